@@ -17,15 +17,25 @@
 import logging
 from typing import Dict, List, Any, Optional
 from core.data.relations import (
-    STEM_HE,           # 天干合
-    BRANCH_LIUHE,      # 地支六合
-    BRANCH_CHONG,      # 地支六冲
-    BRANCH_XING,       # 地支刑
-    BRANCH_HAI,        # 地支害
-    BRANCH_PO,         # 地支破
     BRANCH_SANHE_GROUPS,  # 三合局
 )
-from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS
+from core.data.constants import STEM_ELEMENTS
+from core.data.ganzhi_kernel import (
+    REL_BIJIE,      # 同五行（比劫）
+    REL_CHONG,      # 地支六冲
+    REL_HAI,        # 地支害
+    REL_HE,         # 天干合
+    REL_KE,         # 克
+    REL_KE_BY,      # 被克
+    REL_LIUHE,      # 地支六合
+    REL_PO,         # 地支破
+    REL_SANHE,      # 同属三合局
+    REL_SHENG,      # 生
+    REL_SHENG_BY,   # 被生
+    REL_XING,       # 地支刑
+    branch_relation,
+    stem_relation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -229,30 +239,25 @@ class FortuneRelationAnalyzer:
         if not stem1 or not stem2:
             return "无特殊关系"
         
+        bits = stem_relation(stem1, stem2)
+        
         # 天干合
-        if STEM_HE.get(stem1) == stem2:
+        if bits & REL_HE:
             return f"{stem1}{stem2}相合"
         
         # 同五行（比劫）
-        elem1 = STEM_ELEMENTS.get(stem1)
-        elem2 = STEM_ELEMENTS.get(stem2)
-        
-        if elem1 == elem2:
+        if bits & REL_BIJIE:
             return f"{stem1}{stem2}比劫并见"
         
         # 五行生克
-        if elem1 and elem2:
-            from core.config.luck_fortune_config import ELEMENT_RELATIONS
-            relations = ELEMENT_RELATIONS.get(elem1, {})
-            
-            if relations.get('produces') == elem2:
-                return f"{stem1}生{stem2}"
-            elif relations.get('controls') == elem2:
-                return f"{stem1}克{stem2}"
-            elif relations.get('produced_by') == elem2:
-                return f"{stem2}生{stem1}"
-            elif relations.get('controlled_by') == elem2:
-                return f"{stem2}克{stem1}"
+        if bits & REL_SHENG:
+            return f"{stem1}生{stem2}"
+        if bits & REL_KE:
+            return f"{stem1}克{stem2}"
+        if bits & REL_SHENG_BY:
+            return f"{stem2}生{stem1}"
+        if bits & REL_KE_BY:
+            return f"{stem2}克{stem1}"
         
         return "无特殊关系"
     
@@ -267,43 +272,37 @@ class FortuneRelationAnalyzer:
         if not branch1 or not branch2:
             return "无特殊关系"
         
+        bits = branch_relation(branch1, branch2)
+        
         # 六冲
-        if BRANCH_CHONG.get(branch1) == branch2:
+        if bits & REL_CHONG:
             return f"{branch1}{branch2}相冲⚠️"
         
         # 六合
-        if BRANCH_LIUHE.get(branch1) == branch2:
+        if bits & REL_LIUHE:
             return f"{branch1}{branch2}六合✅"
         
         # 刑
-        if branch2 in BRANCH_XING.get(branch1, []):
+        if bits & REL_XING:
             return f"{branch1}{branch2}相刑⚠️"
         
         # 害
-        if branch2 in BRANCH_HAI.get(branch1, []):
+        if bits & REL_HAI:
             return f"{branch1}{branch2}相害⚠️"
         
         # 破
-        if BRANCH_PO.get(branch1) == branch2:
+        if bits & REL_PO:
             return f"{branch1}{branch2}相破⚠️"
         
         # 三合局（简化判断）
-        for sanhe in BRANCH_SANHE_GROUPS:
-            if branch1 in sanhe and branch2 in sanhe:
-                return f"{branch1}{branch2}三合✅"
+        if bits & REL_SANHE:
+            return f"{branch1}{branch2}三合✅"
         
         # 五行生克
-        elem1 = BRANCH_ELEMENTS.get(branch1)
-        elem2 = BRANCH_ELEMENTS.get(branch2)
-        
-        if elem1 and elem2:
-            from core.config.luck_fortune_config import ELEMENT_RELATIONS
-            relations = ELEMENT_RELATIONS.get(elem1, {})
-            
-            if relations.get('produces') == elem2:
-                return f"{branch1}生{branch2}"
-            elif relations.get('controls') == elem2:
-                return f"{branch1}克{branch2}"
+        if bits & REL_SHENG:
+            return f"{branch1}生{branch2}"
+        if bits & REL_KE:
+            return f"{branch1}克{branch2}"
         
         return "无特殊关系"
     
@@ -427,32 +426,34 @@ class FortuneRelationAnalyzer:
                 if p1_name >= p2_name:  # 避免重复检查
                     continue
                 
+                bits = branch_relation(b1, b2)
+                
                 # 检查冲
-                if BRANCH_CHONG.get(b1) == b2:
+                if bits & REL_CHONG:
                     result['has_chong'] = True
                     result['chong_details'].append(f"{p1_name}柱{b1}与{p2_name}柱{b2}相冲")
                     if b1 == day_branch or b2 == day_branch:
                         result['day_branch_chong'] = True
                 
                 # 检查刑
-                if b2 in BRANCH_XING.get(b1, []):
+                if bits & REL_XING:
                     result['has_xing'] = True
                     result['xing_details'].append(f"{p1_name}柱{b1}刑{p2_name}柱{b2}")
                     if b1 == day_branch or b2 == day_branch:
                         result['day_branch_xing'] = True
                 
                 # 检查合
-                if BRANCH_LIUHE.get(b1) == b2:
+                if bits & REL_LIUHE:
                     result['has_he'] = True
                     result['he_details'].append(f"{p1_name}柱{b1}与{p2_name}柱{b2}六合")
                 
                 # 检查害
-                if b2 in BRANCH_HAI.get(b1, []):
+                if bits & REL_HAI:
                     result['has_hai'] = True
                     result['hai_details'].append(f"{p1_name}柱{b1}害{p2_name}柱{b2}")
                 
                 # 检查破
-                if BRANCH_PO.get(b1) == b2:
+                if bits & REL_PO:
                     result['has_po'] = True
                     result['po_details'].append(f"{p1_name}柱{b1}破{p2_name}柱{b2}")
         
@@ -7,7 +7,14 @@
 
 import logging
 from typing import Dict, List, Any, Optional
+
+import numpy as np
+
 from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS
+from core.data.ganzhi_kernel import (
+    REL_BIJIE, REL_CHONG, REL_HAI, REL_HE, REL_KE, REL_KE_BY,
+    REL_LIUHE, REL_SAME, REL_SHENG, REL_SHENG_BY, REL_XING,
+)
 from core.data.relations import (
     BRANCH_CHONG,
     BRANCH_XING,
@@ -15,6 +22,9 @@ from core.data.relations import (
     BRANCH_LIUHE,
     STEM_HE,
 )
+from core.inference.period_engine import (
+    BRANCH_RELATIONS, STEM_RELATIONS, encode_branches, encode_stems,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -129,6 +139,123 @@ class LiunianAuspiciousAnalyzer:
         logger.info(f"✅ 流年吉凶评分完成: {final_score:.2f}分 ({auspicious_level})")
         return result
     
+    def calculate_auspicious_scores(
+        self,
+        bazi_data: Dict[str, Any],
+        liunian_list: List[Dict[str, Any]],
+        dayun_list: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        批量计算多个流年的吉凶评分（结果与逐年调用 calculate_auspicious_score 一致）
+        
+        日干/日支只编码一次，所有流年的天干、地支、五行平衡、大运调整
+        各用一次数组查表算出；十神、神煞为字符串查表，逐年计算。
+        
+        Args:
+            bazi_data: 八字数据
+            liunian_list: 流年数据列表
+            dayun_list: 与 liunian_list 一一对应的大运数据（可选，元素可为 None）
+            
+        Returns:
+            与 liunian_list 等长的评分结果列表
+        """
+        n = len(liunian_list)
+        if n == 0:
+            return []
+        dayun_list = list(dayun_list) if dayun_list is not None else [None] * n
+        
+        base_score = 50.0
+        pillars = bazi_data.get('bazi_pillars', {})
+        day_pillar = pillars.get('day', {})
+        day_stem = encode_stems([day_pillar.get('stem', '')])[0]
+        day_branch = encode_branches([day_pillar.get('branch', '')])[0]
+        stems = encode_stems([ln.get('stem', '') for ln in liunian_list])
+        branches = encode_branches([ln.get('branch', '') for ln in liunian_list])
+        
+        # 1. 天干关系（日干 → 流年天干）
+        stem_bits = STEM_RELATIONS[day_stem, stems]
+        stem_scores = np.select(
+            [(stem_bits & bit) != 0 for bit in (REL_BIJIE, REL_SHENG_BY, REL_SHENG, REL_KE, REL_KE_BY)],
+            [base_score + 10, base_score + 20, base_score - 5, base_score + 15, base_score - 10],
+            default=base_score,
+        )
+        
+        # 2. 地支关系（日支 → 流年地支）
+        branch_bits = BRANCH_RELATIONS[day_branch, branches]
+        branch_scores = (
+            base_score
+            + np.where(branch_bits & REL_LIUHE, 15.0, 0.0)
+            - np.where(branch_bits & REL_CHONG, 20.0, 0.0)
+            - np.where(branch_bits & REL_XING, 15.0, 0.0)
+            - np.where(branch_bits & REL_HAI, 10.0, 0.0)
+            - np.where(branch_bits & REL_SAME, 5.0, 0.0)
+        )
+        branch_scores = np.clip(branch_scores, 0.0, 100.0)
+        
+        # 3-4. 十神、神煞
+        ten_gods_scores = np.array([
+            self._analyze_ten_gods(ln.get('main_star', ''), base_score) for ln in liunian_list
+        ])
+        deities_scores = np.array([
+            self._analyze_deities(ln.get('deities', []), base_score) for ln in liunian_list
+        ])
+        
+        # 5. 五行平衡（流年天干生日干）
+        if bazi_data.get('element_counts', {}):
+            element_scores = np.where(stem_bits & REL_SHENG_BY, base_score + 10, base_score)
+        else:
+            element_scores = np.full(n, base_score)
+        
+        # 6. 大运影响（大运干支 → 流年干支）
+        has_dayun = np.array([bool(d) for d in dayun_list])
+        dayun_stems = encode_stems([d.get('stem', '') if d else '' for d in dayun_list])
+        dayun_branches = encode_branches([d.get('branch', '') if d else '' for d in dayun_list])
+        dayun_stem_bits = STEM_RELATIONS[dayun_stems, stems]
+        dayun_branch_bits = BRANCH_RELATIONS[dayun_branches, branches]
+        dayun_adjustments = np.where(
+            has_dayun,
+            0.0
+            + np.where(dayun_stem_bits & REL_HE, 5.0, 0.0)
+            + np.where(dayun_branch_bits & REL_LIUHE, 5.0, 0.0)
+            - np.where(dayun_branch_bits & REL_CHONG, 10.0, 0.0),
+            0.0,
+        )
+        
+        final_scores = (
+            stem_scores * 0.30 +
+            branch_scores * 0.25 +
+            ten_gods_scores * 0.20 +
+            deities_scores * 0.15 +
+            element_scores * 0.10
+        ) + dayun_adjustments
+        final_scores = np.clip(final_scores, 0.0, 100.0)
+        
+        results = []
+        for final_score, stem_score, branch_score, ten_gods_score, deities_score, element_score, adjustment in zip(
+            final_scores.tolist(), stem_scores.tolist(), branch_scores.tolist(), ten_gods_scores.tolist(),
+            deities_scores.tolist(), element_scores.tolist(), dayun_adjustments.tolist()
+        ):
+            auspicious_level = self._determine_auspicious_level(final_score)
+            results.append({
+                'auspicious_score': round(final_score, 2),
+                'auspicious_level': auspicious_level,
+                'score_breakdown': {
+                    'stem_relation': round(stem_score, 2),
+                    'branch_relation': round(branch_score, 2),
+                    'ten_gods': round(ten_gods_score, 2),
+                    'deities': round(deities_score, 2),
+                    'element_balance': round(element_score, 2),
+                    'dayun_adjustment': round(adjustment, 2)
+                },
+                'analysis': self._generate_analysis_text(
+                    final_score, auspicious_level, stem_score,
+                    branch_score, ten_gods_score, deities_score
+                )
+            })
+        
+        logger.info(f"✅ 批量流年吉凶评分完成: {n} 个流年")
+        return results
+    
     def _analyze_stem_relation(self, day_stem: str, liunian_stem: str, base_score: float) -> float:
         """
         分析流年天干与日干的关系
@@ -243,7 +370,7 @@ class LiunianAuspiciousAnalyzer:
                 '食神': 12
             }.get(liunian_main_star, 10)
             return base_score + bonus
-        elif liunian_main_star in self.INASPICIOUS_TEN_GODS:
+        elif liunian_main_star in self.INAUSPICIOUS_TEN_GODS:
             # 凶神，减分
             penalty = {
                 '七杀': -20,
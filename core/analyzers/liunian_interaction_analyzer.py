@@ -7,11 +7,10 @@
 
 import logging
 from typing import Dict, List, Any, Optional
-from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS
-from core.data.relations import (
-    BRANCH_CHONG, BRANCH_XING, BRANCH_HAI, BRANCH_LIUHE,
-    BRANCH_SANHE_GROUPS, BRANCH_SANHUI_GROUPS,
-    STEM_HE
+from core.data.ganzhi_kernel import (
+    REL_CHONG, REL_HAI, REL_HE, REL_KE, REL_KE_BY, REL_LIUHE, REL_SANHE, REL_SANHUI,
+    REL_SHENG, REL_SHENG_BY, REL_XING,
+    branch_relation, stem_relation,
 )
 
 logger = logging.getLogger(__name__)
@@ -152,8 +151,11 @@ class LiunianInteractionAnalyzer:
         description = None
         impact = 'neutral'
         
+        # 命局天干对流年天干的关系位（五合 / 五行生克）
+        bits = stem_relation(pillar_stem, liunian_stem)
+        
         # 天干五合
-        if STEM_HE.get(pillar_stem) == liunian_stem:
+        if bits & REL_HE:
             relation_type = '合'
             description = f'流年{liunian_stem}与{pillar_stem}天干五合'
             impact = 'positive'
@@ -161,30 +163,23 @@ class LiunianInteractionAnalyzer:
             relation_type = '同'
             description = f'流年{liunian_stem}与{pillar_stem}相同（伏吟）'
             impact = 'negative'
-        else:
-            # 五行生克关系
-            pillar_element = STEM_ELEMENTS.get(pillar_stem, '')
-            liunian_element = STEM_ELEMENTS.get(liunian_stem, '')
-            
-            if pillar_element and liunian_element:
-                relations = self.ELEMENT_RELATIONS.get(pillar_element, {})
-                
-                if relations.get('produced_by') == liunian_element:
-                    relation_type = '生'
-                    description = f'流年{liunian_stem}生{pillar_stem}'
-                    impact = 'positive'
-                elif relations.get('produces') == liunian_element:
-                    relation_type = '泄'
-                    description = f'流年{liunian_stem}泄{pillar_stem}'
-                    impact = 'neutral'
-                elif relations.get('controls') == liunian_element:
-                    relation_type = '克出'
-                    description = f'流年{liunian_stem}被{pillar_stem}克'
-                    impact = 'positive'
-                elif relations.get('controlled_by') == liunian_element:
-                    relation_type = '受克'
-                    description = f'流年{liunian_stem}克{pillar_stem}'
-                    impact = 'negative'
+        # 五行生克关系
+        elif bits & REL_SHENG_BY:
+            relation_type = '生'
+            description = f'流年{liunian_stem}生{pillar_stem}'
+            impact = 'positive'
+        elif bits & REL_SHENG:
+            relation_type = '泄'
+            description = f'流年{liunian_stem}泄{pillar_stem}'
+            impact = 'neutral'
+        elif bits & REL_KE:
+            relation_type = '克出'
+            description = f'流年{liunian_stem}被{pillar_stem}克'
+            impact = 'positive'
+        elif bits & REL_KE_BY:
+            relation_type = '受克'
+            description = f'流年{liunian_stem}克{pillar_stem}'
+            impact = 'negative'
         
         if relation_type:
             return {
@@ -205,23 +200,25 @@ class LiunianInteractionAnalyzer:
         description = None
         impact = 'neutral'
         
+        bits = branch_relation(pillar_branch, liunian_branch)
+        
         # 六合
-        if BRANCH_LIUHE.get(pillar_branch) == liunian_branch:
+        if bits & REL_LIUHE:
             relation_type = '合'
             description = f'流年{liunian_branch}与{pillar_branch}地支六合'
             impact = 'positive'
         # 六冲
-        elif BRANCH_CHONG.get(pillar_branch) == liunian_branch:
+        elif bits & REL_CHONG:
             relation_type = '冲'
             description = f'流年{liunian_branch}与{pillar_branch}地支六冲'
             impact = 'negative'
         # 三刑
-        elif liunian_branch in BRANCH_XING.get(pillar_branch, []):
+        elif bits & REL_XING:
             relation_type = '刑'
             description = f'流年{liunian_branch}与{pillar_branch}相刑'
             impact = 'negative'
         # 六害
-        elif liunian_branch in BRANCH_HAI.get(pillar_branch, []):
+        elif bits & REL_HAI:
             relation_type = '害'
             description = f'流年{liunian_branch}与{pillar_branch}相害'
             impact = 'negative'
@@ -248,26 +245,25 @@ class LiunianInteractionAnalyzer:
     ) -> List[Dict[str, Any]]:
         """分析特殊组合（三合、三会等）"""
         combinations = []
+        bits = branch_relation(pillar_branch, liunian_branch)
         
         # 检查三合局
-        for sanhe_group in BRANCH_SANHE_GROUPS:
-            if pillar_branch in sanhe_group and liunian_branch in sanhe_group:
-                combinations.append({
-                    'type': 'special',
-                    'relation': '三合',
-                    'description': f'流年{liunian_branch}与{pillar_branch}形成三合局',
-                    'impact': 'positive'
-                })
+        if bits & REL_SANHE:
+            combinations.append({
+                'type': 'special',
+                'relation': '三合',
+                'description': f'流年{liunian_branch}与{pillar_branch}形成三合局',
+                'impact': 'positive'
+            })
         
         # 检查三会局
-        for sanhui_group in BRANCH_SANHUI_GROUPS:
-            if pillar_branch in sanhui_group and liunian_branch in sanhui_group:
-                combinations.append({
-                    'type': 'special',
-                    'relation': '三会',
-                    'description': f'流年{liunian_branch}与{pillar_branch}形成三会局',
-                    'impact': 'positive'
-                })
+        if bits & REL_SANHUI:
+            combinations.append({
+                'type': 'special',
+                'relation': '三会',
+                'description': f'流年{liunian_branch}与{pillar_branch}形成三会局',
+                'impact': 'positive'
+            })
         
         return combinations
     
@@ -519,6 +519,60 @@ class BaziCalculator:
 
         return self._format_dayun_liunian_result()
 
+    def calculate_natal_layer(self) -> Dict[str, Any]:
+        """
+        计算本命层：与当前时间无关的大运序列、全部流年序列、起运交运
+
+        结果只由出生信息决定，可按出生信息长期缓存；
+        与当前时间相关的部分由 apply_current_window() 在其上派生。
+        """
+        if not hasattr(self, 'details') or not self.details:
+            self.calculate()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self._calculate_qiyun_jiaoyun()
+        self._calculate_dayun_sequence()
+        self._calculate_liunian_sequence()
+
+        return {
+            'lunar_date': self.lunar_date,
+            'bazi_pillars': self.bazi_pillars,
+            'details': self.details,
+        }
+
+    @classmethod
+    def from_natal_layer(cls, solar_date, solar_time, gender, natal_layer: Dict[str, Any]) -> 'BaziCalculator':
+        """从本命层快照恢复计算器（不重新排盘）"""
+        calc = cls(solar_date, solar_time, gender)
+        calc.lunar_date = natal_layer.get('lunar_date')
+        calc.bazi_pillars = natal_layer.get('bazi_pillars', {})
+        # 只浅拷贝顶层：当前窗口只替换顶层键，不改写本命层内的序列
+        calc.details = dict(natal_layer.get('details', {}))
+        return calc
+
+    def apply_current_window(self, current_time=None, target_year=None):
+        """
+        在本命层之上派生当前窗口（当前流年/大运、流日、流时、流月、上下文）
+
+        与 calculate_dayun_liunian(current_time, target_year=target_year) 结果一致，
+        但不再重复计算大运和流年序列。
+        """
+        if current_time is None:
+            from datetime import datetime
+            current_time = datetime.now()
+
+        self.current_time = current_time
+        self._calculate_liunian_details()
+        self._calculate_dayun_details()
+        self._calculate_liuri_sequence()
+        self._calculate_liushi_sequence()
+
+        context = self._build_current_context(target_year=target_year)
+        self.details['current_context'] = context
+        self._generate_current_liunian_window(context)
+
+        return self._format_dayun_liunian_result()
+
     def _calculate_liunian_details(self):
         """计算流年详细信息 - 基于当前时间计算，使用lunar-python"""
         from lunar_python import Solar
@@ -931,8 +985,8 @@ class BaziCalculator:
             - 天克地冲：天干相克（双向）且地支相冲
             - 天合地合：天干相合且地支相合
         """
-        from core.data.relations import (
-            STEM_HE, BRANCH_LIUHE, BRANCH_CHONG, STEM_KE
+        from core.data.ganzhi_kernel import (
+            REL_CHONG, REL_HE, REL_KE, REL_LIUHE, branch_relation, stem_relation
         )
         
         relations = []
@@ -955,13 +1009,14 @@ class BaziCalculator:
                 continue
             
             # 2.1 天干关系
-            is_stem_he = STEM_HE.get(liunian_stem) == pillar_stem  # 天干相合
-            is_stem_ke = pillar_stem in STEM_KE.get(liunian_stem, [])  # 天干相克（流年克四柱）
-            is_stem_ke_reverse = liunian_stem in STEM_KE.get(pillar_stem, [])  # 天干相克（四柱克流年）
+            stem_bits = stem_relation(liunian_stem, pillar_stem)
+            is_stem_he = bool(stem_bits & REL_HE)  # 天干相合
+            is_stem_ke = bool(stem_bits & REL_KE)  # 天干相克（流年克四柱）
             
             # 2.2 地支关系
-            is_branch_chong = BRANCH_CHONG.get(liunian_branch) == pillar_branch  # 地支相冲
-            is_branch_he = BRANCH_LIUHE.get(liunian_branch) == pillar_branch  # 地支相合
+            branch_bits = branch_relation(liunian_branch, pillar_branch)
+            is_branch_chong = bool(branch_bits & REL_CHONG)  # 地支相冲
+            is_branch_he = bool(branch_bits & REL_LIUHE)  # 地支相合
             
             # 2.3 天克地冲：流年天干克四柱天干 且 地支相冲
             if is_stem_ke and is_branch_chong:
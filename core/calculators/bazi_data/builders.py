@@ -10,16 +10,7 @@
 import logging
 
 from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS
-from core.data.relations import (
-    STEM_HE,
-    BRANCH_LIUHE,
-    BRANCH_CHONG,
-    BRANCH_XING,
-    BRANCH_HAI,
-    BRANCH_PO,
-    BRANCH_SANHE_GROUPS,
-    BRANCH_SANHUI_GROUPS,
-)
+from core.data.ganzhi_kernel import build_pillar_relationships
 
 logger = logging.getLogger("core.calculators.bazi_calculator")
 
@@ -134,101 +125,7 @@ class BaziDataBuilderMixin:
         return relationships
 
     def _build_ganzhi_relationships(self):
-        pillars = ['year', 'month', 'day', 'hour']
-        stem_map = {pillar: self.bazi_pillars.get(pillar, {}).get('stem') for pillar in pillars}
-        branch_map = {pillar: self.bazi_pillars.get(pillar, {}).get('branch') for pillar in pillars}
-
-        stem_relations = {
-            'he': [],
-            'map': {pillar: [] for pillar in pillars},
-        }
-
-        branch_relations = {
-            'liuhe': [],
-            'chong': [],
-            'xing': [],
-            'hai': [],
-            'po': [],
-            'map': {
-                'liuhe': {pillar: [] for pillar in pillars},
-                'chong': {pillar: [] for pillar in pillars},
-                'xing': {pillar: [] for pillar in pillars},
-                'hai': {pillar: [] for pillar in pillars},
-                'po': {pillar: [] for pillar in pillars},
-            },
-            'sanhe': [],
-            'sanhui': [],
-        }
-
-        for i in range(len(pillars)):
-            for j in range(i + 1, len(pillars)):
-                pillar_a = pillars[i]
-                pillar_b = pillars[j]
-                stem_a = stem_map.get(pillar_a)
-                stem_b = stem_map.get(pillar_b)
-                branch_a = branch_map.get(pillar_a)
-                branch_b = branch_map.get(pillar_b)
-
-                if stem_a and stem_b and STEM_HE.get(stem_a) == stem_b:
-                    entry = {'pillars': [pillar_a, pillar_b], 'stems': [stem_a, stem_b]}
-                    stem_relations['he'].append(entry)
-                    stem_relations['map'][pillar_a].append(pillar_b)
-                    stem_relations['map'][pillar_b].append(pillar_a)
-
-                if branch_a and branch_b:
-                    if BRANCH_LIUHE.get(branch_a) == branch_b:
-                        entry = {'pillars': [pillar_a, pillar_b], 'branches': [branch_a, branch_b]}
-                        branch_relations['liuhe'].append(entry)
-                        branch_relations['map']['liuhe'][pillar_a].append(pillar_b)
-                        branch_relations['map']['liuhe'][pillar_b].append(pillar_a)
-                    if BRANCH_CHONG.get(branch_a) == branch_b:
-                        entry = {'pillars': [pillar_a, pillar_b], 'branches': [branch_a, branch_b]}
-                        branch_relations['chong'].append(entry)
-                        branch_relations['map']['chong'][pillar_a].append(pillar_b)
-                        branch_relations['map']['chong'][pillar_b].append(pillar_a)
-                    if branch_b in BRANCH_XING.get(branch_a, []):
-                        entry = {'pillars': [pillar_a, pillar_b], 'branches': [branch_a, branch_b]}
-                        branch_relations['xing'].append(entry)
-                        branch_relations['map']['xing'][pillar_a].append(pillar_b)
-                    if branch_a in BRANCH_XING.get(branch_b, []):
-                        branch_relations['map']['xing'][pillar_b].append(pillar_a)
-                    if branch_b in BRANCH_HAI.get(branch_a, []):
-                        entry = {'pillars': [pillar_a, pillar_b], 'branches': [branch_a, branch_b]}
-                        branch_relations['hai'].append(entry)
-                        branch_relations['map']['hai'][pillar_a].append(pillar_b)
-                    if branch_a in BRANCH_HAI.get(branch_b, []):
-                        branch_relations['map']['hai'][pillar_b].append(pillar_a)
-                    if BRANCH_PO.get(branch_a) == branch_b:
-                        entry = {'pillars': [pillar_a, pillar_b], 'branches': [branch_a, branch_b]}
-                        branch_relations['po'].append(entry)
-                        branch_relations['map']['po'][pillar_a].append(pillar_b)
-                        branch_relations['map']['po'][pillar_b].append(pillar_a)
-
-        branch_values = {pillar: branch for pillar, branch in branch_map.items() if branch}
-        for group in BRANCH_SANHE_GROUPS:
-            group_set = set(group)
-            matched_pillars = [pillar for pillar, branch in branch_values.items() if branch in group_set]
-            matched_branches = {branch_values[p] for p in matched_pillars}
-            if len(matched_branches) == len(group_set):
-                branch_relations['sanhe'].append({
-                    'group': list(group),
-                    'pillars': matched_pillars,
-                })
-
-        for group in BRANCH_SANHUI_GROUPS:
-            group_set = set(group)
-            matched_pillars = [pillar for pillar, branch in branch_values.items() if branch in group_set]
-            matched_branches = {branch_values[p] for p in matched_pillars}
-            if len(matched_branches) == len(group_set):
-                branch_relations['sanhui'].append({
-                    'group': list(group),
-                    'pillars': matched_pillars,
-                })
-
-        return {
-            'stem_relations': stem_relations,
-            'branch_relations': branch_relations,
-        }
+        return build_pillar_relationships(self.bazi_pillars)
 
     def print_result(self):
         """打印排盘结果"""
@@ -60,3 +60,40 @@ def compute_local_detail(
 
     return format_detail_result(detail_raw, bazi_result)
 
+
+
+def compute_natal_layer(solar_date: str, solar_time: str, gender: str) -> Dict[str, Any]:
+    """
+    计算与当前时间无关的本命层（排盘结果 + 大运序列 + 全部流年序列）
+
+    返回值可 JSON 序列化，供上层按出生信息长期缓存。
+    """
+    from core.calculators.BaziCalculator import BaziCalculator as ToolBaziCalculator  # 延迟导入避免循环依赖
+
+    calculator = ToolBaziCalculator(solar_date, solar_time, gender)
+    bazi_result = calculator.calculate()
+    if not bazi_result:
+        raise ValueError("八字计算失败，请检查输入参数")
+
+    fortune_calc = DocsBaziCalculator(solar_date, solar_time, gender=gender)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        natal_layer = fortune_calc.calculate_natal_layer()
+    natal_layer['bazi_result'] = bazi_result
+    return natal_layer
+
+
+def compute_detail_from_natal_layer(
+    natal_layer: Dict[str, Any],
+    solar_date: str,
+    solar_time: str,
+    gender: str,
+    current_time: Optional[datetime] = None,
+    target_year: Optional[int] = None,
+) -> Dict[str, Any]:
+    """在本命层上派生当前窗口，结果与 compute_local_detail(dayun_index=None) 一致。"""
+    fortune_calc = DocsBaziCalculator.from_natal_layer(solar_date, solar_time, gender, natal_layer)
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        detail_raw = fortune_calc.apply_current_window(current_time=current_time, target_year=target_year)
+    return format_detail_result(detail_raw, natal_layer.get('bazi_result', {}))
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+干支关系内核：导入时一次性预计算的关系位掩码矩阵。
+
+以 relations.py / constants.py 中的关系常量为唯一数据源，预先构建：
+- 地支 12×12 关系矩阵：六合、六冲、刑、害、破、同属三合局、同属三会局、五行生克
+- 天干 10×10 关系矩阵：五合、相克（STEM_KE）、五行生克、比劫
+- 六十甲子（以及单独天干 / 地支）的五行力量向量
+
+矩阵元素 [a][b] 表示 a 对 b 的关系（刑、害等按 relations.py 中 a 的列表方向）。
+查询函数只做字典查找和位运算，不创建中间对象；未知的干支返回 0（无关系）。
+
+使用示例：
+    from core.data.ganzhi_kernel import REL_CHONG, REL_LIUHE, branch_relation, branch_relations_any
+
+    if branch_relation('子', '午') & REL_CHONG: ...
+    mask = branch_relations_any('子', ('丑', '午', '卯', '酉'))   # 子与四柱地支的全部关系
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from .constants import BRANCH_ELEMENTS, EARTHLY_BRANCHES, HEAVENLY_STEMS, HIDDEN_STEMS, STEM_ELEMENTS
+from .relations import (
+    BRANCH_CHONG,
+    BRANCH_HAI,
+    BRANCH_LIUHE,
+    BRANCH_PO,
+    BRANCH_SANHE_GROUPS,
+    BRANCH_SANHUI_GROUPS,
+    BRANCH_XING,
+    STEM_HE,
+    STEM_KE,
+)
+
+# ---------------------------------------------------------------------------
+# 关系位
+# ---------------------------------------------------------------------------
+
+# 地支关系
+REL_LIUHE = 1 << 0     # 六合
+REL_CHONG = 1 << 1     # 六冲
+REL_XING = 1 << 2      # 刑（b 在 BRANCH_XING[a] 中）
+REL_HAI = 1 << 3       # 害（b 在 BRANCH_HAI[a] 中）
+REL_PO = 1 << 4        # 破
+REL_SANHE = 1 << 5     # 同属一个三合局（含相同地支）
+REL_SANHUI = 1 << 6    # 同属一个三会局（含相同地支）
+
+# 天干关系
+REL_HE = 1 << 7        # 天干五合
+
+# 天干 / 地支通用
+REL_SAME = 1 << 8      # 相同干支（伏吟）
+REL_BIJIE = 1 << 9     # 五行相同（比劫）
+REL_SHENG = 1 << 10    # a 生 b
+REL_SHENG_BY = 1 << 11 # b 生 a
+REL_KE = 1 << 12       # a 克 b（天干按 STEM_KE）
+REL_KE_BY = 1 << 13    # b 克 a
+
+# 地支两两关系（不含三合 / 三会 / 五行生克）
+BRANCH_PAIR_RELATIONS = REL_LIUHE | REL_CHONG | REL_XING | REL_HAI | REL_PO
+
+# 规则配置中的关系名 -> 关系位
+BRANCH_RELATION_NAMES: Dict[str, int] = {
+    'liuhe': REL_LIUHE,
+    'chong': REL_CHONG,
+    'xing': REL_XING,
+    'hai': REL_HAI,
+    'po': REL_PO,
+    'sanhe': REL_SANHE,
+    'sanhui': REL_SANHUI,
+}
+
+# ---------------------------------------------------------------------------
+# 五行与力量
+# ---------------------------------------------------------------------------
+
+ELEMENTS: Tuple[str, ...] = ('木', '火', '土', '金', '水')
+ELEMENT_INDEX: Dict[str, int] = {element: i for i, element in enumerate(ELEMENTS)}
+
+_ELEMENT_SHENG = {'木': '火', '火': '土', '土': '金', '金': '水', '水': '木'}
+_ELEMENT_KE = {'木': '土', '火': '金', '土': '水', '金': '木', '水': '火'}
+
+# 五行力量权重（与 DynamicForceBalancer 一致）
+STEM_POWER = 1.5
+BRANCH_MAIN_POWER = 1.5
+BRANCH_HIDDEN_POWER = 0.5
+
+STEM_INDEX: Dict[str, int] = {stem: i for i, stem in enumerate(HEAVENLY_STEMS)}
+BRANCH_INDEX: Dict[str, int] = {branch: i for i, branch in enumerate(EARTHLY_BRANCHES)}
+
+# 六十甲子（甲子、乙丑 ... 癸亥）
+GANZHI_60: Tuple[str, ...] = tuple(
+    HEAVENLY_STEMS[i % 10] + EARTHLY_BRANCHES[i % 12] for i in range(60)
+)
+GANZHI_INDEX: Dict[str, int] = {ganzhi: i for i, ganzhi in enumerate(GANZHI_60)}
+
+
+def _element_bits(element_a: Optional[str], element_b: Optional[str]) -> int:
+    if not element_a or not element_b:
+        return 0
+    if element_a == element_b:
+        return REL_BIJIE
+    if _ELEMENT_SHENG[element_a] == element_b:
+        return REL_SHENG
+    if _ELEMENT_SHENG[element_b] == element_a:
+        return REL_SHENG_BY
+    if _ELEMENT_KE[element_a] == element_b:
+        return REL_KE
+    if _ELEMENT_KE[element_b] == element_a:
+        return REL_KE_BY
+    return 0
+
+
+def _build_branch_matrix() -> Tuple[Tuple[int, ...], ...]:
+    sanhe_of = {branch: i for i, group in enumerate(BRANCH_SANHE_GROUPS) for branch in group}
+    sanhui_of = {branch: i for i, group in enumerate(BRANCH_SANHUI_GROUPS) for branch in group}
+    rows = []
+    for a in EARTHLY_BRANCHES:
+        row = []
+        for b in EARTHLY_BRANCHES:
+            bits = _element_bits(BRANCH_ELEMENTS.get(a), BRANCH_ELEMENTS.get(b))
+            if a == b:
+                bits |= REL_SAME
+            if BRANCH_LIUHE.get(a) == b:
+                bits |= REL_LIUHE
+            if BRANCH_CHONG.get(a) == b:
+                bits |= REL_CHONG
+            if b in BRANCH_XING.get(a, ()):
+                bits |= REL_XING
+            if b in BRANCH_HAI.get(a, ()):
+                bits |= REL_HAI
+            if BRANCH_PO.get(a) == b:
+                bits |= REL_PO
+            if a in sanhe_of and sanhe_of.get(a) == sanhe_of.get(b):
+                bits |= REL_SANHE
+            if a in sanhui_of and sanhui_of.get(a) == sanhui_of.get(b):
+                bits |= REL_SANHUI
+            row.append(bits)
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+def _build_stem_matrix() -> Tuple[Tuple[int, ...], ...]:
+    rows = []
+    for a in HEAVENLY_STEMS:
+        row = []
+        for b in HEAVENLY_STEMS:
+            # 相克以 STEM_KE 为准，其余五行关系按五行生克
+            bits = _element_bits(STEM_ELEMENTS.get(a), STEM_ELEMENTS.get(b)) & ~(REL_KE | REL_KE_BY)
+            if a == b:
+                bits |= REL_SAME
+            if STEM_HE.get(a) == b:
+                bits |= REL_HE
+            if b in STEM_KE.get(a, ()):
+                bits |= REL_KE
+            if a in STEM_KE.get(b, ()):
+                bits |= REL_KE_BY
+            row.append(bits)
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+def _power_vector(stem: Optional[str], branch: Optional[str]) -> Tuple[float, ...]:
+    power = [0.0] * len(ELEMENTS)
+    if stem in STEM_ELEMENTS:
+        power[ELEMENT_INDEX[STEM_ELEMENTS[stem]]] += STEM_POWER
+    if branch in BRANCH_ELEMENTS:
+        power[ELEMENT_INDEX[BRANCH_ELEMENTS[branch]]] += BRANCH_MAIN_POWER
+        for hidden in HIDDEN_STEMS.get(branch, []):
+            element = hidden[-1] if len(hidden) >= 2 else ''
+            if element in ELEMENT_INDEX:
+                power[ELEMENT_INDEX[element]] += BRANCH_HIDDEN_POWER
+    return tuple(power)
+
+
+# 12×12 / 10×10 关系矩阵（按 EARTHLY_BRANCHES / HEAVENLY_STEMS 顺序索引）
+BRANCH_RELATION_MATRIX = _build_branch_matrix()
+STEM_RELATION_MATRIX = _build_stem_matrix()
+
+# 按字符索引的同一份矩阵：查询时只需两次字典查找
+_BRANCH_TABLE: Dict[str, Dict[str, int]] = {
+    a: {b: BRANCH_RELATION_MATRIX[i][j] for j, b in enumerate(EARTHLY_BRANCHES)}
+    for i, a in enumerate(EARTHLY_BRANCHES)
+}
+_STEM_TABLE: Dict[str, Dict[str, int]] = {
+    a: {b: STEM_RELATION_MATRIX[i][j] for j, b in enumerate(HEAVENLY_STEMS)}
+    for i, a in enumerate(HEAVENLY_STEMS)
+}
+_EMPTY_ROW: Dict[str, int] = {}
+
+# 五行力量向量（按 ELEMENTS 顺序）
+STEM_POWER_VECTORS: Dict[str, Tuple[float, ...]] = {stem: _power_vector(stem, None) for stem in HEAVENLY_STEMS}
+BRANCH_POWER_VECTORS: Dict[str, Tuple[float, ...]] = {
+    branch: _power_vector(None, branch) for branch in EARTHLY_BRANCHES
+}
+GANZHI_POWER_VECTORS: Dict[str, Tuple[float, ...]] = {
+    ganzhi: _power_vector(ganzhi[0], ganzhi[1]) for ganzhi in GANZHI_60
+}
+# 六十甲子的天干 / 地支五行（元素索引）
+GANZHI_ELEMENTS: Dict[str, Tuple[int, int]] = {
+    ganzhi: (ELEMENT_INDEX[STEM_ELEMENTS[ganzhi[0]]], ELEMENT_INDEX[BRANCH_ELEMENTS[ganzhi[1]]])
+    for ganzhi in GANZHI_60
+}
+_ZERO_VECTOR: Tuple[float, ...] = (0.0,) * len(ELEMENTS)
+
+
+# ---------------------------------------------------------------------------
+# 查询
+# ---------------------------------------------------------------------------
+
+def branch_relation(a: Optional[str], b: Optional[str]) -> int:
+    """地支 a 对 b 的关系位"""
+    return _BRANCH_TABLE.get(a, _EMPTY_ROW).get(b, 0)
+
+
+def branch_relation_either(a: Optional[str], b: Optional[str]) -> int:
+    """地支 a、b 之间任一方向的关系位（刑、害按双向判断）"""
+    return _BRANCH_TABLE.get(a, _EMPTY_ROW).get(b, 0) | _BRANCH_TABLE.get(b, _EMPTY_ROW).get(a, 0)
+
+
+def stem_relation(a: Optional[str], b: Optional[str]) -> int:
+    """天干 a 对 b 的关系位"""
+    return _STEM_TABLE.get(a, _EMPTY_ROW).get(b, 0)
+
+
+def branch_relations_any(branch: Optional[str], others: Iterable[Optional[str]]) -> int:
+    """地支与一组地支（如四柱地支）之间出现过的全部关系位（按位或）"""
+    row = _BRANCH_TABLE.get(branch, _EMPTY_ROW)
+    mask = 0
+    for other in others:
+        mask |= row.get(other, 0)
+    return mask
+
+
+def stem_relations_any(stem: Optional[str], others: Iterable[Optional[str]]) -> int:
+    """天干与一组天干之间出现过的全部关系位（按位或）"""
+    row = _STEM_TABLE.get(stem, _EMPTY_ROW)
+    mask = 0
+    for other in others:
+        mask |= row.get(other, 0)
+    return mask
+
+
+def branch_relations_each(branch: Optional[str], others: Sequence[Optional[str]]) -> Tuple[int, ...]:
+    """地支与一组地支逐个的关系位"""
+    row = _BRANCH_TABLE.get(branch, _EMPTY_ROW)
+    return tuple(row.get(other, 0) for other in others)
+
+
+def relation_mask(names: Iterable[str]) -> int:
+    """规则配置中的地支关系名（大小写不敏感）转换为关系位，未知名称忽略"""
+    mask = 0
+    for name in names:
+        mask |= BRANCH_RELATION_NAMES.get(str(name).lower(), 0)
+    return mask
+
+
+def ganzhi_power(stem: Optional[str], branch: Optional[str]) -> Tuple[float, ...]:
+    """干支的五行力量向量（天干 + 地支本气 + 藏干），按 ELEMENTS 顺序；缺失或未知的一方不计"""
+    stem_vector = STEM_POWER_VECTORS.get(stem)
+    branch_vector = BRANCH_POWER_VECTORS.get(branch)
+    if stem_vector is None:
+        return branch_vector or _ZERO_VECTOR
+    if branch_vector is None:
+        return stem_vector
+    vector = GANZHI_POWER_VECTORS.get(stem + branch)
+    if vector is None:
+        # 阴阳不配的组合（不在六十甲子中）
+        vector = tuple(s + b for s, b in zip(stem_vector, branch_vector))
+    return vector
+
+
+# ---------------------------------------------------------------------------
+# 四柱关系
+# ---------------------------------------------------------------------------
+
+_PILLARS = ('year', 'month', 'day', 'hour')
+_BRANCH_PAIR_KEYS = (('liuhe', REL_LIUHE), ('chong', REL_CHONG), ('xing', REL_XING), ('hai', REL_HAI), ('po', REL_PO))
+_DIRECTED = REL_XING | REL_HAI
+
+
+def build_pillar_relationships(bazi_pillars: Dict[str, Dict[str, str]]) -> Dict[str, Dict]:
+    """
+    四柱之间的天干合、地支合冲刑害破及三合 / 三会局（排盘结果 relationships 中的干支部分）
+
+    Returns:
+        {'stem_relations': {...}, 'branch_relations': {...}}
+    """
+    stem_map = {pillar: bazi_pillars.get(pillar, {}).get('stem') for pillar in _PILLARS}
+    branch_map = {pillar: bazi_pillars.get(pillar, {}).get('branch') for pillar in _PILLARS}
+
+    stem_relations = {
+        'he': [],
+        'map': {pillar: [] for pillar in _PILLARS},
+    }
+    branch_relations = {
+        'liuhe': [],
+        'chong': [],
+        'xing': [],
+        'hai': [],
+        'po': [],
+        'map': {key: {pillar: [] for pillar in _PILLARS} for key, _ in _BRANCH_PAIR_KEYS},
+        'sanhe': [],
+        'sanhui': [],
+    }
+
+    for i in range(len(_PILLARS)):
+        for j in range(i + 1, len(_PILLARS)):
+            pillar_a = _PILLARS[i]
+            pillar_b = _PILLARS[j]
+            stem_a = stem_map.get(pillar_a)
+            stem_b = stem_map.get(pillar_b)
+            branch_a = branch_map.get(pillar_a)
+            branch_b = branch_map.get(pillar_b)
+
+            if stem_a and stem_b and stem_relation(stem_a, stem_b) & REL_HE:
+                stem_relations['he'].append({'pillars': [pillar_a, pillar_b], 'stems': [stem_a, stem_b]})
+                stem_relations['map'][pillar_a].append(pillar_b)
+                stem_relations['map'][pillar_b].append(pillar_a)
+
+            if not branch_a or not branch_b:
+                continue
+            forward = branch_relation(branch_a, branch_b)
+            backward = branch_relation(branch_b, branch_a)
+            if not (forward | backward) & BRANCH_PAIR_RELATIONS:
+                continue
+            for key, bit in _BRANCH_PAIR_KEYS:
+                if forward & bit:
+                    branch_relations[key].append({'pillars': [pillar_a, pillar_b], 'branches': [branch_a, branch_b]})
+                    branch_relations['map'][key][pillar_a].append(pillar_b)
+                    if not bit & _DIRECTED:
+                        branch_relations['map'][key][pillar_b].append(pillar_a)
+                if bit & _DIRECTED and backward & bit:
+                    branch_relations['map'][key][pillar_b].append(pillar_a)
+
+    branch_values = {pillar: branch for pillar, branch in branch_map.items() if branch}
+    for key, groups in (('sanhe', BRANCH_SANHE_GROUPS), ('sanhui', BRANCH_SANHUI_GROUPS)):
+        for group in groups:
+            group_set = set(group)
+            matched_pillars = [pillar for pillar, branch in branch_values.items() if branch in group_set]
+            matched_branches = {branch_values[p] for p in matched_pillars}
+            if len(matched_branches) == len(group_set):
+                branch_relations[key].append({
+                    'group': list(group),
+                    'pillars': matched_pillars,
+                })
+
+    return {
+        'stem_relations': stem_relations,
+        'branch_relations': branch_relations,
+    }
+
+
+__all__ = [
+    "REL_LIUHE", "REL_CHONG", "REL_XING", "REL_HAI", "REL_PO", "REL_SANHE", "REL_SANHUI",
+    "REL_HE", "REL_SAME", "REL_BIJIE", "REL_SHENG", "REL_SHENG_BY", "REL_KE", "REL_KE_BY",
+    "BRANCH_PAIR_RELATIONS", "BRANCH_RELATION_NAMES",
+    "ELEMENTS", "ELEMENT_INDEX", "STEM_INDEX", "BRANCH_INDEX", "GANZHI_60", "GANZHI_INDEX",
+    "STEM_POWER", "BRANCH_MAIN_POWER", "BRANCH_HIDDEN_POWER",
+    "BRANCH_RELATION_MATRIX", "STEM_RELATION_MATRIX",
+    "STEM_POWER_VECTORS", "BRANCH_POWER_VECTORS", "GANZHI_POWER_VECTORS", "GANZHI_ELEMENTS",
+    "branch_relation", "branch_relation_either", "stem_relation",
+    "branch_relations_any", "stem_relations_any", "branch_relations_each",
+    "relation_mask", "ganzhi_power", "build_pillar_relationships",
+]
@@ -13,10 +13,15 @@ import logging
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 
-from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS, HIDDEN_STEMS
-from core.data.relations import (
-    BRANCH_CHONG, BRANCH_LIUHE, BRANCH_XING, BRANCH_HAI,
-    STEM_HE, BRANCH_SANHE_GROUPS, BRANCH_SANHUI_GROUPS,
+from core.data.constants import BRANCH_ELEMENTS
+from core.data import ganzhi_kernel
+from core.data.ganzhi_kernel import (
+    ELEMENTS, REL_CHONG, REL_HAI, REL_LIUHE, REL_XING,
+    BRANCH_POWER_VECTORS, STEM_POWER_VECTORS, branch_relation,
+)
+from core.inference.period_engine import (
+    BRANCH_LIUHE_TRANSFORM, CHONG_LOSS, LIUHE_GAIN, STEM_HE_GAIN, STEM_HE_TRANSFORM, XING_LOSS,
+    NatalEncoding, PeriodArrays, compute_period_arrays, split_ganzhi,
 )
 
 logger = logging.getLogger(__name__)
@@ -24,23 +29,6 @@ logger = logging.getLogger(__name__)
 WUXING_SHENG = {'木': '火', '火': '土', '土': '金', '金': '水', '水': '木'}
 WUXING_KE = {'木': '土', '火': '金', '土': '水', '金': '木', '水': '火'}
 
-STEM_HE_TRANSFORM = {
-    ('甲', '己'): '土', ('己', '甲'): '土',
-    ('乙', '庚'): '金', ('庚', '乙'): '金',
-    ('丙', '辛'): '水', ('辛', '丙'): '水',
-    ('丁', '壬'): '木', ('壬', '丁'): '木',
-    ('戊', '癸'): '火', ('癸', '戊'): '火',
-}
-
-BRANCH_LIUHE_TRANSFORM = {
-    ('子', '丑'): '土', ('丑', '子'): '土',
-    ('寅', '亥'): '木', ('亥', '寅'): '木',
-    ('卯', '戌'): '火', ('戌', '卯'): '火',
-    ('辰', '酉'): '金', ('酉', '辰'): '金',
-    ('巳', '申'): '水', ('申', '巳'): '水',
-    ('午', '未'): '火', ('未', '午'): '火',
-}
-
 
 @dataclass
 class PeriodBalance:
@@ -59,9 +47,18 @@ class PeriodBalance:
 class DynamicForceBalancer:
     """动态力场平衡器"""
 
-    STEM_POWER = 1.5
-    BRANCH_MAIN_POWER = 1.5
-    BRANCH_HIDDEN_POWER = 0.5
+    # 权重与干支内核的预计算力量向量一致
+    STEM_POWER = ganzhi_kernel.STEM_POWER
+    BRANCH_MAIN_POWER = ganzhi_kernel.BRANCH_MAIN_POWER
+    BRANCH_HIDDEN_POWER = ganzhi_kernel.BRANCH_HIDDEN_POWER
+
+    @staticmethod
+    def _add_power(power: Dict[str, float], stem: str, branch: str) -> None:
+        """累加干支的五行力量（天干 + 地支本气 + 藏干，取内核预计算向量）"""
+        for vector in (STEM_POWER_VECTORS.get(stem), BRANCH_POWER_VECTORS.get(branch)):
+            if vector is not None:
+                for element, value in zip(ELEMENTS, vector):
+                    power[element] += value
 
     @classmethod
     def calculate_natal_wuxing_power(cls, bazi_pillars: Dict[str, Dict[str, str]]) -> Dict[str, float]:
@@ -69,17 +66,7 @@ class DynamicForceBalancer:
         power = {'木': 0.0, '火': 0.0, '土': 0.0, '金': 0.0, '水': 0.0}
         for pillar_name in ['year', 'month', 'day', 'hour']:
             p = bazi_pillars.get(pillar_name, {})
-            stem = p.get('stem', '')
-            branch = p.get('branch', '')
-            if stem and stem in STEM_ELEMENTS:
-                power[STEM_ELEMENTS[stem]] += cls.STEM_POWER
-            if branch and branch in BRANCH_ELEMENTS:
-                power[BRANCH_ELEMENTS[branch]] += cls.BRANCH_MAIN_POWER
-                for hidden in HIDDEN_STEMS.get(branch, []):
-                    elem_char = hidden[-1] if len(hidden) >= 2 else ''
-                    elem_map = {'木': '木', '火': '火', '土': '土', '金': '金', '水': '水'}
-                    if elem_char in elem_map:
-                        power[elem_map[elem_char]] += cls.BRANCH_HIDDEN_POWER
+            cls._add_power(power, p.get('stem', ''), p.get('branch', ''))
         return power
 
     @classmethod
@@ -98,44 +85,38 @@ class DynamicForceBalancer:
         包含合化增益和冲散减损。
         """
         delta = {'木': 0.0, '火': 0.0, '土': 0.0, '金': 0.0, '水': 0.0}
-
-        if dayun_stem and dayun_stem in STEM_ELEMENTS:
-            delta[STEM_ELEMENTS[dayun_stem]] += cls.STEM_POWER
-        if dayun_branch and dayun_branch in BRANCH_ELEMENTS:
-            delta[BRANCH_ELEMENTS[dayun_branch]] += cls.BRANCH_MAIN_POWER
-            for hidden in HIDDEN_STEMS.get(dayun_branch, []):
-                elem_char = hidden[-1] if len(hidden) >= 2 else ''
-                if elem_char in delta:
-                    delta[elem_char] += cls.BRANCH_HIDDEN_POWER
+        cls._add_power(delta, dayun_stem, dayun_branch)
 
         activated = []
         for nb in natal_branches:
-            if dayun_branch and nb:
-                if BRANCH_CHONG.get(dayun_branch) == nb:
-                    activated.append({'type': '冲', 'branches': f'{dayun_branch}{nb}', 'severity': 'high'})
-                    nb_elem = BRANCH_ELEMENTS.get(nb, '')
-                    if nb_elem:
-                        delta[nb_elem] -= 0.8
-                if BRANCH_LIUHE.get(dayun_branch) == nb:
-                    activated.append({'type': '合', 'branches': f'{dayun_branch}{nb}', 'severity': 'medium'})
-                    transform_elem = BRANCH_LIUHE_TRANSFORM.get((dayun_branch, nb))
-                    if transform_elem:
-                        delta[transform_elem] += 0.6
-                xing_targets = BRANCH_XING.get(dayun_branch, [])
-                if nb in xing_targets:
-                    activated.append({'type': '刑', 'branches': f'{dayun_branch}{nb}', 'severity': 'high'})
-                    nb_elem = BRANCH_ELEMENTS.get(nb, '')
-                    if nb_elem:
-                        delta[nb_elem] -= 0.5
-                hai_targets = BRANCH_HAI.get(dayun_branch, [])
-                if nb in hai_targets:
-                    activated.append({'type': '害', 'branches': f'{dayun_branch}{nb}', 'severity': 'medium'})
+            if not dayun_branch or not nb:
+                continue
+            bits = branch_relation(dayun_branch, nb)
+            if not bits & (REL_CHONG | REL_LIUHE | REL_XING | REL_HAI):
+                continue
+            if bits & REL_CHONG:
+                activated.append({'type': '冲', 'branches': f'{dayun_branch}{nb}', 'severity': 'high'})
+                nb_elem = BRANCH_ELEMENTS.get(nb, '')
+                if nb_elem:
+                    delta[nb_elem] -= CHONG_LOSS
+            if bits & REL_LIUHE:
+                activated.append({'type': '合', 'branches': f'{dayun_branch}{nb}', 'severity': 'medium'})
+                transform_elem = BRANCH_LIUHE_TRANSFORM.get((dayun_branch, nb))
+                if transform_elem:
+                    delta[transform_elem] += LIUHE_GAIN
+            if bits & REL_XING:
+                activated.append({'type': '刑', 'branches': f'{dayun_branch}{nb}', 'severity': 'high'})
+                nb_elem = BRANCH_ELEMENTS.get(nb, '')
+                if nb_elem:
+                    delta[nb_elem] -= XING_LOSS
+            if bits & REL_HAI:
+                activated.append({'type': '害', 'branches': f'{dayun_branch}{nb}', 'severity': 'medium'})
 
         if natal_stems and dayun_stem:
             for ns in natal_stems:
                 transform_elem = STEM_HE_TRANSFORM.get((dayun_stem, ns))
                 if transform_elem:
-                    delta[transform_elem] += 0.5
+                    delta[transform_elem] += STEM_HE_GAIN
                     activated.append({
                         'type': '天干合',
                         'branches': f'{dayun_stem}{ns}→{transform_elem}',
@@ -146,9 +127,7 @@ class DynamicForceBalancer:
 
         marriage_palace_activated = False
         if day_branch and dayun_branch:
-            if BRANCH_CHONG.get(dayun_branch) == day_branch:
-                marriage_palace_activated = True
-            if BRANCH_LIUHE.get(dayun_branch) == day_branch:
+            if branch_relation(dayun_branch, day_branch) & (REL_CHONG | REL_LIUHE):
                 marriage_palace_activated = True
 
         spouse_power_change = 0.0
@@ -164,7 +143,7 @@ class DynamicForceBalancer:
         )
 
     @classmethod
-    def calculate_all_dayun_balances(
+    def calculate_dayun_arrays(
         cls,
         natal_power: Dict[str, float],
         natal_branches: List[str],
@@ -173,39 +152,103 @@ class DynamicForceBalancer:
         spouse_star_element: str = '',
         age_range: tuple = (20, 45),
         natal_stems: Optional[List[str]] = None,
-    ) -> List[PeriodBalance]:
-        """为指定年龄范围内的所有大运计算力场快照"""
-        results = []
-        for dayun in dayun_sequence:
-            ganzhi = dayun.get('ganzhi', '')
-            if not ganzhi or len(ganzhi) < 2:
-                stem_str = dayun.get('gan', dayun.get('stem', ''))
-                branch_str = dayun.get('zhi', dayun.get('branch', ''))
-            else:
-                stem_str = ganzhi[0]
-                branch_str = ganzhi[1]
+    ) -> PeriodArrays:
+        """
+        批量计算指定年龄范围内所有大运的力场（数组形式）
 
+        原局只编码一次，所有大运的五行增减、关系激活位、婚姻宫引动一次算出。
+        结果的 meta 为入选的大运字典（顺序同 dayun_sequence）。
+        """
+        selected, stems, branches = [], [], []
+        for dayun in dayun_sequence:
             age_display = dayun.get('age_display', dayun.get('age_range', ''))
             start_age = cls._parse_start_age(age_display, dayun)
             if start_age is not None and age_range:
                 end_age = start_age + 9
                 if start_age > age_range[1] or end_age < age_range[0]:
                     continue
+            stem_str, branch_str = split_ganzhi(dayun)
+            selected.append(dayun)
+            stems.append(stem_str)
+            branches.append(branch_str)
+
+        natal = NatalEncoding.build(
+            natal_power, natal_branches, natal_stems,
+            day_branch=day_branch, spouse_star_element=spouse_star_element,
+        )
+        return compute_period_arrays(natal, stems, branches, meta=selected)
+
+    @staticmethod
+    def _activated_relations(
+        dayun_stem: str,
+        dayun_branch: str,
+        natal_branches: List[str],
+        relation_bits: List[int],
+        natal_stems: List[str],
+        stem_transforms: List[int],
+    ) -> List[Dict[str, Any]]:
+        """由关系位还原 activated_relations 列表（与 calculate_period_balance 一致）"""
+        activated = []
+        for nb, bits in zip(natal_branches, relation_bits):
+            if bits & REL_CHONG:
+                activated.append({'type': '冲', 'branches': f'{dayun_branch}{nb}', 'severity': 'high'})
+            if bits & REL_LIUHE:
+                activated.append({'type': '合', 'branches': f'{dayun_branch}{nb}', 'severity': 'medium'})
+            if bits & REL_XING:
+                activated.append({'type': '刑', 'branches': f'{dayun_branch}{nb}', 'severity': 'high'})
+            if bits & REL_HAI:
+                activated.append({'type': '害', 'branches': f'{dayun_branch}{nb}', 'severity': 'medium'})
+        for ns, element in zip(natal_stems, stem_transforms):
+            if element >= 0:
+                activated.append({
+                    'type': '天干合',
+                    'branches': f'{dayun_stem}{ns}→{ELEMENTS[element]}',
+                    'severity': 'medium'
+                })
+        return activated
 
-            balance = cls.calculate_period_balance(
-                natal_power=natal_power,
-                natal_branches=natal_branches,
-                dayun_stem=stem_str,
-                dayun_branch=branch_str,
-                day_branch=day_branch,
-                spouse_star_element=spouse_star_element,
-                natal_stems=natal_stems,
-            )
-            balance.dayun_ganzhi = f"{stem_str}{branch_str}"
-            balance.dayun_step = dayun.get('step', 0)
-            balance.age_display = age_display
-            results.append(balance)
+    @classmethod
+    def calculate_all_dayun_balances(
+        cls,
+        natal_power: Dict[str, float],
+        natal_branches: List[str],
+        dayun_sequence: List[Dict[str, Any]],
+        day_branch: str = '',
+        spouse_star_element: str = '',
+        age_range: tuple = (20, 45),
+        natal_stems: Optional[List[str]] = None,
+    ) -> List[PeriodBalance]:
+        """为指定年龄范围内的所有大运计算力场快照"""
+        arrays = cls.calculate_dayun_arrays(
+            natal_power=natal_power,
+            natal_branches=natal_branches,
+            dayun_sequence=dayun_sequence,
+            day_branch=day_branch,
+            spouse_star_element=spouse_star_element,
+            age_range=age_range,
+            natal_stems=natal_stems,
+        )
+        natal = arrays.natal
+        # 数组一次性转为 Python 列表，避免逐元素访问 numpy 标量
+        powers, deltas = arrays.power.tolist(), arrays.delta.tolist()
+        relation_rows, transform_rows = arrays.branch_relations.tolist(), arrays.stem_transforms.tolist()
+        spouse_changes, palaces = arrays.spouse_change.tolist(), arrays.palace_activated.tolist()
 
+        results = []
+        for i, dayun in enumerate(arrays.meta):
+            stem_str, branch_str = split_ganzhi(dayun)
+            results.append(PeriodBalance(
+                dayun_ganzhi=arrays.ganzhi[i],
+                dayun_step=dayun.get('step', 0),
+                age_display=dayun.get('age_display', dayun.get('age_range', '')),
+                wuxing_power=dict(zip(ELEMENTS, powers[i])),
+                wuxing_delta=dict(zip(ELEMENTS, deltas[i])),
+                activated_relations=cls._activated_relations(
+                    stem_str, branch_str, natal.branches, relation_rows[i], natal.stems, transform_rows[i],
+                ),
+                spouse_star_power_change=spouse_changes[i],
+                marriage_palace_activated=palaces[i],
+            ))
         return results
 
     @staticmethod
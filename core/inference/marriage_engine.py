@@ -14,6 +14,8 @@ from __future__ import annotations
 import logging
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+
 from core.inference.base_engine import BaseInferenceEngine
 from core.inference.models import InferenceInput, InferenceResult, CausalChain
 from core.inference.force_balancer import DynamicForceBalancer
@@ -23,6 +25,7 @@ from core.inference.quality_filter import InferenceQualityFilter, FilterConfig,
 import core.inference.condition_checkers  # noqa: F401 trigger registration
 from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS
 from core.data.relations import BRANCH_LIUHE
+from core.data.ganzhi_kernel import REL_CHONG, REL_LIUHE
 
 logger = logging.getLogger(__name__)
 
@@ -292,7 +295,7 @@ class MarriageInferenceEngine(BaseInferenceEngine):
             if inp.bazi_pillars.get(p, {}).get('stem')
         ]
 
-        balances = DynamicForceBalancer.calculate_all_dayun_balances(
+        periods = DynamicForceBalancer.calculate_dayun_arrays(
             natal_power=natal_power,
             natal_branches=natal_branches,
             dayun_sequence=inp.dayun_sequence,
@@ -302,36 +305,49 @@ class MarriageInferenceEngine(BaseInferenceEngine):
             natal_stems=natal_stems,
         )
 
-        for bal in balances:
+        # 只展开配偶星力量明显变化或婚姻宫被引动的大运
+        spouse_change = periods.spouse_change
+        notable = periods.palace_activated.copy()
+        if spouse_element:
+            notable |= (spouse_change > 1.0) | (spouse_change < -0.5)
+
+        for i in np.flatnonzero(notable):
+            dayun = periods.meta[i]
+            dayun_ganzhi = periods.ganzhi[i]
+            dayun_step = dayun.get('step', 0)
+            age_display = dayun.get('age_display', dayun.get('age_range', ''))
+            change = float(spouse_change[i])
+            palace_activated = bool(periods.palace_activated[i])
+
             effects = []
-            if bal.spouse_star_power_change > 1.0 and spouse_element:
-                effects.append(f"配偶星（{spouse_element}）力量增强{bal.spouse_star_power_change:.1f}，利于婚恋")
-            elif bal.spouse_star_power_change < -0.5 and spouse_element:
+            if change > 1.0 and spouse_element:
+                effects.append(f"配偶星（{spouse_element}）力量增强{change:.1f}，利于婚恋")
+            elif change < -0.5 and spouse_element:
                 effects.append(f"配偶星（{spouse_element}）力量减弱，感情运势偏淡")
 
-            if bal.marriage_palace_activated:
-                for rel in bal.activated_relations:
-                    if inp.day_branch in rel.get('branches', ''):
-                        rtype = rel['type']
-                        if rtype == '冲':
-                            effects.append('婚姻宫被大运地支冲动，感情或家庭有较大变化')
-                        elif rtype == '合':
-                            effects.append('婚姻宫被大运地支合动，利于缘分出现')
+            if palace_activated:
+                for nb, bits in zip(periods.natal.branches, periods.branch_relations[i]):
+                    if nb != inp.day_branch:
+                        continue
+                    if bits & REL_CHONG:
+                        effects.append('婚姻宫被大运地支冲动，感情或家庭有较大变化')
+                    if bits & REL_LIUHE:
+                        effects.append('婚姻宫被大运地支合动，利于缘分出现')
 
             if effects:
                 chains.append(CausalChain(
                     category='dynamic_balance',
-                    condition=f"第{bal.dayun_step}运 {bal.dayun_ganzhi}（{bal.age_display}）",
+                    condition=f"第{dayun_step}运 {dayun_ganzhi}（{age_display}）",
                     mechanism='大运干支加入原局后五行力量重算',
                     conclusion='；'.join(effects),
-                    time_range=bal.age_display,
+                    time_range=age_display,
                     confidence=0.75,
                     details={
-                        'dayun_ganzhi': bal.dayun_ganzhi,
-                        'step': bal.dayun_step,
-                        'wuxing_delta': bal.wuxing_delta,
-                        'spouse_power_change': bal.spouse_star_power_change,
-                        'palace_activated': bal.marriage_palace_activated,
+                        'dayun_ganzhi': dayun_ganzhi,
+                        'step': dayun_step,
+                        'wuxing_delta': periods.delta_dict(i),
+                        'spouse_power_change': change,
+                        'palace_activated': palace_activated,
                     }
                 ))
 
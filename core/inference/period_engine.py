@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大运/流年批量计算引擎（NumPy）
+
+把原局编码一次，然后用查表 + 数组运算一次性算出所有大运（约 10 步）或
+所有流年（约 100 年）的五行力量增减、地支关系激活位和婚姻宫引动标记，
+替代逐步构造 delta 字典和 activated 列表的循环。
+
+干支统一编码为下标（天干 0-9、地支 0-11），未知或缺失的干支编码为
+填充下标（天干 10、地支 12），查表结果为 0，即"无力量、无关系"。
+
+累加顺序与 DynamicForceBalancer.calculate_period_balance 逐项相加的顺序一致，
+批量结果与逐步计算的浮点值完全相同。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.data.constants import BRANCH_ELEMENTS, STEM_ELEMENTS
+from core.data.ganzhi_kernel import (
+    BRANCH_INDEX, BRANCH_POWER_VECTORS, BRANCH_RELATION_MATRIX,
+    ELEMENT_INDEX, ELEMENTS, REL_CHONG, REL_LIUHE, REL_XING,
+    STEM_INDEX, STEM_POWER_VECTORS, STEM_RELATION_MATRIX,
+)
+
+# 合化五行
+STEM_HE_TRANSFORM = {
+    ('甲', '己'): '土', ('己', '甲'): '土',
+    ('乙', '庚'): '金', ('庚', '乙'): '金',
+    ('丙', '辛'): '水', ('辛', '丙'): '水',
+    ('丁', '壬'): '木', ('壬', '丁'): '木',
+    ('戊', '癸'): '火', ('癸', '戊'): '火',
+}
+
+BRANCH_LIUHE_TRANSFORM = {
+    ('子', '丑'): '土', ('丑', '子'): '土',
+    ('寅', '亥'): '木', ('亥', '寅'): '木',
+    ('卯', '戌'): '火', ('戌', '卯'): '火',
+    ('辰', '酉'): '金', ('酉', '辰'): '金',
+    ('巳', '申'): '水', ('申', '巳'): '水',
+    ('午', '未'): '火', ('未', '午'): '火',
+}
+
+# 运限干支与原局作用时的五行增减
+CHONG_LOSS = 0.8      # 冲：被冲地支五行减损
+LIUHE_GAIN = 0.6      # 六合：合化五行增益
+XING_LOSS = 0.5       # 刑：被刑地支五行减损
+STEM_HE_GAIN = 0.5    # 天干合：合化五行增益
+
+STEM_PAD = len(STEM_INDEX)
+BRANCH_PAD = len(BRANCH_INDEX)
+NO_ELEMENT = -1
+
+# ════════════════════ 查表（模块加载时构建一次） ════════════════════
+
+
+def _power_table(vectors: Dict[str, tuple], index: Dict[str, int], pad: int) -> np.ndarray:
+    table = np.zeros((pad + 1, len(ELEMENTS)))
+    for char, i in index.items():
+        table[i] = vectors[char]
+    return table
+
+
+def _relation_table(matrix, pad: int) -> np.ndarray:
+    table = np.zeros((pad + 1, pad + 1), dtype=np.uint16)
+    table[:pad, :pad] = np.array(matrix, dtype=np.uint16)
+    return table
+
+
+def _pair_delta_table(index: Dict[str, int], pad: int, contribution) -> np.ndarray:
+    """(运限, 原局) → 五行增减向量；contribution(a, b) 返回 (五行, 数值) 或 None"""
+    table = np.zeros((pad + 1, pad + 1, len(ELEMENTS)))
+    for a, i in index.items():
+        for b, j in index.items():
+            hit = contribution(a, b)
+            if hit:
+                table[i, j, ELEMENT_INDEX[hit[0]]] = hit[1]
+    return table
+
+
+def _transform_table(transforms: Dict[tuple, str], index: Dict[str, int], pad: int) -> np.ndarray:
+    table = np.full((pad + 1, pad + 1), NO_ELEMENT, dtype=np.int8)
+    for (a, b), element in transforms.items():
+        table[index[a], index[b]] = ELEMENT_INDEX[element]
+    return table
+
+
+def _one_hot_table(elements: Dict[str, str], index: Dict[str, int], pad: int) -> np.ndarray:
+    table = np.zeros((pad + 1, len(ELEMENTS)), dtype=np.int64)
+    for char, i in index.items():
+        table[i, ELEMENT_INDEX[elements[char]]] = 1
+    return table
+
+
+STEM_POWER_TABLE = _power_table(STEM_POWER_VECTORS, STEM_INDEX, STEM_PAD)
+BRANCH_POWER_TABLE = _power_table(BRANCH_POWER_VECTORS, BRANCH_INDEX, BRANCH_PAD)
+# (天干, 地支) → 干支合计五行力量（天干 + 地支本气 + 藏干）
+GANZHI_POWER_TABLE = STEM_POWER_TABLE[:, None, :] + BRANCH_POWER_TABLE[None, :, :]
+STEM_RELATIONS = _relation_table(STEM_RELATION_MATRIX, STEM_PAD)
+BRANCH_RELATIONS = _relation_table(BRANCH_RELATION_MATRIX, BRANCH_PAD)
+# (运限地支, 日支) → 是否冲/合婚姻宫
+PALACE_ACTIVATION = (BRANCH_RELATIONS & (REL_CHONG | REL_LIUHE)) != 0
+
+CHONG_DELTA = _pair_delta_table(
+    BRANCH_INDEX, BRANCH_PAD,
+    lambda a, b: (BRANCH_ELEMENTS[b], -CHONG_LOSS)
+    if BRANCH_RELATION_MATRIX[BRANCH_INDEX[a]][BRANCH_INDEX[b]] & REL_CHONG else None,
+)
+LIUHE_DELTA = _pair_delta_table(
+    BRANCH_INDEX, BRANCH_PAD,
+    lambda a, b: (BRANCH_LIUHE_TRANSFORM[(a, b)], LIUHE_GAIN)
+    if BRANCH_RELATION_MATRIX[BRANCH_INDEX[a]][BRANCH_INDEX[b]] & REL_LIUHE
+    and (a, b) in BRANCH_LIUHE_TRANSFORM else None,
+)
+XING_DELTA = _pair_delta_table(
+    BRANCH_INDEX, BRANCH_PAD,
+    lambda a, b: (BRANCH_ELEMENTS[b], -XING_LOSS)
+    if BRANCH_RELATION_MATRIX[BRANCH_INDEX[a]][BRANCH_INDEX[b]] & REL_XING else None,
+)
+STEM_HE_DELTA = _pair_delta_table(
+    STEM_INDEX, STEM_PAD,
+    lambda a, b: (STEM_HE_TRANSFORM[(a, b)], STEM_HE_GAIN) if (a, b) in STEM_HE_TRANSFORM else None,
+)
+# (运限地支, 原局地支) → [冲, 合, 刑] 三项增减，按此顺序累加
+BRANCH_PAIR_DELTA = np.stack([CHONG_DELTA, LIUHE_DELTA, XING_DELTA], axis=2)
+STEM_HE_ELEMENT = _transform_table(STEM_HE_TRANSFORM, STEM_INDEX, STEM_PAD)
+STEM_ELEMENT_ONE_HOT = _one_hot_table(STEM_ELEMENTS, STEM_INDEX, STEM_PAD)
+BRANCH_ELEMENT_ONE_HOT = _one_hot_table(BRANCH_ELEMENTS, BRANCH_INDEX, BRANCH_PAD)
+
+for _table in (STEM_POWER_TABLE, BRANCH_POWER_TABLE, GANZHI_POWER_TABLE, STEM_RELATIONS, BRANCH_RELATIONS,
+               PALACE_ACTIVATION,
+               CHONG_DELTA, LIUHE_DELTA, XING_DELTA, BRANCH_PAIR_DELTA, STEM_HE_DELTA, STEM_HE_ELEMENT,
+               STEM_ELEMENT_ONE_HOT, BRANCH_ELEMENT_ONE_HOT):
+    _table.setflags(write=False)
+del _table
+
+
+# ════════════════════ 编码 ════════════════════
+
+
+def encode_stems(stems: Iterable[Optional[str]]) -> np.ndarray:
+    """天干序列 → 下标数组（未知为 STEM_PAD）"""
+    return np.fromiter((STEM_INDEX.get(s, STEM_PAD) if s else STEM_PAD for s in stems), dtype=np.intp)
+
+
+def encode_branches(branches: Iterable[Optional[str]]) -> np.ndarray:
+    """地支序列 → 下标数组（未知为 BRANCH_PAD）"""
+    return np.fromiter((BRANCH_INDEX.get(b, BRANCH_PAD) if b else BRANCH_PAD for b in branches), dtype=np.intp)
+
+
+def split_ganzhi(item: Dict[str, Any]) -> tuple:
+    """从大运/流年字典取出 (天干, 地支)，优先使用 ganzhi 字段"""
+    ganzhi = item.get('ganzhi', '')
+    if not ganzhi or len(ganzhi) < 2:
+        return item.get('gan', item.get('stem', '')), item.get('zhi', item.get('branch', ''))
+    return ganzhi[0], ganzhi[1]
+
+
+@dataclass
+class NatalEncoding:
+    """原局编码（每个命盘只需编码一次）"""
+    power: np.ndarray                      # (5,) 原局五行力量
+    branches: List[str]                    # 参与作用的原局地支
+    stems: List[str]                       # 参与天干合的原局天干
+    branch_index: np.ndarray               # (k,)
+    stem_index: np.ndarray                 # (m,)
+    day_branch_index: int = BRANCH_PAD
+    spouse_element_index: int = NO_ELEMENT
+
+    @classmethod
+    def build(
+        cls,
+        natal_power: Dict[str, float],
+        natal_branches: Sequence[str],
+        natal_stems: Optional[Sequence[str]] = None,
+        day_branch: str = '',
+        spouse_star_element: str = '',
+    ) -> 'NatalEncoding':
+        branches = list(natal_branches or [])
+        stems = list(natal_stems or [])
+        return cls(
+            power=np.array([natal_power.get(e, 0) for e in ELEMENTS], dtype=float),
+            branches=branches,
+            stems=stems,
+            branch_index=encode_branches(branches),
+            stem_index=encode_stems(stems),
+            day_branch_index=BRANCH_INDEX.get(day_branch, BRANCH_PAD) if day_branch else BRANCH_PAD,
+            spouse_element_index=ELEMENT_INDEX.get(spouse_star_element, NO_ELEMENT),
+        )
+
+
+@dataclass
+class PeriodArrays:
+    """一组运限（大运或流年）相对原局的批量计算结果，第 i 行对应第 i 个运限"""
+    stems: np.ndarray                      # (n,) 运限天干下标
+    branches: np.ndarray                   # (n,) 运限地支下标
+    delta: np.ndarray                      # (n, 5) 五行力量增减（列顺序同 ELEMENTS）
+    power: np.ndarray                      # (n, 5) 加入运限后的五行力量（不小于 0）
+    branch_relations: np.ndarray           # (n, k) 运限地支对各原局地支的关系位
+    stem_transforms: np.ndarray            # (n, m) 运限天干与各原局天干合化的五行下标（-1 表示不合）
+    palace_activated: np.ndarray           # (n,) 运限地支冲/合日支
+    spouse_change: np.ndarray              # (n,) 配偶星五行的增减
+    natal: NatalEncoding
+    ganzhi: List[str] = field(default_factory=list)           # 每个运限的干支文字
+    meta: List[Dict[str, Any]] = field(default_factory=list)  # 每个运限的原始字典（可选）
+
+    def __len__(self) -> int:
+        return len(self.stems)
+
+    def delta_dict(self, i: int) -> Dict[str, float]:
+        return dict(zip(ELEMENTS, self.delta[i].tolist()))
+
+    def power_dict(self, i: int) -> Dict[str, float]:
+        return dict(zip(ELEMENTS, self.power[i].tolist()))
+
+
+def compute_period_arrays(
+    natal: NatalEncoding,
+    stems: Iterable[Optional[str]],
+    branches: Iterable[Optional[str]],
+    meta: Optional[List[Dict[str, Any]]] = None,
+) -> PeriodArrays:
+    """
+    批量计算运限干支加入原局后的五行力量变化与关系激活
+
+    Args:
+        natal: 原局编码
+        stems / branches: 运限干支序列（等长）
+        meta: 与运限一一对应的原始字典，原样保存在结果中
+    """
+    stems, branches = list(stems), list(branches)
+    stem_idx = encode_stems(stems)
+    branch_idx = encode_branches(branches)
+
+    n = len(stem_idx)
+
+    # 各项增减排成 (n, 项数, 5)：干支本身 → 逐个原局地支的 冲/合/刑 → 逐个原局天干的合化，
+    # 沿第 1 轴顺序求和，与逐步计算的浮点结果一致
+    terms = np.concatenate([
+        GANZHI_POWER_TABLE[stem_idx, branch_idx][:, None, :],
+        BRANCH_PAIR_DELTA[branch_idx[:, None], natal.branch_index[None, :]].reshape(n, 3 * len(natal.branch_index), len(ELEMENTS)),
+        STEM_HE_DELTA[stem_idx[:, None], natal.stem_index[None, :]],
+    ], axis=1)
+    delta = terms.sum(axis=1)
+
+    branch_relations = BRANCH_RELATIONS[branch_idx[:, None], natal.branch_index[None, :]]
+    stem_transforms = STEM_HE_ELEMENT[stem_idx[:, None], natal.stem_index[None, :]]
+    palace = PALACE_ACTIVATION[branch_idx, natal.day_branch_index]
+    if natal.spouse_element_index == NO_ELEMENT:
+        spouse_change = np.zeros(n)
+    else:
+        spouse_change = delta[:, natal.spouse_element_index].copy()
+
+    return PeriodArrays(
+        stems=stem_idx,
+        branches=branch_idx,
+        delta=delta,
+        power=np.maximum(natal.power + delta, 0.0),
+        branch_relations=branch_relations,
+        stem_transforms=stem_transforms,
+        palace_activated=palace,
+        spouse_change=spouse_change,
+        natal=natal,
+        ganzhi=[f"{s or ''}{b or ''}" for s, b in zip(stems, branches)],
+        meta=list(meta) if meta is not None else [],
+    )
+
+
+def ten_god_offsets(day_stem: str, stems: Iterable[Optional[str]]) -> np.ndarray:
+    """
+    批量计算天干相对日主的十神序号（0 比肩 … 9 正印，与天干序差 mod 10 对应）；
+    日主或目标天干未知时为 -1
+    """
+    stem_idx = encode_stems(stems)
+    day_idx = STEM_INDEX.get(day_stem, STEM_PAD) if day_stem else STEM_PAD
+    if day_idx == STEM_PAD:
+        return np.full(len(stem_idx), -1, dtype=np.intp)
+    return np.where(stem_idx == STEM_PAD, -1, (stem_idx - day_idx) % 10)
+
+
+def element_counts(stems: Iterable[Optional[str]], branches: Iterable[Optional[str]]) -> np.ndarray:
+    """批量统计干支五行个数（天干、地支本气各计 1），返回 (n, 5) 整数数组"""
+    stem_idx = encode_stems(stems)
+    branch_idx = encode_branches(branches)
+    return STEM_ELEMENT_ONE_HOT[stem_idx] + BRANCH_ELEMENT_ONE_HOT[branch_idx]
+
+
+__all__ = [
+    'STEM_HE_TRANSFORM', 'BRANCH_LIUHE_TRANSFORM',
+    'CHONG_LOSS', 'LIUHE_GAIN', 'XING_LOSS', 'STEM_HE_GAIN',
+    'STEM_PAD', 'BRANCH_PAD', 'NO_ELEMENT',
+    'STEM_POWER_TABLE', 'BRANCH_POWER_TABLE', 'GANZHI_POWER_TABLE',
+    'STEM_RELATIONS', 'BRANCH_RELATIONS', 'PALACE_ACTIVATION',
+    'encode_stems', 'encode_branches', 'split_ganzhi',
+    'NatalEncoding', 'PeriodArrays', 'compute_period_arrays',
+    'ten_god_offsets', 'element_counts',
+]
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# NO CHECKED-IN PROTOBUF GENCODE
 # source: bazi_core.proto
-# Protobuf Python Version: 5.29.0
+# Protobuf Python Version: 4.25.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -15,49 +14,77 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x62\x61zi_core.proto\x12\tbazi.core\"I\n\x0f\x42\x61ziCoreRequest\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\"&\n\x06Pillar\x12\x0c\n\x04stem\x18\x01 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x02 \x01(\t\"S\n\x0cPillarDetail\x12\x11\n\tmain_star\x18\x01 \x01(\t\x12\r\n\x05nayin\x18\x02 \x01(\t\x12\x10\n\x08kongwang\x18\x03 \x01(\t\x12\x0f\n\x07\x64\x65ities\x18\x04 \x03(\t\"\xa4\x07\n\x10\x42\x61ziCoreResponse\x12>\n\nbasic_info\x18\x01 \x03(\x0b\x32*.bazi.core.BaziCoreResponse.BasicInfoEntry\x12&\n\x0byear_pillar\x18\x02 \x01(\x0b\x32\x11.bazi.core.Pillar\x12\'\n\x0cmonth_pillar\x18\x03 \x01(\x0b\x32\x11.bazi.core.Pillar\x12%\n\nday_pillar\x18\x04 \x01(\x0b\x32\x11.bazi.core.Pillar\x12&\n\x0bhour_pillar\x18\x05 \x01(\x0b\x32\x11.bazi.core.Pillar\x12\x39\n\x07\x64\x65tails\x18\x06 \x03(\x0b\x32(.bazi.core.BaziCoreResponse.DetailsEntry\x12\x45\n\x0eten_gods_stats\x18\x07 \x03(\x0b\x32-.bazi.core.BaziCoreResponse.TenGodsStatsEntry\x12;\n\x08\x65lements\x18\x08 \x03(\x0b\x32).bazi.core.BaziCoreResponse.ElementsEntry\x12\x46\n\x0e\x65lement_counts\x18\t \x03(\x0b\x32..bazi.core.BaziCoreResponse.ElementCountsEntry\x12\x45\n\rrelationships\x18\n \x03(\x0b\x32..bazi.core.BaziCoreResponse.RelationshipsEntry\x12\x15\n\rmetadata_json\x18\x0b \x01(\t\x1a\x30\n\x0e\x42\x61sicInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1aG\n\x0c\x44\x65tailsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.bazi.core.PillarDetail:\x02\x38\x01\x1a\x33\n\x11TenGodsStatsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a/\n\rElementsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x34\n\x12\x45lementCountsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\x1a\x34\n\x12RelationshipsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x14\n\x12HealthCheckRequest\"%\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xa9\x01\n\x0f\x42\x61ziCoreService\x12H\n\rCalculateBazi\x12\x1a.bazi.core.BaziCoreRequest\x1a\x1b.bazi.core.BaziCoreResponse\x12L\n\x0bHealthCheck\x12\x1d.bazi.core.HealthCheckRequest\x1a\x1e.bazi.core.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x62\x61zi_core.proto\x12\tbazi.core\"a\n\x0f\x42\x61ziCoreRequest\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x16\n\x0eschema_version\x18\x04 \x01(\r\"&\n\x06Pillar\x12\x0c\n\x04stem\x18\x01 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x02 \x01(\t\"\xbe\x01\n\x0cPillarDetail\x12\x11\n\tmain_star\x18\x01 \x01(\t\x12\r\n\x05nayin\x18\x02 \x01(\t\x12\x10\n\x08kongwang\x18\x03 \x01(\t\x12\x0f\n\x07\x64\x65ities\x18\x04 \x03(\t\x12\x14\n\x0chidden_stars\x18\x05 \x03(\t\x12\x11\n\tsub_stars\x18\x06 \x03(\t\x12\x14\n\x0chidden_stems\x18\x07 \x03(\t\x12\x14\n\x0cstar_fortune\x18\x08 \x01(\t\x12\x14\n\x0cself_sitting\x18\t \x01(\t\"r\n\tLunarDate\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\r\n\x05month\x18\x02 \x01(\x05\x12\x0b\n\x03\x64\x61y\x18\x03 \x01(\x05\x12\x12\n\nmonth_name\x18\x04 \x01(\t\x12\x10\n\x08\x64\x61y_name\x18\x05 \x01(\t\x12\x15\n\ris_leap_month\x18\x06 \x01(\x08\"\xef\x01\n\tBasicInfo\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x1b\n\x13\x61\x64justed_solar_date\x18\x03 \x01(\t\x12\x1b\n\x13\x61\x64justed_solar_time\x18\x04 \x01(\t\x12(\n\nlunar_date\x18\x05 \x01(\x0b\x32\x14.bazi.core.LunarDate\x12\x0e\n\x06gender\x18\x06 \x01(\t\x12\x1a\n\x12is_zi_shi_adjusted\x18\x07 \x01(\x08\x12\x19\n\x0c\x63urrent_time\x18\x08 \x01(\tH\x00\x88\x01\x01\x42\x0f\n\r_current_time\"\x90\x01\n\x0b\x43hartPillar\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04stem\x18\x02 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\'\n\x06\x64\x65tail\x18\x04 \x01(\x0b\x32\x17.bazi.core.PillarDetail\x12\x14\n\x0cstem_element\x18\x05 \x01(\t\x12\x16\n\x0e\x62ranch_element\x18\x06 \x01(\t\")\n\nNamedCount\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"R\n\x0bTenGodCount\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12&\n\x07pillars\x18\x03 \x03(\x0b\x32\x15.bazi.core.NamedCount\"A\n\x0bTenGodGroup\x12\x0c\n\x04name\x18\x01 \x01(\t\x12$\n\x04gods\x18\x02 \x03(\x0b\x32\x16.bazi.core.TenGodCount\"(\n\nStringPair\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\"Q\n\x0ePillarRelation\x12\x0f\n\x07pillars\x18\x01 \x03(\t\x12\r\n\x05stems\x18\x02 \x03(\t\x12\x10\n\x08\x62ranches\x18\x03 \x03(\t\x12\r\n\x05group\x18\x04 \x03(\t\"E\n\x0bPillarLinks\x12\x0c\n\x04year\x18\x01 \x03(\t\x12\r\n\x05month\x18\x02 \x03(\t\x12\x0b\n\x03\x64\x61y\x18\x03 \x03(\t\x12\x0c\n\x04hour\x18\x04 \x03(\t\"[\n\rStemRelations\x12%\n\x02he\x18\x01 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12#\n\x03map\x18\x02 \x01(\x0b\x32\x16.bazi.core.PillarLinks\"\xd0\x01\n\x11\x42ranchRelationMap\x12%\n\x05liuhe\x18\x01 \x01(\x0b\x32\x16.bazi.core.PillarLinks\x12%\n\x05\x63hong\x18\x02 \x01(\x0b\x32\x16.bazi.core.PillarLinks\x12$\n\x04xing\x18\x03 \x01(\x0b\x32\x16.bazi.core.PillarLinks\x12#\n\x03hai\x18\x04 \x01(\x0b\x32\x16.bazi.core.PillarLinks\x12\"\n\x02po\x18\x05 \x01(\x0b\x32\x16.bazi.core.PillarLinks\"\xdd\x02\n\x0f\x42ranchRelations\x12(\n\x05liuhe\x18\x01 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12(\n\x05\x63hong\x18\x02 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12\'\n\x04xing\x18\x03 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12&\n\x03hai\x18\x04 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12%\n\x02po\x18\x05 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12)\n\x03map\x18\x06 \x01(\x0b\x32\x1c.bazi.core.BranchRelationMap\x12(\n\x05sanhe\x18\x07 \x03(\x0b\x32\x19.bazi.core.PillarRelation\x12)\n\x06sanhui\x18\x08 \x03(\x0b\x32\x19.bazi.core.PillarRelation\"\xa9\x01\n\rRelationships\x12\x30\n\x11\x65lement_relations\x18\x01 \x03(\x0b\x32\x15.bazi.core.StringPair\x12\x30\n\x0estem_relations\x18\x02 \x01(\x0b\x32\x18.bazi.core.StemRelations\x12\x34\n\x10\x62ranch_relations\x18\x03 \x01(\x0b\x32\x1a.bazi.core.BranchRelations\"\xee\x01\n\tBaziChart\x12(\n\nbasic_info\x18\x01 \x01(\x0b\x32\x14.bazi.core.BasicInfo\x12\'\n\x07pillars\x18\x02 \x03(\x0b\x32\x16.bazi.core.ChartPillar\x12.\n\x0eten_gods_stats\x18\x03 \x03(\x0b\x32\x16.bazi.core.TenGodGroup\x12-\n\x0e\x65lement_counts\x18\x04 \x03(\x0b\x32\x15.bazi.core.NamedCount\x12/\n\rrelationships\x18\x05 \x01(\x0b\x32\x18.bazi.core.Relationships\"\xe1\x07\n\x10\x42\x61ziCoreResponse\x12>\n\nbasic_info\x18\x01 \x03(\x0b\x32*.bazi.core.BaziCoreResponse.BasicInfoEntry\x12&\n\x0byear_pillar\x18\x02 \x01(\x0b\x32\x11.bazi.core.Pillar\x12\'\n\x0cmonth_pillar\x18\x03 \x01(\x0b\x32\x11.bazi.core.Pillar\x12%\n\nday_pillar\x18\x04 \x01(\x0b\x32\x11.bazi.core.Pillar\x12&\n\x0bhour_pillar\x18\x05 \x01(\x0b\x32\x11.bazi.core.Pillar\x12\x39\n\x07\x64\x65tails\x18\x06 \x03(\x0b\x32(.bazi.core.BaziCoreResponse.DetailsEntry\x12\x45\n\x0eten_gods_stats\x18\x07 \x03(\x0b\x32-.bazi.core.BaziCoreResponse.TenGodsStatsEntry\x12;\n\x08\x65lements\x18\x08 \x03(\x0b\x32).bazi.core.BaziCoreResponse.ElementsEntry\x12\x46\n\x0e\x65lement_counts\x18\t \x03(\x0b\x32..bazi.core.BaziCoreResponse.ElementCountsEntry\x12\x45\n\rrelationships\x18\n \x03(\x0b\x32..bazi.core.BaziCoreResponse.RelationshipsEntry\x12\x15\n\rmetadata_json\x18\x0b \x01(\t\x12\x16\n\x0eschema_version\x18\x0c \x01(\r\x12#\n\x05\x63hart\x18\r \x01(\x0b\x32\x14.bazi.core.BaziChart\x1a\x30\n\x0e\x42\x61sicInfoEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1aG\n\x0c\x44\x65tailsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12&\n\x05value\x18\x02 \x01(\x0b\x32\x17.bazi.core.PillarDetail:\x02\x38\x01\x1a\x33\n\x11TenGodsStatsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a/\n\rElementsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x34\n\x12\x45lementCountsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x05:\x02\x38\x01\x1a\x34\n\x12RelationshipsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x14\n\x12HealthCheckRequest\"%\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xa9\x01\n\x0f\x42\x61ziCoreService\x12H\n\rCalculateBazi\x12\x1a.bazi.core.BaziCoreRequest\x1a\x1b.bazi.core.BaziCoreResponse\x12L\n\x0bHealthCheck\x12\x1d.bazi.core.HealthCheckRequest\x1a\x1e.bazi.core.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'bazi_core_pb2', _globals)
-if not _descriptor._USE_C_DESCRIPTORS:
-  DESCRIPTOR._loaded_options = None
-  _globals['_BAZICORERESPONSE_BASICINFOENTRY']._loaded_options = None
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_BAZICORERESPONSE_BASICINFOENTRY']._options = None
   _globals['_BAZICORERESPONSE_BASICINFOENTRY']._serialized_options = b'8\001'
-  _globals['_BAZICORERESPONSE_DETAILSENTRY']._loaded_options = None
+  _globals['_BAZICORERESPONSE_DETAILSENTRY']._options = None
   _globals['_BAZICORERESPONSE_DETAILSENTRY']._serialized_options = b'8\001'
-  _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._loaded_options = None
+  _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._options = None
   _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._serialized_options = b'8\001'
-  _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._loaded_options = None
+  _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._options = None
   _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._serialized_options = b'8\001'
-  _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._loaded_options = None
+  _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._options = None
   _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._serialized_options = b'8\001'
-  _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._loaded_options = None
+  _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._options = None
   _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._serialized_options = b'8\001'
   _globals['_BAZICOREREQUEST']._serialized_start=30
-  _globals['_BAZICOREREQUEST']._serialized_end=103
-  _globals['_PILLAR']._serialized_start=105
-  _globals['_PILLAR']._serialized_end=143
-  _globals['_PILLARDETAIL']._serialized_start=145
-  _globals['_PILLARDETAIL']._serialized_end=228
-  _globals['_BAZICORERESPONSE']._serialized_start=231
-  _globals['_BAZICORERESPONSE']._serialized_end=1163
-  _globals['_BAZICORERESPONSE_BASICINFOENTRY']._serialized_start=832
-  _globals['_BAZICORERESPONSE_BASICINFOENTRY']._serialized_end=880
-  _globals['_BAZICORERESPONSE_DETAILSENTRY']._serialized_start=882
-  _globals['_BAZICORERESPONSE_DETAILSENTRY']._serialized_end=953
-  _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._serialized_start=955
-  _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._serialized_end=1006
-  _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._serialized_start=1008
-  _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._serialized_end=1055
-  _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._serialized_start=1057
-  _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._serialized_end=1109
-  _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._serialized_start=1111
-  _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._serialized_end=1163
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=1165
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=1185
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=1187
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=1224
-  _globals['_BAZICORESERVICE']._serialized_start=1227
-  _globals['_BAZICORESERVICE']._serialized_end=1396
+  _globals['_BAZICOREREQUEST']._serialized_end=127
+  _globals['_PILLAR']._serialized_start=129
+  _globals['_PILLAR']._serialized_end=167
+  _globals['_PILLARDETAIL']._serialized_start=170
+  _globals['_PILLARDETAIL']._serialized_end=360
+  _globals['_LUNARDATE']._serialized_start=362
+  _globals['_LUNARDATE']._serialized_end=476
+  _globals['_BASICINFO']._serialized_start=479
+  _globals['_BASICINFO']._serialized_end=718
+  _globals['_CHARTPILLAR']._serialized_start=721
+  _globals['_CHARTPILLAR']._serialized_end=865
+  _globals['_NAMEDCOUNT']._serialized_start=867
+  _globals['_NAMEDCOUNT']._serialized_end=908
+  _globals['_TENGODCOUNT']._serialized_start=910
+  _globals['_TENGODCOUNT']._serialized_end=992
+  _globals['_TENGODGROUP']._serialized_start=994
+  _globals['_TENGODGROUP']._serialized_end=1059
+  _globals['_STRINGPAIR']._serialized_start=1061
+  _globals['_STRINGPAIR']._serialized_end=1101
+  _globals['_PILLARRELATION']._serialized_start=1103
+  _globals['_PILLARRELATION']._serialized_end=1184
+  _globals['_PILLARLINKS']._serialized_start=1186
+  _globals['_PILLARLINKS']._serialized_end=1255
+  _globals['_STEMRELATIONS']._serialized_start=1257
+  _globals['_STEMRELATIONS']._serialized_end=1348
+  _globals['_BRANCHRELATIONMAP']._serialized_start=1351
+  _globals['_BRANCHRELATIONMAP']._serialized_end=1559
+  _globals['_BRANCHRELATIONS']._serialized_start=1562
+  _globals['_BRANCHRELATIONS']._serialized_end=1911
+  _globals['_RELATIONSHIPS']._serialized_start=1914
+  _globals['_RELATIONSHIPS']._serialized_end=2083
+  _globals['_BAZICHART']._serialized_start=2086
+  _globals['_BAZICHART']._serialized_end=2324
+  _globals['_BAZICORERESPONSE']._serialized_start=2327
+  _globals['_BAZICORERESPONSE']._serialized_end=3320
+  _globals['_BAZICORERESPONSE_BASICINFOENTRY']._serialized_start=2989
+  _globals['_BAZICORERESPONSE_BASICINFOENTRY']._serialized_end=3037
+  _globals['_BAZICORERESPONSE_DETAILSENTRY']._serialized_start=3039
+  _globals['_BAZICORERESPONSE_DETAILSENTRY']._serialized_end=3110
+  _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._serialized_start=3112
+  _globals['_BAZICORERESPONSE_TENGODSSTATSENTRY']._serialized_end=3163
+  _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._serialized_start=3165
+  _globals['_BAZICORERESPONSE_ELEMENTSENTRY']._serialized_end=3212
+  _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._serialized_start=3214
+  _globals['_BAZICORERESPONSE_ELEMENTCOUNTSENTRY']._serialized_end=3266
+  _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._serialized_start=3268
+  _globals['_BAZICORERESPONSE_RELATIONSHIPSENTRY']._serialized_end=3320
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=3322
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=3342
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=3344
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=3381
+  _globals['_BAZICORESERVICE']._serialized_start=3384
+  _globals['_BAZICORESERVICE']._serialized_end=3553
 # @@protoc_insertion_point(module_scope)
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# NO CHECKED-IN PROTOBUF GENCODE
 # source: bazi_fortune.proto
-# Protobuf Python Version: 5.29.0
+# Protobuf Python Version: 4.25.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -13,23 +12,52 @@ from google.protobuf.internal import builder as _builder
 _sym_db = _symbol_database.Default()
 
 
+import bazi_core_pb2 as bazi__core__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12\x62\x61zi_fortune.proto\x12\x0c\x62\x61zi.fortune\"b\n\x12\x42\x61ziFortuneRequest\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x14\n\x0c\x63urrent_time\x18\x04 \x01(\t\"A\n\x13\x42\x61ziFortuneResponse\x12\x13\n\x0b\x64\x65tail_json\x18\x01 \x01(\t\x12\x15\n\rmetadata_json\x18\x02 \x01(\t\"\x14\n\x12HealthCheckRequest\"%\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xc6\x01\n\x12\x42\x61ziFortuneService\x12\\\n\x15\x43\x61lculateDayunLiunian\x12 .bazi.fortune.BaziFortuneRequest\x1a!.bazi.fortune.BaziFortuneResponse\x12R\n\x0bHealthCheck\x12 .bazi.fortune.HealthCheckRequest\x1a!.bazi.fortune.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12\x62\x61zi_fortune.proto\x12\x0c\x62\x61zi.fortune\x1a\x0f\x62\x61zi_core.proto\"z\n\x12\x42\x61ziFortuneRequest\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x14\n\x0c\x63urrent_time\x18\x04 \x01(\t\x12\x16\n\x0eschema_version\x18\x05 \x01(\r\"\xef\x01\n\x0cGanzhiDetail\x12\x0c\n\x04stem\x18\x01 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x02 \x01(\t\x12\x11\n\tmain_star\x18\x03 \x01(\t\x12\x14\n\x0chidden_stems\x18\x04 \x03(\t\x12\x14\n\x0chidden_stars\x18\x05 \x03(\t\x12\x14\n\x0cstar_fortune\x18\x06 \x01(\t\x12\x14\n\x0cself_sitting\x18\x07 \x01(\t\x12\x10\n\x08kongwang\x18\x08 \x01(\t\x12\r\n\x05nayin\x18\t \x01(\t\x12\x0f\n\x07\x64\x65ities\x18\n \x03(\t\x12\x16\n\tdirection\x18\x0b \x01(\tH\x00\x88\x01\x01\x42\x0c\n\n_direction\"\xc5\x02\n\nLiuyueItem\x12\r\n\x05month\x18\x01 \x01(\x05\x12\x12\n\nsolar_term\x18\x02 \x01(\t\x12\x11\n\tterm_date\x18\x03 \x01(\t\x12\x0c\n\x04stem\x18\x04 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x05 \x01(\t\x12\x14\n\x0cstem_shishen\x18\x06 \x01(\t\x12\x16\n\x0e\x62ranch_shishen\x18\x07 \x01(\t\x12\x18\n\x10shishen_combined\x18\x08 \x01(\t\x12\x11\n\tmain_star\x18\t \x01(\t\x12\x14\n\x0chidden_stems\x18\n \x03(\t\x12\x14\n\x0chidden_stars\x18\x0b \x03(\t\x12\x14\n\x0cstar_fortune\x18\x0c \x01(\t\x12\x14\n\x0cself_sitting\x18\r \x01(\t\x12\x10\n\x08kongwang\x18\x0e \x01(\t\x12\r\n\x05nayin\x18\x0f \x01(\t\x12\x0f\n\x07\x64\x65ities\x18\x10 \x03(\t\"4\n\x0fLiunianRelation\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\"\xeb\x03\n\x0bLiunianItem\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\x0b\n\x03\x61ge\x18\x02 \x01(\x05\x12\x13\n\x0b\x61ge_display\x18\x03 \x01(\t\x12\x0c\n\x04stem\x18\x04 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x05 \x01(\t\x12\x11\n\tmain_star\x18\x06 \x01(\t\x12\x14\n\x0chidden_stems\x18\x07 \x03(\t\x12\x14\n\x0chidden_stars\x18\x08 \x03(\t\x12\x14\n\x0cstar_fortune\x18\t \x01(\t\x12\x14\n\x0cself_sitting\x18\n \x01(\t\x12\x10\n\x08kongwang\x18\x0b \x01(\t\x12\r\n\x05nayin\x18\x0c \x01(\t\x12\x0f\n\x07\x64\x65ities\x18\r \x03(\t\x12\x14\n\x0cstem_shishen\x18\x0e \x01(\t\x12\x16\n\x0e\x62ranch_shishen\x18\x0f \x01(\t\x12\x18\n\x10shishen_combined\x18\x10 \x01(\t\x12\x31\n\x0fliuyue_sequence\x18\x11 \x03(\x0b\x32\x18.bazi.fortune.LiuyueItem\x12\x30\n\trelations\x18\x12 \x03(\x0b\x32\x1d.bazi.fortune.LiunianRelation\x12\x16\n\x0exiaoyun_ganzhi\x18\x13 \x01(\t\x12\x14\n\x0cxiaoyun_stem\x18\x14 \x01(\t\x12\x16\n\x0exiaoyun_branch\x18\x15 \x01(\t\"&\n\x08\x41geRange\x12\r\n\x05start\x18\x01 \x01(\x05\x12\x0b\n\x03\x65nd\x18\x02 \x01(\x05\"*\n\nYearGanzhi\x12\x0c\n\x04year\x18\x01 \x01(\x05\x12\x0e\n\x06ganzhi\x18\x02 \x01(\t\"\x91\x04\n\tDayunItem\x12\x0c\n\x04step\x18\x01 \x01(\x05\x12\x0c\n\x04stem\x18\x02 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\x17\n\nis_xiaoyun\x18\x04 \x01(\x08H\x00\x88\x01\x01\x12\x11\n\tmain_star\x18\x05 \x01(\t\x12\x14\n\x0chidden_stems\x18\x06 \x03(\t\x12\x14\n\x0chidden_stars\x18\x07 \x03(\t\x12\x14\n\x0cstar_fortune\x18\x08 \x01(\t\x12\x14\n\x0cself_sitting\x18\t \x01(\t\x12\x10\n\x08kongwang\x18\n \x01(\t\x12\r\n\x05nayin\x18\x0b \x01(\t\x12\x0f\n\x07\x64\x65ities\x18\x0c \x03(\t\x12\x14\n\x0cstem_shishen\x18\r \x01(\t\x12\x16\n\x0e\x62ranch_shishen\x18\x0e \x01(\t\x12\x18\n\x10shishen_combined\x18\x0f \x01(\t\x12\x13\n\x0b\x61ge_display\x18\x10 \x01(\t\x12)\n\tage_range\x18\x11 \x01(\x0b\x32\x16.bazi.fortune.AgeRange\x12\x12\n\nyear_start\x18\x12 \x01(\x05\x12\x10\n\x08year_end\x18\x13 \x01(\x05\x12\x30\n\x0eliunian_simple\x18\x14 \x03(\x0b\x32\x18.bazi.fortune.YearGanzhi\x12\x33\n\x10liunian_sequence\x18\x15 \x03(\x0b\x32\x19.bazi.fortune.LiunianItemB\r\n\x0b_is_xiaoyun\"X\n\x05Qiyun\x12\r\n\x05years\x18\x01 \x01(\x05\x12\x0e\n\x06months\x18\x02 \x01(\x05\x12\x0c\n\x04\x64\x61ys\x18\x03 \x01(\x05\x12\r\n\x05hours\x18\x04 \x01(\x05\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\"e\n\x07Jiaoyun\x12\r\n\x05stems\x18\x01 \x03(\t\x12\x0e\n\x06\x62ranch\x18\x02 \x01(\t\x12\x12\n\nsolar_term\x18\x03 \x01(\t\x12\x12\n\ndays_after\x18\x04 \x01(\x05\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\"\x8c\x02\n\tDayunInfo\x12\x31\n\rcurrent_dayun\x18\x01 \x01(\x0b\x32\x1a.bazi.fortune.GanzhiDetail\x12.\n\nnext_dayun\x18\x02 \x01(\x0b\x32\x1a.bazi.fortune.GanzhiDetail\x12\x12\n\nqiyun_date\x18\x03 \x01(\t\x12\x11\n\tqiyun_age\x18\x04 \x01(\t\x12\"\n\x05qiyun\x18\x05 \x01(\x0b\x32\x13.bazi.fortune.Qiyun\x12\x14\n\x0cjiaoyun_date\x18\x06 \x01(\t\x12\x13\n\x0bjiaoyun_age\x18\x07 \x01(\t\x12&\n\x07jiaoyun\x18\x08 \x01(\x0b\x32\x15.bazi.fortune.Jiaoyun\"J\n\tLiuriItem\x12\x0c\n\x04\x64\x61te\x18\x01 \x01(\t\x12\x0c\n\x04stem\x18\x02 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\x11\n\tmain_star\x18\x04 \x01(\t\"K\n\nLiushiItem\x12\x0c\n\x04time\x18\x01 \x01(\t\x12\x0c\n\x04stem\x18\x02 \x01(\t\x12\x0e\n\x06\x62ranch\x18\x03 \x01(\t\x12\x11\n\tmain_star\x18\x04 \x01(\t\"h\n\x0e\x43urrentContext\x12\x13\n\x0b\x64\x61yun_index\x18\x01 \x01(\x05\x12\x15\n\rselected_year\x18\x02 \x01(\x05\x12\x12\n\nyear_index\x18\x03 \x01(\x05\x12\x16\n\x0eselected_month\x18\x04 \x01(\x05\"\xc7\x03\n\rFortuneDetail\x12#\n\x05\x63hart\x18\x01 \x01(\x0b\x32\x14.bazi.core.BaziChart\x12+\n\ndayun_info\x18\x02 \x01(\x0b\x32\x17.bazi.fortune.DayunInfo\x12\x33\n\x0f\x63urrent_liunian\x18\x03 \x01(\x0b\x32\x1a.bazi.fortune.GanzhiDetail\x12\x30\n\x0cnext_liunian\x18\x04 \x01(\x0b\x32\x1a.bazi.fortune.GanzhiDetail\x12/\n\x0e\x64\x61yun_sequence\x18\x05 \x03(\x0b\x32\x17.bazi.fortune.DayunItem\x12\x31\n\x0fliuyue_sequence\x18\x06 \x03(\x0b\x32\x18.bazi.fortune.LiuyueItem\x12/\n\x0eliuri_sequence\x18\x07 \x03(\x0b\x32\x17.bazi.fortune.LiuriItem\x12\x31\n\x0fliushi_sequence\x18\x08 \x03(\x0b\x32\x18.bazi.fortune.LiushiItem\x12\x35\n\x0f\x63urrent_context\x18\t \x01(\x0b\x32\x1c.bazi.fortune.CurrentContext\"\x86\x01\n\x13\x42\x61ziFortuneResponse\x12\x13\n\x0b\x64\x65tail_json\x18\x01 \x01(\t\x12\x15\n\rmetadata_json\x18\x02 \x01(\t\x12\x16\n\x0eschema_version\x18\x03 \x01(\r\x12+\n\x06\x64\x65tail\x18\x04 \x01(\x0b\x32\x1b.bazi.fortune.FortuneDetail\"\x14\n\x12HealthCheckRequest\"%\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xc6\x01\n\x12\x42\x61ziFortuneService\x12\\\n\x15\x43\x61lculateDayunLiunian\x12 .bazi.fortune.BaziFortuneRequest\x1a!.bazi.fortune.BaziFortuneResponse\x12R\n\x0bHealthCheck\x12 .bazi.fortune.HealthCheckRequest\x1a!.bazi.fortune.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'bazi_fortune_pb2', _globals)
-if not _descriptor._USE_C_DESCRIPTORS:
-  DESCRIPTOR._loaded_options = None
-  _globals['_BAZIFORTUNEREQUEST']._serialized_start=36
-  _globals['_BAZIFORTUNEREQUEST']._serialized_end=134
-  _globals['_BAZIFORTUNERESPONSE']._serialized_start=136
-  _globals['_BAZIFORTUNERESPONSE']._serialized_end=201
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=203
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=223
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=225
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=262
-  _globals['_BAZIFORTUNESERVICE']._serialized_start=265
-  _globals['_BAZIFORTUNESERVICE']._serialized_end=463
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_BAZIFORTUNEREQUEST']._serialized_start=53
+  _globals['_BAZIFORTUNEREQUEST']._serialized_end=175
+  _globals['_GANZHIDETAIL']._serialized_start=178
+  _globals['_GANZHIDETAIL']._serialized_end=417
+  _globals['_LIUYUEITEM']._serialized_start=420
+  _globals['_LIUYUEITEM']._serialized_end=745
+  _globals['_LIUNIANRELATION']._serialized_start=747
+  _globals['_LIUNIANRELATION']._serialized_end=799
+  _globals['_LIUNIANITEM']._serialized_start=802
+  _globals['_LIUNIANITEM']._serialized_end=1293
+  _globals['_AGERANGE']._serialized_start=1295
+  _globals['_AGERANGE']._serialized_end=1333
+  _globals['_YEARGANZHI']._serialized_start=1335
+  _globals['_YEARGANZHI']._serialized_end=1377
+  _globals['_DAYUNITEM']._serialized_start=1380
+  _globals['_DAYUNITEM']._serialized_end=1909
+  _globals['_QIYUN']._serialized_start=1911
+  _globals['_QIYUN']._serialized_end=1999
+  _globals['_JIAOYUN']._serialized_start=2001
+  _globals['_JIAOYUN']._serialized_end=2102
+  _globals['_DAYUNINFO']._serialized_start=2105
+  _globals['_DAYUNINFO']._serialized_end=2373
+  _globals['_LIURIITEM']._serialized_start=2375
+  _globals['_LIURIITEM']._serialized_end=2449
+  _globals['_LIUSHIITEM']._serialized_start=2451
+  _globals['_LIUSHIITEM']._serialized_end=2526
+  _globals['_CURRENTCONTEXT']._serialized_start=2528
+  _globals['_CURRENTCONTEXT']._serialized_end=2632
+  _globals['_FORTUNEDETAIL']._serialized_start=2635
+  _globals['_FORTUNEDETAIL']._serialized_end=3090
+  _globals['_BAZIFORTUNERESPONSE']._serialized_start=3093
+  _globals['_BAZIFORTUNERESPONSE']._serialized_end=3227
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=3229
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=3249
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=3251
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=3288
+  _globals['_BAZIFORTUNESERVICE']._serialized_start=3291
+  _globals['_BAZIFORTUNESERVICE']._serialized_end=3489
 # @@protoc_insertion_point(module_scope)
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
-# NO CHECKED-IN PROTOBUF GENCODE
 # source: bazi_rule.proto
-# Protobuf Python Version: 5.29.0
+# Protobuf Python Version: 4.25.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -15,21 +14,25 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x62\x61zi_rule.proto\x12\tbazi.rule\"u\n\x14\x42\x61ziRuleMatchRequest\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x12\n\nrule_types\x18\x04 \x03(\t\x12\x11\n\tuse_cache\x18\x05 \x01(\x08\"r\n\x15\x42\x61ziRuleMatchResponse\x12\x14\n\x0cmatched_json\x18\x01 \x01(\t\x12\x16\n\x0eunmatched_json\x18\x02 \x01(\t\x12\x14\n\x0c\x63ontext_json\x18\x03 \x01(\t\x12\x15\n\rmetadata_json\x18\x04 \x01(\t\"\x14\n\x12HealthCheckRequest\"%\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xb0\x01\n\x0f\x42\x61ziRuleService\x12O\n\nMatchRules\x12\x1f.bazi.rule.BaziRuleMatchRequest\x1a .bazi.rule.BaziRuleMatchResponse\x12L\n\x0bHealthCheck\x12\x1d.bazi.rule.HealthCheckRequest\x1a\x1e.bazi.rule.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x62\x61zi_rule.proto\x12\tbazi.rule\"\x8d\x01\n\x14\x42\x61ziRuleMatchRequest\x12\x12\n\nsolar_date\x18\x01 \x01(\t\x12\x12\n\nsolar_time\x18\x02 \x01(\t\x12\x0e\n\x06gender\x18\x03 \x01(\t\x12\x12\n\nrule_types\x18\x04 \x03(\t\x12\x11\n\tuse_cache\x18\x05 \x01(\x08\x12\x16\n\x0eschema_version\x18\x06 \x01(\r\"^\n\x0bRuleContent\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x11\n\x04text\x18\x02 \x01(\tH\x00\x88\x01\x01\x12%\n\x05items\x18\x03 \x03(\x0b\x32\x16.bazi.rule.RuleContentB\x07\n\x05_text\"\xbb\x01\n\x0bMatchedRule\x12\x0f\n\x07rule_id\x18\x01 \x01(\t\x12\x11\n\trule_code\x18\x02 \x01(\t\x12\x11\n\trule_name\x18\x03 \x01(\t\x12\x11\n\trule_type\x18\x04 \x01(\t\x12\'\n\x07\x63ontent\x18\x05 \x01(\x0b\x32\x16.bazi.rule.RuleContent\x12\x10\n\x08priority\x18\x06 \x01(\x05\x12\x14\n\x0c\x63ontent_json\x18\x07 \x01(\t\x12\x11\n\trule_json\x18\x08 \x01(\t\"\xcc\x01\n\x15\x42\x61ziRuleMatchResponse\x12\x14\n\x0cmatched_json\x18\x01 \x01(\t\x12\x16\n\x0eunmatched_json\x18\x02 \x01(\t\x12\x14\n\x0c\x63ontext_json\x18\x03 \x01(\t\x12\x15\n\rmetadata_json\x18\x04 \x01(\t\x12\x16\n\x0eschema_version\x18\x05 \x01(\r\x12\'\n\x07matched\x18\x06 \x03(\x0b\x32\x16.bazi.rule.MatchedRule\x12\x17\n\x0funmatched_count\x18\x07 \x01(\x05\"\x14\n\x12HealthCheckRequest\"%\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xb0\x01\n\x0f\x42\x61ziRuleService\x12O\n\nMatchRules\x12\x1f.bazi.rule.BaziRuleMatchRequest\x1a .bazi.rule.BaziRuleMatchResponse\x12L\n\x0bHealthCheck\x12\x1d.bazi.rule.HealthCheckRequest\x1a\x1e.bazi.rule.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'bazi_rule_pb2', _globals)
-if not _descriptor._USE_C_DESCRIPTORS:
-  DESCRIPTOR._loaded_options = None
-  _globals['_BAZIRULEMATCHREQUEST']._serialized_start=30
-  _globals['_BAZIRULEMATCHREQUEST']._serialized_end=147
-  _globals['_BAZIRULEMATCHRESPONSE']._serialized_start=149
-  _globals['_BAZIRULEMATCHRESPONSE']._serialized_end=263
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=265
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=285
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=287
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=324
-  _globals['_BAZIRULESERVICE']._serialized_start=327
-  _globals['_BAZIRULESERVICE']._serialized_end=503
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_BAZIRULEMATCHREQUEST']._serialized_start=31
+  _globals['_BAZIRULEMATCHREQUEST']._serialized_end=172
+  _globals['_RULECONTENT']._serialized_start=174
+  _globals['_RULECONTENT']._serialized_end=268
+  _globals['_MATCHEDRULE']._serialized_start=271
+  _globals['_MATCHEDRULE']._serialized_end=458
+  _globals['_BAZIRULEMATCHRESPONSE']._serialized_start=461
+  _globals['_BAZIRULEMATCHRESPONSE']._serialized_end=665
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=667
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=687
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=689
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=726
+  _globals['_BAZIRULESERVICE']._serialized_start=729
+  _globals['_BAZIRULESERVICE']._serialized_end=905
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DynamicServicer 分发开销微基准
+
+对比三种调用方式的每次调用开销（纳秒）：
+- direct: 直接调用 Servicer 方法（下限）
+- legacy: 旧实现，每次访问属性都加锁并用 types.MethodType 重新绑定
+- dynamic: 当前实现，固定分发函数 + 无锁读取已发布的方法表
+
+每种实现分别测量两种访问方式：
+- registered: 像 gRPC 注册那样只取一次方法引用，之后反复调用
+- attribute: 每次调用都经过属性访问（ds.Method(...)）
+
+用法：
+    python scripts/dev/bench_dynamic_servicer.py [--calls 200000] [--repeat 5] [--threads 1]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import types
+from typing import Any, Callable, Dict
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.hot_reload.microservice_reloader import DynamicServicer
+
+
+class _Servicer:
+    def Calculate(self, request, context):
+        return request
+
+
+class _Reloader:
+    """只提供 DynamicServicer 需要的接口（与 MicroserviceReloader 一样取当前实例时加锁）"""
+
+    def __init__(self, servicer):
+        self._lock = threading.RLock()
+        self._servicer = servicer
+
+    def get_current_servicer(self):
+        with self._lock:
+            return self._servicer
+
+
+class LegacyDynamicServicer:
+    """改造前的实现（仅用于对比）"""
+
+    def __init__(self, reloader):
+        self._reloader = reloader
+        self._method_cache: Dict[str, Any] = {}
+        self._cache_lock = threading.RLock()
+
+    def __getattribute__(self, name: str):
+        if name.startswith('_'):
+            return object.__getattribute__(self, name)
+        reloader = object.__getattribute__(self, '_reloader')
+        method_cache = object.__getattribute__(self, '_method_cache')
+        cache_lock = object.__getattribute__(self, '_cache_lock')
+        servicer = reloader.get_current_servicer()
+        if servicer is None:
+            raise RuntimeError("Servicer 未初始化")
+        with cache_lock:
+            if name in method_cache:
+                cached_method = method_cache[name]
+                if hasattr(cached_method, '__self__') and cached_method.__self__ is servicer:
+                    return cached_method
+        attr = getattr(servicer, name)
+        if callable(attr):
+            if isinstance(attr, types.MethodType):
+                bound_method = types.MethodType(attr.__func__, servicer)
+                with cache_lock:
+                    method_cache[name] = bound_method
+                return bound_method
+            with cache_lock:
+                method_cache[name] = attr
+            return attr
+        return attr
+
+
+def _time_calls(func: Callable[[], Any], calls: int, threads: int) -> float:
+    """返回每次调用的平均耗时（纳秒，按全部线程的总调用数计算）"""
+    per_thread = calls // threads
+
+    def worker():
+        for _ in range(per_thread):
+            func()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter_ns()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return (time.perf_counter_ns() - start) / (per_thread * threads)
+
+
+def run(calls: int, repeat: int, threads: int) -> Dict[str, float]:
+    servicer = _Servicer()
+    legacy = LegacyDynamicServicer(_Reloader(servicer))
+    dynamic = DynamicServicer(_Reloader(servicer))
+    request, context = object(), None
+
+    direct_method = servicer.Calculate
+    legacy_method = legacy.Calculate
+    dynamic_method = dynamic.Calculate
+
+    cases = {
+        'direct': lambda: direct_method(request, context),
+        'legacy/registered': lambda: legacy_method(request, context),
+        'legacy/attribute': lambda: legacy.Calculate(request, context),
+        'dynamic/registered': lambda: dynamic_method(request, context),
+        'dynamic/attribute': lambda: dynamic.Calculate(request, context),
+    }
+    results = {}
+    for name, func in cases.items():
+        func()  # 预热（填充方法表）
+        results[name] = min(_time_calls(func, calls, threads) for _ in range(repeat))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="DynamicServicer 分发开销微基准")
+    parser.add_argument("--calls", type=int, default=200000, help="每轮调用次数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复轮数（取最小值）")
+    parser.add_argument("--threads", type=int, default=1, help="并发线程数")
+    args = parser.parse_args()
+
+    results = run(args.calls, args.repeat, max(args.threads, 1))
+    direct = results['direct']
+    print(f"{'case':<22}{'ns/call':>10}{'overhead':>12}")
+    for name, ns in results.items():
+        print(f"{name:<22}{ns:>10.1f}{ns - direct:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
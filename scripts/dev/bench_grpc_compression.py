@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gRPC 压缩策略基准
+
+用 bazi_fortune（CalculateDayunLiunian）和 bazi_rule（MatchRules）的真实响应大小，在回环地址上
+对比各压缩策略的每次调用耗时、CPU 时间（客户端 + 服务端同进程）和传输字节数：
+- none: 不压缩
+- gzip: 请求和响应始终 gzip（旧行为是 Channel 级 gzip）
+- adaptive: 当前默认，回环/小消息不压缩
+- adaptive-remote: 模拟跨机调用（GRPC_COMPRESS_LOCAL=true），大消息压缩
+
+用法：
+    python scripts/dev/bench_grpc_compression.py [--calls 30] [--rule-json captured_matched.json]
+
+说明：
+- bazi_fortune 响应由本地 Servicer 实际计算生成（不依赖数据库）
+- bazi_rule 需要数据库加载规则；不可用时用 --rule-json 指定抓取的 matched_json，
+  否则按线上规模（约 1500 条规则）生成同结构的模拟数据
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent import futures
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "proto", "generated"))
+
+import grpc
+
+import bazi_fortune_pb2
+import bazi_rule_pb2
+from server.utils import grpc_config
+
+MODES = {
+    "none": ("none", False),
+    "gzip": ("gzip", False),
+    "adaptive": ("adaptive", False),
+    "adaptive-remote": ("adaptive", True),
+}
+
+
+class _Context:
+    def set_code(self, *args):
+        pass
+
+    def set_details(self, *args):
+        pass
+
+    def abort(self, code, details):
+        raise RuntimeError(details)
+
+
+def _fortune_response():
+    from services.bazi_fortune.grpc_server import BaziFortuneServicer
+    request = bazi_fortune_pb2.BaziFortuneRequest(solar_date="1990-05-15", solar_time="14:30", gender="male")
+    return request, BaziFortuneServicer().CalculateDayunLiunian(request, _Context())
+
+
+def _rule_response(rule_json: str = None):
+    request = bazi_rule_pb2.BaziRuleMatchRequest(solar_date="1990-05-15", solar_time="14:30", gender="male")
+    if rule_json:
+        with open(rule_json, encoding="utf-8") as f:
+            matched_json = f.read()
+    else:
+        matched_json = ""
+        try:
+            from services.bazi_rule.grpc_server import BaziRuleServicer
+            matched_json = BaziRuleServicer().MatchRules(request, _Context()).matched_json
+        except Exception:
+            pass
+        if not matched_json or matched_json == "[]":
+            matched = [{
+                "rule_id": f"RULE_{i:05d}",
+                "rule_type": ("marriage", "wealth", "career", "health", "children")[i % 5],
+                "name": f"规则{i}：日柱与月令相合",
+                "content": {"type": "description", "text": "日主得令而旺，财星透干有根，主中年以后财运亨通，" * 3},
+                "conditions": {"all": [{"pillar": "day", "part": "stem", "in": ["甲", "乙"]}]},
+                "priority": i % 100,
+            } for i in range(1500)]
+            matched_json = json.dumps(matched, ensure_ascii=False)
+    return request, bazi_rule_pb2.BaziRuleMatchResponse(
+        matched_json=matched_json, unmatched_json='{"count": 0}', context_json="{}")
+
+
+def _bench(name, request, response, mode, compress_local, calls):
+    grpc_config.GRPC_COMPRESSION_MODE = mode
+    grpc_config.GRPC_COMPRESS_LOCAL = compress_local
+    grpc_config.is_local_target.cache_clear()
+
+    def handle(req, context):
+        return response
+
+    handler = grpc.method_handlers_generic_handler("bench.Payload", {
+        "Get": grpc.unary_unary_rpc_method_handler(
+            handle, request_deserializer=type(request).FromString,
+            response_serializer=type(response).SerializeToString),
+    })
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4),
+                         options=grpc_config.get_grpc_options_with_message_size(50),
+                         interceptors=grpc_config.get_server_interceptors())
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    address = f"localhost:{port}"
+    kwargs = {"options": grpc_config.get_grpc_options_with_message_size(50)}
+    if grpc_config.channel_compression(address) is not None:
+        kwargs["compression"] = grpc_config.channel_compression(address)
+    channel = grpc.insecure_channel(address, **kwargs)
+    call = channel.unary_unary("/bench.Payload/Get", request_serializer=type(request).SerializeToString,
+                               response_deserializer=type(response).FromString)
+    try:
+        call(request, timeout=60)  # 预热连接
+        latencies = []
+        cpu_start = time.process_time()
+        for _ in range(calls):
+            start = time.perf_counter()
+            call(request, timeout=60,
+                 compression=grpc_config.choose_compression(address, request.ByteSize(), "request"))
+            latencies.append((time.perf_counter() - start) * 1000)
+        cpu_ms = (time.process_time() - cpu_start) * 1000 / calls
+    finally:
+        channel.close()
+        server.stop(None)
+
+    compressed = grpc_config.choose_compression(address, response.ByteSize(), "response") is not None
+    return {
+        "payload": name,
+        "mode": "adaptive-remote" if compress_local else mode,
+        "p50_ms": statistics.median(latencies),
+        "mean_ms": statistics.mean(latencies),
+        "cpu_ms": cpu_ms,
+        "wire_kb": (len(gzip.compress(response.SerializeToString())) if compressed else response.ByteSize()) / 1024,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="gRPC 压缩策略基准")
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--rule-json", default=None, help="抓取的 bazi_rule matched_json 文件")
+    parser.add_argument("--modes", default=",".join(MODES), help="逗号分隔：" + ",".join(MODES))
+    args = parser.parse_args()
+
+    payloads = [("bazi_fortune", *_fortune_response()), ("bazi_rule", *_rule_response(args.rule_json))]
+    print(f"\n{'payload':<14}{'size_kb':>9}  {'mode':<16}{'p50_ms':>9}{'mean_ms':>9}{'cpu_ms':>9}{'wire_kb':>10}")
+    for name, request, response in payloads:
+        for mode_name in args.modes.split(","):
+            mode, compress_local = MODES[mode_name]
+            r = _bench(name, request, response, mode, compress_local, args.calls)
+            print(f"{name:<14}{response.ByteSize() / 1024:>9.0f}  {r['mode']:<16}{r['p50_ms']:>9.2f}"
+                  f"{r['mean_ms']:>9.2f}{r['cpu_ms']:>9.2f}{r['wire_kb']:>10.0f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gRPC 多进程（pre-fork）吞吐基准
+
+按不同工作进程数启动 CPU 密集型微服务（默认 bazi_core），用多个客户端进程压测
+CalculateBazi，输出每档 QPS、相对单进程的加速比和并行效率，验证 QPS 随核数近线性增长。
+
+用法：
+    python scripts/dev/bench_grpc_prefork.py [--service bazi_core] [--workers 1,2,4]
+        [--clients-per-worker 2] [--duration 20] [--port 19401]
+
+说明：
+- 工作进程数超过可用 CPU 数时没有意义，默认档位为 1,2,4,... 直到 CPU 数
+- 每档会重新启动服务，并在全部工作进程就绪（成功响应）后才开始计时
+- 客户端是独立进程、各自建连，连接由内核按 SO_REUSEPORT 分配到工作进程
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "proto", "generated"))
+
+SERVICES = {
+    "bazi_core": ("services/bazi_core/grpc_server.py", "/bazi.core.BaziCoreService/CalculateBazi"),
+    "bazi_compute": ("services/bazi_compute/grpc_server.py", "/bazi.core.BaziCoreService/CalculateBazi"),
+}
+
+# 每次请求换一个出生时间，避免命中进程内缓存
+_DATES = [f"{1960 + i % 50}-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(600)]
+
+
+def _make_call(port: int, method: str):
+    import grpc
+    import bazi_core_pb2
+
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    call = channel.unary_unary(
+        method,
+        request_serializer=bazi_core_pb2.BaziCoreRequest.SerializeToString,
+        response_deserializer=bazi_core_pb2.BaziCoreResponse.FromString,
+    )
+
+    def invoke(i: int):
+        request = bazi_core_pb2.BaziCoreRequest(
+            solar_date=_DATES[i % len(_DATES)], solar_time=f"{i % 24:02d}:30", gender="male"
+        )
+        return call(request, timeout=60)
+
+    return channel, invoke
+
+
+def _client(port: int, method: str, start_at: float, stop_at: float, seed: int, counter) -> None:
+    channel, invoke = _make_call(port, method)
+    done = errors = 0
+    i = seed * 7919
+    while time.time() < start_at:
+        time.sleep(0.001)
+    while time.time() < stop_at:
+        try:
+            invoke(i)
+            done += 1
+        except Exception:
+            errors += 1
+        i += 1
+    channel.close()
+    with counter.get_lock():
+        counter[0] += done
+        counter[1] += errors
+
+
+def _wait_ready(port: int, method: str, workers: int, timeout: float = 180) -> bool:
+    """等待服务可用：连续若干次新建连接都能成功响应（覆盖所有工作进程）"""
+    deadline = time.time() + timeout
+    ok = 0
+    while time.time() < deadline:
+        channel, invoke = _make_call(port, method)
+        try:
+            invoke(ok)
+            ok += 1
+            if ok >= workers * 4:
+                return True
+        except Exception:
+            ok = 0
+            time.sleep(1)
+        finally:
+            channel.close()
+    return False
+
+
+def run_level(service: str, workers: int, clients: int, duration: float, port: int) -> dict:
+    script, method = SERVICES[service]
+    env = dict(os.environ, GRPC_WORKERS=str(workers), PYTHONUNBUFFERED="1")
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(project_root, script), "--port", str(port), "--workers", str(workers)],
+        cwd=project_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not _wait_ready(port, method, workers):
+            raise RuntimeError(f"{service} (workers={workers}) 启动超时")
+        # 额外等待，确保所有工作进程都已完成初始化
+        time.sleep(3)
+        counter = multiprocessing.Array("l", 2)
+        start_at = time.time() + 1.0
+        stop_at = start_at + duration
+        procs = [
+            multiprocessing.Process(target=_client, args=(port, method, start_at, stop_at, n, counter))
+            for n in range(clients)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return {"workers": workers, "clients": clients, "requests": counter[0],
+                "errors": counter[1], "qps": counter[0] / duration}
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    default_levels = []
+    n = 1
+    while n <= cpus:
+        default_levels.append(n)
+        n *= 2
+
+    parser = argparse.ArgumentParser(description="gRPC 多进程吞吐基准")
+    parser.add_argument("--service", choices=sorted(SERVICES), default="bazi_core")
+    parser.add_argument("--workers", default=",".join(map(str, default_levels)), help="逗号分隔的工作进程数档位")
+    parser.add_argument("--clients-per-worker", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=20.0, help="每档压测时长（秒）")
+    parser.add_argument("--port", type=int, default=19401)
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.workers.split(",") if x.strip()]
+    print(f"service={args.service} cpus={cpus} levels={levels} duration={args.duration}s")
+    results = []
+    for workers in levels:
+        result = run_level(args.service, workers, workers * args.clients_per_worker, args.duration, args.port)
+        results.append(result)
+        print(f"  workers={workers:<3} clients={result['clients']:<3} qps={result['qps']:8.1f}  "
+              f"errors={result['errors']}", flush=True)
+
+    base = results[0]["qps"] / results[0]["workers"] if results and results[0]["qps"] else 0
+    print("\n workers       qps   speedup  efficiency")
+    for r in results:
+        speedup = r["qps"] / results[0]["qps"] if results[0]["qps"] else 0
+        efficiency = r["qps"] / (base * r["workers"]) if base else 0
+        print(f" {r['workers']:>7} {r['qps']:>9.1f} {speedup:>8.2f}x {efficiency:>10.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,8 @@ import uuid
 from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator, Dict, Optional
 
+from server.utils.stream_inflight import collect_stream_text, get_inflight_registry, stream_completed
+
 logger = logging.getLogger(__name__)
 
 
@@ -290,7 +292,20 @@ class BaseAnalysisStreamHandler(ABC):
             if hasattr(llm_service, 'bot_id') and llm_service.bot_id:
                 stream_kwargs['bot_id'] = actual_bot_id
             
-            async for chunk in llm_service.stream_analysis(formatted_text, **stream_kwargs):
+            # 相同输入正在生成时挂载到进行中的上游；LLM 缓存在上游结束时只写一次
+            def _write_llm_cache(chunks):
+                if stream_completed(chunks):
+                    llm_output = collect_stream_text(chunks, content_types=('progress', 'complete'))
+                    if llm_output:
+                        self.set_cached_llm(llm_cache_key, llm_output)
+            
+            upstream = get_inflight_registry().stream(
+                f"{self.scene}:{actual_bot_id}:{llm_cache_key}",
+                lambda: llm_service.stream_analysis(formatted_text, **stream_kwargs),
+                on_complete=_write_llm_cache,
+                scene=self.scene,
+            )
+            async for chunk in upstream:
                 chunk_type = chunk.get('type', 'progress')
                 if llm_first_token_time is None and chunk_type == 'progress':
                     llm_first_token_time = time.time()
@@ -307,9 +322,6 @@ class BaseAnalysisStreamHandler(ABC):
                     if complete_content:
                         llm_output_chunks.append(complete_content)
                         has_content = True
-                    llm_output = ''.join(llm_output_chunks)
-                    if has_content and llm_output:
-                        self.set_cached_llm(llm_cache_key, llm_output)
                     yield _sse_yield({'type': 'complete', 'content': complete_content})
                     break
                 elif chunk_type == 'error':
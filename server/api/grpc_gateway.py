@@ -43,6 +43,7 @@ from server.api.grpc_gateway.recovery import (
     _ensure_endpoints_registered,
     _try_dynamic_register,
 )
+from server.utils.conditional_response import resolve_conditional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -250,10 +251,15 @@ async def grpc_web_gateway(request: Request):
         error_msg = f"Unsupported endpoint: {endpoint}. Available endpoints: {', '.join(available[:10])}"
         return build_error_response(error_msg, http_status=404, grpc_status=12)
 
-    # ---- 3. 执行 handler ----
+    # ---- 3. 条件请求：确定性端点 ETag 未变化时直接 412（POST），不执行 handler ----
+    conditional = resolve_conditional(endpoint, payload, request.headers.get("if-none-match"), request.method)
+    if conditional and conditional.not_modified:
+        return conditional.not_modified_response(grpc_cors_headers())
+
+    # ---- 4. 执行 handler ----
     data, status_code = await _execute_handler(handler, endpoint, payload)
 
-    # ---- 4. 编码 & 返回 ----
+    # ---- 5. 编码 & 返回 ----
     success = 200 <= status_code < 300
     detail_value = data.get("detail", "") if isinstance(data, dict) else "未知错误"
 
@@ -267,7 +273,10 @@ async def grpc_web_gateway(request: Request):
     grpc_status = 0 if success else map_http_to_grpc_status(status_code)
     grpc_message = "" if success else str(detail_value)
 
-    return build_grpc_web_response(response_payload, grpc_status, grpc_message)
+    response = build_grpc_web_response(response_payload, grpc_status, grpc_message)
+    if conditional and success and data.get("success", True):
+        response.headers.update(conditional.headers())
+    return response
 
 
 # ---------------------------------------------------------------------------
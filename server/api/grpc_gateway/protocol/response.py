@@ -36,9 +36,9 @@ def grpc_cors_headers(request_origin: str = None) -> Dict[str, str]:
             "Access-Control-Allow-Headers": (
                 "Content-Type, X-Grpc-Web, X-User-Agent, Accept, Authorization, "
                 "X-Requested-With, X-Client-Version, grpc-timeout, "
-                "x-grpc-web, x-requested-with"
+                "x-grpc-web, x-requested-with, if-none-match"
             ),
-            "Access-Control-Expose-Headers": "grpc-status, grpc-message, grpc-encoding, grpc-accept-encoding",
+            "Access-Control-Expose-Headers": "grpc-status, grpc-message, grpc-encoding, grpc-accept-encoding, etag",
             "Access-Control-Max-Age": "86400",
         }
 
@@ -84,6 +84,8 @@ async def cache_stats() -> Dict[str, Any]:
             _get_cache_version,
         )
 
+        from server.utils.cache_policy import policy_stats
+
         cache = get_multi_cache()
         stats = cache.stats()
 
@@ -101,6 +103,7 @@ async def cache_stats() -> Dict[str, Any]:
             "cache_version_enabled": version_enabled,
             "cache_version": version,
             "stats": stats,
+            "policies": policy_stats(),
         }
     except Exception as e:
         logger.exception("获取缓存统计失败")
@@ -8,7 +8,7 @@ import sys
 import os
 import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field, validator
 from typing import Optional, Tuple
 from datetime import datetime
@@ -27,6 +27,11 @@ from core.calculators.LunarConverter import LunarConverter
 from server.utils.timezone_converter import convert_local_to_solar_time, format_datetime_for_bazi
 from server.utils.bazi_input_processor import BaziInputProcessor
 from server.api.v1.models.bazi_base_models import BaziBaseRequest
+from server.utils.conditional_response import (
+    register_conditional_endpoint,
+    get_conditional_response,
+    query_request_model,
+)
 
 router = APIRouter()
 
@@ -217,6 +222,9 @@ class BaziInterfaceRequest(BaziBaseRequest):
     name: Optional[str] = Field(None, description="姓名", example="张三")
 
 
+register_conditional_endpoint("/bazi/interface", BaziInterfaceRequest)
+
+
 @router.post("/bazi/interface", response_model=BaziResponse, summary="生成八字界面信息")
 async def generate_bazi_interface(request: BaziInterfaceRequest, http_request: Request):
     """
@@ -233,6 +241,10 @@ async def generate_bazi_interface(request: BaziInterfaceRequest, http_request: R
     
     返回完整的八字界面信息（JSON格式）
     """
+    conditional = get_conditional_response(http_request, "/bazi/interface", request)
+    if conditional and conditional.not_modified:
+        return conditional.not_modified_response()
+
     try:
         # 处理农历输入和时区转换
         final_solar_date, final_solar_time, conversion_info = process_date_time_input(
@@ -259,10 +271,11 @@ async def generate_bazi_interface(request: BaziInterfaceRequest, http_request: R
             # 添加转换信息到结果
             if conversion_info.get('converted') or conversion_info.get('timezone_info'):
                 cached_result['conversion_info'] = conversion_info
-            return BaziResponse(
+            response = BaziResponse(
                 success=True,
                 data=cached_result
             )
+            return conditional.wrap(response) if conditional else response
         
         # 在线程池中执行CPU密集型计算（添加超时保护，最多30秒）
         try:
@@ -298,10 +311,11 @@ async def generate_bazi_interface(request: BaziInterfaceRequest, http_request: R
             longitude=request.longitude or 120.00
         )
         
-        return BaziResponse(
+        response = BaziResponse(
             success=True,
             data=result
         )
+        return conditional.wrap(response) if conditional else response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -314,6 +328,15 @@ async def generate_bazi_interface(request: BaziInterfaceRequest, http_request: R
         raise HTTPException(status_code=500, detail=error_detail)
 
 
+@router.get("/bazi/interface", response_model=BaziResponse, summary="生成八字界面信息（GET，可缓存）")
+async def generate_bazi_interface_by_query(
+    http_request: Request,
+    request: BaziInterfaceRequest = Depends(query_request_model(BaziInterfaceRequest)),
+):
+    """GET 变体：参数走查询字符串，其余同 POST /bazi/interface"""
+    return await generate_bazi_interface(request, http_request)
+
+
 class BaziDetailRequest(BaziBaseRequest):
     """八字详细计算请求模型"""
     current_time: Optional[str] = Field(None, description="当前时间，格式：YYYY-MM-DD HH:MM，用于计算大运流年，默认为当前系统时间", example="2024-01-01 12:00")
@@ -449,6 +472,10 @@ class ShengongMinggongRequest(BaziBaseRequest):
     target_year: Optional[int] = Field(None, description="目标年份（可选），用于计算该年份的流月", example=2024)
 
 
+# 未传 current_time 时按当天计算，ETag 按天变化
+register_conditional_endpoint("/bazi/shengong-minggong", ShengongMinggongRequest, time_dependent_fields=("current_time",))
+
+
 @router.post("/bazi/shengong-minggong", response_model=BaziResponse, summary="获取身宫命宫详细信息")
 async def get_shengong_minggong(request: ShengongMinggongRequest, http_request: Request):
     """
@@ -464,6 +491,10 @@ async def get_shengong_minggong(request: ShengongMinggongRequest, http_request:
     
     返回身宫、命宫和四柱的详细信息
     """
+    conditional = get_conditional_response(http_request, "/bazi/shengong-minggong", request)
+    if conditional and conditional.not_modified:
+        return conditional.not_modified_response()
+
     try:
         # 处理农历输入和时区转换
         final_solar_date, final_solar_time, conversion_info = process_date_time_input(
@@ -509,10 +540,11 @@ async def get_shengong_minggong(request: ShengongMinggongRequest, http_request:
                 if conversion_info.get('converted') or conversion_info.get('timezone_info'):
                     cached_result['conversion_info'] = conversion_info
                 cached_result['cache_hit'] = True
-                return BaziResponse(
+                response = BaziResponse(
                     success=True,
                     data=cached_result
                 )
+                return conditional.wrap(response) if conditional else response
         
         # 在线程池中执行CPU密集型计算（使用统一执行器）
         result = await run_in_executor(
@@ -540,10 +572,11 @@ async def get_shengong_minggong(request: ShengongMinggongRequest, http_request:
         if conversion_info.get('converted') or conversion_info.get('timezone_info'):
             result['conversion_info'] = conversion_info
         
-        return BaziResponse(
+        response = BaziResponse(
             success=True,
             data=result
         )
+        return conditional.wrap(response) if conditional else response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -554,6 +587,15 @@ async def get_shengong_minggong(request: ShengongMinggongRequest, http_request:
         raise HTTPException(status_code=500, detail=f"计算失败: {str(e)}")
 
 
+@router.get("/bazi/shengong-minggong", response_model=BaziResponse, summary="获取身宫命宫详细信息（GET，可缓存）")
+async def get_shengong_minggong_by_query(
+    http_request: Request,
+    request: ShengongMinggongRequest = Depends(query_request_model(ShengongMinggongRequest)),
+):
+    """GET 变体：参数走查询字符串，其余同 POST /bazi/shengong-minggong"""
+    return await get_shengong_minggong(request, http_request)
+
+
 def _calculate_shengong_minggong_details(
     solar_date: str, 
     solar_time: str, 
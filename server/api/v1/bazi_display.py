@@ -34,6 +34,11 @@ from server.utils.api_cache_helper import (
     L2_TTL, get_current_date_str
 )
 from server.utils.api_error_handler import api_error_handler
+from server.utils.conditional_response import (
+    register_conditional_endpoint,
+    get_conditional_response,
+    query_request_model,
+)
 from server.utils.async_executor import get_executor
 from server.orchestrators.bazi_data_orchestrator import BaziDataOrchestrator
 from server.orchestrators.modules_config import get_modules_config
@@ -85,9 +90,13 @@ class FortuneDisplayRequestWithMode:
     use_jin_mode: bool = False
 
 
+# 排盘展示只取决于出生信息，支持 ETag / If-None-Match
+register_conditional_endpoint("/bazi/pan/display", BaziDisplayRequest)
+
+
 @router.post("/bazi/pan/display", summary="排盘展示（前端优化）")
 @api_error_handler
-async def get_pan_display(request: BaziDisplayRequest):
+async def get_pan_display(request: BaziDisplayRequest, http_request: Request = None):
     """
     获取排盘数据（前端优化格式）
     
@@ -108,7 +117,13 @@ async def get_pan_display(request: BaziDisplayRequest):
     - conversion_info: 转换信息（如果进行了农历转换或时区转换）
     
     架构：通过 BaziDataOrchestrator 统一获取数据（数据总线设计）
+    
+    带 If-None-Match 且 ETag 未变化时直接返回（POST 为 412，GET 变体为 304）
     """
+    conditional = get_conditional_response(http_request, "/bazi/pan/display", request)
+    if conditional and conditional.not_modified:
+        return conditional.not_modified_response()
+
     # 处理农历输入和时区转换
     final_solar_date, final_solar_time, conversion_info = BaziInputProcessor.process_input(
         request.solar_date,
@@ -124,7 +139,7 @@ async def get_pan_display(request: BaziDisplayRequest):
     if cached:
         if conversion_info.get('converted') or conversion_info.get('timezone_info'):
             cached['conversion_info'] = conversion_info
-        return cached
+        return conditional.wrap(cached) if conditional else cached
 
     try:
         # ✅ 通过编排层统一获取数据（数据总线设计）
@@ -180,10 +195,19 @@ async def get_pan_display(request: BaziDisplayRequest):
         }
         asyncio.ensure_future(_prefetch_fortune_display(**_prefetch_params))
         asyncio.ensure_future(_prefetch_shengong_minggong(**_prefetch_params))
-        return result
+        return conditional.wrap(result) if conditional else result
     raise HTTPException(status_code=500, detail=result.get('error', '计算失败'))
 
 
+@router.get("/bazi/pan/display", summary="排盘展示（GET，可缓存）")
+async def get_pan_display_by_query(
+    http_request: Request,
+    request: BaziDisplayRequest = Depends(query_request_model(BaziDisplayRequest)),
+):
+    """GET 变体：参数走查询字符串，其余同 POST /bazi/pan/display"""
+    return await get_pan_display(request, http_request)
+
+
 async def _prefetch_fortune_display(
     solar_date: str,
     solar_time: str,
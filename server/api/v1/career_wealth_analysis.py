@@ -61,9 +61,10 @@ from server.utils.analysis_helpers import (
 
 # ✅ 性能优化：导入流式缓存工具
 from server.utils.stream_cache_helper import (
-    get_llm_cache, set_llm_cache,
+    get_llm_cache,
     compute_input_data_hash, LLM_CACHE_TTL
 )
+from server.utils.stream_inflight import get_inflight_registry, make_llm_cache_writer
 
 logger = logging.getLogger(__name__)
 
@@ -1094,7 +1095,14 @@ async def career_wealth_stream_generator(
             has_content = False
             llm_start_time = time.time()
             
-            async for result in llm_service.stream_analysis(formatted_data, bot_id=actual_bot_id):
+            # 相同输入正在生成时挂载到进行中的上游，LLM 缓存在上游结束时只写一次
+            upstream = get_inflight_registry().stream(
+                f"career_wealth:{actual_bot_id}:{input_data_hash}",
+                lambda: llm_service.stream_analysis(formatted_data, bot_id=actual_bot_id),
+                on_complete=make_llm_cache_writer("career_wealth", input_data_hash, LLM_CACHE_TTL, trace_id=trace_id),
+                scene="career_wealth",
+            )
+            async for result in upstream:
                 chunk_count += 1
                 
                 # 记录第一个token时间
@@ -1119,9 +1127,6 @@ async def career_wealth_stream_generator(
                         llm_output_chunks.append(complete_content)
                     
                     full_llm_content = ''.join(llm_output_chunks).strip()
-                    if full_llm_content:
-                        set_llm_cache("career_wealth", input_data_hash, full_llm_content, LLM_CACHE_TTL)
-                        logger.info(f"[{trace_id}] ✅ LLM 缓存已写入: career_wealth")
                     
                     api_end_time = time.time()
                     llm_total_time_ms = int((api_end_time - llm_start_time) * 1000) if llm_start_time else None
@@ -57,9 +57,10 @@ from server.utils.analysis_helpers import (
 
 # ✅ 性能优化：导入流式缓存工具
 from server.utils.stream_cache_helper import (
-    get_llm_cache, set_llm_cache,
+    get_llm_cache,
     compute_input_data_hash, LLM_CACHE_TTL
 )
+from server.utils.stream_inflight import get_inflight_registry, make_llm_cache_writer
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -715,7 +716,14 @@ async def children_study_analysis_stream_generator(
         has_content = False
         complete_content = ""
         
-        async for chunk in llm_service.stream_analysis(formatted_data, bot_id=used_bot_id):
+        # 相同输入正在生成时挂载到进行中的上游，LLM 缓存在上游结束时只写一次
+        upstream = get_inflight_registry().stream(
+            f"children_study:{used_bot_id}:{input_data_hash}",
+            lambda: llm_service.stream_analysis(formatted_data, bot_id=used_bot_id),
+            on_complete=make_llm_cache_writer("children_study", input_data_hash, LLM_CACHE_TTL),
+            scene="children_study",
+        )
+        async for chunk in upstream:
             # 记录第一个token时间
             if llm_first_token_time is None and chunk.get('type') == 'progress':
                 llm_first_token_time = time.time()
@@ -731,9 +739,6 @@ async def children_study_analysis_stream_generator(
                 has_content = True
                 
                 full_llm_content = ''.join(llm_output_chunks).strip()
-                if full_llm_content:
-                    set_llm_cache("children_study", input_data_hash, full_llm_content, LLM_CACHE_TTL)
-                    logger.info(f"✅ LLM 缓存已写入: children_study")
                 
                 api_end_time = time.time()
                 api_total_ms = int((api_end_time - api_start_time) * 1000)
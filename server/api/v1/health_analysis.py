@@ -48,9 +48,10 @@ import time
 
 # ✅ 性能优化：导入流式缓存工具
 from server.utils.stream_cache_helper import (
-    get_llm_cache, set_llm_cache,
+    get_llm_cache,
     compute_input_data_hash, LLM_CACHE_TTL
 )
+from server.utils.stream_inflight import get_inflight_registry, make_llm_cache_writer
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -483,7 +484,14 @@ async def health_analysis_stream_generator(
         has_content = False
         complete_content = ""
         
-        async for chunk in llm_service.stream_analysis(formatted_data, bot_id=used_bot_id):
+        # 相同输入正在生成时挂载到进行中的上游，LLM 缓存在上游结束时只写一次
+        upstream = get_inflight_registry().stream(
+            f"health:{used_bot_id}:{input_data_hash}",
+            lambda: llm_service.stream_analysis(formatted_data, bot_id=used_bot_id),
+            on_complete=make_llm_cache_writer("health", input_data_hash, LLM_CACHE_TTL),
+            scene="health",
+        )
+        async for chunk in upstream:
             # 记录第一个token时间
             if llm_first_token_time is None and chunk.get('type') == 'progress':
                 llm_first_token_time = time.time()
@@ -499,9 +507,6 @@ async def health_analysis_stream_generator(
                 has_content = True
                 
                 full_llm_content = ''.join(llm_output_chunks).strip()
-                if full_llm_content:
-                    set_llm_cache("health", input_data_hash, full_llm_content, LLM_CACHE_TTL)
-                    logger.info(f"✅ LLM 缓存已写入: health")
                 
                 api_end_time = time.time()
                 api_total_ms = int((api_end_time - api_start_time) * 1000)
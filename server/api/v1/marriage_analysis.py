@@ -40,9 +40,10 @@ import time
 # ✅ 性能优化：导入流式缓存工具
 from server.utils.stream_cache_helper import (
     get_stream_data_cache, set_stream_data_cache,
-    get_llm_cache, set_llm_cache,
+    get_llm_cache,
     compute_input_data_hash, DATA_CACHE_TTL, LLM_CACHE_TTL
 )
+from server.utils.stream_inflight import get_inflight_registry, make_llm_cache_writer
 
 # 导入配置加载器（从数据库读取配置）
 try:
@@ -69,6 +70,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _not_refusal(chunk: Dict[str, Any]) -> bool:
+    """平台拒答文本（"对不起…无法回答"）不写入 LLM 缓存"""
+    content = chunk.get('content', '')
+    return not (chunk.get('type') == 'progress' and '对不起' in content and '无法回答' in content)
+
+
 def _write_stream_log(
     trace_id: str,
     frontend_input: Dict[str, Any],
@@ -853,7 +860,16 @@ async def marriage_analysis_stream_generator(
             
             logger.info(f"[{trace_id}] 📤 开始调用 LLM API: bot_id={actual_bot_id}, data_length={len(formatted_data)}")
 
-            async for result in llm_service.stream_analysis(formatted_data, trace_id=trace_id, bot_id=actual_bot_id):
+            # 相同输入正在生成时挂载到进行中的上游，LLM 缓存在上游结束时只写一次（不缓存拒答文本）
+            upstream = get_inflight_registry().stream(
+                f"marriage:{actual_bot_id}:{input_data_hash}",
+                lambda: llm_service.stream_analysis(formatted_data, trace_id=trace_id, bot_id=actual_bot_id),
+                on_complete=make_llm_cache_writer(
+                    "marriage", input_data_hash, LLM_CACHE_TTL, chunk_filter=_not_refusal, trace_id=trace_id,
+                ),
+                scene="marriage",
+            )
+            async for result in upstream:
                 chunk_count += 1
                 
                 if result.get('type') == 'progress':
@@ -877,11 +893,6 @@ async def marriage_analysis_stream_generator(
                     if complete_content:
                         llm_output_chunks.append(complete_content)
                     
-                    full_llm_content = ''.join(llm_output_chunks).strip()
-                    if full_llm_content:
-                        set_llm_cache("marriage", input_data_hash, full_llm_content, LLM_CACHE_TTL)
-                        logger.info(f"[{trace_id}] ✅ LLM 缓存已写入: marriage, 长度={len(full_llm_content)}")
-                    
                     _write_stream_log(
                         trace_id, frontend_input, formatted_data,
                         llm_output_chunks, api_start_time, llm_first_token_time,
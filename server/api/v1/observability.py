@@ -359,3 +359,40 @@ async def reset_api_cache_stats():
     except Exception as e:
         logger.error(f"重置缓存统计失败: {e}", exc_info=True)
         return ObservabilityResponse(success=False, error=str(e))
+
+
+# ==================== 模拟 LLM 统计 API ====================
+
+@router.get("/observability/mock-llm", response_model=ObservabilityResponse, summary="获取模拟 LLM 流式统计")
+async def get_mock_llm_stats():
+    """
+    获取本地模拟 LLM 服务的运行统计（流式接口容量压测用）
+
+    返回：
+    - 并发流数 / 峰值、完成 / 错误 / 中断数
+    - 平均首字耗时、事件循环延迟（平均 / 最大）
+    - 进程 RSS 及按峰值并发估算的每路流内存
+    - 当前模拟配置
+    """
+    try:
+        from server.services.mock_llm_stream_service import LLM_MOCK_ENABLED, get_mock_llm_stats as _stats
+        data = _stats()
+        data["forced_by_env"] = LLM_MOCK_ENABLED
+        return ObservabilityResponse(success=True, data=data)
+    except Exception as e:
+        logger.error(f"获取模拟 LLM 统计失败: {e}", exc_info=True)
+        return ObservabilityResponse(success=False, error=str(e))
+
+
+@router.post("/observability/mock-llm/reset", response_model=ObservabilityResponse, summary="重置模拟 LLM 统计")
+async def reset_mock_llm_stats():
+    """
+    重置模拟 LLM 统计（每轮压测开始前调用）
+    """
+    try:
+        from server.services.mock_llm_stream_service import reset_mock_llm_stats as _reset
+        _reset()
+        return ObservabilityResponse(success=True, data={"message": "模拟 LLM 统计已重置"})
+    except Exception as e:
+        logger.error(f"重置模拟 LLM 统计失败: {e}", exc_info=True)
+        return ObservabilityResponse(success=False, error=str(e))
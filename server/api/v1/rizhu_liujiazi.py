@@ -6,7 +6,7 @@
 
 import sys
 import os
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 import asyncio
@@ -25,6 +25,11 @@ from server.utils.api_cache_helper import (
     generate_cache_key, get_cached_result, set_cached_result, L2_TTL
 )
 from server.utils.async_executor import get_executor
+from server.utils.conditional_response import (
+    register_conditional_endpoint,
+    get_conditional_response,
+    query_request_model,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,8 +52,11 @@ class RizhuLiujiaziResponse(BaseModel):
     error: Optional[str] = None
 
 
+register_conditional_endpoint("/bazi/rizhu-liujiazi", RizhuLiujiaziRequest)
+
+
 @router.post("/bazi/rizhu-liujiazi", response_model=RizhuLiujiaziResponse, summary="查询日元-六十甲子解析")
-async def get_rizhu_liujiazi(request: RizhuLiujiaziRequest):
+async def get_rizhu_liujiazi(request: RizhuLiujiaziRequest, http_request: Request = None):
     """
     根据用户生辰查询日柱对应的六十甲子解析
     
@@ -63,6 +71,10 @@ async def get_rizhu_liujiazi(request: RizhuLiujiaziRequest):
     
     返回日柱解析结果（包含【基础信息】、【深度解读】、【断语展示】等）
     """
+    conditional = get_conditional_response(http_request, "/bazi/rizhu-liujiazi", request)
+    if conditional and conditional.not_modified:
+        return conditional.not_modified_response()
+
     try:
         # 在线程池中执行CPU密集型计算
         loop = asyncio.get_event_loop()
@@ -83,7 +95,8 @@ async def get_rizhu_liujiazi(request: RizhuLiujiaziRequest):
         if cached:
             if conversion_info.get('converted') or conversion_info.get('timezone_info'):
                 cached['conversion_info'] = conversion_info
-            return RizhuLiujiaziResponse(success=True, data=cached)
+            response = RizhuLiujiaziResponse(success=True, data=cached)
+            return conditional.wrap(response) if conditional else response
         # >>> 缓存检查结束 <<<
         
         # 1. 获取八字排盘结果（双轨并行：优先使用编排层）
@@ -178,10 +191,11 @@ async def get_rizhu_liujiazi(request: RizhuLiujiaziRequest):
         if analysis_data and isinstance(analysis_data, dict) and conversion_info and (conversion_info.get('converted') or conversion_info.get('timezone_info')):
             analysis_data['conversion_info'] = conversion_info
         
-        return RizhuLiujiaziResponse(
+        response = RizhuLiujiaziResponse(
             success=True,
             data=analysis_data
         )
+        return conditional.wrap(response) if conditional else response
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -192,3 +206,11 @@ async def get_rizhu_liujiazi(request: RizhuLiujiaziRequest):
             detail=f"查询失败: {str(e)}\n{traceback.format_exc()}"
         )
 
+
+@router.get("/bazi/rizhu-liujiazi", response_model=RizhuLiujiaziResponse, summary="查询日元-六十甲子解析（GET，可缓存）")
+async def get_rizhu_liujiazi_by_query(
+    http_request: Request,
+    request: RizhuLiujiaziRequest = Depends(query_request_model(RizhuLiujiaziRequest)),
+):
+    """GET 变体：参数走查询字符串，其余同 POST /bazi/rizhu-liujiazi"""
+    return await get_rizhu_liujiazi(request, http_request)
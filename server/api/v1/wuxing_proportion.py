@@ -10,7 +10,7 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
@@ -20,6 +20,11 @@ from server.utils.bazi_input_processor import BaziInputProcessor
 from server.utils.api_cache_helper import (
     generate_cache_key, get_cached_result, set_cached_result, L2_TTL
 )
+from server.utils.conditional_response import (
+    register_conditional_endpoint,
+    get_conditional_response,
+    query_request_model,
+)
 from server.services.wuxing_proportion_service import WuxingProportionService
 
 router = APIRouter()
@@ -220,6 +225,8 @@ class WuxingProportionResponse(BaseModel):
     error: Optional[str] = None
 
 
+register_conditional_endpoint("/bazi/wuxing-proportion/test", WuxingProportionRequest)
+
 
 _WUXING_HANDLER = WuxingStreamHandler()
 
@@ -239,7 +246,7 @@ async def wuxing_proportion_stream_generator(
 
 
 @router.post("/bazi/wuxing-proportion/test", summary="测试接口：返回格式化后的数据（用于 Coze Bot）")
-async def wuxing_proportion_test(request: WuxingProportionRequest):
+async def wuxing_proportion_test(request: WuxingProportionRequest, http_request: Request = None):
     """
     测试接口：返回格式化后的数据（用于 Coze Bot）
     
@@ -259,6 +266,10 @@ async def wuxing_proportion_test(request: WuxingProportionRequest):
         "formatted_data_length": 1234
     }
     """
+    conditional = get_conditional_response(http_request, "/bazi/wuxing-proportion/test", request)
+    if conditional and conditional.not_modified:
+        return conditional.not_modified_response()
+
     try:
         # 1. 处理农历输入和时区转换
         final_solar_date, final_solar_time, conversion_info = BaziInputProcessor.process_input(
@@ -313,7 +324,7 @@ async def wuxing_proportion_test(request: WuxingProportionRequest):
         formatted_data_llm = _format_wuxing_for_llm(input_data)
         
         # 6. 返回格式化后的数据
-        return {
+        result = {
             "success": True,
             "input_data": input_data,
             "formatted_data": formatted_data,
@@ -325,6 +336,7 @@ async def wuxing_proportion_test(request: WuxingProportionRequest):
                 "test_command": f'curl -X POST "http://localhost:8001/api/v1/bazi/wuxing-proportion/test" -H "Content-Type: application/json" -d \'{{"solar_date": "{request.solar_date}", "solar_time": "{request.solar_time}", "gender": "{request.gender}", "calendar_type": "{request.calendar_type or "solar"}"}}\''
             }
         }
+        return conditional.wrap(result) if conditional else result
     except Exception as e:
         import traceback
         return {
@@ -334,6 +346,15 @@ async def wuxing_proportion_test(request: WuxingProportionRequest):
         }
 
 
+@router.get("/bazi/wuxing-proportion/test", summary="五行占比格式化数据（GET，可缓存）")
+async def wuxing_proportion_test_by_query(
+    http_request: Request,
+    request: WuxingProportionRequest = Depends(query_request_model(WuxingProportionRequest)),
+):
+    """GET 变体：参数走查询字符串，其余同 POST /bazi/wuxing-proportion/test"""
+    return await wuxing_proportion_test(request, http_request)
+
+
 @router.post("/bazi/wuxing-proportion/stream", summary="五行占比流式分析")
 async def stream_wuxing_proportion(request: WuxingProportionRequest):
     """
@@ -6,7 +6,7 @@
 """
 
 from collections import Counter
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 
 from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS
 from core.data.relations import (
@@ -14,11 +14,20 @@ from core.data.relations import (
     BRANCH_LIUHE,
     BRANCH_CHONG,
     BRANCH_XING,
-    BRANCH_HAI,
-    BRANCH_PO,
     BRANCH_SANHE_GROUPS,
     BRANCH_SANHUI_GROUPS,
 )
+from core.data.ganzhi_kernel import (
+    BRANCH_PAIR_RELATIONS,
+    BRANCH_RELATION_NAMES,
+    REL_HE,
+    REL_KE,
+    REL_KE_BY,
+    branch_relation,
+    branch_relation_either,
+    relation_mask,
+    stem_relation,
+)
 PILLAR_NAMES = ["year", "month", "day", "hour"]
 BRANCH_SEQUENCE = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
 YANG_STEMS = {"甲", "丙", "戊", "庚", "壬"}
@@ -48,6 +57,77 @@ def ensure_list(value: Any) -> List[Any]:
         return value
     return [value]
 
+
+# ========== 条件读取的数据字段（用于规则匹配缓存键） ==========
+# 只读取四柱派生数据（bazi_pillars / details / ten_gods_stats / elements / element_counts /
+# relationships）和性别的条件：同一四柱 + 性别下结果与出生的具体时刻无关
+CHART_CONDITIONS = frozenset({
+    "year_pillar", "month_pillar", "day_pillar", "rizhu", "hour_pillar", "gender",
+    "deities_in_any_pillar", "deities_in_all_pillars", "deities_in_year", "deities_in_month",
+    "deities_in_day", "deities_in_hour", "deities_count", "deities_same_pillar",
+    "star_fortune_in_year", "star_fortune_in_month", "star_fortune_in_day", "star_fortune_in_hour",
+    "main_star_in_year", "main_star_in_day", "main_star_in_pillar", "mingge_type",
+    "ten_gods_main", "ten_gods_sub", "ten_gods_total", "ten_gods_injured", "ten_god_combines",
+    "ten_gods_compare", "ten_gods_compare_group", "ten_gods_total_group", "ten_gods_energy_compare",
+    "ten_gods_not_ke", "ten_gods_same_pillar_branch", "ten_gods_branch_benqi", "ten_gods_ratio",
+    "ten_gods_element_sheng", "ten_gods_in_all_pillars", "ten_gods_destroyed", "ten_gods_main_chong_count",
+    "hour_branch_range", "branch_chong", "no_chong_xing", "day_branch_in", "day_branch_equals",
+    "pillar_element", "day_branch_element_in", "pillar_in", "pillar_equals", "stems_count",
+    "branches_count", "branch_group", "branch_offset", "stems_parity", "branch_adjacent",
+    "branches_unique", "stems_unique", "pillar_relation", "stems_chong", "stems_wuhe_pairs",
+    "stem_wuhe_pairs", "branch_liuhe_sanhe_count", "element_total", "element_relation",
+    "nayin_count_in_pillars", "nayin_equals", "nayin_relation", "branch_element_combination",
+    "pillars_consecutive", "relations_count", "jinshen", "yangren", "branches_repeat_or_sanhui",
+    "branch_sanxing", "pillar_branch_xing_chong", "stems_branches_count",
+})
+
+# 出生时刻（未登记的条件也按此处理，保守起见不与同盘面的其他出生时间共享缓存）
+BIRTH_MOMENT_FIELDS = ("basic_info.solar_date", "basic_info.solar_time")
+_FORTUNE_FIELDS = ("fortune",)
+
+# 读取四柱派生数据之外字段的条件（路径相对 bazi_data）
+CONDITION_EXTRA_FIELDS = {
+    "wangshuai": BIRTH_MOMENT_FIELDS,  # 旺衰按出生时刻距节气天数计算
+    "season": ("basic_info.solar_date",),
+    "lunar_month_in": ("basic_info.lunar_date.month",),
+    "lunar_day_in": ("basic_info.lunar_date.day",),
+    "xishen": ("xishen", "analysis.xishen"),
+    "xishen_in": ("xishen", "analysis.xishen"),
+    "taiyuan_shengong_minggong": ("taiyuan", "shengong", "minggong"),
+    "liunian_relation": _FORTUNE_FIELDS,
+    "dayun_branch_equals": _FORTUNE_FIELDS,
+    "liunian_combines_pillar": _FORTUNE_FIELDS,
+    "liunian_ganzhi_equals": _FORTUNE_FIELDS,
+    "suiyun_binglin_kongwang": _FORTUNE_FIELDS,
+    "month_ten_gods_with_dayun_liunian": _FORTUNE_FIELDS,
+    "liunian_deities": _FORTUNE_FIELDS,
+    "liunian_deities_contains": _FORTUNE_FIELDS,
+    "dayun_branch_in": _FORTUNE_FIELDS,
+    "liunian_branch_in": _FORTUNE_FIELDS,
+    "liunian_dayun_element": _FORTUNE_FIELDS,
+}
+
+
+def condition_fields(condition: Any) -> FrozenSet[str]:
+    """
+    条件（含 all / any / not 嵌套）在四柱派生数据之外读取的字段
+
+    Returns:
+        字段路径集合；空集表示结果只由四柱 + 性别决定
+    """
+    if not isinstance(condition, dict):
+        return frozenset()
+    fields = set()
+    for key, value in condition.items():
+        if key in ("all", "any"):
+            for sub in ensure_list(value):
+                fields.update(condition_fields(sub))
+        elif key == "not":
+            fields.update(condition_fields(value))
+        elif key not in CHART_CONDITIONS:
+            fields.update(CONDITION_EXTRA_FIELDS.get(key, BIRTH_MOMENT_FIELDS))
+    return frozenset(fields)
+
 class EnhancedRuleCondition:
     """增强的规则条件匹配器"""
     
@@ -2312,6 +2392,7 @@ class EnhancedRuleCondition:
 
         details = bazi_data.get("details", {})
         bazi_pillars = bazi_data.get("bazi_pillars", {})
+        branch_mask = BRANCH_RELATION_NAMES.get(relation, 0) & BRANCH_PAIR_RELATIONS if isinstance(relation, str) else 0
 
         for pillar in pillars:
             detail = details.get(pillar, {})
@@ -2347,27 +2428,13 @@ class EnhancedRuleCondition:
                         continue
 
                 if target_part == "stem":
-                    if relation == "he" and STEM_HE.get(source_value) == target_value:
+                    if relation == "he" and stem_relation(source_value, target_value) & REL_HE:
                         return True
                     if relation == "equal" and source_value == target_value:
                         return True
                 elif target_part == "branch":
-                    if relation == "liuhe" and BRANCH_LIUHE.get(source_value) == target_value:
+                    if branch_relation_either(source_value, target_value) & branch_mask:
                         return True
-                    if relation == "chong" and BRANCH_CHONG.get(source_value) == target_value:
-                        return True
-                    if relation == "hai":
-                        harm_targets = ensure_list(BRANCH_HAI.get(source_value))
-                        reverse_harm = ensure_list(BRANCH_HAI.get(target_value))
-                        if target_value in harm_targets or source_value in reverse_harm:
-                            return True
-                    if relation == "po" and BRANCH_PO.get(source_value) == target_value:
-                        return True
-                    if relation == "xing":
-                        xings = ensure_list(BRANCH_XING.get(source_value))
-                        reverse_xings = ensure_list(BRANCH_XING.get(target_value))
-                        if target_value in xings or source_value in reverse_xings:
-                            return True
                     if relation == "equal" and source_value == target_value:
                         return True
                 else:
@@ -2820,41 +2887,21 @@ class EnhancedRuleCondition:
         if part == 'branch':
             if relation == 'equal':
                 return value_a == value_b
-            if relation == 'liuhe' or relation == 'he':
-                return BRANCH_LIUHE.get(value_a) == value_b
-            if relation == 'chong':
-                return BRANCH_CHONG.get(value_a) == value_b
             if relation == 'ke':
-                element_a = BRANCH_ELEMENTS.get(value_a)
-                element_b = BRANCH_ELEMENTS.get(value_b)
-                if not element_a or not element_b:
-                    return False
-                return (ELEMENT_CONTROLS.get(element_a) == element_b or
-                        ELEMENT_CONTROLS.get(element_b) == element_a)
-            if relation == 'xing':
-                targets = ensure_list(BRANCH_XING.get(value_a))
-                reverse_targets = ensure_list(BRANCH_XING.get(value_b))
-                return value_b in targets or value_a in reverse_targets
-            if relation == 'hai':
-                targets = ensure_list(BRANCH_HAI.get(value_a))
-                reverse_targets = ensure_list(BRANCH_HAI.get(value_b))
-                return value_b in targets or value_a in reverse_targets
-            if relation == 'po':
-                return BRANCH_PO.get(value_a) == value_b
-            return False
+                return bool(branch_relation(value_a, value_b) & (REL_KE | REL_KE_BY))
+            if relation == 'he':
+                relation = 'liuhe'
+            # 刑、害按双向判断；六合、六冲、破本身对称
+            mask = BRANCH_RELATION_NAMES.get(relation, 0) & BRANCH_PAIR_RELATIONS
+            return bool(branch_relation_either(value_a, value_b) & mask)
 
         if part == 'stem':
             if relation == 'equal':
                 return value_a == value_b
             if relation == 'he':
-                return STEM_HE.get(value_a) == value_b
+                return bool(stem_relation(value_a, value_b) & REL_HE)
             if relation == 'ke':
-                element_a = STEM_ELEMENTS.get(value_a)
-                element_b = STEM_ELEMENTS.get(value_b)
-                if not element_a or not element_b:
-                    return False
-                return (ELEMENT_CONTROLS.get(element_a) == element_b or
-                        ELEMENT_CONTROLS.get(element_b) == element_a)
+                return bool(stem_relation(value_a, value_b) & (REL_KE | REL_KE_BY))
             return False
 
         if part == 'nayin':
@@ -2943,25 +2990,9 @@ class EnhancedRuleCondition:
     def _check_branch_relations(branch_a: Optional[str], branch_b: Optional[str], relations: List[str]) -> bool:
         if not branch_a or not branch_b or not relations:
             return False
-        for relation in relations:
-            relation = relation.lower()
-            if relation == "chong" and BRANCH_CHONG.get(branch_a) == branch_b:
-                return True
-            if relation == "liuhe" and BRANCH_LIUHE.get(branch_a) == branch_b:
-                return True
-            if relation == "xing":
-                targets = ensure_list(BRANCH_XING.get(branch_a))
-                reverse_targets = ensure_list(BRANCH_XING.get(branch_b))
-                if branch_b in targets or branch_a in reverse_targets:
-                    return True
-            if relation == "hai":
-                targets = ensure_list(BRANCH_HAI.get(branch_a))
-                reverse_targets = ensure_list(BRANCH_HAI.get(branch_b))
-                if branch_b in targets or branch_a in reverse_targets:
-                    return True
-            if relation == "po" and BRANCH_PO.get(branch_a) == branch_b:
-                return True
-        return False
+        # 刑、害按双向判断；其余关系本身对称
+        mask = relation_mask(relations) & BRANCH_PAIR_RELATIONS
+        return bool(branch_relation_either(branch_a, branch_b) & mask)
 
     @staticmethod
     def _match_branches_unique(bazi_data: Dict[str, Any], spec: Dict[str, Any]) -> bool:
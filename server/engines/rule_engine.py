@@ -6,11 +6,15 @@
 """
 
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, List, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 import os
 
-from .rule_condition import EnhancedRuleCondition
+from .rule_condition import EnhancedRuleCondition, condition_fields
+
+# 匹配范围：只依赖四柱 + 性别的规则 / 还依赖出生时刻、流年等字段的规则
+SCOPE_CHART = "chart"
+SCOPE_MOMENT = "moment"
 
 
 class EnhancedRuleEngine:
@@ -27,6 +31,8 @@ class EnhancedRuleEngine:
         self.rules = rules or []
         self.use_index = use_index
         self._index = {}
+        self._rule_fields = {}    # id(rule) -> 条件读取的非四柱字段
+        self._moment_fields = {}  # 规则类型组合 -> 该范围内非四柱规则读取字段的并集
         if use_index:
             self._build_advanced_index()
     
@@ -94,23 +100,50 @@ class EnhancedRuleEngine:
                             self._index['by_deity'][deities] = []
                         self._index['by_deity'][deities].append(rule)
     
-    def match_rules(self, bazi_data: Dict, rule_types: List[str] = None) -> List[Dict]:
+    def rule_fields(self, rule: Dict) -> FrozenSet[str]:
+        """规则条件在四柱派生数据之外读取的字段（空集表示只依赖四柱 + 性别）"""
+        fields = self._rule_fields.get(id(rule))
+        if fields is None:
+            fields = condition_fields(rule.get('conditions', {}))
+            self._rule_fields[id(rule)] = fields
+        return fields
+
+    def moment_fields(self, rule_types: List[str] = None) -> FrozenSet[str]:
+        """指定规则类型中非四柱规则读取字段的并集（空集表示全部规则只依赖四柱 + 性别）"""
+        cache_key = frozenset(rule_types) if rule_types else None
+        fields = self._moment_fields.get(cache_key)
+        if fields is None:
+            fields = set()
+            for rule in self.rules:
+                if rule.get('enabled', True) and (cache_key is None or rule.get('rule_type') in cache_key):
+                    fields.update(self.rule_fields(rule))
+            fields = frozenset(fields)
+            self._moment_fields[cache_key] = fields
+        return fields
+
+    def _in_scope(self, rule: Dict, scope: Optional[str]) -> bool:
+        if scope is None:
+            return True
+        return (not self.rule_fields(rule)) == (scope == SCOPE_CHART)
+
+    def match_rules(self, bazi_data: Dict, rule_types: List[str] = None, scope: Optional[str] = None) -> List[Dict]:
         """
         匹配规则
         
         Args:
             bazi_data: 八字数据
             rule_types: 要匹配的规则类型列表，None表示匹配所有类型
+            scope: SCOPE_CHART 只匹配只依赖四柱 + 性别的规则，SCOPE_MOMENT 只匹配其余规则，None 表示全部
             
         Returns:
             List[Dict]: 匹配的规则列表，按优先级排序
         """
         if self.use_index:
-            return self._match_rules_fast(bazi_data, rule_types)
+            return self._match_rules_fast(bazi_data, rule_types, scope)
         else:
-            return self._match_rules_simple(bazi_data, rule_types)
+            return self._match_rules_simple(bazi_data, rule_types, scope)
     
-    def _match_rules_fast(self, bazi_data: Dict, rule_types: List[str] = None) -> List[Dict]:
+    def _match_rules_fast(self, bazi_data: Dict, rule_types: List[str] = None, scope: Optional[str] = None) -> List[Dict]:
         """快速匹配（使用索引）"""
         # 1. 从索引中快速筛选候选规则
         # 使用字典来去重（key为rule_id），因为字典不能作为set的元素
@@ -186,6 +219,8 @@ class EnhancedRuleEngine:
         else:
             # 如果没有指定规则类型，也要过滤掉未启用的规则
             candidates = [r for r in candidates if r.get('enabled', True)]
+        if scope is not None:
+            candidates = [r for r in candidates if self._in_scope(r, scope)]
         
         # 调试：统计70067-70088范围的候选规则
         candidates_70067_88 = [r for r in candidates if 'FORMULA_身体_700' in r.get('rule_id', '')]
@@ -257,7 +292,7 @@ class EnhancedRuleEngine:
         
         return matched_rules
     
-    def _match_rules_simple(self, bazi_data: Dict, rule_types: List[str] = None) -> List[Dict]:
+    def _match_rules_simple(self, bazi_data: Dict, rule_types: List[str] = None, scope: Optional[str] = None) -> List[Dict]:
         """简单匹配（不使用索引，遍历所有规则）"""
         matched_rules = []
         
@@ -268,6 +303,8 @@ class EnhancedRuleEngine:
                             if r.get('rule_type') in rule_types_set and r.get('enabled', True)]
         else:
             rules_to_check = [r for r in self.rules if r.get('enabled', True)]
+        if scope is not None:
+            rules_to_check = [r for r in rules_to_check if self._in_scope(r, scope)]
         
         # 并行匹配规则（提高性能）- 优化：增加超时控制
         cpu_count = os.cpu_count() or 4
@@ -310,6 +347,7 @@ class EnhancedRuleEngine:
     def add_rule(self, rule: Dict):
         """添加规则"""
         self.rules.append(rule)
+        self._moment_fields.clear()
         if self.use_index:
             self._build_advanced_index()
 
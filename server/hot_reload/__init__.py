@@ -48,7 +48,10 @@ from .worker_sync import (
     start_worker_sync,
     trigger_all_workers,
     get_worker_sync_status,
+    FileChangeBus,
+    get_file_change_bus,
 )
+from .fs_watcher import FileChangeWatcher
 
 __all__ = [
     # 核心管理器
@@ -90,6 +93,11 @@ __all__ = [
     'start_worker_sync',
     'trigger_all_workers',
     'get_worker_sync_status',
+    'FileChangeBus',
+    'get_file_change_bus',
+    
+    # 文件变化监听
+    'FileChangeWatcher',
 ]
 
 
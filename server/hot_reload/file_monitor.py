@@ -3,6 +3,9 @@
 """
 文件监控模块 - 监控所有代码文件的变化
 支持实时监控、代码完整性检查、语法验证
+
+变化检测由节点级 FileChangeBus 推送（inotify，轮询兜底），本进程不再周期性遍历目录；
+只对变化的文件重新计算哈希和语法。
 """
 
 import os
@@ -65,15 +68,25 @@ class FileMonitor:
         # 初始化文件状态
         self._scan_files()
         
-        # 启动监控线程
-        self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._thread.start()
-        
-        logger.info(f"✓ 文件监控器已启动（检查间隔: {self._check_interval}秒）")
+        # 订阅节点级文件变化（inotify 推送；订阅失败时退化为本进程轮询）
+        try:
+            from .worker_sync import get_file_change_bus
+            get_file_change_bus().subscribe(self._on_changes)
+            logger.info("✓ 文件监控器已启动（事件驱动）")
+        except Exception as e:
+            logger.warning(f"⚠ 文件变化订阅失败，改用轮询: {e}")
+            self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
+            self._thread.start()
+            logger.info(f"✓ 文件监控器已启动（检查间隔: {self._check_interval}秒）")
     
     def stop(self):
         """停止文件监控"""
         self._running = False
+        try:
+            from .worker_sync import get_file_change_bus
+            get_file_change_bus().unsubscribe(self._on_changes)
+        except Exception:
+            pass
         if self._thread:
             self._thread.join(timeout=2)
         logger.info("✓ 文件监控器已停止")
@@ -210,23 +223,9 @@ class FileMonitor:
                     if any(pattern in rel_path for pattern in self.exclude_patterns):
                         continue
                     
-                    # 检查文件是否变化
-                    old_state = self._file_states.get(file_path)
-                    new_state = self._update_file_state(file_path)
-                    
-                    if new_state is None:
-                        continue
-                    
-                    # 检测变化
-                    if old_state is None:
-                        # 新文件
-                        changed_files.append(('created', file_path, new_state))
-                    elif old_state['hash'] != new_state['hash']:
-                        # 文件内容变化
-                        change_type = 'modified'
-                        if not new_state['syntax_valid']:
-                            change_type = 'syntax_error'
-                        changed_files.append((change_type, file_path, new_state))
+                    change = self._detect_change(file_path)
+                    if change:
+                        changed_files.append(change)
         
         # 检查删除的文件
         current_files = set()
@@ -248,14 +247,61 @@ class FileMonitor:
                 changed_files.append(('deleted', file_path, None))
                 del self._file_states[file_path]
         
-        # 触发回调
-        if changed_files:
-            for change_type, file_path, state in changed_files:
-                for callback in self._callbacks:
-                    try:
-                        callback(file_path, change_type, state)
-                    except Exception as e:
-                        logger.info(f"⚠ 回调执行失败: {e}")
+        self._dispatch(changed_files)
+    
+    def _detect_change(self, file_path: str):
+        """重新计算单个文件状态，返回 (change_type, file_path, state)，未变化返回 None"""
+        old_state = self._file_states.get(file_path)
+        new_state = self._update_file_state(file_path)
+        
+        if new_state is None:
+            return None
+        
+        if old_state is None:
+            # 新文件
+            return ('created', file_path, new_state)
+        if old_state['hash'] != new_state['hash']:
+            # 文件内容变化
+            change_type = 'modified'
+            if not new_state['syntax_valid']:
+                change_type = 'syntax_error'
+            return (change_type, file_path, new_state)
+        return None
+    
+    def _is_watched(self, file_path: str) -> bool:
+        if not file_path.endswith('.py'):
+            return False
+        rel_path = os.path.relpath(file_path, project_root)
+        if any(pattern in rel_path for pattern in self.exclude_patterns):
+            return False
+        return any(
+            rel_path == directory or rel_path.startswith(directory.rstrip('/') + os.sep)
+            for directory in self.watch_directories
+        )
+    
+    def _on_changes(self, changes: Dict[str, str]):
+        """节点级变化批次回调：只处理变化的文件"""
+        changed_files = []
+        for file_path, change_type in changes.items():
+            if not self._is_watched(file_path):
+                continue
+            if change_type == 'deleted' and not os.path.exists(file_path):
+                if self._file_states.pop(file_path, None) is not None:
+                    changed_files.append(('deleted', file_path, None))
+                continue
+            change = self._detect_change(file_path)
+            if change:
+                changed_files.append(change)
+        self._dispatch(changed_files)
+    
+    def _dispatch(self, changed_files: List):
+        """触发回调"""
+        for change_type, file_path, state in changed_files:
+            for callback in self._callbacks:
+                try:
+                    callback(file_path, change_type, state)
+                except Exception as e:
+                    logger.info(f"⚠ 回调执行失败: {e}")
     
     def get_file_status(self, file_path: str) -> Optional[Dict]:
         """获取文件状态"""
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件变化监听 - inotify 优先，轮询兜底
+
+- Linux 上 watchdog 的 Observer 基于 inotify：空闲时不做任何目录扫描，变化亚秒级送达
+- 未安装 watchdog、inotify 不可用（如 watch 数量超限）或 HOT_RELOAD_WATCH_MODE=polling 时，
+  退化为按 mtime 轮询
+- 变化按 debounce 窗口合并成批次回调：保存文件、git pull 等连续写入只触发一次
+
+使用示例：
+    watcher = FileChangeWatcher(['/app/server'], on_changes=lambda batch: print(batch))
+    watcher.start()     # 返回实际使用的后端：inotify / polling / ...
+    # batch: {'/app/server/main.py': 'modified', ...}
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODE = os.getenv("HOT_RELOAD_WATCH_MODE", "auto").lower()  # auto / polling
+WATCH_DEBOUNCE = float(os.getenv("HOT_RELOAD_DEBOUNCE", "0.3"))
+POLL_INTERVAL = float(os.getenv("HOT_RELOAD_POLL_INTERVAL", "5"))
+
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    '__pycache__', '.mypy_cache', '.pytest_cache', '.git', 'node_modules', '.venv', 'venv',
+})
+
+# 文件路径 -> created / modified / deleted
+ChangeBatch = Dict[str, str]
+
+
+def _merge_change(previous: Optional[str], current: str) -> str:
+    """同一批次内同一文件的多次变化合并为一次"""
+    if previous == 'created' and current == 'modified':
+        return 'created'
+    if previous == 'deleted' and current == 'created':
+        return 'modified'
+    return current
+
+
+def _is_python_file(path: str) -> bool:
+    return path.endswith('.py')
+
+
+class ChangeBatcher:
+    """
+    变化合并器：最后一次变化后静默 debounce 秒再回调；
+    持续写入时最多推迟 max_delay 秒，避免批次无限延后
+    """
+
+    def __init__(self, callback: Callable[[ChangeBatch], None], debounce: float = WATCH_DEBOUNCE,
+                 max_delay: Optional[float] = None):
+        self._callback = callback
+        self.debounce = debounce
+        self.max_delay = max_delay if max_delay is not None else max(debounce * 10, 2.0)
+        self._pending: ChangeBatch = {}
+        self._first_at = 0.0
+        self._last_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, path: str, change_type: str) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_at = now
+            self._pending[path] = _merge_change(self._pending.get(path), change_type)
+            self._last_at = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="hot-reload-batcher")
+                self._thread.start()
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                deadline = min(self._last_at + self.debounce, self._first_at + self.max_delay)
+                wait = deadline - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                batch, self._pending = self._pending, {}
+            try:
+                self._callback(batch)
+            except Exception as e:
+                logger.warning(f"⚠ 文件变化回调执行失败: {e}")
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """watchdog 事件 -> ChangeBatcher"""
+
+    def __init__(self, watcher: 'FileChangeWatcher'):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        event_type = event.event_type
+        if event_type == 'moved':
+            self._watcher._record(event.src_path, 'deleted')
+            self._watcher._record(event.dest_path, 'created')
+        elif event_type in ('created', 'modified', 'deleted'):
+            self._watcher._record(event.src_path, event_type)
+        elif event_type == 'closed':
+            # IN_CLOSE_WRITE：写入完成
+            self._watcher._record(event.src_path, 'modified')
+
+
+class FileChangeWatcher:
+    """目录监听器（inotify / 轮询），变化按批次回调"""
+
+    def __init__(
+        self,
+        directories: Iterable[str],
+        on_changes: Callable[[ChangeBatch], None],
+        include: Callable[[str], bool] = _is_python_file,
+        exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+        recursive: bool = True,
+        debounce: float = WATCH_DEBOUNCE,
+        poll_interval: float = POLL_INTERVAL,
+        mode: str = WATCH_MODE,
+    ):
+        """
+        Args:
+            directories: 监听的目录（不存在的目录会被忽略）
+            on_changes: 批次回调，参数为 {文件路径: 变化类型}
+            include: 文件过滤函数，默认只关心 .py 文件
+            exclude_dirs: 排除的目录名
+            recursive: 是否监听子目录
+            debounce: 合并窗口（秒）
+            poll_interval: 轮询模式的扫描间隔（秒）
+            mode: auto（inotify 优先）/ polling
+        """
+        self.directories = [os.path.abspath(d) for d in directories if os.path.isdir(d)]
+        self.include = include
+        self.exclude_dirs = frozenset(exclude_dirs)
+        self.recursive = recursive
+        self.poll_interval = poll_interval
+        self.mode = mode
+        self.backend: Optional[str] = None
+        self._on_changes = on_changes
+        self._debounce = debounce
+        self._batcher = ChangeBatcher(on_changes, debounce)
+        self._observer = None
+        self._poll_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._snapshot: Dict[str, int] = {}
+
+    def start(self) -> str:
+        """启动监听，返回实际使用的后端"""
+        if self.backend is not None:
+            return self.backend
+        if self.mode != 'polling' and WATCHDOG_AVAILABLE:
+            try:
+                self._start_observer()
+            except Exception as e:
+                logger.warning(f"⚠ 文件事件监听不可用，改用轮询: {e}")
+                self._stop_observer()
+        if self.backend is None:
+            self._start_polling()
+        return self.backend
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._stop_observer()
+        if self._poll_thread:
+            self._poll_thread.join(timeout=2)
+            self._poll_thread = None
+        self._batcher.close()
+        self._batcher = ChangeBatcher(self._on_changes, self._debounce)
+        self.backend = None
+
+    def _start_observer(self) -> None:
+        observer = Observer()
+        handler = _WatchdogHandler(self)
+        for directory in self.directories:
+            observer.schedule(handler, directory, recursive=self.recursive)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        name = type(observer).__name__
+        self.backend = 'inotify' if 'Inotify' in name else name.replace('Observer', '').lower() or 'events'
+
+    def _stop_observer(self) -> None:
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=2)
+            except Exception:
+                pass
+            self._observer = None
+
+    def _start_polling(self) -> None:
+        self._snapshot = self._take_snapshot()
+        self._stop_event.clear()
+        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True, name="hot-reload-poller")
+        self._poll_thread.start()
+        self.backend = 'polling'
+
+    def _is_excluded(self, path: str) -> bool:
+        """只检查监听目录以下的路径片段（项目根目录本身的路径不参与排除）"""
+        for directory in self.directories:
+            if path.startswith(directory + os.sep):
+                parts = path[len(directory) + 1:].split(os.sep)
+                return any(part in self.exclude_dirs for part in parts)
+        return False
+
+    def _record(self, path: str, change_type: str) -> None:
+        path = os.fsdecode(path)
+        if not self.include(path) or self._is_excluded(path):
+            return
+        self._batcher.add(path, change_type)
+
+    def _take_snapshot(self) -> Dict[str, int]:
+        snapshot: Dict[str, int] = {}
+        for directory in self.directories:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [d for d in dirs if d not in self.exclude_dirs] if self.recursive else []
+                for filename in files:
+                    path = os.path.join(root, filename)
+                    if not self.include(path):
+                        continue
+                    try:
+                        snapshot[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+        return snapshot
+
+    def _poll_loop(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                current = self._take_snapshot()
+                for path, mtime in current.items():
+                    previous = self._snapshot.get(path)
+                    if previous is None:
+                        self._batcher.add(path, 'created')
+                    elif previous != mtime:
+                        self._batcher.add(path, 'modified')
+                for path in self._snapshot.keys() - current.keys():
+                    self._batcher.add(path, 'deleted')
+                self._snapshot = current
+            except Exception as e:
+                logger.warning(f"⚠ 文件轮询失败: {e}")
+
+
+def is_under(path: str, directories: List[str]) -> bool:
+    """path 是否位于任一目录之下"""
+    for directory in directories:
+        directory = os.path.abspath(directory)
+        if path == directory or path.startswith(directory.rstrip(os.sep) + os.sep):
+            return True
+    return False
@@ -66,7 +66,7 @@ class HotReloadManager:
         # 启动文件监控器
         try:
             file_monitor = get_file_monitor()
-            file_monitor.start(check_interval=5)  # 5秒检查一次
+            file_monitor.start(check_interval=5)  # 订阅节点级文件变化（订阅失败时5秒轮询一次）
             # 注册文件变化回调
             file_monitor.register_callback(self._on_file_changed)
             logger.info("✓ 文件监控器已启动")
@@ -8,6 +8,9 @@
 2. 动态重新加载 Servicer 类
 3. 支持热替换，不中断服务
 4. 支持回滚到上一版本
+
+文件变化由节点级 FileChangeBus 推送（inotify，轮询兜底），只有不在其监听范围内的
+目录才由本进程按 check_interval 轮询。
 """
 
 import os
@@ -21,6 +24,8 @@ import logging
 from typing import Dict, Optional, Callable, Any, List, Type
 from datetime import datetime
 
+from .fs_watcher import is_under
+
 # 添加项目根目录到路径
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
@@ -66,6 +71,10 @@ class MicroserviceReloader:
         self._file_states: Dict[str, Dict] = {}
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._subscribed = False
+        # 不在节点级监听范围内、仍需轮询的目录
+        self._poll_directories: List[str] = []
+        self._check_lock = threading.Lock()
         
         # 版本管理
         self._current_version = 0
@@ -96,29 +105,68 @@ class MicroserviceReloader:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._thread.start()
         
-        logger.info(f"✓ [{self.service_name}] 微服务热更新监控已启动（检查间隔: {self.check_interval}秒）")
+        self._poll_directories = [d for d in self.watch_directories if os.path.exists(d)]
+        try:
+            from .worker_sync import FileChangeBus, get_file_change_bus
+            bus_directories = [os.path.join(project_root, d) for d in FileChangeBus.WATCH_DIRECTORIES]
+            get_file_change_bus().subscribe(self._on_file_changes)
+            self._subscribed = True
+            self._poll_directories = [d for d in self._poll_directories if not is_under(d, bus_directories)]
+        except Exception as e:
+            logger.warning(f"⚠ [{self.service_name}] 文件变化订阅失败，改用轮询: {e}")
+        
+        if self._poll_directories:
+            self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
+            self._thread.start()
+            logger.info(
+                f"✓ [{self.service_name}] 微服务热更新监控已启动"
+                f"（轮询 {len(self._poll_directories)} 个目录，检查间隔: {self.check_interval}秒）"
+            )
+        else:
+            logger.info(f"✓ [{self.service_name}] 微服务热更新监控已启动（事件驱动）")
     
     def stop(self):
         """停止热更新监控"""
         self._running = False
+        if self._subscribed:
+            try:
+                from .worker_sync import get_file_change_bus
+                get_file_change_bus().unsubscribe(self._on_file_changes)
+            except Exception:
+                pass
+            self._subscribed = False
         if self._thread:
             self._thread.join(timeout=2)
         logger.info(f"✓ [{self.service_name}] 微服务热更新监控已停止")
     
     def _monitor_loop(self):
-        """监控循环"""
+        """监控循环（仅轮询节点级监听范围外的目录）"""
         while self._running:
             try:
-                if self._check_and_reload():
+                if self._check_and_reload(self._poll_directories):
                     logger.info(f"✓ [{self.service_name}] 热更新完成")
             except Exception as e:
                 logger.warning(f"⚠ [{self.service_name}] 热更新检查失败: {e}")
             
             time.sleep(self.check_interval)
     
+    def _on_file_changes(self, changes: Dict[str, str]):
+        """节点级变化批次回调：只检查本服务监控目录内变化的文件"""
+        paths = [
+            path for path in changes
+            if path.endswith('.py') and '__pycache__' not in path and is_under(path, self.watch_directories)
+        ]
+        if not paths:
+            return
+        try:
+            with self._check_lock:
+                changed_files = [change for change in map(self._detect_file_change, paths) if change]
+            if self._apply_changes(changed_files):
+                logger.info(f"✓ [{self.service_name}] 热更新完成")
+        except Exception as e:
+            logger.warning(f"⚠ [{self.service_name}] 热更新检查失败: {e}")
+    
     def _scan_files(self):
         """扫描所有监控的文件"""
         for directory in self.watch_directories:
@@ -214,61 +262,71 @@ class MicroserviceReloader:
             logger.warning(f"⚠ [{self.service_name}] 检查语法失败 {file_path}: {e}")
             return False
     
-    def _check_and_reload(self) -> bool:
-        """检查文件变化并重新加载"""
+    def _check_and_reload(self, directories: Optional[List[str]] = None) -> bool:
+        """检查文件变化并重新加载（全量扫描 directories，默认为全部监控目录）"""
         changed_files = []
         
-        for directory in self.watch_directories:
-            if not os.path.exists(directory):
-                continue
-            
-            for root, dirs, files in os.walk(directory):
-                dirs[:] = [d for d in dirs if d not in {'__pycache__', '.mypy_cache', '.pytest_cache'}]
+        with self._check_lock:
+            for directory in (directories if directories is not None else self.watch_directories):
+                if not os.path.exists(directory):
+                    continue
                 
-                for filename in files:
-                    if not filename.endswith('.py'):
-                        continue
+                for root, dirs, files in os.walk(directory):
+                    dirs[:] = [d for d in dirs if d not in {'__pycache__', '.mypy_cache', '.pytest_cache'}]
                     
-                    file_path = os.path.join(root, filename)
-                    old_state = self._file_states.get(file_path)
-                    
-                    # 先快速检查修改时间（不计算哈希）
-                    new_state = self._update_file_state(file_path, force_hash=False)
-                    
-                    if new_state is None:
-                        continue
-                    
-                    # 检测变化（优先使用修改时间，性能更好）
-                    if old_state is None:
-                        # 新文件，需要计算哈希确认
-                        new_state = self._update_file_state(file_path, force_hash=True)
-                        if new_state and new_state['syntax_valid']:
-                            changed_files.append(('created', file_path))
-                    elif old_state['mtime'] != new_state['mtime']:
-                        # 修改时间变化，计算哈希确认
-                        new_state = self._update_file_state(file_path, force_hash=True)
-                        if new_state and new_state['hash'] != old_state.get('hash'):
-                            if new_state['syntax_valid']:
-                                changed_files.append(('modified', file_path))
-                            else:
-                                logger.warning(f"⚠ [{self.service_name}] 文件有语法错误，跳过: {file_path}")
+                    for filename in files:
+                        if not filename.endswith('.py'):
+                            continue
+                        
+                        change = self._detect_file_change(os.path.join(root, filename))
+                        if change:
+                            changed_files.append(change)
         
-        if changed_files:
-            logger.info(f"\n🔄 [{self.service_name}] 检测到 {len(changed_files)} 个文件变化:")
-            for change_type, file_path in changed_files:
-                rel_path = os.path.relpath(file_path, project_root)
-                logger.info(f"   {change_type}: {rel_path}")
-            
-            # 检查是否是共享文件变化，如果是，触发所有依赖服务
-            for change_type, file_path in changed_files:
-                rel_path = os.path.relpath(file_path, project_root)
-                # 如果变化的是共享文件（src/ 或 server/），触发依赖服务
-                if rel_path.startswith('src/') or rel_path.startswith('server/'):
-                    trigger_dependent_services(rel_path)
-            
-            return self._reload_servicer()
+        return self._apply_changes(changed_files)
+    
+    def _detect_file_change(self, file_path: str) -> Optional[tuple]:
+        """检测单个文件是否变化，返回 (change_type, file_path)，未变化或语法错误返回 None"""
+        old_state = self._file_states.get(file_path)
         
-        return False
+        # 先快速检查修改时间（不计算哈希）
+        new_state = self._update_file_state(file_path, force_hash=False)
+        
+        if new_state is None:
+            return None
+        
+        # 检测变化（优先使用修改时间，性能更好）
+        if old_state is None:
+            # 新文件，需要计算哈希确认
+            new_state = self._update_file_state(file_path, force_hash=True)
+            if new_state and new_state['syntax_valid']:
+                return ('created', file_path)
+        elif old_state['mtime'] != new_state['mtime']:
+            # 修改时间变化，计算哈希确认
+            new_state = self._update_file_state(file_path, force_hash=True)
+            if new_state and new_state['hash'] != old_state.get('hash'):
+                if new_state['syntax_valid']:
+                    return ('modified', file_path)
+                logger.warning(f"⚠ [{self.service_name}] 文件有语法错误，跳过: {file_path}")
+        return None
+    
+    def _apply_changes(self, changed_files: List[tuple]) -> bool:
+        """对检测到的变化触发依赖服务并重新加载 Servicer"""
+        if not changed_files:
+            return False
+        
+        logger.info(f"\n🔄 [{self.service_name}] 检测到 {len(changed_files)} 个文件变化:")
+        for change_type, file_path in changed_files:
+            rel_path = os.path.relpath(file_path, project_root)
+            logger.info(f"   {change_type}: {rel_path}")
+        
+        # 检查是否是共享文件变化，如果是，触发所有依赖服务
+        for change_type, file_path in changed_files:
+            rel_path = os.path.relpath(file_path, project_root)
+            # 如果变化的是共享文件（src/ 或 server/），触发依赖服务
+            if rel_path.startswith('src/') or rel_path.startswith('server/'):
+                trigger_dependent_services(rel_path)
+        
+        return self._reload_servicer()
     
     def _reload_servicer(self) -> bool:
         """重新加载 Servicer 类"""
@@ -318,12 +376,7 @@ class MicroserviceReloader:
                 self._current_version += 1
                 self._current_servicer = new_servicer
             
-            # 清除 DynamicServicer 的方法缓存
-            for ds in self._dynamic_servicers:
-                try:
-                    ds.clear_cache()
-                except Exception as e:
-                    logger.debug(f"   ⚠ 清除 DynamicServicer 缓存失败: {e}")
+            self._refresh_dispatchers()
             
             # 记录版本历史（包含备份信息）
             self._record_version(new_servicer_class, backup_info)
@@ -671,6 +724,7 @@ class MicroserviceReloader:
             with self._servicer_lock:
                 self._current_servicer = new_servicer
                 # 不减少版本号，因为这是回滚操作
+            self._refresh_dispatchers()
             
             # 更新文件状态
             self._scan_files()
@@ -734,6 +788,7 @@ class MicroserviceReloader:
                 
                 with self._servicer_lock:
                     self._current_servicer = new_servicer
+                self._refresh_dispatchers()
                 
                 self._scan_files()
                 
@@ -756,6 +811,15 @@ class MicroserviceReloader:
         """设置 Servicer 实例"""
         with self._servicer_lock:
             self._current_servicer = servicer
+        self._refresh_dispatchers()
+    
+    def _refresh_dispatchers(self):
+        """替换 _current_servicer 后调用：为已注册的 DynamicServicer 发布新 Servicer 的方法表"""
+        for ds in self._dynamic_servicers:
+            try:
+                ds.clear_cache()
+            except Exception as e:
+                logger.debug(f"   ⚠ 清除 DynamicServicer 缓存失败: {e}")
     
     def get_status(self) -> Dict:
         """获取热更新状态"""
@@ -781,6 +845,12 @@ class DynamicServicer:
     
     用于包装实际的 Servicer，支持热替换
     所有 gRPC 调用都会转发到当前的 Servicer 实例
+    
+    分发方式：
+    - 首次访问公开方法时创建该方法名对应的固定分发函数并存为实例属性（gRPC 注册时只取一次
+      方法引用，固定分发函数保证热更新后已注册的 handler 也会转发到新 Servicer）
+    - 分发函数每次调用只读取当前发布的方法表（不可变 dict）并查找方法，不加锁
+    - 热更新时由 clear_cache() 为新 Servicer 构建完整方法表，整体替换引用（原子发布）
     """
     
     def __init__(self, reloader: MicroserviceReloader):
@@ -791,83 +861,87 @@ class DynamicServicer:
             reloader: 微服务热更新器实例
         """
         self._reloader = reloader
-        # 缓存方法引用（可选优化）
+        # 当前发布的方法表：方法名 -> 绑定到当前 Servicer 的方法（发布后不再修改，只整体替换）
         self._method_cache: Dict[str, Any] = {}
+        # 方法名 -> 固定分发函数
+        self._dispatchers: Dict[str, Callable] = {}
+        # 仅用于发布方法表（写路径），调用路径不加锁
         self._cache_lock = threading.RLock()
     
-    def __getattribute__(self, name: str):
+    def __getattr__(self, name: str):
         """
-        动态转发方法调用到当前 Servicer
+        动态转发方法调用到当前 Servicer（仅在实例上找不到属性时调用）
         
-        使用 __getattribute__ 确保所有属性访问都经过这里
-        但需要小心处理内部属性，避免无限递归
+        公开方法首次访问时创建固定分发函数并放入实例属性，之后的访问是普通属性读取；
+        非可调用属性不缓存，每次从当前 Servicer 读取
         """
-        # 处理内部属性（避免无限递归）
+        # 内部属性不转发（避免初始化前访问时无限递归）
         if name.startswith('_'):
-            return object.__getattribute__(self, name)
-        
-        # 获取 reloader（使用 object.__getattribute__ 避免递归）
-        reloader = object.__getattribute__(self, '_reloader')
-        method_cache = object.__getattribute__(self, '_method_cache')
-        cache_lock = object.__getattribute__(self, '_cache_lock')
+            raise AttributeError(name)
         
         # 获取当前 Servicer
-        servicer = reloader.get_current_servicer()
+        servicer = self._reloader.get_current_servicer()
         if servicer is None:
             raise RuntimeError(f"Servicer 未初始化")
         
-        # 尝试从缓存获取
-        with cache_lock:
-            if name in method_cache:
-                cached_method = method_cache[name]
-                # 验证缓存的方法是否仍然有效（检查 Servicer 是否改变）
-                if hasattr(cached_method, '__self__') and cached_method.__self__ is servicer:
-                    return cached_method
-        
-        # 从 Servicer 获取属性/方法
         try:
             attr = getattr(servicer, name)
-            
-            # 如果是可调用对象（方法），缓存它
-            if callable(attr):
-                # 使用 types.MethodType 创建绑定方法，确保每次调用都使用最新的 Servicer
-                import types
-                if isinstance(attr, types.MethodType):
-                    # 重新绑定到当前 Servicer
-                    bound_method = types.MethodType(attr.__func__, servicer)
-                    with cache_lock:
-                        method_cache[name] = bound_method
-                    return bound_method
-                else:
-                    # 其他可调用对象（如函数）
-                    with cache_lock:
-                        method_cache[name] = attr
-                    return attr
-            else:
-                # 非可调用属性
-                return attr
-                
         except AttributeError:
             # 如果 Servicer 没有该属性，抛出 AttributeError
             raise AttributeError(f"'{type(servicer).__name__}' object has no attribute '{name}'")
+        
+        if not callable(attr):
+            # 非可调用属性
+            return attr
+        
+        with self._cache_lock:
+            dispatcher = self._dispatchers.get(name)
+            if dispatcher is None:
+                dispatcher = self._make_dispatcher(name)
+                self._dispatchers[name] = dispatcher
+                self.__dict__[name] = dispatcher
+        return dispatcher
     
-    def __getattr__(self, name: str):
-        """
-        备用方法（当 __getattribute__ 没有找到时调用）
+    def _make_dispatcher(self, name: str) -> Callable:
+        """创建方法名对应的固定分发函数：每次调用读取一次当前方法表"""
+        state = self.__dict__
+        resolve = self._resolve
         
-        这通常不应该被调用，因为 __getattribute__ 应该处理所有情况
-        但保留它作为安全网
-        """
-        reloader = object.__getattribute__(self, '_reloader')
-        servicer = reloader.get_current_servicer()
-        if servicer is None:
-            raise RuntimeError(f"Servicer 未初始化")
-        return getattr(servicer, name)
+        def dispatch(*args, **kwargs):
+            try:
+                method = state['_method_cache'][name]
+            except KeyError:
+                method = resolve(name)
+            return method(*args, **kwargs)
+        
+        dispatch.__name__ = name
+        dispatch.__qualname__ = f"DynamicServicer.{name}"
+        return dispatch
+    
+    def _resolve(self, name: str) -> Callable:
+        """方法表未命中（首次调用或新增方法）：从当前 Servicer 获取并发布新方法表"""
+        # 读取 Servicer 与发布在同一把写锁内，避免与热更新交错时发布旧方法
+        with self._cache_lock:
+            servicer = self._reloader.get_current_servicer()
+            if servicer is None:
+                raise RuntimeError(f"Servicer 未初始化")
+            method = getattr(servicer, name)
+            table = dict(self._method_cache)
+            table[name] = method
+            self._method_cache = table
+        return method
     
     def clear_cache(self):
-        """清除方法缓存（在热更新后调用）"""
+        """为当前 Servicer 重建方法表并整体发布（在热更新后调用）"""
         with self._cache_lock:
-            self._method_cache.clear()
+            servicer = self._reloader.get_current_servicer()
+            table: Dict[str, Any] = {}
+            if servicer is not None:
+                for name in list(self._dispatchers):
+                    method = getattr(servicer, name, None)
+                    if callable(method):
+                        table[name] = method
+            self._method_cache = table
 
 
 def create_hot_reload_server(
@@ -879,7 +953,8 @@ def create_hot_reload_server(
     server_options: List = None,
     max_workers: int = 20,
     check_interval: int = 30,
-    listen_addr: str = None
+    listen_addr: str = None,
+    interceptors: List = None
 ):
     """
     创建支持热更新的 gRPC 服务器
@@ -894,6 +969,7 @@ def create_hot_reload_server(
         max_workers: 线程池大小
         check_interval: 热更新检查间隔
         listen_addr: 监听地址（默认: [::]:port，可自定义如 localhost:port）
+        interceptors: gRPC 服务端拦截器列表
     
     Returns:
         tuple: (server, reloader)
@@ -933,7 +1009,8 @@ def create_hot_reload_server(
     # 创建 gRPC 服务器
     server = grpc.server(
         futures.ThreadPoolExecutor(max_workers=max_workers),
-        options=server_options
+        options=server_options,
+        interceptors=interceptors
     )
     
     # 注册动态 Servicer
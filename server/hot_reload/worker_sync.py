@@ -16,6 +16,13 @@
 使用方法：
 1. 在 main.py 启动时调用 WorkerSyncManager.start()
 2. 在 hot-reload API 中调用 WorkerSyncManager.trigger_all_workers()
+
+信号文件变化通过 inotify 即时唤醒监控线程（不可用时按 check_interval 轮询）。
+
+文件变化广播（FileChangeBus）：
+- 每个节点只有一个进程（文件锁选主）监听代码目录，其余 worker / 微服务进程不再各自扫描
+- 主进程把合并后的变化批次写入文件变化信号文件，订阅方按版本号增量读取后回调
+- 主进程退出后锁自动释放，其他进程在 LEADER_RETRY_INTERVAL 内接替
 """
 
 import os
@@ -25,15 +32,69 @@ import tempfile
 import time
 import threading
 import logging
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List
 from pathlib import Path
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 # 添加项目根目录到路径
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from .fs_watcher import FileChangeWatcher
+
 logger = logging.getLogger(__name__)
 
+# inotify 可用时，信号检查只作为兜底，间隔可以放宽
+SIGNAL_SAFETY_INTERVAL = 30
+# 信号文件只能轮询时的检查间隔
+SIGNAL_POLL_INTERVAL = 2
+
+
+def _watch_signal_file(signal_file: str, wakeup: threading.Event) -> Optional[FileChangeWatcher]:
+    """监听单个信号文件，变化时唤醒等待线程；只能轮询时返回 None（由调用方按间隔检查）"""
+    signal_dir = os.path.dirname(signal_file) or '/tmp'
+    signal_name = os.path.basename(signal_file)
+    try:
+        os.makedirs(signal_dir, exist_ok=True)
+        watcher = FileChangeWatcher(
+            [signal_dir],
+            on_changes=lambda batch: wakeup.set(),
+            include=lambda path: os.path.basename(path) == signal_name,
+            recursive=False,
+            debounce=0.05,
+        )
+        if watcher.mode == 'polling':
+            return None
+        if watcher.start() == 'polling':
+            watcher.stop()
+            return None
+        return watcher
+    except Exception as e:
+        logger.warning(f"⚠ 信号文件监听启动失败，改用轮询: {e}")
+        return None
+
+
+def _atomic_write_json(path: str, data: Dict[str, Any]) -> None:
+    """原子写入 JSON：先写临时文件再 rename（避免多进程读到半写内容）"""
+    directory = os.path.dirname(path) or '/tmp'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class WorkerSyncManager:
     """多 Worker 热更新同步管理器"""
@@ -50,11 +111,13 @@ class WorkerSyncManager:
         self._thread: Optional[threading.Thread] = None
         self._last_signal_version = 0
         self._last_signal_time = 0
-        self._check_interval = 2  # 每 2 秒检查一次信号文件
+        self._check_interval = SIGNAL_POLL_INTERVAL  # 无 inotify 时每 2 秒检查一次信号文件
         self._reload_callback: Optional[Callable] = None
         self._worker_id = f"{os.getpid()}"
         self._last_reload_success = None  # 上次重载是否成功
         self._last_reload_time = 0  # 上次重载时间
+        self._wakeup = threading.Event()
+        self._signal_watcher: Optional[FileChangeWatcher] = None
         
     @classmethod
     def get_instance(cls) -> 'WorkerSyncManager':
@@ -80,6 +143,9 @@ class WorkerSyncManager:
         # 初始化：读取当前信号状态
         self._read_current_signal()
         
+        # 信号文件变化即时唤醒（inotify），不可用时退化为定时检查
+        self._signal_watcher = _watch_signal_file(self.SIGNAL_FILE, self._wakeup)
+        
         # 启动监控线程
         self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._thread.start()
@@ -89,6 +155,10 @@ class WorkerSyncManager:
     def stop(self):
         """停止同步监控"""
         self._running = False
+        self._wakeup.set()
+        if self._signal_watcher:
+            self._signal_watcher.stop()
+            self._signal_watcher = None
         if self._thread:
             self._thread.join(timeout=2)
         logger.info(f"✓ [Worker-{self._worker_id}] 热更新同步监控已停止")
@@ -105,14 +175,16 @@ class WorkerSyncManager:
             logger.warning(f"[Worker-{self._worker_id}] 读取信号文件失败: {e}")
     
     def _monitor_loop(self):
-        """监控循环"""
+        """监控循环（信号文件变化时立即唤醒）"""
         while self._running:
             try:
                 self._check_signal()
             except Exception as e:
                 logger.warning(f"[Worker-{self._worker_id}] 检查信号失败: {e}")
             
-            time.sleep(self._check_interval)
+            timeout = self._check_interval if self._signal_watcher is None else SIGNAL_SAFETY_INTERVAL
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
     
     def _check_signal(self):
         """检查信号文件"""
@@ -325,7 +397,205 @@ class WorkerSyncManager:
             'last_reload_success': self._last_reload_success,
             'last_reload_time': self._last_reload_time,
             'signal_file': self.SIGNAL_FILE,
-            'ack_dir': self.ACK_DIR
+            'ack_dir': self.ACK_DIR,
+            'watch_backend': self._signal_watcher.backend if self._signal_watcher else 'polling'
+        }
+
+
+class FileChangeBus:
+    """
+    节点内代码文件变化广播
+
+    - 进程通过 subscribe() 订阅变化批次（{文件路径: created/modified/deleted}）
+    - 持有文件锁的进程启动目录监听（inotify / 轮询兜底），把批次写入信号文件
+    - 信号文件保留最近 MAX_BATCHES 个批次，订阅方按版本号增量处理，不会漏掉连续批次
+    - 信号文件重建时生成新的 epoch（发布进程 pid + 启动时间），订阅方发现 epoch 变化
+      或版本号回退即从头处理，不会因为旧的 _last_version 忽略新文件中的批次
+    """
+
+    SIGNAL_FILE = "/tmp/hifate_file_change_signal.json"
+    LOCK_FILE = "/tmp/hifate_file_watcher.lock"
+    WATCH_DIRECTORIES = [
+        d.strip() for d in os.getenv("HOT_RELOAD_WATCH_DIRS", "core,server,services,shared").split(",") if d.strip()
+    ]
+    LEADER_RETRY_INTERVAL = 15
+    MAX_BATCHES = 20
+
+    _instance: Optional['FileChangeBus'] = None
+
+    def __init__(self):
+        self._callbacks: List[Callable[[Dict[str, str]], None]] = []
+        self._callbacks_lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._signal_watcher: Optional[FileChangeWatcher] = None
+        self._node_watcher: Optional[FileChangeWatcher] = None
+        self._lock_fd: Optional[int] = None
+        self._last_version = 0
+        self._epoch: Optional[str] = None
+        self._worker_id = f"{os.getpid()}"
+        self._stats = {'published': 0, 'received': 0}
+
+    @classmethod
+    def get_instance(cls) -> 'FileChangeBus':
+        """获取单例实例"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def subscribe(self, callback: Callable[[Dict[str, str]], None]) -> None:
+        """订阅变化批次（首次订阅时启动）"""
+        with self._callbacks_lock:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+        self.start()
+
+    def unsubscribe(self, callback: Callable[[Dict[str, str]], None]) -> None:
+        with self._callbacks_lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        data = self._read_signal()
+        self._epoch = data.get('epoch')
+        self._last_version = data.get('version', 0)
+        self._signal_watcher = _watch_signal_file(self.SIGNAL_FILE, self._wakeup)
+        self._thread = threading.Thread(target=self._monitor_loop, daemon=True, name="file-change-bus")
+        self._thread.start()
+        logger.info(
+            f"✓ [Worker-{self._worker_id}] 文件变化订阅已启动 "
+            f"(信号: {self._signal_watcher.backend if self._signal_watcher else 'polling'})"
+        )
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+        for watcher in (self._signal_watcher, self._node_watcher):
+            if watcher:
+                watcher.stop()
+        self._signal_watcher = None
+        self._node_watcher = None
+        if self._lock_fd is not None:
+            try:
+                os.close(self._lock_fd)  # 关闭即释放 flock
+            except OSError:
+                pass
+            self._lock_fd = None
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._node_watcher is not None
+
+    def _monitor_loop(self):
+        next_leader_attempt = 0.0
+        while self._running:
+            if not self.is_leader and time.monotonic() >= next_leader_attempt:
+                self._try_become_leader()
+                next_leader_attempt = time.monotonic() + self.LEADER_RETRY_INTERVAL
+            try:
+                self._check_signal()
+            except Exception as e:
+                logger.warning(f"[Worker-{self._worker_id}] 检查文件变化信号失败: {e}")
+            timeout = SIGNAL_POLL_INTERVAL if self._signal_watcher is None else self.LEADER_RETRY_INTERVAL
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+
+    def _try_become_leader(self) -> bool:
+        """抢占节点级文件锁，成功则启动目录监听"""
+        if FCNTL_AVAILABLE:
+            fd = None
+            try:
+                fd = os.open(self.LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                if fd is not None:
+                    os.close(fd)
+                return False
+            self._lock_fd = fd
+
+        directories = [os.path.join(project_root, d) for d in self.WATCH_DIRECTORIES]
+        self._node_watcher = FileChangeWatcher(directories, on_changes=self.publish)
+        backend = self._node_watcher.start()
+        logger.info(
+            f"✓ [Worker-{self._worker_id}] 成为节点文件监听进程 "
+            f"(后端: {backend}, 目录: {', '.join(self.WATCH_DIRECTORIES)})"
+        )
+        return True
+
+    def _read_signal(self) -> Dict[str, Any]:
+        try:
+            with open(self.SIGNAL_FILE, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"[Worker-{self._worker_id}] 读取文件变化信号失败: {e}")
+            return {}
+
+    def publish(self, changes: Dict[str, str]) -> int:
+        """写入一个变化批次，返回批次版本号（仅监听进程调用）"""
+        data = self._read_signal()
+        version = data.get('version', 0) + 1
+        epoch = data.get('epoch') or f"{os.getpid()}-{time.time_ns()}"
+        batches = data.get('batches', [])[-(self.MAX_BATCHES - 1):]
+        batches.append({'version': version, 'timestamp': time.time(), 'changes': changes})
+        _atomic_write_json(self.SIGNAL_FILE, {
+            'version': version,
+            'epoch': epoch,
+            'publisher_pid': os.getpid(),
+            'batches': batches,
+        })
+        self._stats['published'] += 1
+        logger.info(f"📢 文件变化已广播 (version: {version}, 文件数: {len(changes)})")
+        return version
+
+    def _check_signal(self):
+        data = self._read_signal()
+        version = data.get('version', 0)
+        epoch = data.get('epoch')
+        if epoch != self._epoch or version < self._last_version:
+            # 信号文件被重建：版本号从头计数，旧的 _last_version 不再可比
+            logger.info(
+                f"[Worker-{self._worker_id}] 文件变化信号已重建 "
+                f"(epoch: {self._epoch} -> {epoch}, version: {self._last_version} -> {version})"
+            )
+            self._epoch = epoch
+            self._last_version = 0
+        if version <= self._last_version:
+            return
+        changes: Dict[str, str] = {}
+        for batch in data.get('batches', []):
+            if batch.get('version', 0) > self._last_version:
+                changes.update(batch.get('changes', {}))
+        self._last_version = version
+        if not changes:
+            return
+        self._stats['received'] += 1
+        with self._callbacks_lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.warning(f"[Worker-{self._worker_id}] 文件变化回调失败: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'worker_id': self._worker_id,
+            'running': self._running,
+            'leader': self.is_leader,
+            'watch_backend': self._node_watcher.backend if self._node_watcher else None,
+            'signal_backend': self._signal_watcher.backend if self._signal_watcher else 'polling',
+            'last_version': self._last_version,
+            'epoch': self._epoch,
+            'subscribers': len(self._callbacks),
+            **self._stats,
         }
 
 
@@ -346,3 +616,8 @@ def get_worker_sync_status() -> Dict[str, Any]:
     """获取同步状态"""
     manager = WorkerSyncManager.get_instance()
     return manager.get_status()
+
+
+def get_file_change_bus() -> FileChangeBus:
+    """获取文件变化广播"""
+    return FileChangeBus.get_instance()
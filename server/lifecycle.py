@@ -106,6 +106,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠ 缓存同步订阅器启动失败（单机模式）: {e}")
     
+    # 预热支付白名单快照并订阅变更（白名单检查只查内存快照）
+    # 后台执行：导入支付模块会注册全部支付客户端，不阻塞启动
+    def _start_whitelist_subscriber():
+        try:
+            from services.payment_service.payment_whitelist_manager import start_whitelist_subscriber
+            start_whitelist_subscriber()
+            logger.info("✓ 支付白名单订阅器已启动")
+        except Exception as e:
+            logger.warning(f"⚠ 支付白名单订阅器启动失败: {e}")
+
+    import threading as _threading
+    _threading.Thread(target=_start_whitelist_subscriber, name="payment_whitelist_warmup", daemon=True).start()
+    
     # ✅ 性能优化：预热节气表缓存（后台执行不阻塞启动）
     try:
         import asyncio as _asyncio
@@ -169,7 +182,37 @@ async def lifespan(app: FastAPI):
         logger.info("✓ MySQL连接清理任务已启动（每60秒清理一次）")
     except Exception as e:
         logger.warning(f"⚠ MySQL连接清理任务启动失败: {e}")
-    
+
+    # 延迟路由后台预热（独立线程导入，不占用请求线程池；首次请求命中时也会按需挂载）
+    try:
+        import os
+        import threading
+        from server.utils.router_manager import RouterManager
+        from server.utils.startup_profiler import STARTUP_PROFILE, get_startup_profiler
+
+        router_manager = RouterManager.get_instance()
+
+        def _warmup_routers():
+            try:
+                router_manager.warm_up_lazy_routers()
+            except Exception as e:
+                logger.warning(f"⚠ 延迟路由预热失败（首次请求时按需挂载）: {e}")
+            if STARTUP_PROFILE:
+                profiler = get_startup_profiler()
+                profiler.uninstall()
+                profiler.log_report()
+
+        if router_manager and os.getenv("LAZY_ROUTER_WARMUP", "true").lower() == "true":
+            pending = router_manager.get_pending_lazy_routers()
+            if pending or STARTUP_PROFILE:
+                threading.Thread(target=_warmup_routers, name="lazy_router_warmup", daemon=True).start()
+                logger.info(f"✓ 延迟路由预热已启动（后台执行，{len(pending)} 个）")
+        elif STARTUP_PROFILE:
+            get_startup_profiler().uninstall()
+            get_startup_profiler().log_report()
+    except Exception as e:
+        logger.warning(f"⚠ 延迟路由预热启动失败: {e}")
+
     yield
     # 关闭时执行
     # 停止缓存同步订阅器
@@ -180,6 +223,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠ 缓存同步订阅器停止失败: {e}")
     
+    # 停止支付白名单订阅器（未加载支付模块时无需处理）
+    try:
+        import sys as _sys
+        whitelist_module = _sys.modules.get("services.payment_service.payment_whitelist_manager")
+        if whitelist_module:
+            whitelist_module.stop_whitelist_subscriber()
+    except Exception as e:
+        logger.warning(f"⚠ 支付白名单订阅器停止失败: {e}")
+    
     # 停止集群同步器
     try:
         from server.hot_reload.cluster_synchronizer import stop_cluster_sync
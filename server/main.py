@@ -5,18 +5,17 @@ FastAPI 应用主入口（精简版）
 
 路由注册、生命周期、健康检查已拆分到独立模块：
 - server/lifecycle.py          - 启动/关闭逻辑
-- server/router_registry.py    - 路由导入与注册
+- server/router_registry.py    - 路由声明与注册（延迟挂载，见 server/utils/router_manager.py）
 - server/health.py             - 健康检查端点
 - server/middleware/utf8_json.py - UTF8 JSON 响应
+- server/middleware/request_logging.py - 请求日志与耗时
 """
 
 import sys
 import os
-import time
 import logging
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request as StarletteRequest
 from fastapi.staticfiles import StaticFiles
 
@@ -24,6 +23,11 @@ from fastapi.staticfiles import StaticFiles
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
+# 启动耗时分析（STARTUP_PROFILE=true 时统计之后每个模块的导入耗时，启动完成后输出报告）
+from server.utils.startup_profiler import STARTUP_PROFILE, get_startup_profiler
+if STARTUP_PROFILE:
+    get_startup_profiler().install()
+
 # 配置日志
 _log_level_name = os.getenv('LOG_LEVEL', 'INFO').upper()
 _log_level = getattr(logging, _log_level_name, logging.INFO)
@@ -67,6 +71,7 @@ except Exception as e:
 # --- 导入拆分模块 ---
 from server.middleware.utf8_json import UTF8JSONResponse
 from server.middleware.gzip_sse import SSEAwareGZipMiddleware
+from server.middleware.request_logging import RequestLoggingMiddleware
 from server.lifecycle import lifespan
 from server.health import health_router
 
@@ -105,20 +110,14 @@ if RATE_LIMIT_AVAILABLE:
 
 # ==================== 中间件 ====================
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """记录请求日志"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    logger.info(
-        f"{request.method} {request.url.path} - "
-        f"Status: {response.status_code} - "
-        f"Time: {process_time:.3f}s - "
-        f"Client: {request.client.host if request.client else 'unknown'}"
-    )
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+# 中间件均为纯 ASGI 实现（不使用 BaseHTTPMiddleware），SSE 流不经过额外任务和内存流
+
+# 延迟路由：首次请求命中时导入并挂载（最内层，挂载后立即参与本次路由分发）
+from server.middleware.lazy_router import LazyRouterMiddleware
+app.add_middleware(LazyRouterMiddleware, router_manager=router_manager)
+
+# 请求日志 + X-Process-Time
+app.add_middleware(RequestLoggingMiddleware)
 
 # CORS
 try:
@@ -130,6 +129,7 @@ try:
         allow_credentials=cors_config["allow_credentials"],
         allow_methods=cors_config["allow_methods"],
         allow_headers=cors_config["allow_headers"],
+        expose_headers=cors_config.get("expose_headers", []),
     )
     logger.info(f"✓ CORS 中间件已配置，允许来源: {cors_config['allow_origins']}")
 except Exception as e:
@@ -142,7 +142,7 @@ except Exception as e:
         allow_headers=["*"],
     )
 
-# GZip（SSE 除外）
+# 压缩（brotli/gzip；SSE 默认不压缩，SSE_COMPRESSION=true 时按事件压缩）
 app.add_middleware(SSEAwareGZipMiddleware, minimum_size=1000)
 
 # 异常处理
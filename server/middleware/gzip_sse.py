@@ -1,35 +1,170 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""自定义中间件 - 从 server/main.py 提取"""
+"""自定义中间件 - 从 server/main.py 提取
+
+纯 ASGI 实现（不经过 BaseHTTPMiddleware，不为每个请求额外创建任务和内存流）：
+- 一次性响应（JSON 等）超过阈值时按客户端 Accept-Encoding 使用 brotli / gzip 压缩
+- 流式响应一律不缓冲：SSE 默认原样透传；开启 SSE_COMPRESSION 后按事件 gzip 压缩并
+  Z_SYNC_FLUSH 刷新，每个事件仍然立即送达浏览器
+- 已设置 Content-Encoding 的响应（含 identity）不处理
+"""
 
 import gzip
-import io
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request as StarletteRequest
-from starlette.responses import Response
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+SSE_COMPRESSION_ENABLED = os.getenv("SSE_COMPRESSION", "false").lower() == "true"
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# 可压缩的内容类型（图片、压缩包等已压缩格式不再压缩）
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """根据 Accept-Encoding 选择压缩算法（brotli 优先）"""
+    accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if BROTLI_AVAILABLE and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
 
-class SSEAwareGZipMiddleware(BaseHTTPMiddleware):
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> str:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _replace_headers(headers: List[Tuple[bytes, bytes]], encoding: str,
+                     content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+    """去掉原 Content-Length，加上 Content-Encoding / Vary"""
+    result = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"vary")]
+    vary = _header(headers, b"vary")
+    vary = f"{vary}, Accept-Encoding" if vary and "accept-encoding" not in vary.lower() else (vary or "Accept-Encoding")
+    result.append((b"vary", vary.encode("latin-1")))
+    result.append((b"content-encoding", encoding.encode("latin-1")))
+    if content_length is not None:
+        result.append((b"content-length", str(content_length).encode("latin-1")))
+    return result
+
+
+class SSEAwareGZipMiddleware:
     """
-    自定义 GZip 中间件，对 SSE (text/event-stream) 响应禁用压缩。
-    SSE 流需要实时传输数据，gzip 压缩会导致浏览器无法正确读取流。
+    自定义压缩中间件，SSE (text/event-stream) 响应默认不压缩。
+    SSE 流需要实时传输数据，整体压缩会导致浏览器无法及时读取流；
+    开启 sse_compression 时改为按事件压缩并立即刷新。
     """
-    def __init__(self, app, minimum_size: int = 1000):
-        super().__init__(app)
+
+    def __init__(self, app, minimum_size: int = 1000, sse_compression: bool = SSE_COMPRESSION_ENABLED):
+        self.app = app
         self.minimum_size = minimum_size
-    
-    async def dispatch(self, request: StarletteRequest, call_next):
-        response = await call_next(request)
-        
-        # 检查是否是 SSE 响应，如果是则跳过压缩
-        content_type = response.headers.get("content-type", "")
+        self.sse_compression = sse_compression
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = _choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.sse_compression)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """单个请求的响应改写状态（只在首个 body 消息时做一次决策）"""
+
+    def __init__(self, send, encoding: str, minimum_size: int, sse_compression: bool):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.sse_compression = sse_compression
+        self._start_message = None
+        self._mode = None           # passthrough / whole / sse
+        self._sse_compressor = None
+        self._whole_body = b""
+
+    async def send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # 推迟发送响应头：需要看到首个 body 才能决定是否压缩
+            self._start_message = message
+            return
+
+        if message_type != "http.response.body" or self._mode == "passthrough":
+            await self._send(message)
+            return
+
+        if self._mode is None:
+            self._mode = self._decide(message)
+            await self._send_start()
+
+        if self._mode == "passthrough":
+            await self._send(message)
+        elif self._mode == "whole":
+            await self._send({"type": "http.response.body", "body": self._whole_body, "more_body": False})
+        else:
+            await self._send_sse_chunk(message)
+
+    def _decide(self, first_body) -> str:
+        headers = self._start_message["headers"]
+        content_type = _header(headers, b"content-type").lower()
+        if _header(headers, b"content-encoding"):
+            return "passthrough"
+
         if "text/event-stream" in content_type:
-            return response
-        
-        # 检查响应头中是否已设置 Content-Encoding: identity
-        if response.headers.get("content-encoding") == "identity":
-            return response
-        
-        # 其他响应使用默认 GZip 压缩逻辑
-        # 这里简化处理，不实现完整的 gzip 压缩
-        # 交给 FastAPI 默认的 GZipMiddleware 处理
-        return response
+            if not self.sse_compression:
+                return "passthrough"
+            # gzip 容器（wbits=31），每个事件 Z_SYNC_FLUSH
+            self._sse_compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._start_message["headers"] = _replace_headers(headers, "gzip", None)
+            return "sse"
+
+        body = first_body.get("body", b"")
+        if first_body.get("more_body", False):
+            # 其他流式响应不缓冲，原样透传
+            return "passthrough"
+        if len(body) < self.minimum_size or not content_type.startswith(_COMPRESSIBLE_TYPES):
+            return "passthrough"
+
+        self._whole_body = _compress(body, self.encoding)
+        self._start_message["headers"] = _replace_headers(headers, self.encoding, len(self._whole_body))
+        return "whole"
+
+    async def _send_start(self):
+        if self._start_message is not None:
+            await self._send(self._start_message)
+            self._start_message = None
+
+    async def _send_sse_chunk(self, message):
+        data = self._sse_compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if more_body:
+            data += self._sse_compressor.flush(zlib.Z_SYNC_FLUSH)
+        else:
+            data += self._sse_compressor.flush(zlib.Z_FINISH)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""延迟路由挂载中间件
+
+纯 ASGI 实现：
+- 请求路径命中尚未挂载的延迟路由时，在线程池中导入模块并挂载，再交给路由分发
+- 访问 OpenAPI 文档时挂载全部延迟路由，保证文档完整
+- 全部挂载完成后只做一次判断，不再有额外开销
+"""
+
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# 需要完整路由表的路径
+_DOC_PATHS = {"/openapi.json", "/docs", "/redoc"}
+
+
+class LazyRouterMiddleware:
+    """首次请求时挂载延迟路由"""
+
+    def __init__(self, app, router_manager):
+        self.app = app
+        self.router_manager = router_manager
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.router_manager.has_pending_lazy_routers():
+            path = scope.get("path", "")
+            try:
+                if path in _DOC_PATHS:
+                    await run_in_threadpool(self.router_manager.warm_up_lazy_routers)
+                elif self.router_manager.pending_routers_for_path(path):
+                    await run_in_threadpool(self.router_manager.ensure_routers_for_path, path)
+            except Exception as e:
+                logger.error(f"延迟路由挂载失败: {path}: {e}", exc_info=True)
+        await self.app(scope, receive, send)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""请求日志与耗时中间件 - 从 server/main.py 提取
+
+纯 ASGI 实现：
+- 响应头写出时加 X-Process-Time（到首字节的处理耗时，与原实现一致）
+- 响应体发送完毕后记录一条日志（流式接口额外记录首字节耗时 TTFB）
+- 不包装、不缓冲响应体，SSE 流原样透传
+- 请求内热路径日志的条数 / 字节数计入 log_budget，随请求日志一并输出
+"""
+
+import logging
+import time
+
+from server.utils.log_budget import log_budget_scope
+
+logger = logging.getLogger(__name__)
+
+
+class RequestLoggingMiddleware:
+    """记录请求日志"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        state = {"status": 500, "ttfb": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                state["status"] = message["status"]
+                state["ttfb"] = process_time
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", str(process_time).encode("latin-1")))
+                message["headers"] = headers
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                _log_request(scope, state["status"], state["ttfb"], time.time() - start_time, stats)
+            await send(message)
+
+        with log_budget_scope() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception:
+                _log_request(scope, state["status"], state["ttfb"], time.time() - start_time, stats)
+                raise
+
+
+def _log_request(scope, status: int, ttfb, total: float, stats=None) -> None:
+    client = scope.get("client")
+    timing = f"Time: {total:.3f}s"
+    # 流式响应首字节明显早于结束时，附带 TTFB
+    if ttfb is not None and total - ttfb > 0.05:
+        timing += f" - TTFB: {ttfb:.3f}s"
+    if stats is not None and (stats.records or stats.suppressed or stats.dropped):
+        timing += f" - Log: {stats.summary()}"
+    logger.info(
+        f"{scope.get('method')} {scope.get('path')} - "
+        f"Status: {status} - "
+        f"{timing} - "
+        f"Client: {client[0] if client else 'unknown'}"
+    )
@@ -24,3 +24,14 @@ class UTF8JSONResponse(Response):
             indent=None,
             separators=(",", ":"),
         ).encode("utf-8")
+
+
+class CacheableJSONResponse(UTF8JSONResponse):
+    """确定性接口的响应：使用调用方给出的 ETag / Cache-Control，允许 nginx 与客户端复用"""
+
+    def __init__(self, content, headers=None, **kwargs):
+        super().__init__(content, **kwargs)
+        del self.headers["Pragma"]
+        del self.headers["Expires"]
+        for key, value in (headers or {}).items():
+            self.headers[key] = value
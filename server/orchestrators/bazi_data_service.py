@@ -19,6 +19,7 @@ sys.path.insert(0, project_root)
 from server.services.bazi_detail_service import BaziDetailService
 from server.services.special_liunian_service import SpecialLiunianService
 from server.utils.async_executor import get_executor
+from server.utils.cache_policy import get_cache
 from server.services.bazi_display_service import BaziDisplayService
 from server.utils.bazi_input_processor import BaziInputProcessor
 from server.models.bazi_detail import BaziDetailModel
@@ -28,6 +29,14 @@ from server.models.special_liunian import SpecialLiunianModel
 
 logger = logging.getLogger(__name__)
 
+# 大运/流年模型列表缓存的策略命名空间（见 server.utils.cache_policy），以 JSON 形式缓存
+BAZI_DATA_CACHE_NAMESPACE = "bazi_data_models"
+
+
+def _dump_models(models: list) -> List[Dict[str, Any]]:
+    """模型列表转为可 JSON 序列化的字典列表（缓存写入用，读取时 model_validate 还原）"""
+    return [m.model_dump(mode="json") for m in models]
+
 
 class BaziDataService:
     """八字统一数据服务 - 统一管理大运流年、特殊流年数据的获取"""
@@ -74,7 +83,6 @@ class BaziDataService:
         # ✅ 优化：使用缓存（减少重复计算）
         try:
             from server.utils.cache_key_generator import CacheKeyGenerator
-            from server.utils.cache_multi_level import get_multi_cache
             
             cache_key = CacheKeyGenerator.generate_dayun_key(
                 solar_date, solar_time, gender,
@@ -82,11 +90,10 @@ class BaziDataService:
                 mode, count
             )
             
-            cache = get_multi_cache()
-            cached_result = cache.get(cache_key)
+            cached_result = get_cache(BAZI_DATA_CACHE_NAMESPACE).get(cache_key)
             if cached_result:
                 logger.debug(f"[BaziDataService] 大运序列缓存命中")
-                return cached_result
+                return [DayunModel.model_validate(item) for item in cached_result]
         except Exception as e:
             logger.debug(f"[BaziDataService] 缓存查询失败（继续计算）: {e}")
         
@@ -154,7 +161,6 @@ class BaziDataService:
         # ✅ 优化：写入缓存
         try:
             from server.utils.cache_key_generator import CacheKeyGenerator
-            from server.utils.cache_multi_level import get_multi_cache
             
             cache_key = CacheKeyGenerator.generate_dayun_key(
                 solar_date, solar_time, gender,
@@ -162,12 +168,7 @@ class BaziDataService:
                 mode, count
             )
             
-            cache = get_multi_cache()
-            # 设置缓存TTL（24小时）
-            cache.l2.ttl = 86400
-            cache.set(cache_key, dayun_models)
-            # 恢复默认TTL
-            cache.l2.ttl = 3600
+            get_cache(BAZI_DATA_CACHE_NAMESPACE).set(cache_key, _dump_models(dayun_models))
         except Exception as e:
             logger.debug(f"[BaziDataService] 缓存写入失败（不影响业务）: {e}")
         
@@ -291,7 +292,6 @@ class BaziDataService:
         # ✅ 优化：写入缓存
         try:
             from server.utils.cache_key_generator import CacheKeyGenerator
-            from server.utils.cache_multi_level import get_multi_cache
             
             cache_key = CacheKeyGenerator.generate_liunian_key(
                 solar_date, solar_time, gender,
@@ -299,10 +299,7 @@ class BaziDataService:
                 target_years
             )
             
-            cache = get_multi_cache()
-            cache.l2.ttl = 86400
-            cache.set(cache_key, liunian_models)
-            cache.l2.ttl = 3600
+            get_cache(BAZI_DATA_CACHE_NAMESPACE).set(cache_key, _dump_models(liunian_models))
         except Exception as e:
             logger.debug(f"[BaziDataService] 流年序列缓存写入失败（不影响业务）: {e}")
         
@@ -416,7 +413,6 @@ class BaziDataService:
         # ✅ 优化：写入缓存
         try:
             from server.utils.cache_key_generator import CacheKeyGenerator
-            from server.utils.cache_multi_level import get_multi_cache
             
             dayun_steps = [d.step for d in dayuns] if dayuns else None
             cache_key = CacheKeyGenerator.generate_special_liunian_key(
@@ -425,10 +421,7 @@ class BaziDataService:
                 dayun_steps, dayun_count
             )
             
-            cache = get_multi_cache()
-            cache.l2.ttl = 86400
-            cache.set(cache_key, special_liunian_models)
-            cache.l2.ttl = 3600
+            get_cache(BAZI_DATA_CACHE_NAMESPACE).set(cache_key, _dump_models(special_liunian_models))
         except Exception as e:
             logger.debug(f"[BaziDataService] 特殊流年缓存写入失败（不影响业务）: {e}")
         
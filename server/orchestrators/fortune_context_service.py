@@ -21,6 +21,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.insert(0, project_root)
 
 from server.services.bazi_detail_service import BaziDetailService
+from server.utils.cache_policy import cached
 from server.services.daily_fortune_service import DailyFortuneService
 from server.services.monthly_fortune_service import MonthlyFortuneService
 
@@ -100,26 +101,27 @@ TIME_KEYWORDS = {
 class FortuneContextService:
     """流年大运上下文服务 - 作为智能问答的增强模块"""
     
-    # ⭐ 性能优化：缓存 calculate_detail_full 结果
-    _detail_cache = {}
-    _cache_max_size = 50  # 最多缓存50条
-    
-    @staticmethod
-    def _get_cached_detail(solar_date: str, solar_time: str, gender: str, current_time: datetime) -> Optional[dict]:
-        """获取缓存的 detail_result"""
-        cache_key = f"{solar_date}_{solar_time}_{gender}_{current_time.strftime('%Y-%m-%dT%H')}"
-        return FortuneContextService._detail_cache.get(cache_key)
-    
+    # ⭐ 性能优化：缓存 calculate_detail_full 结果（策略见 cache_policy 的 fortune_context_detail，仅 L1）
     @staticmethod
-    def _set_cached_detail(solar_date: str, solar_time: str, gender: str, current_time: datetime, result: dict):
-        """缓存 detail_result"""
-        cache_key = f"{solar_date}_{solar_time}_{gender}_{current_time.strftime('%Y-%m-%dT%H')}"
-        # 简单的LRU：如果缓存满了，删除最旧的
-        if len(FortuneContextService._detail_cache) >= FortuneContextService._cache_max_size:
-            # 删除第一个（FIFO）
-            oldest_key = next(iter(FortuneContextService._detail_cache))
-            del FortuneContextService._detail_cache[oldest_key]
-        FortuneContextService._detail_cache[cache_key] = result
+    @cached(
+        namespace='fortune_context_detail',
+        key=lambda solar_date, solar_time, gender, current_time=None: f"{solar_date}:{solar_time}:{gender}",
+        condition=bool,
+    )
+    def _load_detail(solar_date: str, solar_time: str, gender: str,
+                     current_time: Optional[datetime] = None) -> Optional[dict]:
+        """
+        获取 detail_result
+        
+        只读取本命层字段（bazi_pillars、dayun_sequence、liunian_sequence），
+        与当前时间无关，缓存键只含出生信息
+        """
+        return BaziDetailService.calculate_detail_full(
+            solar_date=solar_date,
+            solar_time=solar_time,
+            gender=gender,
+            current_time=current_time
+        )
     
     @staticmethod
     def extract_time_range_from_question(question: str) -> Dict[str, Any]:
@@ -420,24 +422,9 @@ class FortuneContextService:
                     logger.debug(f"开始计算流年大运，目标年份: {target_years}")
                     start_time = time.time()
                     current_time = datetime(target_years[0], 1, 1)
-                    cached_result = FortuneContextService._get_cached_detail(
+                    detail_result = FortuneContextService._load_detail(
                         solar_date, solar_time, gender, current_time
                     )
-                    
-                    if cached_result:
-                        logger.debug(f"[FortuneContextService] 缓存命中，跳过 calculate_detail_full")
-                        detail_result = cached_result
-                    else:
-                        detail_result = BaziDetailService.calculate_detail_full(
-                            solar_date=solar_date,
-                            solar_time=solar_time,
-                            gender=gender,
-                            current_time=current_time
-                        )
-                        if detail_result:
-                            FortuneContextService._set_cached_detail(
-                                solar_date, solar_time, gender, current_time, detail_result
-                            )
                 else:
                     logger.debug(f"[FortuneContextService] 使用编排层传入的 detail_result")
                 
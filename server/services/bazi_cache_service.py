@@ -12,17 +12,19 @@ import time
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from server.utils.cache_policy import get_cache
+
 logger = logging.getLogger(__name__)
 
 
 class BaziCacheService:
     """八字缓存服务 - 统一管理缓存读写"""
     
-    # 缓存 TTL（秒）
-    TTL_BASE = 2592000  # 30天 - 基础八字
-    TTL_DAYUN = 2592000  # 30天 - 单个大运
-    TTL_FULL = 2592000  # 30天 - 完整数据
-    TTL_READY = 2592000  # 30天 - 就绪标志
+    # 缓存策略命名空间（TTL 等由 server.utils.cache_policy 声明，均为 30 天）
+    NS_BASE = "bazi:base"  # 基础八字
+    NS_DAYUN = "bazi:dayun"  # 单个大运
+    NS_FULL = "bazi:full"  # 完整数据
+    NS_READY = "bazi:ready"  # 就绪标志
     
     # 分布式锁超时时间（秒）
     LOCK_TIMEOUT = 300  # 5分钟
@@ -94,8 +96,7 @@ class BaziCacheService:
             基础八字数据，如果不存在则返回 None
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
+            cache = get_cache(BaziCacheService.NS_BASE)
             cache_key = BaziCacheService.get_base_key(solar_date, solar_time, gender)
             result = cache.get(cache_key)
             if result:
@@ -114,9 +115,7 @@ class BaziCacheService:
             是否成功
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
-            cache.l2.ttl = BaziCacheService.TTL_BASE
+            cache = get_cache(BaziCacheService.NS_BASE)
             cache_key = BaziCacheService.get_base_key(solar_date, solar_time, gender)
             cache.set(cache_key, data)
             logger.info(f"✅ [缓存写入] Level 0 基础八字: {cache_key[:50]}...")
@@ -134,8 +133,7 @@ class BaziCacheService:
             大运数据，如果不存在则返回 None
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
+            cache = get_cache(BaziCacheService.NS_DAYUN)
             cache_key = BaziCacheService.get_dayun_key(solar_date, solar_time, gender, dayun_index)
             result = cache.get(cache_key)
             if result:
@@ -154,9 +152,7 @@ class BaziCacheService:
             是否成功
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
-            cache.l2.ttl = BaziCacheService.TTL_DAYUN
+            cache = get_cache(BaziCacheService.NS_DAYUN)
             cache_key = BaziCacheService.get_dayun_key(solar_date, solar_time, gender, dayun_index)
             cache.set(cache_key, data)
             logger.debug(f"✅ [缓存写入] Level 1 大运 {dayun_index}: {cache_key[:50]}...")
@@ -174,8 +170,7 @@ class BaziCacheService:
             完整数据，如果不存在则返回 None
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
+            cache = get_cache(BaziCacheService.NS_FULL)
             cache_key = BaziCacheService.get_full_key(solar_date, solar_time, gender)
             result = cache.get(cache_key)
             if result:
@@ -194,17 +189,14 @@ class BaziCacheService:
             是否成功
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
-            cache.l2.ttl = BaziCacheService.TTL_FULL
+            cache = get_cache(BaziCacheService.NS_FULL)
             cache_key = BaziCacheService.get_full_key(solar_date, solar_time, gender)
             cache.set(cache_key, data)
             logger.info(f"✅ [缓存写入] Level 2 完整数据: {cache_key[:50]}...")
             
             # 同时设置就绪标志
             ready_key = BaziCacheService.get_ready_key(solar_date, solar_time, gender)
-            cache.l2.ttl = BaziCacheService.TTL_READY
-            cache.set(ready_key, {"ready": True, "timestamp": time.time()})
+            get_cache(BaziCacheService.NS_READY).set(ready_key, {"ready": True, "timestamp": time.time()})
             return True
         except Exception as e:
             logger.warning(f"⚠️ 写入完整数据缓存失败: {e}")
@@ -219,8 +211,7 @@ class BaziCacheService:
             是否就绪
         """
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
+            cache = get_cache(BaziCacheService.NS_READY)
             ready_key = BaziCacheService.get_ready_key(solar_date, solar_time, gender)
             result = cache.get(ready_key)
             return result is not None and result.get("ready", False)
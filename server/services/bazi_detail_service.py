@@ -18,6 +18,8 @@ sys.path.insert(0, project_root)
 
 from shared.clients.bazi_fortune_client_grpc import BaziFortuneClient
 from core.calculators.helpers import compute_local_detail
+from server.services.natal_layer_service import NatalLayerService
+from server.utils.cache_policy import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -89,9 +91,7 @@ class BaziDetailService:
         # 2. 先查缓存（L1内存 + L2 Redis）
         if use_cache:
             try:
-                from server.utils.cache_multi_level import get_multi_cache
-                cache = get_multi_cache()
-                cached_result = cache.get(cache_key)
+                cached_result = get_cache('bazi_detail').get(cache_key)
                 if cached_result:
                     logger.info(f"✅ [缓存命中] BaziDetailService.calculate_detail_full: {cache_key[:50]}...")
                     return cached_result
@@ -118,8 +118,7 @@ class BaziDetailService:
                 # 写入缓存（仅 use_cache 时）
                 if use_cache:
                     try:
-                        cache = get_multi_cache()
-                        cache.set(cache_key, result, ttl=2592000)  # 30天
+                        get_cache('bazi_detail').set(cache_key, result)
                         logger.info(f"✅ [缓存写入] BaziDetailService.calculate_detail_full: {cache_key[:50]}...")
                     except Exception:
                         pass  # 缓存写入失败不影响业务
@@ -156,14 +155,83 @@ class BaziDetailService:
                     logger.warning(f"计算当前大运索引失败，使用默认值0: {e}")
                     dayun_index = 0
         
-        result = compute_local_detail(
-            solar_date, solar_time, gender, 
-            current_time=current_time, 
-            dayun_index=dayun_index,
-            target_year=target_year
-        )
+        # ✅ 本命层拆分：不指定大运时，大运/流年序列取自本命层长期缓存，只按 current_time 派生当前窗口
+        if dayun_index is None:
+            result = NatalLayerService.get_detail(
+                solar_date, solar_time, gender,
+                current_time=current_time,
+                target_year=target_year,
+                use_cache=use_cache
+            )
+        else:
+            result = compute_local_detail(
+                solar_date, solar_time, gender, 
+                current_time=current_time, 
+                dayun_index=dayun_index,
+                target_year=target_year
+            )
+        
+        # ✅ 扩展：集成所有数据源（均与当前时间无关，按出生信息 + 规则版本缓存）
+        result.update(BaziDetailService._calculate_natal_extras(
+            solar_date, solar_time, gender, result.get('bazi_pillars', {}),
+            include_wangshuai=include_wangshuai,
+            include_shengong_minggong=include_shengong_minggong,
+            include_rules=include_rules,
+            include_wuxing_proportion=include_wuxing_proportion,
+            include_rizhu_liujiazi=include_rizhu_liujiazi,
+            rule_types=rule_types,
+            use_cache=use_cache
+        ))
         
-        # ✅ 扩展：集成所有数据源
+        # 触发异步预热（不阻塞响应）
+        if async_warmup and quick_mode:
+            try:
+                BaziDetailService._trigger_async_warmup(solar_date, solar_time, gender, current_time)
+            except Exception as e:
+                logger.warning(f"异步预热触发失败（不影响业务）: {e}")
+        
+        # 4. 写入缓存（仅成功且 use_cache 时）
+        if use_cache:
+            try:
+                get_cache('bazi_detail').set(cache_key, result)
+                logger.info(f"✅ [缓存写入] BaziDetailService.calculate_detail_full: {cache_key[:50]}...")
+            except Exception:
+                pass  # 缓存写入失败不影响业务
+        
+        return result
+
+    @staticmethod
+    def _calculate_natal_extras(solar_date: str, solar_time: str, gender: str, bazi_pillars: dict,
+                                include_wangshuai: bool = True,
+                                include_shengong_minggong: bool = True,
+                                include_rules: bool = True,
+                                include_wuxing_proportion: bool = True,
+                                include_rizhu_liujiazi: bool = True,
+                                rule_types: list = None,
+                                use_cache: bool = True) -> dict:
+        """
+        计算附加数据（旺衰、身宫命宫、规则匹配、五行比例、日柱六十甲子）
+
+        这些数据只由出生信息和规则版本决定，按本命层长期缓存；
+        任一项计算失败时不写缓存，避免把降级结果长期保留。
+        """
+        flags = ''.join('1' if f else '0' for f in (
+            include_wangshuai, include_shengong_minggong, include_rules,
+            include_wuxing_proportion, include_rizhu_liujiazi
+        ))
+        cache_key = NatalLayerService.build_key(
+            'extras', solar_date, solar_time, gender,
+            flags, ','.join(sorted(rule_types)) if rule_types else 'all',
+            with_rule_version=include_rules
+        )
+        if use_cache:
+            cached = NatalLayerService.load(cache_key)
+            if cached:
+                return cached
+
+        extras = {}
+        complete = True
+
         # 获取八字计算器用于规则匹配和日柱查询
         bazi_calculator = None
         if include_rules or include_rizhu_liujiazi:
@@ -173,21 +241,24 @@ class BaziDetailService:
                 bazi_calculator.calculate()
             except Exception as e:
                 logger.warning(f"初始化八字计算器失败: {e}")
-        
+                complete = False
+
         # 1. 旺衰与喜忌神数据
         if include_wangshuai:
             try:
                 from server.services.wangshuai_service import WangShuaiService
                 wangshuai_result = WangShuaiService.calculate_wangshuai(solar_date, solar_time, gender, use_cache)
                 if wangshuai_result.get('success'):
-                    result['wangshuai'] = wangshuai_result.get('data', {})
+                    extras['wangshuai'] = wangshuai_result.get('data', {})
                 else:
                     logger.warning(f"旺衰计算失败: {wangshuai_result.get('error')}")
-                    result['wangshuai'] = None
+                    extras['wangshuai'] = None
+                    complete = False
             except Exception as e:
                 logger.warning(f"旺衰计算异常（不影响业务）: {e}")
-                result['wangshuai'] = None
-        
+                extras['wangshuai'] = None
+                complete = False
+
         # 2. 身宫命宫数据
         if include_shengong_minggong:
             try:
@@ -197,82 +268,72 @@ class BaziDetailService:
                 )
                 # 提取身宫命宫数据
                 palaces = interface_data.get('palaces', {})
-                result['shengong'] = palaces.get('body_palace', {})
-                result['minggong'] = palaces.get('life_palace', {})
-                result['taiyuan'] = palaces.get('fetal_origin', {})
-                result['taixi'] = palaces.get('fetal_breath', {})
+                extras['shengong'] = palaces.get('body_palace', {})
+                extras['minggong'] = palaces.get('life_palace', {})
+                extras['taiyuan'] = palaces.get('fetal_origin', {})
+                extras['taixi'] = palaces.get('fetal_breath', {})
             except Exception as e:
                 logger.warning(f"身宫命宫计算异常（不影响业务）: {e}")
-                result['shengong'] = None
-                result['minggong'] = None
-                result['taiyuan'] = None
-                result['taixi'] = None
-        
+                extras['shengong'] = None
+                extras['minggong'] = None
+                extras['taiyuan'] = None
+                extras['taixi'] = None
+                complete = False
+
         # 3. 规则匹配数据
         if include_rules and bazi_calculator:
             try:
                 from server.services.rule_service import RuleService
                 bazi_data = bazi_calculator.build_rule_input()
                 matched_rules = RuleService.match_rules(bazi_data, rule_types=rule_types, use_cache=True)
-                result['matched_rules'] = matched_rules
-                result['rule_count'] = len(matched_rules) if matched_rules else 0
+                extras['matched_rules'] = matched_rules
+                extras['rule_count'] = len(matched_rules) if matched_rules else 0
             except Exception as e:
                 logger.warning(f"规则匹配异常（不影响业务）: {e}")
-                result['matched_rules'] = []
-                result['rule_count'] = 0
-        
+                extras['matched_rules'] = []
+                extras['rule_count'] = 0
+                complete = False
+
         # 4. 五行比例数据
         if include_wuxing_proportion:
             try:
                 from server.services.wuxing_proportion_service import WuxingProportionService
                 wuxing_result = WuxingProportionService.calculate_proportion(solar_date, solar_time, gender)
                 if wuxing_result.get('success'):
-                    result['wuxing_proportion'] = wuxing_result
+                    extras['wuxing_proportion'] = wuxing_result
                 else:
                     logger.warning(f"五行比例计算失败: {wuxing_result.get('error')}")
-                    result['wuxing_proportion'] = None
+                    extras['wuxing_proportion'] = None
+                    complete = False
             except Exception as e:
                 logger.warning(f"五行比例计算异常（不影响业务）: {e}")
-                result['wuxing_proportion'] = None
-        
+                extras['wuxing_proportion'] = None
+                complete = False
+
         # 5. 日柱六十甲子数据
         if include_rizhu_liujiazi and bazi_calculator:
             try:
                 from server.services.rizhu_liujiazi_service import RizhuLiujiaziService
                 # 获取日柱
-                bazi_pillars = result.get('bazi_pillars', {})
-                day_pillar = bazi_pillars.get('day', {})
+                day_pillar = (bazi_pillars or {}).get('day', {})
                 day_stem = day_pillar.get('stem', '')
                 day_branch = day_pillar.get('branch', '')
                 rizhu = day_stem + day_branch if day_stem and day_branch else ''
-                
+
                 if rizhu:
                     rizhu_result = RizhuLiujiaziService.get_rizhu_analysis(rizhu)
-                    result['rizhu_liujiazi'] = rizhu_result if rizhu_result else None
+                    extras['rizhu_liujiazi'] = rizhu_result if rizhu_result else None
                 else:
-                    result['rizhu_liujiazi'] = None
+                    extras['rizhu_liujiazi'] = None
             except Exception as e:
                 logger.warning(f"日柱六十甲子查询异常（不影响业务）: {e}")
-                result['rizhu_liujiazi'] = None
-        
-        # 触发异步预热（不阻塞响应）
-        if async_warmup and quick_mode:
-            try:
-                BaziDetailService._trigger_async_warmup(solar_date, solar_time, gender, current_time)
-            except Exception as e:
-                logger.warning(f"异步预热触发失败（不影响业务）: {e}")
-        
-        # 4. 写入缓存（仅成功且 use_cache 时）
-        if use_cache:
-            try:
-                cache = get_multi_cache()
-                cache.set(cache_key, result, ttl=2592000)  # 30天
-                logger.info(f"✅ [缓存写入] BaziDetailService.calculate_detail_full: {cache_key[:50]}...")
-            except Exception:
-                pass  # 缓存写入失败不影响业务
-        
-        return result
-    
+                extras['rizhu_liujiazi'] = None
+                complete = False
+
+        if use_cache and complete and extras:
+            NatalLayerService.store(cache_key, extras)
+        return extras
+
     @staticmethod
     def _format_detail_result(detail_result: dict, bazi_result: dict) -> dict:
         """
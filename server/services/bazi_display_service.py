@@ -17,6 +17,7 @@ sys.path.insert(0, project_root)
 from server.services.bazi_service import BaziService
 from server.services.bazi_detail_service import BaziDetailService
 from server.services.shensha_sort_service import sort_shensha
+from server.utils.cache_policy import get_cache
 
 # 导入常量
 from core.data.constants import STEM_ELEMENTS, BRANCH_ELEMENTS, HEAVENLY_STEMS
@@ -651,8 +652,7 @@ class BaziDisplayService:
         
         return result
     
-    # Redis缓存TTL（30天，大运流年流月数据不随时间变化）
-    CACHE_TTL = 2592000  # 30天
+    # 缓存 TTL 由 server.utils.cache_policy 的 fortune_display 策略声明（30天）
     
     @staticmethod
     def _generate_fortune_cache_key(solar_date: str, solar_time: str, gender: str,
@@ -677,13 +677,15 @@ class BaziDisplayService:
         Returns:
             str: 缓存键
         """
-        # 生成键（格式：fortune_display:{solar_date}:{solar_time}:{gender}:{current_time}:{dayun_index}:{dayun_year_start}:{dayun_year_end}:{target_year}）
+        # 生成键（格式：fortune_display:{solar_date}:{solar_time}:{gender}:{current_date}:{dayun_index}:{dayun_year_start}:{dayun_year_end}:{target_year}）
+        # current_time 只影响当前大运/流年/流月的判定（按交运日期），日期级粒度足够；
+        # 大运流年序列本身取自本命层缓存，不随时间变化
         key_parts = [
             'fortune_display',
             solar_date,
             solar_time,
             gender,
-            current_time.strftime('%Y-%m-%d %H:%M') if current_time else '',
+            current_time.strftime('%Y-%m-%d') if current_time else '',
             str(dayun_index) if dayun_index is not None else '',
             str(dayun_year_start) if dayun_year_start is not None else '',
             str(dayun_year_end) if dayun_year_end is not None else '',
@@ -738,11 +740,7 @@ class BaziDisplayService:
         
         # 2. 先查缓存（L1内存 + L2 Redis）
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
-            # 设置 L2 Redis TTL 为 30 天
-            cache.l2.ttl = BaziDisplayService.CACHE_TTL
-            cached_result = cache.get(cache_key)
+            cached_result = get_cache('fortune_display').get(cache_key)
             if cached_result:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -1018,9 +1016,7 @@ class BaziDisplayService:
         # 4. 写入缓存（仅成功时）
         if result.get('success'):
             try:
-                cache = get_multi_cache()
-                cache.l2.ttl = BaziDisplayService.CACHE_TTL
-                cache.set(cache_key, result)
+                get_cache('fortune_display').set(cache_key, result)
                 logger.info(f"✅ [缓存写入] BaziDisplayService.get_fortune_display: {cache_key[:80]}...")
             except Exception as e:
                 # 缓存写入失败不影响业务
@@ -13,13 +13,13 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(o
 sys.path.insert(0, project_root)
 
 from core.calculators.bazi_interface_generator import BaziInterfaceGenerator
+from server.utils.cache_policy import get_cache
 
 
 class BaziInterfaceService:
     """八字界面信息服务类"""
     
-    # Redis缓存TTL（30天，身宫命宫胎元数据不随时间变化）
-    CACHE_TTL = 2592000  # 30天
+    # 缓存 TTL 由 server.utils.cache_policy 的 bazi_interface 策略声明（30天，身宫命宫胎元数据不随时间变化）
     
     @staticmethod
     def _generate_cache_key(solar_date: str, solar_time: str, gender: str,
@@ -87,14 +87,10 @@ class BaziInterfaceService:
         
         # 2. 先查缓存（L1内存 + L2 Redis）
         try:
-            from server.utils.cache_multi_level import get_multi_cache
             import logging
             logger = logging.getLogger(__name__)
             
-            cache = get_multi_cache()
-            # 设置 L2 Redis TTL 为 30 天
-            cache.l2.ttl = BaziInterfaceService.CACHE_TTL
-            cached_result = cache.get(cache_key)
+            cached_result = get_cache('bazi_interface').get(cache_key)
             if cached_result:
                 logger.info(f"✅ [缓存命中] BaziInterfaceService.generate_interface_full: {cache_key[:80]}...")
                 return cached_result
@@ -124,9 +120,7 @@ class BaziInterfaceService:
         # 4. 写入缓存（仅成功时）
         if result:
             try:
-                cache = get_multi_cache()
-                cache.l2.ttl = BaziInterfaceService.CACHE_TTL
-                cache.set(cache_key, result)
+                get_cache('bazi_interface').set(cache_key, result)
                 logger.info(f"✅ [缓存写入] BaziInterfaceService.generate_interface_full: {cache_key[:80]}...")
             except Exception as e:
                 # 缓存写入失败不影响业务
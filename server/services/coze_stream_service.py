@@ -45,8 +45,11 @@ def _get_cached_config(key: str) -> Optional[str]:
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
-# 配置日志
+from server.utils.log_budget import get_hot_logger, lazy
+
+# 配置日志（流式分块等热路径经 hot_logger：惰性格式化、调用点限流、按请求计入日志预算）
 logger = logging.getLogger(__name__)
+hot_logger = get_hot_logger(__name__)
 
 # 导入配置加载器（从数据库读取配置）
 from server.config.config_loader import get_config_from_db_only
@@ -343,7 +346,7 @@ class CozeStreamService(BaseLLMStreamService):
                             
                             line_count += 1
                             if line_count <= 20:
-                                logger.info(f"📨 SSE行 {line_count}: {line_str[:200]}")
+                                hot_logger.info("📨 SSE行 %d: %.200s", line_count, line_str)
                             
                             # 处理 event: 行
                             if line_str.startswith('event:'):
@@ -443,24 +446,24 @@ class CozeStreamService(BaseLLMStreamService):
                                                 thinking_buffer = ''.join(thinking_buffer_chunks)
                                                 if self._is_thinking_start(thinking_buffer):
                                                     is_thinking = True
-                                                    logger.debug(f"🧠 检测到思考过程开头，开始过滤: {thinking_buffer[:50]}...")
+                                                    hot_logger.debug("🧠 检测到思考过程开头，开始过滤: %.50s...", thinking_buffer)
                                                 elif self._is_answer_start(thinking_buffer):
                                                     is_thinking = False
-                                                    logger.debug(f"✅ 检测到正式答案开头: {thinking_buffer[:50]}...")
+                                                    hot_logger.debug("✅ 检测到正式答案开头: %.50s...", thinking_buffer)
                                             
                                             # 如果正在思考过程中，检测是否出现正式答案
                                             if is_thinking:
                                                 if self._is_answer_start(content):
                                                     is_thinking = False
-                                                    logger.debug(f"✅ 思考过程结束，检测到正式答案: {content[:50]}...")
+                                                    hot_logger.debug("✅ 思考过程结束，检测到正式答案: %.50s...", content)
                                                 else:
                                                     # 仍在思考过程中，跳过此内容
-                                                    logger.debug(f"🧠 过滤思考过程: {content[:50]}...")
+                                                    hot_logger.debug("🧠 过滤思考过程: %.50s...", content)
                                                     continue
                                             
                                             # 过滤掉提示词和指令文本（作为备选过滤）
                                             if self._is_prompt_or_instruction(content):
-                                                logger.debug(f"⚠️ 过滤提示词/指令: {content[:50]}...")
+                                                hot_logger.debug("⚠️ 过滤提示词/指令: %.50s...", content)
                                                 continue
                                             
                                             has_content = True
@@ -578,7 +581,7 @@ class CozeStreamService(BaseLLMStreamService):
                                         break
                                 
                                 except json.JSONDecodeError as e:
-                                    logger.debug(f"JSON解析失败: {e}, 原始数据: {data_str[:100]}")
+                                    hot_logger.debug("JSON解析失败: %s, 原始数据: %.100s", e, data_str)
                                     continue
                             
                             # 如果流已结束，跳出循环
@@ -916,7 +919,7 @@ class CozeStreamService(BaseLLMStreamService):
                             line_count += 1
                             # 记录前10行，帮助调试
                             if line_count <= 10:
-                                logger.debug(f"[{trace_id}] 📨 SSE行 {line_count}: {line_str[:200]}")
+                                hot_logger.debug("[%s] 📨 SSE行 %d: %.200s", trace_id, line_count, line_str)
                             
                             # 处理 event: 行（新增：Coze API的事件在event行中）
                             if line_str.startswith('event:'):
@@ -964,7 +967,7 @@ class CozeStreamService(BaseLLMStreamService):
                                     msg_type = data.get('type', '')
                                     status = data.get('status', '')
                                     
-                                    logger.debug(f"[{trace_id}] 📨 处理SSE数据: event={event_type}, type={msg_type}, status={status}")
+                                    hot_logger.debug("[%s] 📨 处理SSE数据: event=%s, type=%s, status=%s", trace_id, event_type, msg_type, status)
                                     
                                     # 优先检查status字段
                                     if status == 'failed':
@@ -983,7 +986,7 @@ class CozeStreamService(BaseLLMStreamService):
                                     if event_type == 'conversation.message.delta':
                                         # 跳过非answer类型
                                         if msg_type in ['knowledge_recall', 'verbose']:
-                                            logger.debug(f"⏭️ 跳过 {msg_type} 类型的delta消息")
+                                            hot_logger.debug("⏭️ 跳过 %s 类型的delta消息", msg_type)
                                             continue
                                         
                                         # 只使用 content 字段，过滤掉深度思考模型的 reasoning_content（思考过程）
@@ -991,7 +994,7 @@ class CozeStreamService(BaseLLMStreamService):
                                         
                                         # 增强日志：记录delta事件
                                         if not content:
-                                            logger.debug(f"⚠️ Delta事件content为空: event={event_type}, type={msg_type}, data_keys={list(data.keys())[:10]}")
+                                            hot_logger.debug("⚠️ Delta事件content为空: event=%s, type=%s, data_keys=%s", event_type, msg_type, lazy(lambda: list(data)[:10]))
                                         
                                         if content and isinstance(content, str):
                                             # 处理content可能是JSON字符串的情况
@@ -1025,30 +1028,30 @@ class CozeStreamService(BaseLLMStreamService):
                                                 thinking_buffer = ''.join(thinking_buffer_chunks)
                                                 if self._is_thinking_start(thinking_buffer):
                                                     is_thinking = True
-                                                    logger.debug(f"🧠 检测到思考过程开头，开始过滤: {thinking_buffer[:50]}...")
+                                                    hot_logger.debug("🧠 检测到思考过程开头，开始过滤: %.50s...", thinking_buffer)
                                                 elif self._is_answer_start(thinking_buffer):
                                                     is_thinking = False
-                                                    logger.debug(f"✅ 检测到正式答案开头: {thinking_buffer[:50]}...")
+                                                    hot_logger.debug("✅ 检测到正式答案开头: %.50s...", thinking_buffer)
                                             
                                             # 如果正在思考过程中，检测是否出现正式答案
                                             if is_thinking:
                                                 if self._is_answer_start(content):
                                                     is_thinking = False
-                                                    logger.debug(f"✅ 思考过程结束，检测到正式答案: {content[:50]}...")
+                                                    hot_logger.debug("✅ 思考过程结束，检测到正式答案: %.50s...", content)
                                                 else:
                                                     # 仍在思考过程中，跳过此内容
-                                                    logger.debug(f"🧠 过滤思考过程: {content[:50]}...")
+                                                    hot_logger.debug("🧠 过滤思考过程: %.50s...", content)
                                                     continue
                                             
                                             # 过滤掉提示词和指令文本（作为备选过滤）
                                             if self._is_prompt_or_instruction(content):
-                                                logger.info(f"⚠️ 内容被过滤（提示词/指令）: {content[:50]}...")
+                                                hot_logger.info("⚠️ 内容被过滤（提示词/指令）: %.50s...", content)
                                                 continue
                                             
                                             has_content = True
                                             buffer_chunks.append(content)
                                             sent_length += len(content)  # 记录已发送长度（优化方案2.2）
-                                            logger.debug(f"📤 Delta 内容: {len(content)}字符, 累计已发送: {sent_length}字符, Buffer总长度: {sum(len(c) for c in buffer_chunks)}字符")  # 优化方案2.3
+                                            hot_logger.debug("📤 Delta 内容: %d字符, 累计已发送: %d字符, Buffer总长度: %s字符", len(content), sent_length, lazy(lambda: sum(len(c) for c in buffer_chunks)))  # 优化方案2.3
                                             yield {
                                                 'type': 'progress',
                                                 'content': content
@@ -1062,12 +1065,12 @@ class CozeStreamService(BaseLLMStreamService):
                                     elif event_type == 'conversation.message.completed':
                                         # 对于 verbose 类型，直接跳过
                                         if msg_type == 'verbose':
-                                            logger.info(f"⏭️ 跳过 verbose 类型消息（知识库召回/调试信息，不是Bot回答），content长度: {len(str(data.get('content', '')))}")
+                                            hot_logger.info("⏭️ 跳过 verbose 类型消息（知识库召回/调试信息，不是Bot回答），content长度: %s", lazy(lambda: len(str(data.get('content', '')))))
                                             continue
                                         
                                         # 跳过 knowledge_recall 类型的消息
                                         if msg_type == 'knowledge_recall':
-                                            logger.info(f"⏭️ 跳过 {msg_type} 类型消息（知识库召回，不是Bot回答）")
+                                            hot_logger.info("⏭️ 跳过 %s 类型消息（知识库召回，不是Bot回答）", msg_type)
                                             continue
                                         
                                         # ⚠️ 关键修复：如果没有收到 delta 事件，尝试从 completed 事件中提取内容（不限制 msg_type）
@@ -1078,8 +1081,8 @@ class CozeStreamService(BaseLLMStreamService):
                                             # ⚠️ 增强日志：记录所有相关信息
                                             logger.info(f"📝 conversation.message.completed 事件详情: msg_type={msg_type or '(无)'}, has_content={has_content}, content类型={type(content)}, content长度={len(str(content)) if content else 0}")
                                             if content:
-                                                logger.info(f"📝 content预览: {str(content)[:200]}")
-                                            logger.info(f"📝 完整data keys: {list(data.keys())}")
+                                                hot_logger.info("📝 content预览: %.200s", content)
+                                            hot_logger.info("📝 完整data keys: %s", lazy(list, data))
                                             
                                             # 尝试多种方式提取内容
                                             if not content:
@@ -1128,7 +1131,7 @@ class CozeStreamService(BaseLLMStreamService):
                                                 
                                                 # 过滤掉提示词和指令文本
                                                 if self._is_prompt_or_instruction(content):
-                                                    logger.info(f"⚠️ 内容被过滤（提示词/指令）: {content[:50]}...")
+                                                    hot_logger.info("⚠️ 内容被过滤（提示词/指令）: %.50s...", content)
                                                     continue
                                                 
                                                 has_content = True
@@ -1148,10 +1151,10 @@ class CozeStreamService(BaseLLMStreamService):
                                                 logger.info(f"📤 已发送完整消息（从completed事件）: 总长度={len(content)}字符")
                                             else:
                                                 logger.warning(f"⚠️ conversation.message.completed 事件中 content 为空或无效: msg_type={msg_type}, content类型={type(content)}, content长度={len(str(content)) if content else 0}")
-                                                logger.warning(f"⚠️ 完整data内容: {json.dumps(data, ensure_ascii=False)[:500]}")
+                                                hot_logger.warning("⚠️ 完整data内容: %.500s", lazy(json.dumps, data, ensure_ascii=False))
                                         else:
                                             # 如果已经收到 delta 事件，跳过 completed 事件避免重复
-                                            logger.info(f"📝 收到完整消息（conversation.message.completed，已收到delta事件，跳过避免重复）: msg_type={msg_type}, buffer长度={sum(len(c) for c in buffer_chunks)}, 已发送长度={sent_length}")
+                                            hot_logger.info("📝 收到完整消息（conversation.message.completed，已收到delta事件，跳过避免重复）: msg_type=%s, buffer长度=%s, 已发送长度=%d", msg_type, lazy(lambda: sum(len(c) for c in buffer_chunks)), sent_length)
                                         continue
                                     
                                     # 处理 conversation.chat.completed 事件（对话完成）
@@ -1247,7 +1250,7 @@ class CozeStreamService(BaseLLMStreamService):
                                             
                                             # 过滤掉提示词和指令文本
                                             if self._is_prompt_or_instruction(content):
-                                                logger.info(f"⚠️ 内容被过滤（提示词/指令）: {content[:50]}...")
+                                                hot_logger.info("⚠️ 内容被过滤（提示词/指令）: %.50s...", content)
                                                 continue
                                             
                                             has_content = True
@@ -1257,10 +1260,10 @@ class CozeStreamService(BaseLLMStreamService):
                                                 'content': content
                                             }
                                         else:
-                                            logger.debug(f"⚠️ 未能从响应中提取内容 (Bot ID: {used_bot_id}), event={event_type}, type={msg_type}, 原始数据: {json.dumps(data, ensure_ascii=False)[:200]}")
+                                            hot_logger.debug("⚠️ 未能从响应中提取内容 (Bot ID: %s), event=%s, type=%s, 原始数据: %.200s", used_bot_id, event_type, msg_type, lazy(json.dumps, data, ensure_ascii=False))
                                 
                                 except json.JSONDecodeError as e:
-                                    logger.debug(f"JSON解析失败: {e}, 原始数据: {data_str[:100]}")
+                                    hot_logger.debug("JSON解析失败: %s, 原始数据: %.100s", e, data_str)
                                     continue
                             
                             # 如果流已结束，跳出循环
@@ -1491,9 +1494,7 @@ class CozeStreamService(BaseLLMStreamService):
         
         # 调试日志（可选，生产环境可关闭）
         if not content:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f"无法从Coze响应中提取内容，原始数据: {data}")
+            hot_logger.debug("无法从Coze响应中提取内容，原始数据: %s", data)
         
         return content or ''
     
@@ -1624,7 +1625,7 @@ class CozeStreamService(BaseLLMStreamService):
         text_lower = text.lower()
         for keyword in prompt_keywords:
             if keyword in text:
-                logger.debug(f"🚫 过滤内容（匹配关键词 '{keyword}'）: {text[:80]}...")
+                hot_logger.debug("🚫 过滤内容（匹配关键词 '%s'）: %.80s...", keyword, text)
                 return True
         
         # 检查开头是否是思考过程模式
@@ -1639,7 +1640,7 @@ class CozeStreamService(BaseLLMStreamService):
         ]
         for pattern in thinking_start_patterns:
             if text.strip().startswith(pattern):
-                logger.debug(f"🚫 过滤内容（开头匹配 '{pattern}'）: {text[:80]}...")
+                hot_logger.debug("🚫 过滤内容（开头匹配 '%s'）: %.80s...", pattern, text)
                 return True
         
         # 检查是否包含JSON结构（技术性消息）
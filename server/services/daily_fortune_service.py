@@ -18,13 +18,13 @@ from server.services.bazi_service import BaziService
 from server.services.bazi_detail_service import BaziDetailService
 from server.services.rule_service import RuleService
 from server.utils.data_validator import validate_bazi_data
+from server.utils.cache_policy import get_cache
 
 
 class DailyFortuneService:
     """今日运势分析服务"""
     
-    # Redis缓存TTL（24小时，因为每日运势每天变化）
-    CACHE_TTL = 86400
+    # 缓存 TTL 由 server.utils.cache_policy 的 daily_fortune 策略声明（24小时，因为每日运势每天变化）
     
     @staticmethod
     def _generate_cache_key(
@@ -208,9 +208,7 @@ class DailyFortuneService:
         
         # 2. 先查缓存（L1内存 + L2 Redis）
         try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
-            cached_result = cache.get(cache_key)
+            cached_result = get_cache('daily_fortune').get(cache_key)
             if cached_result:
                 # 缓存命中，直接返回（0个数据库连接）
                 return cached_result
@@ -226,13 +224,7 @@ class DailyFortuneService:
         # 4. 写入缓存（仅成功时）
         if result.get('success'):
             try:
-                from server.utils.cache_multi_level import get_multi_cache
-                cache = get_multi_cache()
-                # 使用自定义TTL（24小时）
-                cache.l2.ttl = DailyFortuneService.CACHE_TTL
-                cache.set(cache_key, result)
-                # 恢复默认TTL
-                cache.l2.ttl = 3600
+                get_cache('daily_fortune').set(cache_key, result)
             except Exception as e:
                 # 缓存写入失败不影响业务
                 logger.warning(f"⚠️  缓存写入失败（不影响业务）: {e}")
@@ -795,6 +787,7 @@ class DailyFortuneService:
             # 1. 清理本地L1缓存
             cache = get_multi_cache()
             cache.l1.clear()  # 清空所有L1缓存（简单实现）
+            get_cache('daily_fortune').clear_l1()
             
             # 2. 清理Redis缓存（支持pattern匹配）
             redis_client = get_redis_client()
@@ -28,6 +28,7 @@ sys.path.insert(0, project_root)
 from server.config.input_format_loader import get_format_loader, build_input_data
 from server.utils.prompt_builders import format_smart_fortune_for_llm
 from server.utils.api_cache_helper import generate_cache_key, get_cached_result, set_cached_result
+from server.utils.stream_inflight import get_inflight_registry, stream_completed
 
 # 导入配置加载器（从数据库读取配置）
 from server.config.config_loader import get_config_from_db_only
@@ -268,6 +269,15 @@ class FortuneLLMClient:
             logger.error(f"❌ Redis写入失败: {e}")
             return False
     
+    def _cache_stream_result(self, cache_key: str, chunks: List[Dict[str, Any]]) -> None:
+        """流式结果正常结束后写入缓存（由进行中流登记表在上游结束时调用一次）"""
+        if not stream_completed(chunks):
+            return
+        content = ''.join(c['content'] for c in chunks if c.get('type') == 'chunk' and c.get('content'))
+        if content:
+            set_cached_result(cache_key, content, ttl=86400)
+            logger.debug(f"✅ 流式结果已缓存: {cache_key[:50]}...")
+    
     def analyze_fortune(
         self,
         intent: str,
@@ -390,22 +400,22 @@ class FortuneLLMClient:
                     logger.info(f"[fortune_llm_client] 📞 调用 _call_coze_api_stream（无conversation_id，首次对话）")
                 logger.info(f"[fortune_llm_client] 📤 输入数据大小: {len(json.dumps(input_data, ensure_ascii=False))}字符")
                 
-                async def stream_and_cache_llm():
-                    stream_cache_key = self._smart_fortune_llm_stream_cache_key(intent, question, bazi_data) if not conversation_id else None
-                    full = []
-                    async for chunk in self._stream_via_executor(
+                if conversation_id:
+                    # 多轮对话上下文各不相同，不复用进行中的流
+                    return self._stream_via_executor(
                         self._call_coze_api_stream,
                         input_data,
                         conversation_id=conversation_id
-                    ):
-                        if chunk.get('type') == 'chunk' and chunk.get('content'):
-                            full.append(chunk['content'])
-                        yield chunk
-                        if chunk.get('type') == 'end' and stream_cache_key and full:
-                            set_cached_result(stream_cache_key, ''.join(full), ttl=86400)
-                            logger.debug(f"✅ 流式深度解读已缓存: {stream_cache_key[:50]}...")
+                    )
                 
-                return stream_and_cache_llm()
+                # 相同问题+八字正在生成时挂载到进行中的上游，缓存在上游结束时只写一次
+                stream_cache_key = self._smart_fortune_llm_stream_cache_key(intent, question, bazi_data)
+                return get_inflight_registry().stream(
+                    stream_cache_key,
+                    lambda: self._stream_via_executor(self._call_coze_api_stream, input_data),
+                    on_complete=lambda chunks: self._cache_stream_result(stream_cache_key, chunks),
+                    scene="smart_fortune_llm",
+                )
             
             # 尝试从缓存获取（非流式模式）
             cache_key = None
@@ -1621,18 +1631,14 @@ class FortuneLLMClient:
                 'task_type': 'brief_response'
             }
             
-            async def stream_and_cache():
-                full = []
-                async for chunk in self._stream_via_executor(self._call_coze_api_stream, input_data):
-                    if chunk.get('type') == 'chunk' and chunk.get('content'):
-                        full.append(chunk['content'])
-                    yield chunk
-                    if chunk.get('type') == 'end' and full:
-                        set_cached_result(cache_key, ''.join(full), ttl=86400)
-                        logger.debug(f"✅ 简短答复已缓存: {cache_key[:50]}...")
-            
             logger.info(f"📊 生成简短答复，category: {category}（异步非阻塞）")
-            return stream_and_cache()
+            # 相同八字+分类正在生成时挂载到进行中的上游，缓存在上游结束时只写一次
+            return get_inflight_registry().stream(
+                cache_key,
+                lambda: self._stream_via_executor(self._call_coze_api_stream, input_data),
+                on_complete=lambda chunks: self._cache_stream_result(cache_key, chunks),
+                scene="smart_fortune_brief",
+            )
             
         except Exception as e:
             logger.error(f"❌ generate_brief_response 异常: {e}", exc_info=True)
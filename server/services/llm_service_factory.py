@@ -3,20 +3,24 @@
 """
 LLM 服务工厂
 
-根据数据库配置返回对应的 LLM 服务实例（Coze 或百炼）。
-支持全局配置和场景级配置。
+根据数据库配置返回对应的 LLM 服务实例（Coze、百炼或本地模拟）。
+支持全局配置和场景级配置；LLM_MOCK_ENABLED=true 时所有场景使用本地模拟服务（压测用）。
 """
 
 import logging
+import os
 from typing import Optional
 
 from server.services.base_llm_stream_service import BaseLLMStreamService
 from server.services.coze_stream_service import CozeStreamService
 from server.services.bailian_stream_service import BailianStreamService
+from server.services.mock_llm_stream_service import LLM_MOCK_ENABLED, MockLLMStreamService
 from server.config.config_loader import get_config_from_db_only
 
 logger = logging.getLogger(__name__)
 
+_PLATFORMS = ("coze", "bailian", "mock")
+
 
 class LLMServiceFactory:
     """LLM 服务工厂 - 根据配置返回对应的 LLM 服务"""
@@ -33,10 +37,15 @@ class LLMServiceFactory:
         Returns:
             LLM 服务实例
         """
-        platform = cls._get_platform_for_scene(scene)
+        platform = "mock" if LLM_MOCK_ENABLED else cls._get_platform_for_scene(scene)
+        if platform == "mock" and os.getenv("APP_ENV", "development").lower() == "production":
+            logger.error(f"生产环境禁止使用模拟 LLM 服务（场景 {scene}），回退到 Coze")
+            platform = "coze"
         
         logger.info(f"为场景 {scene} 选择平台: {platform}")
         
+        if platform == "mock":
+            return MockLLMStreamService.get_instance(scene=scene)
         if platform == "bailian":
             try:
                 # ✅ 优化：使用单例方法，避免重复初始化
@@ -61,21 +70,21 @@ class LLMServiceFactory:
             scene: 场景名称
         
         Returns:
-            平台名称（"coze" 或 "bailian"）
+            平台名称（"coze"、"bailian" 或 "mock"）
         """
         # 1. 先查场景级配置（直接从配置表读取，使用统一的命名规则）
         scene_platform = get_config_from_db_only(f"{scene.upper()}_LLM_PLATFORM")
         if scene_platform:
             platform = scene_platform.lower().strip()
             logger.debug(f"场景 {scene} 使用场景级配置: {platform}")
-            return platform if platform in ("coze", "bailian") else "coze"
+            return platform if platform in _PLATFORMS else "coze"
         
         # 2. 使用全局配置
         global_platform = get_config_from_db_only("LLM_PLATFORM")
         if global_platform:
             platform = global_platform.lower().strip()
             logger.debug(f"场景 {scene} 使用全局配置: {platform}")
-            return platform if platform in ("coze", "bailian") else "coze"
+            return platform if platform in _PLATFORMS else "coze"
         
         # 3. 默认使用 Coze
         logger.debug(f"场景 {scene} 使用默认平台: coze")
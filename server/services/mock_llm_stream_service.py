@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟 LLM 流式服务（容量压测用）
+
+压测流式接口时不调用 Coze / 百炼：按配置的首字延迟、输出速度、分块大小在本进程内
+逐块产出 progress / complete，可按比例注入错误。配合 stress_test/ 测量服务端真实的
+流式并发容量、事件循环延迟和每路流的内存开销，结果可复现且没有调用费用。
+
+启用方式（二选一）：
+    - 环境变量 LLM_MOCK_ENABLED=true：所有场景改用模拟服务，不读数据库配置
+    - 数据库配置 LLM_PLATFORM / {SCENE}_LLM_PLATFORM 设为 mock
+生产环境（APP_ENV=production）下 LLMServiceFactory 拒绝启用。
+
+环境变量：
+    MOCK_LLM_FIRST_TOKEN_MS     首字延迟（毫秒，默认 800）
+    MOCK_LLM_TOKENS_PER_SECOND  首字之后的输出速度（字/秒，默认 50；0 表示不限速）
+    MOCK_LLM_CHUNK_TOKENS       每个 progress 块的字数（默认 5）
+    MOCK_LLM_OUTPUT_TOKENS      每次输出总字数（默认 800）
+    MOCK_LLM_JITTER             块间隔随机抖动比例（默认 0.2，即 ±20%）
+    MOCK_LLM_ERROR_RATE         注入错误的请求比例（0~1，默认 0）
+    MOCK_LLM_ERROR_AT           在输出进度的哪个位置出错（0~1，默认 0.5；0 表示首字前）
+    MOCK_LLM_ERROR_KIND         event：产出 type=error（与平台返回错误一致）；
+                                exception：抛出异常（模拟连接中断），默认 event
+    MOCK_LLM_SEED               随机种子（设置后抖动与错误注入可复现）
+
+运行统计见 get_mock_llm_stats()（/api/v1/observability/mock-llm）：
+并发流数 / 峰值、首字耗时、事件循环延迟（每次 sleep 实际唤醒时间与预定时间之差）、
+进程 RSS 以及按峰值并发估算的每路流内存。
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncGenerator, Dict, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from server.services.base_llm_stream_service import BaseLLMStreamService
+
+logger = logging.getLogger(__name__)
+
+LLM_MOCK_ENABLED = os.getenv("LLM_MOCK_ENABLED", "false").lower() == "true"
+
+_FILLER = (
+    "命局日主得令，月令透出印星生身，整体气势偏旺。大运行至财官之地，宜顺势而为，"
+    "把握贵人提携的机会；流年逢冲，需注意情绪起伏与人际摩擦。事业上稳中求进，"
+    "不宜贸然转换赛道；财运以正财为主，理财以稳健为先。感情方面重在沟通，"
+    "家庭和睦则诸事顺遂。健康上注意脾胃与作息，适度运动，劳逸结合。"
+)
+
+
+@dataclass
+class MockLLMConfig:
+    first_token_ms: float = 800.0
+    tokens_per_second: float = 50.0
+    chunk_tokens: int = 5
+    output_tokens: int = 800
+    jitter: float = 0.2
+    error_rate: float = 0.0
+    error_at: float = 0.5
+    error_kind: str = "event"
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "MockLLMConfig":
+        seed = os.getenv("MOCK_LLM_SEED")
+        return cls(
+            first_token_ms=float(os.getenv("MOCK_LLM_FIRST_TOKEN_MS", "800")),
+            tokens_per_second=float(os.getenv("MOCK_LLM_TOKENS_PER_SECOND", "50")),
+            chunk_tokens=max(1, int(os.getenv("MOCK_LLM_CHUNK_TOKENS", "5"))),
+            output_tokens=max(1, int(os.getenv("MOCK_LLM_OUTPUT_TOKENS", "800"))),
+            jitter=min(1.0, max(0.0, float(os.getenv("MOCK_LLM_JITTER", "0.2")))),
+            error_rate=min(1.0, max(0.0, float(os.getenv("MOCK_LLM_ERROR_RATE", "0")))),
+            error_at=min(1.0, max(0.0, float(os.getenv("MOCK_LLM_ERROR_AT", "0.5")))),
+            error_kind=os.getenv("MOCK_LLM_ERROR_KIND", "event").lower(),
+            seed=int(seed) if seed else None,
+        )
+
+
+class MockLLMError(RuntimeError):
+    """error_kind=exception 时注入的异常（模拟上游连接中断）"""
+
+
+# ==================== 运行统计 ====================
+
+class MockLLMStats:
+    """模拟服务的进程内统计（所有场景共用）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.active = 0
+            self.peak = 0
+            self.started = 0
+            self.completed = 0
+            self.errors = 0
+            self.cancelled = 0
+            self.first_token_ms_total = 0.0
+            self.first_token_count = 0
+            self.lag_ms_total = 0.0
+            self.lag_ms_max = 0.0
+            self.lag_count = 0
+            self.rss_idle_mb: Optional[float] = None
+            self.rss_at_peak_mb: Optional[float] = None
+
+    def stream_started(self) -> None:
+        with self._lock:
+            if self.active == 0 and self.rss_idle_mb is None:
+                self.rss_idle_mb = _rss_mb()
+            self.active += 1
+            self.started += 1
+            if self.active > self.peak:
+                self.peak = self.active
+                self.rss_at_peak_mb = _rss_mb()
+
+    def stream_finished(self, outcome: str) -> None:
+        with self._lock:
+            self.active -= 1
+            if outcome == "complete":
+                self.completed += 1
+            elif outcome == "error":
+                self.errors += 1
+            else:
+                self.cancelled += 1
+
+    def first_token(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.first_token_ms_total += elapsed_ms
+            self.first_token_count += 1
+
+    def loop_lag(self, lag_ms: float) -> None:
+        with self._lock:
+            self.lag_ms_total += lag_ms
+            self.lag_count += 1
+            if lag_ms > self.lag_ms_max:
+                self.lag_ms_max = lag_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            per_stream_kb = None
+            if self.peak and self.rss_idle_mb is not None and self.rss_at_peak_mb is not None:
+                per_stream_kb = round((self.rss_at_peak_mb - self.rss_idle_mb) * 1024 / self.peak, 1)
+            return {
+                "active_streams": self.active,
+                "peak_streams": self.peak,
+                "started": self.started,
+                "completed": self.completed,
+                "errors": self.errors,
+                "cancelled": self.cancelled,
+                "avg_first_token_ms": round(self.first_token_ms_total / self.first_token_count, 2)
+                if self.first_token_count else None,
+                "loop_lag_avg_ms": round(self.lag_ms_total / self.lag_count, 3) if self.lag_count else None,
+                "loop_lag_max_ms": round(self.lag_ms_max, 3),
+                "rss_mb": _rss_mb(),
+                "rss_idle_mb": self.rss_idle_mb,
+                "rss_at_peak_mb": self.rss_at_peak_mb,
+                "est_kb_per_stream": per_stream_kb,
+            }
+
+
+def _rss_mb() -> Optional[float]:
+    if psutil is None:
+        return None
+    try:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 2)
+    except Exception:
+        return None
+
+
+_stats = MockLLMStats()
+
+
+def get_mock_llm_stats() -> Dict[str, Any]:
+    """模拟服务的运行统计（含当前配置）"""
+    data = _stats.snapshot()
+    data["config"] = asdict(MockLLMConfig.from_env())
+    return data
+
+
+def reset_mock_llm_stats() -> None:
+    """清零统计（每轮压测开始前调用）"""
+    _stats.reset()
+
+
+# ==================== 服务 ====================
+
+_mock_service_cache: Dict[str, "MockLLMStreamService"] = {}
+
+
+class MockLLMStreamService(BaseLLMStreamService):
+    """本地模拟 LLM 流式服务 - 与 Coze / 百炼相同的 progress / complete / error 块"""
+
+    @classmethod
+    def get_instance(cls, scene: str) -> "MockLLMStreamService":
+        if scene not in _mock_service_cache:
+            logger.info(f"[MockLLMStreamService] 创建模拟服务: scene={scene}")
+            _mock_service_cache[scene] = cls(scene)
+        return _mock_service_cache[scene]
+
+    def __init__(self, scene: str = "default", config: Optional[MockLLMConfig] = None):
+        self.scene = scene
+        self.config = config or MockLLMConfig.from_env()
+        self._rng = random.Random(self.config.seed)
+
+    def _output_text(self, prompt: str) -> str:
+        """按提示词确定起始位置截取填充文本，同一提示词输出相同"""
+        offset = int(hashlib.md5(prompt.encode("utf-8")).hexdigest()[:8], 16) % len(_FILLER)
+        size = self.config.output_tokens
+        repeated = _FILLER * (size // len(_FILLER) + 2)
+        return repeated[offset:offset + size]
+
+    async def _sleep_until(self, loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+        delay = deadline - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # 实际唤醒时间晚于预定时间的部分即事件循环延迟
+        _stats.loop_lag(max(0.0, loop.time() - deadline) * 1000)
+
+    async def stream_analysis(
+        self,
+        prompt: str,
+        trace_id: Optional[str] = None,
+        **kwargs
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        模拟流式生成
+
+        Yields:
+            dict: {'type': 'progress' | 'complete' | 'error', 'content': str}
+        """
+        config = self.config
+        text = self._output_text(prompt or "")
+        fail_at = None
+        if config.error_rate and self._rng.random() < config.error_rate:
+            fail_at = int(len(text) * config.error_at)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        outcome = "cancelled"
+        _stats.stream_started()
+        try:
+            deadline = start + config.first_token_ms / 1000
+            await self._sleep_until(loop, deadline)
+            interval = config.chunk_tokens / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+            sent = 0
+            while sent < len(text):
+                if fail_at is not None and sent >= fail_at:
+                    outcome = "error"
+                    logger.debug(f"[{trace_id or 'N/A'}] 模拟 LLM 注入错误: scene={self.scene}, 已输出 {sent} 字")
+                    if config.error_kind == "exception":
+                        raise MockLLMError(f"模拟 LLM 连接中断（已输出 {sent} 字）")
+                    yield {'type': 'error', 'content': f'模拟 LLM 错误（已输出 {sent} 字）'}
+                    return
+                if sent == 0:
+                    _stats.first_token((loop.time() - start) * 1000)
+                chunk = text[sent:sent + config.chunk_tokens]
+                sent += len(chunk)
+                yield {'type': 'progress', 'content': chunk}
+                if sent < len(text) and interval:
+                    # 按绝对时间排期，消费方处理慢不会累积成更慢的输出速度
+                    jitter = 1 + self._rng.uniform(-config.jitter, config.jitter) if config.jitter else 1
+                    deadline = max(deadline + interval * jitter, loop.time())
+                    await self._sleep_until(loop, deadline)
+
+            outcome = "complete"
+            yield {'type': 'complete', 'content': ''}
+        finally:
+            _stats.stream_finished(outcome)
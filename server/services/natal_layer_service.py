@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本命层服务 - 拆分与时间无关的本命结果和与时间相关的当前窗口
+
+本命层（排盘、大运序列、全部流年序列、旺衰/身宫命宫/规则等附加数据）只由出生信息
+和规则版本决定，按出生信息长期缓存；当前窗口（当前流年、流日、流时、流月、上下文）
+在本命层上按请求时间即时派生，不进入长期缓存键。
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from core.calculators.helpers import compute_detail_from_natal_layer, compute_natal_layer
+from server.utils.cache_policy import get_cache
+
+logger = logging.getLogger(__name__)
+
+# 本命层计算逻辑变化时递增，旧缓存随之失效
+NATAL_LAYER_VERSION = os.getenv("NATAL_LAYER_VERSION", "1")
+# 缓存策略命名空间（TTL/压缩等见 server.utils.cache_policy，可用 CACHE_POLICIES 覆盖）
+NATAL_CACHE_NAMESPACE = "natal"
+
+
+def _rule_version_tag() -> str:
+    """当前进程已加载的规则版本（规则热更新后键随之变化）"""
+    try:
+        from server.services.rule_service import RuleService
+        return f"r{RuleService._cached_rule_version}.{RuleService._cached_content_version}"
+    except Exception:
+        return "r0"
+
+
+class NatalLayerService:
+    """本命层缓存与当前窗口派生"""
+
+    @staticmethod
+    def build_key(kind: str, solar_date: str, solar_time: str, gender: str,
+                  *parts: Any, with_rule_version: bool = False) -> str:
+        """
+        生成本命层缓存键（只含出生信息和版本，不含当前时间）
+
+        格式：natal:{kind}:v{NATAL_LAYER_VERSION}[:r{rule}.{content}]:{solar_date}:{solar_time}:{gender}[:parts...]
+        """
+        key_parts = ['natal', kind, f"v{NATAL_LAYER_VERSION}"]
+        if with_rule_version:
+            key_parts.append(_rule_version_tag())
+        key_parts.extend([solar_date, solar_time, gender])
+        key_parts.extend('' if p is None else str(p) for p in parts)
+        return ':'.join(key_parts)
+
+    @staticmethod
+    def load(cache_key: str) -> Optional[Any]:
+        """读取本命层缓存（L1 内存 + L2 Redis），不可用时返回 None"""
+        try:
+            cached = get_cache(NATAL_CACHE_NAMESPACE).get(cache_key)
+            if cached:
+                logger.debug(f"✅ [本命层缓存命中] {cache_key[:60]}")
+            return cached
+        except Exception as e:
+            logger.warning(f"⚠️  本命层缓存不可用，降级到直接计算: {e}")
+            return None
+
+    @staticmethod
+    def store(cache_key: str, value: Any) -> None:
+        """按本命层策略写入缓存（长 TTL）"""
+        try:
+            get_cache(NATAL_CACHE_NAMESPACE).set(cache_key, value)
+        except Exception:
+            pass  # 缓存写入失败不影响业务
+
+    @staticmethod
+    def get_or_compute(cache_key: str, compute: Callable[[], Any], use_cache: bool = True) -> Any:
+        """按本命层键读取缓存，未命中时计算并写入"""
+        if use_cache:
+            cached = NatalLayerService.load(cache_key)
+            if cached:
+                return cached
+
+        value = compute()
+        if use_cache and value:
+            NatalLayerService.store(cache_key, value)
+        return value
+
+    @staticmethod
+    def get_fortune_layer(solar_date: str, solar_time: str, gender: str,
+                          use_cache: bool = True) -> Dict[str, Any]:
+        """获取本命层大运流年数据（排盘 + 大运序列 + 全部流年序列）"""
+        cache_key = NatalLayerService.build_key('fortune', solar_date, solar_time, gender)
+        return NatalLayerService.get_or_compute(
+            cache_key,
+            lambda: compute_natal_layer(solar_date, solar_time, gender),
+            use_cache=use_cache,
+        )
+
+    @staticmethod
+    def get_detail(solar_date: str, solar_time: str, gender: str,
+                   current_time: Optional[datetime] = None,
+                   target_year: Optional[int] = None,
+                   use_cache: bool = True) -> Dict[str, Any]:
+        """
+        获取完整大运流年详情：本命层走缓存，当前窗口按 current_time 即时派生
+
+        结果与 compute_local_detail(dayun_index=None) 一致。
+        """
+        natal_layer = NatalLayerService.get_fortune_layer(solar_date, solar_time, gender, use_cache=use_cache)
+        return compute_detail_from_natal_layer(
+            natal_layer, solar_date, solar_time, gender,
+            current_time=current_time, target_year=target_year,
+        )
@@ -15,9 +15,10 @@ from typing import Dict, List, Optional
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 sys.path.insert(0, project_root)
 
-from server.engines.rule_engine import EnhancedRuleEngine
+from server.engines.rule_engine import SCOPE_CHART, SCOPE_MOMENT, EnhancedRuleEngine
 from server.engines.query_adapters import QueryAdapterRegistry
 from server.utils.cache_multi_level import get_multi_cache
+from server.utils.chart_identity import CHART_FIELDS
 from shared.config.database import mysql_config
 
 logger = logging.getLogger(__name__)
@@ -183,6 +184,9 @@ class RuleService:
         """
         匹配规则
         
+        只依赖四柱 + 性别的规则按盘面身份缓存（同一时辰内的出生时间共享结果），
+        其余规则（旺衰、农历日期、流年等）按各自实际读取的字段单独缓存后合并。
+        
         Args:
             bazi_data: 八字数据（完整的八字计算结果）
             rule_types: 要匹配的规则类型列表
@@ -191,21 +195,43 @@ class RuleService:
         Returns:
             List[Dict]: 匹配的规则列表
         """
-        # 生成缓存键
-        cache_key = cls._generate_cache_key(bazi_data, rule_types)
-        
-        # 检查缓存
+        engine = cls.get_engine()
+        types_part = ",".join(sorted(rule_types)) if rule_types else "*"
+        cache = cls.get_cache()
+        chart_key = cache.chart_key(f"bazi:rules:{types_part}", bazi_data)
+        if chart_key is None:
+            # 四柱不完整，按出生时间整体缓存
+            return cls._match_and_cache(cls._generate_cache_key(bazi_data, rule_types),
+                                        bazi_data, rule_types, None, use_cache)
+
+        matched = cls._match_and_cache(chart_key, bazi_data, rule_types, SCOPE_CHART, use_cache)
+        moment_fields = engine.moment_fields(rule_types)
+        if moment_fields:
+            moment_key = cache.chart_key(f"bazi:rules:{types_part}:moment", bazi_data,
+                                                   CHART_FIELDS + tuple(moment_fields))
+            matched = matched + cls._match_and_cache(moment_key, bazi_data, rule_types, SCOPE_MOMENT, use_cache)
+            matched.sort(key=lambda r: r.get('priority', 100), reverse=True)
+        return matched
+
+    @classmethod
+    def _match_and_cache(cls, cache_key: str, bazi_data: Dict, rule_types: Optional[List[str]],
+                         scope: Optional[str], use_cache: bool) -> List[Dict]:
+        """匹配指定范围的规则并格式化，结果（含空列表）按 cache_key 缓存"""
         if use_cache:
-            cache = cls.get_cache()
-            cached_result = cache.get(cache_key)
+            cached_result = cls.get_cache().get(cache_key)
             if cached_result is not None:
                 return cached_result
-        
-        # 匹配规则
-        engine = cls.get_engine()
-        matched_rules = engine.match_rules(bazi_data, rule_types)
-        
-        # 格式化规则结果（支持动态查询）
+
+        matched_rules = cls.get_engine().match_rules(bazi_data, rule_types, scope=scope)
+        formatted_rules = cls._format_rules(matched_rules, bazi_data)
+
+        if use_cache:
+            cls.get_cache().set(cache_key, formatted_rules)
+        return formatted_rules
+
+    @classmethod
+    def _format_rules(cls, matched_rules: List[Dict], bazi_data: Dict) -> List[Dict]:
+        """格式化匹配结果（动态查询规则调用查询适配器获取内容）"""
         formatted_rules = []
         for rule in matched_rules:
             rule_content = rule.get('content', {})
@@ -265,11 +291,6 @@ class RuleService:
             
             formatted_rules.append(formatted_rule)
         
-        # 缓存结果
-        if use_cache and formatted_rules:
-            cache = cls.get_cache()
-            cache.set(cache_key, formatted_rules)
-        
         return formatted_rules
     
     @classmethod
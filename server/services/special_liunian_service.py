@@ -17,6 +17,7 @@ sys.path.insert(0, project_root)
 
 from server.services.bazi_display_service import BaziDisplayService
 from server.services.bazi_detail_service import BaziDetailService
+from server.services.natal_layer_service import NatalLayerService
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -60,34 +61,20 @@ class SpecialLiunianService:
             return []
         
         # 1. 生成缓存键（包含所有影响结果的参数）
+        # ✅ 本命层：结果只取决于大运序列和全部流年的 relations（均与当前时间无关），
+        # 缓存键不含 current_time，按出生信息长期缓存
         # 提取大运步骤列表并排序，用于缓存键
         dayun_steps = sorted([dayun.get('step') for dayun in dayun_sequence if dayun.get('step') is not None])
         dayun_steps_str = ','.join(map(str, dayun_steps))
-        current_time_iso = current_time.strftime('%Y-%m-%dT%H') if current_time else None
-        cache_key_parts = [
-            'special_liunians',
-            solar_date,
-            solar_time,
-            gender,
-            dayun_steps_str,
-            str(dayun_count),
-            current_time_iso or 'default'
-        ]
-        cache_key = ':'.join(cache_key_parts)
+        cache_key = NatalLayerService.build_key(
+            'special_liunians', solar_date, solar_time, gender, dayun_steps_str, dayun_count
+        )
         
-        # 2. 先查缓存（L1内存 + L2 Redis）
-        try:
-            from server.utils.cache_multi_level import get_multi_cache
-            cache = get_multi_cache()
-            # 设置 L2 Redis TTL 为 30 天（2592000秒）
-            cache.l2.ttl = 2592000
-            cached_result = cache.get(cache_key)
-            if cached_result:
-                logger.info(f"✅ [缓存命中] SpecialLiunianService.get_special_liunians_batch: {cache_key[:50]}...")
-                return cached_result
-        except Exception as e:
-            # Redis不可用，降级到直接计算
-            logger.warning(f"⚠️  Redis缓存不可用，降级到直接计算: {e}")
+        # 2. 先查缓存（L1内存 + L2 Redis，按本命层策略）
+        cached_result = NatalLayerService.load(cache_key)
+        if cached_result:
+            logger.info(f"✅ [缓存命中] SpecialLiunianService.get_special_liunians_batch: {cache_key[:50]}...")
+            return cached_result
         
         # 3. 缓存未命中，执行计算
         logger.info(f"⏱️ [缓存未命中] SpecialLiunianService.get_special_liunians_batch: {cache_key[:50]}...")
@@ -196,13 +183,8 @@ class SpecialLiunianService:
                 logger.debug(f"   - {liunian.get('year')}年 {liunian.get('ganzhi')} (大运{liunian.get('dayun_step')}): {liunian.get('relations', [])}")
         
         # 4. 写入缓存（仅成功时）
-        try:
-            cache = get_multi_cache()
-            cache.l2.ttl = 2592000  # 30天
-            cache.set(cache_key, special_liunians)
-            logger.info(f"✅ [缓存写入] SpecialLiunianService.get_special_liunians_batch: {cache_key[:50]}...")
-        except Exception:
-            pass  # 缓存写入失败不影响业务
+        NatalLayerService.store(cache_key, special_liunians)
+        logger.info(f"✅ [缓存写入] SpecialLiunianService.get_special_liunians_batch: {cache_key[:50]}...")
         
         return special_liunians
     
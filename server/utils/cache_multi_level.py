@@ -73,6 +73,15 @@ class L1MemoryCache:
         with self._lock:
             self._cache.pop(key, None)
             self._cache_expiry.pop(key, None)
+
+    def ttl_remaining(self, key: str) -> Optional[float]:
+        """条目剩余 TTL（秒）；不存在、已过期或不过期时返回 None"""
+        with self._lock:
+            expiry = self._cache_expiry.get(key)
+            if key not in self._cache or not expiry:
+                return None
+            remaining = expiry - time.time()
+            return remaining if remaining > 0 else None
     
     def clear(self):
         with self._lock:
@@ -337,6 +346,12 @@ class MultiLevelCache:
     def clear(self):
         """清空所有缓存"""
         self.l1.clear()
+        # 按命名空间策略创建的缓存有独立 L1，一并清空
+        try:
+            from server.utils.cache_policy import clear_policy_l1
+            clear_policy_l1()
+        except Exception:
+            pass
         # L2 清空需要特殊处理，这里不实现
     
     def _generate_key(self, solar_date: str, solar_time: str, gender: str, **kwargs) -> str:
@@ -355,6 +370,28 @@ class MultiLevelCache:
         """设置八字缓存"""
         key = self._generate_key(solar_date, solar_time, gender, **kwargs)
         self.set(key, value)
+
+    def chart_key(self, namespace: str, bazi_data: dict, fields=None) -> Optional[str]:
+        """
+        生成盘面身份缓存键（只依赖四柱 + 性别的计算使用，同一时辰内的出生时间共享条目）
+
+        Returns:
+            缓存键；四柱不完整时返回 None
+        """
+        from server.utils.chart_identity import CHART_FIELDS, chart_identity
+        identity = chart_identity(bazi_data, CHART_FIELDS if fields is None else fields)
+        return f"{namespace}:chart:{identity}" if identity is not None else None
+
+    def get_chart(self, namespace: str, bazi_data: dict, fields=None) -> Optional[Any]:
+        """按盘面身份获取缓存"""
+        key = self.chart_key(namespace, bazi_data, fields)
+        return self.get(key) if key is not None else None
+
+    def set_chart(self, namespace: str, bazi_data: dict, value: Any, fields=None):
+        """按盘面身份设置缓存"""
+        key = self.chart_key(namespace, bazi_data, fields)
+        if key is not None:
+            self.set(key, value)
     
     def stats(self) -> dict:
         """获取缓存统计信息"""
@@ -29,6 +29,8 @@ REDIS_BUSINESS_CACHE_PATTERNS = [
     "fortune_display:*",
     # 特殊流年
     "special_liunians:*",
+    # 本命层（NatalLayerService，含本命层特殊流年）
+    "natal:*",
     # API 层缓存
     "pan:*",
     "wangshuai:*",
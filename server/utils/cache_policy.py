@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按命名空间声明的缓存策略
+
+每个业务命名空间声明自己的 L1/L2 TTL、L1 容量、编码、压缩和提前刷新策略，
+通过 get_cache(namespace) 获取对应的缓存实例，不再在运行时修改共享
+MultiLevelCache 的 l2.ttl（会悄悄改变其他调用方条目的 TTL）。
+
+无需改代码即可调优：环境变量 CACHE_POLICIES 为 JSON，按命名空间覆盖字段，例如
+    CACHE_POLICIES='{"natal": {"l2_ttl": 86400}, "fortune_display": {"l1_max_entries": 2000}}'
+
+用法：
+    cache = get_cache('fortune_display')
+    cache.set(key, value)
+
+    @cached(namespace='fortune_context_detail', key=lambda d, t, g, **_: f"{d}:{t}:{g}")
+    def load_detail(solar_date, solar_time, gender, current_time=None): ...
+"""
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from server.utils.cache_multi_level import L1MemoryCache, _effective_key
+
+logger = logging.getLogger(__name__)
+
+CODEC_JSON = "json"
+
+# 非纯 JSON 的 L2 载荷以 \x00 开头，第二字节标识编码（大写表示 zlib 压缩）
+# Redis 为多实例共享，不使用 pickle 等可执行任意代码的编码；模型对象由调用方转为 JSON 后再写入
+_HEADER = b"\x00"
+_TAGS = {CODEC_JSON: b"j"}
+
+DAY = 24 * 3600
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    单个命名空间的缓存策略
+
+    Attributes:
+        namespace: 命名空间（通常与缓存键前缀一致）
+        l1_ttl: L1 内存 TTL（秒），0 表示不过期
+        l2_ttl: L2 Redis TTL（秒），0 表示不过期
+        l1_max_entries: L1 最大条目数（内存上限），0 表示不使用 L1
+        l2_enabled: 是否写入 L2 Redis（进程内缓存设为 False）
+        codec: L2 编码，目前仅 json（与 MultiLevelCache 格式兼容）
+        compress_min_bytes: 编码后超过该字节数时 zlib 压缩，0 表示不压缩
+        refresh_ahead: L1 剩余 TTL 低于 l1_ttl 的该比例时后台刷新（仅 @cached），0 表示不刷新
+    """
+    namespace: str
+    l1_ttl: int = 300
+    l2_ttl: int = 3600
+    l1_max_entries: int = 10000
+    l2_enabled: bool = True
+    codec: str = CODEC_JSON
+    compress_min_bytes: int = 0
+    refresh_ahead: float = 0.0
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "CachePolicy":
+        """返回应用覆盖项后的新策略（忽略未知字段）"""
+        fields = {f.name for f in dataclasses.fields(self)} - {"namespace"}
+        valid = {k: v for k, v in overrides.items() if k in fields}
+        unknown = set(overrides) - fields
+        if unknown:
+            logger.warning(f"缓存策略 {self.namespace} 忽略未知字段: {sorted(unknown)}")
+        if valid.get("codec", self.codec) not in _TAGS:
+            logger.warning(f"缓存策略 {self.namespace} 不支持的编码: {valid['codec']}，保持 {self.codec}")
+            valid.pop("codec")
+        return dataclasses.replace(self, **valid)
+
+
+# 内置策略（按业务数据的时效性声明）
+DEFAULT_POLICIES = [
+    # 本命层：只由出生信息和版本决定，长期缓存，体积大时压缩
+    CachePolicy("natal", l1_ttl=1800, l2_ttl=365 * DAY, l1_max_entries=5000, compress_min_bytes=16384),
+    CachePolicy("bazi_detail", l1_ttl=300, l2_ttl=30 * DAY, l1_max_entries=5000, compress_min_bytes=16384),
+    CachePolicy("bazi_interface", l1_ttl=1800, l2_ttl=30 * DAY),
+    CachePolicy("fortune_display", l1_ttl=300, l2_ttl=30 * DAY, l1_max_entries=5000, compress_min_bytes=16384),
+    CachePolicy("daily_fortune", l1_ttl=300, l2_ttl=DAY),
+    # BaziDataService 大运/流年模型列表（以 model_dump(mode="json") 结果缓存，读取时 model_validate）
+    CachePolicy("bazi_data_models", l1_ttl=300, l2_ttl=DAY),
+    # BaziCacheService 分级缓存
+    CachePolicy("bazi:base", l1_ttl=300, l2_ttl=30 * DAY),
+    CachePolicy("bazi:dayun", l1_ttl=300, l2_ttl=30 * DAY),
+    CachePolicy("bazi:full", l1_ttl=300, l2_ttl=30 * DAY, compress_min_bytes=16384),
+    CachePolicy("bazi:ready", l1_ttl=60, l2_ttl=30 * DAY),
+    # FortuneContextService 进程内 detail 缓存（仅 L1）
+    CachePolicy("fortune_context_detail", l1_ttl=1800, l2_enabled=False, l1_max_entries=50, refresh_ahead=0.1),
+]
+
+_registry: Dict[str, CachePolicy] = {}
+_caches: Dict[str, "PolicyCache"] = {}
+_lock = threading.Lock()
+_env_overrides: Optional[Dict[str, Dict[str, Any]]] = None
+
+
+def _load_env_overrides() -> Dict[str, Dict[str, Any]]:
+    global _env_overrides
+    if _env_overrides is None:
+        raw = os.getenv("CACHE_POLICIES", "").strip()
+        overrides = {}
+        if raw:
+            try:
+                parsed = json.loads(raw)
+                overrides = {ns: v for ns, v in parsed.items() if isinstance(v, dict)}
+            except (ValueError, AttributeError) as e:
+                logger.warning(f"CACHE_POLICIES 解析失败，忽略: {e}")
+        _env_overrides = overrides
+    return _env_overrides
+
+
+def register_policy(policy: CachePolicy) -> CachePolicy:
+    """注册（或替换）命名空间策略，环境变量覆盖项优先；已创建的缓存实例会被重建"""
+    overrides = _load_env_overrides().get(policy.namespace)
+    if overrides:
+        policy = policy.with_overrides(overrides)
+    with _lock:
+        _registry[policy.namespace] = policy
+        _caches.pop(policy.namespace, None)
+    return policy
+
+
+def get_policy(namespace: str) -> CachePolicy:
+    """获取命名空间策略；未声明的命名空间使用默认值（同样支持环境变量覆盖）"""
+    policy = _registry.get(namespace)
+    if policy is None:
+        policy = register_policy(CachePolicy(namespace))
+    return policy
+
+
+def reload_policies() -> None:
+    """重新读取 CACHE_POLICIES 并重建所有策略和缓存实例"""
+    global _env_overrides
+    with _lock:
+        _env_overrides = None
+        _registry.clear()
+        _caches.clear()
+    for policy in DEFAULT_POLICIES:
+        register_policy(policy)
+
+
+def _encode(value: Any, policy: CachePolicy) -> bytes:
+    payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+    tag = _TAGS[policy.codec]
+    if policy.compress_min_bytes and len(payload) >= policy.compress_min_bytes:
+        return _HEADER + tag.upper() + zlib.compress(payload)
+    if policy.codec == CODEC_JSON:
+        return payload  # 纯 JSON，与 L2RedisCache 写入的格式一致
+    return _HEADER + tag + payload
+
+
+def _decode(data: Any, policy: CachePolicy) -> Any:
+    """按命名空间策略声明的编码解码；载荷标识的编码与策略不一致时拒绝（ValueError）"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not data.startswith(_HEADER):
+        if policy.codec != CODEC_JSON:
+            raise ValueError(f"{policy.namespace} 声明编码 {policy.codec}，拒绝纯 JSON 载荷")
+        return json.loads(data)
+    tag, payload = data[1:2], data[2:]
+    if tag.lower() != _TAGS[policy.codec]:
+        raise ValueError(f"{policy.namespace} 声明编码 {policy.codec}，拒绝编码标识 {tag!r}")
+    if tag.isupper():
+        payload = zlib.decompress(payload)
+    return json.loads(payload)
+
+
+class PolicyCache:
+    """按 CachePolicy 工作的 L1 + L2 缓存（L1 独立，L2 共享 Redis 客户端与缓存版本前缀）"""
+
+    def __init__(self, policy: CachePolicy, redis_client=None):
+        self.policy = policy
+        self.l1 = (L1MemoryCache(max_size=policy.l1_max_entries, ttl=policy.l1_ttl)
+                   if policy.l1_max_entries > 0 else None)
+        self.redis = redis_client if policy.l2_enabled else None
+        self._l2_hits = 0
+        self._l2_misses = 0
+
+    def _key(self, key: str) -> str:
+        return _effective_key(self.redis, key) if self.redis is not None else key
+
+    def get(self, key: str) -> Optional[Any]:
+        """L1 -> L2 读取，L2 命中时回填 L1"""
+        k = self._key(key)
+        if self.l1 is not None:
+            value = self.l1.get(k)
+            if value is not None:
+                return value
+        if self.redis is None:
+            return None
+        try:
+            data = self.redis.get(k)
+            if not data:
+                self._l2_misses += 1
+                return None
+            value = _decode(data, self.policy)
+        except Exception as e:
+            self._l2_misses += 1
+            logger.debug(f"[{self.policy.namespace}] L2 读取失败: {e}")
+            return None
+        self._l2_hits += 1
+        if self.l1 is not None and value is not None:
+            self.l1.set(k, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """按策略 TTL 写入 L1 和 L2（L2 TTL 加 0–10% 随机偏移防雪崩）"""
+        k = self._key(key)
+        if self.l1 is not None:
+            self.l1.set(k, value)
+        if self.redis is None:
+            return
+        try:
+            data = _encode(value, self.policy)
+            ttl = self.policy.l2_ttl
+            if ttl > 0:
+                self.redis.setex(k, ttl + random.randint(0, max(1, int(ttl * 0.1))), data)
+            else:
+                self.redis.set(k, data)
+        except Exception as e:
+            logger.debug(f"[{self.policy.namespace}] L2 写入失败: {e}")
+
+    def delete(self, key: str) -> None:
+        k = self._key(key)
+        if self.l1 is not None:
+            self.l1.delete(k)
+        if self.redis is not None:
+            try:
+                self.redis.delete(k)
+            except Exception:
+                pass
+
+    def ttl_remaining(self, key: str) -> Optional[float]:
+        """L1 中条目的剩余 TTL（秒）；不在 L1 或不过期时返回 None"""
+        if self.l1 is None:
+            return None
+        return self.l1.ttl_remaining(self._key(key))
+
+    def clear_l1(self) -> None:
+        if self.l1 is not None:
+            self.l1.clear()
+
+    def stats(self) -> dict:
+        total = self._l2_hits + self._l2_misses
+        return {
+            "policy": dataclasses.asdict(self.policy),
+            "l1": self.l1.stats() if self.l1 is not None else None,
+            "l2": {
+                "enabled": self.redis is not None,
+                "hits": self._l2_hits,
+                "misses": self._l2_misses,
+                "hit_rate_percent": round(self._l2_hits / total * 100, 2) if total else 0.0,
+            },
+        }
+
+
+def get_cache(namespace: str) -> PolicyCache:
+    """获取命名空间的缓存实例（单例，L2 复用全局 MultiLevelCache 的 Redis 客户端）"""
+    cache = _caches.get(namespace)
+    if cache is not None:
+        return cache
+    policy = get_policy(namespace)
+    redis_client = None
+    if policy.l2_enabled:
+        try:
+            from server.utils.cache_multi_level import get_multi_cache
+            redis_client = getattr(get_multi_cache().l2, "redis", None)
+        except Exception:
+            redis_client = None
+    with _lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = PolicyCache(policy, redis_client)
+            _caches[namespace] = cache
+    return cache
+
+
+def clear_policy_l1(namespace: Optional[str] = None) -> None:
+    """清空命名空间（默认全部）的 L1 内存缓存"""
+    if namespace is None:
+        caches = list(_caches.values())
+    else:
+        caches = [_caches[namespace]] if namespace in _caches else []
+    for cache in caches:
+        cache.clear_l1()
+
+
+def policy_stats() -> Dict[str, dict]:
+    """各命名空间缓存统计（仅已创建的实例）"""
+    return {ns: cache.stats() for ns, cache in list(_caches.items())}
+
+
+def _default_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    raw = json.dumps([args, kwargs], ensure_ascii=False, sort_keys=True, default=str)
+    return f"{func.__module__}.{func.__qualname__}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+
+def cached(namespace: str,
+           key: Optional[Callable[..., str]] = None,
+           condition: Callable[[Any], bool] = lambda result: result is not None):
+    """
+    按命名空间策略缓存函数结果（支持同步和 async 函数）
+
+    Args:
+        namespace: 策略命名空间，完整缓存键为 "{namespace}:{key(...)}"
+        key: 由调用参数生成键的函数，默认使用函数名 + 参数哈希
+        condition: 结果满足该条件才写缓存（默认非 None）
+
+    被装饰函数附带 cache_key(*args, **kwargs) 和 invalidate(*args, **kwargs)。
+    策略 refresh_ahead > 0 时，L1 条目临近过期的命中会触发一次后台刷新。
+    """
+    def decorator(func):
+        refreshing = set()
+        refresh_lock = threading.Lock()
+        background_tasks = set()
+
+        def cache_key(*args, **kwargs) -> str:
+            part = key(*args, **kwargs) if key is not None else _default_key(func, args, kwargs)
+            return f"{namespace}:{part}"
+
+        def _needs_refresh(cache: PolicyCache, full_key: str) -> bool:
+            policy = cache.policy
+            if policy.refresh_ahead <= 0 or policy.l1_ttl <= 0:
+                return False
+            remaining = cache.ttl_remaining(full_key)
+            if remaining is None or remaining > policy.l1_ttl * policy.refresh_ahead:
+                return False
+            with refresh_lock:
+                if full_key in refreshing:
+                    return False
+                refreshing.add(full_key)
+            return True
+
+        def _store(cache: PolicyCache, full_key: str, result: Any) -> None:
+            if condition(result):
+                cache.set(full_key, result)
+
+        if inspect.iscoroutinefunction(func):
+            async def _refresh(full_key, args, kwargs):
+                try:
+                    _store(get_cache(namespace), full_key, await func(*args, **kwargs))
+                except Exception as e:
+                    logger.warning(f"[{namespace}] 后台刷新失败: {e}")
+                finally:
+                    refreshing.discard(full_key)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache = get_cache(namespace)
+                full_key = cache_key(*args, **kwargs)
+                value = cache.get(full_key)
+                if value is not None:
+                    if _needs_refresh(cache, full_key):
+                        task = asyncio.get_running_loop().create_task(_refresh(full_key, args, kwargs))
+                        background_tasks.add(task)
+                        task.add_done_callback(background_tasks.discard)
+                    return value
+                result = await func(*args, **kwargs)
+                _store(cache, full_key, result)
+                return result
+        else:
+            def _refresh(full_key, args, kwargs):
+                try:
+                    _store(get_cache(namespace), full_key, func(*args, **kwargs))
+                except Exception as e:
+                    logger.warning(f"[{namespace}] 后台刷新失败: {e}")
+                finally:
+                    refreshing.discard(full_key)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                cache = get_cache(namespace)
+                full_key = cache_key(*args, **kwargs)
+                value = cache.get(full_key)
+                if value is not None:
+                    if _needs_refresh(cache, full_key):
+                        threading.Thread(target=_refresh, args=(full_key, args, kwargs),
+                                         name=f"cache_refresh_{namespace}", daemon=True).start()
+                    return value
+                result = func(*args, **kwargs)
+                _store(cache, full_key, result)
+                return result
+
+        def invalidate(*args, **kwargs) -> None:
+            get_cache(namespace).delete(cache_key(*args, **kwargs))
+
+        wrapper.namespace = namespace
+        wrapper.cache_key = cache_key
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
+
+
+for _policy in DEFAULT_POLICIES:
+    register_policy(_policy)
@@ -49,6 +49,8 @@ def _cache_sync_subscriber():
                     from server.utils.cache_multi_level import get_multi_cache
                     cache = get_multi_cache()
                     cache.l1.clear()  # 清空所有L1缓存
+                    from server.utils.cache_policy import clear_policy_l1
+                    clear_policy_l1('daily_fortune')
                     logger.info(f"✅ 已清理本地L1缓存（日期: {target_date}）")
                 except Exception as e:
                     logger.warning(f"⚠️  清理本地L1缓存失败: {e}")
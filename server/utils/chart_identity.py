@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+八字盘面身份（chart identity）缓存键
+
+规则匹配、日柱性别、神煞、十神、纳音/空亡等计算只读取四柱、性别及由四柱派生的字段，
+与出生的具体分钟无关。按 (solar_date, solar_time, gender) 生成缓存键时，同一时辰内
+上百个出生时间共享同一盘面却各自未命中。
+
+chart_identity 由两部分组成：
+- 四柱 + 性别：可读前缀，便于排查（如 "庚午戊子甲寅庚午:male"）
+- 计算实际读取字段的规范化 JSON 摘要：即使某个字段与出生时刻有关，键也会随之变化，
+  不会把不同结果合并到同一条目
+
+用法：
+    identity = chart_identity(bazi_data)                       # 四柱派生字段
+    identity = chart_identity(bazi_data, fields=("fortune",))  # 额外读取的字段
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+PILLAR_NAMES = ("year", "month", "day", "hour")
+
+# 由四柱派生的字段（排盘结果中与出生时刻无关的部分）
+CHART_FIELDS = ("bazi_pillars", "details", "ten_gods_stats", "elements", "element_counts", "relationships")
+
+
+def read_field(data: Any, path: str) -> Any:
+    """按点分路径读取嵌套字段，不存在时返回 None"""
+    value = data
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+        if value is None:
+            return None
+    return value
+
+
+def pillars_signature(bazi_pillars: Dict[str, Any]) -> Optional[str]:
+    """四柱干支拼接（年月日时），任一柱不完整时返回 None"""
+    if not isinstance(bazi_pillars, dict):
+        return None
+    parts = []
+    for name in PILLAR_NAMES:
+        pillar = bazi_pillars.get(name)
+        if not isinstance(pillar, dict) or not pillar.get("stem") or not pillar.get("branch"):
+            return None
+        parts.append(f"{pillar['stem']}{pillar['branch']}")
+    return "".join(parts)
+
+
+def chart_identity(bazi_data: Dict[str, Any], fields: Iterable[str] = CHART_FIELDS,
+                   gender: Optional[str] = None) -> Optional[str]:
+    """
+    生成盘面身份键
+
+    Args:
+        bazi_data: 八字数据（含 bazi_pillars，性别取 basic_info.gender 或顶层 gender）
+        fields: 计算读取的字段路径（相对 bazi_data），其值的摘要并入键
+        gender: 显式指定性别
+
+    Returns:
+        身份键；四柱不完整时返回 None（调用方应退回按出生时间的键）
+    """
+    signature = pillars_signature(bazi_data.get("bazi_pillars") if isinstance(bazi_data, dict) else None)
+    if signature is None:
+        return None
+    if gender is None:
+        gender = read_field(bazi_data, "basic_info.gender") or bazi_data.get("gender") or ""
+    identity = f"{signature}:{gender}"
+    fields = sorted(set(fields))
+    if fields:
+        payload = json.dumps([[path, read_field(bazi_data, path)] for path in fields],
+                             ensure_ascii=False, sort_keys=True, default=str)
+        identity += ":" + hashlib.md5(payload.encode("utf-8")).hexdigest()[:16]
+    return identity
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+确定性响应的 ETag 与条件请求（If-None-Match → 304 / 412）
+
+排盘展示、八字界面、身宫命宫、日元六十甲子、五行占比等接口的响应只取决于
+请求参数（solar_date / solar_time / gender / 历法 / 地点）以及规则、内容版本。
+这类接口可以按需启用条件响应：
+
+- 由规范化后的请求参数 + 内容版本计算强 ETag（参数相同、版本不变 → ETag 相同）
+- 请求带 If-None-Match 且匹配时不调用编排层：GET / HEAD 返回 304，
+  其他方法（POST 路由、gRPC-Web 网关）按 RFC 9110 返回 412
+- 只有 GET / HEAD 的成功响应带 Cache-Control: public, max-age，nginx 与客户端可以复用；
+  POST 响应只带 ETag（Cache-Control: no-cache），需要共享缓存的调用方使用 GET 变体
+- 未传 current_time 等"按今天计算"的字段时，ETag 含当天日期，max-age 不跨过零点
+
+内容版本由 ETAG_BUILD_VERSION（部署版本）、多级缓存版本（热更新 / 手动 bump 时递增）
+以及已加载的规则 / 内容版本号组成，任一变化都会使旧 ETag 失效。
+
+使用示例（v1 路由）：
+    register_conditional_endpoint("/bazi/pan/display", BaziDisplayRequest)
+
+    async def get_pan_display(request: BaziDisplayRequest, http_request: Request = None):
+        conditional = get_conditional_response(http_request, "/bazi/pan/display", request)
+        if conditional and conditional.not_modified:
+            return conditional.not_modified_response()
+        ...
+        return conditional.wrap(result) if conditional else result
+
+    # GET 变体：参数走查询字符串，响应可被 nginx 与客户端缓存
+    @router.get("/bazi/pan/display")
+    async def get_pan_display_by_query(
+        http_request: Request,
+        request: BaziDisplayRequest = Depends(query_request_model(BaziDisplayRequest)),
+    ):
+        return await get_pan_display(request, http_request)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple, Type
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+CONDITIONAL_RESPONSE_ENABLED = os.getenv("CONDITIONAL_RESPONSE_ENABLED", "true").lower() == "true"
+CONDITIONAL_MAX_AGE = int(os.getenv("CONDITIONAL_MAX_AGE", "600"))
+CACHEABLE_METHODS = ("GET", "HEAD")
+ETAG_BUILD_VERSION = os.getenv("ETAG_BUILD_VERSION", "")
+
+try:
+    from server.observability.metrics_collector import get_metrics
+    _not_modified_counter = get_metrics().counter(
+        "http_not_modified_total", "条件请求命中（返回304）次数", ["endpoint"]
+    )
+except ImportError:
+    _not_modified_counter = None
+
+
+@dataclass(frozen=True)
+class ConditionalEndpoint:
+    """启用条件响应的接口：请求模型 + 缺省时按"今天"计算的字段"""
+    path: str
+    request_model: Type[BaseModel]
+    time_dependent_fields: Tuple[str, ...] = ()
+
+
+_CONDITIONAL_ENDPOINTS: Dict[str, ConditionalEndpoint] = {}
+
+
+def register_conditional_endpoint(
+    path: str,
+    request_model: Type[BaseModel],
+    time_dependent_fields: Tuple[str, ...] = (),
+) -> None:
+    """
+    登记确定性接口（v1 路由与 gRPC-Web 网关共用同一份登记）
+
+    Args:
+        path: 接口路径（不含 /api/v1 前缀，与 gRPC-Web 端点名一致）
+        request_model: 请求模型，用于校验并规范化参数
+        time_dependent_fields: 缺省时接口按当前时间计算的字段（如 current_time）
+    """
+    _CONDITIONAL_ENDPOINTS[path] = ConditionalEndpoint(path, request_model, tuple(time_dependent_fields))
+
+
+def get_conditional_endpoint(path: str) -> Optional[ConditionalEndpoint]:
+    return _CONDITIONAL_ENDPOINTS.get(path)
+
+
+def get_content_version() -> str:
+    """当前内容版本：部署版本 | 多级缓存版本 | 规则版本 | 内容版本"""
+    cache_version = ""
+    try:
+        from server.utils.cache_multi_level import get_multi_cache, _get_cache_version
+        cache_version = _get_cache_version(getattr(get_multi_cache().l2, "redis", None))
+    except Exception as e:
+        logger.debug(f"获取缓存版本失败: {e}")
+
+    # 规则服务已加载时才读取其版本号（不在这里触发数据库连接）
+    rule_version, content_version = 0, 0
+    rule_service_module = sys.modules.get("server.services.rule_service")
+    if rule_service_module is not None:
+        rule_service = getattr(rule_service_module, "RuleService", None)
+        rule_version = getattr(rule_service, "_cached_rule_version", 0)
+        content_version = getattr(rule_service, "_cached_content_version", 0)
+
+    return f"{ETAG_BUILD_VERSION}|{cache_version}|{rule_version}|{content_version}"
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """规范化请求参数：去掉 None 和内部字段（以 _ 开头），字符串去首尾空白"""
+    normalized = {}
+    for key, value in params.items():
+        if value is None or key.startswith("_"):
+            continue
+        normalized[key] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def compute_etag(path: str, params: Dict[str, Any], version: Optional[str] = None) -> str:
+    """由接口路径 + 规范化参数 + 内容版本计算强 ETag"""
+    raw = json.dumps(
+        {
+            "path": path,
+            "params": normalize_params(params),
+            "version": get_content_version() if version is None else version,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否匹配（弱比较：忽略 W/ 前缀，支持逗号分隔多个值与 *）"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _seconds_until_midnight(now: Optional[datetime] = None) -> int:
+    now = now or datetime.now()
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(int((midnight - now).total_seconds()), 0)
+
+
+class ConditionalResponse:
+    """单个请求的条件响应状态"""
+
+    def __init__(
+        self,
+        path: str,
+        etag: str,
+        max_age: int,
+        if_none_match: Optional[str] = None,
+        method: str = "GET",
+    ):
+        self.path = path
+        self.etag = etag
+        self.max_age = max_age
+        self.cacheable = method.upper() in CACHEABLE_METHODS
+        self.not_modified = etag_matches(if_none_match, etag)
+
+    def headers(self) -> Dict[str, str]:
+        # POST 响应不会被共享缓存复用，只给出 ETag 供调用方比较
+        cache_control = f"public, max-age={self.max_age}" if self.cacheable else "no-cache"
+        return {"ETag": self.etag, "Cache-Control": cache_control}
+
+    def not_modified_response(self, extra_headers: Optional[Dict[str, str]] = None) -> Response:
+        """If-None-Match 匹配：GET / HEAD 返回 304，其他方法返回 412（RFC 9110 13.1.2）"""
+        if _not_modified_counter:
+            _not_modified_counter.inc(endpoint=self.path)
+        status_code = 304 if self.cacheable else 412
+        logger.debug(f"条件请求命中: {self.path} ETag={self.etag} → {status_code}")
+        return Response(status_code=status_code, headers={**(extra_headers or {}), **self.headers()})
+
+    def wrap(self, result: Any) -> Any:
+        """成功结果附加 ETag（GET / HEAD 同时允许缓存）；失败结果原样返回（保持默认不缓存）"""
+        from server.middleware.utf8_json import CacheableJSONResponse
+
+        content = jsonable_encoder(result) if isinstance(result, BaseModel) else result
+        if not isinstance(content, dict) or not content.get("success"):
+            return result
+        return CacheableJSONResponse(content, headers=self.headers())
+
+
+def resolve_conditional(
+    path: str,
+    params: Dict[str, Any],
+    if_none_match: Optional[str] = None,
+    method: str = "GET",
+) -> Optional[ConditionalResponse]:
+    """
+    计算已登记接口的条件响应状态
+
+    Args:
+        path: 接口路径
+        params: 请求参数（dict，gRPC-Web 载荷或请求模型导出）
+        if_none_match: 请求头 If-None-Match
+        method: HTTP 方法，决定命中时返回 304 还是 412、响应是否可缓存
+
+    Returns:
+        ConditionalResponse；未登记、未启用或参数校验失败时返回 None（交给接口本身处理）
+    """
+    if not CONDITIONAL_RESPONSE_ENABLED:
+        return None
+    endpoint = _CONDITIONAL_ENDPOINTS.get(path)
+    if endpoint is None:
+        return None
+
+    try:
+        normalized = endpoint.request_model(**normalize_params(params)).model_dump()
+    except ValidationError:
+        return None
+
+    max_age = CONDITIONAL_MAX_AGE
+    if any(normalized.get(field) is None for field in endpoint.time_dependent_fields):
+        # 按"今天"计算的响应：ETag 含当天日期，缓存不跨过零点
+        normalized["today"] = datetime.now().strftime("%Y-%m-%d")
+        max_age = min(max_age, _seconds_until_midnight())
+
+    return ConditionalResponse(path, compute_etag(path, normalized), max_age, if_none_match, method)
+
+
+def get_conditional_response(http_request, path: str, request_model: BaseModel) -> Optional[ConditionalResponse]:
+    """v1 路由使用：由 FastAPI Request + 已校验的请求模型计算条件响应状态（直接调用时 http_request 为 None）"""
+    if http_request is None:
+        return None
+    return resolve_conditional(
+        path, request_model.model_dump(), http_request.headers.get("if-none-match"), http_request.method
+    )
+
+
+def query_request_model(request_model: Type[BaseModel]):
+    """
+    GET 变体使用的依赖：把查询参数解析为请求模型
+
+    校验失败抛出 RequestValidationError，与请求体校验一样返回 422。
+    """
+    def _parse(http_request: Request) -> BaseModel:
+        try:
+            return request_model(**dict(http_request.query_params))
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("query", *error.get("loc", ()))} for error in e.errors()]
+            )
+
+    return _parse
@@ -83,7 +83,9 @@ def get_cors_config() -> Dict:
             "X-Client-Version",
             "grpc-timeout",
             "X-V2-Guest-Token",
+            "If-None-Match",
         ],
+        "expose_headers": ["ETag"],
     }
 
 
@@ -137,9 +139,9 @@ def get_grpc_cors_headers(request_origin: str = None) -> Dict[str, str]:
         "Access-Control-Allow-Headers": (
             "Content-Type, X-Grpc-Web, X-User-Agent, Accept, Authorization, "
             "X-Requested-With, X-Client-Version, grpc-timeout, "
-            "x-grpc-web, x-requested-with, content-type"
+            "x-grpc-web, x-requested-with, content-type, if-none-match"
         ),
-        "Access-Control-Expose-Headers": "grpc-status, grpc-message, grpc-encoding, grpc-accept-encoding",
+        "Access-Control-Expose-Headers": "grpc-status, grpc-message, grpc-encoding, grpc-accept-encoding, etag",
         "Access-Control-Max-Age": "86400",
     }
 
@@ -6,10 +6,9 @@
 
 import logging
 import traceback
-from typing import Callable, Any
-from fastapi import Request, HTTPException
+from typing import Callable
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -21,20 +20,46 @@ PRODUCTION_MODE = is_production()  # 从统一环境配置读取
 SHOW_DETAILED_ERRORS = not is_production()  # 生产环境不显示详细错误
 
 
-class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
-    """异常处理中间件"""
+class ExceptionHandlerMiddleware:
+    """
+    异常处理中间件（纯 ASGI，不包装响应体，流式响应原样透传）
+
+    响应头尚未发送时把异常转换为 JSON 错误响应；已开始发送（如 SSE 中途异常）
+    时无法再改写响应，只能继续向上抛出
+    """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Any:
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            return response
-        except HTTPException as e:
+            await self.app(scope, receive, send_wrapper)
+        except HTTPException:
             # FastAPI的HTTPException直接返回
-            raise e
-        except (BrokenPipeError, OSError) as e:
+            raise
+        except Exception as e:
+            if response_started:
+                raise
+            response = self._handle_exception(e)
+            await response(scope, receive, send)
+    
+    def _handle_exception(self, e: Exception) -> JSONResponse:
+        if isinstance(e, (BrokenPipeError, OSError)):
             # 客户端断开连接，这是正常情况，不需要记录为错误
             # 检查是否是 Broken pipe 错误（errno 32）
-            if isinstance(e, BrokenPipeError) or (isinstance(e, OSError) and e.errno == 32):
+            if isinstance(e, BrokenPipeError) or e.errno == 32:
                 # 静默处理，不记录错误日志
                 return JSONResponse(
                     status_code=200,  # 返回 200，因为这是客户端主动断开
@@ -45,8 +70,8 @@ class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
                     }
                 )
             # 其他 OSError 继续抛出
-            raise
-        except ValueError as e:
+            raise e
+        if isinstance(e, ValueError):
             # 参数验证错误
             logger.warning(f"参数验证错误: {str(e)}")
             return JSONResponse(
@@ -57,25 +82,25 @@ class ExceptionHandlerMiddleware(BaseHTTPMiddleware):
                     "error_type": "validation_error"
                 }
             )
-        except Exception as e:
-            # 其他未处理的异常
-            error_trace = traceback.format_exc()
-            logger.error(f"未处理的异常: {str(e)}\n{error_trace}")
-            
-            # 生产环境不暴露详细错误信息
-            if PRODUCTION_MODE or not SHOW_DETAILED_ERRORS:
-                error_detail = "服务器内部错误，请稍后重试"
-            else:
-                error_detail = f"错误: {str(e)}"
-            
-            return JSONResponse(
-                status_code=500,
-                content={
-                    "success": False,
-                    "error": error_detail,
-                    "error_type": "internal_error"
-                }
-            )
+        
+        # 其他未处理的异常
+        error_trace = traceback.format_exc()
+        logger.error(f"未处理的异常: {str(e)}\n{error_trace}")
+        
+        # 生产环境不暴露详细错误信息
+        if PRODUCTION_MODE or not SHOW_DETAILED_ERRORS:
+            error_detail = "服务器内部错误，请稍后重试"
+        else:
+            error_detail = f"错误: {str(e)}"
+        
+        return JSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "error": error_detail,
+                "error_type": "internal_error"
+            }
+        )
 
 
 def safe_execute(func: Callable, *args, default_return=None, **kwargs):
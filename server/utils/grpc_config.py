@@ -3,18 +3,172 @@
 """
 gRPC 配置工具类
 统一管理 gRPC 连接配置，避免在多个文件中重复配置
-支持 keepalive、压缩等，减少网络传输量
+支持 keepalive、自适应压缩等，减少网络传输量
 """
 
-from typing import List, Tuple
+import ipaddress
+import logging
+import os
+import socket
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
-# 压缩：客户端建连时传入，减少网络传输 40–60%
 try:
     import grpc
     GRPC_COMPRESSION = grpc.Compression.Gzip
 except Exception:
+    grpc = None
     GRPC_COMPRESSION = None
 
+# 压缩策略：adaptive（按消息大小和目标位置逐次决定）/ gzip（始终压缩）/ none（不压缩）
+# 本机和同宿主 Docker 网络传输几乎零成本，gzip 压缩几 MB 的 JSON 反而比传输更耗 CPU
+GRPC_COMPRESSION_MODE = os.getenv("GRPC_COMPRESSION_MODE", "adaptive").lower()
+# 小于该字节数的消息不压缩（压缩收益抵不过 CPU 开销）
+GRPC_COMPRESSION_MIN_BYTES = int(os.getenv("GRPC_COMPRESSION_MIN_BYTES", str(64 * 1024)))
+# 本地网络（回环 + Docker 默认网段），adaptive 模式下默认不压缩
+GRPC_LOCAL_NETWORKS = os.getenv("GRPC_LOCAL_NETWORKS", "127.0.0.0/8,::1/128,172.16.0.0/12")
+GRPC_COMPRESS_LOCAL = os.getenv("GRPC_COMPRESS_LOCAL", "false").lower() == "true"
+
+try:
+    from server.observability.metrics_collector import get_metrics
+    _decision_counter = get_metrics().counter(
+        "grpc_compression_decisions_total", "gRPC 消息压缩决策次数", ["direction", "decision", "reason"]
+    )
+    _payload_counter = get_metrics().counter(
+        "grpc_compression_payload_bytes_total", "gRPC 消息原始字节数（按是否压缩）", ["direction", "decision"]
+    )
+except ImportError:
+    _decision_counter = None
+    _payload_counter = None
+
+
+def _local_networks():
+    networks = []
+    for cidr in GRPC_LOCAL_NETWORKS.split(","):
+        cidr = cidr.strip()
+        if not cidr:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(cidr, strict=False))
+        except ValueError:
+            logger.warning(f"GRPC_LOCAL_NETWORKS 配置无效: {cidr}")
+    return networks
+
+
+_LOCAL_NETWORKS = _local_networks()
+
+
+def _target_host(target: str) -> str:
+    """
+    从地址中取出主机名，支持：
+    - "localhost:9001" / "bazi-core:9001" / "[::1]:9001"
+    - context.peer() 格式："ipv4:127.0.0.1:54321" / "ipv6:[::1]:54321" / "unix:/tmp/x.sock"
+    """
+    if target.startswith(("ipv4:", "ipv6:", "unix:", "dns:")):
+        scheme, target = target.split(":", 1)
+        if scheme == "unix":
+            return "localhost"
+        target = target.lstrip("/")
+    if target.startswith("["):
+        return target[1:target.index("]")] if "]" in target else target[1:]
+    if target.count(":") == 1:
+        return target.rsplit(":", 1)[0]
+    return target
+
+
+@lru_cache(maxsize=256)
+def is_local_target(target: str) -> bool:
+    """目标是否在本机或同宿主网络（主机名只解析一次并缓存）"""
+    host = _target_host(target)
+    if host in ("localhost", "", "0.0.0.0", "::"):
+        return True
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        try:
+            ip = ipaddress.ip_address(socket.gethostbyname(host))
+        except (OSError, ValueError):
+            return False
+    return any(ip in network for network in _LOCAL_NETWORKS)
+
+
+def choose_compression(target: str, payload_size: int, direction: str = "request") -> Optional[Any]:
+    """
+    决定单条消息是否压缩，并记录决策指标
+
+    Args:
+        target: 对端地址（客户端为服务地址，服务端为 context.peer()）
+        payload_size: 消息序列化后的字节数
+        direction: request / response
+
+    Returns:
+        grpc.Compression.Gzip 或 None（不压缩）
+    """
+    if GRPC_COMPRESSION is None or GRPC_COMPRESSION_MODE == "none":
+        decision, reason = None, "disabled"
+    elif GRPC_COMPRESSION_MODE == "gzip":
+        decision, reason = GRPC_COMPRESSION, "forced"
+    elif payload_size < GRPC_COMPRESSION_MIN_BYTES:
+        decision, reason = None, "small"
+    elif not GRPC_COMPRESS_LOCAL and is_local_target(target):
+        decision, reason = None, "local"
+    else:
+        decision, reason = GRPC_COMPRESSION, "large_remote"
+
+    label = "gzip" if decision is not None else "none"
+    if _decision_counter is not None:
+        _decision_counter.inc(direction=direction, decision=label, reason=reason)
+        _payload_counter.inc(payload_size, direction=direction, decision=label)
+    return decision
+
+
+def channel_compression(address: str) -> Optional[Any]:
+    """Channel 级默认压缩：adaptive 模式下不设默认值，由每次调用决定"""
+    if GRPC_COMPRESSION_MODE == "gzip":
+        return GRPC_COMPRESSION
+    return None
+
+
+def message_size(message: Any) -> int:
+    """protobuf 消息序列化后的字节数（非 protobuf 对象返回 0）"""
+    try:
+        return message.ByteSize()
+    except AttributeError:
+        return 0
+
+
+if grpc is not None:
+    class ResponseCompressionInterceptor(grpc.ServerInterceptor):
+        """服务端拦截器：按响应大小和调用方位置决定 unary 响应是否压缩"""
+
+        def intercept_service(self, continuation, handler_call_details):
+            handler = continuation(handler_call_details)
+            if handler is None or handler.unary_unary is None:
+                return handler
+            behavior = handler.unary_unary
+
+            def unary_unary(request, context):
+                response = behavior(request, context)
+                compression = choose_compression(context.peer(), message_size(response), "response")
+                if compression is not None:
+                    context.set_compression(compression)
+                return response
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+
+def get_server_interceptors() -> List[Any]:
+    """gRPC 服务端通用拦截器（自适应响应压缩）"""
+    if grpc is None or GRPC_COMPRESSION_MODE == "none":
+        return []
+    return [ResponseCompressionInterceptor()]
+
 
 def get_standard_grpc_options() -> List[Tuple[str, int]]:
     """
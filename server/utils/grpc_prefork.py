@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gRPC 多进程（pre-fork）服务
+
+纯 Python 的排盘计算和规则匹配受 GIL 限制，单进程 gRPC 服务最多只能用满一个核。
+多进程模式下主进程只负责 fork 和监管 N 个工作进程，每个工作进程各自创建 gRPC
+服务器并通过 SO_REUSEPORT 绑定同一端口，由内核在进程间分配连接。
+
+- 工作进程数：serve(workers=N) 或环境变量 GRPC_WORKERS（auto = 可用 CPU 数，默认 1 = 单进程）
+- 健康聚合：工作进程通过共享内存上报心跳和状态，每个进程的 gRPC 健康检查
+  （grpc_health 可用时）返回全体聚合结果；主进程在状态变化时记录日志
+- 平滑退出：SIGTERM/SIGINT 时先标记 NOT_SERVING，再 server.stop(grace) 等待进行中的
+  请求完成（GRPC_DRAIN_GRACE 秒），超时后强制结束
+- 热更新：每个工作进程各自调用 create_hot_reload_server 并启动 reloader，
+  文件变化由节点级 FileChangeBus 统一监听后广播到各进程
+- 崩溃重启：工作进程异常退出后自动重启（连续快速崩溃时指数退避）
+
+主进程在 fork 前不能创建任何 gRPC 对象（gRPC 服务器不能跨 fork 使用），
+build_server 只在工作进程中调用。
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+GRPC_WORKERS = os.getenv("GRPC_WORKERS", "1")
+GRPC_DRAIN_GRACE = float(os.getenv("GRPC_DRAIN_GRACE", "10"))
+# 心跳间隔与超时（超过超时未上报视为不健康）
+HEARTBEAT_INTERVAL = 2.0
+HEARTBEAT_TIMEOUT = float(os.getenv("GRPC_HEARTBEAT_TIMEOUT", "10"))
+# 启动后该时间内退出视为快速崩溃，重启按指数退避
+FAST_CRASH_SECONDS = 10.0
+MAX_RESTART_BACKOFF = 30.0
+
+try:
+    from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+    GRPC_HEALTH_AVAILABLE = True
+except ImportError:
+    GRPC_HEALTH_AVAILABLE = False
+
+# 工作进程状态
+STATE_STARTING = 0
+STATE_SERVING = 1
+STATE_DRAINING = 2
+STATE_STOPPED = 3
+_STATE_NAMES = {
+    STATE_STARTING: "starting",
+    STATE_SERVING: "serving",
+    STATE_DRAINING: "draining",
+    STATE_STOPPED: "stopped",
+}
+
+# build_server(extra_options) -> (已绑定端口的 server, reloader 或 None)
+BuildServer = Callable[[List[Tuple[str, Any]]], Tuple[Any, Optional[Any]]]
+
+
+def resolve_workers(workers: Optional[Union[int, str]] = None) -> int:
+    """解析工作进程数（None 读取 GRPC_WORKERS；auto/0 为可用 CPU 数）"""
+    value = GRPC_WORKERS if workers is None else workers
+    if str(value).strip().lower() in ("auto", "0"):
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except AttributeError:
+            return max(1, os.cpu_count() or 1)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning(f"GRPC_WORKERS 无效: {value}，使用单进程")
+        return 1
+
+
+class WorkerHealthTable:
+    """工作进程健康表（共享内存，fork 后父子进程可见）"""
+
+    def __init__(self, size: int, ctx=None):
+        ctx = ctx or multiprocessing
+        self.size = size
+        self._beats = ctx.Array("d", size, lock=False)
+        self._states = ctx.Array("i", size, lock=False)
+        self._pids = ctx.Array("i", size, lock=False)
+
+    def update(self, slot: int, state: int, pid: Optional[int] = None) -> None:
+        self._states[slot] = state
+        self._beats[slot] = time.time()
+        if pid is not None:
+            self._pids[slot] = pid
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        聚合所有工作进程状态
+
+        Returns:
+            {"status": "SERVING"/"NOT_SERVING", "serving": 健康进程数, "total": 进程数,
+             "workers": [{"slot", "pid", "state", "heartbeat_age"}]}
+        """
+        now = time.time() if now is None else now
+        workers = []
+        serving = 0
+        for slot in range(self.size):
+            beat = self._beats[slot]
+            age = now - beat if beat else None
+            state = self._states[slot]
+            healthy = state == STATE_SERVING and age is not None and age <= HEARTBEAT_TIMEOUT
+            serving += healthy
+            workers.append({
+                "slot": slot,
+                "pid": self._pids[slot],
+                "state": _STATE_NAMES.get(state, "unknown"),
+                "heartbeat_age": round(age, 2) if age is not None else None,
+                "healthy": healthy,
+            })
+        return {
+            "status": "SERVING" if serving else "NOT_SERVING",
+            "serving": serving,
+            "total": self.size,
+            "workers": workers,
+        }
+
+
+def _reuseport_options(enabled: bool) -> List[Tuple[str, Any]]:
+    return [("grpc.so_reuseport", 1)] if enabled else []
+
+
+def _add_health_servicer(server, service_name: str):
+    """注册标准 gRPC 健康检查服务（grpc_health 未安装时跳过，探活退化为 TCP 检查）"""
+    if not GRPC_HEALTH_AVAILABLE:
+        return None
+    try:
+        servicer = health.HealthServicer()
+        health_pb2_grpc.add_HealthServicer_to_server(servicer, server)
+        return servicer
+    except Exception as e:
+        logger.warning(f"[{service_name}] 健康检查服务注册失败: {e}")
+        return None
+
+
+def _set_health(servicer, service_name: str, serving: bool) -> None:
+    if servicer is None:
+        return
+    status = (health_pb2.HealthCheckResponse.SERVING if serving
+              else health_pb2.HealthCheckResponse.NOT_SERVING)
+    servicer.set("", status)
+    servicer.set(service_name, status)
+
+
+def _drain(server, reloader, health_servicer, service_name: str, grace: float) -> None:
+    """平滑退出：先摘除健康状态，再等待进行中的请求完成"""
+    _set_health(health_servicer, service_name, False)
+    if reloader is not None:
+        try:
+            reloader.stop()
+        except Exception as e:
+            logger.warning(f"[{service_name}] 停止热更新监控失败: {e}")
+    server.stop(grace).wait(grace + 1)
+
+
+def _serve_single(service_name: str, build_server: BuildServer, port: int, grace: float) -> None:
+    """单进程模式（与原实现一致，增加 SIGTERM 平滑退出）"""
+    server, reloader = build_server(_reuseport_options(False))
+    health_servicer = _add_health_servicer(server, service_name)
+    server.start()
+    _set_health(health_servicer, service_name, True)
+    logger.info(f"✅ [{service_name}] gRPC 服务已启动（单进程），监听端口: {port}")
+
+    stop_event = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    try:
+        while not stop_event.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    logger.info(f">>> [{service_name}] 正在停止服务（等待进行中的请求，最长 {grace}s）...")
+    _drain(server, reloader, health_servicer, service_name, grace)
+    logger.info(f"✅ [{service_name}] 服务已停止")
+
+
+def _worker_main(slot: int, service_name: str, build_server: BuildServer,
+                 table: WorkerHealthTable, grace: float) -> None:
+    """工作进程入口：创建服务器、上报心跳，收到 SIGTERM 后平滑退出"""
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C 由主进程统一处理
+    pid = os.getpid()
+    table.update(slot, STATE_STARTING, pid)
+
+    server, reloader = build_server(_reuseport_options(True))
+    health_servicer = _add_health_servicer(server, service_name)
+    server.start()
+    table.update(slot, STATE_SERVING, pid)
+    logger.info(f"✓ [{service_name}] 工作进程 #{slot} 已启动 (pid={pid})")
+
+    while not stop_event.wait(HEARTBEAT_INTERVAL):
+        table.update(slot, STATE_SERVING)
+        _set_health(health_servicer, service_name, table.snapshot()["serving"] > 0)
+
+    table.update(slot, STATE_DRAINING)
+    _drain(server, reloader, health_servicer, service_name, grace)
+    table.update(slot, STATE_STOPPED)
+    logger.info(f"✓ [{service_name}] 工作进程 #{slot} 已退出 (pid={pid})")
+
+
+def _worker_entry(*args) -> None:
+    try:
+        _worker_main(*args)
+    except Exception as e:
+        logger.error(f"🚨 工作进程异常退出: {e}", exc_info=True)
+        os._exit(1)
+
+
+class PreforkSupervisor:
+    """主进程：fork 工作进程、崩溃重启、聚合健康状态、统一平滑退出"""
+
+    def __init__(self, service_name: str, build_server: BuildServer, port: int,
+                 workers: int, grace: float = GRPC_DRAIN_GRACE):
+        self.service_name = service_name
+        self.build_server = build_server
+        self.port = port
+        self.workers = workers
+        self.grace = grace
+        self._ctx = multiprocessing.get_context("fork")
+        self.table = WorkerHealthTable(workers, self._ctx)
+        self._procs: Dict[int, Any] = {}
+        self._started_at: Dict[int, float] = {}
+        self._restarts: Dict[int, int] = {}
+        self._next_start: Dict[int, float] = {}
+        self._stop_event = threading.Event()
+        self._last_status: Optional[str] = None
+
+    def _spawn(self, slot: int) -> None:
+        proc = self._ctx.Process(
+            target=_worker_entry,
+            args=(slot, self.service_name, self.build_server, self.table, self.grace),
+            name=f"{self.service_name}-worker-{slot}",
+            daemon=False,
+        )
+        proc.start()
+        self._procs[slot] = proc
+        self._started_at[slot] = time.time()
+        self.table.update(slot, STATE_STARTING, proc.pid)
+
+    def _check_workers(self) -> None:
+        now = time.time()
+        for slot, proc in list(self._procs.items()):
+            if proc is not None and proc.is_alive():
+                if now - self._started_at[slot] > FAST_CRASH_SECONDS:
+                    self._restarts[slot] = 0
+                continue
+            if proc is not None:
+                # 刚退出：记录并安排重启
+                self.table.update(slot, STATE_STOPPED)
+                fast = now - self._started_at[slot] < FAST_CRASH_SECONDS
+                self._restarts[slot] = self._restarts.get(slot, 0) + 1 if fast else 0
+                delay = min(MAX_RESTART_BACKOFF, 2 ** self._restarts[slot] - 1) if fast else 0
+                logger.warning(f"⚠️ [{self.service_name}] 工作进程 #{slot} 退出 (exitcode={proc.exitcode})，"
+                               f"{delay:.0f}s 后重启")
+                self._procs[slot] = None
+                self._next_start[slot] = now + delay
+            if now >= self._next_start.get(slot, 0):
+                self._spawn(slot)
+
+    def _log_health(self) -> None:
+        snapshot = self.table.snapshot()
+        status = f"{snapshot['status']} {snapshot['serving']}/{snapshot['total']}"
+        if status != self._last_status:
+            self._last_status = status
+            logger.info(f"[{self.service_name}] 健康状态: {status}")
+
+    def status(self) -> Dict[str, Any]:
+        return self.table.snapshot()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+            signal.signal(signal.SIGINT, lambda signum, frame: self.stop())
+
+        for slot in range(self.workers):
+            self._spawn(slot)
+        logger.info(f"✅ [{self.service_name}] gRPC 多进程服务已启动: {self.workers} 个工作进程，"
+                    f"监听端口: {self.port} (SO_REUSEPORT)")
+
+        while not self._stop_event.wait(1.0):
+            self._check_workers()
+            self._log_health()
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """通知所有工作进程平滑退出，超时后强制结束"""
+        logger.info(f">>> [{self.service_name}] 正在停止 {self.workers} 个工作进程"
+                    f"（等待进行中的请求，最长 {self.grace}s）...")
+        procs = [p for p in self._procs.values() if p is not None and p.is_alive()]
+        for proc in procs:
+            try:
+                os.kill(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.time() + self.grace + 5
+        for proc in procs:
+            proc.join(max(0.0, deadline - time.time()))
+            if proc.is_alive():
+                logger.warning(f"⚠️ [{self.service_name}] 工作进程 pid={proc.pid} 未按时退出，强制结束")
+                proc.kill()
+                proc.join(1)
+        logger.info(f"✅ [{self.service_name}] 服务已停止")
+
+
+def serve_grpc(service_name: str, build_server: BuildServer, port: int,
+               workers: Optional[Union[int, str]] = None,
+               grace: float = GRPC_DRAIN_GRACE) -> None:
+    """
+    启动 gRPC 服务（单进程或多进程）
+
+    Args:
+        service_name: 服务名称（日志和健康检查服务名）
+        build_server: 创建并绑定端口的函数，接收需追加的 server options，
+                      返回 (server, reloader)；多进程模式下在每个工作进程中调用
+        port: 监听端口
+        workers: 工作进程数（None 读取 GRPC_WORKERS）
+        grace: 平滑退出等待时间（秒）
+    """
+    count = resolve_workers(workers)
+    if count <= 1 or not hasattr(os, "fork"):
+        _serve_single(service_name, build_server, port, grace)
+        return
+    PreforkSupervisor(service_name, build_server, port, count, grace).run()
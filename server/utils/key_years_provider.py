@@ -56,6 +56,11 @@ from abc import ABC, abstractmethod
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+import numpy as np
+
+from core.data.ganzhi_kernel import ELEMENT_INDEX, ELEMENTS
+from core.inference.period_engine import element_counts as ganzhi_element_counts, ten_god_offsets
+
 logger = logging.getLogger(__name__)
 
 
@@ -235,23 +240,14 @@ def _get_stem_shishen(day_stem: str, target_stem: str) -> str:
     return SHISHEN_MAP.get(relation_index, '未知')
 
 
-def _calculate_ganzhi_elements(stem: str, branch: str) -> Dict[str, int]:
-    """计算干支五行统计（业务层工具方法）"""
-    STEM_ELEMENTS = {
-        '甲': '木', '乙': '木', '丙': '火', '丁': '火', '戊': '土',
-        '己': '土', '庚': '金', '辛': '金', '壬': '水', '癸': '水'
-    }
-    BRANCH_ELEMENTS = {
-        '子': '水', '丑': '土', '寅': '木', '卯': '木', '辰': '土',
-        '巳': '火', '午': '火', '未': '土', '申': '金', '酉': '金',
-        '戌': '土', '亥': '水'
-    }
-    elements = {'木': 0, '火': 0, '土': 0, '金': 0, '水': 0}
-    if stem and stem in STEM_ELEMENTS:
-        elements[STEM_ELEMENTS[stem]] += 1
-    if branch and branch in BRANCH_ELEMENTS:
-        elements[BRANCH_ELEMENTS[branch]] += 1
-    return elements
+# 十神序号 → 名称（序号为目标天干与日主天干的天干序差 mod 10，与 _get_stem_shishen 一致）
+_SHISHEN_BY_OFFSET = ('比肩', '劫财', '食神', '伤官', '偏财', '正财', '七杀', '正官', '偏印', '正印')
+
+
+def _batch_stem_shishen(day_stem: str, dayun_sequence: List[Dict[str, Any]]) -> List[str]:
+    """批量计算整个大运序列的天干十神（业务层工具方法，结果同逐个调用 _get_stem_shishen）"""
+    offsets = ten_god_offsets(day_stem, [d.get('stem', '') for d in dayun_sequence])
+    return [_SHISHEN_BY_OFFSET[o] if o >= 0 else '未知' for o in offsets.tolist()]
 
 
 # --- 默认策略：按距离当前大运的优先级 ---
@@ -280,6 +276,41 @@ def _select_default_key_dayuns(
 
 # --- 健康策略：五行病理冲突 ---
 
+# 五行病理冲突（阈值：大运2 + 原局2），按顺序取第一个命中的冲突
+HEALTH_CONFLICTS = [
+    ('水', '土', '水土混战'),
+    ('火', '水', '水火交战'),
+    ('金', '木', '金木相战'),
+    ('木', '土', '木土相战'),
+    ('火', '金', '火金相战'),
+]
+
+
+def _batch_dayun_health_relations(
+    dayun_sequence: List[Dict[str, Any]],
+    bazi_elements: Dict[str, int]
+) -> List[Optional[str]]:
+    """
+    批量分析大运序列与原局的五行病理关系
+
+    所有大运的干支五行个数一次算出（n×5 数组），每种冲突一次数组比较。
+    返回与 dayun_sequence 等长的列表，无特殊关系的位置为 None。
+    """
+    counts = ganzhi_element_counts(
+        [d.get('stem', '') for d in dayun_sequence],
+        [d.get('branch', '') for d in dayun_sequence],
+    )
+    natal = np.array([bazi_elements.get(e, 0) for e in ELEMENTS])
+    result: List[Optional[str]] = [None] * len(dayun_sequence)
+    for elem_a, elem_b, conflict_name in HEALTH_CONFLICTS:
+        a, b = ELEMENT_INDEX[elem_a], ELEMENT_INDEX[elem_b]
+        hit = ((counts[:, a] >= 2) & (natal[b] >= 2)) | ((counts[:, b] >= 2) & (natal[a] >= 2))
+        for i in np.flatnonzero(hit):
+            if result[i] is None:
+                result[i] = conflict_name
+    return result
+
+
 def _analyze_dayun_health_relation(
     dayun: Dict[str, Any],
     bazi_elements: Dict[str, int]
@@ -290,25 +321,7 @@ def _analyze_dayun_health_relation(
     返回冲突类型（水土混战、水火交战、金木相战、木土相战、火金相战），
     如果没有特殊关系返回 None
     """
-    dayun_stem = dayun.get('stem', '')
-    dayun_branch = dayun.get('branch', '')
-    dayun_elements = _calculate_ganzhi_elements(dayun_stem, dayun_branch)
-    
-    # 五行病理冲突检测（阈值：大运2 + 原局2）
-    conflicts = [
-        ('水', '土', '水土混战'),
-        ('火', '水', '水火交战'),
-        ('金', '木', '金木相战'),
-        ('木', '土', '木土相战'),
-        ('火', '金', '火金相战'),
-    ]
-    
-    for elem_a, elem_b, conflict_name in conflicts:
-        if (dayun_elements.get(elem_a, 0) >= 2 and bazi_elements.get(elem_b, 0) >= 2) or \
-           (dayun_elements.get(elem_b, 0) >= 2 and bazi_elements.get(elem_a, 0) >= 2):
-            return conflict_name
-    
-    return None
+    return _batch_dayun_health_relations([dayun], bazi_elements)[0]
 
 
 def _select_health_key_dayuns(
@@ -326,12 +339,13 @@ def _select_health_key_dayuns(
     """
     element_counts = bazi_data.get('element_counts', {}) if bazi_data else {}
     
+    relation_types = _batch_dayun_health_relations(dayun_sequence, element_counts)
+    
     key_dayuns = []
-    for dayun in dayun_sequence:
+    for dayun, relation_type in zip(dayun_sequence, relation_types):
         # 小运不参与业务分析（小运只通过特殊流年路径进入关键大运）
         if dayun.get('is_xiaoyun', False):
             continue
-        relation_type = _analyze_dayun_health_relation(dayun, element_counts)
         if relation_type:
             dayun_copy = dayun.copy()
             dayun_copy['relation_type'] = relation_type
@@ -379,8 +393,9 @@ def _select_marriage_key_dayuns(
     
     key_dayuns = []
     current_step = current_dayun.get('step') if current_dayun else None
+    shishen_list = _batch_stem_shishen(day_stem, dayun_sequence)
     
-    for dayun in dayun_sequence:
+    for dayun, shishen in zip(dayun_sequence, shishen_list):
         if dayun.get('step') == current_step:
             continue
         # 小运不参与婚姻业务分析（小运只通过特殊流年路径进入关键大运）
@@ -394,7 +409,6 @@ def _select_marriage_key_dayuns(
         
         # 检查天干十神
         if dayun_stem:
-            shishen = _get_stem_shishen(day_stem, dayun_stem)
             if shishen in target_shishen:
                 reasons.append(f'{shishen}透出')
         
@@ -441,8 +455,9 @@ def _select_career_key_dayuns(
     
     key_dayuns = []
     current_step = current_dayun.get('step') if current_dayun else None
+    shishen_list = _batch_stem_shishen(day_stem, dayun_sequence)
     
-    for dayun in dayun_sequence:
+    for dayun, shishen in zip(dayun_sequence, shishen_list):
         if dayun.get('step') == current_step:
             continue
         # 小运不参与事业业务分析（小运只通过特殊流年路径进入关键大运）
@@ -452,7 +467,6 @@ def _select_career_key_dayuns(
         dayun_stem = dayun.get('stem', '')
         
         if dayun_stem:
-            shishen = _get_stem_shishen(day_stem, dayun_stem)
             if shishen in target_shishen:
                 dayun_copy = dayun.copy()
                 dayun_copy['relation_type'] = f'{shishen}透出'
@@ -497,8 +511,9 @@ def _select_children_key_dayuns(
     
     key_dayuns = []
     current_step = current_dayun.get('step') if current_dayun else None
+    shishen_list = _batch_stem_shishen(day_stem, dayun_sequence)
     
-    for dayun in dayun_sequence:
+    for dayun, shishen in zip(dayun_sequence, shishen_list):
         if dayun.get('step') == current_step:
             continue
         # 小运不参与子女业务分析（小运只通过特殊流年路径进入关键大运）
@@ -508,7 +523,6 @@ def _select_children_key_dayuns(
         dayun_stem = dayun.get('stem', '')
         
         if dayun_stem:
-            shishen = _get_stem_shishen(day_stem, dayun_stem)
             if shishen in target_shishen:
                 dayun_copy = dayun.copy()
                 dayun_copy['relation_type'] = f'{shishen}透出'
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热路径日志预算 - 惰性格式化、按调用点限流 / 采样、队列异步写出、按请求统计日志字节
+
+热路径（流式分块、规则匹配、gRPC 单次调用）上的 logger.info(f"...{json.dumps(data)}")
+每次调用都会先完成序列化和格式化（即使该级别未开启），再同步写出。
+
+- get_hot_logger(name)：返回 HotPathLogger，%s 参数只在确实输出时格式化；
+  参数可用 lazy(fn, *args) 包装，把 json.dumps / 大小统计之类的计算也推迟到输出时
+- 按调用点（文件:行号）令牌桶限流，另可传 sample=N 只输出每 N 条中的 1 条；
+  被限流 / 采样丢弃的条数附在该调用点下一条输出的日志末尾。WARNING 及以上不限流
+- 模块 logger 的所有输出经有界队列交给后台线程写出，业务线程不等待 I/O；
+  队列满时丢弃并计数，fork 后的子进程自动重建队列和写出线程
+- log_budget_scope()：统计请求内输出的日志条数、字节数和被抑制的条数；单个请求超出
+  HOT_LOG_BUDGET_BYTES 后，该请求内 INFO 及以下的热路径日志不再输出
+
+环境变量：
+    HOT_LOG_RATE_PER_SITE   每个调用点每秒最多输出条数，突发同值（默认 20；0 不限）
+    HOT_LOG_BUDGET_BYTES    单个请求的日志字节上限（默认 65536；0 不限）
+    HOT_LOG_QUEUE_SIZE      异步队列长度（默认 10000）
+    HOT_LOG_ASYNC           是否经队列异步写出（默认 true；false 时在调用线程写出）
+
+使用示例：
+    hot_logger = get_hot_logger(__name__)
+    hot_logger.debug("原始数据: %.200s", lazy(json.dumps, data, ensure_ascii=False))
+    hot_logger.info("📨 SSE行 %d: %.200s", line_count, line_str, sample=10)
+
+    with log_budget_scope() as stats:
+        handle_request()
+    logger.info(f"日志: {stats.summary()}")
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+HOT_LOG_RATE_PER_SITE = float(os.getenv("HOT_LOG_RATE_PER_SITE", "20"))
+HOT_LOG_BUDGET_BYTES = int(os.getenv("HOT_LOG_BUDGET_BYTES", "65536"))
+HOT_LOG_QUEUE_SIZE = int(os.getenv("HOT_LOG_QUEUE_SIZE", "10000"))
+HOT_LOG_ASYNC = os.getenv("HOT_LOG_ASYNC", "true").lower() == "true"
+
+
+class LazyArg:
+    """惰性日志参数：只有日志确实输出（格式化）时才调用 fn"""
+
+    __slots__ = ("fn", "args", "kwargs")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.fn(*self.args, **self.kwargs))
+
+    def __repr__(self) -> str:
+        return repr(self.fn(*self.args, **self.kwargs))
+
+
+def lazy(fn: Callable[..., Any], *args, **kwargs) -> LazyArg:
+    """包装为惰性参数，例如 lazy(json.dumps, data, ensure_ascii=False)"""
+    return LazyArg(fn, args, kwargs)
+
+
+# ==================== 按请求统计 ====================
+
+class LogStats:
+    """一次请求内的日志开销"""
+
+    __slots__ = ("records", "bytes", "suppressed", "dropped")
+
+    def __init__(self):
+        self.records = 0
+        self.bytes = 0
+        self.suppressed = 0   # 被限流 / 采样 / 预算抑制的热路径日志
+        self.dropped = 0      # 队列满被丢弃
+
+    @property
+    def over_budget(self) -> bool:
+        return 0 < HOT_LOG_BUDGET_BYTES <= self.bytes
+
+    def summary(self) -> str:
+        text = f"{self.records} 条/{self.bytes / 1024:.1f}KB"
+        if self.suppressed:
+            text += f"，抑制 {self.suppressed} 条"
+        if self.dropped:
+            text += f"，丢弃 {self.dropped} 条"
+        return text
+
+
+_current_stats: ContextVar[Optional[LogStats]] = ContextVar("hot_log_stats", default=None)
+
+
+@contextmanager
+def log_budget_scope() -> Iterator[LogStats]:
+    """在一次请求内统计日志开销（也可作为装饰器使用）"""
+    stats = LogStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_log_stats() -> Optional[LogStats]:
+    """当前请求的日志统计（不在 log_budget_scope 内时返回 None）"""
+    return _current_stats.get()
+
+
+# ==================== 队列异步写出 ====================
+
+_queue: Optional[queue.Queue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_pid: Optional[int] = None
+_listener_lock = threading.Lock()
+_dropped_total = 0
+
+
+def _has_budget_handler(logger: logging.Logger) -> bool:
+    return any(isinstance(handler, BudgetQueueHandler) for handler in logger.handlers)
+
+
+def _dispatch(record: logging.LogRecord) -> None:
+    """按原传播链把记录交给入队那一层 logger 之上的处理器"""
+    # 入队之前（含入队那一层）的处理器已在调用线程由 callHandlers 执行过
+    current = logging.getLogger(record.name)
+    while current is not None and not _has_budget_handler(current):
+        current = current.parent
+    current = current.parent if current is not None else None
+
+    found = False
+    while current is not None:
+        rerouted = False
+        for handler in current.handlers:
+            if isinstance(handler, BudgetQueueHandler):
+                rerouted = True
+                continue
+            found = True
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        # 热路径 logger 的 propagate=False 只是为了改走队列，写出时照常向上传播
+        if not current.propagate and not rerouted:
+            break
+        current = current.parent
+    if not found and logging.lastResort is not None and record.levelno >= logging.lastResort.level:
+        logging.lastResort.handle(record)
+
+
+class _DispatchHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        _dispatch(record)
+
+
+def _ensure_listener() -> queue.Queue:
+    global _queue, _listener, _listener_pid
+    if _listener_pid == os.getpid():
+        return _queue
+    with _listener_lock:
+        if _listener_pid != os.getpid():
+            # fork 后的子进程没有写出线程，队列的锁也可能处于父进程持有状态：全部重建
+            _queue = queue.Queue(HOT_LOG_QUEUE_SIZE)
+            _listener = logging.handlers.QueueListener(_queue, _DispatchHandler())
+            _listener.start()
+            _listener_pid = os.getpid()
+        return _queue
+
+
+def stop_hot_log_listener() -> None:
+    """写出队列中剩余的日志并停止后台线程（进程退出时自动调用）"""
+    global _listener, _listener_pid
+    with _listener_lock:
+        if _listener is not None and _listener_pid == os.getpid():
+            _listener.stop()
+        _listener = None
+        _listener_pid = None
+
+
+atexit.register(stop_hot_log_listener)
+
+
+class BudgetQueueHandler(logging.handlers.QueueHandler):
+    """在调用线程格式化并统计字节，写出交给后台线程"""
+
+    def __init__(self, async_write: bool = True):
+        super().__init__(None)
+        self.async_write = async_write
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 父类在此合并 msg % args（惰性参数在这里求值），写出线程只拿到字符串
+        record = super().prepare(record)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.records += 1
+            stats.bytes += len(record.msg.encode("utf-8", "replace"))
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped_total
+        if not self.async_write:
+            _dispatch(record)
+            return
+        try:
+            _ensure_listener().put_nowait(record)
+        except queue.Full:
+            _dropped_total += 1
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.dropped += 1
+
+
+def dropped_log_count() -> int:
+    """本进程因队列满丢弃的日志条数"""
+    return _dropped_total
+
+
+# ==================== 热路径 logger ====================
+
+class _CallSite:
+    """单个调用点的令牌桶与采样计数（多线程下计数允许少量误差）"""
+
+    __slots__ = ("tokens", "updated", "seen", "suppressed")
+
+    def __init__(self):
+        self.tokens = HOT_LOG_RATE_PER_SITE
+        self.updated = time.monotonic()
+        self.seen = 0
+        self.suppressed = 0
+
+    def admit(self, sample: int) -> bool:
+        self.seen += 1
+        if sample > 1 and self.seen % sample != 1:
+            return False
+        rate = HOT_LOG_RATE_PER_SITE
+        if rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(rate, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class HotPathLogger:
+    """热路径 logger：惰性格式化 + 调用点限流 / 采样 + 请求字节预算"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._sites: Dict[Tuple[str, int], _CallSite] = {}
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, msg: str, *args, sample: int = 1, **kwargs) -> None:
+        self._log(logging.DEBUG, msg, args, sample, kwargs)
+
+    def info(self, msg: str, *args, sample: int = 1, **kwargs) -> None:
+        self._log(logging.INFO, msg, args, sample, kwargs)
+
+    def warning(self, msg: str, *args, **kwargs) -> None:
+        self._log(logging.WARNING, msg, args, 1, kwargs)
+
+    def error(self, msg: str, *args, **kwargs) -> None:
+        self._log(logging.ERROR, msg, args, 1, kwargs)
+
+    def _log(self, level: int, msg: str, args: tuple, sample: int, kwargs: dict) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        if level < logging.WARNING:
+            frame = sys._getframe(2)
+            key = (frame.f_code.co_filename, frame.f_lineno)
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites.setdefault(key, _CallSite())
+            stats = _current_stats.get()
+            if not site.admit(sample) or (stats is not None and stats.over_budget):
+                site.suppressed += 1
+                if stats is not None:
+                    stats.suppressed += 1
+                return
+            if site.suppressed:
+                suppressed, site.suppressed = site.suppressed, 0
+                msg = f"{msg}（此前抑制 {suppressed} 条）"
+        kwargs.setdefault("stacklevel", 3)
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+_hot_loggers: Dict[str, HotPathLogger] = {}
+
+
+def get_hot_logger(name: str) -> HotPathLogger:
+    """
+    获取热路径 logger
+
+    同名 logging.Logger 的全部输出（包括普通 logger.info）改为经 BudgetQueueHandler
+    写出，仍由上级 logger（通常是 root）的处理器按原格式输出。
+    """
+    hot = _hot_loggers.get(name)
+    if hot is not None:
+        return hot
+    with _listener_lock:
+        hot = _hot_loggers.get(name)
+        if hot is None:
+            logger = logging.getLogger(name)
+            if not any(isinstance(h, BudgetQueueHandler) for h in logger.handlers):
+                logger.addHandler(BudgetQueueHandler(async_write=HOT_LOG_ASYNC))
+                logger.propagate = False
+            hot = _hot_loggers[name] = HotPathLogger(logger)
+        return hot
@@ -8,20 +8,107 @@
 - 支持热更新时重新注册路由
 - 避免路由重复注册
 - 记录路由注册信息
+- 延迟挂载：启动时只登记路由元数据（模块路径、前缀、路径列表），
+  首次请求命中或后台预热时才导入路由模块（LAZY_ROUTERS=false 关闭）
 """
 
+import ast
+import copy
 import sys
 import os
+import importlib
 import logging
+import re
+import threading
+import time
 from typing import Optional, Callable, List, Dict, Any, Tuple
 from fastapi import FastAPI, APIRouter
+from starlette.routing import Mount, compile_path
 
 # 添加项目根目录到路径
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from server.utils.startup_profiler import get_startup_profiler
+
 logger = logging.getLogger(__name__)
 
+# 延迟挂载开关：关闭后所有路由在启动时导入（与旧行为一致）
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "true").lower() == "true"
+
+_ROUTE_METHODS = {"get", "post", "put", "delete", "patch", "options", "head", "api_route", "websocket"}
+
+
+def _module_source_path(module_path: str) -> Optional[str]:
+    """按项目目录结构定位模块源文件（不导入模块及其父包）"""
+    base = os.path.join(project_root, *module_path.split("."))
+    for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _const_str(node) -> Optional[str]:
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def scan_router_paths(module_path: str, attr: str = "router") -> Tuple[str, Optional[List[str]]]:
+    """
+    静态解析路由模块（AST，不执行导入），获取 APIRouter 前缀和路由路径
+
+    Returns:
+        (router_prefix, paths)：paths 为 None 表示无法静态确定（如 include_router 子路由），
+        此时按前缀整体认领请求；模块源文件不存在时 paths 为空列表
+    """
+    source_path = _module_source_path(module_path)
+    if source_path is None:
+        return "", []  # 模块不存在：不认领任何请求，预热时记录导入失败
+    try:
+        with open(source_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=source_path)
+    except (OSError, SyntaxError) as e:
+        logger.debug(f"解析路由模块 {module_path} 失败: {e}")
+        return "", None
+
+    router_prefix = ""
+    defined = False
+    paths: List[str] = []
+    dynamic = False
+
+    def _is_router(node) -> bool:
+        return isinstance(node, ast.Name) and node.id == attr
+
+    for node in ast.walk(tree):
+        # router = APIRouter(prefix="...")
+        if isinstance(node, ast.Assign) and any(_is_router(t) for t in node.targets):
+            call = node.value
+            if isinstance(call, ast.Call) and getattr(call.func, "id", None) == "APIRouter":
+                defined = True
+                for kw in call.keywords:
+                    if kw.arg == "prefix":
+                        router_prefix = _const_str(kw.value) or ""
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and _is_router(node.func.value):
+            method = node.func.attr
+            if method in _ROUTE_METHODS or method == "add_api_route":
+                path = _const_str(node.args[0]) if node.args else None
+                if path is None:
+                    path = next((_const_str(kw.value) for kw in node.keywords if kw.arg == "path"), None)
+                if path is None:
+                    dynamic = True
+                else:
+                    paths.append(path)
+            elif method in ("include_router", "mount"):
+                dynamic = True
+
+    if not defined or dynamic or not paths:
+        return router_prefix, None
+    return router_prefix, paths
+
+
+def _join_path(*parts: str) -> str:
+    path = "/".join(p.strip("/") for p in parts if p and p.strip("/"))
+    return "/" + path
+
 
 class RouterInfo:
     """路由信息"""
@@ -59,6 +146,58 @@ class RouterInfo:
             return None
 
 
+class LazyRouterInfo(RouterInfo):
+    """
+    延迟挂载的路由信息
+
+    启动时只登记模块路径与路由路径（静态解析），不导入模块；
+    首次请求命中（LazyRouterMiddleware）或后台预热时再导入并挂载。
+    """
+    def __init__(
+        self,
+        name: str,
+        module_path: str,
+        prefix: str = "",
+        tags: Optional[List[str]] = None,
+        attr: str = "router",
+        lazy: bool = True,
+        enabled_getter: Optional[Callable[[], bool]] = None
+    ):
+        super().__init__(name, self._import_router, prefix, tags, enabled_getter)
+        self.module_path = module_path
+        self.attr = attr
+        self.lazy = lazy
+        self.loaded = False  # 是否已导入挂载过（热更新清除注册状态后仍保留）
+        self.load_failed = False
+        self._path_patterns: Optional[List[re.Pattern]] = None
+        self._claim_prefix: Optional[str] = None
+
+    def _import_router(self) -> Optional[APIRouter]:
+        try:
+            module = importlib.import_module(self.module_path)
+            return getattr(module, self.attr)
+        except Exception as e:
+            logger.warning(f"路由 {self.name} 导入失败（可选功能）: {e}")
+            return None
+
+    def _build_matchers(self):
+        router_prefix, paths = scan_router_paths(self.module_path, self.attr)
+        if paths is None:
+            self._claim_prefix = _join_path(self.prefix, router_prefix)
+            self._path_patterns = []
+        else:
+            self._path_patterns = [compile_path(_join_path(self.prefix, router_prefix, p))[0] for p in paths]
+
+    def claims(self, path: str) -> bool:
+        """请求路径是否属于该路由（未导入时按静态解析的路径判断）"""
+        if self._path_patterns is None:
+            self._build_matchers()
+        if self._claim_prefix is not None:
+            prefix = self._claim_prefix.rstrip("/")
+            return path == prefix or path.startswith(prefix + "/") or not prefix
+        return any(pattern.match(path) for pattern in self._path_patterns)
+
+
 class RouterManager:
     """路由管理器 - 支持热更新的路由注册"""
     
@@ -73,6 +212,7 @@ class RouterManager:
         self.registered_routers: Dict[str, RouterInfo] = {}
         self._route_signatures: Dict[str, Tuple[str, str]] = {}  # 路由签名：{name: (prefix, path)}
         self._registered_route_paths: Dict[str, List[str]] = {}  # 记录每个路由名称对应的路径列表
+        self._lazy_lock = threading.RLock()
     
     @classmethod
     def get_instance(cls) -> Optional['RouterManager']:
@@ -99,6 +239,36 @@ class RouterManager:
         """
         router_info = RouterInfo(name, router_getter, prefix, tags, enabled_getter)
         self.registered_routers[name] = router_info
+
+    def register_lazy_router(
+        self,
+        name: str,
+        module_path: str,
+        prefix: str = "",
+        tags: Optional[List[str]] = None,
+        attr: str = "router",
+        lazy: bool = True,
+        enabled_getter: Optional[Callable[[], bool]] = None
+    ):
+        """
+        按模块路径登记路由（导入推迟到挂载时）
+
+        Args:
+            name: 路由名称（唯一标识）
+            module_path: 路由所在模块，如 server.api.v1.chat
+            prefix: 路由前缀
+            tags: 路由标签
+            attr: 模块中 APIRouter 的属性名
+            lazy: 是否允许延迟挂载（False 时启动即导入，适合核心路由）
+            enabled_getter: 检查路由是否启用的函数（可选）
+        """
+        self.registered_routers[name] = LazyRouterInfo(
+            name, module_path, prefix, tags, attr=attr, lazy=lazy, enabled_getter=enabled_getter
+        )
+
+    def _is_deferred(self, router_info: RouterInfo) -> bool:
+        return (LAZY_ROUTERS and isinstance(router_info, LazyRouterInfo)
+                and router_info.lazy and not router_info.loaded)
     
     def _get_route_signature(self, router: APIRouter, prefix: str) -> str:
         """获取路由签名（用于检测重复注册）"""
@@ -178,6 +348,13 @@ class RouterManager:
         Returns:
             bool: 是否成功注册
         """
+        start = time.perf_counter()
+        try:
+            return self._do_register_single_router(router_info, force)
+        finally:
+            get_startup_profiler().record(f"router:{router_info.name}", time.perf_counter() - start)
+
+    def _do_register_single_router(self, router_info: RouterInfo, force: bool) -> bool:
         try:
             # 检查路由是否启用
             if not router_info.is_enabled():
@@ -204,13 +381,11 @@ class RouterManager:
             self._registered_route_paths[router_info.name] = router_paths
             
             # 注册路由
-            self.app.include_router(
-                router,
-                prefix=router_info.prefix,
-                tags=router_info.tags
-            )
+            self._include_router(router, router_info.prefix, router_info.tags)
             
             router_info._registered = True
+            if isinstance(router_info, LazyRouterInfo):
+                router_info.loaded = True
             logger.info(f"✓ 路由已注册: {router_info.name} (prefix: {router_info.prefix}, tags: {router_info.tags}, 路径数: {len(router_paths)})")
             return True
             
@@ -218,6 +393,25 @@ class RouterManager:
             logger.error(f"注册路由 {router_info.name} 失败: {e}", exc_info=True)
             return False
     
+    def _include_router(self, router: APIRouter, prefix: str, tags: List[str]):
+        """
+        挂载路由；运行期挂载时新路由需排在静态文件 Mount（如挂在 / 的前端目录）之前，
+        否则会被 Mount 先匹配
+
+        懒加载路由在预热线程 / 线程池中挂载，事件循环同时在遍历 app.router.routes 分发请求，
+        因此不原地修改该列表：在私有副本上生成新路由，拼出完整新列表后一次赋值替换
+        """
+        with self._lazy_lock:
+            live = self.app.router.routes
+            # 浅拷贝 APIRouter：依赖、默认响应类等配置与 app.router 一致，路由列表为私有副本
+            staging = copy.copy(self.app.router)
+            staging.routes = list(live)
+            staging.include_router(router, prefix=prefix, tags=tags)
+            new_routes = staging.routes[len(live):]
+            mount_index = next((i for i, r in enumerate(live) if isinstance(r, Mount)), len(live))
+            self.app.router.routes = live[:mount_index] + new_routes + live[mount_index:]
+            self.app.openapi_schema = None  # 重新生成 OpenAPI 文档
+
     def register_all_routers(self, force: bool = False) -> Dict[str, bool]:
         """
         注册所有路由
@@ -234,11 +428,18 @@ class RouterManager:
         
         logger.info("🔄 开始注册所有路由...")
         
+        deferred_count = 0
         for name, router_info in self.registered_routers.items():
             # 如果已注册且不是强制模式，跳过
             if router_info._registered and not force:
                 results[name] = True
                 continue
+
+            # 延迟挂载的路由：只登记，首次请求或预热时导入
+            if self._is_deferred(router_info):
+                results[name] = True
+                deferred_count += 1
+                continue
             
             # 重置注册状态（强制模式下）
             if force:
@@ -253,7 +454,7 @@ class RouterManager:
             else:
                 failed_count += 1
         
-        logger.info(f"✅ 路由注册完成: {registered_count} 成功, {failed_count} 失败")
+        logger.info(f"✅ 路由注册完成: {registered_count} 成功, {failed_count} 失败, {deferred_count} 延迟挂载")
         
         return results
     
@@ -266,3 +467,48 @@ class RouterManager:
         for router_info in self.registered_routers.values():
             router_info._registered = False
 
+    # ==================== 延迟挂载 ====================
+
+    def get_pending_lazy_routers(self) -> List[str]:
+        """尚未挂载的延迟路由名称列表"""
+        return [name for name, info in self.registered_routers.items()
+                if self._is_deferred(info) and not info.load_failed]
+
+    def has_pending_lazy_routers(self) -> bool:
+        return any(self._is_deferred(info) and not info.load_failed
+                   for info in self.registered_routers.values())
+
+    def pending_routers_for_path(self, path: str) -> List[str]:
+        """认领该请求路径的未挂载延迟路由"""
+        return [name for name, info in list(self.registered_routers.items())
+                if self._is_deferred(info) and not info.load_failed and info.claims(path)]
+
+    def mount_lazy_router(self, name: str) -> bool:
+        """导入并挂载一个延迟路由（线程安全，已挂载时直接返回）"""
+        router_info = self.registered_routers.get(name)
+        if router_info is None:
+            return False
+        with self._lazy_lock:
+            if not self._is_deferred(router_info):
+                return router_info._registered
+            if router_info.load_failed:
+                return False
+            start = time.perf_counter()
+            success = self._register_single_router(router_info)
+            elapsed = time.perf_counter() - start
+            if not success:
+                router_info.load_failed = True
+            logger.info(f"{'✓' if success else '⚠'} 延迟路由挂载{'完成' if success else '失败'}: "
+                        f"{name} ({elapsed * 1000:.0f}ms)")
+            return success
+
+    def ensure_routers_for_path(self, path: str) -> List[str]:
+        """挂载认领该路径的所有延迟路由，返回本次挂载成功的路由名称"""
+        return [name for name in self.pending_routers_for_path(path) if self.mount_lazy_router(name)]
+
+    def warm_up_lazy_routers(self) -> Dict[str, bool]:
+        """后台预热：依次挂载所有未挂载的延迟路由"""
+        results = {name: self.mount_lazy_router(name) for name in self.get_pending_lazy_routers()}
+        if results:
+            logger.info(f"✅ 延迟路由预热完成: {sum(results.values())}/{len(results)} 成功")
+        return results
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时分析器 - 统计每个模块的导入耗时和每个路由的注册耗时
+
+启用方式：
+- 环境变量 STARTUP_PROFILE=true 启动服务，启动完成后日志输出耗时报告
+- 命令行：python -m server.utils.startup_profiler [--top 30] [--json] [--module server.main]
+
+导入耗时通过 sys.meta_path 上的计时 Finder 统计（与 python -X importtime 口径一致）：
+- self_ms: 模块自身执行耗时（不含其导入的子模块）
+- cumulative_ms: 模块执行总耗时（含首次导入的子模块）
+"""
+
+import importlib.abc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+STARTUP_PROFILE_TOP = int(os.getenv("STARTUP_PROFILE_TOP", "30"))
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """包装原 Loader，在 exec_module 前后计时；其余属性透传给原 Loader"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler._timing(module.__name__):
+            self._loader.exec_module(module)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """位于 sys.meta_path 首位，借用后续 Finder 查找模块并替换为计时 Loader"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimingLoader(spec.loader, self._profiler)
+                    return spec
+            return None
+        finally:
+            self._local.finding = False
+
+
+class StartupProfiler:
+    """启动耗时分析器（导入耗时 + 命名阶段耗时）"""
+
+    def __init__(self):
+        self._finder: Optional[_TimingFinder] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._imports: Dict[str, Dict[str, float]] = {}
+        self._sections: Dict[str, float] = {}
+        self._started_at: Optional[float] = None
+
+    @property
+    def installed(self) -> bool:
+        return self._finder is not None
+
+    def install(self) -> None:
+        """开始统计导入耗时（只影响之后首次导入的模块）"""
+        if self._finder is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder is None:
+            return
+        try:
+            sys.meta_path.remove(self._finder)
+        except ValueError:
+            pass
+        self._finder = None
+
+    @contextmanager
+    def _timing(self, module_name: str):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [0.0]  # 子模块耗时累计
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            with self._lock:
+                self._imports[module_name] = {
+                    "self": max(0.0, elapsed - frame[0]),
+                    "cumulative": elapsed,
+                }
+
+    @contextmanager
+    def section(self, name: str):
+        """统计一个命名阶段的耗时（如 router:bazi），同名阶段累加"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._sections[name] = self._sections.get(name, 0.0) + seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._imports.clear()
+            self._sections.clear()
+        self._started_at = time.perf_counter() if self._finder is not None else None
+
+    def report(self, top: int = STARTUP_PROFILE_TOP) -> Dict[str, Any]:
+        """
+        生成耗时报告
+
+        Returns:
+            {
+                "elapsed_ms": 自 install 起的总耗时,
+                "module_count": 统计到的模块数,
+                "top_self": [{"module", "self_ms", "cumulative_ms"}...]  # 按自身耗时排序
+                "top_cumulative": [...]                                  # 按总耗时排序
+                "sections": [{"name", "ms"}...]                          # 按耗时排序
+            }
+        """
+        with self._lock:
+            imports = dict(self._imports)
+            sections = dict(self._sections)
+
+        def _row(name, t):
+            return {
+                "module": name,
+                "self_ms": round(t["self"] * 1000, 2),
+                "cumulative_ms": round(t["cumulative"] * 1000, 2),
+            }
+
+        by_self = sorted(imports.items(), key=lambda kv: kv[1]["self"], reverse=True)[:top]
+        by_cumulative = sorted(imports.items(), key=lambda kv: kv[1]["cumulative"], reverse=True)[:top]
+        return {
+            "elapsed_ms": round((time.perf_counter() - self._started_at) * 1000, 2) if self._started_at else None,
+            "module_count": len(imports),
+            "top_self": [_row(n, t) for n, t in by_self],
+            "top_cumulative": [_row(n, t) for n, t in by_cumulative],
+            "sections": [
+                {"name": n, "ms": round(s * 1000, 2)}
+                for n, s in sorted(sections.items(), key=lambda kv: kv[1], reverse=True)
+            ],
+        }
+
+    def format_report(self, top: int = STARTUP_PROFILE_TOP) -> str:
+        data = self.report(top)
+        lines = [f"启动耗时报告: 总计 {data['elapsed_ms']}ms, 导入模块 {data['module_count']} 个"]
+        lines.append(f"-- 模块自身耗时 Top {top} --")
+        lines.extend(f"  {r['self_ms']:>10.1f}ms  (累计 {r['cumulative_ms']:.1f}ms)  {r['module']}"
+                     for r in data["top_self"])
+        lines.append(f"-- 模块累计耗时 Top {top} --")
+        lines.extend(f"  {r['cumulative_ms']:>10.1f}ms  {r['module']}" for r in data["top_cumulative"])
+        if data["sections"]:
+            lines.append("-- 阶段耗时 --")
+            lines.extend(f"  {s['ms']:>10.1f}ms  {s['name']}" for s in data["sections"])
+        return "\n".join(lines)
+
+    def log_report(self, top: int = STARTUP_PROFILE_TOP) -> None:
+        logger.info(self.format_report(top))
+
+
+_profiler = StartupProfiler()
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """获取全局启动耗时分析器"""
+    return _profiler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="统计模块导入与路由注册耗时")
+    parser.add_argument("--module", default="server.main", help="要导入的入口模块")
+    parser.add_argument("--top", type=int, default=STARTUP_PROFILE_TOP)
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args(argv)
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, project_root)
+
+    _profiler.install()
+    try:
+        importlib.import_module(args.module)
+    finally:
+        _profiler.uninstall()
+    if args.json:
+        print(json.dumps(_profiler.report(args.top), ensure_ascii=False, indent=2))
+    else:
+        print(_profiler.format_report(args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
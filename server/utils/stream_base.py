@@ -5,7 +5,7 @@
 
 提取5个分析接口流式生成器的共性代码：
 - Bot ID 解析
-- LLM 缓存读写
+- LLM 缓存读写（含进行中流复用）
 - 流式循环（SSE 事件生成）
 - 错误处理与日志
 """
@@ -20,6 +20,7 @@ from server.utils.stream_cache_helper import (
     get_llm_cache, set_llm_cache,
     compute_input_data_hash, LLM_CACHE_TTL
 )
+from server.utils.stream_inflight import get_inflight_registry
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,13 @@ def resolve_bot_id(
     return os.getenv(env_key, "")
 
 
+def _chunk_text(result) -> str:
+    """提取上游 chunk 的文本内容"""
+    if isinstance(result, dict):
+        return result.get("content", "") or ""
+    return str(result)
+
+
 async def stream_with_cache(
     *,
     analysis_type: str,
@@ -75,10 +83,10 @@ async def stream_with_cache(
     formatted_data = format_func(input_data)
 
     # 2. 缓存检查
-    cache_key = compute_input_data_hash(formatted_data)
-    cached = await get_llm_cache(cache_key)
+    input_data_hash = compute_input_data_hash(formatted_data)
+    cached = get_llm_cache(analysis_type, input_data_hash)
     if cached:
-        logger.info(f"[{analysis_type}] LLM 缓存命中 key={cache_key[:16]}...")
+        logger.info(f"[{analysis_type}] LLM 缓存命中 key={input_data_hash}")
         yield f"data: {json.dumps({'type': 'progress', 'content': cached}, ensure_ascii=False)}\n\n"
         yield f"data: {json.dumps({'type': 'complete', 'content': ''}, ensure_ascii=False)}\n\n"
         return
@@ -91,23 +99,28 @@ async def stream_with_cache(
         yield f"data: {json.dumps({'type': 'error', 'content': f'LLM服务创建失败: {str(e)}'}, ensure_ascii=False)}\n\n"
         return
 
-    # 4. 流式调用
+    # 4. 流式调用（相同输入正在生成时挂载到进行中的上游，缓存只在上游结束时写一次）
+    def _write_cache(chunks):
+        if any(isinstance(c, dict) and c.get("type") == "error" for c in chunks):
+            return
+        content = "".join(_chunk_text(c) for c in chunks)
+        if content:
+            set_llm_cache(analysis_type, input_data_hash, content, ttl=LLM_CACHE_TTL)
+
     full_content = ""
     start_time = time.time()
     try:
-        async for result in llm_service.stream_analysis(formatted_data):
-            if isinstance(result, dict):
-                content = result.get("content", "")
-            else:
-                content = str(result)
+        async for result in get_inflight_registry().stream(
+            f"{analysis_type}:{bot_id}:{input_data_hash}",
+            lambda: llm_service.stream_analysis(formatted_data),
+            on_complete=_write_cache,
+            scene=analysis_type,
+        ):
+            content = _chunk_text(result)
             if content:
                 full_content += content
                 yield f"data: {json.dumps({'type': 'progress', 'content': content}, ensure_ascii=False)}\n\n"
 
-        # 5. 写缓存
-        if full_content:
-            await set_llm_cache(cache_key, full_content, ttl=LLM_CACHE_TTL)
-
         yield f"data: {json.dumps({'type': 'complete', 'content': ''}, ensure_ascii=False)}\n\n"
 
         elapsed = time.time() - start_time
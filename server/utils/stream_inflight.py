@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进行中 LLM 流复用（in-flight fan-out）
+
+LLM 缓存只在生成结束后才写入。同一份输入（compute_input_data_hash 相同）在首次
+生成尚未结束时再次请求（多个用户同时访问、或同一用户重试），原先会各自打开一条
+Coze/百炼流。这里按 key 登记进行中的上游流：
+
+- 第一个请求启动上游，上游在独立任务中运行，产出的 chunk 全部进入缓冲区
+- 后续相同 key 的请求直接挂到该上游：先回放已产出的 chunk，再接收实时 chunk
+- 上游结束时调用一次 on_complete（写缓存），随后从登记表移除
+- 订阅方中途断开不影响上游与其他订阅方；上游异常会在每个订阅方重新抛出
+
+使用示例：
+    async for chunk in get_inflight_registry().stream(
+        f"health:{bot_id}:{input_data_hash}",
+        lambda: llm_service.stream_analysis(formatted_data, bot_id=bot_id),
+        on_complete=make_llm_cache_writer("health", input_data_hash, LLM_CACHE_TTL),
+    ):
+        ...
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from server.utils.stream_cache_helper import set_llm_cache
+
+logger = logging.getLogger(__name__)
+
+try:
+    from server.observability.metrics_collector import get_metrics
+    _attach_counter = get_metrics().counter(
+        "llm_stream_inflight_attached_total", "挂载到进行中LLM流的请求数", ["scene"]
+    )
+    _upstream_counter = get_metrics().counter(
+        "llm_stream_upstream_total", "实际发起的上游LLM流数量", ["scene"]
+    )
+    _inflight_gauge = get_metrics().gauge("llm_stream_inflight", "进行中的上游LLM流数量")
+except ImportError:
+    _attach_counter = None
+    _upstream_counter = None
+    _inflight_gauge = None
+
+
+def collect_stream_text(chunks: List[Dict[str, Any]], content_types=("progress", "complete", "chunk")) -> str:
+    """拼接流式 chunk 中的文本内容（用于写 LLM 缓存）"""
+    parts = []
+    for chunk in chunks:
+        if isinstance(chunk, dict) and chunk.get("type") in content_types and chunk.get("content"):
+            parts.append(chunk["content"])
+    return "".join(parts).strip()
+
+
+def stream_completed(chunks: List[Dict[str, Any]], end_types=("complete", "end")) -> bool:
+    """上游是否正常结束（出现结束 chunk 且没有 error chunk）"""
+    types = {chunk.get("type") for chunk in chunks if isinstance(chunk, dict)}
+    return "error" not in types and bool(types.intersection(end_types))
+
+
+def make_llm_cache_writer(
+    scene: str,
+    input_data_hash: str,
+    ttl: int,
+    chunk_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    trace_id: Optional[str] = None,
+) -> Callable[[List[Dict[str, Any]]], None]:
+    """
+    生成 on_complete 回调：上游正常结束且有文本时写一次 LLM 缓存（set_llm_cache）
+
+    Args:
+        scene: LLM 缓存前缀（如 health / marriage）
+        input_data_hash: compute_input_data_hash 结果
+        ttl: 缓存过期时间（秒）
+        chunk_filter: 只拼接返回 True 的 chunk（如过滤平台拒答文本）
+        trace_id: 日志追踪 ID
+    """
+    def _write(chunks: List[Dict[str, Any]]) -> None:
+        if not stream_completed(chunks):
+            return
+        if chunk_filter is not None:
+            chunks = [c for c in chunks if chunk_filter(c)]
+        content = collect_stream_text(chunks, content_types=("progress", "complete"))
+        if content:
+            set_llm_cache(scene, input_data_hash, content, ttl)
+            logger.info(f"[{trace_id or 'N/A'}] ✅ LLM 缓存已写入: {scene}, 长度={len(content)}")
+
+    return _write
+
+
+class _InflightStream:
+    """单条进行中的上游流：缓冲区 + 新数据通知"""
+
+    def __init__(self, key: str, scene: str):
+        self.key = key
+        self.scene = scene
+        self.loop = asyncio.get_running_loop()
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.started_at = time.time()
+        self._changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def publish(self, chunk: Any) -> None:
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+        self.done = True
+        self._notify()
+
+    def _notify(self) -> None:
+        # 唤醒当前所有等待者，再换一个新的 Event 供下一轮等待
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        """回放已产出的 chunk，然后跟随实时 chunk 直到上游结束"""
+        self.subscribers += 1
+        position = 0
+        try:
+            while True:
+                changed = self._changed
+                while position < len(self.chunks):
+                    yield self.chunks[position]
+                    position += 1
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await changed.wait()
+        finally:
+            self.subscribers -= 1
+
+
+class InflightStreamRegistry:
+    """进行中 LLM 流登记表（单事件循环内使用）"""
+
+    def __init__(self):
+        self._streams: Dict[str, _InflightStream] = {}
+        self._stats = {"upstreams": 0, "attached": 0}
+
+    async def stream(
+        self,
+        key: str,
+        upstream_factory: Callable[[], AsyncIterator[Any]],
+        on_complete: Optional[Callable[[List[Any]], Any]] = None,
+        scene: str = "",
+    ) -> AsyncIterator[Any]:
+        """
+        获取 key 对应的流：有进行中的上游则挂载，否则启动新的上游
+
+        登记在首次迭代时发生，可在同步函数中创建后交给异步调用方迭代。
+
+        Args:
+            key: 流标识（通常为 场景 + bot_id + 输入哈希）
+            upstream_factory: 创建上游异步生成器的函数（仅在启动新上游时调用）
+            on_complete: 上游正常结束时调用一次，参数为全部 chunk（可为协程函数）
+            scene: 场景名（用于指标标签）
+        """
+        subscription = self._acquire(key, upstream_factory, on_complete, scene).subscribe()
+        try:
+            async for chunk in subscription:
+                yield chunk
+        finally:
+            await subscription.aclose()
+
+    def _acquire(
+        self,
+        key: str,
+        upstream_factory: Callable[[], AsyncIterator[Any]],
+        on_complete: Optional[Callable[[List[Any]], Any]],
+        scene: str,
+    ) -> _InflightStream:
+        entry = self._streams.get(key)
+        if entry is not None and not entry.done and entry.loop is asyncio.get_running_loop():
+            self._stats["attached"] += 1
+            if _attach_counter:
+                _attach_counter.inc(scene=scene or "default")
+            logger.info(f"[InflightStream] 复用进行中的上游流: key={key[:50]}, 已缓冲 {len(entry.chunks)} 个chunk")
+            return entry
+
+        entry = _InflightStream(key, scene)
+        self._streams[key] = entry
+        self._stats["upstreams"] += 1
+        if _upstream_counter:
+            _upstream_counter.inc(scene=scene or "default")
+        self._update_gauge()
+        entry.task = entry.loop.create_task(self._pump(entry, upstream_factory, on_complete))
+        return entry
+
+    async def _pump(
+        self,
+        entry: _InflightStream,
+        upstream_factory: Callable[[], AsyncIterator[Any]],
+        on_complete: Optional[Callable[[List[Any]], Any]],
+    ) -> None:
+        """在独立任务中消费上游，订阅方断开不会中断上游"""
+        error = None
+        try:
+            async for chunk in upstream_factory():
+                entry.publish(chunk)
+            if on_complete is not None:
+                try:
+                    result = on_complete(entry.chunks)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.warning(f"[InflightStream] on_complete 执行失败: key={entry.key[:50]}, error={e}")
+        except asyncio.CancelledError as e:
+            error = e
+            raise
+        except Exception as e:
+            logger.error(f"[InflightStream] 上游流异常: key={entry.key[:50]}, error={e}")
+            error = e
+        finally:
+            # 缓存写入后才移出登记表：期间到达的相同请求仍可挂载，之后的请求直接命中缓存
+            if self._streams.get(entry.key) is entry:
+                del self._streams[entry.key]
+            self._update_gauge()
+            entry.finish(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["inflight"] = len(self._streams)
+        return stats
+
+    def _update_gauge(self) -> None:
+        if _inflight_gauge:
+            _inflight_gauge.set(len(self._streams))
+
+
+_registry: Optional[InflightStreamRegistry] = None
+
+
+def get_inflight_registry() -> InflightStreamRegistry:
+    """获取全局进行中流登记表"""
+    global _registry
+    if _registry is None:
+        _registry = InflightStreamRegistry()
+    return _registry
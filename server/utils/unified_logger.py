@@ -24,6 +24,8 @@ from contextlib import contextmanager
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+logger = logging.getLogger(__name__)
+
 
 class LogLevel(Enum):
     """日志级别"""
@@ -120,6 +122,8 @@ class UnifiedLogger:
             'id_card', 'identity',
             'phone', 'mobile', 'tel'
         }
+        # 字段名 -> 是否敏感（字段名集合有限，避免每条日志对每个键重复做子串匹配）
+        self._sensitive_key_cache: Dict[str, bool] = {}
     
     @classmethod
     def get_instance(cls) -> 'UnifiedLogger':
@@ -130,6 +134,16 @@ class UnifiedLogger:
                     cls._instance = cls()
         return cls._instance
     
+    def _is_sensitive_key(self, key: Any) -> bool:
+        key = str(key)
+        cached = self._sensitive_key_cache.get(key)
+        if cached is None:
+            key_lower = key.lower()
+            cached = any(sensitive in key_lower for sensitive in self.sensitive_fields)
+            if len(self._sensitive_key_cache) < 4096:
+                self._sensitive_key_cache[key] = cached
+        return cached
+
     def _mask_sensitive_data(self, data: Any) -> Any:
         """
         脱敏处理敏感数据
@@ -147,10 +161,8 @@ class UnifiedLogger:
         elif isinstance(data, dict):
             result = {}
             for key, value in data.items():
-                key_lower = key.lower()
                 # 检查是否是敏感字段
-                is_sensitive = any(sensitive in key_lower for sensitive in self.sensitive_fields)
-                if is_sensitive:
+                if self._is_sensitive_key(key):
                     result[key] = self._mask_sensitive_data(value)
                 else:
                     result[key] = self._mask_sensitive_data(value) if isinstance(value, (dict, list)) else value
@@ -37,8 +37,8 @@ import bazi_analyzer_pb2_grpc
 import fortune_analysis_pb2_grpc
 
 
-def serve(port: int = 9001):
-    """启动合并的 gRPC 服务器（支持热更新）"""
+def _build_server(port: int, extra_options=None):
+    """创建并绑定合并的 gRPC 服务器（支持热更新），返回 (server, reloader)"""
 
     server_options = [
         ('grpc.keepalive_time_ms', 300000),
@@ -47,7 +47,10 @@ def serve(port: int = 9001):
         ('grpc.http2.max_pings_without_data', 2),
         ('grpc.http2.min_time_between_pings_ms', 60000),
         ('grpc.http2.min_ping_interval_without_data_ms', 300000),
-    ]
+    ] + list(extra_options or [])
+    # 自适应响应压缩（本机/小消息不压缩）
+    from server.utils.grpc_config import get_server_interceptors
+    interceptors = get_server_interceptors()
 
     try:
         from server.hot_reload.microservice_reloader import (
@@ -63,6 +66,7 @@ def serve(port: int = 9001):
             add_servicer_to_server_func=bazi_core_pb2_grpc.add_BaziCoreServiceServicer_to_server,
             port=port,
             server_options=server_options,
+            interceptors=interceptors,
             max_workers=10,
             check_interval=30,
             listen_addr=f"[::]:{port}"
@@ -81,25 +85,16 @@ def serve(port: int = 9001):
 
         register_microservice_reloader("bazi_compute", reloader)
         reloader.start()
-
-        server.start()
-        logger.info(f"✅ Bazi Compute 合并服务已启动（热更新），监听端口: {port}")
-        logger.info(f"   包含: BaziCore + BaziFortune + BaziAnalyzer")
-
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            reloader.stop()
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
+        logger.info(f"✓ Bazi Compute 热更新已启用，包含: BaziCore + BaziFortune + BaziAnalyzer")
+        return server, reloader
 
     except ImportError as e:
         logger.info(f"⚠️ 热更新模块不可用，使用传统模式: {e}")
 
         server = grpc.server(
             futures.ThreadPoolExecutor(max_workers=10),
-            options=server_options
+            options=server_options,
+            interceptors=interceptors
         )
 
         # 注册全部四个 servicer
@@ -110,21 +105,23 @@ def serve(port: int = 9001):
 
         listen_addr = f"[::]:{port}"
         server.add_insecure_port(listen_addr)
+        return server, None
+
 
-        server.start()
-        logger.info(f"✅ Bazi Compute 合并服务已启动（传统模式），监听端口: {port}")
+def serve(port: int = 9001, workers=None):
+    """
+    启动合并的 gRPC 服务器（支持热更新）
 
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
+    workers > 1（或 GRPC_WORKERS）时以多进程模式运行，各进程通过 SO_REUSEPORT 共享端口
+    """
+    from server.utils.grpc_prefork import serve_grpc
+    serve_grpc("bazi_compute", lambda extra_options: _build_server(port, extra_options), port, workers=workers)
 
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="启动 Bazi Compute 合并 gRPC 服务")
     parser.add_argument("--port", type=int, default=9001, help="服务端口（默认: 9001）")
+    parser.add_argument("--workers", default=None, help="工作进程数（auto = CPU 数，默认读取 GRPC_WORKERS，未设置为 1）")
     args = parser.parse_args()
-    serve(args.port)
+    serve(args.port, args.workers)
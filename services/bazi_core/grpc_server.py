@@ -26,6 +26,70 @@ import bazi_core_pb2
 import bazi_core_pb2_grpc
 
 from core.calculators.bazi_core_calculator import BaziCoreCalculator
+from shared.clients.typed_payloads import SCHEMA_VERSION, SchemaMismatch, to_chart, wants_legacy, wants_typed
+
+
+def _fill_legacy_fields(response: bazi_core_pb2.BaziCoreResponse, result: dict) -> None:
+    """填充旧版字段（map<string,string> / JSON 字符串，schema_version = 0 的客户端使用）"""
+    # 基本信息（需要特殊处理 lunar_date，它是字典）
+    if "basic_info" in result:
+        basic_info = result["basic_info"]
+        for key, value in basic_info.items():
+            if key == "lunar_date" and isinstance(value, dict):
+                # lunar_date 是字典，需要序列化为 JSON
+                response.basic_info[key] = json.dumps(value, ensure_ascii=False)
+            else:
+                response.basic_info[key] = str(value)
+    
+    # 四柱信息
+    if "bazi_pillars" in result:
+        pillars = result["bazi_pillars"]
+        for pillar_name, pillar_data in pillars.items():
+            pillar = bazi_core_pb2.Pillar(
+                stem=pillar_data.get("stem", ""),
+                branch=pillar_data.get("branch", "")
+            )
+            if pillar_name == "year":
+                response.year_pillar.CopyFrom(pillar)
+            elif pillar_name == "month":
+                response.month_pillar.CopyFrom(pillar)
+            elif pillar_name == "day":
+                response.day_pillar.CopyFrom(pillar)
+            elif pillar_name == "hour":
+                response.hour_pillar.CopyFrom(pillar)
+    
+    # 四柱详情
+    if "details" in result:
+        for pillar_name, detail_data in result["details"].items():
+            detail = bazi_core_pb2.PillarDetail(
+                main_star=detail_data.get("main_star", ""),
+                nayin=detail_data.get("nayin", ""),
+                kongwang=detail_data.get("kongwang", ""),
+            )
+            if "deities" in detail_data:
+                detail.deities.extend(detail_data["deities"])
+            response.details[pillar_name].CopyFrom(detail)
+    
+    # 十神统计
+    if "ten_gods_stats" in result:
+        for key, value in result["ten_gods_stats"].items():
+            response.ten_gods_stats[key] = str(value)
+    
+    # 五行信息
+    if "elements" in result:
+        for key, value in result["elements"].items():
+            # 使用 json.dumps 而不是 str()，确保格式正确
+            response.elements[key] = json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else str(value)
+    
+    # 五行计数
+    if "element_counts" in result:
+        for key, value in result["element_counts"].items():
+            response.element_counts[key] = int(value)
+    
+    # 关系信息
+    if "relationships" in result:
+        for key, value in result["relationships"].items():
+            response.relationships[key] = str(value)
 
 
 class BaziCoreServicer(bazi_core_pb2_grpc.BaziCoreServiceServicer):
@@ -51,69 +115,19 @@ class BaziCoreServicer(bazi_core_pb2_grpc.BaziCoreServiceServicer):
                 context.set_details("八字排盘失败")
                 return bazi_core_pb2.BaziCoreResponse()
 
-            # 转换结果为 protobuf 格式
+            # 转换结果为 protobuf 格式：新客户端用类型化结构，旧客户端 / 兼容开关保留旧版字段
             response = bazi_core_pb2.BaziCoreResponse()
-            
-            # 基本信息（需要特殊处理 lunar_date，它是字典）
-            if "basic_info" in result:
-                basic_info = result["basic_info"]
-                for key, value in basic_info.items():
-                    if key == "lunar_date" and isinstance(value, dict):
-                        # lunar_date 是字典，需要序列化为 JSON
-                        response.basic_info[key] = json.dumps(value, ensure_ascii=False)
-                    else:
-                        response.basic_info[key] = str(value)
-            
-            # 四柱信息
-            if "bazi_pillars" in result:
-                pillars = result["bazi_pillars"]
-                for pillar_name, pillar_data in pillars.items():
-                    pillar = bazi_core_pb2.Pillar(
-                        stem=pillar_data.get("stem", ""),
-                        branch=pillar_data.get("branch", "")
-                    )
-                    if pillar_name == "year":
-                        response.year_pillar.CopyFrom(pillar)
-                    elif pillar_name == "month":
-                        response.month_pillar.CopyFrom(pillar)
-                    elif pillar_name == "day":
-                        response.day_pillar.CopyFrom(pillar)
-                    elif pillar_name == "hour":
-                        response.hour_pillar.CopyFrom(pillar)
-            
-            # 四柱详情
-            if "details" in result:
-                for pillar_name, detail_data in result["details"].items():
-                    detail = bazi_core_pb2.PillarDetail(
-                        main_star=detail_data.get("main_star", ""),
-                        nayin=detail_data.get("nayin", ""),
-                        kongwang=detail_data.get("kongwang", ""),
-                    )
-                    if "deities" in detail_data:
-                        detail.deities.extend(detail_data["deities"])
-                    response.details[pillar_name].CopyFrom(detail)
-            
-            # 十神统计
-            if "ten_gods_stats" in result:
-                for key, value in result["ten_gods_stats"].items():
-                    response.ten_gods_stats[key] = str(value)
-            
-            # 五行信息
-            if "elements" in result:
-                for key, value in result["elements"].items():
-                    # 使用 json.dumps 而不是 str()，确保格式正确
-                    response.elements[key] = json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else str(value)
-            
-            # 五行计数
-            if "element_counts" in result:
-                for key, value in result["element_counts"].items():
-                    response.element_counts[key] = int(value)
-            
-            # 关系信息
-            if "relationships" in result:
-                for key, value in result["relationships"].items():
-                    response.relationships[key] = str(value)
-            
+            legacy = wants_legacy(request)
+            if wants_typed(request):
+                try:
+                    response.chart.CopyFrom(to_chart(result))
+                    response.schema_version = SCHEMA_VERSION
+                except SchemaMismatch as e:
+                    logger.warning(f"bazi-core-service: 排盘结果与类型化结构不一致，回退旧版字段: {e}")
+                    legacy = True
+            if legacy:
+                _fill_legacy_fields(response, result)
+
             # 元数据（JSON 字符串）
             metadata = {
                 "service": "bazi-core-service",
@@ -137,28 +151,31 @@ class BaziCoreServicer(bazi_core_pb2_grpc.BaziCoreServiceServicer):
         return bazi_core_pb2.HealthCheckResponse(status="ok")
 
 
-def serve(port: int = 9001):
-    """启动 gRPC 服务器（支持热更新）"""
+def _build_server(port: int, extra_options=None):
+    """创建并绑定 gRPC 服务器（支持热更新），返回 (server, reloader)"""
+    # 服务器选项
+    server_options = [
+        ('grpc.keepalive_time_ms', 300000),  # 5分钟
+        ('grpc.keepalive_timeout_ms', 20000),  # 20秒
+        ('grpc.keepalive_permit_without_calls', False),
+        ('grpc.http2.max_pings_without_data', 2),
+        ('grpc.http2.min_time_between_pings_ms', 60000),  # 60秒
+        ('grpc.http2.min_ping_interval_without_data_ms', 300000),  # 5分钟
+    ] + list(extra_options or [])
+    # 自适应响应压缩（本机/小消息不压缩）
+    from server.utils.grpc_config import get_server_interceptors
+    interceptors = get_server_interceptors()
+    # 使用 localhost 避免权限问题（某些环境可能需要）
+    listen_addr = f"localhost:{port}"
+
     try:
         # 尝试使用热更新模式
         from server.hot_reload.microservice_reloader import (
             create_hot_reload_server,
             register_microservice_reloader
         )
-        
-        # 服务器选项
-        server_options = [
-            ('grpc.keepalive_time_ms', 300000),  # 5分钟
-            ('grpc.keepalive_timeout_ms', 20000),  # 20秒
-            ('grpc.keepalive_permit_without_calls', False),
-            ('grpc.http2.max_pings_without_data', 2),
-            ('grpc.http2.min_time_between_pings_ms', 60000),  # 60秒
-            ('grpc.http2.min_ping_interval_without_data_ms', 300000),  # 5分钟
-        ]
-        
+
         # 创建支持热更新的服务器
-        # 使用 localhost 避免权限问题（某些环境可能需要）
-        listen_addr = f"localhost:{port}"
         server, reloader = create_hot_reload_server(
             service_name="bazi_core",
             module_path="services.bazi_core.grpc_server",
@@ -166,65 +183,48 @@ def serve(port: int = 9001):
             add_servicer_to_server_func=bazi_core_pb2_grpc.add_BaziCoreServiceServicer_to_server,
             port=port,
             server_options=server_options,
+            interceptors=interceptors,
             max_workers=20,
             check_interval=30,  # 30秒检查一次
             listen_addr=listen_addr  # 使用 localhost
         )
-        
+
         # 注册热更新器（供主服务查询）
         register_microservice_reloader("bazi_core", reloader)
-        
+
         # 启动热更新监控
         reloader.start()
-        
-        server.start()
-        logger.info(f"✅ Bazi Core gRPC 服务已启动（热更新已启用），监听端口: {port}")
-        
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            reloader.stop()
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
-            
+        logger.info("✓ Bazi Core 热更新已启用")
+        return server, reloader
+
     except ImportError as e:
         # 如果热更新模块不可用，使用传统模式（降级）
         logger.info(f"⚠️ 热更新模块不可用，使用传统模式: {e}")
-        
-        server_options = [
-            ('grpc.keepalive_time_ms', 300000),
-            ('grpc.keepalive_timeout_ms', 20000),
-            ('grpc.keepalive_permit_without_calls', False),
-            ('grpc.http2.max_pings_without_data', 2),
-            ('grpc.http2.min_time_between_pings_ms', 60000),
-            ('grpc.http2.min_ping_interval_without_data_ms', 300000),
-        ]
-        
+
         server = grpc.server(
             futures.ThreadPoolExecutor(max_workers=20),
-            options=server_options
+            options=server_options,
+            interceptors=interceptors
         )
         bazi_core_pb2_grpc.add_BaziCoreServiceServicer_to_server(BaziCoreServicer(), server)
-        
-        listen_addr = f"localhost:{port}"
         server.add_insecure_port(listen_addr)
-        
-        server.start()
-        logger.info(f"✅ Bazi Core gRPC 服务已启动（传统模式），监听端口: {port}")
-        
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
+        return server, None
+
+
+def serve(port: int = 9001, workers=None):
+    """
+    启动 gRPC 服务器（支持热更新）
+
+    workers > 1（或 GRPC_WORKERS）时以多进程模式运行，各进程通过 SO_REUSEPORT 共享端口
+    """
+    from server.utils.grpc_prefork import serve_grpc
+    serve_grpc("bazi_core", lambda extra_options: _build_server(port, extra_options), port, workers=workers)
 
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="启动 Bazi Core gRPC 服务")
     parser.add_argument("--port", type=int, default=9001, help="服务端口（默认: 9001）")
+    parser.add_argument("--workers", default=None, help="工作进程数（auto = CPU 数，默认读取 GRPC_WORKERS，未设置为 1）")
     args = parser.parse_args()
-    serve(args.port)
-
+    serve(args.port, args.workers)
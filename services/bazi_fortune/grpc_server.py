@@ -27,6 +27,9 @@ import bazi_fortune_pb2
 import bazi_fortune_pb2_grpc
 
 from core.calculators.helpers import compute_local_detail
+from shared.clients.typed_payloads import (
+    SCHEMA_VERSION, SchemaMismatch, to_fortune_detail, wants_legacy, wants_typed,
+)
 
 
 class BaziFortuneServicer(bazi_fortune_pb2_grpc.BaziFortuneServiceServicer):
@@ -56,8 +59,18 @@ class BaziFortuneServicer(bazi_fortune_pb2_grpc.BaziFortuneServiceServicer):
                 current_time=current_time,
             )
 
+            # 新客户端用类型化结构，旧客户端 / 兼容开关保留 detail_json
             response = bazi_fortune_pb2.BaziFortuneResponse()
-            response.detail_json = json.dumps(detail, ensure_ascii=False)
+            legacy = wants_legacy(request)
+            if wants_typed(request):
+                try:
+                    response.detail.CopyFrom(to_fortune_detail(detail))
+                    response.schema_version = SCHEMA_VERSION
+                except SchemaMismatch as e:
+                    logger.warning(f"bazi-fortune-service: 详情与类型化结构不一致，回退 detail_json: {e}")
+                    legacy = True
+            if legacy:
+                response.detail_json = json.dumps(detail, ensure_ascii=False)
             
             metadata = {
                 "service": "bazi-fortune-service",
@@ -86,23 +99,27 @@ class BaziFortuneServicer(bazi_fortune_pb2_grpc.BaziFortuneServiceServicer):
         return bazi_fortune_pb2.HealthCheckResponse(status="ok")
 
 
-def serve(port: int = 9002):
-    """启动 gRPC 服务器（支持热更新）"""
+def _build_server(port: int, extra_options=None):
+    """创建并绑定 gRPC 服务器（支持热更新），返回 (server, reloader)"""
+    server_options = [
+        ('grpc.keepalive_time_ms', 300000),
+        ('grpc.keepalive_timeout_ms', 20000),
+        ('grpc.keepalive_permit_without_calls', False),
+        ('grpc.http2.max_pings_without_data', 2),
+        ('grpc.http2.min_time_between_pings_ms', 60000),
+        ('grpc.http2.min_ping_interval_without_data_ms', 300000),
+    ] + list(extra_options or [])
+    # 自适应响应压缩（本机/小消息不压缩）
+    from server.utils.grpc_config import get_server_interceptors
+    interceptors = get_server_interceptors()
+
     try:
         from server.hot_reload.microservice_reloader import (
             create_hot_reload_server,
             register_microservice_reloader
         )
-        
-        server_options = [
-            ('grpc.keepalive_time_ms', 300000),
-            ('grpc.keepalive_timeout_ms', 20000),
-            ('grpc.keepalive_permit_without_calls', False),
-            ('grpc.http2.max_pings_without_data', 2),
-            ('grpc.http2.min_time_between_pings_ms', 60000),
-            ('grpc.http2.min_ping_interval_without_data_ms', 300000),
-        ]
-        
+
+        # create_hot_reload_server 已经绑定了端口，不需要再次绑定
         server, reloader = create_hot_reload_server(
             service_name="bazi_fortune",
             module_path="services.bazi_fortune.grpc_server",
@@ -110,60 +127,45 @@ def serve(port: int = 9002):
             add_servicer_to_server_func=bazi_fortune_pb2_grpc.add_BaziFortuneServiceServicer_to_server,
             port=port,
             server_options=server_options,
+            interceptors=interceptors,
             max_workers=20,
             check_interval=30
         )
-        
+
         register_microservice_reloader("bazi_fortune", reloader)
         reloader.start()
-        
-        # create_hot_reload_server 已经绑定了端口，不需要再次绑定
-        server.start()
-        logger.info(f"✅ Bazi Fortune gRPC 服务已启动（热更新已启用），监听端口: {port}")
-        
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            reloader.stop()
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
-            
+        logger.info("✓ Bazi Fortune 热更新已启用")
+        return server, reloader
+
     except ImportError:
         # 降级到传统模式
-        server_options = [
-            ('grpc.keepalive_time_ms', 300000),
-            ('grpc.keepalive_timeout_ms', 20000),
-            ('grpc.keepalive_permit_without_calls', False),
-            ('grpc.http2.max_pings_without_data', 2),
-            ('grpc.http2.min_time_between_pings_ms', 60000),
-            ('grpc.http2.min_ping_interval_without_data_ms', 300000),
-        ]
-        
+        logger.info("⚠️ 热更新模块不可用，使用传统模式")
         server = grpc.server(
             futures.ThreadPoolExecutor(max_workers=20),
-            options=server_options
+            options=server_options,
+            interceptors=interceptors
         )
         bazi_fortune_pb2_grpc.add_BaziFortuneServiceServicer_to_server(BaziFortuneServicer(), server)
-        
+
         listen_addr = f"[::]:{port}"
         server.add_insecure_port(listen_addr)
-        
-        server.start()
-        logger.info(f"✅ Bazi Fortune gRPC 服务已启动（传统模式），监听端口: {port}")
-        
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
+        return server, None
+
+
+def serve(port: int = 9002, workers=None):
+    """
+    启动 gRPC 服务器（支持热更新）
+
+    workers > 1（或 GRPC_WORKERS）时以多进程模式运行，各进程通过 SO_REUSEPORT 共享端口
+    """
+    from server.utils.grpc_prefork import serve_grpc
+    serve_grpc("bazi_fortune", lambda extra_options: _build_server(port, extra_options), port, workers=workers)
 
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="启动 Bazi Fortune gRPC 服务")
     parser.add_argument("--port", type=int, default=9002, help="服务端口（默认: 9002）")
+    parser.add_argument("--workers", default=None, help="工作进程数（auto = CPU 数，默认读取 GRPC_WORKERS，未设置为 1）")
     args = parser.parse_args()
-    serve(args.port)
-
+    serve(args.port, args.workers)
@@ -26,17 +26,33 @@ import bazi_rule_pb2
 import bazi_rule_pb2_grpc
 
 from core.calculators.BaziCalculator import BaziCalculator
+from shared.clients.typed_payloads import SCHEMA_VERSION, to_matched_rule, wants_legacy, wants_typed
+from server.utils.log_budget import current_log_stats, get_hot_logger, lazy, log_budget_scope
+
+hot_logger = get_hot_logger(__name__)
+
+
+def _response_size_summary(response: bazi_rule_pb2.BaziRuleMatchResponse) -> str:
+    """响应各部分大小（逐条 ByteSize 只在日志确实输出时计算）"""
+    matched_size = len(response.matched_json.encode('utf-8')) + sum(m.ByteSize() for m in response.matched)
+    unmatched_size = 0  # 不再返回 unmatched 数据
+    context_size = len(response.context_json.encode('utf-8'))
+    total_size = matched_size + unmatched_size + context_size
+    return (f"matched={matched_size/1024/1024:.2f}MB, unmatched={unmatched_size/1024/1024:.2f}MB, "
+            f"context={context_size/1024/1024:.2f}MB, 总计={total_size/1024/1024:.2f}MB")
 
 
 class BaziRuleServicer(bazi_rule_pb2_grpc.BaziRuleServiceServicer):
     """实现 BaziRuleService 的 gRPC 服务"""
 
+    @log_budget_scope()
     def MatchRules(self, request: bazi_rule_pb2.BaziRuleMatchRequest, context: grpc.ServicerContext) -> bazi_rule_pb2.BaziRuleMatchResponse:
         """匹配规则"""
         import datetime
         request_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         rule_types_str = ", ".join(request.rule_types) if request.rule_types else "全部"
-        logger.info(f"[{request_time}] 📥 bazi-rule-service: 收到请求 - solar_date={request.solar_date}, solar_time={request.solar_time}, gender={request.gender}, rule_types=[{rule_types_str}], use_cache={request.use_cache}")
+        hot_logger.info("[%s] 📥 bazi-rule-service: 收到请求 - solar_date=%s, solar_time=%s, gender=%s, rule_types=[%s], use_cache=%s",
+                        request_time, request.solar_date, request.solar_time, request.gender, rule_types_str, request.use_cache)
         
         try:
             import time
@@ -81,7 +97,8 @@ class BaziRuleServicer(bazi_rule_pb2_grpc.BaziRuleServiceServicer):
             unmatched = [r for r in all_rules if (r.get('rule_id') or r.get('rule_code')) not in matched_rule_ids]
             
             match_time = time.time() - match_start
-            logger.info(f"[{request_time}] ✅ bazi-rule-service: 规则匹配完成 - 匹配 {len(matched)} 条，未匹配 {len(unmatched)} 条（耗时 {match_time:.2f}秒，构建 {build_time:.2f}秒，缓存={use_cache_optimized}）")
+            hot_logger.info("[%s] ✅ bazi-rule-service: 规则匹配完成 - 匹配 %d 条，未匹配 %d 条（耗时 %.2f秒，构建 %.2f秒，缓存=%s）",
+                            request_time, len(matched), len(unmatched), match_time, build_time, use_cache_optimized)
 
             # 将对象转换为可序列化的 dict（优化：只序列化必要字段，减少数据量）
             matched_serializable = []
@@ -120,23 +137,24 @@ class BaziRuleServicer(bazi_rule_pb2_grpc.BaziRuleServiceServicer):
             
             # 序列化前记录时间
             serialize_start = datetime.datetime.now()
-            matched_json_str = json.dumps(matched_serializable, ensure_ascii=False, default=str)
-            # unmatched_json_str 不再需要，因为只返回 count
+            # context 是各规则的自由结构条件值，保持 JSON
             context_json_str = json.dumps(context_optimized, ensure_ascii=False, default=str)
+            response.context_json = context_json_str
+            # 新客户端用类型化结构（结构不符的规则单条退回 JSON），旧客户端 / 兼容开关保留 matched_json
+            if wants_typed(request):
+                dumps = lambda value: json.dumps(value, ensure_ascii=False, default=str)
+                response.matched.extend(to_matched_rule(rule, dumps) for rule in matched_serializable)
+                response.unmatched_count = unmatched_count
+                response.schema_version = SCHEMA_VERSION
+            matched_json_str = ""
+            if wants_legacy(request):
+                matched_json_str = json.dumps(matched_serializable, ensure_ascii=False, default=str)
+                response.matched_json = matched_json_str
+                # 只返回 unmatched 数量，不返回完整数据
+                response.unmatched_json = json.dumps({'count': unmatched_count}, ensure_ascii=False)
             serialize_end = datetime.datetime.now()
             serialize_time = (serialize_end - serialize_start).total_seconds()
             
-            # 记录响应数据大小
-            matched_size = len(matched_json_str.encode('utf-8'))
-            unmatched_size = 0  # 不再返回 unmatched 数据
-            context_size = len(context_json_str.encode('utf-8'))
-            total_size = matched_size + unmatched_size + context_size
-            
-            response.matched_json = matched_json_str
-            # 只返回 unmatched 数量，不返回完整数据
-            response.unmatched_json = json.dumps({'count': unmatched_count}, ensure_ascii=False)
-            response.context_json = context_json_str
-            
             metadata = {
                 "service": "bazi-rule-service",
                 "version": "1.0.0",
@@ -144,12 +162,10 @@ class BaziRuleServicer(bazi_rule_pb2_grpc.BaziRuleServiceServicer):
             response.metadata_json = json.dumps(metadata, ensure_ascii=False)
             
             total_time = time.time() - total_start
-            logger.info(f"[{request_time}] ✅ bazi-rule-service: 响应已返回（总耗时 {total_time:.2f}秒，计算 {calc_time:.2f}秒，匹配 {match_time:.2f}秒，序列化 {serialize_time:.2f}秒，响应大小: matched={matched_size/1024/1024:.2f}MB, unmatched={unmatched_size/1024/1024:.2f}MB, context={context_size/1024/1024:.2f}MB, 总计={total_size/1024/1024:.2f}MB）")
-            
-            # 强制刷新输出，确保日志及时写入
-            import sys
-            sys.stdout.flush()
-            sys.stderr.flush()
+            # 响应大小只在日志输出时统计；日志经队列异步写出，不再逐次 flush
+            hot_logger.info("[%s] ✅ bazi-rule-service: 响应已返回（总耗时 %.2f秒，计算 %.2f秒，匹配 %.2f秒，序列化 %.2f秒，响应大小: %s，日志: %s）",
+                            request_time, total_time, calc_time, match_time, serialize_time,
+                            lazy(_response_size_summary, response), lazy(lambda: current_log_stats().summary()))
             
             return response
             
@@ -171,26 +187,30 @@ class BaziRuleServicer(bazi_rule_pb2_grpc.BaziRuleServiceServicer):
         return bazi_rule_pb2.HealthCheckResponse(status="ok")
 
 
-def serve(port: int = 9004):
-    """启动 gRPC 服务器（支持热更新）"""
+def _build_server(port: int, extra_options=None):
+    """创建并绑定 gRPC 服务器（支持热更新），返回 (server, reloader)"""
+    server_options = [
+        ('grpc.keepalive_time_ms', 300000),
+        ('grpc.keepalive_timeout_ms', 20000),
+        ('grpc.keepalive_permit_without_calls', False),
+        ('grpc.http2.max_pings_without_data', 2),
+        ('grpc.http2.min_time_between_pings_ms', 60000),
+        ('grpc.http2.min_ping_interval_without_data_ms', 300000),
+        # 增加消息大小限制（默认4MB，增加到50MB以支持大量规则）
+        ('grpc.max_send_message_length', 50 * 1024 * 1024),  # 50MB
+        ('grpc.max_receive_message_length', 50 * 1024 * 1024),  # 50MB
+    ] + list(extra_options or [])
+    # 自适应响应压缩（本机/小消息不压缩）
+    from server.utils.grpc_config import get_server_interceptors
+    interceptors = get_server_interceptors()
+
     try:
         from server.hot_reload.microservice_reloader import (
             create_hot_reload_server,
             register_microservice_reloader
         )
-        
-        server_options = [
-            ('grpc.keepalive_time_ms', 300000),
-            ('grpc.keepalive_timeout_ms', 20000),
-            ('grpc.keepalive_permit_without_calls', False),
-            ('grpc.http2.max_pings_without_data', 2),
-            ('grpc.http2.min_time_between_pings_ms', 60000),
-            ('grpc.http2.min_ping_interval_without_data_ms', 300000),
-            # 增加消息大小限制（默认4MB，增加到50MB以支持大量规则）
-            ('grpc.max_send_message_length', 50 * 1024 * 1024),  # 50MB
-            ('grpc.max_receive_message_length', 50 * 1024 * 1024),  # 50MB
-        ]
-        
+
+        # create_hot_reload_server 已经绑定了端口，不需要再次绑定
         server, reloader = create_hot_reload_server(
             service_name="bazi_rule",
             module_path="services.bazi_rule.grpc_server",
@@ -198,62 +218,45 @@ def serve(port: int = 9004):
             add_servicer_to_server_func=bazi_rule_pb2_grpc.add_BaziRuleServiceServicer_to_server,
             port=port,
             server_options=server_options,
+            interceptors=interceptors,
             max_workers=20,
             check_interval=30
         )
-        
+
         register_microservice_reloader("bazi_rule", reloader)
         reloader.start()
-        
-        # create_hot_reload_server 已经绑定了端口，不需要再次绑定
-        server.start()
-        logger.info(f"✅ Bazi Rule gRPC 服务已启动（热更新已启用），监听端口: {port}")
-        
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            reloader.stop()
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
-            
+        logger.info("✓ Bazi Rule 热更新已启用")
+        return server, reloader
+
     except ImportError:
         # 降级到传统模式
-        server_options = [
-            ('grpc.keepalive_time_ms', 300000),
-            ('grpc.keepalive_timeout_ms', 20000),
-            ('grpc.keepalive_permit_without_calls', False),
-            ('grpc.http2.max_pings_without_data', 2),
-            ('grpc.http2.min_time_between_pings_ms', 60000),
-            ('grpc.http2.min_ping_interval_without_data_ms', 300000),
-            ('grpc.max_send_message_length', 50 * 1024 * 1024),
-            ('grpc.max_receive_message_length', 50 * 1024 * 1024),
-        ]
-        
+        logger.info("⚠️ 热更新模块不可用，使用传统模式")
         server = grpc.server(
             futures.ThreadPoolExecutor(max_workers=20),
-            options=server_options
+            options=server_options,
+            interceptors=interceptors
         )
         bazi_rule_pb2_grpc.add_BaziRuleServiceServicer_to_server(BaziRuleServicer(), server)
-        
+
         listen_addr = f"[::]:{port}"
         server.add_insecure_port(listen_addr)
-        
-        server.start()
-        logger.info(f"✅ Bazi Rule gRPC 服务已启动（传统模式），监听端口: {port}")
-        
-        try:
-            server.wait_for_termination()
-        except KeyboardInterrupt:
-            logger.info("\n>>> 正在停止服务...")
-            server.stop(grace=5)
-            logger.info("✅ 服务已停止")
+        return server, None
+
+
+def serve(port: int = 9004, workers=None):
+    """
+    启动 gRPC 服务器（支持热更新）
+
+    workers > 1（或 GRPC_WORKERS）时以多进程模式运行，各进程通过 SO_REUSEPORT 共享端口
+    """
+    from server.utils.grpc_prefork import serve_grpc
+    serve_grpc("bazi_rule", lambda extra_options: _build_server(port, extra_options), port, workers=workers)
 
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="启动 Bazi Rule gRPC 服务")
     parser.add_argument("--port", type=int, default=9004, help="服务端口（默认: 9004）")
+    parser.add_argument("--workers", default=None, help="工作进程数（auto = CPU 数，默认读取 GRPC_WORKERS，未设置为 1）")
     args = parser.parse_args()
-    serve(args.port)
-
+    serve(args.port, args.workers)
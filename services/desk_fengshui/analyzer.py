@@ -118,6 +118,8 @@ class DeskFengshuiAnalyzer:
             img_shape = detection_result.get('image_shape')
 
             logger.info(f"检测到 {len(items)} 个物品（耗时: {stages_time['detection']:.2f}秒，来源: {'qwen_vl' if use_vision else 'yolo'}）")
+            if detection_result.get('timings'):
+                logger.info(f"YOLO分阶段耗时: {detection_result['timings']}")
 
             # 2. 计算位置
             # VisionAnalyzer 的 items 已由 _convert_items 填充 position，无需再计算
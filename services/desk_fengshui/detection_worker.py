@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+YOLO 批量检测工作线程
+
+- 解码：根据图像头部尺寸选择 cv2.IMREAD_REDUCED_COLOR_{2,4,8}，手机大图不再全尺寸解码
+- 预处理：一次性 letterbox 到模型输入尺寸（YOLO 内部不再二次缩放）
+- 推理：并发请求在短时间窗口内合并为一次 YOLO 批量调用
+- 统计：每个请求返回 decode / preprocess / queue / infer / postprocess 分阶段耗时
+"""
+
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 配置（环境变量可覆盖）
+YOLO_BATCHING_ENABLED = os.getenv("DESK_YOLO_BATCHING", "true").lower() == "true"
+YOLO_INPUT_SIZE = int(os.getenv("DESK_YOLO_IMGSZ", "640"))
+YOLO_BATCH_WINDOW_MS = float(os.getenv("DESK_YOLO_BATCH_WINDOW_MS", "10"))
+YOLO_MAX_BATCH = int(os.getenv("DESK_YOLO_MAX_BATCH", "8"))
+YOLO_INFER_TIMEOUT = float(os.getenv("DESK_YOLO_INFER_TIMEOUT", "25"))
+
+# 缩小解码倍数（从大到小尝试）
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+_LETTERBOX_COLOR = (114, 114, 114)
+
+try:
+    from server.observability.metrics_collector import get_metrics
+    _stage_histogram = get_metrics().histogram(
+        "desk_yolo_stage_seconds", "办公桌YOLO检测分阶段耗时", ["stage"]
+    )
+    _batch_histogram = get_metrics().histogram("desk_yolo_batch_size", "办公桌YOLO批量大小")
+except ImportError:
+    _stage_histogram = None
+    _batch_histogram = None
+
+
+@dataclass
+class PreparedImage:
+    """解码并 letterbox 后的图像"""
+    tensor: np.ndarray                 # letterbox 后的 BGR 图像 (S, S, 3)
+    orig_shape: Tuple[int, int, int]   # 原图尺寸 (h, w, c)，bbox 映射回该坐标系
+    scale: float                       # 解码图 -> letterbox 的缩放比例
+    pad: Tuple[float, float]           # letterbox 左/上 填充
+    decode_factor: Tuple[float, float] # 原图 / 解码图 的 (x, y) 比例
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def to_original(self, bbox: List[float]) -> List[float]:
+        """把 letterbox 坐标系下的 [x1, y1, x2, y2] 映射回原图坐标"""
+        pad_x, pad_y = self.pad
+        fx, fy = self.decode_factor
+        h, w = self.orig_shape[:2]
+        x1 = min(max((bbox[0] - pad_x) / self.scale * fx, 0.0), w)
+        y1 = min(max((bbox[1] - pad_y) / self.scale * fy, 0.0), h)
+        x2 = min(max((bbox[2] - pad_x) / self.scale * fx, 0.0), w)
+        y2 = min(max((bbox[3] - pad_y) / self.scale * fy, 0.0), h)
+        return [x1, y1, x2, y2]
+
+
+def _read_image_size(image_bytes: bytes) -> Optional[Tuple[int, int]]:
+    """只读图像头部获取 (w, h)，失败返回 None"""
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(image_bytes)) as im:
+            return im.size
+    except Exception:
+        return None
+
+
+def decode_reduced(image_bytes: bytes, min_side: int = YOLO_INPUT_SIZE) -> Tuple[Optional[np.ndarray], Tuple[int, int, int]]:
+    """
+    按模型输入尺寸缩小解码
+
+    Returns:
+        (解码图像, 原图尺寸 (h, w, 3))；解码失败时图像为 None
+    """
+    img_array = np.frombuffer(image_bytes, dtype=np.uint8)
+    size = _read_image_size(image_bytes)
+    flag, factor = cv2.IMREAD_COLOR, 1
+    if size:
+        long_side = max(size)
+        for f, reduced_flag in _REDUCED_FLAGS:
+            if long_side / f >= min_side:
+                flag, factor = reduced_flag, f
+                break
+
+    img = cv2.imdecode(img_array, flag)
+    if img is None:
+        return None, (0, 0, 3)
+
+    dec_h, dec_w = img.shape[:2]
+    if size and factor > 1:
+        w, h = size
+        # 解码时会按 EXIF 方向旋转，头部尺寸需要对应交换
+        if (dec_w > dec_h) != (w > h):
+            w, h = h, w
+        return img, (h, w, 3)
+    return img, (dec_h, dec_w, 3)
+
+
+def letterbox(img: np.ndarray, size: int = YOLO_INPUT_SIZE) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """等比缩放并填充到 size×size，返回 (图像, 缩放比例, (左填充, 上填充))"""
+    h, w = img.shape[:2]
+    scale = min(size / h, size / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    if (new_w, new_h) != (w, h):
+        interp = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        img = cv2.resize(img, (new_w, new_h), interpolation=interp)
+    pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=_LETTERBOX_COLOR)
+    return img, scale, (left, top)
+
+
+def prepare_image(image_bytes: bytes, size: int = YOLO_INPUT_SIZE) -> Optional[PreparedImage]:
+    """解码 + letterbox，失败返回 None"""
+    start = time.perf_counter()
+    img, orig_shape = decode_reduced(image_bytes, size)
+    decode_ms = (time.perf_counter() - start) * 1000
+    if img is None:
+        return None
+
+    start = time.perf_counter()
+    dec_h, dec_w = img.shape[:2]
+    tensor, scale, pad = letterbox(img, size)
+    preprocess_ms = (time.perf_counter() - start) * 1000
+
+    return PreparedImage(
+        tensor=tensor,
+        orig_shape=orig_shape,
+        scale=scale,
+        pad=pad,
+        decode_factor=(orig_shape[1] / dec_w, orig_shape[0] / dec_h),
+        timings={"decode_ms": round(decode_ms, 2), "preprocess_ms": round(preprocess_ms, 2)},
+    )
+
+
+@dataclass
+class _InferJob:
+    tensor: np.ndarray
+    future: Future
+    enqueued_at: float
+
+
+class BatchedDetectionWorker:
+    """
+    批量推理工作线程
+
+    调用方线程负责解码/预处理/后处理，只有推理在工作线程内按批执行：
+        worker = BatchedDetectionWorker(lambda batch: model(batch, imgsz=640, verbose=False))
+        result, info = worker.infer(prepared.tensor)
+    """
+
+    def __init__(
+        self,
+        infer_fn: Callable[[List[np.ndarray]], List[Any]],
+        max_batch: int = YOLO_MAX_BATCH,
+        window_ms: float = YOLO_BATCH_WINDOW_MS,
+        name: str = "desk_yolo",
+    ):
+        self._infer_fn = infer_fn
+        self.max_batch = max(1, max_batch)
+        self.window = max(0.0, window_ms) / 1000
+        self._queue: "queue.Queue[_InferJob]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"{name}_batcher", daemon=True)
+        self._thread.start()
+
+    def infer(self, tensor: np.ndarray, timeout: float = YOLO_INFER_TIMEOUT) -> Tuple[Any, Dict[str, float]]:
+        """提交一张预处理后的图像，阻塞等待该图像的推理结果"""
+        future: Future = Future()
+        self._queue.put(_InferJob(tensor=tensor, future=future, enqueued_at=time.perf_counter()))
+        return future.result(timeout=timeout)
+
+    def _collect_batch(self) -> List[_InferJob]:
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            start = time.perf_counter()
+            try:
+                results = self._infer_fn([job.tensor for job in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"批量推理结果数量不匹配: {len(results)} != {len(batch)}")
+            except Exception as e:
+                logger.error(f"YOLO批量推理失败 (batch={len(batch)}): {e}", exc_info=True)
+                for job in batch:
+                    job.future.set_exception(e)
+                continue
+
+            infer_ms = (time.perf_counter() - start) * 1000
+            if _batch_histogram:
+                _batch_histogram.observe(len(batch))
+            for job, result in zip(batch, results):
+                info = {
+                    "queue_ms": round((start - job.enqueued_at) * 1000, 2),
+                    "infer_ms": round(infer_ms, 2),
+                    "batch_size": len(batch),
+                }
+                job.future.set_result((result, info))
+
+
+def observe_stage_timings(timings: Dict[str, float]) -> None:
+    """导出分阶段耗时到 MetricsCollector"""
+    if not _stage_histogram:
+        return
+    for key, value in timings.items():
+        if key.endswith("_ms"):
+            _stage_histogram.observe(value / 1000, stage=key[:-3])
+
+
+# 每个模型一个工作线程（与 item_detector 的模型缓存对应）
+_workers: Dict[str, BatchedDetectionWorker] = {}
+_workers_lock = threading.Lock()
+
+
+def get_detection_worker(model_key: str, model: Any) -> BatchedDetectionWorker:
+    """获取（或创建）指定模型的批量检测工作线程"""
+    with _workers_lock:
+        worker = _workers.get(model_key)
+        if worker is None:
+            worker = BatchedDetectionWorker(
+                lambda batch: model(batch, imgsz=YOLO_INPUT_SIZE, verbose=False)
+            )
+            _workers[model_key] = worker
+            logger.info(
+                f"✅ YOLO批量检测工作线程已启动: model={model_key}, "
+                f"max_batch={worker.max_batch}, window={YOLO_BATCH_WINDOW_MS}ms"
+            )
+        return worker
@@ -9,6 +9,15 @@ import numpy as np
 from typing import List, Dict, Tuple, Optional
 import logging
 import threading
+import time
+
+from detection_worker import (
+    YOLO_BATCHING_ENABLED,
+    get_detection_worker,
+    observe_stage_timings,
+    prepare_image,
+)
+from shared.utils.image_result_cache import ImageResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +25,9 @@ logger = logging.getLogger(__name__)
 _model_cache = {}
 _model_lock = threading.Lock()
 
+# 检测结果缓存（同一张图重复上传时跳过推理；检测框为像素坐标，不启用感知哈希）
+_result_cache = ImageResultCache("desk_yolo", use_perceptual=False)
+
 
 class DeskItemDetector:
     """办公桌物品检测器（支持模型缓存）"""
@@ -88,10 +100,15 @@ class DeskItemDetector:
                     logger.error(f"❌ YOLO模型加载失败: {e}")
                     self.model = None
                     _model_cache[model_path] = None
+        
+        # 批量检测工作线程（缩小解码 + letterbox + 并发请求合批推理）
+        self.worker = None
+        if self.model is not None and YOLO_BATCHING_ENABLED:
+            self.worker = get_detection_worker(model_path, self.model)
     
     def detect(self, image_bytes: bytes) -> Dict:
         """
-        检测办公桌物品
+        检测办公桌物品（按图片内容缓存检测结果）
         
         Args:
             image_bytes: 图像字节数据
@@ -99,19 +116,44 @@ class DeskItemDetector:
         Returns:
             检测结果字典
         """
+        return _result_cache.get_or_compute(
+            image_bytes,
+            lambda: self._detect_uncached(image_bytes),
+            params={'model': self.model_path, 'conf': self.confidence_threshold, 'backup': self.model is None}
+        )
+    
+    def _detect_uncached(self, image_bytes: bytes) -> Dict:
+        """执行物品检测（不经过缓存）"""
         try:
-            # 1. 解码图像
-            img = self._decode_image(image_bytes)
-            if img is None:
-                return {'success': False, 'error': '图像解码失败'}
+            timings = {}
             
-            # 2. 执行检测
-            if self.model is not None:
-                items = self._detect_with_yolo(img)
+            # 1-2. 解码图像并执行检测
+            if self.worker is not None:
+                prepared = prepare_image(image_bytes)
+                if prepared is None:
+                    return {'success': False, 'error': '图像解码失败'}
+                img_shape = prepared.orig_shape
+                timings.update(prepared.timings)
+                
+                result, infer_info = self.worker.infer(prepared.tensor)
+                timings.update(infer_info)
+                
+                postprocess_start = time.perf_counter()
+                items = self._parse_yolo_result(result, prepared.to_original)
+                timings['postprocess_ms'] = round((time.perf_counter() - postprocess_start) * 1000, 2)
+                observe_stage_timings(timings)
             else:
-                logger.warning("⚠️ YOLO模型未安装，使用备用方案（准确率较低）")
-                logger.warning("   建议执行: ./scripts/install_yolo.sh")
-                items = self._detect_with_opencv(img)
+                img = self._decode_image(image_bytes)
+                if img is None:
+                    return {'success': False, 'error': '图像解码失败'}
+                img_shape = img.shape
+                
+                if self.model is not None:
+                    items = self._detect_with_yolo(img)
+                else:
+                    logger.warning("⚠️ YOLO模型未安装，使用备用方案（准确率较低）")
+                    logger.warning("   建议执行: ./scripts/install_yolo.sh")
+                    items = self._detect_with_opencv(img)
             
             # 3. 过滤相关物品（大幅放宽条件，尽量保留所有检测到的物品）
             # 允许的物品类别（COCO数据集中的常见办公桌物品）
@@ -197,10 +239,11 @@ class DeskItemDetector:
             return {
                 'success': True,
                 'items': filtered_items,
-                'image_shape': img.shape,
+                'image_shape': img_shape,
                 'total_detected': len(items),
                 'using_backup': self.model is None,  # 标记是否使用备用方案
-                'warning': warning_msg  # 只有真正检测失败时才返回警告
+                'warning': warning_msg,  # 只有真正检测失败时才返回警告
+                'timings': timings  # 分阶段耗时（批量检测模式）
             }
             
         except Exception as e:
@@ -227,25 +270,7 @@ class DeskItemDetector:
             
             # 解析结果
             for result in results:
-                for box in result.boxes:
-                    class_id = int(box.cls[0])
-                    class_name = result.names[class_id]
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].cpu().numpy().tolist()  # [x1, y1, x2, y2]
-                    
-                    if confidence >= self.confidence_threshold:
-                        # 特殊处理：laptop需要更高的置信度（因为容易误识别显示器为laptop）
-                        if class_name == 'laptop' and confidence < 0.4:
-                            continue
-                        
-                        label = self.ITEM_MAP.get(class_name, class_name)
-                        
-                        items.append({
-                            'name': class_name,
-                            'label': label,
-                            'confidence': round(confidence, 2),
-                            'bbox': bbox
-                        })
+                items.extend(self._parse_yolo_result(result))
             
             logger.debug(f"YOLO检测到 {len(items)} 个物品")
             
@@ -254,6 +279,38 @@ class DeskItemDetector:
         
         return items
     
+    def _parse_yolo_result(self, result, bbox_transform=None) -> List[Dict]:
+        """
+        解析单张图像的YOLO结果
+        
+        Args:
+            result: ultralytics 单张图像的 Results
+            bbox_transform: 可选的坐标变换（letterbox 坐标 -> 原图坐标）
+        """
+        items = []
+        for box in result.boxes:
+            class_id = int(box.cls[0])
+            class_name = result.names[class_id]
+            confidence = float(box.conf[0])
+            
+            if confidence < self.confidence_threshold:
+                continue
+            # 特殊处理：laptop需要更高的置信度（因为容易误识别显示器为laptop）
+            if class_name == 'laptop' and confidence < 0.4:
+                continue
+            
+            bbox = box.xyxy[0].cpu().numpy().tolist()  # [x1, y1, x2, y2]
+            if bbox_transform is not None:
+                bbox = bbox_transform(bbox)
+            
+            items.append({
+                'name': class_name,
+                'label': self.ITEM_MAP.get(class_name, class_name),
+                'confidence': round(confidence, 2),
+                'bbox': bbox
+            })
+        return items
+    
     def _detect_with_opencv(self, img: np.ndarray) -> List[Dict]:
         """
         使用OpenCV备用检测方案（简化版）
@@ -9,7 +9,9 @@ import os
 import json
 import logging
 import hashlib
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Optional, Mapping, Tuple
 
 # 添加项目根目录到路径
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -26,6 +28,85 @@ except ImportError:
     get_redis_client = None
 
 
+# 规则类型分组（匹配时使用）
+BASIC_RULE_TYPES = frozenset({
+    'position', 'basic', 'taboo', 'wealth', 'career', 'love', 'protection',
+    'health', 'study', 'relationship', 'general'
+})
+MOVE_RULE_TYPES = frozenset({
+    'position', 'wealth', 'career', 'love', 'protection', 'health', 'study', 'relationship'
+})
+ADDITION_RULE_TYPES = MOVE_RULE_TYPES | {'element', 'general'}
+GENERIC_ADDITION_RULE_TYPES = MOVE_RULE_TYPES | {'general'}
+HIGHLIGHT_RULE_TYPES = frozenset({'wealth', 'career', 'love', 'protection'})
+# 位置类规则（不是物品，不生成增加建议）
+NON_ITEM_RULE_NAMES = frozenset({'left_items', 'right_items', 'front_area', 'back_area', 'desk', 'computer'})
+
+_SUGGESTION_EMOJIS = ('💰', '📈', '💕', '🛡️', '🏥', '📚', '🤝', '💡', '✅', '⭐', '🌟')
+_RULE_TYPE_EMOJI = {
+    'wealth': '💰',
+    'career': '📈',
+    'love': '💕',
+    'protection': '🛡️',
+    'health': '🏥',
+    'study': '📚',
+    'relationship': '🤝',
+    'general': '💡'
+}
+_RULE_TYPE_DEFAULT_POSITION = {
+    'wealth': '左侧（青龙位）或前方',
+    'career': '左侧（青龙位）',
+    'love': '前方（朱雀位）',
+}
+
+
+@dataclass(frozen=True)
+class PreparedRule:
+    """预解析、预解码的规则（加载时生成一次，匹配时只读）"""
+    rule_type: str
+    item_name: str
+    item_label: str
+    reason: str
+    suggestion: str
+    priority: str                   # 'high' / 'medium'（按原始优先级 >= 90 划分）
+    related_element: Optional[str]
+    ideal_is_dict: bool             # ideal_position 是否为有效字典（否则基础匹配跳过）
+    directions: Tuple[str, ...]     # 理想方位（保持原顺序，首个用于展示）
+    direction_set: frozenset        # 理想方位集合（O(1) 判断是否在理想位置）
+    is_avoid: bool                  # 忌讳规则：ideal_position.direction 含 avoid
+    ideal_position_name: str        # 调整建议展示的理想方位
+    addition_position_name: str     # 增加建议展示的推荐方位
+    addition_suggestion: str        # 通用增加建议文案（已补表情前缀）
+
+
+@dataclass(frozen=True)
+class RuleIndex:
+    """
+    不可变规则索引：item_name -> rule_type -> 规则元组
+
+    规则加载/刷新时整体重建，通过一次引用赋值发布，匹配线程无需加锁
+    """
+    source: object                                          # 构建索引的规则列表（按身份判断是否过期）
+    by_item: Mapping[str, Mapping[str, Tuple[PreparedRule, ...]]]
+    basic_by_item: Mapping[str, Tuple[PreparedRule, ...]]   # 基础匹配候选（保持规则原顺序）
+    removal_by_item: Mapping[str, PreparedRule]             # 每个物品首条 avoid 忌讳规则
+    addition_rules: Tuple[PreparedRule, ...]                # 增加建议候选（保持规则原顺序）
+
+
+def _parse_ideal_position(ideal_pos) -> Tuple[bool, dict]:
+    """解析 ideal_position，返回 (是否为字典, 字典)"""
+    if not ideal_pos:
+        return True, {}
+    if isinstance(ideal_pos, str):
+        try:
+            ideal_pos = json.loads(ideal_pos)
+        except Exception:
+            return True, {}
+    if not isinstance(ideal_pos, dict):
+        return False, {}
+    return True, ideal_pos
+
+
 class DeskFengshuiEngine:
     """办公桌风水规则引擎"""
     
@@ -307,6 +388,7 @@ class DeskFengshuiEngine:
         """
         self.db_config = db_config or self._get_default_db_config()
         self.rules_cache = None  # 内存缓存
+        self._rule_index: Optional[RuleIndex] = None  # 规则索引（与 rules_cache 同步重建）
         self.redis_client = None  # Redis客户端（可选）
         
         # 尝试初始化Redis客户端
@@ -528,8 +610,8 @@ class DeskFengshuiEngine:
                     if isinstance(cached_data, bytes):
                         cached_data = cached_data.decode('utf-8')
                     rules = json.loads(cached_data)
-                    # 回填内存缓存
-                    self.rules_cache = rules
+                    # 回填内存缓存（同时重建索引）
+                    self._publish_rules(rules)
                     logger.info(f"✅ 从Redis缓存加载了 {len(rules)} 条规则")
                     return rules
             except Exception as e:
@@ -541,8 +623,8 @@ class DeskFengshuiEngine:
         """保存规则到缓存"""
         cache_key = self._get_cache_key()
         
-        # 1. 保存到内存缓存
-        self.rules_cache = rules
+        # 1. 保存到内存缓存（同时重建索引）
+        self._publish_rules(rules)
         
         # 2. 保存到Redis缓存
         if self.redis_client:
@@ -553,6 +635,97 @@ class DeskFengshuiEngine:
             except Exception as e:
                 logger.warning(f"⚠️ Redis缓存写入失败: {e}")
     
+    def _publish_rules(self, rules: List[Dict]):
+        """重建规则索引并发布（先发布索引再发布规则，读到新规则时索引一定已就绪）"""
+        self._rule_index = self._build_rule_index(rules)
+        self.rules_cache = rules
+
+    def _get_rule_index(self, rules: List[Dict]) -> RuleIndex:
+        """获取与规则列表对应的索引（内置规则等未经缓存的列表按需构建）"""
+        index = self._rule_index
+        if index is not None and index.source is rules:
+            return index
+        index = self._build_rule_index(rules)
+        if rules is self.rules_cache:
+            self._rule_index = index
+        return index
+
+    @classmethod
+    def _build_rule_index(cls, rules: List[Dict]) -> RuleIndex:
+        """
+        构建不可变规则索引
+
+        ideal_position 解析、文本解码、方位名称与建议文案均在此一次完成，
+        匹配阶段只做字典查找
+        """
+        by_item: Dict[str, Dict[str, List[PreparedRule]]] = {}
+        basic_by_item: Dict[str, List[PreparedRule]] = {}
+        removal_by_item: Dict[str, PreparedRule] = {}
+        addition_rules: List[PreparedRule] = []
+
+        for rule in rules:
+            rule_type = rule.get('rule_type')
+            item_name = rule.get('item_name') or ''
+            ideal_is_dict, ideal_pos = _parse_ideal_position(rule.get('ideal_position'))
+
+            directions = ideal_pos.get('directions') or []
+            if isinstance(directions, str):
+                directions = [directions]
+            directions = tuple(directions)
+            avoid_direction = ideal_pos.get('direction', '')
+
+            raw_priority = rule.get('priority', 5)
+            if raw_priority is None:
+                raw_priority = 5
+
+            reason = cls._safe_decode(rule.get('reason', ''))
+            suggestion = cls._safe_decode(rule.get('suggestion', ''))
+
+            addition_suggestion = suggestion or reason
+            if not any(addition_suggestion.startswith(emoji) for emoji in _SUGGESTION_EMOJIS):
+                addition_suggestion = f"{_RULE_TYPE_EMOJI.get(rule_type, '💡')} {addition_suggestion}"
+
+            if directions:
+                addition_position_name = cls._get_direction_name(directions[0])
+            else:
+                addition_position_name = _RULE_TYPE_DEFAULT_POSITION.get(rule_type, '合适位置')
+
+            prepared = PreparedRule(
+                rule_type=rule_type,
+                item_name=item_name,
+                item_label=cls._safe_decode(rule.get('item_label', '')),
+                reason=reason,
+                suggestion=suggestion,
+                priority='high' if raw_priority >= 90 else 'medium',
+                related_element=rule.get('related_element'),
+                ideal_is_dict=ideal_is_dict,
+                directions=directions,
+                direction_set=frozenset(directions),
+                is_avoid=isinstance(avoid_direction, str) and 'avoid' in avoid_direction.lower(),
+                ideal_position_name=cls._get_direction_name(directions[0] if directions else 'left'),
+                addition_position_name=addition_position_name,
+                addition_suggestion=addition_suggestion,
+            )
+
+            by_item.setdefault(item_name, {}).setdefault(rule_type, []).append(prepared)
+            if rule_type in BASIC_RULE_TYPES and ideal_is_dict:
+                basic_by_item.setdefault(item_name, []).append(prepared)
+            if rule_type == 'taboo' and prepared.is_avoid:
+                removal_by_item.setdefault(item_name, prepared)
+            if rule_type in ADDITION_RULE_TYPES and item_name not in NON_ITEM_RULE_NAMES:
+                addition_rules.append(prepared)
+
+        return RuleIndex(
+            source=rules,
+            by_item=MappingProxyType({
+                name: MappingProxyType({t: tuple(r) for t, r in types.items()})
+                for name, types in by_item.items()
+            }),
+            basic_by_item=MappingProxyType({name: tuple(r) for name, r in basic_by_item.items()}),
+            removal_by_item=MappingProxyType(removal_by_item),
+            addition_rules=tuple(addition_rules),
+        )
+
     def load_rules(self, force_reload: bool = False) -> List[Dict]:
         """
         加载风水规则（支持Redis缓存）
@@ -1319,6 +1492,7 @@ class DeskFengshuiEngine:
     def _match_basic_rules(self, detected_items: List[Dict], rules: List[Dict]) -> List[Dict]:
         """匹配基础规则，检查物品位置是否合理"""
         adjustments = []
+        index = self._get_rule_index(rules)
         
         for item in detected_items:
             item_name = item['name']
@@ -1327,64 +1501,25 @@ class DeskFengshuiEngine:
             current_relative = current_position.get('relative', '')
             current_direction = current_position.get('direction', '')
             
-            # 查找该物品的规则（支持所有规则类型）
-            for rule in rules:
-                if rule['rule_type'] not in ['position', 'basic', 'taboo', 'wealth', 'career', 'love', 'protection', 'health', 'study', 'relationship', 'general']:
-                    continue
-                
-                # 匹配物品名称
-                rule_item_name = rule.get('item_name', '')
-                if rule_item_name != item_name:
-                    continue
-                
-                # 获取理想位置
-                ideal_pos = rule.get('ideal_position', {})
-                # 🔴 防御性检查：确保 ideal_pos 不为 None
-                if not ideal_pos:
-                    ideal_pos = {}
-                if isinstance(ideal_pos, str):
-                    try:
-                        ideal_pos = json.loads(ideal_pos)
-                    except Exception:
-                        ideal_pos = {}
-                if not isinstance(ideal_pos, dict):
-                    continue
-                
-                ideal_directions = ideal_pos.get('directions', [])
-                if isinstance(ideal_directions, str):
-                    ideal_directions = [ideal_directions]
-                
+            # 查找该物品的规则（支持所有规则类型，按规则原顺序）
+            for rule in index.basic_by_item.get(item_name, ()):
                 # 检查当前位置是否在理想位置列表中
-                is_in_ideal = False
-                if current_relative in ideal_directions or current_direction in ideal_directions:
-                    is_in_ideal = True
+                is_in_ideal = current_relative in rule.direction_set or current_direction in rule.direction_set
+                if is_in_ideal:
+                    continue
                 
-                # 如果是taboo规则且当前位置在禁止区域
-                if rule['rule_type'] == 'taboo' and not is_in_ideal:
+                # taboo规则且当前位置在禁止区域；或position规则/新规则类型且位置不匹配
+                if rule.rule_type == 'taboo' or (rule.rule_type in MOVE_RULE_TYPES and rule.directions):
                     adjustments.append({
                         'item': item_label,
                         'item_label': item_label,
                         'current_position': current_position.get('relative_name', current_relative),
-                        'ideal_position': self._get_direction_name(ideal_directions[0] if ideal_directions else 'left'),
-                        'reason': self._safe_decode(rule.get('reason', '')),
-                        'suggestion': self._safe_decode(rule.get('suggestion', '')),
-                        'priority': 'high' if rule.get('priority', 5) >= 90 else 'medium',
+                        'ideal_position': rule.ideal_position_name,
+                        'reason': rule.reason,
+                        'suggestion': rule.suggestion,
+                        'priority': rule.priority,
                         'action': 'move',
-                        'element': rule.get('related_element', '')
-                    })
-                    break
-                # 如果是position规则或新规则类型且位置不匹配
-                elif rule['rule_type'] in ['position', 'wealth', 'career', 'love', 'protection', 'health', 'study', 'relationship'] and not is_in_ideal and ideal_directions:
-                    adjustments.append({
-                        'item': item_label,
-                        'item_label': item_label,
-                        'current_position': current_position.get('relative_name', current_relative),
-                        'ideal_position': self._get_direction_name(ideal_directions[0]),
-                        'reason': self._safe_decode(rule.get('reason', '')),
-                        'suggestion': self._safe_decode(rule.get('suggestion', '')),
-                        'priority': 'high' if rule.get('priority', 5) >= 90 else 'medium',
-                        'action': 'move',
-                        'element': rule.get('related_element', '')
+                        'element': rule.related_element or ''
                     })
                     break
         
@@ -1393,40 +1528,24 @@ class DeskFengshuiEngine:
     def _match_taboo_rules(self, detected_items: List[Dict], rules: List[Dict]) -> List[Dict]:
         """匹配忌讳规则，检查是否有不宜摆放的物品"""
         removals = []
+        index = self._get_rule_index(rules)
         
         for item in detected_items:
-            item_name = item['name']
-            current_position = item.get('position', {})
+            # 每个物品取首条禁止区域（avoid）忌讳规则
+            rule = index.removal_by_item.get(item['name'])
+            if rule is None:
+                continue
             
-            # 查找忌讳规则
-            for rule in rules:
-                if rule['rule_type'] != 'taboo':
-                    continue
-                
-                if rule['item_name'] == item_name:
-                    ideal_pos = rule.get('ideal_position', {})
-                    # 🔴 防御性检查：确保 ideal_pos 不为 None
-                    if not ideal_pos:
-                        ideal_pos = {}
-                    if isinstance(ideal_pos, str):
-                        try:
-                            ideal_pos = json.loads(ideal_pos)
-                        except Exception:
-                            ideal_pos = {}
-                    avoid_direction = ideal_pos.get('direction', '') if isinstance(ideal_pos, dict) else ''
-                    
-                    # 检查是否在禁止区域
-                    if 'avoid' in avoid_direction.lower():
-                        removals.append({
-                            'item': item['label'],
-                            'item_label': item['label'],
-                            'current_position': current_position.get('relative_name', ''),
-                            'reason': rule.get('reason', ''),
-                            'priority': 'high',
-                            'action': 'remove',
-                            'suggestion': rule.get('suggestion', '')
-                        })
-                        break
+            current_position = item.get('position', {})
+            removals.append({
+                'item': item['label'],
+                'item_label': item['label'],
+                'current_position': current_position.get('relative_name', ''),
+                'reason': rule.reason,
+                'priority': 'high',
+                'action': 'remove',
+                'suggestion': rule.suggestion
+            })
         
         return removals
     
@@ -1434,12 +1553,12 @@ class DeskFengshuiEngine:
         """基于规则和喜神生成增加建议"""
         additions = []
         xishen = bazi_info.get('xishen') if bazi_info else None
+        index = self._get_rule_index(rules)
         
         # 检查已检测到的物品类型
         detected_item_names = {item['name'] for item in detected_items}
         # 🔴 防御性检查：避免链式调用导致 None 错误
         detected_left_items = []
-        detected_right_items = []
         for item in detected_items:
             if not item:
                 continue
@@ -1448,41 +1567,13 @@ class DeskFengshuiEngine:
                 relative = position.get('relative', '')
                 if relative in ['left', 'front_left', 'back_left']:
                     detected_left_items.append(item)
-                elif relative in ['right', 'front_right', 'back_right']:
-                    detected_right_items.append(item)
         
         # 1. 基于规则的增加建议（检查缺失的重要物品）
-        for rule in rules:
-            if rule['rule_type'] not in ['position', 'element', 'general', 'wealth', 'career', 'love', 'protection', 'health', 'study', 'relationship']:
-                continue
-            
-            rule_item_name = rule.get('item_name', '')
-            rule_item_label = self._safe_decode(rule.get('item_label', ''))
-            
-            # 跳过位置规则（不是物品）
-            if rule_item_name in ['left_items', 'right_items', 'front_area', 'back_area', 'desk', 'computer']:
-                continue
-            
-            # 检查是否已有该物品
-            has_item = rule_item_name in detected_item_names
-            
+        for rule in index.addition_rules:
             # 如果是喜神相关规则，优先推荐（强制显示，即使已有类似物品）
-            if xishen and rule.get('related_element') and rule.get('related_element') == xishen:
-                ideal_pos = rule.get('ideal_position', {})
-                # 🔴 防御性检查：确保 ideal_pos 不为 None
-                if not ideal_pos:
-                    ideal_pos = {}
-                if isinstance(ideal_pos, str):
-                    try:
-                        ideal_pos = json.loads(ideal_pos)
-                    except Exception:
-                        ideal_pos = {}
-                ideal_directions = ideal_pos.get('directions', []) if isinstance(ideal_pos, dict) else []
-                if isinstance(ideal_directions, str):
-                    ideal_directions = [ideal_directions]
-                
-                position_name = self._get_direction_name(ideal_directions[0]) if ideal_directions else '合适位置'
-                suggestion = self._safe_decode(rule.get('suggestion', ''))
+            if xishen and rule.related_element and rule.related_element == xishen:
+                position_name = self._get_direction_name(rule.directions[0]) if rule.directions else '合适位置'
+                suggestion = rule.suggestion
                 
                 # 强制添加⭐标记和强调
                 if '⭐' not in suggestion and '🌟' not in suggestion:
@@ -1491,107 +1582,34 @@ class DeskFengshuiEngine:
                     suggestion = suggestion.replace('⭐', '🌟【喜神专属】')
                 
                 additions.append({
-                    'item': rule_item_name,
-                    'item_label': rule_item_label,
+                    'item': rule.item_name,
+                    'item_label': rule.item_label,
                     'position': position_name,
                     'reason': suggestion,
                     'suggestion': suggestion,
                     'priority': 'high',
                     'action': 'add',
                     'element': xishen,
-                    'rule_type': rule.get('rule_type', 'element'),  # 添加规则类型
+                    'rule_type': rule.rule_type or 'element',  # 添加规则类型
                     'is_xishen': True  # 标记为喜神建议
                 })
                 continue
             
-            # 通用物品建议（基于规则）- 支持所有新规则类型
-            if rule['rule_type'] in ['position', 'wealth', 'career', 'love', 'protection', 'health', 'study', 'relationship', 'general'] and not has_item:
-                # 检查是否应该推荐（基于位置和规则优先级）
-                ideal_pos = rule.get('ideal_position', {})
-                # 🔴 防御性检查：确保 ideal_pos 不为 None
-                if not ideal_pos:
-                    ideal_pos = {}
-                if isinstance(ideal_pos, str):
-                    try:
-                        ideal_pos = json.loads(ideal_pos)
-                    except Exception:
-                        ideal_pos = {}
-                ideal_directions = ideal_pos.get('directions', []) if isinstance(ideal_pos, dict) else []
-                if isinstance(ideal_directions, str):
-                    ideal_directions = [ideal_directions]
-                
-                # 对于爆点规则（wealth, career, love等），优先推荐
-                is_highlight_rule = rule['rule_type'] in ['wealth', 'career', 'love', 'protection']
-                priority = 'high' if is_highlight_rule else 'medium'
-                
-                # 确定推荐位置
-                if ideal_directions:
-                    position_name = self._get_direction_name(ideal_directions[0])
-                else:
-                    # 根据规则类型默认位置
-                    if rule['rule_type'] == 'wealth':
-                        position_name = '左侧（青龙位）或前方'
-                    elif rule['rule_type'] == 'career':
-                        position_name = '左侧（青龙位）'
-                    elif rule['rule_type'] == 'love':
-                        position_name = '前方（朱雀位）'
-                    else:
-                        position_name = '合适位置'
-                
-                suggestion = self._safe_decode(rule.get('suggestion', ''))
-                if not suggestion:
-                    suggestion = self._safe_decode(rule.get('reason', ''))
-                
-                # 确保建议有表情符号前缀
-                if not any(suggestion.startswith(emoji) for emoji in ['💰', '📈', '💕', '🛡️', '🏥', '📚', '🤝', '💡', '✅', '⭐', '🌟']):
-                    emoji_map = {
-                        'wealth': '💰',
-                        'career': '📈',
-                        'love': '💕',
-                        'protection': '🛡️',
-                        'health': '🏥',
-                        'study': '📚',
-                        'relationship': '🤝',
-                        'general': '💡'
-                    }
-                    emoji = emoji_map.get(rule['rule_type'], '💡')
-                    suggestion = f"{emoji} {suggestion}"
-                
-                # 对于爆点规则，无条件推荐（不限制位置条件）
-                # 对于普通规则，根据位置条件推荐
-                should_recommend = False
-                if is_highlight_rule:
-                    # 爆点规则无条件推荐
-                    should_recommend = True
-                elif ideal_directions:
-                    # 检查位置条件
-                    if 'left' in str(ideal_directions) and len(detected_left_items) < 3:
-                        should_recommend = True
-                    elif 'right' in str(ideal_directions) and len(detected_right_items) < 2:
-                        should_recommend = True
-                    elif 'front' in str(ideal_directions):
-                        should_recommend = True
-                    elif 'back' in str(ideal_directions):
-                        should_recommend = True
-                    else:
-                        should_recommend = True  # 默认推荐
-                else:
-                    # 没有位置限制，推荐
-                    should_recommend = True
-                
-                if should_recommend:
-                    additions.append({
-                        'item': rule_item_name,
-                        'item_label': rule_item_label,
-                        'position': position_name,
-                        'ideal_position': position_name,
-                        'reason': suggestion,
-                        'suggestion': suggestion,
-                        'priority': priority,
-                        'action': 'add',
-                        'element': rule.get('related_element'),
-                        'rule_type': rule.get('rule_type', 'general')  # 添加规则类型
-                    })
+            # 通用物品建议（基于规则）- 支持所有新规则类型；缺失的物品均推荐
+            # （爆点规则 wealth/career/love/protection 优先级为 high）
+            if rule.rule_type in GENERIC_ADDITION_RULE_TYPES and rule.item_name not in detected_item_names:
+                additions.append({
+                    'item': rule.item_name,
+                    'item_label': rule.item_label,
+                    'position': rule.addition_position_name,
+                    'ideal_position': rule.addition_position_name,
+                    'reason': rule.addition_suggestion,
+                    'suggestion': rule.addition_suggestion,
+                    'priority': 'high' if rule.rule_type in HIGHLIGHT_RULE_TYPES else 'medium',
+                    'action': 'add',
+                    'element': rule.related_element,
+                    'rule_type': rule.rule_type or 'general'  # 添加规则类型
+                })
         
         # 2. 通用风水建议（基于四象布局）
         # 青龙位建议
@@ -1935,7 +1953,7 @@ class DeskFengshuiEngine:
             
             if has_suspicious_chars and suspicious_char_count >= 3:
                 try:
-                    fixed = self._encode_mysql_latin1(text).decode('utf-8')
+                    fixed = DeskFengshuiEngine._encode_mysql_latin1(text).decode('utf-8')
                     chinese_count = sum(1 for c in fixed[:100] if '\u4e00' <= c <= '\u9fff')
                     chinese_punct_count = sum(1 for c in fixed[:100] if c in '，。！？；：')
                     if chinese_count >= 2 or chinese_punct_count >= 1:
@@ -1954,7 +1972,7 @@ class DeskFengshuiEngine:
                 return text
             except UnicodeEncodeError:
                 try:
-                    fixed = self._encode_mysql_latin1(text).decode('utf-8')
+                    fixed = DeskFengshuiEngine._encode_mysql_latin1(text).decode('utf-8')
                     if sum(1 for c in fixed[:100] if '\u4e00' <= c <= '\u9fff') >= 2:
                         return fixed
                 except (UnicodeEncodeError, UnicodeDecodeError):
@@ -15,8 +15,13 @@ from typing import Dict, Any, Optional, List
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from shared.utils.image_result_cache import ImageResultCache
+
 logger = logging.getLogger(__name__)
 
+# 视觉识别结果缓存（同一张图重复上传时跳过 Qwen-VL 调用）
+_result_cache = ImageResultCache("desk_vision")
+
 _POSITION_MAP = {
     'left_front':    {'relative': 'left',   'vertical': 'front',  'bagua_direction': 'southeast'},
     'center_front':  {'relative': 'center', 'vertical': 'front',  'bagua_direction': 'south'},
@@ -73,7 +78,11 @@ class VisionAnalyzer:
         raise ValueError("未配置 BAILIAN_DESK_FENGSHUI_VISION_APP_ID")
 
     async def analyze(self, image_bytes: bytes) -> Dict[str, Any]:
-        """调用百炼 Qwen-VL 智能体识别桌面物品"""
+        """调用百炼 Qwen-VL 智能体识别桌面物品（按图片内容缓存识别结果）"""
+        return await _result_cache.aget_or_compute(image_bytes, lambda: self._analyze_uncached(image_bytes))
+
+    async def _analyze_uncached(self, image_bytes: bytes) -> Dict[str, Any]:
+        """调用百炼 Qwen-VL 智能体识别桌面物品（不经过缓存）"""
         try:
             self._ensure_sdk()
             from dashscope import Application
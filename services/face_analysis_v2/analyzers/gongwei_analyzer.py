@@ -7,6 +7,8 @@
 from typing import List, Dict, Optional
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,7 +16,7 @@ class GongweiAnalyzer:
     """宫位分析器"""
     
     def analyze_shisan_gongwei(self, mapped_features: List[Dict], 
-                               landmarks: List[Dict]) -> List[Dict]:
+                               landmarks: np.ndarray) -> List[Dict]:
         """
         分析十三宫位
         
@@ -54,7 +56,7 @@ class GongweiAnalyzer:
         return results
     
     def analyze_liuqin(self, mapped_features: List[Dict], 
-                       landmarks: List[Dict]) -> List[Dict]:
+                       landmarks: np.ndarray) -> List[Dict]:
         """
         分析六亲宫位
         
@@ -86,7 +88,7 @@ class GongweiAnalyzer:
         return results
     
     def analyze_shishen(self, mapped_features: List[Dict], 
-                        landmarks: List[Dict]) -> List[Dict]:
+                        landmarks: np.ndarray) -> List[Dict]:
         """
         分析十神宫位
         
@@ -116,7 +118,7 @@ class GongweiAnalyzer:
         return results
     
     def _analyze_gongwei_features(self, feature: Dict, 
-                                   landmarks: List[Dict]) -> Dict:
+                                   landmarks: np.ndarray) -> Dict:
         """
         分析宫位的具体特征（关键：识别实际特征，避免互斥）
         
@@ -220,7 +222,7 @@ class GongweiAnalyzer:
         }
     
     def _analyze_liuqin_features(self, features: List[Dict], 
-                                  landmarks: List[Dict]) -> Dict:
+                                  landmarks: np.ndarray) -> Dict:
         """
         分析六亲的特征（增强版：精确识别各宫位特征，避免互斥）
         
@@ -276,7 +278,7 @@ class GongweiAnalyzer:
         }
     
     def _analyze_shishen_features(self, features: List[Dict], 
-                                   landmarks: List[Dict]) -> Dict:
+                                   landmarks: np.ndarray) -> Dict:
         """
         分析十神的特征（与规则配置中的feature描述匹配）
         
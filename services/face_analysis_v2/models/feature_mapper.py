@@ -5,7 +5,9 @@
 """
 
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict
+
+from ..utils.geometry import Landmarks, landmarks_to_array
 
 
 class FeatureMapper:
@@ -14,6 +16,52 @@ class FeatureMapper:
     def __init__(self):
         # 定义99个面相特征点的映射规则
         self.feature_mapping = self._init_feature_mapping()
+        self._compile_mapping()
+    
+    def _compile_mapping(self):
+        """
+        把映射规则编译为索引 / 权重数组，每个特征点 = 所引用关键点的加权和 + 偏移
+        
+        - single: 权重 1
+        - average: 各点等权（缺失的点不参与平均）
+        - interpolate: (1 - ratio, ratio)
+        - offset: 基点权重 1，加 (dx, dy, 0) 偏移
+        """
+        self._feature_ids = sorted(self.feature_mapping.keys())
+        width = max(len(d.get('indices') or d.get('base') or []) for d in self.feature_mapping.values())
+        count = len(self._feature_ids)
+        
+        self._slot_indices = np.zeros((count, width), dtype=np.int64)
+        self._slot_weights = np.zeros((count, width))
+        self._slot_used = np.zeros((count, width), dtype=bool)
+        self._offsets = np.zeros((count, 3))
+        self._is_average = np.zeros(count, dtype=bool)
+        
+        for row, feature_id in enumerate(self._feature_ids):
+            feature_def = self.feature_mapping[feature_id]
+            method = feature_def['method']
+            if method == 'single':
+                indices, weights = feature_def['indices'][:1], [1.0]
+            elif method == 'average':
+                indices = feature_def['indices']
+                weights = [1.0 / len(indices)] * len(indices)
+                self._is_average[row] = True
+            elif method == 'interpolate':
+                ratio = feature_def.get('ratio', 0.5)
+                indices, weights = feature_def['indices'][:2], [1 - ratio, ratio]
+            elif method == 'offset':
+                indices, weights = feature_def['base'][:1], [1.0]
+                self._offsets[row, :2] = feature_def['offset']
+            else:
+                # 未知方法：引用一个不存在的点，映射时跳过
+                indices, weights = [np.iinfo(np.int64).max], [0.0]
+            
+            k = len(indices)
+            self._slot_indices[row, :k] = indices
+            self._slot_weights[row, :k] = weights
+            self._slot_used[row, :k] = True
+        
+        self._feature_defs = [self.feature_mapping[fid] for fid in self._feature_ids]
     
     def _init_feature_mapping(self) -> Dict:
         """初始化特征点映射规则"""
@@ -106,101 +154,61 @@ class FeatureMapper:
             99: {'name': '右脸轮廓中', 'method': 'single', 'indices': [411], 'gongwei': '面部轮廓', 'type': 'feature'},
         }
     
-    def map_features(self, mediapipe_landmarks: List[Dict], face_bounds: Dict) -> List[Dict]:
+    def map_features(self, mediapipe_landmarks: Landmarks, face_bounds: Dict) -> List[Dict]:
         """
         将MediaPipe关键点映射为99个面相特征点
         
         Args:
-            mediapipe_landmarks: MediaPipe检测的468个关键点
+            mediapipe_landmarks: MediaPipe检测的468个关键点（(N, 3) 数组或字典列表）
             face_bounds: 人脸边界框
         
         Returns:
             99个面相特征点列表
         """
-        mapped_features = []
+        coords, valid = self.map_points(mediapipe_landmarks)
         
-        for feature_id in sorted(self.feature_mapping.keys()):
-            feature_def = self.feature_mapping[feature_id]
-            
-            # 根据方法计算特征点坐标
-            point = self._calculate_feature_point(
-                feature_def, mediapipe_landmarks, face_bounds
-            )
-            
-            if point:
-                mapped_features.append({
-                    'feature_id': feature_id,
-                    'feature_name': feature_def['name'],
-                    'x': point['x'],
-                    'y': point['y'],
-                    'z': point.get('z', 0),
-                    'gongwei': feature_def.get('gongwei', ''),
-                    'position_type': feature_def.get('type', ''),
-                    'method': feature_def['method']
-                })
+        mapped_features = []
+        for row, (x, y, z) in enumerate(coords.tolist()):
+            if not valid[row]:
+                continue
+            feature_def = self._feature_defs[row]
+            mapped_features.append({
+                'feature_id': self._feature_ids[row],
+                'feature_name': feature_def['name'],
+                'x': x,
+                'y': y,
+                'z': z,
+                'gongwei': feature_def.get('gongwei', ''),
+                'position_type': feature_def.get('type', ''),
+                'method': feature_def['method']
+            })
         
         return mapped_features
     
-    def _calculate_feature_point(self, feature_def: Dict, landmarks: List[Dict], 
-                                  face_bounds: Dict) -> Optional[Dict]:
+    def map_points(self, mediapipe_landmarks: Landmarks):
         """
-        根据定义计算特征点坐标
-        """
-        method = feature_def['method']
-        
-        if method == 'single':
-            # 单个关键点
-            index = feature_def['indices'][0]
-            return self._get_landmark_by_index(landmarks, index)
+        批量计算全部特征点坐标
         
-        elif method == 'average':
-            # 多个关键点的平均
-            indices = feature_def['indices']
-            points = [self._get_landmark_by_index(landmarks, idx) for idx in indices]
-            points = [p for p in points if p is not None]
-            if points:
-                return {
-                    'x': sum(p['x'] for p in points) / len(points),
-                    'y': sum(p['y'] for p in points) / len(points),
-                    'z': sum(p.get('z', 0) for p in points) / len(points)
-                }
+        Returns:
+            (coords, valid)：按 feature_id 排序的 (F, 3) 坐标数组，以及引用的关键点是否存在
+        """
+        points = landmarks_to_array(mediapipe_landmarks)
+        count = len(self._feature_ids)
+        if len(points) == 0:
+            return np.zeros((count, 3)), np.zeros(count, dtype=bool)
         
-        elif method == 'interpolate':
-            # 两点之间插值
-            indices = feature_def['indices']
-            ratio = feature_def.get('ratio', 0.5)
-            
-            p1 = self._get_landmark_by_index(landmarks, indices[0])
-            p2 = self._get_landmark_by_index(landmarks, indices[1])
-            
-            if p1 and p2:
-                return {
-                    'x': p1['x'] + (p2['x'] - p1['x']) * ratio,
-                    'y': p1['y'] + (p2['y'] - p1['y']) * ratio,
-                    'z': p1.get('z', 0) + (p2.get('z', 0) - p1.get('z', 0)) * ratio
-                }
+        present = self._slot_indices < len(points)
+        gathered = points[np.where(present, self._slot_indices, 0)].astype(np.float64)
         
-        elif method == 'offset':
-            # 基于某点的偏移
-            base_index = feature_def['base'][0]
-            offset = feature_def['offset']
-            
-            base_point = self._get_landmark_by_index(landmarks, base_index)
-            if base_point:
-                return {
-                    'x': base_point['x'] + offset[0],
-                    'y': base_point['y'] + offset[1],
-                    'z': base_point.get('z', 0)
-                }
+        # average 只对存在的点求平均；其他方法要求所引用的点全部存在
+        used = self._slot_used & present
+        used_count = used.sum(axis=1)
+        weights = np.where(self._is_average[:, None], used / np.maximum(used_count, 1)[:, None],
+                           self._slot_weights)
+        valid = np.where(self._is_average, used_count > 0, (present | ~self._slot_used).all(axis=1))
         
-        return None
-    
-    def _get_landmark_by_index(self, landmarks: List[Dict], index: int) -> Optional[Dict]:
-        """根据索引获取关键点"""
-        for lm in landmarks:
-            if lm['index'] == index:
-                return lm
-        return None
+        coords = np.einsum('fk,fkc->fc', weights, gathered) + self._offsets
+        return coords, valid
     
     def get_features_by_gongwei(self, mapped_features: List[Dict], gongwei: str) -> List[Dict]:
         """根据宫位筛选特征点"""
@@ -11,6 +11,8 @@ logger = logging.getLogger(__name__)
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 
+from ..utils.geometry import compute_face_bounds
+
 try:
     import mediapipe as mp
     MEDIAPIPE_AVAILABLE = True
@@ -61,7 +63,8 @@ class LandmarkDetector:
             image: OpenCV图像（BGR格式）
         
         Returns:
-            检测结果字典，包含landmarks和face_bounds
+            检测结果字典，包含 points（(N, 3) float32 数组）、visibility 和 face_bounds；
+            需要字典列表时用 utils.geometry.landmarks_to_dicts 转换
         """
         # 确保已初始化
         self._ensure_initialized()
@@ -83,35 +86,20 @@ class LandmarkDetector:
         # 获取第一张人脸的关键点
         face_landmarks = results.multi_face_landmarks[0]
         
-        # 转换为像素坐标
-        landmarks = []
-        for idx, landmark in enumerate(face_landmarks.landmark):
-            landmarks.append({
-                'index': idx,
-                'x': landmark.x,  # 归一化坐标 0-1
-                'y': landmark.y,
-                'z': landmark.z,
-                'visibility': landmark.visibility if hasattr(landmark, 'visibility') else 1.0,
-                'x_px': int(landmark.x * w),  # 像素坐标
-                'y_px': int(landmark.y * h)
-            })
-        
-        # 计算人脸边界框
-        x_coords = [lm['x'] for lm in landmarks]
-        y_coords = [lm['y'] for lm in landmarks]
-        
-        face_bounds = {
-            'left': min(x_coords),
-            'top': min(y_coords),
-            'right': max(x_coords),
-            'bottom': max(y_coords),
-            'width': max(x_coords) - min(x_coords),
-            'height': max(y_coords) - min(y_coords)
-        }
+        # 归一化坐标 0-1，(N, 3) float32（MediaPipe 本身即以 float32 存储，无精度损失）
+        points = np.array(
+            [(landmark.x, landmark.y, landmark.z) for landmark in face_landmarks.landmark],
+            dtype=np.float32
+        )
+        visibility = np.array(
+            [getattr(landmark, 'visibility', 1.0) for landmark in face_landmarks.landmark],
+            dtype=np.float32
+        )
         
         return {
-            'landmarks': landmarks,
-            'face_bounds': face_bounds,
+            'points': points,
+            'visibility': visibility,
+            'face_bounds': compute_face_bounds(points),
             'image_size': {'width': w, 'height': h}
         }
     
@@ -18,26 +18,11 @@ class LandmarkDetectorFallback:
         """
         h, w = image.shape[:2]
         
-        # 生成模拟的468个关键点（基于人脸中心区域）
-        landmarks = []
-        center_x, center_y = 0.5, 0.4  # 人脸中心位置
-        
-        for i in range(468):
-            # 在中心区域随机分布
-            x = center_x + np.random.normal(0, 0.15)
-            y = center_y + np.random.normal(0, 0.15)
-            x = np.clip(x, 0, 1)
-            y = np.clip(y, 0, 1)
-            
-            landmarks.append({
-                'index': i,
-                'x': float(x),
-                'y': float(y),
-                'z': float(np.random.normal(0, 0.01)),
-                'visibility': 1.0,
-                'x_px': int(x * w),
-                'y_px': int(y * h)
-            })
+        # 生成模拟的468个关键点（基于人脸中心区域随机分布）
+        center = np.array([0.5, 0.4])  # 人脸中心位置
+        points = np.empty((468, 3), dtype=np.float32)
+        points[:, :2] = np.clip(center + np.random.normal(0, 0.15, size=(468, 2)), 0, 1)
+        points[:, 2] = np.random.normal(0, 0.01, size=468)
         
         face_bounds = {
             'left': 0.2,
@@ -49,7 +34,8 @@ class LandmarkDetectorFallback:
         }
         
         return {
-            'landmarks': landmarks,
+            'points': points,
+            'visibility': np.ones(468, dtype=np.float32),
             'face_bounds': face_bounds,
             'image_size': {'width': w, 'height': h}
         }
@@ -13,7 +13,7 @@ from PIL import Image
 from .models.landmark_detector import LandmarkDetector
 from .models.feature_mapper import FeatureMapper
 from .analyzers.gongwei_analyzer import GongweiAnalyzer
-from .utils.geometry import GeometryCalculator
+from .utils.geometry import GeometryCalculator, landmarks_to_dicts
 
 # 导入规则匹配服务
 import sys
@@ -21,6 +21,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 from services.face_knowledge_v2.service import FaceKnowledgeService
+from shared.utils.image_result_cache import ImageResultCache
+
+# 关键点检测结果缓存（同一张图重复上传时跳过 MediaPipe 推理）
+# v2：缓存 (N, 3) 坐标列表而非 468 个关键点字典
+# 关键点按人区分且为像素坐标，只按内容哈希精确命中，不启用感知哈希
+_landmark_cache = ImageResultCache("face_v2_landmarks", version="v2", use_perceptual=False)
 
 
 class FaceAnalysisService:
@@ -44,6 +50,38 @@ class FaceAnalysisService:
         Returns:
             检测结果
         """
+        detected = self._detect_points(image_data, image_format)
+        
+        if not detected['success']:
+            return {
+                'success': False,
+                'message': detected['message'],
+                'landmarks': [],
+                'mapped_features': []
+            }
+        
+        points = detected['points']
+        return {
+            'success': True,
+            'message': detected['message'],
+            'landmarks': landmarks_to_dicts(points, detected['image_size'], detected['visibility']),
+            'mapped_features': self.feature_mapper.map_features(points, detected['face_bounds']),
+            'face_bounds': detected['face_bounds']
+        }
+    
+    def _detect_points(self, image_data: bytes, image_format: str = 'jpg') -> Dict:
+        """检测人脸关键点（经缓存），成功时 points 为 (N, 3) float32 数组"""
+        detected = _landmark_cache.get_or_compute(
+            image_data,
+            lambda: self._detect_points_uncached(image_data, image_format)
+        )
+        if detected['success']:
+            detected['points'] = np.asarray(detected['points'], dtype=np.float32).reshape(-1, 3)
+            detected['visibility'] = np.asarray(detected['visibility'], dtype=np.float32)
+        return detected
+    
+    def _detect_points_uncached(self, image_data: bytes, image_format: str = 'jpg') -> Dict:
+        """检测人脸关键点（不经过缓存），坐标转为列表以便缓存序列化"""
         try:
             # 解码图片
             image = self._decode_image(image_data, image_format)
@@ -54,31 +92,22 @@ class FaceAnalysisService:
             if not result:
                 return {
                     'success': False,
-                    'message': '未检测到人脸',
-                    'landmarks': [],
-                    'mapped_features': []
+                    'message': '未检测到人脸'
                 }
             
-            # 映射到99个特征点
-            mapped_features = self.feature_mapper.map_features(
-                result['landmarks'],
-                result['face_bounds']
-            )
-            
             return {
                 'success': True,
                 'message': '检测成功',
-                'landmarks': result['landmarks'],
-                'mapped_features': mapped_features,
-                'face_bounds': result['face_bounds']
+                'points': result['points'].tolist(),
+                'visibility': result['visibility'].tolist(),
+                'face_bounds': result['face_bounds'],
+                'image_size': result['image_size']
             }
         
         except Exception as e:
             return {
                 'success': False,
-                'message': f'检测失败：{str(e)}',
-                'landmarks': [],
-                'mapped_features': []
+                'message': f'检测失败：{str(e)}'
             }
     
     def analyze_gongwei(self, image_data: bytes, image_format: str = 'jpg', 
@@ -98,20 +127,24 @@ class FaceAnalysisService:
             analysis_types = ['gongwei', 'liuqin', 'shishen']
         
         # 先检测关键点
-        detect_result = self.detect_landmarks(image_data, image_format)
+        detected = self._detect_points(image_data, image_format)
         
-        if not detect_result['success']:
+        if not detected['success']:
             return {
                 'success': False,
-                'message': detect_result['message'],
+                'message': detected['message'],
                 'gongwei_list': [],
                 'liuqin_list': [],
                 'shishen_list': []
             }
         
-        landmarks = detect_result['landmarks']
-        mapped_features = detect_result['mapped_features']
-        
+        points = detected['points']
+        mapped_features = self.feature_mapper.map_features(points, detected['face_bounds'])
+        return self._analyze_gongwei_features(points, mapped_features, analysis_types)
+    
+    def _analyze_gongwei_features(self, landmarks: np.ndarray, mapped_features: List[Dict],
+                                  analysis_types: List[str]) -> Dict:
+        """基于已检测的关键点数组和特征点做宫位分析"""
         # 分析各类宫位
         result = {
             'success': True,
@@ -214,32 +247,34 @@ class FaceAnalysisService:
             完整分析结果
         """
         # 检测关键点
-        detect_result = self.detect_landmarks(image_data, image_format)
+        detected = self._detect_points(image_data, image_format)
         
-        if not detect_result['success']:
+        if not detected['success']:
             return {
                 'success': False,
-                'message': detect_result['message']
+                'message': detected['message']
             }
         
-        landmarks = detect_result['landmarks']
-        mapped_features = detect_result['mapped_features']
-        face_bounds = detect_result['face_bounds']
+        points = detected['points']
+        face_bounds = detected['face_bounds']
+        mapped_features = self.feature_mapper.map_features(points, face_bounds)
         
         # 宫位分析
-        gongwei_result = self.analyze_gongwei(image_data, image_format)
+        gongwei_result = self._analyze_gongwei_features(
+            points, mapped_features, ['gongwei', 'liuqin', 'shishen']
+        )
         
         # 三停分析
-        santing = self.geometry_calculator.calculate_santing(landmarks, face_bounds)
+        santing = self.geometry_calculator.calculate_santing(points, face_bounds)
         
         # 五眼分析
-        wuyan = self.geometry_calculator.calculate_wuyan(landmarks)
+        wuyan = self.geometry_calculator.calculate_wuyan(points)
         
         return {
             'success': True,
             'message': '分析成功',
             'landmarks': {
-                'mediapipe_points': len(landmarks),
+                'mediapipe_points': len(points),
                 'mapped_features': len(mapped_features)
             },
             'gongwei': gongwei_result,
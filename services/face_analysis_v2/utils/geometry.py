@@ -2,17 +2,87 @@
 """
 几何计算工具
 计算三停、五眼、面部比例等
+
+关键点在服务内部以 (N, 3) float32 数组（x, y, z 归一化坐标，行号即 MediaPipe 索引）传递，
+按索引数组一次取点，不再逐个线性查找；字典列表只在响应边界由 landmarks_to_dicts 生成。
+各计算函数仍兼容旧的字典列表输入。
 """
 
+import math
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Union
+
+# 关键点：(N, 3) 数组或旧格式字典列表（含 index/x/y/z）
+Landmarks = Union[np.ndarray, List[Dict]]
+
+# 三停：眉毛、鼻底
+EYEBROW_INDICES = np.array([70, 300])
+NOSE_BOTTOM_INDICES = np.array([2])
+
+# 五眼：左脸边界、左眼外角、左眼内角、右眼内角、右眼外角、右脸边界（从左到右，相邻两点为一段）
+WUYAN_INDICES = np.array([234, 33, 133, 362, 263, 454])
+
+
+def landmarks_to_array(landmarks: Landmarks) -> np.ndarray:
+    """关键点转为 (N, 3) float32 数组；字典列表按 index 放置，缺失的点为 0"""
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    if not landmarks:
+        return np.zeros((0, 3), dtype=np.float32)
+    points = np.zeros((max(lm['index'] for lm in landmarks) + 1, 3), dtype=np.float32)
+    for lm in landmarks:
+        points[lm['index']] = (lm['x'], lm['y'], lm.get('z', 0))
+    return points
+
+
+def take_points(points: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """按索引数组取点（float64），越界索引取 (0, 0, 0)"""
+    if len(points) > indices.max():
+        return points[indices].astype(np.float64)
+    taken = np.zeros((len(indices), 3))
+    valid = indices < len(points)
+    taken[valid] = points[indices[valid]]
+    return taken
+
+
+def compute_face_bounds(points: np.ndarray) -> Dict:
+    """由关键点数组计算人脸边界框（归一化坐标）"""
+    left, top = points[:, :2].min(axis=0).tolist()
+    right, bottom = points[:, :2].max(axis=0).tolist()
+    return {
+        'left': left,
+        'top': top,
+        'right': right,
+        'bottom': bottom,
+        'width': right - left,
+        'height': bottom - top
+    }
+
+
+def landmarks_to_dicts(points: np.ndarray, image_size: Dict,
+                       visibility: Optional[np.ndarray] = None) -> List[Dict]:
+    """关键点数组转为响应用的字典列表（index / x / y / z / visibility / 像素坐标）"""
+    w, h = image_size['width'], image_size['height']
+    vis = visibility.tolist() if visibility is not None else [1.0] * len(points)
+    return [
+        {
+            'index': idx,
+            'x': x,
+            'y': y,
+            'z': z,
+            'visibility': vis[idx],
+            'x_px': int(x * w),
+            'y_px': int(y * h)
+        }
+        for idx, (x, y, z) in enumerate(points.tolist())
+    ]
 
 
 class GeometryCalculator:
     """几何计算器"""
     
     @staticmethod
-    def calculate_santing(landmarks: List[Dict], face_bounds: Dict) -> Dict:
+    def calculate_santing(landmarks: Landmarks, face_bounds: Dict) -> Dict:
         """
         计算三停（上停、中停、下停）
         
@@ -23,10 +93,12 @@ class GeometryCalculator:
         Returns:
             三停比例和评价
         """
+        points = landmarks_to_array(landmarks)
+        
         # 获取关键点
         hairline_y = face_bounds['top'] - 0.1  # 估算发际线（额头上方）
-        eyebrow_y = GeometryCalculator._get_avg_y(landmarks, [70, 300])  # 眉毛
-        nose_bottom_y = GeometryCalculator._get_avg_y(landmarks, [2])  # 鼻底
+        eyebrow_y = take_points(points, EYEBROW_INDICES)[:, 1].mean()  # 眉毛
+        nose_bottom_y = take_points(points, NOSE_BOTTOM_INDICES)[:, 1].mean()  # 鼻底
         chin_y = face_bounds['bottom']  # 下巴
         
         # 计算三停长度
@@ -76,7 +148,7 @@ class GeometryCalculator:
             return "三停比例需调整，运势有起伏"
     
     @staticmethod
-    def calculate_wuyan(landmarks: List[Dict]) -> Dict:
+    def calculate_wuyan(landmarks: Landmarks) -> Dict:
         """
         计算五眼（五眼比例）
         
@@ -87,30 +159,14 @@ class GeometryCalculator:
         - 右眼宽 = 1眼
         - 右眼到右侧面 = 1眼
         """
-        # 获取关键点
-        left_face = GeometryCalculator._get_point(landmarks, 234)  # 左脸边界
-        left_eye_outer = GeometryCalculator._get_point(landmarks, 33)  # 左眼外角
-        left_eye_inner = GeometryCalculator._get_point(landmarks, 133)  # 左眼内角
-        right_eye_inner = GeometryCalculator._get_point(landmarks, 362)  # 右眼内角
-        right_eye_outer = GeometryCalculator._get_point(landmarks, 263)  # 右眼外角
-        right_face = GeometryCalculator._get_point(landmarks, 454)  # 右脸边界
-        
-        # 计算距离
-        face_width = abs(right_face['x'] - left_face['x'])
-        left_side = abs(left_eye_outer['x'] - left_face['x'])
-        left_eye_width = abs(left_eye_inner['x'] - left_eye_outer['x'])
-        eye_distance = abs(right_eye_inner['x'] - left_eye_inner['x'])
-        right_eye_width = abs(right_eye_outer['x'] - right_eye_inner['x'])
-        right_side = abs(right_face['x'] - right_eye_outer['x'])
+        # 从左脸边界到右脸边界的 6 个点的横坐标
+        xs = take_points(landmarks_to_array(landmarks), WUYAN_INDICES)[:, 0]
         
-        # 转换为比例
-        eye_widths = [
-            left_side / face_width,
-            left_eye_width / face_width,
-            eye_distance / face_width,
-            right_eye_width / face_width,
-            right_side / face_width
-        ]
+        # 相邻两点之间为一段：左侧面、左眼宽、两眼间距、右眼宽、右侧面
+        face_width = abs(xs[-1] - xs[0])
+        if face_width == 0:
+            raise ZeroDivisionError("脸宽为 0，无法计算五眼")
+        eye_widths = (np.abs(np.diff(xs)) / face_width).tolist()
         
         # 评价
         evaluation = GeometryCalculator._evaluate_wuyan(eye_widths)
@@ -139,31 +195,16 @@ class GeometryCalculator:
     @staticmethod
     def calculate_distance(p1: Dict, p2: Dict) -> float:
         """计算两点距离"""
-        dx = p2['x'] - p1['x']
-        dy = p2['y'] - p1['y']
-        return np.sqrt(dx**2 + dy**2)
+        return math.hypot(p2['x'] - p1['x'], p2['y'] - p1['y'])
     
     @staticmethod
     def calculate_angle(p1: Dict, p2: Dict, p3: Dict) -> float:
         """计算三点角度（以p2为顶点）"""
-        v1 = np.array([p1['x'] - p2['x'], p1['y'] - p2['y']])
-        v2 = np.array([p3['x'] - p2['x'], p3['y'] - p2['y']])
+        v1x, v1y = p1['x'] - p2['x'], p1['y'] - p2['y']
+        v2x, v2y = p3['x'] - p2['x'], p3['y'] - p2['y']
         
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
-        angle = np.arccos(np.clip(cos_angle, -1.0, 1.0))
-        return np.degrees(angle)
-    
-    @staticmethod
-    def _get_point(landmarks: List[Dict], index: int) -> Dict:
-        """根据索引获取点"""
-        for lm in landmarks:
-            if lm['index'] == index:
-                return lm
-        return {'x': 0, 'y': 0, 'z': 0}
-    
-    @staticmethod
-    def _get_avg_y(landmarks: List[Dict], indices: List[int]) -> float:
-        """获取一组点的平均Y坐标"""
-        points = [GeometryCalculator._get_point(landmarks, idx) for idx in indices]
-        return sum(p['y'] for p in points) / len(points) if points else 0
-
+        norm = math.hypot(v1x, v1y) * math.hypot(v2x, v2y)
+        if norm == 0:
+            return float('nan')
+        cos_angle = (v1x * v2x + v1y * v2y) / norm
+        return math.degrees(math.acos(min(1.0, max(-1.0, cos_angle))))
@@ -32,6 +32,11 @@ try:
     from .mediapipe_singleton import MediaPipeSingleton
 except ImportError:
     from mediapipe_singleton import MediaPipeSingleton
+from shared.utils.image_result_cache import ImageResultCache
+
+# 面部特征缓存（同一张图重复上传时跳过 MediaPipe 推理）
+# 结果按人区分且含像素坐标，只按内容哈希精确命中，不启用感知哈希
+_result_cache = ImageResultCache("face_features", use_perceptual=False)
 
 
 class FaceAnalyzer:
@@ -46,7 +51,7 @@ class FaceAnalyzer:
             self.mp_face_mesh = None
     
     def _get_face_mesh_instance(self):
-        """获取 MediaPipe FaceMesh 实例（使用单例）"""
+        """获取 MediaPipe FaceMesh 实例池（并发请求各借出一个实例）"""
         if not MEDIAPIPE_AVAILABLE:
             return None
         return self.mp_singleton.get_face_mesh()
@@ -63,6 +68,14 @@ class FaceAnalyzer:
         Returns:
             分析结果
         """
+        return _result_cache.get_or_compute(
+            image_bytes,
+            lambda: self._analyze_uncached(image_bytes, image_format, enable_special_features),
+            params={'special': enable_special_features}
+        )
+    
+    def _analyze_uncached(self, image_bytes: bytes, image_format: str = "jpg", enable_special_features: bool = False) -> Dict[str, Any]:
+        """分析面相（不经过缓存）"""
         import datetime
         request_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -32,6 +32,11 @@ try:
     from .mediapipe_singleton import MediaPipeSingleton
 except ImportError:
     from mediapipe_singleton import MediaPipeSingleton
+from shared.utils.image_result_cache import ImageResultCache
+
+# 手部特征缓存（同一张图重复上传时跳过 MediaPipe 推理）
+# 结果按人区分且含像素坐标，只按内容哈希精确命中，不启用感知哈希
+_result_cache = ImageResultCache("hand_features", use_perceptual=False)
 
 
 class HandAnalyzer:
@@ -46,14 +51,14 @@ class HandAnalyzer:
             self.mp_hands = None
     
     def _get_hands_instance(self):
-        """获取 MediaPipe Hands 实例（使用单例）"""
+        """获取 MediaPipe Hands 实例池（并发请求各借出一个实例）"""
         if not MEDIAPIPE_AVAILABLE:
             return None
         return self.mp_singleton.get_hands()
     
     def analyze(self, image_bytes: bytes, image_format: str = "jpg") -> Dict[str, Any]:
         """
-        分析手相
+        分析手相（按图片内容缓存特征提取结果）
         
         Args:
             image_bytes: 图像字节数据
@@ -62,6 +67,13 @@ class HandAnalyzer:
         Returns:
             分析结果
         """
+        return _result_cache.get_or_compute(
+            image_bytes,
+            lambda: self._analyze_uncached(image_bytes, image_format)
+        )
+    
+    def _analyze_uncached(self, image_bytes: bytes, image_format: str = "jpg") -> Dict[str, Any]:
+        """分析手相（不经过缓存）"""
         # 验证图像
         is_valid, error_msg = self.preprocessor.validate_image(image_bytes)
         if not is_valid:
@@ -3,13 +3,30 @@
 """
 MediaPipe 单例管理器
 复用 MediaPipe 对象，避免重复初始化，提高性能
+
+MediaPipe 图实例不是线程安全的，单个实例只能串行处理。这里为 Hands / FaceMesh
+各维护一个实例池（默认按 CPU 核数），请求借出一个空闲实例处理完再归还，
+并发分析随核数扩展而不是排队等同一个图。
+
+- MEDIAPIPE_POOL_SIZE：每种图的实例数（0 或未设置时取 CPU 核数）
+- MEDIAPIPE_POOL_MODE：thread（默认，进程内实例池）/ process（子进程隔离，
+  MediaPipe 崩溃不影响服务进程）
+- 借出等待时间、推理耗时导出到 MetricsCollector
 """
 
+import multiprocessing
+import os
+import queue
 import threading
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional
 
 logger = logging.getLogger(__name__)
-from typing import Optional
 
 try:
     import mediapipe as mp
@@ -17,26 +34,277 @@ try:
 except ImportError:
     MEDIAPIPE_AVAILABLE = False
 
+MEDIAPIPE_POOL_SIZE = int(os.getenv("MEDIAPIPE_POOL_SIZE", "0")) or os.cpu_count() or 1
+MEDIAPIPE_POOL_MODE = os.getenv("MEDIAPIPE_POOL_MODE", "thread").lower()
+MEDIAPIPE_CHECKOUT_TIMEOUT = float(os.getenv("MEDIAPIPE_CHECKOUT_TIMEOUT", "30"))
+
+try:
+    from server.observability.metrics_collector import get_metrics
+    _wait_histogram = get_metrics().histogram(
+        "mediapipe_pool_wait_seconds", "MediaPipe实例池借出等待时间", ["graph"]
+    )
+    _infer_histogram = get_metrics().histogram(
+        "mediapipe_inference_seconds", "MediaPipe推理耗时", ["graph"]
+    )
+    _in_use_gauge = get_metrics().gauge("mediapipe_pool_in_use", "MediaPipe实例池借出数量", ["graph"])
+except ImportError:
+    _wait_histogram = None
+    _infer_histogram = None
+    _in_use_gauge = None
+
+
+def _create_hands():
+    return mp.solutions.hands.Hands(
+        static_image_mode=True,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+
+
+def _create_face_mesh():
+    return mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=True,
+        max_num_faces=1,
+        refine_landmarks=True,
+        min_detection_confidence=0.6,
+        min_tracking_confidence=0.5
+    )
+
+
+_GRAPH_FACTORIES = {
+    "hands": _create_hands,
+    "face_mesh": _create_face_mesh,
+}
+
+# 各图类型结果中的关键点字段
+_RESULT_FIELDS = {
+    "hands": "multi_hand_landmarks",
+    "face_mesh": "multi_face_landmarks",
+}
+
+
+class GraphPool:
+    """
+    MediaPipe 图实例池（借出/归还）
+
+    实例按需创建，最多 size 个；空闲实例按 LIFO 复用（保持缓存热）。
+    process() 与图实例的 process() 签名一致，调用方可直接替换：
+        pool = GraphPool("hands", _create_hands, size=4)
+        results = pool.process(img_rgb)
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int = MEDIAPIPE_POOL_SIZE,
+                 checkout_timeout: float = MEDIAPIPE_CHECKOUT_TIMEOUT):
+        self.name = name
+        self.size = max(1, size)
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+
+    def checkout(self, timeout: Optional[float] = None) -> Any:
+        """借出一个图实例；池满且超时仍无空闲实例时抛出 TimeoutError"""
+        try:
+            return self._mark_checkout(self._idle.get_nowait())
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                graph = self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            logger.info(f"✅ MediaPipe {self.name} 实例已创建 ({self._created}/{self.size})")
+            return self._mark_checkout(graph)
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        try:
+            return self._mark_checkout(self._idle.get(timeout=timeout))
+        except queue.Empty:
+            raise TimeoutError(f"MediaPipe {self.name} 实例池等待超时（{timeout}s，size={self.size}）")
+
+    def checkin(self, graph: Any, discard: bool = False) -> None:
+        """归还图实例；discard=True 时关闭该实例（处理异常后不再复用）"""
+        with self._lock:
+            self._in_use -= 1
+            if discard:
+                self._created -= 1
+        if _in_use_gauge:
+            _in_use_gauge.dec(graph=self.name)
+        if discard:
+            _close_quietly(graph)
+        else:
+            self._idle.put(graph)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """借出上下文：正常退出归还，异常退出丢弃实例"""
+        start = time.perf_counter()
+        graph = self.checkout(timeout)
+        if _wait_histogram:
+            _wait_histogram.observe(time.perf_counter() - start, graph=self.name)
+        try:
+            yield graph
+        except BaseException:
+            self.checkin(graph, discard=True)
+            raise
+        self.checkin(graph)
+
+    def process(self, image_rgb) -> Any:
+        """借出实例执行一次推理"""
+        with self.lease() as graph:
+            start = time.perf_counter()
+            results = graph.process(image_rgb)
+            if _infer_histogram:
+                _infer_histogram.observe(time.perf_counter() - start, graph=self.name)
+            return results
+
+    def warm_up(self) -> None:
+        """预先创建一个实例（初始化失败时抛出异常）"""
+        self.checkin(self.checkout())
+
+    def close(self) -> None:
+        """关闭所有空闲实例（借出中的实例归还后仍可继续使用）"""
+        while True:
+            try:
+                graph = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            _close_quietly(graph)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"graph": self.name, "size": self.size, "created": self._created, "in_use": self._in_use}
+
+    def _mark_checkout(self, graph: Any) -> Any:
+        with self._lock:
+            self._in_use += 1
+        if _in_use_gauge:
+            _in_use_gauge.inc(graph=self.name)
+        return graph
+
+
+def _close_quietly(graph: Any) -> None:
+    try:
+        graph.close()
+    except Exception:
+        pass
+
+
+# ---------------------------------------------------------------- 子进程模式
+
+_worker_graphs: dict = {}
+
+
+def _get_worker_graph(kind: str):
+    """子进程内获取（首次调用时创建）图实例"""
+    graph = _worker_graphs.get(kind)
+    if graph is None:
+        graph = _GRAPH_FACTORIES[kind]()
+        _worker_graphs[kind] = graph
+    return graph
+
+
+def _warm_up_worker(kind: str) -> None:
+    _get_worker_graph(kind)
+
+
+def _process_in_worker(kind: str, image_rgb) -> tuple:
+    """子进程内执行推理，返回 (关键点坐标列表, 推理耗时秒)"""
+    graph = _get_worker_graph(kind)
+    start = time.perf_counter()
+    results = graph.process(image_rgb)
+    elapsed = time.perf_counter() - start
+    landmark_lists = getattr(results, _RESULT_FIELDS[kind]) or []
+    return [[(p.x, p.y, p.z) for p in lm.landmark] for lm in landmark_lists], elapsed
+
+
+def wrap_landmark_results(kind: str, coords: List[List[tuple]]) -> SimpleNamespace:
+    """把子进程返回的坐标还原成与 MediaPipe 结果相同的访问方式（results.multi_*_landmarks[0].landmark[i].x）"""
+    landmark_lists = [
+        SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points])
+        for points in coords
+    ]
+    return SimpleNamespace(**{_RESULT_FIELDS[kind]: landmark_lists or None})
+
+
+class ProcessGraphPool:
+    """
+    子进程图实例池（每个子进程各持有一份图实例，接口与 GraphPool 一致）
+
+    子进程以 spawn 方式启动（父进程已加载的 MediaPipe 不能 fork 复用）；
+    子进程崩溃时重建进程池，只影响当次请求
+    """
+
+    def __init__(self, name: str, size: int = MEDIAPIPE_POOL_SIZE):
+        self.name = name
+        self.size = max(1, size)
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.size, mp_context=multiprocessing.get_context("spawn"))
+
+    def process(self, image_rgb) -> SimpleNamespace:
+        start = time.perf_counter()
+        executor = self._executor
+        try:
+            coords, infer_seconds = executor.submit(_process_in_worker, self.name, image_rgb).result(
+                timeout=MEDIAPIPE_CHECKOUT_TIMEOUT
+            )
+        except BrokenProcessPool:
+            logger.warning(f"⚠️  MediaPipe {self.name} 子进程异常退出，重建进程池")
+            with self._executor_lock:
+                if self._executor is executor:
+                    self._executor = self._new_executor()
+            executor.shutdown(wait=False)
+            raise
+        if _infer_histogram:
+            _infer_histogram.observe(infer_seconds, graph=self.name)
+        if _wait_histogram:
+            _wait_histogram.observe(max(time.perf_counter() - start - infer_seconds, 0.0), graph=self.name)
+        return wrap_landmark_results(self.name, coords)
+
+    def warm_up(self) -> None:
+        """在子进程内预先创建图实例"""
+        self._executor.submit(_warm_up_worker, self.name).result(timeout=MEDIAPIPE_CHECKOUT_TIMEOUT)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
 
 class MediaPipeSingleton:
-    """MediaPipe 对象单例管理器"""
-    
+    """MediaPipe 对象单例管理器（Hands / FaceMesh 实例池）"""
+
     _instance = None
     _lock = threading.Lock()
-    
-    def __init__(self):
+
+    def __init__(self, pool_size: int = MEDIAPIPE_POOL_SIZE, mode: str = MEDIAPIPE_POOL_MODE):
         if MEDIAPIPE_AVAILABLE:
             self.mp_hands = mp.solutions.hands
             self.mp_face_mesh = mp.solutions.face_mesh
         else:
             self.mp_hands = None
             self.mp_face_mesh = None
-        
+
+        self.pool_size = pool_size
+        self.mode = mode
         self._hands_instance = None
         self._face_mesh_instance = None
         self._hands_lock = threading.Lock()
         self._face_mesh_lock = threading.Lock()
-    
+
     @classmethod
     def get_instance(cls):
         """获取单例实例"""
@@ -45,69 +313,60 @@ class MediaPipeSingleton:
                 if cls._instance is None:
                     cls._instance = cls()
         return cls._instance
-    
+
+    def _create_pool(self, kind: str):
+        if self.mode == "process":
+            return ProcessGraphPool(kind, size=self.pool_size)
+        return GraphPool(kind, _GRAPH_FACTORIES[kind], size=self.pool_size)
+
     def get_hands(self):
-        """获取 Hands 实例（单例）"""
+        """获取 Hands 实例池（与 Hands 实例同样调用 process()，初始化失败返回 None）"""
         if not MEDIAPIPE_AVAILABLE:
             return None
-        
+
         if self._hands_instance is None:
             with self._hands_lock:
                 if self._hands_instance is None:
                     try:
-                        self._hands_instance = self.mp_hands.Hands(
-                            static_image_mode=True,
-                            max_num_hands=1,
-                            min_detection_confidence=0.7,
-                            min_tracking_confidence=0.5
-                        )
-                        logger.info("✅ MediaPipe Hands 单例已创建")
+                        pool = self._create_pool("hands")
+                        pool.warm_up()
+                        self._hands_instance = pool
+                        logger.info(f"✅ MediaPipe Hands 实例池已创建 (size={self.pool_size}, mode={self.mode})")
                     except Exception as e:
                         logger.info(f"⚠️  MediaPipe Hands 初始化失败: {e}")
                         return None
-        
+
         return self._hands_instance
-    
+
     def get_face_mesh(self):
-        """获取 FaceMesh 实例（单例）"""
+        """获取 FaceMesh 实例池（与 FaceMesh 实例同样调用 process()，初始化失败返回 None）"""
         if not MEDIAPIPE_AVAILABLE:
             return None
-        
+
         if self._face_mesh_instance is None:
             with self._face_mesh_lock:
                 if self._face_mesh_instance is None:
                     try:
-                        self._face_mesh_instance = self.mp_face_mesh.FaceMesh(
-                            static_image_mode=True,
-                            max_num_faces=1,
-                            refine_landmarks=True,
-                            min_detection_confidence=0.6,
-                            min_tracking_confidence=0.5
-                        )
-                        logger.info("✅ MediaPipe FaceMesh 单例已创建")
+                        pool = self._create_pool("face_mesh")
+                        pool.warm_up()
+                        self._face_mesh_instance = pool
+                        logger.info(f"✅ MediaPipe FaceMesh 实例池已创建 (size={self.pool_size}, mode={self.mode})")
                     except Exception as e:
                         logger.info(f"⚠️  MediaPipe FaceMesh 初始化失败: {e}")
                         return None
-        
+
         return self._face_mesh_instance
-    
+
     def reset_hands(self):
-        """重置 Hands 实例（用于错误恢复）"""
+        """重置 Hands 实例池（用于错误恢复）"""
         with self._hands_lock:
             if self._hands_instance:
-                try:
-                    self._hands_instance.close()
-                except Exception:
-                    pass
+                self._hands_instance.close()
                 self._hands_instance = None
-    
+
     def reset_face_mesh(self):
-        """重置 FaceMesh 实例（用于错误恢复）"""
+        """重置 FaceMesh 实例池（用于错误恢复）"""
         with self._face_mesh_lock:
             if self._face_mesh_instance:
-                try:
-                    self._face_mesh_instance.close()
-                except Exception:
-                    pass
+                self._face_mesh_instance.close()
                 self._face_mesh_instance = None
-
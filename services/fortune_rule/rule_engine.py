@@ -11,6 +11,11 @@ import logging
 logger = logging.getLogger(__name__)
 import json
 
+from server.utils.log_budget import get_hot_logger
+
+# 融合分析逐条规则的推导过程走 DEBUG，参数只在输出时格式化
+hot_logger = get_hot_logger(__name__)
+
 
 class FortuneRuleEngine:
     """命理规则引擎（支持从数据库或硬编码加载规则）"""
@@ -1442,13 +1447,13 @@ class FortuneRuleEngine:
         integrated_insights = []
         
         if not bazi_data:
-            logger.info("⚠️  八字数据为空，跳过融合分析")
+            hot_logger.info("⚠️  八字数据为空，跳过融合分析")
             return integrated_insights
         
         # 打印八字数据
-        logger.info("\n" + "="*80)
-        logger.info("🔮 八字与手相面相融合分析")
-        logger.info("="*80)
+        hot_logger.debug("\n" + "="*80)
+        hot_logger.debug("🔮 八字与手相面相融合分析")
+        hot_logger.debug("="*80)
         
         # 获取八字信息
         five_elements = bazi_data.get("element_counts", {})
@@ -1461,28 +1466,28 @@ class FortuneRuleEngine:
             # 尝试从 totals 字段解析（最常见的情况）
             if "totals" in ten_gods_raw:
                 totals_str = ten_gods_raw.get("totals", "")
-                if isinstance(totals_str, str):
+                if isinstance(totals_str, (str, dict)):
                     try:
-                        # 将单引号替换为双引号，然后解析 JSON
-                        totals_dict = json.loads(totals_str.replace("'", '"'))
+                        # 类型化结构直接是字典；旧版是 Python repr，将单引号替换为双引号后解析 JSON
+                        totals_dict = totals_str if isinstance(totals_str, dict) else json.loads(totals_str.replace("'", '"'))
                         # 提取每个十神的 count
                         for god_name, god_info in totals_dict.items():
                             if isinstance(god_info, dict) and "count" in god_info:
                                 ten_gods[god_name] = god_info["count"]
                     except Exception as e:
-                        logger.info(f"  ⚠️  解析 totals 失败: {e}")
+                        hot_logger.debug("  ⚠️  解析 totals 失败: %s", e)
             
             # 如果 totals 解析失败，尝试从 ten_gods_total 解析
             if not ten_gods and "ten_gods_total" in ten_gods_raw:
                 total_str = ten_gods_raw.get("ten_gods_total", "")
-                if isinstance(total_str, str):
+                if isinstance(total_str, (str, dict)):
                     try:
-                        total_dict = json.loads(total_str.replace("'", '"'))
+                        total_dict = total_str if isinstance(total_str, dict) else json.loads(total_str.replace("'", '"'))
                         for god_name, god_info in total_dict.items():
                             if isinstance(god_info, dict) and "count" in god_info:
                                 ten_gods[god_name] = god_info["count"]
                     except Exception as e:
-                        logger.info(f"  ⚠️  解析 ten_gods_total 失败: {e}")
+                        hot_logger.debug("  ⚠️  解析 ten_gods_total 失败: %s", e)
             
             # 如果还是解析失败，尝试直接使用（可能是简单字典）
             if not ten_gods:
@@ -1492,10 +1497,10 @@ class FortuneRuleEngine:
                     elif isinstance(v, str) and v.isdigit():
                         ten_gods[k] = int(v)
         
-        logger.info("\n【八字数据】")
-        logger.info(f"  五行统计: {five_elements}")
-        logger.info(f"  十神统计（原始）: {ten_gods_raw}")
-        logger.info(f"  十神统计（解析后）: {ten_gods}")
+        hot_logger.debug("\n【八字数据】")
+        hot_logger.debug("  五行统计: %s", five_elements)
+        hot_logger.debug("  十神统计（原始）: %s", ten_gods_raw)
+        hot_logger.debug("  十神统计（解析后）: %s", ten_gods)
         if bazi_pillars:
             year = bazi_pillars.get("year", {})
             month = bazi_pillars.get("month", {})
@@ -1509,27 +1514,27 @@ class FortuneRuleEngine:
             day_zhi = day.get('zhi') or day.get('branch', '')
             hour_gan = hour.get('gan') or hour.get('stem', '')
             hour_zhi = hour.get('zhi') or hour.get('branch', '')
-            logger.info(f"  八字四柱: {year_gan}{year_zhi} {month_gan}{month_zhi} {day_gan}{day_zhi} {hour_gan}{hour_zhi}")
+            hot_logger.debug("  八字四柱: %s%s %s%s %s%s %s%s", year_gan, year_zhi, month_gan, month_zhi, day_gan, day_zhi, hour_gan, hour_zhi)
         
         # 打印手相特征
         if hand_features:
-            logger.info("\n【手相特征】")
+            hot_logger.debug("\n【手相特征】")
             hand_shape = hand_features.get("hand_shape", "")
             hand_shape_ratio = hand_features.get("hand_shape_ratio", 0.0)
             palm_lines = hand_features.get("palm_lines", {})
             finger_ratios = hand_features.get("finger_ratios", {})
-            logger.info(f"  手型: {hand_shape} (ratio: {hand_shape_ratio:.2f})")
-            logger.info(f"  掌纹: {palm_lines}")
-            logger.info(f"  指长比例: {finger_ratios}")
+            hot_logger.debug("  手型: %s (ratio: %.2f)", hand_shape, hand_shape_ratio)
+            hot_logger.debug("  掌纹: %s", palm_lines)
+            hot_logger.debug("  指长比例: %s", finger_ratios)
         
         # 打印面相特征
         if face_features:
-            logger.info("\n【面相特征】")
+            hot_logger.debug("\n【面相特征】")
             san_ting = face_features.get("san_ting_ratio", {})
-            logger.info(f"  三停比例: {san_ting}")
+            hot_logger.debug("  三停比例: %s", san_ting)
         
-        logger.info("\n【规则匹配过程】")
-        logger.info("-"*80)
+        hot_logger.debug("\n【规则匹配过程】")
+        hot_logger.debug("-"*80)
         
         # 五行对应关系（传统命理学）
         element_mapping = {
@@ -1557,9 +1562,9 @@ class FortuneRuleEngine:
             # 规则1.1: 方形手 + 金元素（金主收敛、刚强，方形手主稳重，同属性增强）
             rule_name = "规则1.1: 方形手 + 金元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 方形手对应金、土，金旺则财运佳，适合金融、管理")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 金元素={five_elements.get('金', 0)}, ratio={hand_shape_ratio:.2f}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 方形手对应金、土，金旺则财运佳，适合金融、管理")
+            hot_logger.debug("  检查: hand_shape='%s', 金元素=%s, ratio=%.2f", hand_shape, five_elements.get('金', 0), hand_shape_ratio)
             if hand_shape == "方形手" and five_elements.get("金", 0) > 0:
                 gold_count = five_elements.get("金", 0)
                 if gold_count >= 3:
@@ -1589,16 +1594,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='方形手'且金元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需手型='方形手'且金元素 > 0")
             
             # 规则1.2: 方形手 + 土元素（土主稳定、承载，方形手主稳重，同属性增强）
             rule_name = "规则1.2: 方形手 + 土元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 方形手对应金、土，土旺则稳定务实，适合工程、建筑")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 土元素={five_elements.get('土', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 方形手对应金、土，土旺则稳定务实，适合工程、建筑")
+            hot_logger.debug("  检查: hand_shape='%s', 土元素=%s", hand_shape, five_elements.get('土', 0))
             if hand_shape == "方形手" and five_elements.get("土", 0) >= 2:
                 insight = {
                     "category": "事业",
@@ -1607,16 +1612,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='方形手'且土元素 >= 2")
+                hot_logger.debug("  ❌ 未匹配: 需手型='方形手'且土元素 >= 2")
             
             # 规则1.3: 长方形手 + 木元素（木主生发、向上，长方形手主理性分析，同属性增强）
             rule_name = "规则1.3: 长方形手 + 木元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 长方形手对应木、金，木旺则思维活跃，适合技术、科研")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 木元素={five_elements.get('木', 0)}, ratio={hand_shape_ratio:.2f}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 长方形手对应木、金，木旺则思维活跃，适合技术、科研")
+            hot_logger.debug("  检查: hand_shape='%s', 木元素=%s, ratio=%.2f", hand_shape, five_elements.get('木', 0), hand_shape_ratio)
             if hand_shape == "长方形手" and five_elements.get("木", 0) > 0:
                 wood_count = five_elements.get("木", 0)
                 if wood_count >= 3:
@@ -1646,16 +1651,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='长方形手'且木元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需手型='长方形手'且木元素 > 0")
             
             # 规则1.4: 长方形手 + 金元素（金主收敛、刚强，长方形手主理性，同属性增强）
             rule_name = "规则1.4: 长方形手 + 金元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 长方形手对应木、金，金旺则逻辑思维强，适合金融、技术")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 金元素={five_elements.get('金', 0)}, ratio={hand_shape_ratio:.2f}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 长方形手对应木、金，金旺则逻辑思维强，适合金融、技术")
+            hot_logger.debug("  检查: hand_shape='%s', 金元素=%s, ratio=%.2f", hand_shape, five_elements.get('金', 0), hand_shape_ratio)
             if hand_shape == "长方形手" and five_elements.get("金", 0) > 0:
                 gold_count = five_elements.get("金", 0)
                 if gold_count >= 3:
@@ -1678,16 +1683,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='长方形手'且金元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需手型='长方形手'且金元素 > 0")
             
             # 规则1.5: 圆形手 + 水元素（水主流动、智慧，圆形手主灵活，同属性增强）
             rule_name = "规则1.5: 圆形手 + 水元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 圆形手对应水、木，水旺则适应能力强，适合创意、营销")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 水元素={five_elements.get('水', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 圆形手对应水、木，水旺则适应能力强，适合创意、营销")
+            hot_logger.debug("  检查: hand_shape='%s', 水元素=%s", hand_shape, five_elements.get('水', 0))
             if hand_shape == "圆形手" and five_elements.get("水", 0) > 0:
                 insight = {
                     "category": "性格",
@@ -1696,16 +1701,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='圆形手'且水元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需手型='圆形手'且水元素 > 0")
             
             # 规则1.6: 圆形手 + 木元素（木主生发、向上，圆形手主灵活，相生关系）
             rule_name = "规则1.6: 圆形手 + 木元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 圆形手对应水、木，木旺则思维活跃，适合艺术、设计")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 木元素={five_elements.get('木', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 圆形手对应水、木，木旺则思维活跃，适合艺术、设计")
+            hot_logger.debug("  检查: hand_shape='%s', 木元素=%s", hand_shape, five_elements.get('木', 0))
             if hand_shape == "圆形手" and five_elements.get("木", 0) > 0:
                 insight = {
                     "category": "天赋",
@@ -1714,16 +1719,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='圆形手'且木元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需手型='圆形手'且木元素 > 0")
             
             # 规则1.7: 尖形手 + 火元素（火主热情、向上，尖形手主理想主义，同属性增强）
             rule_name = "规则1.7: 尖形手 + 火元素"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 尖形手对应火，火旺则热情向上，适合艺术、教育")
-            logger.info(f"  检查: hand_shape='{hand_shape}', 火元素={five_elements.get('火', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 尖形手对应火，火旺则热情向上，适合艺术、教育")
+            hot_logger.debug("  检查: hand_shape='%s', 火元素=%s", hand_shape, five_elements.get('火', 0))
             if hand_shape == "尖形手" and five_elements.get("火", 0) > 0:
                 insight = {
                     "category": "天赋",
@@ -1732,18 +1737,18 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需手型='尖形手'且火元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需手型='尖形手'且火元素 > 0")
             
             # ========== 规则组2: 掌纹与五行融合（基于传统命理学对应关系）==========
             
             # 规则2.1: 生命线 + 土元素（生命线对应土，土主稳定承载，健康根基）
             rule_name = "规则2.1: 生命线 + 土元素（健康根基）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 生命线对应土，土旺则健康根基稳固，土弱则需注意脾胃")
-            logger.info(f"  检查: life_line='{life_line}', 土元素={five_elements.get('土', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 生命线对应土，土旺则健康根基稳固，土弱则需注意脾胃")
+            hot_logger.debug("  检查: life_line='%s', 土元素=%s", life_line, five_elements.get('土', 0))
             if "深" in life_line or "长" in life_line:
                 earth_count = five_elements.get("土", 0)
                 
@@ -1766,7 +1771,7 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功（土弱）: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功（土弱）: %s", insight['content'])
                 elif earth_count >= 3:
                     insight = {
                         "category": "健康",
@@ -1775,7 +1780,7 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功（土旺）: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功（土旺）: %s", insight['content'])
                 else:
                     insight = {
                         "category": "健康",
@@ -1784,16 +1789,16 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功（土适中）: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功（土适中）: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 生命线不满足条件（需包含'深'或'长'）")
+                hot_logger.debug("  ❌ 未匹配: 生命线不满足条件（需包含'深'或'长'）")
             
             # 规则2.2: 智慧线 + 木元素（智慧线对应木，木主生发向上，学习思维）
             rule_name = "规则2.2: 智慧线 + 木元素（学习思维）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 智慧线对应木，木旺则学习能力强，思维敏捷")
-            logger.info(f"  检查: head_line='{head_line}', 木元素={five_elements.get('木', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 智慧线对应木，木旺则学习能力强，思维敏捷")
+            hot_logger.debug("  检查: head_line='%s', 木元素=%s", head_line, five_elements.get('木', 0))
             if "清晰" in head_line or "深长" in head_line:
                 if five_elements.get("木", 0) > 0:
                     insight = {
@@ -1803,18 +1808,18 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
                 else:
-                    logger.info(f"  ❌ 未匹配: 智慧线满足条件，但木元素为 {five_elements.get('木', 0)}（需 > 0）")
+                    hot_logger.debug("  ❌ 未匹配: 智慧线满足条件，但木元素为 %s（需 > 0）", five_elements.get('木', 0))
             else:
-                logger.info(f"  ❌ 未匹配: 智慧线不满足条件（需包含'清晰'或'深长'）")
+                hot_logger.debug("  ❌ 未匹配: 智慧线不满足条件（需包含'清晰'或'深长'）")
             
             # 规则2.3: 感情线 + 十神（感情线对应水、火，正官正财主稳定和谐）
             rule_name = "规则2.3: 感情线 + 十神（感情婚姻）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 感情线对应水、火，正官正财主感情稳定，婚姻和谐")
-            logger.info(f"  检查: heart_line='{heart_line}', 正官={ten_gods.get('正官', 0)}, 正财={ten_gods.get('正财', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 感情线对应水、火，正官正财主感情稳定，婚姻和谐")
+            hot_logger.debug("  检查: heart_line='%s', 正官=%s, 正财=%s", heart_line, ten_gods.get('正官', 0), ten_gods.get('正财', 0))
             if "明显" in heart_line or "深长" in heart_line:
                 zheng_guan = ten_gods.get("正官", 0)
                 zheng_cai = ten_gods.get("正财", 0)
@@ -1860,19 +1865,19 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
                 else:
-                    logger.info(f"  ❌ 未匹配: 感情线满足条件，但正官={zheng_guan}, 正财={zheng_cai}（需至少一个 > 0）")
+                    hot_logger.debug("  ❌ 未匹配: 感情线满足条件，但正官=%s, 正财=%s（需至少一个 > 0）", zheng_guan, zheng_cai)
             else:
-                logger.info(f"  ❌ 未匹配: 感情线不满足条件（需包含'明显'或'深长'）")
+                hot_logger.debug("  ❌ 未匹配: 感情线不满足条件（需包含'明显'或'深长'）")
             
             # 规则2.4: 事业线 + 金元素（事业线对应金、火，金主收敛刚强，事业成就）
             rule_name = "规则2.4: 事业线 + 金元素（事业成就）"
             scanned_rules.append(rule_name)
             fate_line = hand_features.get("palm_lines", {}).get("fate_line", "")
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 事业线对应金、火，金旺则事业有成，适合管理、金融")
-            logger.info(f"  检查: fate_line='{fate_line}', 金元素={five_elements.get('金', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 事业线对应金、火，金旺则事业有成，适合管理、金融")
+            hot_logger.debug("  检查: fate_line='%s', 金元素=%s", fate_line, five_elements.get('金', 0))
             if ("明显" in fate_line or "深长" in fate_line) and five_elements.get("金", 0) > 0:
                 insight = {
                     "category": "事业",
@@ -1881,23 +1886,23 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需事业线包含'明显'或'深长'且金元素 > 0")
+                hot_logger.debug("  ❌ 未匹配: 需事业线包含'明显'或'深长'且金元素 > 0")
             
             # ========== 规则组3: 指长与五行融合（基于传统命理学对应关系）==========
             
             # 规则3.1: 指长比例 + 五行天赋（个性化内容）
             rule_name = "规则3.1: 指长比例 + 五行天赋"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
+            hot_logger.debug("\n%s", rule_name)
             if finger_ratios:
                 index_ratio = finger_ratios.get("index", 0)
                 ring_ratio = finger_ratios.get("ring", 0)
                 middle_ratio = finger_ratios.get("middle", 1.0)
                 gold_count = five_elements.get("金", 0)
                 wood_count = five_elements.get("木", 0)
-                logger.info(f"  检查: 食指比例={index_ratio:.2f}, 无名指比例={ring_ratio:.2f}, 中指比例={middle_ratio:.2f}, 金元素={gold_count}, 木元素={wood_count}")
+                hot_logger.debug("  检查: 食指比例=%.2f, 无名指比例=%.2f, 中指比例=%.2f, 金元素=%s, 木元素=%s", index_ratio, ring_ratio, middle_ratio, gold_count, wood_count)
                 
                 # 食指长 + 金元素（根据差异程度个性化）
                 if index_ratio > ring_ratio * 1.05 and gold_count > 0:
@@ -1926,7 +1931,7 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功（食指长）: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功（食指长）: %s", insight['content'])
                 
                 # 无名指长 + 木元素（根据差异程度个性化）
                 elif ring_ratio > index_ratio * 1.05 and wood_count > 0:
@@ -1955,7 +1960,7 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功（无名指长）: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功（无名指长）: %s", insight['content'])
                 
                 # 中指长 + 木元素（新增）
                 elif middle_ratio > 1.1 and wood_count > 0:
@@ -1966,11 +1971,11 @@ class FortuneRuleEngine:
                         "source": "integrated"
                     }
                     integrated_insights.append(insight)
-                    logger.info(f"  ✅ 匹配成功（中指长）: {insight['content']}")
+                    hot_logger.debug("  ✅ 匹配成功（中指长）: %s", insight['content'])
                 else:
-                    logger.info(f"  ❌ 未匹配: 指长比例或五行元素不满足条件")
+                    hot_logger.debug("  ❌ 未匹配: 指长比例或五行元素不满足条件")
             else:
-                logger.info(f"  ❌ 未匹配: 指长比例数据为空")
+                hot_logger.debug("  ❌ 未匹配: 指长比例数据为空")
         
         # ========== 规则组4: 面相与五行融合（基于传统命理学对应关系）==========
         if face_features:
@@ -1984,9 +1989,9 @@ class FortuneRuleEngine:
             # 规则4.1: 上停 + 木元素（上停对应早年，木主生发向上，学习运）
             rule_name = "规则4.1: 上停 + 木元素（早年学习运）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 上停对应早年运势，木主生发向上，学习能力强")
-            logger.info(f"  检查: 上停比例={upper:.2%}, 木元素={five_elements.get('木', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 上停对应早年运势，木主生发向上，学习能力强")
+            hot_logger.debug("  检查: 上停比例=%.2f%%, 木元素=%s", upper * 100, five_elements.get('木', 0))
             if upper > 0.35 and five_elements.get("木", 0) > 0:
                 wood_count = five_elements.get("木", 0)
                 if wood_count >= 3:
@@ -2014,16 +2019,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 上停比例={upper:.2%}（需 > 35%）或木元素={five_elements.get('木', 0)}（需 > 0）")
+                hot_logger.debug("  ❌ 未匹配: 上停比例=%.2f%%（需 > 35%%）或木元素=%s（需 > 0）", upper * 100, five_elements.get('木', 0))
             
             # 规则4.2: 中停 + 火元素（中停对应中年，火主热情向上，事业运）
             rule_name = "规则4.2: 中停 + 火元素（中年事业运）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 中停对应中年运势，火主热情向上，事业发展好")
-            logger.info(f"  检查: 中停比例={middle:.2%}, 火元素={five_elements.get('火', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 中停对应中年运势，火主热情向上，事业发展好")
+            hot_logger.debug("  检查: 中停比例=%.2f%%, 火元素=%s", middle * 100, five_elements.get('火', 0))
             if middle > 0.35 and five_elements.get("火", 0) > 0:
                 fire_count = five_elements.get("火", 0)
                 if fire_count >= 3:
@@ -2051,16 +2056,16 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 中停比例={middle:.2%}（需 > 35%）或火元素={five_elements.get('火', 0)}（需 > 0）")
+                hot_logger.debug("  ❌ 未匹配: 中停比例=%.2f%%（需 > 35%%）或火元素=%s（需 > 0）", middle * 100, five_elements.get('火', 0))
             
             # 规则4.3: 下停 + 土元素（下停对应晚年，土主稳定承载，晚年运）
             rule_name = "规则4.3: 下停 + 土元素（晚年运势）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
-            logger.info(f"  原理: 下停对应晚年运势，土主稳定承载，晚年有福")
-            logger.info(f"  检查: 下停比例={lower:.2%}, 土元素={five_elements.get('土', 0)}")
+            hot_logger.debug("\n%s", rule_name)
+            hot_logger.debug("  原理: 下停对应晚年运势，土主稳定承载，晚年有福")
+            hot_logger.debug("  检查: 下停比例=%.2f%%, 土元素=%s", lower * 100, five_elements.get('土', 0))
             if lower > 0.35 and five_elements.get("土", 0) > 0:
                 earth_count = five_elements.get("土", 0)
                 if earth_count >= 3:
@@ -2088,18 +2093,18 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 下停比例={lower:.2%}（需 > 35%）或土元素={five_elements.get('土', 0)}（需 > 0）")
+                hot_logger.debug("  ❌ 未匹配: 下停比例=%.2f%%（需 > 35%%）或土元素=%s（需 > 0）", lower * 100, five_elements.get('土', 0))
             
             # 规则4.4: 鼻子 + 金元素（鼻子对应财运，金主收敛刚强，财运）
             rule_name = "规则4.4: 鼻子 + 金元素（财运）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
+            hot_logger.debug("\n%s", rule_name)
             nose_height = measurements.get("nose_height", 0)
             nose_ratio = measurements.get("nose_ratio", 0)
-            logger.info(f"  原理: 鼻子对应财运，金主收敛刚强，财运佳")
-            logger.info(f"  检查: 鼻子高度={nose_height:.1f}, 比例={nose_ratio:.2f}, 金元素={five_elements.get('金', 0)}")
+            hot_logger.debug("  原理: 鼻子对应财运，金主收敛刚强，财运佳")
+            hot_logger.debug("  检查: 鼻子高度=%.1f, 比例=%.2f, 金元素=%s", nose_height, nose_ratio, five_elements.get('金', 0))
             if (nose_ratio > 2.0 or nose_height > 50) and five_elements.get("金", 0) > 0:
                 gold_count = five_elements.get("金", 0)
                 if gold_count >= 3:
@@ -2129,18 +2134,18 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需鼻子高挺（比例>2.0或高度>50）且金元素>0")
+                hot_logger.debug("  ❌ 未匹配: 需鼻子高挺（比例>2.0或高度>50）且金元素>0")
             
             # 规则4.5: 额头 + 木元素（额头对应智慧，木主生发向上，学习能力）
             rule_name = "规则4.5: 额头 + 木元素（智慧学习）"
             scanned_rules.append(rule_name)
-            logger.info(f"\n{rule_name}")
+            hot_logger.debug("\n%s", rule_name)
             forehead_width = measurements.get("forehead_width", 0)
             forehead_ratio = measurements.get("forehead_ratio", 0)
-            logger.info(f"  原理: 额头对应智慧，木主生发向上，学习能力强")
-            logger.info(f"  检查: 额头宽度={forehead_width:.1f}, 比例={forehead_ratio:.2f}, 木元素={five_elements.get('木', 0)}")
+            hot_logger.debug("  原理: 额头对应智慧，木主生发向上，学习能力强")
+            hot_logger.debug("  检查: 额头宽度=%.1f, 比例=%.2f, 木元素=%s", forehead_width, forehead_ratio, five_elements.get('木', 0))
             if (forehead_ratio > 1.2 or forehead_width > 100) and five_elements.get("木", 0) > 0:
                 wood_count = five_elements.get("木", 0)
                 if wood_count >= 3:
@@ -2170,13 +2175,13 @@ class FortuneRuleEngine:
                     "source": "integrated"
                 }
                 integrated_insights.append(insight)
-                logger.info(f"  ✅ 匹配成功: {insight['content']}")
+                hot_logger.debug("  ✅ 匹配成功: %s", insight['content'])
             else:
-                logger.info(f"  ❌ 未匹配: 需额头宽阔（比例>1.2或宽度>100）且木元素>0")
+                hot_logger.debug("  ❌ 未匹配: 需额头宽阔（比例>1.2或宽度>100）且木元素>0")
         
         # 托底方案：如果融合分析匹配到的规则太少，生成基础融合分析
         if len(integrated_insights) < 3:
-            logger.info(f"\n⚠️  融合分析匹配到的规则较少（{len(integrated_insights)}条），启用托底方案生成基础融合分析...")
+            hot_logger.info("\n⚠️  融合分析匹配到的规则较少（%s条），启用托底方案生成基础融合分析...", len(integrated_insights))
             
             # 基于五行生成基础融合分析
             if five_elements:
@@ -2194,7 +2199,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: 金元素较旺，财运分析")
+                        hot_logger.debug("  ✅ 托底融合分析: 金元素较旺，财运分析")
                     elif element_name == "木" and element_count >= 2:
                         integrated_insights.append({
                             "category": "学习",
@@ -2202,7 +2207,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: 木元素较旺，学习分析")
+                        hot_logger.debug("  ✅ 托底融合分析: 木元素较旺，学习分析")
                     elif element_name == "土" and element_count >= 3:
                         integrated_insights.append({
                             "category": "事业",
@@ -2210,7 +2215,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: 土元素较旺，事业分析")
+                        hot_logger.debug("  ✅ 托底融合分析: 土元素较旺，事业分析")
                     elif element_name == "火" and element_count >= 2:
                         integrated_insights.append({
                             "category": "性格",
@@ -2218,7 +2223,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: 火元素较旺，性格分析")
+                        hot_logger.debug("  ✅ 托底融合分析: 火元素较旺，性格分析")
                     elif element_name == "水" and element_count >= 2:
                         integrated_insights.append({
                             "category": "智慧",
@@ -2226,7 +2231,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: 水元素较旺，智慧分析")
+                        hot_logger.debug("  ✅ 托底融合分析: 水元素较旺，智慧分析")
             
             # 基于十神生成基础融合分析
             if ten_gods and len(integrated_insights) < 3:
@@ -2241,7 +2246,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: {god_name}较旺，财运分析")
+                        hot_logger.debug("  ✅ 托底融合分析: %s较旺，财运分析", god_name)
                     elif god_name == "正官" or god_name == "七杀":
                         integrated_insights.append({
                             "category": "事业",
@@ -2249,7 +2254,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: {god_name}较旺，事业分析")
+                        hot_logger.debug("  ✅ 托底融合分析: %s较旺，事业分析", god_name)
                     elif god_name == "正印" or god_name == "偏印":
                         integrated_insights.append({
                             "category": "学习",
@@ -2257,7 +2262,7 @@ class FortuneRuleEngine:
                             "confidence": 0.7,
                             "source": "integrated"
                         })
-                        logger.info(f"  ✅ 托底融合分析: {god_name}较旺，学习分析")
+                        hot_logger.debug("  ✅ 托底融合分析: %s较旺，学习分析", god_name)
             
             # 如果还是没有足够的洞察，生成通用融合分析
             if len(integrated_insights) < 2:
@@ -2279,21 +2284,21 @@ class FortuneRuleEngine:
                             "confidence": 0.65,
                             "source": "integrated"
                         })
-                    logger.info(f"  ✅ 托底融合分析: 生成通用融合综合分析")
+                    hot_logger.debug("  ✅ 托底融合分析: 生成通用融合综合分析")
         
         # 打印最终结果
-        logger.info("\n" + "-"*80)
-        logger.info(f"【融合分析结果】")
-        logger.info(f"  扫描的规则总数: {len(scanned_rules)}")
-        logger.info(f"  匹配成功的规则数: {len(integrated_insights)}")
-        logger.info(f"\n  扫描的规则列表:")
+        hot_logger.debug("\n" + "-"*80)
+        hot_logger.debug("【融合分析结果】")
+        hot_logger.debug("  扫描的规则总数: %s", len(scanned_rules))
+        hot_logger.debug("  匹配成功的规则数: %s", len(integrated_insights))
+        hot_logger.debug("\n  扫描的规则列表:")
         for i, rule in enumerate(scanned_rules, 1):
-            logger.info(f"    {i}. {rule}")
-        logger.info(f"\n  匹配成功的规则:")
+            hot_logger.debug("    %s. %s", i, rule)
+        hot_logger.debug("\n  匹配成功的规则:")
         for i, insight in enumerate(integrated_insights, 1):
-            logger.info(f"    {i}. [{insight['category']}] {insight['content']} (置信度: {insight['confidence']})")
-        logger.info("="*80)
-        logger.info(f"✅ 融合分析完成，共扫描 {len(scanned_rules)} 条规则，匹配到 {len(integrated_insights)} 条规则\n")
+            hot_logger.debug("    %s. [%s] %s (置信度: %s)", i, insight['category'], insight['content'], insight['confidence'])
+        hot_logger.debug("="*80)
+        hot_logger.info("✅ 融合分析完成，共扫描 %s 条规则，匹配到 %s 条规则\n", len(scanned_rules), len(integrated_insights))
         
         # 合并和提炼重复内容
         integrated_insights = self._merge_and_refine_insights(integrated_insights)
@@ -15,8 +15,13 @@ from typing import Dict, Any, Optional, List
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+from shared.utils.image_result_cache import ImageResultCache
+
 logger = logging.getLogger(__name__)
 
+# 视觉识别结果缓存（同一张图重复上传时跳过 Qwen-VL 调用）
+_result_cache = ImageResultCache("home_vision")
+
 # 各房间类型识别Prompt
 ROOM_PROMPTS = {
     'bedroom': """请分析这张卧室照片，识别室内家具和布局，以JSON格式输出：
@@ -188,12 +193,20 @@ class HomeFengshuiVisionAnalyzer:
 
     async def analyze(self, image_bytes: bytes, room_type: str = 'bedroom') -> Dict[str, Any]:
         """
-        调用百炼 Qwen-VL 智能体识别室内家具
+        调用百炼 Qwen-VL 智能体识别室内家具（按图片内容 + 房间类型缓存识别结果）
 
         Args:
             image_bytes: 图片字节
             room_type: 房间类型；传 'auto' 或空字符串时自动识别
         """
+        return await _result_cache.aget_or_compute(
+            image_bytes,
+            lambda: self._analyze_uncached(image_bytes, room_type),
+            params={'room_type': room_type or 'auto'},
+        )
+
+    async def _analyze_uncached(self, image_bytes: bytes, room_type: str = 'bedroom') -> Dict[str, Any]:
+        """调用百炼 Qwen-VL 智能体识别室内家具（不经过缓存）"""
         try:
             self._ensure_sdk()
             from dashscope import Application
@@ -9,7 +9,15 @@ import re
 from datetime import datetime
 from services.intent_service.llm_client import IntentLLMClient
 from services.intent_service.rule_postprocessor import RulePostProcessor
-from services.intent_service.config import INTENT_CATEGORIES, INTENT_TO_RULE_TYPE_MAP
+from services.intent_service.config import (
+    INTENT_CATEGORIES,
+    INTENT_TO_RULE_TYPE_MAP,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+    SEMANTIC_CACHE_MAX_ENTRIES
+)
+from services.intent_service.semantic_cache import SemanticIntentCache
 from services.intent_service.logger import logger  # ✅ 先导入 logger
 
 # 优先使用 V2 版本（sentence-transformers，准确率85%+）
@@ -286,8 +294,24 @@ class IntentClassifier:
         self.post_processor = RulePostProcessor()
         self.intent_categories = INTENT_CATEGORIES
         self.rule_type_map = INTENT_TO_RULE_TYPE_MAP
+        self.semantic_cache = self._create_semantic_cache() if SEMANTIC_CACHE_ENABLED else None
         logger.info("IntentClassifier initialized (Hybrid Architecture)")
     
+    def _create_semantic_cache(self) -> SemanticIntentCache:
+        """创建LLM兜底语义缓存（复用本地分类器已加载的 sentence-transformers 模型做嵌入）"""
+        model = getattr(self.local_classifier, "model", None)
+        encoder = None
+        if model is not None and getattr(self.local_classifier, "model_loaded", False):
+            encoder = lambda text: model.encode(text, convert_to_numpy=True)
+        logger.info(f"[IntentClassifier] 语义缓存已启用: encoder={'sentence_transformer' if encoder else 'hash'}, "
+                    f"threshold={SEMANTIC_CACHE_THRESHOLD}, ttl={SEMANTIC_CACHE_TTL}s")
+        return SemanticIntentCache(
+            encoder=encoder,
+            similarity_threshold=SEMANTIC_CACHE_THRESHOLD,
+            ttl=SEMANTIC_CACHE_TTL,
+            max_entries=SEMANTIC_CACHE_MAX_ENTRIES
+        )
+    
     def classify(
         self,
         question: str,
@@ -386,15 +410,26 @@ class IntentClassifier:
                 logger.info(f"[IntentClassifier][{request_id}] [第2层] 🔄 进入LLM兜底流程 (confidence={local_confidence:.2f}, method={local_method})")
                 llm_start = time.time()
                 try:
-                    # 使用LLM兜底
-                    logger.info(f"[IntentClassifier][{request_id}] [第2层-LLM] 调用LLM API...")
-                    llm_result = self.llm_client.call_coze_api(
-                        question=question,
-                        prompt_template=INTENT_CLASSIFICATION_PROMPT,
-                        use_cache=use_cache,
-                        prompt_version=prompt_version
-                    )
-                    llm_time = int((time.time() - llm_start) * 1000)
+                    # 先查语义缓存（近似问题复用LLM结果）
+                    llm_result = None
+                    use_semantic_cache = use_cache and self.semantic_cache is not None
+                    if use_semantic_cache:
+                        llm_result = self.semantic_cache.get(question, prompt_version)
+                    if llm_result is not None:
+                        llm_time = int((time.time() - llm_start) * 1000)
+                        logger.info(f"[IntentClassifier][{request_id}] [第2层-LLM] ✅ 语义缓存命中，跳过LLM调用")
+                    else:
+                        # 使用LLM兜底
+                        logger.info(f"[IntentClassifier][{request_id}] [第2层-LLM] 调用LLM API...")
+                        llm_result = self.llm_client.call_coze_api(
+                            question=question,
+                            prompt_template=INTENT_CLASSIFICATION_PROMPT,
+                            use_cache=use_cache,
+                            prompt_version=prompt_version
+                        )
+                        llm_time = int((time.time() - llm_start) * 1000)
+                        if use_semantic_cache:
+                            self.semantic_cache.put(question, prompt_version, llm_result, llm_time)
                     logger.info(f"[IntentClassifier][{request_id}] [第2层-LLM] ✅ LLM调用完成: "
                                f"intents={llm_result.get('intents')}, "
                                f"confidence={llm_result.get('confidence', 0):.2f}, "
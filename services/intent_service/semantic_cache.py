@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+LLM兜底结果语义缓存
+
+近似问题（如"明年财运" / "明年的财运怎么样"）复用已有的 LLM 兜底分类结果：
+- 问题先做归一化（去标点、语气词），归一化后完全一致直接命中
+- 否则按问题嵌入向量的余弦相似度匹配，超过阈值即命中
+- 按 TTL + LRU 淘汰，容量固定
+- 命中率、节省的 LLM 耗时导出到 MetricsCollector
+
+时间意图不参与缓存：RulePostProcessor 会根据原问题重新解析 time_intent，
+所以"明年财运"与"2028年财运"即使命中同一条目，时间范围仍各自正确。
+"""
+import copy
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# 与 services.intent_service.logger 同名，避免导入 config（config 导入时需读库）
+logger = logging.getLogger("intent_service")
+
+try:
+    from server.observability.metrics_collector import get_metrics
+    _METRICS_AVAILABLE = True
+except ImportError:
+    _METRICS_AVAILABLE = False
+
+# 归一化时去掉的语气词/虚词（不影响意图判断）
+_FILLER_PATTERN = re.compile(r"(怎么样|怎样|如何|好不好|会不会|能不能|是不是|请问|帮我|看看|一下|我的|我|的|了|吗|呢|吧|啊|呀)")
+_PUNCT_PATTERN = re.compile(r"[\s\?？!！,，。\.、;；:：~～…\"'“”‘’（）()]+")
+
+# 不依赖模型的回退嵌入维度（字符 unigram + bigram 哈希）
+_HASH_EMBEDDING_DIM = 512
+
+# 缓存条目中不保存的字段（由调用方/后处理按原问题重新生成）
+_VOLATILE_FIELDS = ("time_intent", "response_time_ms", "rule_types", "prompt_version", "method")
+
+
+def normalize_question(question: str) -> str:
+    """问题归一化：去标点、语气词，保留意图与时间关键词"""
+    text = _PUNCT_PATTERN.sub("", question or "")
+    normalized = _FILLER_PATTERN.sub("", text)
+    # 全部被过滤时保留去标点后的文本，避免空键
+    return normalized or text
+
+
+def hash_embedding(text: str, dim: int = _HASH_EMBEDDING_DIM) -> np.ndarray:
+    """字符 unigram + bigram 哈希嵌入（sentence-transformers 不可用时的回退方案）"""
+    vec = np.zeros(dim, dtype=np.float32)
+    for ch in text:
+        vec[zlib.crc32(ch.encode("utf-8")) % dim] += 1.0
+    for i in range(len(text) - 1):
+        vec[zlib.crc32(text[i:i + 2].encode("utf-8")) % dim] += 1.0
+    return vec
+
+
+@dataclass
+class _CacheEntry:
+    """缓存条目"""
+    normalized: str
+    embedding: np.ndarray
+    result: Dict[str, Any]
+    llm_time_ms: int
+    expires_at: float
+
+
+class SemanticIntentCache:
+    """
+    LLM 兜底结果语义缓存（线程安全）
+
+    使用示例：
+        cache = SemanticIntentCache(encoder=model.encode)
+        cached = cache.get(question, prompt_version)
+        if cached is None:
+            result = llm_client.call_coze_api(...)
+            cache.put(question, prompt_version, result, llm_time_ms)
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Callable[[str], Any]] = None,
+        similarity_threshold: float = 0.92,
+        ttl: int = 3600,
+        max_entries: int = 2048,
+    ):
+        """
+        Args:
+            encoder: 文本嵌入函数（通常为 SentenceTransformer.encode），None 时使用哈希嵌入
+            similarity_threshold: 余弦相似度命中阈值
+            ttl: 条目有效期（秒）
+            max_entries: 最大条目数，超出按 LRU 淘汰
+        """
+        self._encoder = encoder
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # prompt_version -> OrderedDict[normalized, _CacheEntry]，不同 Prompt 版本互不命中
+        self._entries: Dict[str, "OrderedDict[str, _CacheEntry]"] = {}
+        # prompt_version -> (keys, 单位化嵌入矩阵)，写入/淘汰时失效
+        self._matrix_cache: Dict[str, Tuple[list, np.ndarray]] = {}
+        self._stats = {"hits": 0, "exact_hits": 0, "misses": 0, "evictions": 0, "saved_ms": 0}
+
+        if _METRICS_AVAILABLE:
+            metrics = get_metrics()
+            self._hit_counter = metrics.counter("intent_semantic_cache_hits_total", "意图语义缓存命中次数", ["match"])
+            self._miss_counter = metrics.counter("intent_semantic_cache_misses_total", "意图语义缓存未命中次数")
+            self._saved_counter = metrics.counter("intent_semantic_cache_saved_ms_total", "语义缓存节省的LLM耗时(ms)")
+            self._size_gauge = metrics.gauge("intent_semantic_cache_entries", "意图语义缓存条目数")
+        else:
+            self._hit_counter = self._miss_counter = self._saved_counter = self._size_gauge = None
+
+    # ---------------------------------------------------------------- 对外接口
+
+    def get(self, question: str, prompt_version: str = "v1.0") -> Optional[Dict[str, Any]]:
+        """查找语义相近的已缓存结果，未命中返回 None"""
+        normalized = normalize_question(question)
+        now = time.time()
+
+        with self._lock:
+            entries = self._entries.get(prompt_version)
+            if entries:
+                self._purge_expired(prompt_version, entries, now)
+            entry = entries.get(normalized) if entries else None
+            need_semantic = entry is None and bool(entries)
+
+        match = "exact"
+        similarity = 1.0
+        # 编码器推理在锁外执行，避免并发查询排队等待模型
+        embedding = self._embed(normalized) if need_semantic else None
+
+        with self._lock:
+            entries = self._entries.get(prompt_version)
+            if embedding is not None and entries:
+                entry, similarity = self._nearest(prompt_version, entries, embedding)
+                match = "semantic"
+                if entry is not None and similarity < self.similarity_threshold:
+                    entry = None
+            elif entry is not None and (not entries or entries.get(entry.normalized) is not entry):
+                entry = None  # 两次加锁之间已被淘汰
+
+            if entry is None:
+                self._stats["misses"] += 1
+                if self._miss_counter:
+                    self._miss_counter.inc()
+                return None
+
+            entries.move_to_end(entry.normalized)
+            self._stats["hits"] += 1
+            if match == "exact":
+                self._stats["exact_hits"] += 1
+            self._stats["saved_ms"] += entry.llm_time_ms
+            if self._hit_counter:
+                self._hit_counter.inc(match=match)
+                self._saved_counter.inc(entry.llm_time_ms)
+            result = copy.deepcopy(entry.result)
+
+        logger.info(f"[SemanticIntentCache] ✅ 命中({match}): question={question[:50]}, "
+                    f"matched={entry.normalized[:50]}, similarity={similarity:.3f}")
+        return result
+
+    def put(
+        self,
+        question: str,
+        prompt_version: str,
+        result: Dict[str, Any],
+        llm_time_ms: int = 0,
+    ) -> None:
+        """写入 LLM 兜底结果（只保存意图部分，时间意图等字段不缓存）"""
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        stored = {k: copy.deepcopy(v) for k, v in result.items() if k not in _VOLATILE_FIELDS}
+        embedding = self._embed(normalized)
+
+        with self._lock:
+            entries = self._entries.setdefault(prompt_version, OrderedDict())
+            entries[normalized] = _CacheEntry(
+                normalized=normalized,
+                embedding=embedding,
+                result=stored,
+                llm_time_ms=int(llm_time_ms),
+                expires_at=time.time() + self.ttl,
+            )
+            entries.move_to_end(normalized)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            self._matrix_cache.pop(prompt_version, None)
+            self._update_size_gauge()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._matrix_cache.clear()
+            self._update_size_gauge()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息（命中率、节省耗时）"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = sum(len(e) for e in self._entries.values())
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 4) if total else 0.0
+        return stats
+
+    # ---------------------------------------------------------------- 内部实现
+
+    def _embed(self, text: str) -> np.ndarray:
+        """计算单位化嵌入向量（编码器异常时回退到哈希嵌入）"""
+        vec = None
+        if self._encoder is not None:
+            try:
+                vec = np.asarray(self._encoder(text), dtype=np.float32).reshape(-1)
+            except Exception as e:
+                logger.warning(f"[SemanticIntentCache] ⚠️ 编码器失败，使用哈希嵌入: {e}")
+        if vec is None:
+            vec = hash_embedding(text)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    def _nearest(
+        self,
+        prompt_version: str,
+        entries: "OrderedDict[str, _CacheEntry]",
+        query: np.ndarray,
+    ) -> Tuple[Optional[_CacheEntry], float]:
+        """返回余弦相似度最高的条目（调用方持锁）"""
+        cached = self._matrix_cache.get(prompt_version)
+        if cached is None:
+            keys = list(entries.keys())
+            matrix = np.stack([entries[k].embedding for k in keys])
+            cached = (keys, matrix)
+            self._matrix_cache[prompt_version] = cached
+        keys, matrix = cached
+        if matrix.shape[1] != query.shape[0]:
+            return None, 0.0
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        return entries[keys[best]], float(scores[best])
+
+    def _purge_expired(self, prompt_version: str, entries: "OrderedDict[str, _CacheEntry]", now: float) -> None:
+        """清理过期条目（调用方持锁）"""
+        expired = [k for k, e in entries.items() if e.expires_at <= now]
+        if not expired:
+            return
+        for k in expired:
+            del entries[k]
+        self._stats["evictions"] += len(expired)
+        self._matrix_cache.pop(prompt_version, None)
+        self._update_size_gauge()
+
+    def _update_size_gauge(self) -> None:
+        if self._size_gauge:
+            self._size_gauge.set(sum(len(e) for e in self._entries.values()))
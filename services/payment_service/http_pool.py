@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+支付渠道出站 HTTP 连接池与 OAuth 令牌缓存
+
+各支付客户端原先直接调用 requests.post / requests.get，每次请求都要重新建立
+TCP + TLS 连接；PayPal 还会在多个代码路径上重新请求 /v1/oauth2/token。
+
+- get_http_session(provider)：按支付渠道复用 keep-alive 连接池，未显式传入
+  timeout 时使用该渠道的默认 (连接, 读取) 超时；fork 后的子进程自动重建，不共享套接字
+- get_cached_token(provider, merchant, fetch)：按 (渠道, 商户) 缓存访问令牌，
+  遵守 expires_in 并提前刷新；进程内同一 key 只有一个线程刷新，跨 worker 通过
+  Redis 共享令牌并以 SET NX 锁保证只有一个 worker 请求令牌接口
+
+环境变量：
+    PAYMENT_HTTP_POOL_SIZE            每个渠道的连接池大小（默认 20）
+    PAYMENT_HTTP_CONNECT_TIMEOUT      默认连接超时（秒，默认 5）
+    PAYMENT_HTTP_READ_TIMEOUT         默认读取超时（秒，默认 30）
+    PAYMENT_HTTP_TIMEOUT_<PROVIDER>   渠道超时覆盖，格式 "连接,读取"（如 PAYMENT_HTTP_TIMEOUT_PAYPAL=3,20）
+    PAYMENT_TOKEN_REFRESH_MARGIN      令牌过期前提前刷新的秒数（默认 300）
+
+使用示例：
+    response = get_http_session("paypal").post(url, headers=headers, json=data)
+    token = get_cached_token("paypal", f"{mode}:{client_id}", fetch_token)  # fetch_token() -> (token, expires_in)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_HTTP_POOL_SIZE = int(os.getenv("PAYMENT_HTTP_POOL_SIZE", "20"))
+PAYMENT_HTTP_CONNECT_TIMEOUT = float(os.getenv("PAYMENT_HTTP_CONNECT_TIMEOUT", "5"))
+PAYMENT_HTTP_READ_TIMEOUT = float(os.getenv("PAYMENT_HTTP_READ_TIMEOUT", "30"))
+PAYMENT_TOKEN_REFRESH_MARGIN = int(os.getenv("PAYMENT_TOKEN_REFRESH_MARGIN", "300"))
+
+_TOKEN_KEY_PREFIX = "payment:oauth_token"
+_TOKEN_LOCK_TTL_MS = 10000       # 跨 worker 刷新锁的最长持有时间
+_TOKEN_WAIT_SECONDS = 3.0        # 未拿到锁时等待其他 worker 写入令牌的最长时间
+_TOKEN_WAIT_INTERVAL = 0.05
+
+
+def provider_timeout(provider: str) -> Tuple[float, float]:
+    """渠道默认的 (连接, 读取) 超时"""
+    override = os.getenv(f"PAYMENT_HTTP_TIMEOUT_{provider.upper()}")
+    if override:
+        try:
+            connect, read = (float(part) for part in override.split(","))
+            return connect, read
+        except ValueError:
+            logger.warning(f"PAYMENT_HTTP_TIMEOUT_{provider.upper()} 格式无效（应为 \"连接,读取\"）: {override}")
+    return PAYMENT_HTTP_CONNECT_TIMEOUT, PAYMENT_HTTP_READ_TIMEOUT
+
+
+if requests is not None:
+    class PaymentHttpSession(requests.Session):
+        """带渠道默认超时的 Session（调用方显式传入 timeout 时以调用方为准）"""
+
+        def __init__(self, provider: str):
+            super().__init__()
+            self.provider = provider
+            self.default_timeout = provider_timeout(provider)
+            # 支付请求不自动重试（非幂等），只复用连接
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PAYMENT_HTTP_POOL_SIZE, max_retries=0)
+            self.mount("https://", adapter)
+            self.mount("http://", adapter)
+
+        def request(self, method, url, **kwargs):
+            kwargs.setdefault("timeout", self.default_timeout)
+            return super().request(method, url, **kwargs)
+
+
+_sessions: Dict[str, "PaymentHttpSession"] = {}
+_sessions_pid = os.getpid()
+_sessions_lock = threading.Lock()
+
+
+def get_http_session(provider: str) -> "PaymentHttpSession":
+    """获取支付渠道的共享 HTTP Session（进程内按渠道复用）"""
+    global _sessions_pid
+    if requests is None:
+        raise RuntimeError("requests 未安装，无法发起支付渠道请求")
+    session = _sessions.get(provider)
+    if session is not None and _sessions_pid == os.getpid():
+        return session
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # fork 后的子进程：丢弃父进程的连接，避免多个进程共用同一套接字
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(provider)
+        if session is None:
+            session = PaymentHttpSession(provider)
+            _sessions[provider] = session
+        return session
+
+
+def close_http_sessions() -> None:
+    """关闭所有渠道的连接池（用于热更新 / 测试）"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+# ==================== OAuth 令牌缓存 ====================
+
+# (渠道, 商户) -> (令牌, 应刷新的时间戳)
+_tokens: Dict[Tuple[str, str], Tuple[str, float]] = {}
+_token_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_token_locks_guard = threading.Lock()
+
+
+def _get_redis():
+    try:
+        from shared.config.redis import get_redis_client
+        return get_redis_client()
+    except Exception:
+        return None
+
+
+def _token_key(provider: str, merchant: str) -> str:
+    # 商户标识（如 client_id）不直接出现在 Redis key 中
+    digest = hashlib.sha256(merchant.encode("utf-8")).hexdigest()[:16]
+    return f"{_TOKEN_KEY_PREFIX}:{provider}:{digest}"
+
+
+def _refresh_at(expires_in: int) -> float:
+    """提前 PAYMENT_TOKEN_REFRESH_MARGIN 秒刷新；有效期很短的令牌至少使用一半有效期"""
+    return time.time() + max(expires_in - PAYMENT_TOKEN_REFRESH_MARGIN, expires_in / 2)
+
+
+def _is_fresh(entry: Optional[Tuple[str, float]]) -> bool:
+    return entry is not None and time.time() < entry[1]
+
+
+def _read_shared(redis_client, key: str) -> Optional[Tuple[str, float]]:
+    try:
+        data = redis_client.get(key)
+        if data:
+            payload = json.loads(data)
+            return payload["token"], float(payload["refresh_at"])
+    except Exception as e:
+        logger.debug(f"读取共享支付令牌失败: {e}")
+    return None
+
+
+def _write_shared(redis_client, key: str, token: str, refresh_at: float) -> None:
+    ttl = int(refresh_at - time.time())
+    if ttl <= 0:
+        return
+    try:
+        redis_client.set(key, json.dumps({"token": token, "refresh_at": refresh_at}), ex=ttl)
+    except Exception as e:
+        logger.debug(f"写入共享支付令牌失败: {e}")
+
+
+def _lock_for(cache_key: Tuple[str, str]) -> threading.Lock:
+    with _token_locks_guard:
+        lock = _token_locks.get(cache_key)
+        if lock is None:
+            lock = _token_locks[cache_key] = threading.Lock()
+        return lock
+
+
+def get_cached_token(
+    provider: str,
+    merchant: str,
+    fetch: Callable[[], Optional[Tuple[str, int]]],
+    force_refresh: bool = False,
+) -> Optional[str]:
+    """
+    获取缓存的访问令牌，过期前 PAYMENT_TOKEN_REFRESH_MARGIN 秒起视为需要刷新
+
+    Args:
+        provider: 支付渠道（如 paypal）
+        merchant: 商户标识（如 "live:client_id"），不同商户 / 环境的令牌互不干扰
+        fetch: 请求新令牌，返回 (token, expires_in 秒)；失败返回 None
+        force_refresh: 忽略缓存强制刷新（如令牌被渠道提前吊销）
+
+    Returns:
+        访问令牌；刷新失败时返回 None
+    """
+    cache_key = (provider, merchant)
+    entry = _tokens.get(cache_key)
+    if not force_refresh and _is_fresh(entry):
+        return entry[0]
+
+    with _lock_for(cache_key):
+        # 等锁期间其他线程可能已完成刷新
+        entry = _tokens.get(cache_key)
+        if not force_refresh and _is_fresh(entry):
+            return entry[0]
+
+        redis_client = _get_redis()
+        key = _token_key(provider, merchant)
+        if redis_client is not None and not force_refresh:
+            shared = _read_shared(redis_client, key)
+            if _is_fresh(shared):
+                _tokens[cache_key] = shared
+                return shared[0]
+
+        lock_key = f"{key}:lock"
+        locked = False
+        if redis_client is not None:
+            try:
+                locked = bool(redis_client.set(lock_key, os.getpid(), nx=True, px=_TOKEN_LOCK_TTL_MS))
+            except Exception as e:
+                logger.debug(f"获取支付令牌刷新锁失败，仅使用进程内缓存: {e}")
+                redis_client = None
+        if redis_client is not None and not locked and not force_refresh:
+            # 其他 worker 正在刷新：等待其写入，超时后自行刷新
+            deadline = time.time() + _TOKEN_WAIT_SECONDS
+            while time.time() < deadline:
+                time.sleep(_TOKEN_WAIT_INTERVAL)
+                shared = _read_shared(redis_client, key)
+                if _is_fresh(shared):
+                    _tokens[cache_key] = shared
+                    return shared[0]
+
+        try:
+            result = fetch()
+            if not result or not result[0]:
+                _tokens.pop(cache_key, None)
+                return None
+            token, expires_in = result
+            entry = (token, _refresh_at(int(expires_in)))
+            _tokens[cache_key] = entry
+            if redis_client is not None:
+                _write_shared(redis_client, key, *entry)
+            return token
+        finally:
+            if locked:
+                try:
+                    redis_client.delete(lock_key)
+                except Exception:
+                    pass
+
+
+def clear_token_cache() -> None:
+    """清除进程内令牌缓存（用于热更新 / 测试）"""
+    _tokens.clear()
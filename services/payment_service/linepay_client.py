@@ -13,9 +13,10 @@ import hashlib
 import base64
 import uuid
 import json
-import requests
 from typing import Optional, Dict, Any
 
+from services.payment_service.http_pool import get_http_session
+
 # 导入支付配置加载器
 try:
     from services.payment_service.payment_config_loader import get_payment_config, get_payment_environment
@@ -190,7 +191,7 @@ class LinePayClient:
             headers = self._get_headers(uri, body)
             
             # 执行请求
-            response = requests.post(url, headers=headers, data=body, timeout=30)
+            response = get_http_session("linepay").post(url, headers=headers, data=body)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -277,7 +278,7 @@ class LinePayClient:
             headers = self._get_headers(uri, body)
             
             # 执行请求
-            response = requests.post(url, headers=headers, data=body, timeout=30)
+            response = get_http_session("linepay").post(url, headers=headers, data=body)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -341,7 +342,7 @@ class LinePayClient:
             headers = self._get_headers(uri, body)
             
             # 执行请求
-            response = requests.get(url, headers=headers, timeout=30)
+            response = get_http_session("linepay").get(url, headers=headers)
             
             if response.status_code == 200:
                 result = response.json()
@@ -414,7 +415,7 @@ class LinePayClient:
             headers = self._get_headers(uri, body)
             
             # 执行请求
-            response = requests.post(url, headers=headers, data=body, timeout=30)
+            response = get_http_session("linepay").post(url, headers=headers, data=body)
             
             if response.status_code in [200, 201]:
                 result = response.json()
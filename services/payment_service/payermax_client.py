@@ -53,6 +53,7 @@ except ImportError as e:
 
 from .base_client import BasePaymentClient
 from .client_factory import register_payment_client
+from .http_pool import get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -368,7 +369,7 @@ class PayerMaxClient(BasePaymentClient):
             logger.info(f"PayerMax请求URL: {url}")
             logger.info(f"PayerMax请求数据: {request_body}")
             _t0 = time.perf_counter()
-            response = requests.post(url, data=request_body, headers=headers, timeout=30)
+            response = get_http_session("payermax").post(url, data=request_body, headers=headers)
             _t1 = time.perf_counter()
             api_ms = int((_t1 - _t0) * 1000)
             logger.info(f"PayerMax响应状态码: {response.status_code} | PayerMax_API耗时: {api_ms}ms")
@@ -529,7 +530,7 @@ class PayerMaxClient(BasePaymentClient):
                 "sign": signature
             }
 
-            response = requests.post(url, data=request_body, headers=headers, timeout=30)
+            response = get_http_session("payermax").post(url, data=request_body, headers=headers)
 
             if response.status_code == 200:
                 result = response.json()
@@ -652,7 +653,7 @@ class PayerMaxClient(BasePaymentClient):
                 "sign": signature
             }
 
-            response = requests.post(url, data=request_body, headers=headers, timeout=30)
+            response = get_http_session("payermax").post(url, data=request_body, headers=headers)
 
             if response.status_code == 200:
                 result = response.json()
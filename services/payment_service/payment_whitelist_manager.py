@@ -3,12 +3,27 @@
 """
 支付白名单管理模块
 实现白名单的添加、删除、查询、启用/禁用功能
+
+白名单检查（is_whitelisted）只查内存快照，不访问数据库：
+- 快照只含 active 记录，按类型（user_id/email/phone/identifier）保存 64 位哈希集合，
+  内存只与白名单记录数相关（旧实现按被查询的标识缓存，未命中也常驻内存）
+- 按 updated_at 水位增量刷新（后台线程，间隔 PAYMENT_WHITELIST_REFRESH_INTERVAL），
+  硬删除无法从水位看出，删除时全量重载，并按 PAYMENT_WHITELIST_FULL_RELOAD_INTERVAL 兜底
+- 增删改后经 Redis 发布/订阅通知其他 worker：新增/状态变更增量刷新，删除全量重载
+- 每次变更快照版本号递增；进程首次检查时若快照尚未预热，同步加载一次
+
+比较规则与数据库排序规则（utf8mb4_unicode_ci）一致：忽略大小写和尾部空格
 """
 
+import hashlib
+import json
 import os
+import socket
 import sys
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -20,14 +35,93 @@ from shared.config.database import get_mysql_connection, return_mysql_connection
 
 logger = logging.getLogger(__name__)
 
+PAYMENT_WHITELIST_REFRESH_INTERVAL = int(os.getenv("PAYMENT_WHITELIST_REFRESH_INTERVAL", "30"))
+PAYMENT_WHITELIST_FULL_RELOAD_INTERVAL = int(os.getenv("PAYMENT_WHITELIST_FULL_RELOAD_INTERVAL", "3600"))
+
+WHITELIST_CHANNEL = "payment:whitelist:invalidate"
+
+# 按检查优先级排列：user_id > email > phone > identifier
+WHITELIST_TYPES = ("user_id", "email", "phone", "identifier")
+
+_SNAPSHOT_COLUMNS = "id, whitelist_type, user_id, email, phone, identifier, status, updated_at"
+
+# 发布者标识（收到自己发布的通知时跳过）
+_ORIGIN = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _member_hash(value: Any) -> int:
+    """标识的 64 位哈希（忽略大小写和尾部空格）"""
+    normalized = str(value).rstrip().casefold()
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class WhitelistSnapshot:
+    """白名单内存快照（只含 active 记录）"""
+
+    def __init__(self):
+        self.version = 0
+        self.watermark = None  # 已应用记录的最大 updated_at
+        # 记录ID -> (类型, 成员哈希)，用于增量更新时撤销旧值
+        self._rows: Dict[int, Tuple[str, int]] = {}
+        # 类型 -> {成员哈希: 引用该哈希的 active 记录数}
+        self._members: Dict[str, Dict[int, int]] = {t: {} for t in WHITELIST_TYPES}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def contains(self, whitelist_type: str, value: Any) -> bool:
+        return _member_hash(value) in self._members[whitelist_type]
+
+    def apply(self, rows: List[Dict[str, Any]]) -> int:
+        """应用一批记录（新增 / 更新 / 失效），返回实际变更的记录数"""
+        changed = 0
+        for row in rows:
+            entry = None
+            whitelist_type = row.get("whitelist_type")
+            value = row.get(whitelist_type) if whitelist_type in WHITELIST_TYPES else None
+            if row.get("status") == "active" and value:
+                entry = (whitelist_type, _member_hash(value))
+            if self._rows.get(row["id"]) != entry:
+                self._discard(row["id"])
+                if entry is not None:
+                    self._rows[row["id"]] = entry
+                    members = self._members[entry[0]]
+                    members[entry[1]] = members.get(entry[1], 0) + 1
+                changed += 1
+            updated_at = row.get("updated_at")
+            if updated_at is not None and (self.watermark is None or updated_at > self.watermark):
+                self.watermark = updated_at
+        if changed:
+            self.version += 1
+        return changed
+
+    def _discard(self, row_id: int):
+        entry = self._rows.pop(row_id, None)
+        if entry is None:
+            return
+        members = self._members[entry[0]]
+        if members.get(entry[1], 0) <= 1:
+            members.pop(entry[1], None)
+        else:
+            members[entry[1]] -= 1
+
 
 class PaymentWhitelistManager:
     """支付白名单管理类"""
     
     def __init__(self):
         """初始化白名单管理器"""
-        self._cache: Dict[str, bool] = {}  # 缓存白名单状态
-        self._cache_ttl = 300  # 5分钟缓存
+        self._snapshot: Optional[WhitelistSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._last_refresh = 0.0
+        self._last_full_reload = 0.0
+    
+    @property
+    def snapshot_version(self) -> int:
+        """当前快照版本（未加载时为 0）"""
+        return self._snapshot.version if self._snapshot else 0
     
     def is_whitelisted(
         self,
@@ -37,7 +131,7 @@ class PaymentWhitelistManager:
         identifier: Optional[str] = None
     ) -> bool:
         """
-        检查用户是否在白名单中
+        检查用户是否在白名单中（只查内存快照）
         
         优先级：user_id > email > phone > identifier
         
@@ -50,147 +144,117 @@ class PaymentWhitelistManager:
         Returns:
             bool: 如果用户在白名单中返回True，否则返回False
         """
-        # 1. 按用户ID匹配（优先级最高）
-        if user_id:
-            if self._check_whitelist_by_user_id(user_id):
-                return True
-        
-        # 2. 按邮箱匹配
-        if email:
-            if self._check_whitelist_by_email(email):
-                return True
+        snapshot = self._get_snapshot()
+        if snapshot is None:
+            return False
         
-        # 3. 按手机号匹配
-        if phone:
-            if self._check_whitelist_by_phone(phone):
-                return True
+        values = {'user_id': user_id, 'email': email, 'phone': phone, 'identifier': identifier}
+        return any(
+            values[whitelist_type] and snapshot.contains(whitelist_type, values[whitelist_type])
+            for whitelist_type in WHITELIST_TYPES
+        )
+    
+    def _get_snapshot(self) -> Optional[WhitelistSnapshot]:
+        """获取快照；过期时在后台刷新，从未加载时同步加载一次"""
+        if self._snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    self.reload()
+        elif time.time() - self._last_refresh >= PAYMENT_WHITELIST_REFRESH_INTERVAL:
+            self._schedule_refresh()
+        return self._snapshot
+    
+    def _schedule_refresh(self):
+        """启动后台刷新（同一时间只有一个）"""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
         
-        # 4. 按其他标识符匹配
-        if identifier:
-            if self._check_whitelist_by_identifier(identifier):
-                return True
+        def _run():
+            try:
+                if time.time() - self._last_full_reload >= PAYMENT_WHITELIST_FULL_RELOAD_INTERVAL:
+                    self.reload()
+                else:
+                    self.refresh()
+            finally:
+                self._refreshing = False
         
-        return False
+        threading.Thread(target=_run, name="PaymentWhitelistRefresh", daemon=True).start()
     
-    def _check_whitelist_by_user_id(self, user_id: str) -> bool:
-        """检查用户ID是否在白名单中"""
-        cache_key = f"whitelist:user_id:{user_id}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
+    def _query_rows(self, watermark=None) -> Optional[List[Dict[str, Any]]]:
+        """读取白名单记录（watermark 为空时读取全部），失败返回 None"""
         conn = None
         try:
             conn = get_mysql_connection()
             with conn.cursor() as cursor:
-                sql = """
-                    SELECT 1 
-                    FROM payment_whitelist 
-                    WHERE user_id = %s 
-                      AND whitelist_type = 'user_id'
-                      AND status = 'active'
-                    LIMIT 1
-                """
-                cursor.execute(sql, (user_id,))
-                result = cursor.fetchone()
-                is_whitelisted = bool(result)
-                self._cache[cache_key] = is_whitelisted
-                return is_whitelisted
+                if watermark is None:
+                    cursor.execute(f"SELECT {_SNAPSHOT_COLUMNS} FROM payment_whitelist")
+                else:
+                    # >=：同一秒内稍后写入的记录在下次刷新时仍能读到（重复应用是幂等的）
+                    cursor.execute(
+                        f"SELECT {_SNAPSHOT_COLUMNS} FROM payment_whitelist WHERE updated_at >= %s",
+                        (watermark,)
+                    )
+                return list(cursor.fetchall())
         except Exception as e:
-            logger.error(f"查询白名单失败（user_id）: {e}", exc_info=True)
-            return False
+            logger.error(f"读取白名单快照失败: {e}", exc_info=True)
+            return None
         finally:
             if conn:
                 return_mysql_connection(conn)
     
-    def _check_whitelist_by_email(self, email: str) -> bool:
-        """检查邮箱是否在白名单中"""
-        cache_key = f"whitelist:email:{email}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
-        conn = None
-        try:
-            conn = get_mysql_connection()
-            with conn.cursor() as cursor:
-                sql = """
-                    SELECT 1 
-                    FROM payment_whitelist 
-                    WHERE email = %s 
-                      AND whitelist_type = 'email'
-                      AND status = 'active'
-                    LIMIT 1
-                """
-                cursor.execute(sql, (email,))
-                result = cursor.fetchone()
-                is_whitelisted = bool(result)
-                self._cache[cache_key] = is_whitelisted
-                return is_whitelisted
-        except Exception as e:
-            logger.error(f"查询白名单失败（email）: {e}", exc_info=True)
+    def reload(self) -> bool:
+        """全量重载快照（构建新快照后整体替换）"""
+        rows = self._query_rows()
+        self._last_refresh = time.time()
+        if rows is None:
+            if self._snapshot is None:
+                # 数据库不可用：先用空快照（检查结果为 False，与旧实现查询失败时一致），
+                # 之后由后台刷新重试，避免每次检查都同步访问数据库
+                self._snapshot = WhitelistSnapshot()
             return False
-        finally:
-            if conn:
-                return_mysql_connection(conn)
+        snapshot = WhitelistSnapshot()
+        snapshot.apply(rows)
+        with self._refresh_lock:
+            snapshot.version = self.snapshot_version + 1
+            self._snapshot = snapshot
+        self._last_full_reload = time.time()
+        logger.info(f"白名单快照已加载: {len(snapshot)} 条, version={snapshot.version}")
+        return True
     
-    def _check_whitelist_by_phone(self, phone: str) -> bool:
-        """检查手机号是否在白名单中"""
-        cache_key = f"whitelist:phone:{phone}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
-        conn = None
-        try:
-            conn = get_mysql_connection()
-            with conn.cursor() as cursor:
-                sql = """
-                    SELECT 1 
-                    FROM payment_whitelist 
-                    WHERE phone = %s 
-                      AND whitelist_type = 'phone'
-                      AND status = 'active'
-                    LIMIT 1
-                """
-                cursor.execute(sql, (phone,))
-                result = cursor.fetchone()
-                is_whitelisted = bool(result)
-                self._cache[cache_key] = is_whitelisted
-                return is_whitelisted
-        except Exception as e:
-            logger.error(f"查询白名单失败（phone）: {e}", exc_info=True)
+    def refresh(self) -> bool:
+        """按 updated_at 水位增量刷新（快照未加载时全量加载）"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.watermark is None:
+            return self.reload()
+        rows = self._query_rows(snapshot.watermark)
+        self._last_refresh = time.time()
+        if rows is None:
             return False
-        finally:
-            if conn:
-                return_mysql_connection(conn)
+        with self._refresh_lock:
+            if snapshot is self._snapshot:
+                snapshot.apply(rows)
+        return True
     
-    def _check_whitelist_by_identifier(self, identifier: str) -> bool:
-        """检查其他标识符是否在白名单中"""
-        cache_key = f"whitelist:identifier:{identifier}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-        
-        conn = None
+    def _publish_change(self, op: str):
+        """通知其他 worker 刷新快照（add/update 增量刷新，remove 全量重载）"""
         try:
-            conn = get_mysql_connection()
-            with conn.cursor() as cursor:
-                sql = """
-                    SELECT 1 
-                    FROM payment_whitelist 
-                    WHERE identifier = %s 
-                      AND whitelist_type = 'identifier'
-                      AND status = 'active'
-                    LIMIT 1
-                """
-                cursor.execute(sql, (identifier,))
-                result = cursor.fetchone()
-                is_whitelisted = bool(result)
-                self._cache[cache_key] = is_whitelisted
-                return is_whitelisted
+            from shared.config.redis import get_redis_client
+            redis_client = get_redis_client()
+            if redis_client:
+                redis_client.publish(WHITELIST_CHANNEL, json.dumps({"op": op, "origin": _ORIGIN}))
         except Exception as e:
-            logger.error(f"查询白名单失败（identifier）: {e}", exc_info=True)
-            return False
-        finally:
-            if conn:
-                return_mysql_connection(conn)
+            logger.warning(f"发布白名单变更通知失败: {e}")
+    
+    def handle_change(self, message: Dict[str, Any]):
+        """处理其他 worker 发布的变更通知"""
+        if message.get("origin") == _ORIGIN or self._snapshot is None:
+            return
+        if message.get("op") == "remove":
+            self.reload()
+        else:
+            self.refresh()
     
     def add_to_whitelist(
         self,
@@ -235,22 +299,9 @@ class PaymentWhitelistManager:
                 ))
                 conn.commit()
                 
-                # 清除相关缓存（在提交后清除，确保数据已写入）
-                self._clear_cache(whitelist_type, user_id, email, phone, identifier)
-                
-                # 如果添加成功，立即更新缓存为True（避免后续查询时缓存未命中）
-                if email:
-                    cache_key = f"whitelist:email:{email}"
-                    self._cache[cache_key] = True
-                if user_id:
-                    cache_key = f"whitelist:user_id:{user_id}"
-                    self._cache[cache_key] = True
-                if phone:
-                    cache_key = f"whitelist:phone:{phone}"
-                    self._cache[cache_key] = True
-                if identifier:
-                    cache_key = f"whitelist:identifier:{identifier}"
-                    self._cache[cache_key] = True
+                # 提交后刷新本地快照并通知其他 worker
+                self.refresh()
+                self._publish_change("add")
                 
                 logger.info(f"用户已添加到白名单: type={whitelist_type}")
                 return True
@@ -309,8 +360,9 @@ class PaymentWhitelistManager:
                 cursor.execute(sql, tuple(params))
                 conn.commit()
                 
-                # 清除相关缓存
-                self._clear_cache(whitelist_type, user_id, email, phone, identifier)
+                # 硬删除无法从 updated_at 水位看出，全量重载并通知其他 worker
+                self.reload()
+                self._publish_change("remove")
                 
                 logger.info(f"用户已从白名单移除: type={whitelist_type}")
                 return True
@@ -401,8 +453,9 @@ class PaymentWhitelistManager:
                 cursor.execute(sql, (status, whitelist_id))
                 conn.commit()
                 
-                # 清除所有缓存（因为不知道具体是哪个用户）
-                self._cache.clear()
+                # 状态变更会更新 updated_at，增量刷新即可
+                self.refresh()
+                self._publish_change("update")
                 
                 logger.info(f"白名单状态已更新: id={whitelist_id}, status={status}")
                 return True
@@ -415,31 +468,6 @@ class PaymentWhitelistManager:
             if conn:
                 return_mysql_connection(conn)
     
-    def _clear_cache(
-        self,
-        whitelist_type: str,
-        user_id: Optional[str] = None,
-        email: Optional[str] = None,
-        phone: Optional[str] = None,
-        identifier: Optional[str] = None
-    ):
-        """清除相关缓存"""
-        keys_to_remove = []
-        
-        if user_id:
-            keys_to_remove.append(f"whitelist:user_id:{user_id}")
-        if email:
-            keys_to_remove.append(f"whitelist:email:{email}")
-        if phone:
-            keys_to_remove.append(f"whitelist:phone:{phone}")
-        if identifier:
-            keys_to_remove.append(f"whitelist:identifier:{identifier}")
-        
-        for key in keys_to_remove:
-            if key in self._cache:
-                del self._cache[key]
-
-
 # 单例实例
 _whitelist_manager: Optional[PaymentWhitelistManager] = None
 
@@ -450,3 +478,66 @@ def get_whitelist_manager() -> PaymentWhitelistManager:
     if _whitelist_manager is None:
         _whitelist_manager = PaymentWhitelistManager()
     return _whitelist_manager
+
+
+# ==================== 跨 worker 变更订阅 ====================
+
+_subscriber_thread: Optional[threading.Thread] = None
+_subscriber_running = False
+
+
+def _whitelist_subscriber():
+    """白名单变更订阅器（后台线程），启动时顺带预热快照"""
+    global _subscriber_running
+    
+    manager = get_whitelist_manager()
+    if manager._snapshot is None:
+        manager.reload()
+    
+    try:
+        from shared.config.redis import get_redis_client
+        
+        redis_client = get_redis_client()
+        if not redis_client:
+            logger.warning("⚠️  Redis客户端不可用，白名单变更订阅器无法启动")
+            return
+        
+        pubsub = redis_client.pubsub()
+        pubsub.subscribe(WHITELIST_CHANNEL)
+        _subscriber_running = True
+        logger.info(f"✓ 白名单变更订阅器已启动，监听频道: {WHITELIST_CHANNEL}")
+        
+        for message in pubsub.listen():
+            if not _subscriber_running:
+                break
+            if message['type'] != 'message':
+                continue
+            try:
+                data = message['data']
+                manager.handle_change(json.loads(data.decode('utf-8') if isinstance(data, bytes) else data))
+            except Exception as e:
+                logger.warning(f"⚠️  处理白名单变更通知失败: {e}")
+    except Exception as e:
+        logger.error(f"❌ 白名单变更订阅器异常: {e}")
+    finally:
+        _subscriber_running = False
+
+
+def start_whitelist_subscriber():
+    """启动白名单变更订阅器（同时在后台预热快照）"""
+    global _subscriber_thread
+    
+    if _subscriber_thread and _subscriber_thread.is_alive():
+        return
+    _subscriber_thread = threading.Thread(
+        target=_whitelist_subscriber,
+        daemon=True,
+        name="PaymentWhitelistSubscriber"
+    )
+    _subscriber_thread.start()
+
+
+def stop_whitelist_subscriber():
+    """停止白名单变更订阅器"""
+    global _subscriber_running
+    _subscriber_running = False
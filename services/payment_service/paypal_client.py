@@ -9,10 +9,11 @@ PayPal支付客户端封装
 import os
 import logging
 import base64
-import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
+from services.payment_service.http_pool import get_cached_token, get_http_session
+
 # 导入支付配置加载器
 try:
     from services.payment_service.payment_config_loader import get_payment_config, get_payment_environment
@@ -76,16 +77,30 @@ class PayPalClient:
         """检查PayPal客户端是否已启用"""
         return bool(self.client_id and self.client_secret and self.access_token)
     
-    def _get_access_token(self) -> Optional[str]:
+    def _get_access_token(self, force_refresh: bool = False) -> Optional[str]:
         """
         获取PayPal访问令牌（OAuth 2.0）
         
+        令牌按 (mode, client_id) 在进程内和 Redis 中共享，过期前自动刷新，
+        避免每个 worker / 每个客户端实例各自请求 /v1/oauth2/token
+        
         Returns:
             访问令牌，失败返回None
         """
         if not self.client_id or not self.client_secret:
             return None
         
+        return get_cached_token(
+            "paypal", f"{self.mode}:{self.client_id}", self._fetch_access_token, force_refresh
+        )
+    
+    def _fetch_access_token(self) -> Optional[Tuple[str, int]]:
+        """
+        向PayPal请求新的访问令牌
+        
+        Returns:
+            (访问令牌, 有效期秒数)，失败返回None
+        """
         try:
             # 构建认证头
             auth_string = f"{self.client_id}:{self.client_secret}"
@@ -102,13 +117,13 @@ class PayPalClient:
                 "grant_type": "client_credentials"
             }
             
-            response = requests.post(url, headers=headers, data=data, timeout=10)
+            response = get_http_session("paypal").post(url, headers=headers, data=data, timeout=10)
             
             if response.status_code == 200:
                 result = response.json()
                 token = result.get("access_token")
                 logger.info("PayPal访问令牌获取成功")
-                return token
+                return token, int(result.get("expires_in", 32400))
             else:
                 logger.error(f"获取PayPal访问令牌失败: {response.status_code} - {response.text}")
                 return None
@@ -118,10 +133,10 @@ class PayPalClient:
             return None
     
     def _get_headers(self) -> Dict[str, str]:
-        """获取API请求头"""
-        if not self.access_token:
-            # 尝试重新获取令牌
-            self.access_token = self._get_access_token()
+        """获取API请求头（令牌临近过期时自动换新）"""
+        token = self._get_access_token()
+        if token:
+            self.access_token = token
         
         return {
             "Authorization": f"Bearer {self.access_token}",
@@ -211,7 +226,7 @@ class PayPalClient:
                 "quote_currency": quote_currency
             }
             
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = get_http_session("paypal").post(url, headers=headers, json=data)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -374,7 +389,7 @@ class PayPalClient:
             }
             
             # 执行请求
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = get_http_session("paypal").post(url, headers=headers, json=data)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -476,7 +491,7 @@ class PayPalClient:
             headers = self._get_headers()
             
             # 执行请求（POST请求，无需body）
-            response = requests.post(url, headers=headers, json={}, timeout=30)
+            response = get_http_session("paypal").post(url, headers=headers, json={})
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -575,7 +590,7 @@ class PayPalClient:
             headers = self._get_headers()
             
             # 执行请求
-            response = requests.get(url, headers=headers, timeout=30)
+            response = get_http_session("paypal").get(url, headers=headers)
             
             if response.status_code == 200:
                 result = response.json()
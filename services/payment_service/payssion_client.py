@@ -10,10 +10,11 @@ import logging
 import hashlib
 import hmac
 import json
-import requests
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from services.payment_service.http_pool import get_http_session
+
 # 导入支付配置加载器
 try:
     from services.payment_service.payment_config_loader import get_payment_config, get_payment_environment
@@ -193,7 +194,7 @@ class PayssionClient(BasePaymentClient):
                 "User-Agent": "Payssion-Client/1.0"
             }
 
-            response = requests.post(url, json=request_data, headers=headers, timeout=30)
+            response = get_http_session("payssion").post(url, json=request_data, headers=headers)
 
             if response.status_code == 200:
                 result = response.json()
@@ -311,7 +312,7 @@ class PayssionClient(BasePaymentClient):
                 "User-Agent": "Payssion-Client/1.0"
             }
 
-            response = requests.post(url, json=request_data, headers=headers, timeout=30)
+            response = get_http_session("payssion").post(url, json=request_data, headers=headers)
 
             if response.status_code == 200:
                 result = response.json()
@@ -415,7 +416,7 @@ class PayssionClient(BasePaymentClient):
                 "User-Agent": "Payssion-Client/1.0"
             }
 
-            response = requests.post(url, json=request_data, headers=headers, timeout=30)
+            response = get_http_session("payssion").post(url, json=request_data, headers=headers)
 
             if response.status_code == 200:
                 result = response.json()
@@ -19,7 +19,7 @@ import grpc
 # 导入公共工具函数
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(project_root, "server", "utils"))
-from grpc_config import get_standard_grpc_options
+from grpc_config import channel_compression, choose_compression, get_standard_grpc_options, message_size
 from grpc_helpers import parse_grpc_address
 
 logger = logging.getLogger(__name__)
@@ -62,12 +62,9 @@ class BaseGrpcClient:
             with cls._channel_lock:
                 if key not in cls._channels:
                     kwargs = {"options": options}
-                    try:
-                        from grpc_config import GRPC_COMPRESSION
-                        if GRPC_COMPRESSION is not None:
-                            kwargs["compression"] = GRPC_COMPRESSION
-                    except Exception:
-                        pass
+                    compression = channel_compression(address)
+                    if compression is not None:
+                        kwargs["compression"] = compression
                     cls._channels[key] = grpc.insecure_channel(address, **kwargs)
         return cls._channels[key]
 
@@ -132,6 +129,12 @@ class BaseGrpcClient:
             raise last_error
         raise RuntimeError("call_with_retry: unexpected state")
 
+    def call_compression(self, request: Any) -> Optional[grpc.Compression]:
+        """
+        单次调用的请求压缩方式（按请求大小和服务地址决定，None 表示沿用 Channel 默认）
+        """
+        return choose_compression(self.address, message_size(request), "request")
+
     def get_grpc_options(self, include_message_size: bool = False, max_message_size_mb: int = 50) -> list:
         """
         获取 gRPC 配置选项
@@ -24,10 +24,137 @@ sys.path.insert(0, os.path.join(project_root, "server", "utils"))
 from grpc_config import get_standard_grpc_options
 from grpc_helpers import parse_grpc_address
 from shared.clients.base_grpc_client import BaseGrpcClient
+from shared.clients.typed_payloads import SCHEMA_VERSION, chart_from_proto, requested_schema_version
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_legacy_response(response: bazi_core_pb2.BaziCoreResponse) -> Dict[str, Any]:
+    """解析旧版字段（schema_version = 0 的服务端）"""
+    result: Dict[str, Any] = {}
+
+    # 基本信息（安全地转换为字典，需要反序列化 lunar_date）
+    basic_info_dict = {}
+    if response.basic_info:
+        for key, value in response.basic_info.items():
+            if key == "lunar_date" and isinstance(value, str):
+                try:
+                    basic_info_dict[key] = json.loads(value) if value else {}
+                except (json.JSONDecodeError, TypeError):
+                    basic_info_dict[key] = {}
+            else:
+                basic_info_dict[key] = value
+    result["basic_info"] = basic_info_dict
+
+    # 四柱信息（安全地获取）
+    result["bazi_pillars"] = {
+        "year": {
+            "stem": response.year_pillar.stem if response.year_pillar else "",
+            "branch": response.year_pillar.branch if response.year_pillar else "",
+        },
+        "month": {
+            "stem": response.month_pillar.stem if response.month_pillar else "",
+            "branch": response.month_pillar.branch if response.month_pillar else "",
+        },
+        "day": {
+            "stem": response.day_pillar.stem if response.day_pillar else "",
+            "branch": response.day_pillar.branch if response.day_pillar else "",
+        },
+        "hour": {
+            "stem": response.hour_pillar.stem if response.hour_pillar else "",
+            "branch": response.hour_pillar.branch if response.hour_pillar else "",
+        },
+    }
+
+    # 四柱详情（安全地获取）
+    result["details"] = {}
+    if response.details:
+        for pillar_name, detail in response.details.items():
+            if detail:
+                result["details"][pillar_name] = {
+                    "main_star": detail.main_star if hasattr(detail, 'main_star') else "",
+                    "hidden_stars": list(detail.hidden_stars) if hasattr(detail, 'hidden_stars') and detail.hidden_stars else [],
+                    "hidden_stems": list(detail.hidden_stems) if hasattr(detail, 'hidden_stems') and detail.hidden_stems else [],
+                    "star_fortune": detail.star_fortune if hasattr(detail, 'star_fortune') else "",
+                    "self_sitting": detail.self_sitting if hasattr(detail, 'self_sitting') else "",
+                    "nayin": detail.nayin if hasattr(detail, 'nayin') else "",
+                    "kongwang": detail.kongwang if hasattr(detail, 'kongwang') else "",
+                    "deities": list(detail.deities) if hasattr(detail, 'deities') and detail.deities else [],
+                }
+            else:
+                result["details"][pillar_name] = {
+                    "main_star": "",
+                    "hidden_stars": [],
+                    "hidden_stems": [],
+                    "star_fortune": "",
+                    "self_sitting": "",
+                    "nayin": "",
+                    "kongwang": "",
+                    "deities": [],
+                }
+
+    # 十神统计（需要反序列化 JSON 字符串）
+    ten_gods_stats = {}
+    if response.ten_gods_stats:
+        for key, value_json in response.ten_gods_stats.items():
+            try:
+                if isinstance(value_json, str):
+                    ten_gods_stats[key] = json.loads(value_json) if value_json else {}
+                else:
+                    ten_gods_stats[key] = value_json
+            except (json.JSONDecodeError, TypeError):
+                ten_gods_stats[key] = value_json if value_json else {}
+    result["ten_gods_stats"] = ten_gods_stats
+
+    # 五行信息（需要反序列化 JSON 字符串或Python字典字符串）
+    elements = {}
+    if response.elements:
+        for key, value_json in response.elements.items():
+            logger.debug(f"elements['{key}'] raw value type={type(value_json).__name__}, value={repr(value_json)[:200]}")
+            try:
+                if isinstance(value_json, str):
+                    try:
+                        import ast
+                        parsed = ast.literal_eval(value_json) if value_json else {}
+                        logger.debug(f"ast.literal_eval success for '{key}'")
+                    except (ValueError, SyntaxError) as e1:
+                        logger.debug(f"ast.literal_eval failed for '{key}': {e1}, trying json.loads...")
+                        parsed = json.loads(value_json) if value_json else {}
+                        logger.debug(f"json.loads success for '{key}'")
+                    if isinstance(parsed, dict):
+                        elements[key] = parsed
+                    else:
+                        logger.warning(f"DEBUG: parsed result for '{key}' is not dict (type={type(parsed)}), using empty dict")
+                        elements[key] = {}
+                elif isinstance(value_json, dict):
+                    logger.debug(f"elements['{key}'] is already dict")
+                    elements[key] = value_json
+                else:
+                    logger.warning(f"DEBUG: elements['{key}'] is unexpected type: {type(value_json)}")
+                    elements[key] = {}
+            except (json.JSONDecodeError, TypeError, ValueError, SyntaxError) as e:
+                logger.warning(f"Failed to parse elements['{key}']: {repr(value_json)[:100]}, error: {e}")
+                elements[key] = {}
+    result["elements"] = elements
+
+    # 五行计数（直接是 int32）
+    result["element_counts"] = dict(response.element_counts) if response.element_counts else {}
+
+    # 关系信息（需要反序列化 JSON 字符串）
+    relationships = {}
+    if response.relationships:
+        for key, value_json in response.relationships.items():
+            try:
+                if isinstance(value_json, str):
+                    relationships[key] = json.loads(value_json) if value_json else {}
+                else:
+                    relationships[key] = value_json
+            except (json.JSONDecodeError, TypeError):
+                relationships[key] = value_json if value_json else {}
+    result["relationships"] = relationships
+    return result
+
+
 class BaziCoreClient(BaseGrpcClient):
     """gRPC client for the bazi-core-service."""
 
@@ -47,6 +174,7 @@ class BaziCoreClient(BaseGrpcClient):
             solar_date=solar_date,
             solar_time=solar_time,
             gender=gender,
+            schema_version=requested_schema_version(),
         )
 
         import datetime
@@ -59,130 +187,13 @@ class BaziCoreClient(BaseGrpcClient):
         channel = self.get_channel(self.address, options)
         stub = bazi_core_pb2_grpc.BaziCoreServiceStub(channel)
         try:
-            response = stub.CalculateBazi(request, timeout=self.timeout)
-
-            # 转换为字典格式
-            result: Dict[str, Any] = {}
-
-            # 基本信息（安全地转换为字典，需要反序列化 lunar_date）
-            basic_info_dict = {}
-            if response.basic_info:
-                for key, value in response.basic_info.items():
-                    if key == "lunar_date" and isinstance(value, str):
-                        try:
-                            basic_info_dict[key] = json.loads(value) if value else {}
-                        except (json.JSONDecodeError, TypeError):
-                            basic_info_dict[key] = {}
-                    else:
-                        basic_info_dict[key] = value
-            result["basic_info"] = basic_info_dict
-
-            # 四柱信息（安全地获取）
-            result["bazi_pillars"] = {
-                "year": {
-                    "stem": response.year_pillar.stem if response.year_pillar else "",
-                    "branch": response.year_pillar.branch if response.year_pillar else "",
-                },
-                "month": {
-                    "stem": response.month_pillar.stem if response.month_pillar else "",
-                    "branch": response.month_pillar.branch if response.month_pillar else "",
-                },
-                "day": {
-                    "stem": response.day_pillar.stem if response.day_pillar else "",
-                    "branch": response.day_pillar.branch if response.day_pillar else "",
-                },
-                "hour": {
-                    "stem": response.hour_pillar.stem if response.hour_pillar else "",
-                    "branch": response.hour_pillar.branch if response.hour_pillar else "",
-                },
-            }
-
-            # 四柱详情（安全地获取）
-            result["details"] = {}
-            if response.details:
-                for pillar_name, detail in response.details.items():
-                    if detail:
-                        result["details"][pillar_name] = {
-                            "main_star": detail.main_star if hasattr(detail, 'main_star') else "",
-                            "hidden_stars": list(detail.hidden_stars) if hasattr(detail, 'hidden_stars') and detail.hidden_stars else [],
-                            "hidden_stems": list(detail.hidden_stems) if hasattr(detail, 'hidden_stems') and detail.hidden_stems else [],
-                            "star_fortune": detail.star_fortune if hasattr(detail, 'star_fortune') else "",
-                            "self_sitting": detail.self_sitting if hasattr(detail, 'self_sitting') else "",
-                            "nayin": detail.nayin if hasattr(detail, 'nayin') else "",
-                            "kongwang": detail.kongwang if hasattr(detail, 'kongwang') else "",
-                            "deities": list(detail.deities) if hasattr(detail, 'deities') and detail.deities else [],
-                        }
-                    else:
-                        result["details"][pillar_name] = {
-                            "main_star": "",
-                            "hidden_stars": [],
-                            "hidden_stems": [],
-                            "star_fortune": "",
-                            "self_sitting": "",
-                            "nayin": "",
-                            "kongwang": "",
-                            "deities": [],
-                        }
-
-            # 十神统计（需要反序列化 JSON 字符串）
-            ten_gods_stats = {}
-            if response.ten_gods_stats:
-                for key, value_json in response.ten_gods_stats.items():
-                    try:
-                        if isinstance(value_json, str):
-                            ten_gods_stats[key] = json.loads(value_json) if value_json else {}
-                        else:
-                            ten_gods_stats[key] = value_json
-                    except (json.JSONDecodeError, TypeError):
-                        ten_gods_stats[key] = value_json if value_json else {}
-            result["ten_gods_stats"] = ten_gods_stats
-
-            # 五行信息（需要反序列化 JSON 字符串或Python字典字符串）
-            elements = {}
-            if response.elements:
-                for key, value_json in response.elements.items():
-                    logger.debug(f"elements['{key}'] raw value type={type(value_json).__name__}, value={repr(value_json)[:200]}")
-                    try:
-                        if isinstance(value_json, str):
-                            try:
-                                import ast
-                                parsed = ast.literal_eval(value_json) if value_json else {}
-                                logger.debug(f"ast.literal_eval success for '{key}'")
-                            except (ValueError, SyntaxError) as e1:
-                                logger.debug(f"ast.literal_eval failed for '{key}': {e1}, trying json.loads...")
-                                parsed = json.loads(value_json) if value_json else {}
-                                logger.debug(f"json.loads success for '{key}'")
-                            if isinstance(parsed, dict):
-                                elements[key] = parsed
-                            else:
-                                logger.warning(f"DEBUG: parsed result for '{key}' is not dict (type={type(parsed)}), using empty dict")
-                                elements[key] = {}
-                        elif isinstance(value_json, dict):
-                            logger.debug(f"elements['{key}'] is already dict")
-                            elements[key] = value_json
-                        else:
-                            logger.warning(f"DEBUG: elements['{key}'] is unexpected type: {type(value_json)}")
-                            elements[key] = {}
-                    except (json.JSONDecodeError, TypeError, ValueError, SyntaxError) as e:
-                        logger.warning(f"Failed to parse elements['{key}']: {repr(value_json)[:100]}, error: {e}")
-                        elements[key] = {}
-            result["elements"] = elements
-
-            # 五行计数（直接是 int32）
-            result["element_counts"] = dict(response.element_counts) if response.element_counts else {}
+            response = stub.CalculateBazi(request, timeout=self.timeout, compression=self.call_compression(request))
 
-            # 关系信息（需要反序列化 JSON 字符串）
-            relationships = {}
-            if response.relationships:
-                for key, value_json in response.relationships.items():
-                    try:
-                        if isinstance(value_json, str):
-                            relationships[key] = json.loads(value_json) if value_json else {}
-                        else:
-                            relationships[key] = value_json
-                    except (json.JSONDecodeError, TypeError):
-                        relationships[key] = value_json if value_json else {}
-            result["relationships"] = relationships
+            # 转换为字典格式（服务端支持时使用类型化结构）
+            if response.schema_version >= SCHEMA_VERSION:
+                result = chart_from_proto(response.chart)
+            else:
+                result = _parse_legacy_response(response)
 
             # 元数据
             if response.metadata_json:
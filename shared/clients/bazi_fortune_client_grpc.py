@@ -24,6 +24,7 @@ sys.path.insert(0, os.path.join(project_root, "server", "utils"))
 from grpc_config import get_standard_grpc_options
 from grpc_helpers import parse_grpc_address
 from shared.clients.base_grpc_client import BaseGrpcClient
+from shared.clients.typed_payloads import SCHEMA_VERSION, fortune_detail_from_proto, requested_schema_version
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +49,7 @@ class BaziFortuneClient(BaseGrpcClient):
             solar_time=solar_time,
             gender=gender,
             current_time=current_time or "",
+            schema_version=requested_schema_version(),
         )
 
         logger.debug("Calling bazi-fortune-service (gRPC): %s request=%s", self.address, request)
@@ -57,7 +59,11 @@ class BaziFortuneClient(BaseGrpcClient):
         channel = self.get_channel(self.address, options)
         stub = bazi_fortune_pb2_grpc.BaziFortuneServiceStub(channel)
         try:
-            response = stub.CalculateDayunLiunian(request, timeout=self.timeout)
+            response = stub.CalculateDayunLiunian(request, timeout=self.timeout, compression=self.call_compression(request))
+
+            # 服务端支持时使用类型化结构，避免大体积 JSON 的序列化与解析
+            if response.schema_version >= SCHEMA_VERSION:
+                return fortune_detail_from_proto(response.detail)
 
             if not response.detail_json:
                 raise RuntimeError("bazi-fortune-service response missing 'detail_json'")
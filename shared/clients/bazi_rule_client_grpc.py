@@ -24,6 +24,7 @@ sys.path.insert(0, os.path.join(project_root, "server", "utils"))
 from grpc_config import get_grpc_options_with_message_size
 from grpc_helpers import parse_grpc_address
 from shared.clients.base_grpc_client import BaseGrpcClient
+from shared.clients.typed_payloads import SCHEMA_VERSION, matched_rule_from_proto, requested_schema_version
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ class BaziRuleClient(BaseGrpcClient):
             gender=gender,
             rule_types=list(rule_types) if rule_types else [],
             use_cache=use_cache,
+            schema_version=requested_schema_version(),
         )
 
         import datetime
@@ -69,20 +71,25 @@ class BaziRuleClient(BaseGrpcClient):
         channel = self.get_channel(self.address, options)
         stub = bazi_rule_pb2_grpc.BaziRuleServiceStub(channel)
         try:
-            response = stub.MatchRules(request, timeout=self.timeout)
+            response = stub.MatchRules(request, timeout=self.timeout, compression=self.call_compression(request))
 
             import datetime
             response_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            matched_data = json.loads(response.matched_json) if response.matched_json else []
-            matched_count = len(matched_data)
-
-            # 处理 unmatched 数据（可能是完整列表或只包含 count）
-            unmatched_json = response.unmatched_json if response.unmatched_json else '{}'
-            unmatched_data = json.loads(unmatched_json)
-            if isinstance(unmatched_data, dict) and 'count' in unmatched_data:
+            if response.schema_version >= SCHEMA_VERSION:
+                # 类型化结构（服务端只返回 unmatched 数量）
+                matched_data = [matched_rule_from_proto(m, json.loads) for m in response.matched]
                 unmatched_list = []
             else:
-                unmatched_list = unmatched_data if isinstance(unmatched_data, list) else []
+                matched_data = json.loads(response.matched_json) if response.matched_json else []
+
+                # 处理 unmatched 数据（可能是完整列表或只包含 count）
+                unmatched_json = response.unmatched_json if response.unmatched_json else '{}'
+                unmatched_data = json.loads(unmatched_json)
+                if isinstance(unmatched_data, dict) and 'count' in unmatched_data:
+                    unmatched_list = []
+                else:
+                    unmatched_list = unmatched_data if isinstance(unmatched_data, list) else []
+            matched_count = len(matched_data)
 
             logger.info(f"[{response_time}] ✅ bazi-rule-service (gRPC): 调用成功，匹配 {matched_count} 条规则")
             return {
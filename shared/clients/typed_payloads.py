@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+类型化 protobuf 结构与业务字典的互转（服务端 / 客户端共用）
+
+bazi_core / bazi_fortune / bazi_rule 原先把嵌套结构序列化成 JSON 字符串塞进 protobuf
+（map<string,string> 里的值甚至是 Python repr），两端各做一次 JSON 序列化和解析。
+schema_version = 1 起改为强类型消息：
+
+- 请求带 schema_version，服务端据此决定填充类型化字段还是旧版 JSON 字段
+  （旧客户端 schema_version = 0，始终拿到旧版字段）
+- GRPC_LEGACY_JSON_FIELDS=true 时服务端对新客户端也同时填充旧版字段（迁移期对照用）
+- GRPC_TYPED_PAYLOADS=false 时客户端不声明类型化版本，退回旧版 JSON 字段
+- 服务端转换时发现字典结构与 schema 不一致（SchemaMismatch），回退为旧版 JSON 字段，
+  客户端按响应里的 schema_version 选择解析方式
+
+to_* 函数把业务字典转成消息，*_from_* 函数把消息还原成与原字典相同的结构。
+"""
+
+import os
+import sys
+from typing import Any, Dict, List
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(project_root, "proto", "generated"))
+
+import bazi_core_pb2
+import bazi_fortune_pb2
+import bazi_rule_pb2
+
+# 当前类型化结构版本
+SCHEMA_VERSION = 1
+# 新客户端也填充旧版 JSON 字段（迁移期对照，默认关闭；旧客户端不受影响）
+GRPC_LEGACY_JSON_FIELDS = os.getenv("GRPC_LEGACY_JSON_FIELDS", "false").lower() == "true"
+# 客户端是否请求类型化结构
+GRPC_TYPED_PAYLOADS = os.getenv("GRPC_TYPED_PAYLOADS", "true").lower() == "true"
+
+PILLAR_NAMES = ("year", "month", "day", "hour")
+
+
+class SchemaMismatch(ValueError):
+    """字典结构与类型化 schema 不一致"""
+
+
+def wants_typed(request) -> bool:
+    """请求方是否支持类型化结构"""
+    return request.schema_version >= SCHEMA_VERSION
+
+
+def wants_legacy(request) -> bool:
+    """是否需要填充旧版 JSON 字段"""
+    return request.schema_version < SCHEMA_VERSION or GRPC_LEGACY_JSON_FIELDS
+
+
+def requested_schema_version() -> int:
+    """客户端请求中声明的 schema_version"""
+    return SCHEMA_VERSION if GRPC_TYPED_PAYLOADS else 0
+
+
+def _expect(d: Any, size: int, what: str) -> None:
+    if not isinstance(d, dict) or len(d) != size:
+        raise SchemaMismatch(f"{what} 结构不一致: {list(d) if isinstance(d, dict) else type(d).__name__}")
+
+
+def _build(message_cls, d: Dict[str, Any], what: str):
+    try:
+        return message_cls(**d)
+    except (TypeError, ValueError) as e:
+        raise SchemaMismatch(f"{what}: {e}") from e
+
+
+# ===== 排盘（bazi_core.BaziChart）=====
+
+_DETAIL_FIELDS = ("main_star", "hidden_stars", "sub_stars", "hidden_stems", "star_fortune",
+                  "self_sitting", "kongwang", "nayin", "deities")
+_RELATION_KINDS = ("liuhe", "chong", "xing", "hai", "po")
+
+
+def _pillar_links(d: Dict[str, List[str]]) -> Dict[str, Any]:
+    _expect(d, 4, "relationships.map")
+    return d
+
+
+def _relations(items, fields, what):
+    for item in items:
+        _expect(item, len(fields), what)
+    return items
+
+
+def to_chart(result: Dict[str, Any]) -> bazi_core_pb2.BaziChart:
+    """排盘结果字典 -> BaziChart"""
+    basic_info = result["basic_info"]
+    pillars, details, elements = result["bazi_pillars"], result["details"], result["elements"]
+    ten_gods_stats, relationships = result["ten_gods_stats"], result["relationships"]
+
+    chart = bazi_core_pb2.BaziChart(
+        basic_info=_build(bazi_core_pb2.BasicInfo, basic_info, "basic_info"))
+    for name in PILLAR_NAMES:
+        detail = details[name]
+        _expect(detail, len(_DETAIL_FIELDS), f"details.{name}")
+        element = elements[name]
+        _expect(element, 4, f"elements.{name}")
+        chart.pillars.append(bazi_core_pb2.ChartPillar(
+            name=name,
+            stem=pillars[name]["stem"],
+            branch=pillars[name]["branch"],
+            detail=_build(bazi_core_pb2.PillarDetail, detail, f"details.{name}"),
+            stem_element=element["stem_element"],
+            branch_element=element["branch_element"],
+        ))
+
+    for group_name, gods in ten_gods_stats.items():
+        group = chart.ten_gods_stats.add(name=group_name)
+        for god_name, stat in gods.items():
+            _expect(stat, 2, "ten_gods_stats")
+            group.gods.add(name=god_name, count=stat["count"],
+                           pillars=[bazi_core_pb2.NamedCount(name=k, count=v) for k, v in stat["pillars"].items()])
+    chart.element_counts.extend(bazi_core_pb2.NamedCount(name=k, count=v) for k, v in result["element_counts"].items())
+
+    _expect(relationships, 3, "relationships")
+    stem_relations = relationships["stem_relations"]
+    branch_relations = relationships["branch_relations"]
+    _expect(stem_relations, 2, "stem_relations")
+    _expect(branch_relations, 8, "branch_relations")
+    _expect(branch_relations["map"], 5, "branch_relations.map")
+    try:
+        chart.relationships.CopyFrom(bazi_core_pb2.Relationships(
+            element_relations=[bazi_core_pb2.StringPair(key=k, value=v)
+                               for k, v in relationships["element_relations"].items()],
+            stem_relations=bazi_core_pb2.StemRelations(
+                he=_relations(stem_relations["he"], ("pillars", "stems"), "he"),
+                map=_pillar_links(stem_relations["map"]),
+            ),
+            branch_relations=bazi_core_pb2.BranchRelations(
+                map={kind: _pillar_links(branch_relations["map"][kind]) for kind in _RELATION_KINDS},
+                sanhe=_relations(branch_relations["sanhe"], ("group", "pillars"), "sanhe"),
+                sanhui=_relations(branch_relations["sanhui"], ("group", "pillars"), "sanhui"),
+                **{kind: _relations(branch_relations[kind], ("pillars", "branches"), kind)
+                   for kind in _RELATION_KINDS},
+            ),
+        ))
+    except (TypeError, ValueError, KeyError) as e:
+        raise SchemaMismatch(f"relationships: {e}") from e
+    return chart
+
+
+def _detail_dict(m) -> Dict[str, Any]:
+    return {
+        "main_star": m.main_star,
+        "hidden_stars": list(m.hidden_stars),
+        "sub_stars": list(m.sub_stars),
+        "hidden_stems": list(m.hidden_stems),
+        "star_fortune": m.star_fortune,
+        "self_sitting": m.self_sitting,
+        "kongwang": m.kongwang,
+        "nayin": m.nayin,
+        "deities": list(m.deities),
+    }
+
+
+def _links_dict(m) -> Dict[str, List[str]]:
+    return {"year": list(m.year), "month": list(m.month), "day": list(m.day), "hour": list(m.hour)}
+
+
+def _basic_info_dict(m, fortune_layout: bool) -> Dict[str, Any]:
+    lunar = m.lunar_date
+    lunar_date = {
+        "year": lunar.year, "month": lunar.month, "day": lunar.day,
+        "month_name": lunar.month_name, "day_name": lunar.day_name, "is_leap_month": lunar.is_leap_month,
+    }
+    if fortune_layout:
+        basic_info = {"solar_date": m.solar_date, "solar_time": m.solar_time,
+                      "lunar_date": lunar_date, "gender": m.gender}
+        if m.HasField("current_time"):
+            basic_info["current_time"] = m.current_time
+        basic_info.update({"adjusted_solar_date": m.adjusted_solar_date,
+                           "adjusted_solar_time": m.adjusted_solar_time,
+                           "is_zi_shi_adjusted": m.is_zi_shi_adjusted})
+        return basic_info
+    basic_info = {
+        "solar_date": m.solar_date,
+        "solar_time": m.solar_time,
+        "adjusted_solar_date": m.adjusted_solar_date,
+        "adjusted_solar_time": m.adjusted_solar_time,
+        "lunar_date": lunar_date,
+        "gender": m.gender,
+        "is_zi_shi_adjusted": m.is_zi_shi_adjusted,
+    }
+    if m.HasField("current_time"):
+        basic_info["current_time"] = m.current_time
+    return basic_info
+
+
+def chart_from_proto(chart: bazi_core_pb2.BaziChart, fortune_layout: bool = False) -> Dict[str, Any]:
+    """
+    BaziChart -> 排盘结果字典
+
+    Args:
+        fortune_layout: 按大运流年详情的格式还原（bazi_pillars 合并详情字段，字段顺序与排盘结果不同）
+    """
+    bazi_pillars, details, elements = {}, {}, {}
+    for p in chart.pillars:
+        detail = _detail_dict(p.detail)
+        details[p.name] = detail
+        if fortune_layout:
+            bazi_pillars[p.name] = {"stem": p.stem, "branch": p.branch, **detail}
+            elements[p.name] = {"stem": p.stem, "branch": p.branch,
+                                "stem_element": p.stem_element, "branch_element": p.branch_element}
+        else:
+            bazi_pillars[p.name] = {"stem": p.stem, "branch": p.branch}
+            elements[p.name] = {"stem": p.stem, "stem_element": p.stem_element,
+                                "branch": p.branch, "branch_element": p.branch_element}
+
+    rel = chart.relationships
+    stem_rel, branch_rel = rel.stem_relations, rel.branch_relations
+    branch_relations = {
+        kind: [{"pillars": list(r.pillars), "branches": list(r.branches)} for r in getattr(branch_rel, kind)]
+        for kind in _RELATION_KINDS
+    }
+    branch_relations["map"] = {kind: _links_dict(getattr(branch_rel.map, kind)) for kind in _RELATION_KINDS}
+    branch_relations["sanhe"] = [{"group": list(r.group), "pillars": list(r.pillars)} for r in branch_rel.sanhe]
+    branch_relations["sanhui"] = [{"group": list(r.group), "pillars": list(r.pillars)} for r in branch_rel.sanhui]
+
+    return {
+        "basic_info": _basic_info_dict(chart.basic_info, fortune_layout),
+        "bazi_pillars": bazi_pillars,
+        "details": details,
+        "ten_gods_stats": {
+            group.name: {
+                god.name: {"count": god.count, "pillars": {p.name: p.count for p in god.pillars}}
+                for god in group.gods
+            }
+            for group in chart.ten_gods_stats
+        },
+        "elements": elements,
+        "element_counts": {c.name: c.count for c in chart.element_counts},
+        "relationships": {
+            "element_relations": {p.key: p.value for p in rel.element_relations},
+            "stem_relations": {
+                "he": [{"pillars": list(r.pillars), "stems": list(r.stems)} for r in stem_rel.he],
+                "map": _links_dict(stem_rel.map),
+            },
+            "branch_relations": branch_relations,
+        },
+    }
+
+
+# ===== 大运流年（bazi_fortune.FortuneDetail）=====
+
+_FORTUNE_KEYS = ("basic_info", "bazi_pillars", "details", "ten_gods_stats", "elements", "element_counts",
+                 "relationships", "dayun_info", "liunian_info", "dayun_sequence", "liunian_sequence",
+                 "liuyue_sequence", "liuri_sequence", "liushi_sequence")
+_FORTUNE_DETAIL_KEYS = PILLAR_NAMES + ("liunian", "dayun", "qiyun", "jiaoyun", "dayun_sequence",
+                                       "liunian_sequence", "liuri_sequence", "liushi_sequence",
+                                       "current_context", "liuyue_sequence")
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or a == b
+
+
+def to_fortune_detail(detail: Dict[str, Any]) -> bazi_fortune_pb2.FortuneDetail:
+    """
+    大运流年详情字典 -> FortuneDetail
+
+    details 下的柱详情 / 当前大运流年 / 各序列与顶层字段是同一份数据，只传一次；
+    不满足该关系时抛出 SchemaMismatch。
+    """
+    _expect(detail, len(_FORTUNE_KEYS), "fortune_detail")
+    inner = detail["details"]
+    _expect(inner, len(_FORTUNE_DETAIL_KEYS), "fortune_detail.details")
+    dayun_info, liunian_info = detail["dayun_info"], detail["liunian_info"]
+    dayun_sequence = detail["dayun_sequence"]
+
+    # 顶层 liunian_sequence 必须是各步大运流年的拼接；details 下的同名字段与顶层一致
+    flat_liunian = [item for dayun in dayun_sequence for item in dayun["liunian_sequence"]]
+    if not (_same(detail["liunian_sequence"], flat_liunian)
+            and _same(inner["dayun_sequence"], dayun_sequence)
+            and _same(inner["liunian_sequence"], detail["liunian_sequence"])
+            and _same(inner["liuyue_sequence"], detail["liuyue_sequence"])
+            and _same(inner["liuri_sequence"], detail["liuri_sequence"])
+            and _same(inner["liushi_sequence"], detail["liushi_sequence"])
+            and _same(inner["dayun"], dayun_info["current_dayun"])
+            and _same(inner["liunian"], liunian_info["current_liunian"])
+            and _same(inner["qiyun"], dayun_info["qiyun"])
+            and _same(inner["jiaoyun"], dayun_info["jiaoyun"])):
+        raise SchemaMismatch("fortune_detail 冗余字段与顶层不一致")
+    for name in PILLAR_NAMES:
+        merged = {"stem": detail["bazi_pillars"][name]["stem"],
+                  "branch": detail["bazi_pillars"][name]["branch"], **inner[name]}
+        if merged != detail["bazi_pillars"][name]:
+            raise SchemaMismatch(f"bazi_pillars.{name} 与 details 不一致")
+
+    for dayun in dayun_sequence:
+        if len(dayun) not in (20, 21):
+            raise SchemaMismatch("dayun_sequence 结构不一致")
+        for liunian in dayun["liunian_sequence"]:
+            _expect(liunian, 21, "liunian_sequence")
+            for liuyue in liunian["liuyue_sequence"]:
+                _expect(liuyue, 16, "liuyue_sequence")
+
+    chart = to_chart({**detail, "details": {name: inner[name] for name in PILLAR_NAMES}})
+    return _build(bazi_fortune_pb2.FortuneDetail, {
+        "chart": chart,
+        "dayun_info": {k: (v or None) for k, v in dayun_info.items()},
+        "current_liunian": liunian_info["current_liunian"] or None,
+        "next_liunian": liunian_info["next_liunian"] or None,
+        "dayun_sequence": dayun_sequence,
+        "liuyue_sequence": detail["liuyue_sequence"],
+        "liuri_sequence": detail["liuri_sequence"],
+        "liushi_sequence": detail["liushi_sequence"],
+        "current_context": inner["current_context"],
+    }, "fortune_detail")
+
+
+def _ganzhi_dict(m, has: bool = True) -> Dict[str, Any]:
+    if not has:
+        return {}
+    d = {
+        "stem": m.stem,
+        "branch": m.branch,
+        "main_star": m.main_star,
+        "hidden_stems": list(m.hidden_stems),
+        "hidden_stars": list(m.hidden_stars),
+        "star_fortune": m.star_fortune,
+        "self_sitting": m.self_sitting,
+        "kongwang": m.kongwang,
+        "nayin": m.nayin,
+        "deities": list(m.deities),
+    }
+    if m.HasField("direction"):
+        d["direction"] = m.direction
+    return d
+
+
+def _liuyue_dict(m) -> Dict[str, Any]:
+    return {
+        "month": m.month,
+        "solar_term": m.solar_term,
+        "term_date": m.term_date,
+        "stem": m.stem,
+        "branch": m.branch,
+        "stem_shishen": m.stem_shishen,
+        "branch_shishen": m.branch_shishen,
+        "shishen_combined": m.shishen_combined,
+        "main_star": m.main_star,
+        "hidden_stems": list(m.hidden_stems),
+        "hidden_stars": list(m.hidden_stars),
+        "star_fortune": m.star_fortune,
+        "self_sitting": m.self_sitting,
+        "kongwang": m.kongwang,
+        "nayin": m.nayin,
+        "deities": list(m.deities),
+    }
+
+
+def _liunian_dict(m) -> Dict[str, Any]:
+    return {
+        "year": m.year,
+        "age": m.age,
+        "age_display": m.age_display,
+        "stem": m.stem,
+        "branch": m.branch,
+        "main_star": m.main_star,
+        "hidden_stems": list(m.hidden_stems),
+        "hidden_stars": list(m.hidden_stars),
+        "star_fortune": m.star_fortune,
+        "self_sitting": m.self_sitting,
+        "kongwang": m.kongwang,
+        "nayin": m.nayin,
+        "deities": list(m.deities),
+        "stem_shishen": m.stem_shishen,
+        "branch_shishen": m.branch_shishen,
+        "shishen_combined": m.shishen_combined,
+        "liuyue_sequence": [_liuyue_dict(x) for x in m.liuyue_sequence],
+        "relations": [{"type": r.type, "description": r.description} for r in m.relations],
+        "xiaoyun_ganzhi": m.xiaoyun_ganzhi,
+        "xiaoyun_stem": m.xiaoyun_stem,
+        "xiaoyun_branch": m.xiaoyun_branch,
+    }
+
+
+def _dayun_dict(m) -> Dict[str, Any]:
+    d = {"step": m.step, "stem": m.stem, "branch": m.branch}
+    if m.HasField("is_xiaoyun"):
+        d["is_xiaoyun"] = m.is_xiaoyun
+    d.update({
+        "main_star": m.main_star,
+        "hidden_stems": list(m.hidden_stems),
+        "hidden_stars": list(m.hidden_stars),
+        "star_fortune": m.star_fortune,
+        "self_sitting": m.self_sitting,
+        "kongwang": m.kongwang,
+        "nayin": m.nayin,
+        "deities": list(m.deities),
+        "stem_shishen": m.stem_shishen,
+        "branch_shishen": m.branch_shishen,
+        "shishen_combined": m.shishen_combined,
+        "age_display": m.age_display,
+        "age_range": {"start": m.age_range.start, "end": m.age_range.end},
+        "year_start": m.year_start,
+        "year_end": m.year_end,
+        "liunian_simple": [{"year": x.year, "ganzhi": x.ganzhi} for x in m.liunian_simple],
+        "liunian_sequence": [_liunian_dict(x) for x in m.liunian_sequence],
+    })
+    return d
+
+
+def fortune_detail_from_proto(m: bazi_fortune_pb2.FortuneDetail) -> Dict[str, Any]:
+    """FortuneDetail -> 大运流年详情字典（冗余字段还原为同一对象引用，与服务端原字典一致）"""
+    result = chart_from_proto(m.chart, fortune_layout=True)
+    info = m.dayun_info
+    qiyun, jiaoyun = info.qiyun, info.jiaoyun
+    dayun_info = {
+        "current_dayun": _ganzhi_dict(info.current_dayun, info.HasField("current_dayun")),
+        "next_dayun": _ganzhi_dict(info.next_dayun, info.HasField("next_dayun")),
+        "qiyun_date": info.qiyun_date,
+        "qiyun_age": info.qiyun_age,
+        "qiyun": {"years": qiyun.years, "months": qiyun.months, "days": qiyun.days,
+                  "hours": qiyun.hours, "description": qiyun.description},
+        "jiaoyun_date": info.jiaoyun_date,
+        "jiaoyun_age": info.jiaoyun_age,
+        "jiaoyun": {"stems": list(jiaoyun.stems), "branch": jiaoyun.branch, "solar_term": jiaoyun.solar_term,
+                    "days_after": jiaoyun.days_after, "description": jiaoyun.description},
+    }
+    liunian_info = {
+        "current_liunian": _ganzhi_dict(m.current_liunian, m.HasField("current_liunian")),
+        "next_liunian": _ganzhi_dict(m.next_liunian, m.HasField("next_liunian")),
+    }
+    dayun_sequence = [_dayun_dict(x) for x in m.dayun_sequence]
+    liunian_sequence = [item for dayun in dayun_sequence for item in dayun["liunian_sequence"]]
+    liuyue_sequence = [_liuyue_dict(x) for x in m.liuyue_sequence]
+    liuri_sequence = [{"date": x.date, "stem": x.stem, "branch": x.branch, "main_star": x.main_star}
+                      for x in m.liuri_sequence]
+    liushi_sequence = [{"time": x.time, "stem": x.stem, "branch": x.branch, "main_star": x.main_star}
+                       for x in m.liushi_sequence]
+    ctx = m.current_context
+
+    details = result["details"]
+    details.update({
+        "liunian": liunian_info["current_liunian"],
+        "dayun": dayun_info["current_dayun"],
+        "qiyun": dayun_info["qiyun"],
+        "jiaoyun": dayun_info["jiaoyun"],
+        "dayun_sequence": dayun_sequence,
+        "liunian_sequence": liunian_sequence,
+        "liuri_sequence": liuri_sequence,
+        "liushi_sequence": liushi_sequence,
+        "current_context": {"dayun_index": ctx.dayun_index, "selected_year": ctx.selected_year,
+                            "year_index": ctx.year_index, "selected_month": ctx.selected_month},
+        "liuyue_sequence": liuyue_sequence,
+    })
+    result.update({
+        "dayun_info": dayun_info,
+        "liunian_info": liunian_info,
+        "dayun_sequence": dayun_sequence,
+        "liunian_sequence": liunian_sequence,
+        "liuyue_sequence": liuyue_sequence,
+        "liuri_sequence": liuri_sequence,
+        "liushi_sequence": liushi_sequence,
+    })
+    return result
+
+
+# ===== 规则匹配（bazi_rule.MatchedRule）=====
+
+_RULE_KEYS = ("rule_id", "rule_code", "rule_name", "rule_type", "content", "priority")
+
+
+def _rule_content(content: Any):
+    """content 符合 {type, text?, items?} 结构时返回 RuleContent，否则返回 None"""
+    if not isinstance(content, dict) or not isinstance(content.get("type"), str):
+        return None
+    if not set(content) <= {"type", "text", "items"}:
+        return None
+    text = content.get("text")
+    if text is not None and not isinstance(text, str):
+        return None
+    items = []
+    for item in content.get("items") or ():
+        sub = _rule_content(item)
+        if sub is None:
+            return None
+        items.append(sub)
+    if "items" in content and not content["items"]:
+        return None  # 空列表无法与缺省区分
+    return bazi_rule_pb2.RuleContent(type=content["type"], text=text, items=items)
+
+
+def to_matched_rule(rule: Dict[str, Any], dumps) -> bazi_rule_pb2.MatchedRule:
+    """
+    匹配规则字典 -> MatchedRule
+
+    Args:
+        dumps: 序列化函数（不符合结构的 content / 整条规则退回 JSON）
+    """
+    if (isinstance(rule, dict) and len(rule) == len(_RULE_KEYS)
+            and all(isinstance(rule.get(k), str) for k in ("rule_id", "rule_code", "rule_name", "rule_type"))
+            and type(rule.get("priority")) is int):
+        msg = bazi_rule_pb2.MatchedRule(
+            rule_id=rule["rule_id"], rule_code=rule["rule_code"], rule_name=rule["rule_name"],
+            rule_type=rule["rule_type"], priority=rule["priority"])
+        content = _rule_content(rule["content"])
+        if content is not None:
+            msg.content.CopyFrom(content)
+        else:
+            msg.content_json = dumps(rule["content"])
+        return msg
+    return bazi_rule_pb2.MatchedRule(rule_json=dumps(rule))
+
+
+def _rule_content_dict(m) -> Dict[str, Any]:
+    d = {"type": m.type}
+    if m.HasField("text"):
+        d["text"] = m.text
+    if m.items:
+        d["items"] = [_rule_content_dict(x) for x in m.items]
+    return d
+
+
+def matched_rule_from_proto(m: bazi_rule_pb2.MatchedRule, loads) -> Dict[str, Any]:
+    """MatchedRule -> 匹配规则字典"""
+    if m.rule_json:
+        return loads(m.rule_json)
+    return {
+        "rule_id": m.rule_id,
+        "rule_code": m.rule_code,
+        "rule_name": m.rule_name,
+        "rule_type": m.rule_type,
+        "content": loads(m.content_json) if m.content_json else _rule_content_dict(m.content),
+        "priority": m.priority,
+    }
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+图像分析结果缓存（按图片内容哈希）
+
+用户重复上传同一张照片（如流式失败后客户端重试）时，直接复用上次的
+检测/关键点结果，跳过 MediaPipe / YOLO / 视觉模型推理。
+
+- 主键：图片字节的 blake2b 内容哈希（快速，完全一致才命中）
+- 可选（默认关闭）：64 位 dHash 感知哈希，捕获重新编码（压缩/转存）后的同一张图：
+  L2 中保存精确别名（跨 worker 共享），进程内另有按汉明距离检索的小索引。
+  dHash 只有 64 位，不同图片也可能相同，别名命中后还要求原图尺寸一致、
+  16×16 缩略图逐像素接近才复用。需命名空间显式 use_perceptual=True 且
+  IMAGE_RESULT_CACHE_PERCEPTUAL=true；按人区分（面相/手相）或含像素坐标
+  （关键点、检测框）的命名空间不得启用
+- 只缓存检测与关键点等中间结果，不缓存最终文案
+- 存储：独立的 MultiLevelCache 实例（L1 内存 + L2 Redis），与八字缓存隔离容量
+
+使用示例：
+    _cache = ImageResultCache("face_landmarks")
+    result = _cache.get_or_compute(image_bytes, lambda: detector.detect(image_bytes),
+                                   params={"special": False})
+"""
+
+import asyncio
+import copy
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_ENABLED = os.getenv("IMAGE_RESULT_CACHE_ENABLED", "true").lower() == "true"
+IMAGE_CACHE_PERCEPTUAL = os.getenv("IMAGE_RESULT_CACHE_PERCEPTUAL", "false").lower() == "true"
+IMAGE_CACHE_TTL = int(os.getenv("IMAGE_RESULT_CACHE_TTL", "86400"))  # L2 默认 1 天
+IMAGE_CACHE_L1_SIZE = int(os.getenv("IMAGE_RESULT_CACHE_L1_SIZE", "512"))
+IMAGE_CACHE_L1_TTL = 600
+PERCEPTUAL_MAX_DISTANCE = 4      # 感知哈希汉明距离阈值（64 位中最多几位不同）
+PERCEPTUAL_INDEX_SIZE = 4096     # 每个命名空间进程内感知哈希索引的最大条目数
+PERCEPTUAL_THUMB_SIZE = 16       # 别名校验缩略图边长
+PERCEPTUAL_MAX_THUMB_DIFF = 4.0  # 别名校验：缩略图平均灰度差上限（0~255）
+
+_KEY_PREFIX = "img_result"
+
+
+def content_hash(image_bytes: bytes) -> str:
+    """图片字节内容哈希（blake2b-128）"""
+    return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+
+def perceptual_hash(image_bytes: bytes) -> Optional[str]:
+    """
+    64 位 dHash 感知哈希；解码失败或 OpenCV 不可用时返回 None
+
+    以 1/8 分辨率灰度解码后缩放到 9×8，比较相邻像素亮度
+    """
+    try:
+        import cv2
+        import numpy as np
+
+        arr = np.frombuffer(image_bytes, dtype=np.uint8)
+        img = cv2.imdecode(arr, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if img is None:
+            img = cv2.imdecode(arr, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            return None
+        small = cv2.resize(img, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        value = 0
+        for bit in bits:
+            value = (value << 1) | int(bit)
+        return f"{value:016x}"
+    except Exception as e:
+        logger.debug(f"感知哈希计算失败: {e}")
+        return None
+
+
+def image_signature(image_bytes: bytes) -> Optional[Dict[str, Any]]:
+    """
+    感知哈希别名使用的图片签名；解码失败或 OpenCV 不可用时返回 None
+
+    Returns:
+        {"phash": 64 位 dHash, "size": [宽, 高], "thumb": 16×16 灰度缩略图（hex）}
+    """
+    phash = perceptual_hash(image_bytes)
+    if not phash:
+        return None
+    try:
+        import cv2
+        import numpy as np
+
+        img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            return None
+        thumb = cv2.resize(img, (PERCEPTUAL_THUMB_SIZE, PERCEPTUAL_THUMB_SIZE), interpolation=cv2.INTER_AREA)
+        return {"phash": phash, "size": [int(img.shape[1]), int(img.shape[0])], "thumb": thumb.tobytes().hex()}
+    except Exception as e:
+        logger.debug(f"图片签名计算失败: {e}")
+        return None
+
+
+def _same_image(signature: Dict[str, Any], alias: Any) -> bool:
+    """别名校验：原图尺寸一致且缩略图平均灰度差不超过阈值（像素坐标结果不能跨尺寸复用）"""
+    if not isinstance(alias, dict) or alias.get("size") != signature["size"]:
+        return False
+    try:
+        a, b = bytes.fromhex(alias["thumb"]), bytes.fromhex(signature["thumb"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    if len(a) != len(b) or not a:
+        return False
+    return sum(abs(x - y) for x, y in zip(a, b)) / len(a) <= PERCEPTUAL_MAX_THUMB_DIFF
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _get_backend():
+    """图像结果专用 MultiLevelCache（延迟初始化，Redis 不可用时仅 L1）"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                from server.utils.cache_multi_level import MultiLevelCache
+                try:
+                    from shared.config.redis import get_redis_client
+                    redis_client = get_redis_client()
+                except Exception:
+                    redis_client = None
+                _backend = MultiLevelCache(
+                    l1_max_size=IMAGE_CACHE_L1_SIZE,
+                    l1_ttl=IMAGE_CACHE_L1_TTL,
+                    redis_client=redis_client,
+                    redis_ttl=IMAGE_CACHE_TTL,
+                )
+    return _backend
+
+
+class ImageResultCache:
+    """按图片内容缓存分析中间结果（单个命名空间）"""
+
+    def __init__(
+        self,
+        namespace: str,
+        version: str = "v1",
+        ttl: int = IMAGE_CACHE_TTL,
+        use_perceptual: bool = False,
+        backend=None,
+    ):
+        """
+        Args:
+            namespace: 命名空间（如 face_features / desk_yolo），不同分析器互不干扰
+            version: 结果格式版本，检测逻辑变更时递增即可使旧结果失效
+            ttl: 缓存时间（秒）
+            use_perceptual: 是否启用感知哈希别名（捕获重新编码的副本）；
+                还需 IMAGE_RESULT_CACHE_PERCEPTUAL=true，人像/像素坐标类结果不得启用
+            backend: 自定义 MultiLevelCache（测试用），默认使用共享实例
+        """
+        self.namespace = namespace
+        self.version = version
+        self.ttl = ttl
+        self.use_perceptual = use_perceptual and IMAGE_CACHE_PERCEPTUAL
+        self._backend = backend
+        # (参数后缀, 感知哈希) -> 别名（内容哈希 + 校验签名），按汉明距离检索，LRU 限容
+        self._phash_index: "OrderedDict[tuple, str]" = OrderedDict()
+        self._index_lock = threading.Lock()
+        self._hits = 0
+        self._perceptual_hits = 0
+        self._misses = 0
+
+    @property
+    def backend(self):
+        return self._backend if self._backend is not None else _get_backend()
+
+    # ---------------------------------------------------------------- 键
+
+    def _suffix(self, params: Optional[Dict[str, Any]]) -> str:
+        if not params:
+            return ""
+        return ":" + ",".join(f"{k}={params[k]}" for k in sorted(params))
+
+    def _content_key(self, digest: str, params: Optional[Dict[str, Any]]) -> str:
+        return f"{_KEY_PREFIX}:{self.namespace}:{self.version}:c:{digest}{self._suffix(params)}"
+
+    def _alias_key(self, phash: str, params: Optional[Dict[str, Any]]) -> str:
+        return f"{_KEY_PREFIX}:{self.namespace}:{self.version}:p:{phash}{self._suffix(params)}"
+
+    # ---------------------------------------------------------------- 感知哈希索引
+
+    def _index_add(self, phash: str, alias: Dict[str, Any], params: Optional[Dict[str, Any]]):
+        key = (self._suffix(params), int(phash, 16))
+        with self._index_lock:
+            self._phash_index[key] = alias
+            self._phash_index.move_to_end(key)
+            while len(self._phash_index) > PERCEPTUAL_INDEX_SIZE:
+                self._phash_index.popitem(last=False)
+
+    def _index_nearest(self, phash: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        suffix, value = self._suffix(params), int(phash, 16)
+        best, best_distance = None, PERCEPTUAL_MAX_DISTANCE + 1
+        with self._index_lock:
+            for (s, v), alias in self._phash_index.items():
+                if s != suffix:
+                    continue
+                distance = bin(v ^ value).count("1")
+                if distance < best_distance:
+                    best, best_distance = alias, distance
+        return best
+
+    # ---------------------------------------------------------------- 读写
+
+    def _lookup(self, image_bytes: bytes, digest: str, params: Optional[Dict[str, Any]]):
+        """返回 (结果, 图片签名)；签名仅在内容哈希未命中且启用感知哈希时计算"""
+        cached = self.backend.get(self._content_key(digest, params))
+        if cached is not None:
+            self._hits += 1
+            return copy.deepcopy(cached), None
+
+        signature = image_signature(image_bytes) if self.use_perceptual else None
+        if signature:
+            phash = signature["phash"]
+            for alias in (self.backend.get(self._alias_key(phash, params)), self._index_nearest(phash, params)):
+                if not _same_image(signature, alias):
+                    continue
+                cached = self.backend.get(self._content_key(alias["digest"], params))
+                if cached is not None:
+                    self._perceptual_hits += 1
+                    logger.info(f"[ImageResultCache] {self.namespace} 感知哈希命中（重新编码的副本）")
+                    return copy.deepcopy(cached), signature
+
+        self._misses += 1
+        return None, signature
+
+    def _store(self, digest: str, signature: Optional[Dict[str, Any]], value: Any,
+               params: Optional[Dict[str, Any]]):
+        try:
+            self.backend.set(self._content_key(digest, params), copy.deepcopy(value), ttl=self.ttl)
+            if signature:
+                alias = {"digest": digest, "size": signature["size"], "thumb": signature["thumb"]}
+                self.backend.set(self._alias_key(signature["phash"], params), alias, ttl=self.ttl)
+                self._index_add(signature["phash"], alias, params)
+        except Exception as e:
+            logger.warning(f"[ImageResultCache] {self.namespace} 写入缓存失败: {e}")
+
+    def get(self, image_bytes: bytes, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """查询缓存结果，未命中返回 None"""
+        if not IMAGE_CACHE_ENABLED or not image_bytes:
+            return None
+        result, _ = self._lookup(image_bytes, content_hash(image_bytes), params)
+        return result
+
+    def set(self, image_bytes: bytes, value: Any, params: Optional[Dict[str, Any]] = None):
+        """写入缓存结果"""
+        if not IMAGE_CACHE_ENABLED or not image_bytes:
+            return
+        signature = image_signature(image_bytes) if self.use_perceptual else None
+        self._store(content_hash(image_bytes), signature, value, params)
+
+    def get_or_compute(
+        self,
+        image_bytes: bytes,
+        compute: Callable[[], Any],
+        params: Optional[Dict[str, Any]] = None,
+        cacheable: Callable[[Any], bool] = lambda r: isinstance(r, dict) and bool(r.get("success")),
+    ) -> Any:
+        """命中则直接返回，否则执行 compute 并缓存（默认只缓存 success=True 的结果）"""
+        if not IMAGE_CACHE_ENABLED or not image_bytes:
+            return compute()
+        digest = content_hash(image_bytes)
+        cached, signature = self._lookup(image_bytes, digest, params)
+        if cached is not None:
+            return cached
+        result = compute()
+        if cacheable(result):
+            self._store(digest, signature, result, params)
+        return result
+
+    async def aget_or_compute(
+        self,
+        image_bytes: bytes,
+        compute: Callable[[], Awaitable[Any]],
+        params: Optional[Dict[str, Any]] = None,
+        cacheable: Callable[[Any], bool] = lambda r: isinstance(r, dict) and bool(r.get("success")),
+    ) -> Any:
+        """get_or_compute 的异步版本（哈希与缓存读写在线程池执行，不阻塞事件循环）"""
+        if not IMAGE_CACHE_ENABLED or not image_bytes:
+            return await compute()
+        loop = asyncio.get_event_loop()
+        digest = content_hash(image_bytes)
+        cached, signature = await loop.run_in_executor(None, self._lookup, image_bytes, digest, params)
+        if cached is not None:
+            return cached
+        result = await compute()
+        if cacheable(result):
+            await loop.run_in_executor(None, self._store, digest, signature, result, params)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """命中统计"""
+        total = self._hits + self._perceptual_hits + self._misses
+        hit_rate = (self._hits + self._perceptual_hits) / total * 100 if total else 0.0
+        return {
+            "namespace": self.namespace,
+            "hits": self._hits,
+            "perceptual_hits": self._perceptual_hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(hit_rate, 2),
+        }
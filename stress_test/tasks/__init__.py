@@ -7,5 +7,6 @@
 from .bazi_tasks import BaziTasks
 from .fortune_tasks import FortuneTasks
 from .health_tasks import HealthTasks
+from .stream_tasks import StreamCapacityTasks
 
-__all__ = ["BaziTasks", "FortuneTasks", "HealthTasks"]
+__all__ = ["BaziTasks", "FortuneTasks", "HealthTasks", "StreamCapacityTasks"]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式接口容量测试任务
+
+完整读取 SSE 流（不在 N 行后截断），分别上报：
+    - "{接口名}"：整条流耗时，出现 type=error 事件或没有 complete 即记为失败
+    - "{接口名} 首字"：从发出请求到第一个 progress 事件的耗时
+
+配合服务端本地模拟 LLM（LLM_MOCK_ENABLED=true）测量服务端真实的流式并发容量，
+不产生 Coze / 百炼调用费用：
+    # 服务端
+    LLM_MOCK_ENABLED=true MOCK_LLM_FIRST_TOKEN_MS=800 MOCK_LLM_TOKENS_PER_SECOND=50 python3 server/start.py
+    # 压测端（在 stress_test/ 目录执行；每轮开始前重置统计，结束后读取事件循环延迟与每路流内存）
+    curl -X POST http://localhost:8001/api/v1/observability/mock-llm/reset
+    PYTHONPATH=. locust -f tasks/stream_tasks.py --host=http://localhost:8001 --users 200 --spawn-rate 20 --run-time 5m --headless
+    curl http://localhost:8001/api/v1/observability/mock-llm
+"""
+
+import json
+import time
+
+from locust import HttpUser, task, between
+
+from utils.data_generator import DataGenerator
+
+
+class StreamCapacityTasks(HttpUser):
+    """流式接口容量测试任务类"""
+
+    # 请求间隔：0.5-1.5秒（容量测试以流本身的时长为主）
+    wait_time = between(0.5, 1.5)
+
+    def _stream(self, path, payload, name):
+        """请求流式接口并读完整条 SSE 流"""
+        start = time.perf_counter()
+        first_token_ms = None
+        error = None
+        completed = False
+        with self.client.post(path, json=payload, stream=True, catch_response=True, name=name, timeout=300) as response:
+            if response.status_code != 200:
+                response.failure(f"HTTP错误: {response.status_code}")
+                return
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    try:
+                        event = json.loads(line[5:].strip())
+                    except ValueError:
+                        continue
+                    event_type = event.get("type")
+                    if event_type == "progress" and first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - start) * 1000
+                    elif event_type == "error":
+                        error = event.get("content") or "未知错误"
+                        break
+                    elif event_type == "complete":
+                        completed = True
+            except Exception as e:
+                error = f"流读取中断: {str(e)}"
+
+            if error:
+                response.failure(f"流式错误: {error}")
+            elif not completed:
+                response.failure("流结束但未收到 complete")
+            else:
+                response.success()
+
+        if first_token_ms is not None:
+            self.environment.events.request.fire(
+                request_type="SSE",
+                name=f"{name} 首字",
+                response_time=first_token_ms,
+                response_length=0,
+                exception=None,
+                context={},
+            )
+
+    @task(3)
+    def test_xishen_jishen_stream(self):
+        """喜神忌神流式"""
+        self._stream("/api/v1/bazi/xishen-jishen/stream", DataGenerator.generate_bazi_request(), "喜神忌神流式")
+
+    @task(2)
+    def test_marriage_stream(self):
+        """感情婚姻流式"""
+        self._stream("/api/v1/bazi/marriage-analysis/stream", DataGenerator.generate_bazi_request(), "婚姻流式")
+
+    @task(2)
+    def test_career_wealth_stream(self):
+        """事业财富流式"""
+        self._stream("/api/v1/career-wealth/stream", DataGenerator.generate_bazi_request(), "事业流式")
+
+    @task(2)
+    def test_children_study_stream(self):
+        """子女学习流式"""
+        self._stream("/api/v1/children-study/stream", DataGenerator.generate_bazi_request(), "子女流式")
+
+    @task(2)
+    def test_health_stream(self):
+        """身体健康流式"""
+        self._stream("/api/v1/health/stream", DataGenerator.generate_bazi_request(), "健康流式")
+
+    @task(2)
+    def test_general_review_stream(self):
+        """总评分析流式"""
+        self._stream("/api/v1/general-review/stream", DataGenerator.generate_bazi_request(), "总评流式")
+
+    @task(2)
+    def test_annual_report_stream(self):
+        """年运报告流式"""
+        self._stream("/api/v1/annual-report/stream", DataGenerator.generate_bazi_request(), "年运流式")
+
+    @task(2)
+    def test_daily_fortune_stream(self):
+        """每日运势日历流式"""
+        self._stream(
+            "/api/v1/daily-fortune-calendar/stream",
+            DataGenerator.generate_daily_fortune_stream_request(),
+            "每日运势流式",
+        )
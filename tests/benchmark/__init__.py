@@ -0,0 +1 @@
+"""进程内基准测试（排盘 / 规则匹配 / 每日运势等，不依赖 MySQL / Redis / LLM）"""
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试用例：排盘计算、大运流年、旺衰分析、规则匹配、每日运势、结果格式化
+
+每个用例由三部分组成：
+- prepare()：准备输入（不计时），返回上下文
+- run(ctx, i)：被计时的一次调用，i 为本轮第几次（按 i 轮换语料中的命盘 / 日期）
+- reset(ctx)：冷缓存模式下每次调用前清空该路径上的进程内缓存（不计时）
+
+每轮按 i = 0..size-1 把语料完整跑一遍，各轮工作量相同，轮与轮之间才可比。
+
+全部在进程内执行，不连接 MySQL / Redis / LLM：多级缓存替换为只有 L1 的本地实例，
+并屏蔽 BAZI_CORE_SERVICE_URL，排盘始终走本地计算。
+"""
+
+import contextlib
+import io
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from tests.benchmark.corpus import CHARTS, CURRENT_TIME, DAILY_DATES, build_rule_corpus
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    description: str
+    size: int      # 每轮调用次数
+    rounds: int    # 计时轮数
+    prepare: Callable[[], Dict[str, Any]]
+    run: Callable[[Dict[str, Any], int], Any]
+    reset: Optional[Callable[[Dict[str, Any]], None]] = None
+
+
+@contextlib.contextmanager
+def offline_environment() -> Iterator[None]:
+    """基准测试期间隔离外部依赖：本地多级缓存（无 Redis）、本地排盘（无 gRPC）"""
+    from server.utils import cache_multi_level
+    from server.utils.cache_multi_level import MultiLevelCache
+
+    saved_cache = cache_multi_level._multi_cache
+    saved_url = os.environ.pop("BAZI_CORE_SERVICE_URL", None)
+    cache_multi_level._multi_cache = MultiLevelCache(l1_max_size=50000, l1_ttl=300, redis_client=None)
+    try:
+        yield
+    finally:
+        cache_multi_level._multi_cache = saved_cache
+        if saved_url is not None:
+            os.environ["BAZI_CORE_SERVICE_URL"] = saved_url
+
+
+def _chart(i: int):
+    return CHARTS[i % len(CHARTS)]
+
+
+def _clear_jieqi_cache(ctx: Dict[str, Any]) -> None:
+    from core.calculators.bazi_calculator_docs import BaziCalculator as DocsBaziCalculator
+    DocsBaziCalculator._jieqi_table_cache.clear()
+
+
+def _clear_daily_data(ctx: Dict[str, Any]) -> None:
+    from server.data import daily_fortune_data_loader
+    daily_fortune_data_loader._CACHE.clear()
+
+
+# ==================== 排盘 / 大运流年 / 旺衰 ====================
+
+def _bazi_calculate(ctx: Dict[str, Any], i: int) -> Any:
+    from core.calculators.BaziCalculator import BaziCalculator
+    return BaziCalculator(*_chart(i)).calculate()
+
+
+def _dayun_liunian(ctx: Dict[str, Any], i: int) -> Any:
+    from core.calculators.bazi_calculator_docs import BaziCalculator as DocsBaziCalculator
+    solar_date, solar_time, gender = _chart(i)
+    calculator = DocsBaziCalculator(solar_date, solar_time, gender=gender)
+    # 与 compute_local_detail 一致：计算过程的 print 输出重定向掉
+    with contextlib.redirect_stdout(io.StringIO()):
+        return calculator.calculate_dayun_liunian(current_time=CURRENT_TIME)
+
+
+def _wangshuai_prepare() -> Dict[str, Any]:
+    from core.analyzers.wangshuai_analyzer import WangShuaiAnalyzer
+    return {"analyzer": WangShuaiAnalyzer()}
+
+
+def _wangshuai_analyze(ctx: Dict[str, Any], i: int) -> Any:
+    return ctx["analyzer"].analyze(*_chart(i))
+
+
+# ==================== 规则匹配 ====================
+
+def _rule_prepare() -> Dict[str, Any]:
+    from core.calculators.BaziCalculator import BaziCalculator
+    from server.engines.rule_engine import EnhancedRuleEngine
+    rules = build_rule_corpus()
+    inputs = []
+    for chart in CHARTS:
+        result = BaziCalculator(*chart).calculate()
+        inputs.append({key: result.get(key, {}) for key in (
+            "basic_info", "bazi_pillars", "details", "ten_gods_stats",
+            "elements", "element_counts", "relationships")})
+    return {"rules": rules, "inputs": inputs, "engine": EnhancedRuleEngine(rules, use_index=True)}
+
+
+def _rule_match(ctx: Dict[str, Any], i: int) -> Any:
+    return ctx["engine"].match_rules(ctx["inputs"][i % len(ctx["inputs"])])
+
+
+def _rule_reset(ctx: Dict[str, Any]) -> None:
+    # 冷启动：重新建索引，丢弃按规则类型缓存的字段集合
+    from server.engines.rule_engine import EnhancedRuleEngine
+    ctx["engine"] = EnhancedRuleEngine(ctx["rules"], use_index=True)
+
+
+# ==================== 每日运势 ====================
+
+def _daily_args(i: int):
+    solar_date, solar_time, gender = _chart(i)
+    return DAILY_DATES[i % len(DAILY_DATES)], solar_date, solar_time, gender
+
+
+def _daily_query(ctx: Dict[str, Any], i: int) -> Any:
+    from server.services.daily_fortune_calendar_service import DailyFortuneCalendarService
+    return DailyFortuneCalendarService._query_from_database(*_daily_args(i))
+
+
+def _daily_calendar(ctx: Dict[str, Any], i: int) -> Any:
+    from server.services.daily_fortune_calendar_service import DailyFortuneCalendarService
+    return DailyFortuneCalendarService.get_daily_fortune_calendar(*_daily_args(i))
+
+
+def _daily_reset(ctx: Dict[str, Any]) -> None:
+    from server.utils.cache_multi_level import get_multi_cache
+    get_multi_cache().clear()
+    _clear_daily_data(ctx)
+
+
+# ==================== 格式化 ====================
+
+def _format_prepare() -> Dict[str, Any]:
+    from core.calculators.BaziCalculator import BaziCalculator
+    pairs = []
+    for i in range(4):
+        pairs.append((_dayun_liunian({}, i), BaziCalculator(*_chart(i)).calculate()))
+    return {"pairs": pairs}
+
+
+def _format_detail(ctx: Dict[str, Any], i: int) -> Any:
+    from server.utils.bazi_formatters import BaziResultFormatter
+    detail_raw, bazi_result = ctx["pairs"][i % len(ctx["pairs"])]
+    return BaziResultFormatter.format_detail_result(detail_raw, bazi_result)
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase("bazi_calculate", "BaziCalculator.calculate 排盘", len(CHARTS), 5,
+                  dict, _bazi_calculate),
+    BenchmarkCase("dayun_liunian", "calculate_dayun_liunian 大运流年", 2, 2,
+                  dict, _dayun_liunian, _clear_jieqi_cache),
+    BenchmarkCase("wangshuai_analyze", "WangShuaiAnalyzer.analyze 旺衰", len(CHARTS), 5,
+                  _wangshuai_prepare, _wangshuai_analyze),
+    BenchmarkCase("rule_match", "EnhancedRuleEngine.match_rules（合成规则集）", len(CHARTS), 5,
+                  _rule_prepare, _rule_match, _rule_reset),
+    BenchmarkCase("daily_fortune_query", "每日运势计算（不经缓存）", len(CHARTS), 3,
+                  dict, _daily_query, _daily_reset),
+    BenchmarkCase("daily_fortune_calendar", "每日运势日历（经多级缓存）", len(CHARTS), 3,
+                  dict, _daily_calendar, _daily_reset),
+    BenchmarkCase("format_detail", "BaziResultFormatter.format_detail_result", 4, 50,
+                  _format_prepare, _format_detail),
+]
+
+
+def get_case(name: str) -> BenchmarkCase:
+    for case in CASES:
+        if case.name == name:
+            return case
+    raise KeyError(f"未知的基准用例: {name}（可选: {', '.join(c.name for c in CASES)}）")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试固定语料：命盘、查询日期、合成规则集
+
+所有数据写死或由固定种子生成，保证不同机器 / 不同次运行测的是同一份工作量。
+"""
+
+import random
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+# (阳历日期, 时间, 性别)：覆盖子时换日、节气交界、闰月、早晚年份
+CHARTS: List[Tuple[str, str, str]] = [
+    ("1990-05-15", "14:30", "male"),
+    ("1985-06-20", "08:30", "female"),
+    ("1990-01-15", "12:00", "male"),
+    ("2000-02-04", "20:45", "female"),   # 立春当天
+    ("1976-08-08", "23:30", "male"),     # 晚子时
+    ("1995-12-22", "00:15", "female"),   # 早子时 + 冬至
+    ("2001-05-23", "06:00", "male"),     # 闰四月
+    ("1968-10-01", "18:20", "female"),
+    ("1988-03-05", "10:10", "male"),     # 惊蛰
+    ("2010-07-07", "16:40", "female"),
+    ("1959-11-30", "04:05", "male"),
+    ("2023-03-22", "09:00", "female"),   # 闰二月
+]
+
+# 大运流年 / 每日运势的“当前时间”固定，避免结果随运行日期变化
+CURRENT_TIME = datetime(2026, 1, 1, 12, 0)
+
+DAILY_DATES: List[str] = [
+    "2026-01-01", "2026-02-17", "2026-04-05", "2026-06-21",
+    "2026-08-08", "2026-10-01", "2026-12-22",
+]
+
+RULE_SEED = 20260101
+RULE_COUNT = 3000
+RULE_TYPES = ["marriage", "career", "wealth", "health", "character", "children"]
+
+_STEMS = "甲乙丙丁戊己庚辛壬癸"
+_BRANCHES = "子丑寅卯辰巳午未申酉戌亥"
+JIAZI = [_STEMS[i % 10] + _BRANCHES[i % 12] for i in range(60)]
+
+_DEITIES = [
+    "天乙贵人", "太极贵人", "文昌贵人", "天德贵人", "月德贵人", "德秀贵人", "国印贵人", "福星贵人",
+    "驿马", "桃花", "华盖", "将星", "羊刃", "禄神", "红鸾", "天喜", "孤辰", "寡宿",
+    "亡神", "劫煞", "灾煞", "学堂", "词馆", "金舆", "空亡",
+]
+_STAR_FORTUNES = ["长生", "沐浴", "冠带", "临官", "帝旺", "衰", "病", "死", "墓", "绝", "胎", "养"]
+_TEN_GODS = ["比肩", "劫财", "食神", "伤官", "偏财", "正财", "七杀", "正官", "偏印", "正印"]
+
+
+def _leaf(rng: random.Random) -> Dict:
+    kind = rng.randrange(9)
+    if kind == 0:
+        return {"year_pillar": rng.sample(JIAZI, 3)}
+    if kind == 1:
+        return {"month_pillar": rng.choice(JIAZI)}
+    if kind == 2:
+        return {"hour_pillar": rng.sample(JIAZI, 2)}
+    if kind == 3:
+        return {"deities_in_any_pillar": rng.sample(_DEITIES, 2)}
+    if kind == 4:
+        return {"star_fortune_in_day": rng.choice(_STAR_FORTUNES)}
+    if kind == 5:
+        return {"main_star_in_year": rng.sample(_TEN_GODS, 2)}
+    if kind == 6:
+        return {"day_branch_in": rng.sample(_BRANCHES, 3)}
+    if kind == 7:
+        return {"gender": rng.choice(["male", "female"])}
+    return {"not": {"star_fortune_in_month": rng.choice(_STAR_FORTUNES)}}
+
+
+def _conditions(rng: random.Random) -> Dict:
+    """与线上规则相近的分布：单键规则可走年柱 / 日柱 / 神煞索引，组合规则只能按类型全量匹配"""
+    indexed = rng.random()
+    if indexed < 0.3:
+        return {"day_pillar": rng.choice(JIAZI)}
+    if indexed < 0.4:
+        return {"year_pillar": rng.sample(JIAZI, 2)}
+    if indexed < 0.5:
+        return {"deities_in_any_pillar": [rng.choice(_DEITIES)]}
+    leaves = [_leaf(rng) for _ in range(rng.randint(2, 4))]
+    return {"all": leaves} if rng.random() < 0.7 else {"any": leaves}
+
+
+def build_rule_corpus(count: int = RULE_COUNT, seed: int = RULE_SEED) -> List[Dict]:
+    """按固定种子生成合成规则（线上规则在数据库中，基准测试不依赖数据库）"""
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        rules.append({
+            "rule_id": f"BENCH_{i:05d}",
+            "rule_name": f"基准规则{i}",
+            "rule_type": rng.choice(RULE_TYPES),
+            "priority": rng.randint(1, 100),
+            "enabled": rng.random() > 0.05,
+            "conditions": _conditions(rng),
+            "content": {"type": "description", "text": f"基准规则{i}"},
+        })
+    return rules
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程内基准测试：排盘、大运流年、旺衰、规则匹配、每日运势、格式化
+
+不依赖 MySQL / Redis / LLM，在项目根目录执行：
+    python tests/benchmark/run_benchmark.py                          # 全部用例，与基线对比
+    python tests/benchmark/run_benchmark.py --cases rule_match --modes warm
+    python tests/benchmark/run_benchmark.py --scale 0.2 --output result.json
+    python tests/benchmark/run_benchmark.py --update-baseline        # 以本次结果覆盖基线
+
+有用例中位数比基线慢超过 --threshold 时退出码为 1。
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from tests.benchmark.cases import CASES, get_case
+from tests.benchmark.runner import (
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_THRESHOLD,
+    MODES,
+    compare_to_baseline,
+    format_comparison,
+    load_json,
+    run_suite,
+    save_json,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="进程内基准测试（无 MySQL / Redis / LLM）")
+    parser.add_argument("--cases", default="", help=f"逗号分隔的用例名，默认全部：{', '.join(c.name for c in CASES)}")
+    parser.add_argument("--modes", default=",".join(MODES), help="cold / warm，逗号分隔（默认两种都跑）")
+    parser.add_argument("--scale", type=float, default=1.0, help="轮数缩放，冒烟可用 0.2（默认 1.0）")
+    parser.add_argument("--output", default="", help="本次结果 JSON 输出路径")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线 JSON 路径")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"中位数慢于基线的比例阈值（默认 {DEFAULT_THRESHOLD}）")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help=f"低于该差值（毫秒）不判回归（默认 {DEFAULT_MIN_DELTA_MS}）")
+    parser.add_argument("--update-baseline", action="store_true", help="以本次结果覆盖基线")
+    parser.add_argument("--no-compare", action="store_true", help="只输出结果，不与基线对比")
+    parser.add_argument("--log-level", default="ERROR", help="被测代码的日志级别（默认 ERROR，避免日志输出干扰计时）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(getattr(logging, args.log_level.upper(), logging.ERROR) - 1)
+
+    cases = [get_case(name.strip()) for name in args.cases.split(",") if name.strip()] or CASES
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+
+    def _progress(name, mode, stats):
+        print(f"  {name:<26}{mode:<6} median {stats['median_ms']:>10.3f}ms  "
+              f"p95 {stats['p95_ms']:>10.3f}ms  calls={stats['calls']}", flush=True)
+
+    print(f"基准测试：{len(cases)} 个用例，模式 {'/'.join(modes)}，scale={args.scale}")
+    result = run_suite(cases, modes, scale=args.scale, progress=_progress)
+
+    if args.output:
+        save_json(result, args.output)
+        print(f"结果已写入 {args.output}")
+
+    if args.update_baseline:
+        save_json(result, args.baseline)
+        print(f"基线已更新: {args.baseline}")
+        return 0
+
+    if args.no_compare:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"未找到基线 {args.baseline}，跳过对比（可用 --update-baseline 生成）")
+        return 0
+
+    rows = compare_to_baseline(result, load_json(args.baseline), args.threshold, args.min_delta_ms)
+    print()
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} 项性能回归（阈值 +{args.threshold:.0%}）")
+        return 1
+    print("\n✅ 未发现性能回归")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
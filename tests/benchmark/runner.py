@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试执行与基线对比
+
+- warm：先把语料完整跑一遍预热，再计时（缓存已填充，反映稳态热路径）
+- cold：每次调用前执行用例的 reset 清空进程内缓存，且不预热
+- 每轮得到一个样本（本轮平均每次调用耗时），统计的是各轮样本；计时期间暂停 GC
+- compare_to_baseline：按用例 + 模式比较中位数，超出阈值且绝对差值超过噪声下限时判为回归
+"""
+
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from tests.benchmark.cases import BenchmarkCase, offline_environment
+
+MODES = ("cold", "warm")
+
+DEFAULT_THRESHOLD = 0.3       # 中位数慢于基线 30% 判为回归
+DEFAULT_MIN_DELTA_MS = 0.05   # 差值低于该值视为计时噪声
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # 最近秩法
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples_ms: List[float], calls: int) -> Dict[str, float]:
+    values = sorted(samples_ms)
+    return {
+        "rounds": len(values),
+        "calls": calls,
+        "median_ms": round(statistics.median(values), 4),
+        "p95_ms": round(_percentile(values, 95), 4),
+        "mean_ms": round(statistics.fmean(values), 4),
+        "min_ms": round(values[0], 4),
+        "max_ms": round(values[-1], 4),
+    }
+
+
+def run_case(
+    case: BenchmarkCase,
+    mode: str,
+    rounds: Optional[int] = None,
+    ctx: Optional[Dict[str, Any]] = None,
+) -> Dict[str, float]:
+    """执行单个用例，返回每次调用的耗时统计（毫秒）；ctx 为已准备好的上下文（同一用例多个模式共用）"""
+    if mode not in MODES:
+        raise ValueError(f"mode 必须是 {MODES} 之一: {mode}")
+    rounds = rounds or case.rounds
+    if ctx is None:
+        ctx = case.prepare()
+    if mode == "warm":
+        for i in range(case.size):
+            case.run(ctx, i)
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    for _ in range(rounds):
+        elapsed = 0.0
+        gc.collect()
+        gc.disable()
+        try:
+            for i in range(case.size):
+                if mode == "cold" and case.reset is not None:
+                    case.reset(ctx)
+                start = time.perf_counter()
+                case.run(ctx, i)
+                elapsed += time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+        samples.append(elapsed * 1000 / case.size)
+    return summarize(samples, rounds * case.size)
+
+
+def run_suite(
+    cases: Iterable[BenchmarkCase],
+    modes: Iterable[str] = MODES,
+    scale: float = 1.0,
+    progress=None,
+) -> Dict[str, Any]:
+    """
+    执行一组用例
+
+    Args:
+        cases: 用例列表
+        modes: 要执行的模式（cold / warm，按顺序执行，cold 在前更接近首次请求）
+        scale: 轮数缩放（冒烟时如 0.2），每个用例至少执行 1 轮
+        progress: 可选回调 progress(case_name, mode, stats)
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    with offline_environment():
+        for case in cases:
+            rounds = max(1, int(case.rounds * scale))
+            ctx = case.prepare()
+            for mode in modes:
+                stats = run_case(case, mode, rounds, ctx)
+                results.setdefault(case.name, {})[mode] = stats
+                if progress:
+                    progress(case.name, mode, stats)
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> List[Dict[str, Any]]:
+    """
+    按 (用例, 模式) 对比中位数
+
+    Returns:
+        每项对比结果：case / mode / baseline_ms / current_ms / ratio / status，
+        status 为 regression / improved / ok / new（基线中没有该项）
+    """
+    rows = []
+    baseline_results = baseline.get("results", {})
+    for name, modes in current.get("results", {}).items():
+        for mode, stats in modes.items():
+            base = baseline_results.get(name, {}).get(mode)
+            current_ms = stats["median_ms"]
+            if not base:
+                rows.append({"case": name, "mode": mode, "baseline_ms": None, "current_ms": current_ms,
+                             "ratio": None, "status": "new"})
+                continue
+            base_ms = base["median_ms"]
+            ratio = current_ms / base_ms if base_ms > 0 else float("inf")
+            delta = current_ms - base_ms
+            if ratio > 1 + threshold and delta > min_delta_ms:
+                status = "regression"
+            elif ratio < 1 / (1 + threshold) and -delta > min_delta_ms:
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append({"case": name, "mode": mode, "baseline_ms": base_ms, "current_ms": current_ms,
+                         "ratio": round(ratio, 3), "status": status})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'用例':<26}{'模式':<6}{'基线(ms)':>12}{'本次(ms)':>12}{'倍数':>8}  结果"]
+    for row in rows:
+        base = "-" if row["baseline_ms"] is None else f"{row['baseline_ms']:.3f}"
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+        lines.append(f"{row['case']:<26}{row['mode']:<6}{base:>12}{row['current_ms']:>12.3f}{ratio:>8}  {row['status']}")
+    return "\n".join(lines)
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(data: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+纯 ASGI 中间件单元测试（压缩 / 请求日志 / 异常处理）
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sys
+import zlib
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.middleware.gzip_sse import SSEAwareGZipMiddleware
+from server.middleware.request_logging import RequestLoggingMiddleware
+
+
+def _scope(accept_encoding="gzip"):
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/test",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 12345),
+    }
+
+
+def _json_app(payload, content_type=b"application/json"):
+    body = json.dumps(payload).encode()
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+def _sse_app(events):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream")]})
+        for i, event in enumerate(events):
+            await send({"type": "http.response.body", "body": event, "more_body": i < len(events) - 1})
+    return app
+
+
+def _run(app, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def _headers(message):
+    return {k.decode(): v.decode() for k, v in message["headers"]}
+
+
+class TestCompressionMiddleware:
+    """压缩中间件测试"""
+
+    def test_large_json_is_gzipped(self):
+        payload = {"data": "八字" * 1000}
+        messages = _run(SSEAwareGZipMiddleware(_json_app(payload)), _scope())
+
+        headers = _headers(messages[0])
+        assert headers["content-encoding"] == "gzip"
+        assert headers["vary"] == "Accept-Encoding"
+        assert int(headers["content-length"]) == len(messages[1]["body"])
+        assert json.loads(gzip.decompress(messages[1]["body"])) == payload
+
+    def test_small_body_and_no_accept_encoding_pass_through(self):
+        small = _run(SSEAwareGZipMiddleware(_json_app({"ok": True})), _scope())
+        assert "content-encoding" not in _headers(small[0])
+
+        no_accept = _run(SSEAwareGZipMiddleware(_json_app({"data": "x" * 5000})), _scope(""))
+        assert "content-encoding" not in _headers(no_accept[0])
+
+    def test_sse_passes_through_event_by_event(self):
+        events = [b"data: 1\n\n", b"data: 2\n\n", b"data: 3\n\n"]
+        messages = _run(SSEAwareGZipMiddleware(_sse_app(events)), _scope())
+
+        assert "content-encoding" not in _headers(messages[0])
+        assert [m["body"] for m in messages[1:]] == events
+
+    def test_sse_compression_flushes_each_event(self):
+        events = [b"data: " + b"a" * 200 + b"\n\n", b"data: " + b"b" * 200 + b"\n\n"]
+        messages = _run(SSEAwareGZipMiddleware(_sse_app(events), sse_compression=True), _scope())
+
+        assert _headers(messages[0])["content-encoding"] == "gzip"
+        # 每个事件单独可解压（Z_SYNC_FLUSH），不需要等待流结束
+        decompressor = zlib.decompressobj(31)
+        assert decompressor.decompress(messages[1]["body"]) == events[0]
+        assert decompressor.decompress(messages[2]["body"]) == events[1]
+
+
+class TestRequestLoggingMiddleware:
+    """请求日志中间件测试"""
+
+    def test_adds_process_time_header(self):
+        messages = _run(RequestLoggingMiddleware(_json_app({"ok": True})), _scope())
+        assert float(_headers(messages[0])["x-process-time"]) >= 0
+
+    def test_streaming_body_not_buffered(self):
+        events = [b"data: 1\n\n", b"data: 2\n\n"]
+        messages = _run(RequestLoggingMiddleware(_sse_app(events)), _scope())
+        assert [m["body"] for m in messages[1:]] == events
+
+
+class TestExceptionHandlerMiddleware:
+    """异常处理中间件测试"""
+
+    def test_value_error_becomes_400(self):
+        pytest.importorskip("server.config.env_config")
+        from server.utils.exception_handler import ExceptionHandlerMiddleware
+
+        async def app(scope, receive, send):
+            raise ValueError("参数错误")
+
+        messages = _run(ExceptionHandlerMiddleware(app), _scope())
+        assert messages[0]["status"] == 400
+        assert json.loads(messages[1]["body"])["error_type"] == "validation_error"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
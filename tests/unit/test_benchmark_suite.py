@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进程内基准测试框架单元测试
+
+- 合成规则语料固定可复现，且能被规则引擎索引和匹配
+- cold 模式每次调用前清缓存、warm 模式先预热
+- 基线对比：超阈值判回归、噪声下限、新增用例；回归时命令行退出码为 1
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from tests.benchmark import run_benchmark
+from tests.benchmark.cases import BenchmarkCase, get_case
+from tests.benchmark.corpus import CHARTS, build_rule_corpus
+from tests.benchmark.runner import compare_to_baseline, run_case, summarize
+
+
+def _result(**medians):
+    return {"results": {name: {mode: {"median_ms": ms} for mode, ms in modes.items()}
+                        for name, modes in medians.items()}}
+
+
+class TestCorpus:
+
+    def test_rule_corpus_is_deterministic(self):
+        assert build_rule_corpus(200) == build_rule_corpus(200)
+        assert build_rule_corpus(200, seed=1) != build_rule_corpus(200)
+
+    def test_rules_match_real_chart(self):
+        from core.calculators.BaziCalculator import BaziCalculator
+        from server.engines.rule_engine import EnhancedRuleEngine
+
+        engine = EnhancedRuleEngine(build_rule_corpus(), use_index=True)
+        assert engine._index["by_day_pillar"] and engine._index["by_deity"]
+        bazi_data = BaziCalculator(*CHARTS[0]).calculate()
+        assert engine.match_rules(bazi_data)
+
+
+class TestRunCase:
+
+    def _case(self, calls):
+        return BenchmarkCase(
+            "fake", "fake", size=3, rounds=2,
+            prepare=lambda: {"cache": set()},
+            run=lambda ctx, i: calls.append(("run", i, i in ctx["cache"])) or ctx["cache"].add(i),
+            reset=lambda ctx: calls.append(("reset",)) or ctx["cache"].clear(),
+        )
+
+    def test_cold_resets_before_every_call(self):
+        calls = []
+        stats = run_case(self._case(calls), "cold")
+        assert calls.count(("reset",)) == 6
+        assert not any(hit for _, _, hit in [c for c in calls if c[0] == "run"])
+        assert stats["rounds"] == 2 and stats["calls"] == 6
+
+    def test_warm_runs_corpus_once_before_timing(self):
+        calls = []
+        run_case(self._case(calls), "warm")
+        runs = [c for c in calls if c[0] == "run"]
+        assert len(runs) == 9 and ("reset",) not in calls
+        assert all(hit for _, _, hit in runs[3:])
+
+    def test_summarize(self):
+        stats = summarize([5.0, 1.0, 3.0, 2.0, 4.0], calls=10)
+        assert stats["median_ms"] == 3.0 and stats["p95_ms"] == 5.0
+        assert stats["min_ms"] == 1.0 and stats["max_ms"] == 5.0
+
+    def test_unknown_case(self):
+        with pytest.raises(KeyError):
+            get_case("nope")
+
+
+class TestCompare:
+
+    def test_statuses(self):
+        baseline = _result(a={"warm": 10.0, "cold": 10.0}, b={"warm": 0.02})
+        current = _result(a={"warm": 14.0, "cold": 6.0}, b={"warm": 0.05}, c={"warm": 1.0})
+        rows = {(r["case"], r["mode"]): r for r in compare_to_baseline(current, baseline, threshold=0.3)}
+        assert rows[("a", "warm")]["status"] == "regression"
+        assert rows[("a", "warm")]["ratio"] == 1.4
+        assert rows[("a", "cold")]["status"] == "improved"
+        # 2.5 倍但只差 0.03ms：视为噪声
+        assert rows[("b", "warm")]["status"] == "ok"
+        assert rows[("c", "warm")]["status"] == "new"
+
+    @pytest.fixture
+    def restore_logging(self):
+        yield
+        logging.disable(logging.NOTSET)
+
+    def test_cli_exit_code(self, tmp_path, monkeypatch, restore_logging):
+        baseline_path = str(tmp_path / "baseline.json")
+        monkeypatch.setattr(run_benchmark, "run_suite",
+                            lambda cases, modes, scale, progress: _result(a={"warm": 10.0}))
+        assert run_benchmark.main(["--baseline", baseline_path]) == 0          # 无基线
+        assert run_benchmark.main(["--baseline", baseline_path, "--update-baseline"]) == 0
+
+        monkeypatch.setattr(run_benchmark, "run_suite",
+                            lambda cases, modes, scale, progress: _result(a={"warm": 20.0}))
+        assert run_benchmark.main(["--baseline", baseline_path]) == 1
+        assert run_benchmark.main(["--baseline", baseline_path, "--threshold", "1.5"]) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按命名空间缓存策略单元测试
+
+- 环境变量 CACHE_POLICIES 覆盖策略
+- L2 编解码（纯 JSON 兼容旧格式 / 压缩 / 拒绝 pickle 载荷）
+- 写入使用命名空间自己的 TTL，不修改共享 MultiLevelCache
+- @cached 装饰器（同步 / async / 条件写入 / 失效 / 提前刷新）
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils import cache_policy
+from server.utils.cache_policy import (
+    CachePolicy, PolicyCache, _decode, _encode, cached,
+    get_policy, register_policy, reload_policies,
+)
+
+
+class _FakeRedis:
+    """模拟 Redis 客户端（get/setex/set/delete）"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def set(self, key, value):
+        self.setex(key, None, value)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.delenv("CACHE_POLICIES", raising=False)
+    reload_policies()
+    yield
+    monkeypatch.delenv("CACHE_POLICIES", raising=False)
+    reload_policies()
+
+
+def _install(policy, redis=None):
+    """注册策略并直接放入缓存实例（不依赖真实 Redis）"""
+    policy = register_policy(policy)
+    cache = PolicyCache(policy, redis_client=redis)
+    cache_policy._caches[policy.namespace] = cache
+    return cache
+
+
+class TestPolicyRegistry:
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("CACHE_POLICIES", json.dumps({
+            "natal": {"l2_ttl": 60, "unknown_field": 1},
+            "daily_fortune": {"codec": "yaml"},
+        }))
+        reload_policies()
+        assert get_policy("natal").l2_ttl == 60
+        assert get_policy("natal").l1_ttl == 1800
+        assert get_policy("daily_fortune").codec == "json"
+
+    def test_undeclared_namespace_uses_defaults(self, monkeypatch):
+        monkeypatch.setenv("CACHE_POLICIES", '{"adhoc": {"l1_ttl": 5}}')
+        reload_policies()
+        policy = get_policy("adhoc")
+        assert policy.l1_ttl == 5
+        assert policy.l2_ttl == CachePolicy("x").l2_ttl
+
+    def test_invalid_env_ignored(self, monkeypatch):
+        monkeypatch.setenv("CACHE_POLICIES", "not json")
+        reload_policies()
+        assert get_policy("natal").l2_ttl == 365 * cache_policy.DAY
+
+
+class TestCodec:
+
+    def test_plain_json_compatible(self):
+        data = _encode({"a": "甲"}, CachePolicy("t"))
+        assert json.loads(data) == {"a": "甲"}
+        assert _decode(data.decode("utf-8"), CachePolicy("t")) == {"a": "甲"}
+
+    def test_compressed_roundtrip(self):
+        value = {"rows": ["子丑寅卯"] * 500}
+        data = _encode(value, CachePolicy("t", compress_min_bytes=1024))
+        assert data[:2] == b"\x00J"
+        assert len(data) < len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        assert _decode(data, CachePolicy("t")) == value
+
+    def test_rejects_pickle_payload(self):
+        import pickle
+
+        payload = pickle.dumps({"a": 1})
+        for data in (b"\x00p" + payload, b"\x00P" + zlib.compress(payload)):
+            with pytest.raises(ValueError):
+                _decode(data, CachePolicy("t"))
+
+    def test_pickle_codec_override_ignored(self):
+        assert CachePolicy("t").with_overrides({"codec": "pickle"}).codec == "json"
+        assert get_policy("bazi_data_models").codec == "json"
+
+    def test_pickle_payload_is_l2_miss(self):
+        import pickle
+
+        redis = _FakeRedis()
+        redis.data["t:k"] = b"\x00p" + pickle.dumps({"a": 1})
+        assert PolicyCache(CachePolicy("t"), redis_client=redis).get("t:k") is None
+
+    def test_models_roundtrip_as_json(self):
+        from server.models.dayun import DayunModel
+        from server.orchestrators.bazi_data_service import _dump_models
+
+        models = [DayunModel(step=0, stem="甲", branch="子", ganzhi="甲子", details={"age": 5})]
+        cached_value = _decode(_encode(_dump_models(models), get_policy("bazi_data_models")),
+                               get_policy("bazi_data_models"))
+        assert [DayunModel.model_validate(item) for item in cached_value] == models
+
+
+class TestPolicyCache:
+
+    def test_uses_namespace_ttl(self):
+        from server.utils.cache_multi_level import get_multi_cache
+
+        shared_ttl = get_multi_cache().l2.ttl
+        redis = _FakeRedis()
+        cache = PolicyCache(CachePolicy("t", l2_ttl=1000), redis_client=redis)
+        cache.set("t:k", {"v": 1})
+        assert 1000 <= next(iter(redis.ttls.values())) <= 1100
+        assert get_multi_cache().l2.ttl == shared_ttl
+
+    def test_l2_hit_backfills_l1(self):
+        redis = _FakeRedis()
+        writer = PolicyCache(CachePolicy("t"), redis_client=redis)
+        reader = PolicyCache(CachePolicy("t"), redis_client=redis)
+        writer.set("t:k", [1, 2])
+        redis.data.clear()
+        assert reader.get("t:k") is None
+        writer.set("t:k", [1, 2])
+        assert reader.get("t:k") == [1, 2]
+        redis.data.clear()
+        assert reader.get("t:k") == [1, 2]
+
+    def test_l1_max_entries(self):
+        cache = PolicyCache(CachePolicy("t", l1_max_entries=2, l2_enabled=False))
+        for i in range(3):
+            cache.set(f"t:{i}", i)
+        assert cache.get("t:0") is None
+        assert cache.get("t:2") == 2
+
+    def test_l2_disabled_ignores_client(self):
+        redis = _FakeRedis()
+        cache = PolicyCache(CachePolicy("t", l2_enabled=False), redis_client=redis)
+        cache.set("t:k", 1)
+        assert redis.data == {}
+        assert cache.get("t:k") == 1
+
+    def test_multi_cache_clear_clears_policy_l1(self):
+        from server.utils.cache_multi_level import get_multi_cache
+
+        cache = _install(CachePolicy("t_clear", l2_enabled=False))
+        cache.set("t_clear:k", 1)
+        get_multi_cache().clear()
+        assert cache.get("t_clear:k") is None
+
+
+class TestCachedDecorator:
+
+    def test_sync(self):
+        _install(CachePolicy("t_sync", l2_enabled=False))
+        calls = []
+
+        @cached(namespace="t_sync", key=lambda x, **_: str(x))
+        def load(x, extra=None):
+            calls.append(x)
+            return {"x": x}
+
+        assert load(1, extra="a") == {"x": 1}
+        assert load(1, extra="b") == {"x": 1}
+        assert calls == [1]
+        assert load.cache_key(1) == "t_sync:1"
+        load.invalidate(1)
+        load(1)
+        assert calls == [1, 1]
+
+    def test_condition_skips_store(self):
+        _install(CachePolicy("t_cond", l2_enabled=False))
+        calls = []
+
+        @cached(namespace="t_cond", condition=bool)
+        def load(x):
+            calls.append(x)
+            return {}
+
+        load(1)
+        load(1)
+        assert calls == [1, 1]
+
+    def test_async(self):
+        _install(CachePolicy("t_async", l2_enabled=False))
+        calls = []
+
+        @cached(namespace="t_async")
+        async def load(x):
+            calls.append(x)
+            return x * 2
+
+        async def run():
+            return [await load(2), await load(2), await load(3)]
+
+        assert asyncio.run(run()) == [4, 4, 6]
+        assert calls == [2, 3]
+
+    def test_refresh_ahead(self):
+        cache = _install(CachePolicy("t_refresh", l1_ttl=100, l2_enabled=False, refresh_ahead=0.5))
+        calls = []
+
+        @cached(namespace="t_refresh")
+        def load():
+            calls.append(1)
+            return len(calls)
+
+        assert load() == 1
+        # 剩余 TTL 仍充足，不刷新
+        assert load() == 1
+        assert calls == [1]
+
+        with patch.object(cache, "ttl_remaining", return_value=10):
+            assert load() == 1  # 先返回旧值，后台刷新
+        deadline = time.time() + 2
+        while cache.get(load.cache_key()) != 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert calls == [1, 1]
+        assert load() == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+盘面身份缓存键单元测试
+
+- 同一时辰内不同出生时间的盘面身份一致，跨时辰不同
+- 规则条件读取字段的分类（含 all / any / not 嵌套，未登记条件按出生时刻处理）
+- RuleService 按盘面身份缓存只依赖四柱的规则，其余规则按实际读取字段单独缓存
+"""
+
+import os
+import re
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.engines import rule_condition
+from server.engines.rule_condition import (
+    BIRTH_MOMENT_FIELDS, CHART_CONDITIONS, CONDITION_EXTRA_FIELDS, condition_fields,
+)
+from server.engines.rule_engine import SCOPE_CHART, SCOPE_MOMENT, EnhancedRuleEngine
+from server.utils.cache_multi_level import MultiLevelCache
+from server.utils.chart_identity import chart_identity, pillars_signature
+
+
+def _chart(solar_time, solar_date="1990-05-15"):
+    from core.calculators.bazi_core_calculator import BaziCoreCalculator
+    return BaziCoreCalculator(solar_date, solar_time, "male").calculate()
+
+
+def _bazi_data(lunar_month=4, solar_time="14:30"):
+    return {
+        "basic_info": {"solar_date": "1990-05-15", "solar_time": solar_time, "gender": "male",
+                       "lunar_date": {"month": lunar_month, "day": 21}},
+        "bazi_pillars": {
+            "year": {"stem": "庚", "branch": "午"},
+            "month": {"stem": "辛", "branch": "巳"},
+            "day": {"stem": "庚", "branch": "辰"},
+            "hour": {"stem": "癸", "branch": "未"},
+        },
+        "details": {},
+    }
+
+
+class TestChartIdentity:
+
+    def test_pillars_signature(self):
+        assert pillars_signature(_bazi_data()["bazi_pillars"]) == "庚午辛巳庚辰癸未"
+        incomplete = dict(_bazi_data()["bazi_pillars"], hour={"stem": "", "branch": ""})
+        assert pillars_signature(incomplete) is None
+        assert chart_identity({"bazi_pillars": incomplete}) is None
+
+    def test_same_shichen_shares_identity(self):
+        early, late, next_shichen = _chart("13:05"), _chart("14:55"), _chart("15:05")
+        assert early["basic_info"] != late["basic_info"]
+        assert chart_identity(early) == chart_identity(late)
+        assert chart_identity(early).startswith("庚午辛巳庚辰癸未:male:")
+        assert chart_identity(early) != chart_identity(next_shichen)
+
+    def test_fields_and_gender(self):
+        data = _bazi_data()
+        assert chart_identity(data, fields=()) == "庚午辛巳庚辰癸未:male"
+        assert chart_identity(data, fields=(), gender="female") == "庚午辛巳庚辰癸未:female"
+        lunar = ("basic_info.lunar_date.month",)
+        assert chart_identity(data, lunar) == chart_identity(_bazi_data(solar_time="13:10"), lunar)
+        assert chart_identity(data, lunar) != chart_identity(_bazi_data(lunar_month=5), lunar)
+
+
+class TestConditionFields:
+
+    def test_classification(self):
+        assert condition_fields({"day_pillar": "庚辰"}) == frozenset()
+        assert condition_fields({"all": [{"gender": "male"}, {"not": {"nayin_equals": "x"}}]}) == frozenset()
+        assert condition_fields({"any": [{"rizhu": "庚辰"}, {"lunar_month_in": {"values": [4]}}]}) == \
+            frozenset({"basic_info.lunar_date.month"})
+        assert condition_fields({"liunian_branch_in": ["子"]}) == frozenset({"fortune"})
+        assert condition_fields({"unknown_condition": 1}) == frozenset(BIRTH_MOMENT_FIELDS)
+
+    def test_every_condition_classified(self):
+        """EnhancedRuleCondition.match 中处理的每个条件都必须登记读取字段"""
+        with open(rule_condition.__file__, encoding="utf-8") as f:
+            source = f.read()
+        body = source[source.index("    def match(condition"):source.index("    def _match_ten_gods_stats")]
+        keys = set()
+        for match in re.finditer(r'key (?:==|in) (\([^)]*\)|\[[^\]]*\]|"[^"]*")(?: or key == "([^"]*)")?', body):
+            keys.update(re.findall(r'"([^"]*)"', match.group(1)))
+            if match.group(2):
+                keys.add(match.group(2))
+        keys -= {"all", "any", "not"}
+        assert not keys - CHART_CONDITIONS - set(CONDITION_EXTRA_FIELDS)
+        assert not CHART_CONDITIONS & set(CONDITION_EXTRA_FIELDS)
+
+
+class TestRuleServiceChartCache:
+
+    RULES = [
+        {"rule_id": "R_DAY", "rule_type": "wealth", "priority": 50, "content": {"type": "text", "text": "a"},
+         "conditions": {"day_pillar": "庚辰"}},
+        {"rule_id": "R_LUNAR", "rule_type": "wealth", "priority": 80, "content": {"type": "text", "text": "b"},
+         "conditions": {"lunar_month_in": {"values": [4]}}},
+        {"rule_id": "R_OTHER", "rule_type": "health", "priority": 10, "content": {"type": "text", "text": "c"},
+         "conditions": {"gender": "male"}},
+    ]
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        from server.services.rule_service import RuleService
+        engine = EnhancedRuleEngine([dict(r) for r in self.RULES])
+        calls = []
+        original = engine.match_rules
+
+        def _match_rules(bazi_data, rule_types=None, scope=None):
+            calls.append(scope)
+            return original(bazi_data, rule_types, scope)
+
+        monkeypatch.setattr(engine, "match_rules", _match_rules)
+        monkeypatch.setattr(RuleService, "_engine", engine)
+        monkeypatch.setattr(RuleService, "_cache", MultiLevelCache())
+        return RuleService, calls
+
+    def test_scopes(self):
+        engine = EnhancedRuleEngine([dict(r) for r in self.RULES])
+        ids = lambda rules: [r["rule_id"] for r in rules]
+        assert ids(engine.match_rules(_bazi_data(), ["wealth"], scope=SCOPE_CHART)) == ["R_DAY"]
+        assert ids(engine.match_rules(_bazi_data(), ["wealth"], scope=SCOPE_MOMENT)) == ["R_LUNAR"]
+        assert engine.moment_fields(["wealth"]) == frozenset({"basic_info.lunar_date.month"})
+        assert engine.moment_fields(["health"]) == frozenset()
+
+    def test_pillar_rules_shared_across_birth_times(self, service):
+        rule_service, calls = service
+        first = rule_service.match_rules(_bazi_data(solar_time="14:30"), ["wealth"])
+        assert [r["rule_id"] for r in first] == ["R_LUNAR", "R_DAY"]
+        assert calls == [SCOPE_CHART, SCOPE_MOMENT]
+
+        # 同一时辰、同一农历月：全部命中缓存
+        calls.clear()
+        assert rule_service.match_rules(_bazi_data(solar_time="13:10"), ["wealth"]) == first
+        assert calls == []
+
+        # 农历月不同：只重新匹配依赖农历的规则
+        second = rule_service.match_rules(_bazi_data(lunar_month=5), ["wealth"])
+        assert [r["rule_id"] for r in second] == ["R_DAY"]
+        assert calls == [SCOPE_MOMENT]
+
+    def test_pillar_only_rule_types(self, service):
+        rule_service, calls = service
+        rule_service.match_rules(_bazi_data(), ["health"])
+        rule_service.match_rules(_bazi_data(solar_time="13:10", lunar_month=5), ["health"])
+        assert calls == [SCOPE_CHART]
+
+    def test_incomplete_pillars_fall_back(self, service):
+        rule_service, calls = service
+        data = _bazi_data()
+        data["bazi_pillars"]["hour"] = {}
+        rule_service.match_rules(data, ["wealth"])
+        assert calls == [None]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+确定性响应 ETag / 条件请求单元测试
+"""
+
+import asyncio
+import os
+import sys
+from typing import Optional
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from pydantic import BaseModel
+
+from server.utils import conditional_response
+from server.utils.conditional_response import (
+    compute_etag,
+    etag_matches,
+    register_conditional_endpoint,
+    resolve_conditional,
+)
+
+
+class ChartRequest(BaseModel):
+    solar_date: str
+    solar_time: str
+    gender: str
+    calendar_type: Optional[str] = "solar"
+    current_time: Optional[str] = None
+
+
+register_conditional_endpoint("/test/chart", ChartRequest)
+register_conditional_endpoint("/test/chart-today", ChartRequest, time_dependent_fields=("current_time",))
+
+BIRTH = {"solar_date": "1990-05-15", "solar_time": "14:30", "gender": "male"}
+
+
+@pytest.fixture(autouse=True)
+def fixed_version(monkeypatch):
+    monkeypatch.setattr(conditional_response, "get_content_version", lambda: "test|v1|0|0")
+
+
+class TestEtag:
+    """ETag 计算与匹配"""
+
+    def test_same_input_same_etag(self):
+        reordered = {"gender": "male", "solar_time": "14:30 ", "solar_date": "1990-05-15", "location": None}
+        assert compute_etag("/test/chart", BIRTH) == compute_etag("/test/chart", reordered)
+        assert compute_etag("/test/chart", BIRTH).startswith('"')
+
+    def test_input_path_and_version_change_etag(self):
+        etag = compute_etag("/test/chart", BIRTH)
+        assert etag != compute_etag("/test/chart", {**BIRTH, "gender": "female"})
+        assert etag != compute_etag("/test/other", BIRTH)
+        assert etag != compute_etag("/test/chart", BIRTH, version="test|v2|0|0")
+
+    def test_if_none_match_parsing(self):
+        etag = '"abc"'
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('W/"abc"', etag)
+        assert etag_matches('"x", "abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"x"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestResolveConditional:
+    """登记接口的条件响应状态"""
+
+    def test_unregistered_or_invalid_returns_none(self):
+        assert resolve_conditional("/test/unknown", BIRTH) is None
+        assert resolve_conditional("/test/chart", {"solar_date": "1990-05-15"}) is None
+
+    def test_defaults_and_internal_fields_ignored(self):
+        plain = resolve_conditional("/test/chart", BIRTH)
+        explicit = resolve_conditional("/test/chart", {**BIRTH, "calendar_type": "solar", "_request_id": "r1"})
+        assert plain.etag == explicit.etag
+        assert not plain.not_modified
+
+    def test_not_modified_when_etag_matches(self):
+        etag = resolve_conditional("/test/chart", BIRTH).etag
+        conditional = resolve_conditional("/test/chart", BIRTH, if_none_match=etag)
+        assert conditional.not_modified
+
+        response = conditional.not_modified_response({"Access-Control-Allow-Origin": "*"})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.headers["access-control-allow-origin"] == "*"
+
+    def test_post_match_is_precondition_failed(self):
+        etag = resolve_conditional("/test/chart", BIRTH).etag
+        conditional = resolve_conditional("/test/chart", BIRTH, if_none_match=etag, method="POST")
+        assert conditional.not_modified
+        response = conditional.not_modified_response()
+        assert response.status_code == 412
+        assert response.headers["cache-control"] == "no-cache"
+
+        wrapped = conditional.wrap({"success": True, "data": {}})
+        assert wrapped.headers["etag"] == etag
+        assert not wrapped.headers["cache-control"].startswith("public")
+
+    def test_time_dependent_response_expires_at_midnight(self):
+        today = resolve_conditional("/test/chart-today", BIRTH)
+        fixed = resolve_conditional("/test/chart-today", {**BIRTH, "current_time": "2024-01-01 12:00"})
+        assert today.etag != fixed.etag
+        assert today.max_age <= 86400
+        assert today.max_age <= fixed.max_age
+
+    def test_wrap_only_successful_results(self):
+        conditional = resolve_conditional("/test/chart", BIRTH)
+        failed = {"success": False, "error": "计算失败"}
+        assert conditional.wrap(failed) is failed
+
+        response = conditional.wrap({"success": True, "data": {"八字": "庚午"}})
+        assert response.headers["etag"] == conditional.etag
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        assert "pragma" not in response.headers
+        assert "庚午".encode("utf-8") in response.body
+
+
+class TestRouteIntegration:
+    """FastAPI 路由：条件请求命中时不执行计算"""
+
+    @staticmethod
+    def _app(calls):
+        from fastapi import Depends, FastAPI, Request
+
+        from server.middleware.utf8_json import UTF8JSONResponse
+        from server.utils.conditional_response import get_conditional_response, query_request_model
+
+        app = FastAPI(default_response_class=UTF8JSONResponse)
+
+        @app.post("/test/chart")
+        async def chart(request: ChartRequest, http_request: Request = None):
+            conditional = get_conditional_response(http_request, "/test/chart", request)
+            if conditional and conditional.not_modified:
+                return conditional.not_modified_response()
+            calls.append(request.solar_date)
+            result = {"success": True, "data": {"day": "庚午"}}
+            return conditional.wrap(result) if conditional else result
+
+        @app.get("/test/chart")
+        async def chart_by_query(
+            http_request: Request,
+            request: ChartRequest = Depends(query_request_model(ChartRequest)),
+        ):
+            return await chart(request, http_request)
+
+        return app
+
+    def test_get_answers_304_before_computing(self):
+        httpx = pytest.importorskip("httpx")
+        calls = []
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=self._app(calls))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.get("/test/chart", params=BIRTH)
+                second = await client.get("/test/chart", params=BIRTH, headers={"If-None-Match": first.headers["etag"]})
+                invalid = await client.get("/test/chart", params={"solar_date": "1990-05-15"})
+                return first, second, invalid
+
+        first, second, invalid = asyncio.run(scenario())
+        assert first.status_code == 200
+        assert first.json()["data"]["day"] == "庚午"
+        assert first.headers["cache-control"].startswith("public, max-age=")
+        assert second.status_code == 304
+        assert invalid.status_code == 422
+        assert calls == ["1990-05-15"]
+
+    def test_post_answers_412_and_is_not_public(self):
+        httpx = pytest.importorskip("httpx")
+        calls = []
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=self._app(calls))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.post("/test/chart", json=BIRTH)
+                second = await client.post("/test/chart", json=BIRTH, headers={"If-None-Match": first.headers["etag"]})
+                via_get = await client.get("/test/chart", params=BIRTH, headers={"If-None-Match": first.headers["etag"]})
+                return first, second, via_get
+
+        first, second, via_get = asyncio.run(scenario())
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "no-cache"
+        assert second.status_code == 412
+        assert via_get.status_code == 304
+        assert calls == ["1990-05-15"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+办公桌风水 YOLO 批量检测工作线程单元测试
+"""
+
+import os
+import sys
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from services.desk_fengshui.detection_worker import (
+    BatchedDetectionWorker,
+    decode_reduced,
+    letterbox,
+    prepare_image,
+)
+
+
+def _jpeg_bytes(width: int, height: int) -> bytes:
+    img = np.full((height, width, 3), 200, dtype=np.uint8)
+    ok, encoded = cv2.imencode('.jpg', img)
+    assert ok
+    return encoded.tobytes()
+
+
+class TestPreprocess:
+    """解码与 letterbox 测试"""
+
+    def test_large_image_decoded_reduced(self):
+        img, orig_shape = decode_reduced(_jpeg_bytes(2000, 1500), min_side=640)
+        # 2000/2 = 1000 >= 640，2000/4 = 500 < 640 → 缩小 2 倍解码
+        assert img.shape[:2] == (750, 1000)
+        assert orig_shape == (1500, 2000, 3)
+
+    def test_small_image_decoded_full(self):
+        img, orig_shape = decode_reduced(_jpeg_bytes(600, 400), min_side=640)
+        assert img.shape[:2] == (400, 600)
+        assert orig_shape == (400, 600, 3)
+
+    def test_invalid_bytes(self):
+        assert prepare_image(b"not an image") is None
+
+    def test_letterbox_shape(self):
+        img = np.zeros((300, 600, 3), dtype=np.uint8)
+        boxed, scale, pad = letterbox(img, 640)
+        assert boxed.shape == (640, 640, 3)
+        assert scale == pytest.approx(640 / 600)
+        assert pad == (0, 160)
+
+    def test_bbox_maps_back_to_original(self):
+        prepared = prepare_image(_jpeg_bytes(2000, 1500), size=640)
+        assert prepared.tensor.shape == (640, 640, 3)
+        assert prepared.orig_shape == (1500, 2000, 3)
+        # 原图 [400, 300, 1200, 900] 在 letterbox 坐标系中的位置
+        s = 640 / 2000
+        pad_x, pad_y = prepared.pad
+        boxed = [400 * s + pad_x, 300 * s + pad_y, 1200 * s + pad_x, 900 * s + pad_y]
+        mapped = prepared.to_original(boxed)
+        assert mapped == pytest.approx([400, 300, 1200, 900], abs=1.0)
+        assert set(prepared.timings) == {"decode_ms", "preprocess_ms"}
+
+
+class TestBatchedDetectionWorker:
+    """批量推理测试"""
+
+    def test_concurrent_requests_are_batched(self):
+        batch_sizes = []
+        release = threading.Event()
+
+        def infer_fn(batch):
+            release.wait(timeout=5)
+            batch_sizes.append(len(batch))
+            return [int(t[0, 0, 0]) for t in batch]
+
+        worker = BatchedDetectionWorker(infer_fn, max_batch=8, window_ms=200)
+        results = {}
+
+        def submit(i):
+            tensor = np.full((4, 4, 3), i, dtype=np.uint8)
+            results[i] = worker.infer(tensor, timeout=10)
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join()
+
+        # 每个请求拿到自己的结果
+        assert {i: r[0] for i, r in results.items()} == {0: 0, 1: 1, 2: 2, 3: 3}
+        assert sum(batch_sizes) == 4
+        assert len(batch_sizes) < 4
+        assert all("infer_ms" in info and "queue_ms" in info for _, info in results.values())
+
+    def test_inference_error_propagates(self):
+        def infer_fn(batch):
+            raise RuntimeError("model crashed")
+
+        worker = BatchedDetectionWorker(infer_fn, window_ms=0)
+        with pytest.raises(RuntimeError, match="model crashed"):
+            worker.infer(np.zeros((4, 4, 3), dtype=np.uint8), timeout=5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+办公桌风水规则索引单元测试
+"""
+
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from services.desk_fengshui.rule_engine import DeskFengshuiEngine
+
+
+def _make_engine():
+    """不连接数据库/Redis 的引擎实例"""
+    engine = DeskFengshuiEngine.__new__(DeskFengshuiEngine)
+    engine.db_config = {}
+    engine.rules_cache = None
+    engine._rule_index = None
+    engine.redis_client = None
+    return engine
+
+
+def _item(name, label, relative):
+    return {'name': name, 'label': label, 'position': {'relative': relative, 'relative_name': relative}}
+
+
+# 模拟数据库加载结果：ideal_position 为 JSON 字符串、文本为 latin1 乱码
+DB_RULES = [
+    {
+        'rule_code': 'TABOO_KNIFE', 'rule_type': 'taboo', 'item_name': 'knife',
+        'item_label': '刀具', 'ideal_position': '{"direction": "avoid_all"}',
+        'reason': '刀具带煞气', 'suggestion': '建议收入抽屉', 'priority': 95,
+        'related_element': None,
+    },
+    {
+        'rule_code': 'POS_CUP', 'rule_type': 'wealth', 'item_name': 'cup',
+        'item_label': '水杯', 'ideal_position': '{"directions": ["right", "front_right"]}',
+        'reason': '水主财'.encode('utf-8').decode('latin1'),
+        'suggestion': '', 'priority': 80, 'related_element': '水',
+    },
+    {
+        'rule_code': 'BAD_POS', 'rule_type': 'position', 'item_name': 'lamp',
+        'item_label': '台灯', 'ideal_position': '["left"]',
+        'reason': '无效配置', 'suggestion': '', 'priority': 50, 'related_element': None,
+    },
+]
+
+
+class TestRuleIndex:
+    """规则索引构建测试"""
+
+    def test_index_groups_by_item_and_type(self):
+        engine = _make_engine()
+        index = engine._build_rule_index(engine._get_builtin_rules())
+
+        kettle = index.by_item['kettle']
+        assert set(kettle) == {'position', 'taboo'}
+        assert kettle['position'][0].direction_set == frozenset({'left', 'front_left', 'back_left'})
+        # 位置类规则不进入增加建议候选
+        assert all(r.item_name not in ('left_items', 'desk') for r in index.addition_rules)
+
+    def test_index_parses_and_decodes_db_rules(self):
+        engine = _make_engine()
+        index = engine._build_rule_index(DB_RULES)
+
+        cup = index.by_item['cup']['wealth'][0]
+        assert cup.directions == ('right', 'front_right')
+        assert cup.reason == '水主财'
+        # suggestion 为空时增加建议回退到 reason，并补表情前缀
+        assert cup.addition_suggestion == '💰 水主财'
+        assert index.removal_by_item['knife'].is_avoid
+        # ideal_position 不是字典的规则不参与基础匹配
+        assert 'lamp' not in index.basic_by_item
+
+    def test_index_is_immutable(self):
+        engine = _make_engine()
+        index = engine._build_rule_index(DB_RULES)
+        with pytest.raises(TypeError):
+            index.by_item['cup'] = {}
+        with pytest.raises(Exception):
+            index.addition_rules[0].reason = 'x'
+
+    def test_index_rebuilt_when_cache_refreshes(self):
+        engine = _make_engine()
+        rules = engine._get_builtin_rules()
+        engine._save_rules_to_cache(rules)
+        first = engine._rule_index
+        assert first.source is rules
+        assert engine._get_rule_index(engine.load_rules()) is first
+
+        refreshed = DB_RULES[:]
+        engine._save_rules_to_cache(refreshed)
+        assert engine._rule_index is not first
+        assert engine._get_rule_index(refreshed).source is refreshed
+
+
+class TestIndexedMatching:
+    """基于索引的规则匹配测试"""
+
+    def test_basic_rules_move_misplaced_items(self):
+        engine = _make_engine()
+        rules = engine._get_builtin_rules()
+        items = [_item('kettle', '烧水壶', 'right'), _item('cup', '水杯', 'right'), _item('mouse', '鼠标', 'left')]
+
+        adjustments = engine._match_basic_rules(items, rules)
+
+        assert [a['item'] for a in adjustments] == ['烧水壶', '鼠标']
+        assert adjustments[0]['ideal_position'] == '左侧（青龙位）'
+        assert adjustments[0]['priority'] == 'high'
+        assert adjustments[1]['priority'] == 'medium'
+
+    def test_taboo_rules_only_match_avoid_direction(self):
+        engine = _make_engine()
+        items = [_item('knife', '刀', 'front'), _item('cup', '水杯', 'left')]
+
+        removals = engine._match_taboo_rules(items, DB_RULES)
+
+        assert len(removals) == 1
+        assert removals[0]['item'] == '刀'
+        assert removals[0]['suggestion'] == '建议收入抽屉'
+
+    def test_additions_prioritize_xishen_and_skip_present_items(self):
+        engine = _make_engine()
+        rules = engine._get_builtin_rules()
+        items = [_item('cup', '水杯', 'right')]
+
+        additions = engine._generate_additions(items, {'xishen': '水'}, rules)
+
+        assert additions[0]['is_xishen']
+        assert additions[0]['item'] == 'water_item'
+        assert additions[0]['suggestion'].startswith('🌟【喜神专属】')
+        assert 'cup' not in [a['item'] for a in additions]
+
+    def test_builtin_rules_fallback_matches_without_cache(self):
+        engine = _make_engine()
+        rules = engine._get_builtin_rules()
+        result = engine._match_basic_rules([_item('kettle', '烧水壶', 'right')], rules)
+        assert len(result) == 1
+        # 未经缓存的规则列表不覆盖已发布的索引
+        assert engine._rule_index is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
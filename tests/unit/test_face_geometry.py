@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+面相几何计算单元测试
+
+- 关键点 (N, 3) 数组与字典列表互转
+- 三停 / 五眼：数组与旧字典列表输入结果一致
+- 特征点映射：single / average / interpolate / offset 及缺失关键点的处理
+- 服务只在响应边界生成关键点字典
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils.cache_multi_level import MultiLevelCache
+from services.face_analysis_v2 import service as face_service
+from services.face_analysis_v2.models.feature_mapper import FeatureMapper
+from services.face_analysis_v2.models.landmark_detector_fallback import LandmarkDetectorFallback
+from services.face_analysis_v2.utils.geometry import (
+    GeometryCalculator, compute_face_bounds, landmarks_to_array, landmarks_to_dicts,
+)
+from shared.utils.image_result_cache import ImageResultCache
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(7)
+    return np.clip(np.array([0.5, 0.4, 0.0]) + rng.normal(0, 0.15, (468, 3)), 0, 1).astype(np.float32)
+
+
+class TestLandmarkArray:
+
+    def test_round_trip(self, points):
+        landmarks = landmarks_to_dicts(points, {'width': 640, 'height': 480})
+        assert len(landmarks) == 468
+        assert landmarks[10]['index'] == 10
+        assert landmarks[10]['x_px'] == int(float(points[10, 0]) * 640)
+        assert landmarks[10]['visibility'] == 1.0
+        assert np.array_equal(landmarks_to_array(landmarks), points)
+        assert landmarks_to_array(points) is points
+
+    def test_missing_indices(self):
+        array = landmarks_to_array([{'index': 2, 'x': 0.5, 'y': 0.25, 'z': 0.0}])
+        assert array.shape == (3, 3) and array.dtype == np.float32
+        assert array[0].tolist() == [0, 0, 0] and array[2].tolist() == [0.5, 0.25, 0.0]
+
+    def test_face_bounds(self, points):
+        bounds = compute_face_bounds(points)
+        assert bounds['left'] == float(points[:, 0].min())
+        assert bounds['height'] == pytest.approx(float(points[:, 1].max() - points[:, 1].min()))
+
+
+class TestGeometry:
+
+    def test_array_and_dicts_agree(self, points):
+        landmarks = landmarks_to_dicts(points, {'width': 640, 'height': 480})
+        bounds = compute_face_bounds(points)
+        assert GeometryCalculator.calculate_santing(points, bounds) == \
+            GeometryCalculator.calculate_santing(landmarks, bounds)
+        assert GeometryCalculator.calculate_wuyan(points) == GeometryCalculator.calculate_wuyan(landmarks)
+
+    def test_wuyan_segments(self):
+        points = np.zeros((468, 3), dtype=np.float32)
+        for index, x in zip([234, 33, 133, 362, 263, 454], [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]):
+            points[index, 0] = x
+        wuyan = GeometryCalculator.calculate_wuyan(points)
+        assert wuyan['eye_widths'] == pytest.approx([0.2] * 5, abs=1e-6)
+        assert wuyan['evaluation'] == "五眼匀称，面部协调，美观大方"
+        with pytest.raises(ZeroDivisionError):
+            GeometryCalculator.calculate_wuyan(np.zeros((468, 3), dtype=np.float32))
+
+    def test_distance_and_angle(self):
+        origin, a, b = {'x': 0, 'y': 0}, {'x': 1, 'y': 0}, {'x': 0, 'y': 2}
+        assert GeometryCalculator.calculate_distance(origin, b) == 2
+        assert GeometryCalculator.calculate_angle(a, origin, b) == pytest.approx(90)
+
+
+class TestFeatureMapper:
+
+    def test_methods(self, points):
+        features = {f['feature_id']: f for f in FeatureMapper().map_features(points, {})}
+        assert (features[1]['x'], features[1]['y']) == (float(points[10, 0]), float(points[10, 1]))
+        expected = points[151].astype(np.float64) + (points[9] - points[151].astype(np.float64)) * 0.3
+        assert [features[5][k] for k in 'xyz'] == pytest.approx(expected.tolist())
+        assert features[3]['x'] == pytest.approx(float(points[151, 0]) - 0.05)
+        assert features[3]['z'] == float(points[151, 2])
+        assert features[16]['method'] == 'average' and features[16]['y'] == float(points[9, 1])
+
+    def test_missing_landmarks_skipped(self, points):
+        features = FeatureMapper().map_features(points, {})
+        ids = [f['feature_id'] for f in features]
+        # 瞳孔（468 / 473）需要 refine_landmarks，468 点时跳过
+        assert 35 not in ids and 40 not in ids
+        assert ids == sorted(ids) and len(ids) == len(FeatureMapper().feature_mapping) - 2
+        assert FeatureMapper().map_features(np.zeros((0, 3), dtype=np.float32), {}) == []
+
+    def test_average_of_present_points(self, points):
+        mapper = FeatureMapper()
+        mapper.feature_mapping = {1: {'name': 'n', 'method': 'average', 'indices': [1, 2, 500]}}
+        mapper._compile_mapping()
+        feature, = mapper.map_features(points, {})
+        assert feature['x'] == pytest.approx(float(points[1:3, 0].astype(np.float64).mean()))
+
+
+class TestServiceBoundary:
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        monkeypatch.setattr(face_service, "_landmark_cache", ImageResultCache(
+            "test_face", backend=MultiLevelCache(l1_max_size=10, redis_client=None)))
+        svc = face_service.FaceAnalysisService.__new__(face_service.FaceAnalysisService)
+        svc.landmark_detector = LandmarkDetectorFallback()
+        svc.feature_mapper = FeatureMapper()
+        svc.geometry_calculator = GeometryCalculator()
+        return svc
+
+    def test_detect_landmarks(self, service):
+        ok, encoded = cv2.imencode('.jpg', np.full((48, 64, 3), 128, dtype=np.uint8))
+        first = service.detect_landmarks(encoded.tobytes())
+        assert first['success'] and len(first['landmarks']) == 468
+        assert set(first['landmarks'][0]) == {'index', 'x', 'y', 'z', 'visibility', 'x_px', 'y_px'}
+        assert first['mapped_features'] and first['face_bounds']['width'] == 0.6
+
+        # 命中缓存：坐标数组还原后结果一致
+        detected = service._detect_points(encoded.tobytes())
+        assert detected['points'].shape == (468, 3) and detected['points'].dtype == np.float32
+        assert service.detect_landmarks(encoded.tobytes()) == first
+
+    def test_undecodable_image(self, service):
+        result = service.detect_landmarks(b"not an image")
+        assert not result['success'] and result['landmarks'] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+干支关系内核单元测试
+
+与改造前基于 relations.py 字典逐项查找的实现做一致性对比（参考实现保留在本文件中）。
+"""
+
+import os
+import random
+import sys
+import types
+from dataclasses import asdict
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from core.data import ganzhi_kernel as k
+from core.data.constants import (
+    BRANCH_ELEMENTS,
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    HIDDEN_STEMS,
+    STEM_ELEMENTS,
+)
+from core.data.relations import (
+    BRANCH_CHONG,
+    BRANCH_HAI,
+    BRANCH_LIUHE,
+    BRANCH_PO,
+    BRANCH_SANHE_GROUPS,
+    BRANCH_SANHUI_GROUPS,
+    BRANCH_XING,
+    STEM_HE,
+    STEM_KE,
+)
+
+PILLARS = ['year', 'month', 'day', 'hour']
+SHENG = {'木': '火', '火': '土', '土': '金', '金': '水', '水': '木'}
+KE = {'木': '土', '火': '金', '土': '水', '金': '木', '水': '火'}
+
+
+def _random_charts(count, seed=7):
+    rnd = random.Random(seed)
+    return [
+        {p: {'stem': rnd.choice(HEAVENLY_STEMS), 'branch': rnd.choice(EARTHLY_BRANCHES)} for p in PILLARS}
+        for _ in range(count)
+    ]
+
+
+# ════════════════════ 改造前的参考实现 ════════════════════
+
+
+def legacy_branch_relation_name(b1, b2):
+    """FortuneRelationAnalyzer._get_branch_relation（改造前）"""
+    if BRANCH_CHONG.get(b1) == b2:
+        return f"{b1}{b2}相冲⚠️"
+    if BRANCH_LIUHE.get(b1) == b2:
+        return f"{b1}{b2}六合✅"
+    if b2 in BRANCH_XING.get(b1, []):
+        return f"{b1}{b2}相刑⚠️"
+    if b2 in BRANCH_HAI.get(b1, []):
+        return f"{b1}{b2}相害⚠️"
+    if BRANCH_PO.get(b1) == b2:
+        return f"{b1}{b2}相破⚠️"
+    for group in BRANCH_SANHE_GROUPS:
+        if b1 in group and b2 in group:
+            return f"{b1}{b2}三合✅"
+    e1, e2 = BRANCH_ELEMENTS.get(b1), BRANCH_ELEMENTS.get(b2)
+    if SHENG[e1] == e2:
+        return f"{b1}生{b2}"
+    if KE[e1] == e2:
+        return f"{b1}克{b2}"
+    return "无特殊关系"
+
+
+def legacy_stem_relation_name(s1, s2):
+    """FortuneRelationAnalyzer._get_stem_relation（改造前）"""
+    if STEM_HE.get(s1) == s2:
+        return f"{s1}{s2}相合"
+    e1, e2 = STEM_ELEMENTS.get(s1), STEM_ELEMENTS.get(s2)
+    if e1 == e2:
+        return f"{s1}{s2}比劫并见"
+    if SHENG[e1] == e2:
+        return f"{s1}生{s2}"
+    if KE[e1] == e2:
+        return f"{s1}克{s2}"
+    if SHENG[e2] == e1:
+        return f"{s2}生{s1}"
+    if KE[e2] == e1:
+        return f"{s2}克{s1}"
+    return "无特殊关系"
+
+
+def legacy_pillar_relationships(bazi_pillars):
+    """BaziCoreCalculator._build_ganzhi_relationships 的两两关系部分（改造前）"""
+    stem_map = {p: bazi_pillars.get(p, {}).get('stem') for p in PILLARS}
+    branch_map = {p: bazi_pillars.get(p, {}).get('branch') for p in PILLARS}
+    stem_he, stem_he_map = [], {p: [] for p in PILLARS}
+    keys = ['liuhe', 'chong', 'xing', 'hai', 'po']
+    lists = {key: [] for key in keys}
+    maps = {key: {p: [] for p in PILLARS} for key in keys}
+    for i in range(4):
+        for j in range(i + 1, 4):
+            pa, pb = PILLARS[i], PILLARS[j]
+            sa, sb, ba, bb = stem_map[pa], stem_map[pb], branch_map[pa], branch_map[pb]
+            if sa and sb and STEM_HE.get(sa) == sb:
+                stem_he.append({'pillars': [pa, pb], 'stems': [sa, sb]})
+                stem_he_map[pa].append(pb)
+                stem_he_map[pb].append(pa)
+            if not (ba and bb):
+                continue
+            entry = {'pillars': [pa, pb], 'branches': [ba, bb]}
+            for key, table in (('liuhe', BRANCH_LIUHE), ('chong', BRANCH_CHONG)):
+                if table.get(ba) == bb:
+                    lists[key].append(dict(entry))
+                    maps[key][pa].append(pb)
+                    maps[key][pb].append(pa)
+            for key, table in (('xing', BRANCH_XING), ('hai', BRANCH_HAI)):
+                if bb in table.get(ba, []):
+                    lists[key].append(dict(entry))
+                    maps[key][pa].append(pb)
+                if ba in table.get(bb, []):
+                    maps[key][pb].append(pa)
+            if BRANCH_PO.get(ba) == bb:
+                lists['po'].append(dict(entry))
+                maps['po'][pa].append(pb)
+                maps['po'][pb].append(pa)
+    return stem_he, stem_he_map, lists, maps
+
+
+def legacy_check_branch_relations(a, b, relations):
+    """EnhancedRuleCondition._check_branch_relations（改造前）"""
+    for relation in relations:
+        relation = relation.lower()
+        if relation == "chong" and BRANCH_CHONG.get(a) == b:
+            return True
+        if relation == "liuhe" and BRANCH_LIUHE.get(a) == b:
+            return True
+        if relation == "xing" and (b in BRANCH_XING.get(a, []) or a in BRANCH_XING.get(b, [])):
+            return True
+        if relation == "hai" and (b in BRANCH_HAI.get(a, []) or a in BRANCH_HAI.get(b, [])):
+            return True
+        if relation == "po" and BRANCH_PO.get(a) == b:
+            return True
+    return False
+
+
+def legacy_power(stem, branch):
+    power = {e: 0.0 for e in k.ELEMENTS}
+    if stem in STEM_ELEMENTS:
+        power[STEM_ELEMENTS[stem]] += 1.5
+    if branch in BRANCH_ELEMENTS:
+        power[BRANCH_ELEMENTS[branch]] += 1.5
+        for hidden in HIDDEN_STEMS.get(branch, []):
+            power[hidden[-1]] += 0.5
+    return power
+
+
+# ════════════════════ 内核矩阵 ════════════════════
+
+
+class TestKernelMatrices:
+
+    def test_branch_matrix_matches_relation_tables(self):
+        for a in EARTHLY_BRANCHES:
+            for b in EARTHLY_BRANCHES:
+                bits = k.branch_relation(a, b)
+                assert bool(bits & k.REL_LIUHE) == (BRANCH_LIUHE.get(a) == b)
+                assert bool(bits & k.REL_CHONG) == (BRANCH_CHONG.get(a) == b)
+                assert bool(bits & k.REL_XING) == (b in BRANCH_XING.get(a, []))
+                assert bool(bits & k.REL_HAI) == (b in BRANCH_HAI.get(a, []))
+                assert bool(bits & k.REL_PO) == (BRANCH_PO.get(a) == b)
+                assert bool(bits & k.REL_SANHE) == any(a in g and b in g for g in BRANCH_SANHE_GROUPS)
+                assert bool(bits & k.REL_SANHUI) == any(a in g and b in g for g in BRANCH_SANHUI_GROUPS)
+                assert bool(bits & k.REL_SAME) == (a == b)
+                assert bits == k.BRANCH_RELATION_MATRIX[k.BRANCH_INDEX[a]][k.BRANCH_INDEX[b]]
+
+    def test_stem_matrix_matches_relation_tables(self):
+        for a in HEAVENLY_STEMS:
+            for b in HEAVENLY_STEMS:
+                bits = k.stem_relation(a, b)
+                assert bool(bits & k.REL_HE) == (STEM_HE.get(a) == b)
+                assert bool(bits & k.REL_KE) == (b in STEM_KE.get(a, []))
+                assert bool(bits & k.REL_KE_BY) == (a in STEM_KE.get(b, []))
+                assert bool(bits & k.REL_BIJIE) == (STEM_ELEMENTS[a] == STEM_ELEMENTS[b])
+                assert bool(bits & k.REL_SHENG) == (SHENG[STEM_ELEMENTS[a]] == STEM_ELEMENTS[b])
+
+    def test_unknown_values_have_no_relation(self):
+        assert k.branch_relation(None, '子') == 0
+        assert k.branch_relation('子', '') == 0
+        assert k.stem_relation('甲', 'x') == 0
+        assert k.branch_relations_any('子', [None, '', '午']) == k.branch_relation('子', '午')
+
+    def test_relations_any_and_each(self):
+        others = ('丑', '午', '卯', '酉')
+        each = k.branch_relations_each('子', others)
+        assert each == tuple(k.branch_relation('子', b) for b in others)
+        combined = 0
+        for bits in each:
+            combined |= bits
+        assert k.branch_relations_any('子', others) == combined
+        assert combined & k.REL_LIUHE and combined & k.REL_CHONG and combined & k.REL_XING and combined & k.REL_PO
+
+    def test_relation_mask_names(self):
+        assert k.relation_mask(['Chong', 'hai', 'unknown']) == k.REL_CHONG | k.REL_HAI
+
+    def test_sixty_ganzhi_power_vectors(self):
+        assert len(k.GANZHI_60) == 60 and k.GANZHI_60[0] == '甲子' and k.GANZHI_60[-1] == '癸亥'
+        for ganzhi in k.GANZHI_60:
+            expected = legacy_power(ganzhi[0], ganzhi[1])
+            assert k.ganzhi_power(ganzhi[0], ganzhi[1]) == tuple(expected[e] for e in k.ELEMENTS)
+        expected = legacy_power('甲', None)
+        assert k.ganzhi_power('甲', '') == tuple(expected[e] for e in k.ELEMENTS)
+        assert k.ganzhi_power('', '') == (0.0,) * 5
+
+
+# ════════════════════ 分析器一致性 ════════════════════
+
+
+class TestAnalyzerParity:
+
+    def test_fortune_relation_analyzer(self):
+        from core.analyzers.fortune_relation_analyzer import FortuneRelationAnalyzer
+
+        for a in EARTHLY_BRANCHES:
+            for b in EARTHLY_BRANCHES:
+                assert FortuneRelationAnalyzer._get_branch_relation(a, b) == legacy_branch_relation_name(a, b)
+        for a in HEAVENLY_STEMS:
+            for b in HEAVENLY_STEMS:
+                assert FortuneRelationAnalyzer._get_stem_relation(a, b) == legacy_stem_relation_name(a, b)
+
+    def test_liunian_interaction_analyzer(self):
+        from core.analyzers.liunian_interaction_analyzer import LiunianInteractionAnalyzer
+
+        analyzer = LiunianInteractionAnalyzer()
+        for a in EARTHLY_BRANCHES:
+            for b in EARTHLY_BRANCHES:
+                result = analyzer._analyze_branch_relation(a, b)
+                if BRANCH_LIUHE.get(a) == b:
+                    assert result['relation'] == '合'
+                elif BRANCH_CHONG.get(a) == b:
+                    assert result['relation'] == '冲'
+                elif b in BRANCH_XING.get(a, []):
+                    assert result['relation'] == '刑'
+                elif b in BRANCH_HAI.get(a, []):
+                    assert result['relation'] == '害'
+                elif a == b:
+                    assert result['relation'] == '同'
+                else:
+                    assert result is None
+                specials = [c['relation'] for c in analyzer._analyze_special_combinations(a, b)]
+                expected = [name for name, groups in (('三合', BRANCH_SANHE_GROUPS), ('三会', BRANCH_SANHUI_GROUPS))
+                            for g in groups if a in g and b in g]
+                assert specials == expected
+        for pillar_stem in HEAVENLY_STEMS:
+            for liunian_stem in HEAVENLY_STEMS:
+                result = analyzer._analyze_stem_relation(pillar_stem, liunian_stem)
+                relation = result['relation'] if result else None
+                pe, le = STEM_ELEMENTS[pillar_stem], STEM_ELEMENTS[liunian_stem]
+                if STEM_HE.get(pillar_stem) == liunian_stem:
+                    assert relation == '合'
+                elif pillar_stem == liunian_stem:
+                    assert relation == '同'
+                elif SHENG[le] == pe:
+                    assert relation == '生'
+                elif SHENG[pe] == le:
+                    assert relation == '泄'
+                elif KE[pe] == le:
+                    assert relation == '克出'
+                elif KE[le] == pe:
+                    assert relation == '受克'
+                else:
+                    assert relation is None
+
+    def test_pillar_relationships(self):
+        for chart in _random_charts(2000):
+            result = k.build_pillar_relationships(chart)
+            stem_he, stem_he_map, lists, maps = legacy_pillar_relationships(chart)
+            assert result['stem_relations'] == {'he': stem_he, 'map': stem_he_map}
+            for key in lists:
+                assert result['branch_relations'][key] == lists[key]
+                assert result['branch_relations']['map'][key] == maps[key]
+
+    def test_core_calculator_uses_kernel(self):
+        from core.calculators.bazi_core_calculator import BaziCoreCalculator
+
+        chart = _random_charts(1, seed=3)[0]
+        owner = types.SimpleNamespace(bazi_pillars=chart)
+        assert BaziCoreCalculator._build_ganzhi_relationships(owner) == k.build_pillar_relationships(chart)
+
+    def test_rule_condition_branch_relations(self):
+        from server.engines.rule_condition import EnhancedRuleCondition
+
+        relation_sets = [['chong'], ['liuhe'], ['xing'], ['hai'], ['po'], ['sanhe'], ['XING', 'po'], ['unknown']]
+        for a in EARTHLY_BRANCHES:
+            for b in EARTHLY_BRANCHES:
+                for relations in relation_sets:
+                    assert EnhancedRuleCondition._check_branch_relations(a, b, relations) == \
+                        legacy_check_branch_relations(a, b, relations)
+
+    def test_liunian_relations(self):
+        from core.calculators.bazi_calculator_docs import BaziCalculator
+
+        rnd = random.Random(11)
+        for chart in _random_charts(500):
+            ln_stem, ln_branch = rnd.choice(HEAVENLY_STEMS), rnd.choice(EARTHLY_BRANCHES)
+            relations = BaziCalculator._calculate_liunian_relations(None, ln_stem, ln_branch, '甲', '子', chart)
+            expected = [] if (ln_stem, ln_branch) != ('甲', '子') else ['岁运并临']
+            for pillar in chart.values():
+                if pillar['stem'] in STEM_KE[ln_stem] and BRANCH_CHONG[ln_branch] == pillar['branch']:
+                    expected.append('天克地冲')
+                elif STEM_HE[ln_stem] == pillar['stem'] and BRANCH_LIUHE[ln_branch] == pillar['branch']:
+                    expected.append('天合地合')
+            assert [r['type'].split('-')[-1] for r in relations] == expected
+
+    def test_force_balancer(self):
+        from core.inference.force_balancer import DynamicForceBalancer
+
+        rnd = random.Random(5)
+        for chart in _random_charts(500):
+            natal = DynamicForceBalancer.calculate_natal_wuxing_power(chart)
+            expected = {e: 0.0 for e in k.ELEMENTS}
+            for pillar in chart.values():
+                for e, value in legacy_power(pillar['stem'], pillar['branch']).items():
+                    expected[e] += value
+            assert natal == expected
+
+            dayun_stem, dayun_branch = rnd.choice(HEAVENLY_STEMS), rnd.choice(EARTHLY_BRANCHES)
+            natal_branches = [p['branch'] for p in chart.values()]
+            balance = DynamicForceBalancer.calculate_period_balance(
+                natal, natal_branches, dayun_stem, dayun_branch, day_branch=chart['day']['branch'],
+            )
+            expected_types = []
+            for nb in natal_branches:
+                if BRANCH_CHONG.get(dayun_branch) == nb:
+                    expected_types.append('冲')
+                if BRANCH_LIUHE.get(dayun_branch) == nb:
+                    expected_types.append('合')
+                if nb in BRANCH_XING.get(dayun_branch, []):
+                    expected_types.append('刑')
+                if nb in BRANCH_HAI.get(dayun_branch, []):
+                    expected_types.append('害')
+            assert [r['type'] for r in asdict(balance)['activated_relations']] == expected_types
+            day_branch = chart['day']['branch']
+            assert balance.marriage_palace_activated == (
+                BRANCH_CHONG[dayun_branch] == day_branch or BRANCH_LIUHE[dayun_branch] == day_branch
+            )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gRPC 自适应压缩单元测试
+
+- 地址 / peer 解析与本地网络判断
+- 各压缩模式的决策与指标
+- 服务端响应压缩拦截器
+"""
+
+import os
+import sys
+
+import grpc
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils import grpc_config
+from server.utils.grpc_config import (
+    ResponseCompressionInterceptor, _target_host, choose_compression, is_local_target,
+)
+
+LARGE = 1024 * 1024
+
+
+@pytest.fixture
+def adaptive(monkeypatch):
+    monkeypatch.setattr(grpc_config, "GRPC_COMPRESSION_MODE", "adaptive")
+    monkeypatch.setattr(grpc_config, "GRPC_COMPRESSION_MIN_BYTES", 64 * 1024)
+    monkeypatch.setattr(grpc_config, "GRPC_COMPRESS_LOCAL", False)
+    is_local_target.cache_clear()
+    yield
+    is_local_target.cache_clear()
+
+
+class TestTargetLocality:
+
+    @pytest.mark.parametrize("target, host", [
+        ("localhost:9001", "localhost"),
+        ("bazi-core:9001", "bazi-core"),
+        ("[::1]:9001", "::1"),
+        ("ipv4:10.0.0.8:54321", "10.0.0.8"),
+        ("ipv6:[::1]:54321", "::1"),
+        ("unix:/tmp/grpc.sock", "localhost"),
+    ])
+    def test_target_host(self, target, host):
+        assert _target_host(target) == host
+
+    def test_local_networks(self, adaptive):
+        assert is_local_target("localhost:9001")
+        assert is_local_target("ipv4:127.0.0.1:40000")
+        assert is_local_target("ipv6:[::1]:40000")
+        assert is_local_target("172.18.0.5:9001")  # 同宿主 Docker 网络
+        assert not is_local_target("10.0.0.8:9001")
+        assert not is_local_target("host.invalid:9001")
+
+
+class TestChooseCompression:
+
+    def test_adaptive(self, adaptive):
+        assert choose_compression("localhost:9001", LARGE) is None
+        assert choose_compression("10.0.0.8:9001", 100) is None
+        assert choose_compression("10.0.0.8:9001", LARGE) == grpc.Compression.Gzip
+
+    def test_compress_local(self, adaptive, monkeypatch):
+        monkeypatch.setattr(grpc_config, "GRPC_COMPRESS_LOCAL", True)
+        assert choose_compression("localhost:9001", LARGE) == grpc.Compression.Gzip
+        assert choose_compression("localhost:9001", 100) is None
+
+    def test_forced_modes(self, adaptive, monkeypatch):
+        monkeypatch.setattr(grpc_config, "GRPC_COMPRESSION_MODE", "gzip")
+        assert choose_compression("localhost:9001", 10) == grpc.Compression.Gzip
+        assert grpc_config.channel_compression("localhost:9001") == grpc.Compression.Gzip
+        monkeypatch.setattr(grpc_config, "GRPC_COMPRESSION_MODE", "none")
+        assert choose_compression("10.0.0.8:9001", LARGE) is None
+        assert grpc_config.get_server_interceptors() == []
+
+    def test_metrics(self, adaptive):
+        counter = grpc_config._decision_counter
+        before = counter.get(direction="response", decision="none", reason="local")
+        choose_compression("ipv4:127.0.0.1:1", LARGE, "response")
+        assert counter.get(direction="response", decision="none", reason="local") == before + 1
+
+
+class TestResponseCompressionInterceptor:
+
+    class _Response:
+        def __init__(self, size):
+            self.size = size
+
+        def ByteSize(self):
+            return self.size
+
+    class _Context:
+        def __init__(self, peer):
+            self._peer = peer
+            self.compression = None
+
+        def peer(self):
+            return self._peer
+
+        def set_compression(self, compression):
+            self.compression = compression
+
+    def _wrapped(self, size):
+        handler = grpc.unary_unary_rpc_method_handler(lambda request, context: self._Response(size))
+        return ResponseCompressionInterceptor().intercept_service(lambda details: handler, None)
+
+    def test_large_remote_response_compressed(self, adaptive):
+        context = self._Context("ipv4:10.0.0.8:40000")
+        assert self._wrapped(LARGE).unary_unary(None, context).size == LARGE
+        assert context.compression == grpc.Compression.Gzip
+
+    def test_local_or_small_response_not_compressed(self, adaptive):
+        for peer, size in (("ipv4:127.0.0.1:40000", LARGE), ("ipv4:10.0.0.8:40000", 10)):
+            context = self._Context(peer)
+            self._wrapped(size).unary_unary(None, context)
+            assert context.compression is None
+
+    def test_streaming_handler_untouched(self, adaptive):
+        handler = grpc.unary_stream_rpc_method_handler(lambda request, context: iter(()))
+        assert ResponseCompressionInterceptor().intercept_service(lambda details: handler, None) is handler
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
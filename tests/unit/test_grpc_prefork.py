@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+gRPC 多进程（pre-fork）服务单元测试
+
+- 工作进程数解析
+- 健康表聚合（状态 + 心跳超时）
+- 单进程模式平滑退出
+- 多进程模式：多个工作进程共享端口、健康聚合、统一退出
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils import grpc_prefork
+from server.utils.grpc_prefork import (
+    STATE_DRAINING, STATE_SERVING, STATE_STARTING,
+    PreforkSupervisor, WorkerHealthTable, resolve_workers, serve_grpc,
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _pid_server(port: int, extra_options):
+    """返回当前进程 pid 的最小 gRPC 服务（generic handler，无需 proto）"""
+    import grpc
+    from concurrent import futures
+
+    def handle(request, context):
+        return str(os.getpid()).encode()
+
+    handler = grpc.method_handlers_generic_handler(
+        "test.Pid", {"Get": grpc.unary_unary_rpc_method_handler(handle)})
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2), options=list(extra_options))
+    server.add_generic_rpc_handlers((handler,))
+    server.add_insecure_port(f"localhost:{port}")
+    return server, None
+
+
+class TestResolveWorkers:
+
+    def test_explicit(self):
+        assert resolve_workers(3) == 3
+        assert resolve_workers("2") == 2
+        assert resolve_workers(-1) == 1
+
+    def test_auto(self):
+        assert resolve_workers("auto") >= 1
+        assert resolve_workers(0) == resolve_workers("auto")
+
+    def test_invalid_and_env_default(self, monkeypatch):
+        assert resolve_workers("many") == 1
+        monkeypatch.setattr(grpc_prefork, "GRPC_WORKERS", "4")
+        assert resolve_workers() == 4
+
+
+class TestWorkerHealthTable:
+
+    def test_aggregate(self):
+        table = WorkerHealthTable(3)
+        assert table.snapshot()["status"] == "NOT_SERVING"
+
+        table.update(0, STATE_SERVING, pid=100)
+        table.update(1, STATE_STARTING, pid=101)
+        table.update(2, STATE_DRAINING, pid=102)
+        snapshot = table.snapshot()
+        assert snapshot["status"] == "SERVING"
+        assert (snapshot["serving"], snapshot["total"]) == (1, 3)
+        assert [w["state"] for w in snapshot["workers"]] == ["serving", "starting", "draining"]
+        assert snapshot["workers"][0]["pid"] == 100
+
+    def test_heartbeat_timeout(self):
+        table = WorkerHealthTable(1)
+        table.update(0, STATE_SERVING)
+        stale = table.snapshot(now=time.time() + grpc_prefork.HEARTBEAT_TIMEOUT + 1)
+        assert stale["status"] == "NOT_SERVING"
+        assert stale["workers"][0]["healthy"] is False
+
+
+class TestServeSingle:
+
+    def test_single_process_drains_on_stop(self, monkeypatch):
+        calls = []
+
+        class _Future:
+            def wait(self, timeout=None):
+                calls.append(("wait", timeout))
+
+        class _Server:
+            def start(self):
+                calls.append("start")
+
+            def stop(self, grace):
+                calls.append(("stop", grace))
+                return _Future()
+
+        class _Reloader:
+            def stop(self):
+                calls.append("reloader_stop")
+
+        def build_server(extra_options):
+            calls.append(("build", list(extra_options)))
+            return _Server(), _Reloader()
+
+        # 第一次等待即触发 Ctrl-C，模拟进程被中断
+        def _interrupt(self, timeout=None):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(threading.Event, "wait", _interrupt)
+        serve_grpc("demo", build_server, 0, workers=1, grace=3)
+        assert calls == [("build", []), "start", "reloader_stop", ("stop", 3), ("wait", 4)]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="需要 fork")
+class TestPrefork:
+
+    def test_workers_share_port(self):
+        import grpc
+
+        port = _free_port()
+        supervisor = PreforkSupervisor(
+            "demo", lambda extra_options: _pid_server(port, extra_options), port, workers=2, grace=1)
+        thread = threading.Thread(target=supervisor.run, daemon=True)
+        thread.start()
+        try:
+            deadline = time.time() + 30
+            while supervisor.status()["serving"] < 2 and time.time() < deadline:
+                time.sleep(0.2)
+            assert supervisor.status()["serving"] == 2
+
+            worker_pids = {w["pid"] for w in supervisor.status()["workers"]}
+            with grpc.insecure_channel(f"localhost:{port}") as channel:
+                pid = int(channel.unary_unary("/test.Pid/Get")(b"", timeout=10))
+            assert pid in worker_pids
+            assert pid != os.getpid()
+        finally:
+            supervisor.stop()
+            thread.join(15)
+
+        assert not thread.is_alive()
+        assert all(w["state"] == "stopped" for w in supervisor.status()["workers"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
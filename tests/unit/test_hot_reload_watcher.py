@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热更新文件监听单元测试（变化合并 / inotify 与轮询监听 / 节点级变化广播）
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.hot_reload import fs_watcher
+from server.hot_reload.fs_watcher import ChangeBatcher, FileChangeWatcher, is_under
+from server.hot_reload.worker_sync import FileChangeBus
+
+
+class _Collector:
+    """收集回调批次，支持等待"""
+
+    def __init__(self):
+        self.batches = []
+        self._event = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(dict(batch))
+        self._event.set()
+
+    def wait(self, timeout=5.0):
+        assert self._event.wait(timeout), "未收到变化批次"
+        self._event.clear()
+
+    def merged(self):
+        result = {}
+        for batch in self.batches:
+            result.update(batch)
+        return result
+
+
+def _write(path, content="x = 1\n"):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class TestChangeBatcher:
+    """变化合并器测试"""
+
+    def test_burst_is_merged_into_one_batch(self):
+        collector = _Collector()
+        batcher = ChangeBatcher(collector, debounce=0.1)
+        batcher.add("/a.py", "created")
+        batcher.add("/a.py", "modified")
+        batcher.add("/b.py", "modified")
+        batcher.add("/c.py", "deleted")
+        batcher.add("/c.py", "created")
+
+        collector.wait()
+        batcher.close()
+        assert collector.batches == [{"/a.py": "created", "/b.py": "modified", "/c.py": "modified"}]
+
+    def test_continuous_writes_flush_at_max_delay(self):
+        collector = _Collector()
+        batcher = ChangeBatcher(collector, debounce=0.2, max_delay=0.3)
+        started = time.monotonic()
+        while not collector.batches and time.monotonic() - started < 2:
+            batcher.add("/a.py", "modified")
+            time.sleep(0.05)
+        batcher.close()
+        assert collector.batches
+        assert time.monotonic() - started < 1.5
+
+
+class TestFileChangeWatcher:
+    """目录监听测试"""
+
+    @pytest.mark.parametrize("mode", ["polling", "auto"])
+    def test_detects_python_file_changes(self, tmp_path, mode):
+        if mode == "auto" and not fs_watcher.WATCHDOG_AVAILABLE:
+            pytest.skip("watchdog 未安装")
+        existing = tmp_path / "existing.py"
+        _write(existing)
+        (tmp_path / "__pycache__").mkdir()
+
+        collector = _Collector()
+        watcher = FileChangeWatcher([str(tmp_path)], collector, debounce=0.1, poll_interval=0.1, mode=mode)
+        backend = watcher.start()
+        try:
+            if mode == "polling":
+                assert backend == "polling"
+            time.sleep(0.2)
+            _write(tmp_path / "new.py")
+            _write(tmp_path / "notes.txt")
+            _write(tmp_path / "__pycache__" / "cached.py")
+            os.utime(existing, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+            _write(existing, "x = 2\n")
+
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                merged = collector.merged()
+                if str(tmp_path / "new.py") in merged and str(existing) in merged:
+                    break
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        merged = collector.merged()
+        assert merged[str(tmp_path / "new.py")] == "created"
+        assert merged[str(existing)] in ("modified", "created")
+        assert str(tmp_path / "notes.txt") not in merged
+        assert str(tmp_path / "__pycache__" / "cached.py") not in merged
+
+    def test_missing_directories_are_ignored(self, tmp_path):
+        watcher = FileChangeWatcher([str(tmp_path / "missing")], lambda batch: None, mode="polling")
+        assert watcher.directories == []
+
+    def test_is_under(self, tmp_path):
+        assert is_under(str(tmp_path / "a" / "b.py"), [str(tmp_path)])
+        assert not is_under(str(tmp_path) + "_other/b.py", [str(tmp_path)])
+
+
+@pytest.fixture
+def bus_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileChangeBus, "SIGNAL_FILE", str(tmp_path / "signal.json"))
+    monkeypatch.setattr(FileChangeBus, "LOCK_FILE", str(tmp_path / "watcher.lock"))
+    monkeypatch.setattr(FileChangeBus, "_instance", None)
+    return tmp_path
+
+
+class TestFileChangeBus:
+    """节点级变化广播测试"""
+
+    def test_batches_published_between_checks_are_not_lost(self, bus_files):
+        publisher = FileChangeBus()
+        subscriber = FileChangeBus()
+        collector = _Collector()
+        subscriber._callbacks.append(collector)
+
+        publisher.publish({"/app/a.py": "modified"})
+        publisher.publish({"/app/b.py": "created"})
+        subscriber._check_signal()
+        subscriber._check_signal()
+
+        assert collector.batches == [{"/app/a.py": "modified", "/app/b.py": "created"}]
+        assert subscriber._last_version == 2
+
+    def test_recreated_signal_file_is_processed(self, bus_files):
+        publisher = FileChangeBus()
+        subscriber = FileChangeBus()
+        collector = _Collector()
+        subscriber._callbacks.append(collector)
+        for i in range(3):
+            publisher.publish({f"/app/{i}.py": "modified"})
+        subscriber._check_signal()
+        assert subscriber._last_version == 3
+
+        # 信号文件被删除后重建：版本号从 1 重新计数，epoch 变化
+        os.remove(FileChangeBus.SIGNAL_FILE)
+        publisher.publish({"/app/new.py": "created"})
+        subscriber._check_signal()
+
+        assert collector.batches[-1] == {"/app/new.py": "created"}
+        assert subscriber._last_version == 1
+        assert subscriber._epoch == publisher._read_signal()["epoch"]
+
+    def test_version_rollback_without_epoch_resets(self, bus_files):
+        subscriber = FileChangeBus()
+        collector = _Collector()
+        subscriber._callbacks.append(collector)
+        subscriber._last_version = 5
+        with open(FileChangeBus.SIGNAL_FILE, "w") as f:
+            json.dump({"version": 1, "batches": [{"version": 1, "changes": {"/app/a.py": "modified"}}]}, f)
+        subscriber._check_signal()
+        assert collector.batches == [{"/app/a.py": "modified"}]
+        assert subscriber._last_version == 1
+
+    def test_signal_keeps_bounded_history(self, bus_files, monkeypatch):
+        monkeypatch.setattr(FileChangeBus, "MAX_BATCHES", 3)
+        bus = FileChangeBus()
+        for i in range(5):
+            version = bus.publish({f"/app/{i}.py": "modified"})
+        data = bus._read_signal()
+        assert version == 5
+        assert [batch["version"] for batch in data["batches"]] == [3, 4, 5]
+
+    def test_only_one_leader_per_node(self, bus_files, monkeypatch):
+        pytest.importorskip("fcntl")
+        monkeypatch.setattr(FileChangeBus, "WATCH_DIRECTORIES", [])
+        first, second = FileChangeBus(), FileChangeBus()
+        try:
+            assert first._try_become_leader()
+            assert not second._try_become_leader()
+        finally:
+            first.stop()
+            second.stop()
+        assert second._try_become_leader()
+        second.stop()
+
+
+class TestFileMonitorSubscription:
+    """FileMonitor 只处理推送来的变化文件"""
+
+    def test_on_changes_reports_modified_and_deleted(self, tmp_path, monkeypatch):
+        from server.hot_reload import file_monitor as file_monitor_module
+        from server.hot_reload.file_monitor import FileMonitor
+
+        monkeypatch.setattr(file_monitor_module, "project_root", str(tmp_path))
+        (tmp_path / "server").mkdir()
+        target = tmp_path / "server" / "mod.py"
+        _write(target)
+
+        monitor = FileMonitor()
+        monitor.watch_directories = ["server"]
+        monitor._scan_files()
+        events = []
+        monitor.register_callback(lambda path, change_type, state: events.append((change_type, path)))
+
+        _write(target, "x = 2\n")
+        _write(tmp_path / "server" / "broken.py", "def f(:\n")
+        monitor._on_changes({
+            str(target): "modified",
+            str(tmp_path / "server" / "broken.py"): "created",
+            str(tmp_path / "other.py"): "modified",
+        })
+        assert ("modified", str(target)) in events
+        assert ("created", str(tmp_path / "server" / "broken.py")) in events
+        assert all(path != str(tmp_path / "other.py") for _, path in events)
+
+        events.clear()
+        target.unlink()
+        monitor._on_changes({str(target): "deleted"})
+        assert events == [("deleted", str(target))]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
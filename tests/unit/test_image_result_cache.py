@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图像分析结果缓存单元测试
+"""
+
+import asyncio
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils.cache_multi_level import MultiLevelCache
+from shared.utils import image_result_cache
+from shared.utils.image_result_cache import (
+    PERCEPTUAL_MAX_DISTANCE,
+    ImageResultCache,
+    content_hash,
+    perceptual_hash,
+)
+
+
+def _image(quality: int = 95) -> bytes:
+    yy, xx = np.mgrid[0:480, 0:640]
+    gray = (127 + 100 * np.sin(xx / 45.0) * np.cos(yy / 70.0)).astype(np.uint8)
+    img = cv2.merge([gray, gray, gray])
+    ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    assert ok
+    return encoded.tobytes()
+
+
+def _ramp(low: int, high: int) -> bytes:
+    """水平亮度渐变图：不同亮度区间的渐变 dHash 完全相同"""
+    row = np.linspace(low, high, 640).astype(np.uint8)
+    ok, encoded = cv2.imencode('.png', np.tile(row, (480, 1)))
+    assert ok
+    return encoded.tobytes()
+
+
+@pytest.fixture
+def cache():
+    return ImageResultCache("test_ns", backend=MultiLevelCache(l1_max_size=100, redis_client=None))
+
+
+@pytest.fixture
+def perceptual_cache(monkeypatch):
+    monkeypatch.setattr(image_result_cache, "IMAGE_CACHE_PERCEPTUAL", True)
+    return ImageResultCache("test_ns", use_perceptual=True,
+                            backend=MultiLevelCache(l1_max_size=100, redis_client=None))
+
+
+class TestHashes:
+    """哈希函数测试"""
+
+    def test_content_hash_stable(self):
+        assert content_hash(b"abc") == content_hash(b"abc")
+        assert content_hash(b"abc") != content_hash(b"abd")
+
+    def test_perceptual_hash_survives_reencoding(self):
+        original, reencoded = _image(95), _image(60)
+        assert original != reencoded
+        distance = bin(int(perceptual_hash(original), 16) ^ int(perceptual_hash(reencoded), 16)).count("1")
+        assert distance <= PERCEPTUAL_MAX_DISTANCE
+
+    def test_perceptual_hash_invalid_bytes(self):
+        assert perceptual_hash(b"not an image") is None
+
+
+class TestImageResultCache:
+    """缓存读写测试"""
+
+    def test_second_call_skips_compute(self, cache):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"success": True, "items": [{"name": "cup"}]}
+
+        image = _image()
+        first = cache.get_or_compute(image, compute)
+        second = cache.get_or_compute(image, compute)
+        assert first == second
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_failures_not_cached(self, cache):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"success": False, "error": "no face"}
+
+        image = _image()
+        cache.get_or_compute(image, compute)
+        cache.get_or_compute(image, compute)
+        assert len(calls) == 2
+
+    def test_params_are_part_of_key(self, cache):
+        image = _image()
+        cache.set(image, {"success": True, "room": "bedroom"}, params={"room_type": "bedroom"})
+        assert cache.get(image, params={"room_type": "kitchen"}) is None
+        assert cache.get(image, params={"room_type": "bedroom"})["room"] == "bedroom"
+
+    def test_perceptual_off_by_default(self, cache):
+        assert not cache.use_perceptual
+        cache.set(_image(95), {"success": True, "value": 1})
+        assert cache.get(_image(60)) is None
+
+    def test_perceptual_needs_global_switch(self):
+        assert not ImageResultCache("test_ns", use_perceptual=True).use_perceptual
+
+    def test_reencoded_copy_hits_via_perceptual_hash(self, perceptual_cache):
+        perceptual_cache.set(_image(95), {"success": True, "value": 1})
+        assert perceptual_cache.get(_image(60)) == {"success": True, "value": 1}
+        assert perceptual_cache.stats()["perceptual_hits"] == 1
+
+    def test_distinct_images_with_same_dhash_do_not_share(self, perceptual_cache):
+        first, second = _ramp(0, 255), _ramp(60, 120)
+        assert perceptual_hash(first) == perceptual_hash(second)
+        perceptual_cache.set(first, {"success": True, "owner": "a"})
+        assert perceptual_cache.get(second) is None
+        assert perceptual_cache.stats()["perceptual_hits"] == 0
+
+    def test_resized_copy_does_not_share(self, perceptual_cache):
+        image = cv2.imdecode(np.frombuffer(_image(95), dtype=np.uint8), cv2.IMREAD_COLOR)
+        ok, resized = cv2.imencode('.jpg', cv2.resize(image, (320, 240)), [cv2.IMWRITE_JPEG_QUALITY, 95])
+        assert ok
+        perceptual_cache.set(_image(95), {"success": True, "bbox": [10, 10, 100, 100]})
+        assert perceptual_cache.get(resized.tobytes()) is None
+
+    def test_returned_value_is_a_copy(self, cache):
+        image = _image()
+        cache.set(image, {"success": True, "items": []})
+        cache.get(image)["items"].append("mutated")
+        assert cache.get(image)["items"] == []
+
+    def test_async_get_or_compute(self, cache):
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {"success": True}
+
+        async def run():
+            image = _image()
+            await cache.aget_or_compute(image, compute)
+            return await cache.aget_or_compute(image, compute)
+
+        assert asyncio.run(run()) == {"success": True}
+        assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
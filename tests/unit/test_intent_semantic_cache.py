@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+意图识别 LLM 兜底语义缓存单元测试
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from services.intent_service.semantic_cache import SemanticIntentCache, normalize_question
+
+
+LLM_RESULT = {
+    "is_fortune_related": True,
+    "intents": ["wealth"],
+    "confidence": 0.95,
+    "keywords": ["明年", "财运"],
+    "time_intent": {"type": "next_year", "target_years": [2026]},
+    "method": "llm_fallback",
+}
+
+
+class TestNormalizeQuestion:
+    """问题归一化测试"""
+
+    def test_strips_fillers_and_punctuation(self):
+        assert normalize_question("明年的财运怎么样？") == "明年财运"
+        assert normalize_question("我明年财运如何") == "明年财运"
+
+    def test_keeps_text_when_everything_filtered(self):
+        assert normalize_question("怎么样？") == "怎么样"
+
+
+class TestSemanticIntentCache:
+    """语义缓存测试"""
+
+    def test_exact_hit_after_normalization(self):
+        cache = SemanticIntentCache()
+        cache.put("明年财运", "v1.0", LLM_RESULT, llm_time_ms=800)
+
+        result = cache.get("明年的财运怎么样？", "v1.0")
+        assert result is not None
+        assert result["intents"] == ["wealth"]
+        # 时间意图由后处理按原问题重新解析，不进入缓存
+        assert "time_intent" not in result
+        assert "method" not in result
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["exact_hits"] == 1
+        assert stats["saved_ms"] == 800
+
+    def test_semantic_hit_with_encoder(self):
+        vectors = {"明年财运": [1.0, 0.0], "明年财富运势": [0.99, 0.05], "健康": [0.0, 1.0]}
+        cache = SemanticIntentCache(encoder=lambda text: vectors[text], similarity_threshold=0.9)
+        cache.put("明年财运", "v1.0", LLM_RESULT)
+
+        assert cache.get("明年财富运势", "v1.0")["intents"] == ["wealth"]
+        assert cache.get("健康", "v1.0") is None
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_prompt_versions_are_isolated(self):
+        cache = SemanticIntentCache()
+        cache.put("明年财运", "v1.0", LLM_RESULT)
+        assert cache.get("明年财运", "v2.0") is None
+
+    def test_returned_result_is_a_copy(self):
+        cache = SemanticIntentCache()
+        cache.put("明年财运", "v1.0", LLM_RESULT)
+        cache.get("明年财运", "v1.0")["intents"].append("career")
+        assert cache.get("明年财运", "v1.0")["intents"] == ["wealth"]
+
+    def test_ttl_expiry(self):
+        cache = SemanticIntentCache(ttl=1)
+        cache.put("明年财运", "v1.0", LLM_RESULT)
+        time.sleep(1.1)
+        assert cache.get("明年财运", "v1.0") is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_lru_eviction(self):
+        cache = SemanticIntentCache(max_entries=2, similarity_threshold=0.99)
+        cache.put("财运", "v1.0", LLM_RESULT)
+        cache.put("事业", "v1.0", LLM_RESULT)
+        # 访问"财运"使其成为最近使用
+        assert cache.get("财运", "v1.0") is not None
+        cache.put("健康", "v1.0", LLM_RESULT)
+
+        assert cache.get("事业", "v1.0") is None
+        assert cache.get("财运", "v1.0") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_lookup_encodes_outside_lock(self):
+        vectors = {"明年财运": [1.0, 0.0], "明年财富运势": [0.99, 0.05]}
+        locked_during_encode = []
+
+        def encoder(text):
+            locked_during_encode.append(cache._lock.locked())
+            return vectors[text]
+
+        cache = SemanticIntentCache(encoder=encoder, similarity_threshold=0.9)
+        cache.put("明年财运", "v1.0", LLM_RESULT)
+        assert cache.get("明年财富运势", "v1.0")["intents"] == ["wealth"]
+        assert locked_during_encode == [False, False]
+
+    def test_encoder_failure_falls_back_to_hash_embedding(self):
+        def broken_encoder(text):
+            raise RuntimeError("model unavailable")
+
+        cache = SemanticIntentCache(encoder=broken_encoder)
+        cache.put("明年财运", "v1.0", LLM_RESULT)
+        assert cache.get("明年财运", "v1.0") is not None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
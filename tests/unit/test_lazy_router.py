@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+延迟路由挂载与启动耗时分析单元测试
+
+- 路由模块静态解析（不导入）
+- 延迟路由：启动时不导入，首次请求命中时挂载，且排在静态文件 Mount 之前
+- 导入失败的延迟路由只尝试一次
+- StartupProfiler 统计模块自身 / 累计导入耗时
+"""
+
+import asyncio
+import os
+import sys
+import textwrap
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from fastapi import FastAPI
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from server.middleware.lazy_router import LazyRouterMiddleware
+from server.utils import router_manager as router_manager_module
+from server.utils.router_manager import RouterManager, scan_router_paths
+from server.utils.startup_profiler import StartupProfiler
+
+ROUTER_SOURCE = textwrap.dedent('''
+    from fastapi import APIRouter
+
+    router = APIRouter(prefix="/demo")
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"item_id": item_id}
+
+    @router.post(path="/items")
+    async def create_item():
+        return {"ok": True}
+''')
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """在临时目录生成路由模块（模块名带前缀避免与其他测试冲突）"""
+    monkeypatch.setattr(router_manager_module, "project_root", str(tmp_path))
+    monkeypatch.setattr(router_manager_module, "LAZY_ROUTERS", True)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "lazy_demo_router.py").write_text(ROUTER_SOURCE, encoding="utf-8")
+    (tmp_path / "lazy_broken_router.py").write_text(
+        ROUTER_SOURCE + "\nraise ImportError('missing heavy dependency')\n", encoding="utf-8")
+    (tmp_path / "lazy_nested_router.py").write_text(textwrap.dedent('''
+        from fastapi import APIRouter
+        from lazy_demo_router import router as sub_router
+
+        router = APIRouter(prefix="/nested")
+        router.include_router(sub_router)
+    '''), encoding="utf-8")
+    yield tmp_path
+    for name in ("lazy_demo_router", "lazy_broken_router", "lazy_nested_router"):
+        sys.modules.pop(name, None)
+
+
+def _app_with_manager():
+    app = FastAPI()
+    manager = RouterManager(app)
+    app.add_middleware(LazyRouterMiddleware, router_manager=manager)
+    return app, manager
+
+
+def _request(app, method, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "raw_path": path.encode(),
+             "root_path": "", "scheme": "http", "query_string": b"", "headers": [],
+             "client": ("127.0.0.1", 12345), "server": ("test", 80)}
+    asyncio.run(app(scope, receive, send))
+    return messages[0]["status"]
+
+
+class TestScanRouterPaths:
+
+    def test_paths_and_prefix(self, modules):
+        prefix, paths = scan_router_paths("lazy_demo_router")
+        assert prefix == "/demo"
+        assert sorted(paths) == ["/items", "/items/{item_id}"]
+        assert "lazy_demo_router" not in sys.modules
+
+    def test_include_router_falls_back_to_prefix(self, modules):
+        assert scan_router_paths("lazy_nested_router") == ("/nested", None)
+
+    def test_missing_module(self, modules):
+        assert scan_router_paths("lazy_not_exists") == ("", [])
+
+    def test_repo_router(self):
+        prefix, paths = scan_router_paths("server.api.v1.model_tuning")
+        assert prefix == "/model-tuning"
+        assert paths
+
+
+class TestLazyRouter:
+
+    def test_mounted_on_first_request(self, modules):
+        app, manager = _app_with_manager()
+        manager.register_lazy_router("demo", "lazy_demo_router", prefix="/api/v1", tags=["demo"])
+        manager.register_all_routers()
+        # 模拟 main.py：静态文件挂在 / 上，排在所有路由之后
+        app.mount("/", StaticFiles(directory=str(modules)), name="root")
+
+        assert "lazy_demo_router" not in sys.modules
+        assert manager.get_pending_lazy_routers() == ["demo"]
+        assert manager.pending_routers_for_path("/api/v1/demo/items/3") == ["demo"]
+        assert manager.pending_routers_for_path("/api/v1/other") == []
+
+        assert _request(app, "GET", "/api/v1/demo/items/3") == 200
+        assert manager.get_registered_routers() == ["demo"]
+        assert not manager.has_pending_lazy_routers()
+        assert _request(app, "POST", "/api/v1/demo/items") == 200
+
+    def test_mount_swaps_route_list(self, modules):
+        app, manager = _app_with_manager()
+        manager.register_lazy_router("demo", "lazy_demo_router", prefix="/api/v1")
+        manager.register_all_routers()
+        app.mount("/", StaticFiles(directory=str(modules)), name="root")
+        live = app.router.routes
+        snapshot = list(live)
+
+        assert manager.mount_lazy_router("demo")
+        # 正在分发的请求持有的旧列表保持不变，新列表一次替换
+        assert live == snapshot and app.router.routes is not live
+        paths = [getattr(r, "path", None) for r in app.router.routes]
+        assert paths.index("/api/v1/demo/items/{item_id}") < len(paths) - 1
+        assert isinstance(app.router.routes[-1], Mount)
+
+    def test_eager_when_disabled(self, modules, monkeypatch):
+        monkeypatch.setattr(router_manager_module, "LAZY_ROUTERS", False)
+        app, manager = _app_with_manager()
+        manager.register_lazy_router("demo", "lazy_demo_router", prefix="/api/v1")
+        assert manager.register_all_routers() == {"demo": True}
+        assert "lazy_demo_router" in sys.modules
+        assert manager.get_pending_lazy_routers() == []
+
+    def test_not_lazy_router_imported_at_startup(self, modules):
+        app, manager = _app_with_manager()
+        manager.register_lazy_router("demo", "lazy_demo_router", prefix="/api/v1", lazy=False)
+        manager.register_all_routers()
+        assert manager.get_registered_routers() == ["demo"]
+
+    def test_prefix_claim_and_warm_up(self, modules):
+        app, manager = _app_with_manager()
+        manager.register_lazy_router("nested", "lazy_nested_router", prefix="/api/v2")
+        manager.register_lazy_router("broken", "lazy_broken_router", prefix="/api/v1")
+        manager.register_all_routers()
+        assert manager.pending_routers_for_path("/api/v2/nested/demo/items/1") == ["nested"]
+
+        assert manager.warm_up_lazy_routers() == {"nested": True, "broken": False}
+        assert manager.get_pending_lazy_routers() == []
+        # 失败的路由不再重复尝试
+        assert manager.warm_up_lazy_routers() == {}
+        assert _request(app, "GET", "/api/v2/nested/demo/items/1") == 200
+
+    def test_hot_reload_keeps_mounted_router(self, modules):
+        app, manager = _app_with_manager()
+        manager.register_lazy_router("demo", "lazy_demo_router", prefix="/api/v1")
+        manager.register_all_routers()
+        manager.mount_lazy_router("demo")
+        manager.clear_registered_state()
+        assert manager.register_all_routers(force=True) == {"demo": True}
+        assert manager.get_registered_routers() == ["demo"]
+
+
+class TestStartupProfiler:
+
+    def test_import_timing(self, tmp_path, monkeypatch):
+        monkeypatch.syspath_prepend(str(tmp_path))
+        (tmp_path / "prof_child_mod.py").write_text("import time\ntime.sleep(0.05)\n", encoding="utf-8")
+        (tmp_path / "prof_parent_mod.py").write_text(
+            "import time\nimport prof_child_mod\ntime.sleep(0.02)\nVALUE = 1\n", encoding="utf-8")
+
+        profiler = StartupProfiler()
+        profiler.install()
+        try:
+            import prof_parent_mod
+            with profiler.section("router:demo"):
+                pass
+        finally:
+            profiler.uninstall()
+            sys.modules.pop("prof_parent_mod", None)
+            sys.modules.pop("prof_child_mod", None)
+
+        assert prof_parent_mod.VALUE == 1
+        report = profiler.report(top=50)
+        rows = {r["module"]: r for r in report["top_cumulative"]}
+        parent, child = rows["prof_parent_mod"], rows["prof_child_mod"]
+        assert child["self_ms"] >= 40
+        assert parent["cumulative_ms"] >= parent["self_ms"] + child["cumulative_ms"] - 1
+        assert parent["self_ms"] < child["self_ms"]
+        assert report["sections"][0]["name"] == "router:demo"
+        assert "prof_parent_mod" in profiler.format_report()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
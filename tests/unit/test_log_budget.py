@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热路径日志预算单元测试
+
+- 惰性参数只在日志确实输出时求值
+- 按调用点限流 / 采样，被抑制条数附在下一条输出
+- 按请求统计字节并在超出预算后抑制 INFO
+- 队列异步写出仍按原传播链交给上级处理器，队列满时丢弃并计数
+"""
+
+import logging
+import os
+import sys
+import uuid
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils import log_budget
+from server.utils.log_budget import get_hot_logger, lazy, log_budget_scope
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    @property
+    def messages(self):
+        return [record.getMessage() for record in self.records]
+
+
+@pytest.fixture
+def hot(monkeypatch):
+    """独立的父 logger 上挂捕获处理器，热路径 logger 为其子 logger"""
+    parent = logging.getLogger(f"test_log_budget.{uuid.uuid4().hex}")
+    parent.setLevel(logging.DEBUG)
+    parent.propagate = False
+    capture = _Capture()
+    parent.addHandler(capture)
+    monkeypatch.setattr(log_budget, "HOT_LOG_RATE_PER_SITE", 0.0)
+    monkeypatch.setattr(log_budget, "HOT_LOG_BUDGET_BYTES", 0)
+    hot_logger = get_hot_logger(f"{parent.name}.hot")
+    yield hot_logger, capture
+    log_budget.stop_hot_log_listener()
+
+
+def _flush():
+    log_budget.stop_hot_log_listener()
+
+
+class TestHotPathLogger:
+
+    def test_lazy_args(self, hot):
+        hot_logger, capture = hot
+        calls = []
+        hot_logger.logger.setLevel(logging.INFO)
+        hot_logger.debug("skipped %s", lazy(lambda: calls.append("debug")))
+        hot_logger.info("data: %.5s", lazy(lambda: calls.append("info") or "abcdefgh"))
+        _flush()
+        assert calls == ["info"]
+        assert capture.messages == ["data: abcde"]
+        # 调用位置指向业务代码而不是 log_budget
+        assert capture.records[0].funcName == "test_lazy_args"
+
+    def test_rate_limit_per_call_site(self, hot, monkeypatch):
+        hot_logger, capture = hot
+        monkeypatch.setattr(log_budget, "HOT_LOG_RATE_PER_SITE", 3.0)
+
+        def emit(i):
+            hot_logger.info("a %d", i)
+
+        for i in range(10):
+            emit(i)
+        hot_logger.info("b")   # 另一个调用点不受影响
+        hot_logger.warning("w")
+        monkeypatch.setattr(log_budget, "HOT_LOG_RATE_PER_SITE", 0.0)
+        emit(10)
+        _flush()
+        assert capture.messages == ["a 0", "a 1", "a 2", "b", "w", "a 10（此前抑制 7 条）"]
+
+    def test_sample(self, hot):
+        hot_logger, capture = hot
+        for i in range(10):
+            hot_logger.debug("%d", i, sample=4)
+        _flush()
+        assert capture.messages == ["0", "4（此前抑制 3 条）", "8（此前抑制 3 条）"]
+
+    def test_request_budget(self, hot, monkeypatch):
+        hot_logger, capture = hot
+        monkeypatch.setattr(log_budget, "HOT_LOG_BUDGET_BYTES", 20)
+        with log_budget_scope() as stats:
+            for i in range(5):
+                hot_logger.info("%s", "x" * 8)
+            hot_logger.error("还会输出")
+        _flush()
+        assert capture.messages == ["x" * 8] * 3 + ["还会输出"]
+        assert (stats.records, stats.suppressed) == (4, 2)
+        assert stats.bytes == 24 + len("还会输出".encode("utf-8"))
+        assert "4 条" in stats.summary() and "抑制 2 条" in stats.summary()
+        assert log_budget.current_log_stats() is None
+
+
+class TestQueueDispatch:
+
+    def test_plain_logger_and_child_records(self, hot):
+        hot_logger, capture = hot
+        logging.getLogger(hot_logger.logger.name).info("plain %s", "x")
+        logging.getLogger(f"{hot_logger.logger.name}.child").info("child")
+        _flush()
+        assert capture.messages == ["plain x", "child"]
+        assert hot_logger.logger.propagate is False
+
+    def test_queue_full_drops(self, hot, monkeypatch):
+        hot_logger, capture = hot
+
+        class _Full:
+            def put_nowait(self, record):
+                raise log_budget.queue.Full
+
+        monkeypatch.setattr(log_budget, "_ensure_listener", lambda: _Full())
+        before = log_budget.dropped_log_count()
+        with log_budget_scope() as stats:
+            hot_logger.info("lost")
+        assert stats.dropped == 1 and log_budget.dropped_log_count() == before + 1
+
+    def test_sync_mode(self, hot):
+        hot_logger, capture = hot
+        handler = next(h for h in hot_logger.logger.handlers if isinstance(h, log_budget.BudgetQueueHandler))
+        handler.async_write = False
+        hot_logger.info("now")
+        assert capture.messages == ["now"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
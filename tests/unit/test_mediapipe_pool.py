@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MediaPipe 实例池单元测试
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from services.fortune_analysis.mediapipe_singleton import GraphPool, wrap_landmark_results
+
+
+class FakeGraph:
+    """模拟 MediaPipe 图：同一实例被并发调用时记录冲突"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.busy = False
+        self.conflicts = 0
+        self.closed = False
+
+    def process(self, image):
+        if self.busy:
+            self.conflicts += 1
+        self.busy = True
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("graph crashed")
+            return image
+        finally:
+            self.busy = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestGraphPool:
+    """实例池测试"""
+
+    def test_creates_lazily_up_to_size(self):
+        created = []
+        pool = GraphPool("test", lambda: created.append(FakeGraph()) or created[-1], size=2)
+
+        assert pool.process("img") == "img"
+        assert pool.process("img") == "img"
+        # 串行调用复用同一个实例
+        assert len(created) == 1
+
+        a, b = pool.checkout(), pool.checkout()
+        assert len(created) == 2
+        pool.checkin(a)
+        pool.checkin(b)
+        assert pool.stats() == {"graph": "test", "size": 2, "created": 2, "in_use": 0}
+
+    def test_concurrent_requests_use_separate_graphs(self):
+        created = []
+        pool = GraphPool("test", lambda: created.append(FakeGraph(delay=0.2)) or created[-1], size=4)
+
+        threads = [threading.Thread(target=pool.process, args=("img",)) for _ in range(4)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        assert len(created) == 4
+        assert sum(g.conflicts for g in created) == 0
+        # 并行而非排队（串行需要 0.8s）
+        assert elapsed < 0.6
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = GraphPool("test", FakeGraph, size=1)
+        graph = pool.checkout()
+        with pytest.raises(TimeoutError):
+            pool.checkout(timeout=0.05)
+        pool.checkin(graph)
+        assert pool.checkout(timeout=0.05) is graph
+
+    def test_failed_graph_is_discarded(self):
+        graphs = [FakeGraph(fail=True), FakeGraph()]
+        pool = GraphPool("test", lambda: graphs.pop(0), size=1)
+
+        with pytest.raises(RuntimeError):
+            pool.process("img")
+        assert pool.stats()["created"] == 0
+
+        # 下一次请求重新创建实例
+        assert pool.process("img") == "img"
+
+    def test_factory_failure_releases_slot(self):
+        def broken_factory():
+            raise RuntimeError("init failed")
+
+        pool = GraphPool("test", broken_factory, size=1)
+        with pytest.raises(RuntimeError):
+            pool.warm_up()
+        assert pool.stats()["created"] == 0
+
+
+class TestWrapLandmarkResults:
+    """子进程结果还原测试"""
+
+    def test_wraps_coordinates_like_mediapipe_results(self):
+        results = wrap_landmark_results("face_mesh", [[(0.1, 0.2, 0.3), (0.4, 0.5, 0.6)]])
+        landmarks = results.multi_face_landmarks[0]
+        assert len(landmarks.landmark) == 2
+        assert landmarks.landmark[1].y == 0.5
+
+    def test_empty_results_are_none(self):
+        assert wrap_landmark_results("hands", []).multi_hand_landmarks is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -105,6 +105,88 @@ class TestDynamicServicer:
         cache = object.__getattribute__(ds, '_method_cache')
         assert isinstance(cache, dict)
 
+    def test_registered_reference_follows_reload(self):
+        """gRPC 注册时只取一次方法引用，热更新后该引用应转发到新 Servicer"""
+        from server.hot_reload.microservice_reloader import (
+            DynamicServicer, MicroserviceReloader
+        )
+
+        class ServicerV1:
+            def Greet(self, request, context):
+                return "v1"
+
+        class ServicerV2:
+            def Greet(self, request, context):
+                return "v2"
+
+        with patch.object(MicroserviceReloader, '_scan_files'):
+            reloader = MicroserviceReloader(
+                service_name="test_svc",
+                module_path="test.module",
+                servicer_class_name="TestServicer",
+            )
+        reloader.set_servicer(ServicerV1())
+        ds = DynamicServicer(reloader)
+        reloader._dynamic_servicers.append(ds)
+
+        handler = ds.Greet
+        assert handler(None, None) == "v1"
+        assert ds.Greet is handler
+
+        reloader.set_servicer(ServicerV2())
+        assert handler(None, None) == "v2"
+
+    def test_registered_reference_follows_rollback(self, tmp_path, monkeypatch):
+        """回滚替换 Servicer 后，已注册的 handler 应立即转发到恢复的 Servicer"""
+        import sys
+        from server.hot_reload.microservice_reloader import (
+            DynamicServicer, MicroserviceReloader
+        )
+
+        (tmp_path / "rollback_demo_servicer.py").write_text(
+            "class DemoServicer:\n"
+            "    def Greet(self, request, context):\n"
+            "        return 'restored'\n",
+            encoding="utf-8",
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "rollback_demo_servicer", raising=False)
+
+        class BrokenServicer:
+            def Greet(self, request, context):
+                return "broken"
+
+        with patch.object(MicroserviceReloader, '_scan_files'):
+            reloader = MicroserviceReloader(
+                service_name="test_svc",
+                module_path="rollback_demo_servicer",
+                servicer_class_name="DemoServicer",
+            )
+            reloader.set_servicer(BrokenServicer())
+            ds = DynamicServicer(reloader)
+            reloader._dynamic_servicers.append(ds)
+            handler = ds.Greet
+            assert handler(None, None) == "broken"
+
+            reloader._version_history.append({'version': 1, 'backup_files': []})
+            assert reloader._rollback()
+        assert handler(None, None) == "restored"
+        sys.modules.pop("rollback_demo_servicer", None)
+
+    def test_call_path_does_not_take_lock(self):
+        """方法表发布后，调用路径不需要获取写锁"""
+        ds, _, servicer = self._make_dynamic()
+        handler = ds.SomeMethod
+        handler("warm-up")
+
+        lock = object.__getattribute__(ds, '_cache_lock')
+        result = []
+        with lock:
+            caller = threading.Thread(target=lambda: result.append(handler("arg")))
+            caller.start()
+            caller.join(timeout=2)
+        assert result == ["result"]
+
 
 # ════════════════════ MicroserviceReloader basics ════════════════════
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟 LLM 流式服务单元测试
+
+- 块序列：progress 拼接为完整输出，最后一个块为 complete；同一提示词输出相同
+- 错误注入：event 产出 type=error，exception 抛出 MockLLMError
+- 统计：并发峰值、完成 / 错误 / 中断计数
+- 工厂：LLM_MOCK_ENABLED 时返回模拟服务，生产环境拒绝启用
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.services import llm_service_factory
+from server.services.llm_service_factory import LLMServiceFactory
+from server.services.mock_llm_stream_service import (
+    MockLLMConfig,
+    MockLLMError,
+    MockLLMStreamService,
+    get_mock_llm_stats,
+    reset_mock_llm_stats,
+)
+
+
+def _service(**overrides):
+    params = dict(first_token_ms=0, tokens_per_second=0, chunk_tokens=4, output_tokens=30, jitter=0, seed=1)
+    params.update(overrides)
+    return MockLLMStreamService("test", MockLLMConfig(**params))
+
+
+async def _collect(service, prompt="提示词"):
+    return [chunk async for chunk in service.stream_analysis(prompt)]
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    reset_mock_llm_stats()
+    yield
+    reset_mock_llm_stats()
+
+
+class TestStream:
+
+    def test_chunks_and_complete(self):
+        chunks = asyncio.run(_collect(_service()))
+        assert chunks[-1] == {'type': 'complete', 'content': ''}
+        progress = [c['content'] for c in chunks[:-1]]
+        assert all(c['type'] == 'progress' for c in chunks[:-1])
+        assert len(progress) == 8 and len("".join(progress)) == 30
+
+    def test_output_is_deterministic(self):
+        first = asyncio.run(_collect(_service(), "甲子"))
+        assert asyncio.run(_collect(_service(), "甲子")) == first
+        assert asyncio.run(_collect(_service(), "乙丑")) != first
+
+    def test_paced_output(self):
+        service = _service(first_token_ms=20, tokens_per_second=400, output_tokens=20)
+
+        async def _timed():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await _collect(service)
+            return loop.time() - start
+
+        # 首字 20ms + 4 个间隔各 10ms
+        assert asyncio.run(_timed()) >= 0.055
+        stats = get_mock_llm_stats()
+        assert stats["avg_first_token_ms"] >= 19
+        assert stats["loop_lag_max_ms"] >= 0
+
+
+class TestErrorInjection:
+
+    def test_error_event(self):
+        chunks = asyncio.run(_collect(_service(error_rate=1, error_at=0.5)))
+        assert chunks[-1]['type'] == 'error'
+        assert len("".join(c['content'] for c in chunks[:-1])) == 16
+        assert get_mock_llm_stats()["errors"] == 1
+
+    def test_error_before_first_token(self):
+        chunks = asyncio.run(_collect(_service(error_rate=1, error_at=0)))
+        assert [c['type'] for c in chunks] == ['error']
+
+    def test_exception(self):
+        with pytest.raises(MockLLMError):
+            asyncio.run(_collect(_service(error_rate=1, error_kind="exception")))
+        assert get_mock_llm_stats()["errors"] == 1
+
+    def test_error_rate_zero(self):
+        for _ in range(5):
+            assert asyncio.run(_collect(_service()))[-1]['type'] == 'complete'
+
+
+class TestStats:
+
+    def test_concurrent_streams(self):
+        service = _service(first_token_ms=10, tokens_per_second=1000)
+
+        async def _run():
+            await asyncio.gather(*[_collect(service, str(i)) for i in range(5)])
+
+        asyncio.run(_run())
+        stats = get_mock_llm_stats()
+        assert stats["peak_streams"] == 5 and stats["active_streams"] == 0
+        assert stats["started"] == 5 and stats["completed"] == 5
+        assert stats["config"]["first_token_ms"] == MockLLMConfig.from_env().first_token_ms
+
+    def test_cancelled_on_early_close(self):
+        async def _run():
+            gen = _service().stream_analysis("提示词")
+            await gen.__anext__()
+            await gen.aclose()
+
+        asyncio.run(_run())
+        stats = get_mock_llm_stats()
+        assert stats["cancelled"] == 1 and stats["active_streams"] == 0
+
+    def test_config_from_env(self, monkeypatch):
+        monkeypatch.setenv("MOCK_LLM_CHUNK_TOKENS", "0")
+        monkeypatch.setenv("MOCK_LLM_ERROR_RATE", "2")
+        monkeypatch.setenv("MOCK_LLM_SEED", "7")
+        config = MockLLMConfig.from_env()
+        assert config.chunk_tokens == 1 and config.error_rate == 1.0 and config.seed == 7
+
+
+class TestFactory:
+
+    def test_env_switch(self, monkeypatch):
+        monkeypatch.setattr(llm_service_factory, "LLM_MOCK_ENABLED", True)
+        monkeypatch.setenv("APP_ENV", "development")
+        service = LLMServiceFactory.get_service("marriage")
+        assert isinstance(service, MockLLMStreamService)
+        assert LLMServiceFactory.get_service("marriage") is service
+
+    def test_db_platform(self, monkeypatch):
+        monkeypatch.setattr(llm_service_factory, "get_config_from_db_only",
+                            lambda key: "mock" if key == "LLM_PLATFORM" else None)
+        monkeypatch.setenv("APP_ENV", "development")
+        assert isinstance(LLMServiceFactory.get_service("health"), MockLLMStreamService)
+
+    def test_refused_in_production(self, monkeypatch):
+        monkeypatch.setattr(llm_service_factory, "LLM_MOCK_ENABLED", True)
+        monkeypatch.setenv("APP_ENV", "production")
+        # Coze 服务初始化需读数据库配置，这里只校验回退的平台
+        monkeypatch.setattr(llm_service_factory, "CozeStreamService", lambda bot_id=None: ("coze", bot_id))
+        assert LLMServiceFactory.get_service("marriage", bot_id="b1") == ("coze", "b1")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本命层 / 当前窗口拆分单元测试
+
+- 本命层 + 当前窗口 与 一次性 calculate_dayun_liunian 结果一致
+- 本命层缓存键不含当前时间，跨时间请求复用同一本命层
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from core.calculators.bazi_calculator_docs import BaziCalculator
+from server.services import natal_layer_service
+from server.services.natal_layer_service import NATAL_LAYER_VERSION, NatalLayerService
+
+BIRTH = ('1990-05-15', '14:30', 'male')
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class _FakeRedis:
+    """模拟 Redis 客户端（get/setex/set/delete）"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def set(self, key, value):
+        self.setex(key, None, value)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _natal_cache(redis):
+    from server.utils.cache_policy import PolicyCache, get_policy
+    # 不使用 L1，确保每次都经过 L2 编解码
+    policy = dataclasses.replace(get_policy('natal'), l1_max_entries=0)
+    return PolicyCache(policy, redis_client=redis)
+
+
+@pytest.fixture(scope="module")
+def natal_layer():
+    calc = BaziCalculator(*BIRTH)
+    with contextlib.redirect_stdout(io.StringIO()):
+        layer = calc.calculate_natal_layer()
+    # 模拟从 Redis 读回
+    return json.loads(_dumps(layer))
+
+
+class TestCurrentWindow:
+
+    @pytest.mark.parametrize("current_time,target_year", [
+        (datetime(2026, 10, 18, 15, 20), None),
+        (datetime(2031, 2, 3, 23, 5), 2033),
+    ])
+    def test_matches_full_calculation(self, natal_layer, current_time, target_year):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = BaziCalculator(*BIRTH).calculate_dayun_liunian(
+                current_time=current_time, target_year=target_year
+            )
+            actual = BaziCalculator.from_natal_layer(*BIRTH, natal_layer).apply_current_window(
+                current_time=current_time, target_year=target_year
+            )
+        assert _dumps(actual) == _dumps(expected)
+
+    def test_window_does_not_touch_natal_layer(self, natal_layer):
+        before = _dumps(natal_layer)
+        with contextlib.redirect_stdout(io.StringIO()):
+            BaziCalculator.from_natal_layer(*BIRTH, natal_layer).apply_current_window(datetime(2026, 1, 1))
+        assert _dumps(natal_layer) == before
+        assert 'liuri_sequence' not in natal_layer['details']
+
+
+class TestNatalLayerService:
+
+    def test_key_has_no_time(self):
+        key = NatalLayerService.build_key('fortune', *BIRTH)
+        assert key == f"natal:fortune:v{NATAL_LAYER_VERSION}:1990-05-15:14:30:male"
+        ruled = NatalLayerService.build_key('extras', *BIRTH, '11111', 'all', with_rule_version=True)
+        assert ruled.startswith(f"natal:extras:v{NATAL_LAYER_VERSION}:r")
+        assert ruled.endswith(':1990-05-15:14:30:male:11111:all')
+
+    def test_natal_layer_reused_across_times(self, natal_layer):
+        redis = _FakeRedis()
+        with patch.object(natal_layer_service, 'get_cache', return_value=_natal_cache(redis)), \
+                patch.object(natal_layer_service, 'compute_natal_layer', return_value=natal_layer) as compute:
+            first = NatalLayerService.get_detail(*BIRTH, current_time=datetime(2026, 10, 18, 9))
+            second = NatalLayerService.get_detail(*BIRTH, current_time=datetime(2027, 3, 1, 21))
+        assert compute.call_count == 1
+        keys = [k.split(':', 1)[1] if k.startswith('v') else k for k in redis.data]
+        assert keys == [NatalLayerService.build_key('fortune', *BIRTH)]
+        # 本命层按 natal 策略长期缓存
+        assert min(redis.ttls.values()) >= 365 * 24 * 3600
+        assert first['liunian_sequence'] == second['liunian_sequence']
+        assert first['liuri_sequence'] != second['liuri_sequence']
+
+    def test_use_cache_false_skips_cache(self, natal_layer):
+        redis = _FakeRedis()
+        with patch.object(natal_layer_service, 'get_cache', return_value=_natal_cache(redis)), \
+                patch.object(natal_layer_service, 'compute_natal_layer', return_value=natal_layer) as compute:
+            NatalLayerService.get_detail(*BIRTH, current_time=datetime(2026, 1, 1), use_cache=False)
+            NatalLayerService.get_detail(*BIRTH, current_time=datetime(2026, 1, 1), use_cache=False)
+        assert compute.call_count == 2
+        assert redis.data == {}
+
+
+class TestSpecialLiunianCacheKey:
+
+    def test_key_independent_of_current_time(self):
+        from server.services.special_liunian_service import SpecialLiunianService
+
+        dayuns = [{'step': 1, 'stem': '甲', 'branch': '子', 'year_start': 2000, 'year_end': 2009}]
+        liunians = [{'year': 2001, 'stem': '辛', 'branch': '巳', 'relations': [{'type': '冲'}]}]
+        redis = _FakeRedis()
+        with patch.object(natal_layer_service, 'get_cache', return_value=_natal_cache(redis)):
+            for current_time in (datetime(2026, 1, 1, 8), datetime(2026, 6, 1, 20)):
+                result = asyncio.run(SpecialLiunianService.get_special_liunians_batch(
+                    *BIRTH, dayun_sequence=dayuns, current_time=current_time,
+                    liunian_sequence=[dict(ln) for ln in liunians],
+                ))
+                assert [ln['dayun_step'] for ln in result] == [1]
+        assert len(redis.data) == 1
+        assert next(iter(redis.data)).endswith(NatalLayerService.build_key('special_liunians', *BIRTH, '1', 8))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+支付渠道 HTTP 连接池与 OAuth 令牌缓存单元测试
+
+- 按渠道复用 Session、默认超时、fork 后重建
+- 令牌缓存：提前刷新、进程内单飞、跨 worker 经 Redis 共享与刷新锁
+- PayPal 客户端多个实例共用一次令牌请求
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from services.payment_service import http_pool
+from services.payment_service.http_pool import get_cached_token, get_http_session, provider_timeout
+
+
+class _FakeRedis:
+    """只实现令牌缓存用到的 get / set / delete"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value if isinstance(value, (str, bytes)) else str(value)
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = _FakeRedis()
+    monkeypatch.setattr(http_pool, "_get_redis", lambda: client)
+    http_pool.clear_token_cache()
+    yield client
+    http_pool.clear_token_cache()
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(http_pool, "_get_redis", lambda: None)
+    http_pool.clear_token_cache()
+    yield
+    http_pool.clear_token_cache()
+
+
+class _Fetch:
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.calls = 0
+        self.expires_in = expires_in
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        return f"token-{calls}", self.expires_in
+
+
+class TestHttpSession:
+
+    def test_reused_per_provider(self):
+        http_pool.close_http_sessions()
+        paypal = get_http_session("paypal")
+        assert get_http_session("paypal") is paypal
+        assert get_http_session("linepay") is not paypal
+        assert paypal.get_adapter("https://api.paypal.com")._pool_maxsize == http_pool.PAYMENT_HTTP_POOL_SIZE
+
+    def test_rebuilt_after_fork(self, monkeypatch):
+        session = get_http_session("paypal")
+        monkeypatch.setattr(http_pool, "_sessions_pid", -1)
+        assert get_http_session("paypal") is not session
+
+    def test_default_timeout(self, monkeypatch):
+        seen = []
+        monkeypatch.setattr(requests.Session, "request",
+                            lambda self, method, url, **kwargs: seen.append(kwargs.get("timeout")))
+        session = http_pool.PaymentHttpSession("payermax")
+        session.post("https://example.invalid")
+        session.get("https://example.invalid", timeout=2)
+        assert seen == [provider_timeout("payermax"), 2]
+
+    def test_provider_timeout_override(self, monkeypatch):
+        monkeypatch.setenv("PAYMENT_HTTP_TIMEOUT_PAYPAL", "3,20")
+        assert provider_timeout("paypal") == (3.0, 20.0)
+        monkeypatch.setenv("PAYMENT_HTTP_TIMEOUT_PAYPAL", "bad")
+        assert provider_timeout("paypal") == (http_pool.PAYMENT_HTTP_CONNECT_TIMEOUT,
+                                              http_pool.PAYMENT_HTTP_READ_TIMEOUT)
+
+
+class TestTokenCache:
+
+    def test_cached_until_refresh_margin(self, no_redis):
+        fetch = _Fetch(expires_in=3600)
+        assert get_cached_token("paypal", "m1", fetch) == "token-1"
+        assert get_cached_token("paypal", "m1", fetch) == "token-1"
+        assert get_cached_token("paypal", "m2", fetch) == "token-2"
+
+        # 进入提前刷新窗口
+        token, refresh_at = http_pool._tokens[("paypal", "m1")]
+        assert refresh_at == pytest.approx(time.time() + 3600 - http_pool.PAYMENT_TOKEN_REFRESH_MARGIN, abs=5)
+        http_pool._tokens[("paypal", "m1")] = (token, time.time() - 1)
+        assert get_cached_token("paypal", "m1", fetch) == "token-3"
+        assert get_cached_token("paypal", "m1", fetch, force_refresh=True) == "token-4"
+
+    def test_short_lived_token_used_for_half_lifetime(self, no_redis):
+        fetch = _Fetch(expires_in=60)
+        get_cached_token("paypal", "m", fetch)
+        get_cached_token("paypal", "m", fetch)
+        assert fetch.calls == 1
+
+    def test_failed_fetch_not_cached(self, no_redis):
+        assert get_cached_token("paypal", "m", lambda: None) is None
+        assert get_cached_token("paypal", "m", _Fetch()) == "token-1"
+
+    def test_single_flight_in_process(self, no_redis):
+        fetch = _Fetch(delay=0.05)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(get_cached_token("paypal", "m", fetch)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert fetch.calls == 1 and results == ["token-1"] * 8
+
+    def test_shared_across_workers(self, redis_client):
+        fetch = _Fetch()
+        assert get_cached_token("paypal", "live:client", fetch) == "token-1"
+        key = http_pool._token_key("paypal", "live:client")
+        assert "client" not in key and key in redis_client.data
+        assert key + ":lock" not in redis_client.data
+
+        # 另一个 worker（进程内缓存为空）直接读取 Redis
+        http_pool.clear_token_cache()
+        assert get_cached_token("paypal", "live:client", fetch) == "token-1"
+        assert fetch.calls == 1
+
+    def test_waits_for_worker_holding_lock(self, redis_client, monkeypatch):
+        key = http_pool._token_key("paypal", "m")
+        redis_client.set(key + ":lock", "other-worker")
+
+        def _other_worker_writes():
+            time.sleep(0.1)
+            http_pool._write_shared(redis_client, key, "from-other", time.time() + 600)
+
+        threading.Thread(target=_other_worker_writes).start()
+        fetch = _Fetch()
+        assert get_cached_token("paypal", "m", fetch) == "from-other"
+        assert fetch.calls == 0
+
+    def test_lock_timeout_falls_back_to_fetch(self, redis_client, monkeypatch):
+        monkeypatch.setattr(http_pool, "_TOKEN_WAIT_SECONDS", 0.1)
+        redis_client.set(http_pool._token_key("paypal", "m") + ":lock", "stuck-worker")
+        assert get_cached_token("paypal", "m", _Fetch()) == "token-1"
+
+
+class TestPayPalClient:
+
+    class _Response:
+        status_code = 200
+        text = ""
+
+        def json(self):
+            return {"access_token": "paypal-token", "expires_in": 32400}
+
+    def test_instances_share_token(self, no_redis, monkeypatch):
+        from services.payment_service import paypal_client
+
+        posts = []
+
+        class _Session:
+            def post(self, url, **kwargs):
+                posts.append(url)
+                return TestPayPalClient._Response()
+
+        monkeypatch.setattr(paypal_client, "get_http_session", lambda provider: _Session())
+
+        def _client():
+            client = paypal_client.PayPalClient.__new__(paypal_client.PayPalClient)
+            client.client_id, client.client_secret, client.mode = "cid", "secret", "sandbox"
+            client.base_url = "https://api.sandbox.paypal.com"
+            client.access_token = client._get_access_token()
+            return client
+
+        first, second = _client(), _client()
+        assert first.access_token == second.access_token == "paypal-token"
+        assert second._get_headers()["Authorization"] == "Bearer paypal-token"
+        assert posts == ["https://api.sandbox.paypal.com/v1/oauth2/token"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+支付白名单内存快照单元测试
+
+- 快照增删改、同值多条记录、忽略大小写 / 尾部空格
+- 检查只查快照：首次加载后不再访问数据库
+- updated_at 水位增量刷新、删除全量重载、跨 worker 通知
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from services.payment_service import payment_whitelist_manager as wl
+from services.payment_service.payment_whitelist_manager import PaymentWhitelistManager, WhitelistSnapshot
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _row(row_id, whitelist_type, value, status="active", updated_at=T0):
+    row = {"id": row_id, "whitelist_type": whitelist_type, "user_id": None, "email": None,
+           "phone": None, "identifier": None, "status": status, "updated_at": updated_at}
+    row[whitelist_type] = value
+    return row
+
+
+class _FakeDB:
+    """模拟 payment_whitelist 表，只支持管理器用到的语句"""
+
+    def __init__(self, rows=()):
+        self.rows = {row["id"]: dict(row) for row in rows}
+        self.statements = []
+        self.fail = False
+        self.now = T0
+
+    def connect(self):
+        if self.fail:
+            raise ConnectionError("db down")
+        return _FakeConnection(self)
+
+
+class _FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return _FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        self.db.statements.append((sql, params))
+        if sql.startswith("SELECT id, whitelist_type"):
+            rows = self.db.rows.values()
+            if params:
+                rows = [r for r in rows if r["updated_at"] >= params[0]]
+            self.result = [dict(r) for r in rows]
+        elif sql.startswith("INSERT"):
+            user_id, email, phone, identifier, whitelist_type = params[:5]
+            row_id = max(self.db.rows, default=0) + 1
+            self.db.rows[row_id] = {"id": row_id, "whitelist_type": whitelist_type, "user_id": user_id,
+                                    "email": email, "phone": phone, "identifier": identifier,
+                                    "status": "active", "updated_at": self.db.now}
+        elif sql.startswith("DELETE"):
+            whitelist_type, value = params[0], params[1]
+            for row_id in [i for i, r in self.db.rows.items()
+                           if r["whitelist_type"] == whitelist_type and r[whitelist_type] == value]:
+                del self.db.rows[row_id]
+        elif sql.startswith("UPDATE"):
+            status, row_id = params
+            self.db.rows[row_id].update(status=status, updated_at=self.db.now)
+
+    def fetchall(self):
+        return self.result
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _FakeDB([_row(1, "email", "VIP@Example.com"), _row(2, "user_id", "u-1"),
+                    _row(3, "phone", "13800000000", status="inactive")])
+    monkeypatch.setattr(wl, "get_mysql_connection", fake.connect)
+    monkeypatch.setattr(wl, "return_mysql_connection", lambda conn: None)
+    return fake
+
+
+@pytest.fixture
+def published(monkeypatch):
+    ops = []
+    monkeypatch.setattr(PaymentWhitelistManager, "_publish_change", lambda self, op: ops.append(op))
+    return ops
+
+
+def _selects(db):
+    return [s for s in db.statements if s[0].startswith("SELECT")]
+
+
+class TestWhitelistSnapshot:
+
+    def test_apply(self):
+        snapshot = WhitelistSnapshot()
+        assert snapshot.apply([_row(1, "email", "a@x.com"), _row(2, "email", "a@x.com"),
+                               _row(3, "phone", "1", status="inactive")]) == 2
+        assert snapshot.version == 1 and len(snapshot) == 2
+        assert snapshot.contains("email", "A@X.com ") and not snapshot.contains("phone", "1")
+
+        # 同值的另一条记录仍有效；重复应用不改变版本
+        later = T0 + timedelta(seconds=5)
+        assert snapshot.apply([_row(1, "email", "a@x.com", status="inactive", updated_at=later)]) == 1
+        assert snapshot.contains("email", "a@x.com")
+        assert snapshot.apply([_row(2, "email", "a@x.com", updated_at=later)]) == 0
+        assert snapshot.version == 2 and snapshot.watermark == later
+
+        snapshot.apply([_row(2, "email", "b@x.com", updated_at=later)])
+        assert not snapshot.contains("email", "a@x.com") and snapshot.contains("email", "b@x.com")
+
+    def test_identifier_column_must_match_type(self):
+        snapshot = WhitelistSnapshot()
+        row = _row(1, "email", "a@x.com")
+        row["user_id"] = "u-9"
+        snapshot.apply([row])
+        assert not snapshot.contains("user_id", "u-9")
+
+
+class TestPaymentWhitelistManager:
+
+    def test_checks_never_hit_db_after_load(self, db):
+        manager = PaymentWhitelistManager()
+        assert manager.is_whitelisted(email="vip@example.com")
+        assert manager.is_whitelisted(user_id="nobody", email="VIP@example.com")
+        assert manager.is_whitelisted(user_id="u-1")
+        assert not manager.is_whitelisted(phone="13800000000")
+        assert not manager.is_whitelisted(identifier="1.2.3.4")
+        assert len(db.statements) == 1
+
+    def test_incremental_refresh(self, db, monkeypatch):
+        manager = PaymentWhitelistManager()
+        manager.is_whitelisted(email="x")
+        db.rows[4] = _row(4, "identifier", "1.2.3.4", updated_at=T0 + timedelta(seconds=30))
+        db.rows[2]["status"], db.rows[2]["updated_at"] = "inactive", T0 + timedelta(seconds=30)
+
+        monkeypatch.setattr(wl, "PAYMENT_WHITELIST_REFRESH_INTERVAL", 0)
+        manager.is_whitelisted(email="x")  # 触发后台刷新，本次仍用旧快照
+        for thread in list(wl.threading.enumerate()):
+            if thread.name == "PaymentWhitelistRefresh":
+                thread.join()
+        assert _selects(db)[-1][1] == (T0,)
+        assert manager.is_whitelisted(identifier="1.2.3.4")
+        assert not manager.is_whitelisted(user_id="u-1")
+        assert manager.snapshot_version == 2
+
+    def test_admin_changes_update_snapshot(self, db, published):
+        manager = PaymentWhitelistManager()
+        assert not manager.is_whitelisted(email="new@x.com")
+
+        db.now = T0 + timedelta(seconds=10)
+        assert manager.add_to_whitelist("email", email="new@x.com")
+        assert manager.is_whitelisted(email="new@x.com")
+
+        assert manager.remove_from_whitelist("email", email="VIP@Example.com")
+        assert not manager.is_whitelisted(email="vip@example.com")
+        # 删除后全量重载
+        assert _selects(db)[-1][1] == ()
+
+        db.now = T0 + timedelta(seconds=20)
+        assert manager.enable_whitelist(3)
+        assert manager.is_whitelisted(phone="13800000000")
+        assert published == ["add", "remove", "update"]
+
+    def test_db_down_on_cold_start(self, db):
+        db.fail = True
+        manager = PaymentWhitelistManager()
+        assert not manager.is_whitelisted(email="vip@example.com")
+        assert not manager.is_whitelisted(email="vip@example.com")
+        assert manager.snapshot_version == 0
+
+        db.fail = False
+        assert manager.refresh()
+        assert manager.is_whitelisted(email="vip@example.com")
+
+    def test_handle_change(self, db):
+        manager = PaymentWhitelistManager()
+        manager.handle_change({"op": "add", "origin": "other"})
+        assert db.statements == []  # 未加载快照时忽略
+
+        manager.is_whitelisted(email="x")
+        manager.handle_change({"op": "add", "origin": wl._ORIGIN})
+        assert len(db.statements) == 1
+        del db.rows[1]
+        manager.handle_change({"op": "remove", "origin": "other"})
+        assert not manager.is_whitelisted(email="vip@example.com")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
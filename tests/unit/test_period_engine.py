@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+大运/流年批量计算引擎单元测试
+
+批量结果与逐步计算（calculate_period_balance / calculate_auspicious_score /
+_get_stem_shishen 等单个运限的实现）逐项对比。
+"""
+
+import os
+import random
+import sys
+from dataclasses import asdict
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from core.data.constants import EARTHLY_BRANCHES, HEAVENLY_STEMS
+from core.inference.force_balancer import DynamicForceBalancer
+from core.inference.period_engine import (
+    BRANCH_PAD, STEM_PAD, NatalEncoding, compute_period_arrays, element_counts,
+    encode_branches, encode_stems, ten_god_offsets,
+)
+
+PILLARS = ['year', 'month', 'day', 'hour']
+ELEMENTS = ['木', '火', '土', '金', '水']
+
+
+def _random_chart(rnd):
+    return {p: {'stem': rnd.choice(HEAVENLY_STEMS), 'branch': rnd.choice(EARTHLY_BRANCHES)} for p in PILLARS}
+
+
+def _random_dayuns(rnd, count=10):
+    return [
+        {'step': i, 'ganzhi': rnd.choice(HEAVENLY_STEMS) + rnd.choice(EARTHLY_BRANCHES),
+         'age_display': f'{i * 10 + 3}-{i * 10 + 12}岁'}
+        for i in range(count)
+    ]
+
+
+class TestEncoding:
+
+    def test_unknown_values_map_to_padding(self):
+        assert encode_stems(['甲', '', None, 'x']).tolist() == [0, STEM_PAD, STEM_PAD, STEM_PAD]
+        assert encode_branches(['亥', '', None]).tolist() == [11, BRANCH_PAD, BRANCH_PAD]
+
+    def test_element_counts(self):
+        counts = element_counts(['甲', '丙', ''], ['寅', '', '子'])
+        assert counts.tolist() == [[2, 0, 0, 0, 0], [0, 1, 0, 0, 0], [0, 0, 0, 0, 1]]
+
+    def test_ten_god_offsets(self):
+        from server.utils.key_years_provider import _get_stem_shishen, _batch_stem_shishen
+
+        stems = HEAVENLY_STEMS + ['', 'x']
+        assert ten_god_offsets('', stems).tolist() == [-1] * len(stems)
+        for day_stem in HEAVENLY_STEMS:
+            dayuns = [{'stem': s} for s in stems]
+            assert _batch_stem_shishen(day_stem, dayuns) == [_get_stem_shishen(day_stem, s) for s in stems]
+
+
+class TestPeriodArrays:
+
+    def test_matches_single_period_balance(self):
+        rnd = random.Random(1)
+        for _ in range(300):
+            chart = _random_chart(rnd)
+            natal_power = DynamicForceBalancer.calculate_natal_wuxing_power(chart)
+            natal_branches = [chart[p]['branch'] for p in PILLARS]
+            natal_stems = [chart[p]['stem'] for p in PILLARS]
+            spouse = rnd.choice(ELEMENTS + [''])
+            stems = [rnd.choice(HEAVENLY_STEMS + ['']) for _ in range(12)]
+            branches = [rnd.choice(EARTHLY_BRANCHES + ['']) for _ in range(12)]
+
+            natal = NatalEncoding.build(natal_power, natal_branches, natal_stems,
+                                        day_branch=chart['day']['branch'], spouse_star_element=spouse)
+            arrays = compute_period_arrays(natal, stems, branches)
+            assert len(arrays) == 12
+            for i, (stem, branch) in enumerate(zip(stems, branches)):
+                single = DynamicForceBalancer.calculate_period_balance(
+                    natal_power, natal_branches, stem, branch,
+                    day_branch=chart['day']['branch'], spouse_star_element=spouse, natal_stems=natal_stems,
+                )
+                # 浮点值逐位一致（不是近似相等）
+                assert arrays.delta_dict(i) == single.wuxing_delta
+                assert arrays.power_dict(i) == single.wuxing_power
+                assert bool(arrays.palace_activated[i]) == single.marriage_palace_activated
+                assert float(arrays.spouse_change[i]) == single.spouse_star_power_change
+
+    def test_all_dayun_balances_match_single_periods(self):
+        rnd = random.Random(2)
+        for _ in range(100):
+            chart = _random_chart(rnd)
+            natal_power = DynamicForceBalancer.calculate_natal_wuxing_power(chart)
+            natal_branches = [chart[p]['branch'] for p in PILLARS]
+            natal_stems = [chart[p]['stem'] for p in PILLARS]
+            dayuns = _random_dayuns(rnd)
+            balances = DynamicForceBalancer.calculate_all_dayun_balances(
+                natal_power, natal_branches, dayuns, day_branch=chart['day']['branch'],
+                spouse_star_element='水', age_range=(18, 50), natal_stems=natal_stems,
+            )
+            selected = [d for d in dayuns if not (int(d['age_display'].split('-')[0]) > 50
+                                                 or int(d['age_display'].split('-')[0]) + 9 < 18)]
+            assert [b.dayun_step for b in balances] == [d['step'] for d in selected]
+            for balance, dayun in zip(balances, selected):
+                single = DynamicForceBalancer.calculate_period_balance(
+                    natal_power, natal_branches, dayun['ganzhi'][0], dayun['ganzhi'][1],
+                    day_branch=chart['day']['branch'], spouse_star_element='水', natal_stems=natal_stems,
+                )
+                expected = asdict(single)
+                expected.update(dayun_ganzhi=dayun['ganzhi'], dayun_step=dayun['step'],
+                                age_display=dayun['age_display'])
+                assert asdict(balance) == expected
+
+    def test_empty_inputs(self):
+        natal = NatalEncoding.build({}, [], None)
+        arrays = compute_period_arrays(natal, [], [])
+        assert len(arrays) == 0 and arrays.delta.shape == (0, 5)
+        arrays = compute_period_arrays(natal, ['甲'], ['子'])
+        assert arrays.branch_relations.shape == (1, 0)
+        assert arrays.spouse_change.tolist() == [0.0]
+        assert not arrays.palace_activated[0]
+
+
+class TestConsumers:
+
+    def test_marriage_dynamic_balance(self):
+        from core.inference.marriage_engine import MarriageInferenceEngine
+        from core.inference.models import InferenceInput
+
+        chart = {
+            'year': {'stem': '戊', 'branch': '辰'}, 'month': {'stem': '辛', 'branch': '酉'},
+            'day': {'stem': '壬', 'branch': '午'}, 'hour': {'stem': '癸', 'branch': '卯'},
+        }
+        dayuns = [{'step': 1, 'ganzhi': '壬子', 'age_display': '20-29岁'},
+                  {'step': 2, 'ganzhi': '甲寅', 'age_display': '60-69岁'}]
+        inp = InferenceInput(
+            day_stem='壬', day_branch='午', bazi_pillars=chart, dayun_sequence=dayuns,
+            ten_gods={'year': {'main_star': '七杀', 'hidden_stars': []}},
+        )
+        chains = MarriageInferenceEngine()._infer_dynamic_balance(inp)
+        assert [c.details['step'] for c in chains] == [1]
+        assert '婚姻宫被大运地支冲动' in chains[0].conclusion
+        assert chains[0].details['palace_activated'] is True
+        assert all(type(v) is float for v in chains[0].details['wuxing_delta'].values())
+
+    def test_health_relations_batch(self):
+        from server.utils.key_years_provider import (
+            HEALTH_CONFLICTS, _analyze_dayun_health_relation, _batch_dayun_health_relations,
+        )
+
+        rnd = random.Random(3)
+        for _ in range(200):
+            bazi_elements = {e: rnd.randint(0, 4) for e in ELEMENTS}
+            dayuns = [{'stem': rnd.choice(HEAVENLY_STEMS + ['']), 'branch': rnd.choice(EARTHLY_BRANCHES + [''])}
+                      for _ in range(10)]
+            batch = _batch_dayun_health_relations(dayuns, bazi_elements)
+            assert batch == [_analyze_dayun_health_relation(d, bazi_elements) for d in dayuns]
+            assert all(r is None or r in {c[2] for c in HEALTH_CONFLICTS} for r in batch)
+
+    def test_auspicious_scores_batch(self):
+        from core.analyzers.liunian_auspicious_analyzer import LiunianAuspiciousAnalyzer
+
+        stars = LiunianAuspiciousAnalyzer.AUSPICIOUS_TEN_GODS + LiunianAuspiciousAnalyzer.INAUSPICIOUS_TEN_GODS + ['比肩', '']
+        deities = ['天乙贵人', '文昌', '空亡', '羊刃', '其他']
+        rnd = random.Random(4)
+        analyzer = LiunianAuspiciousAnalyzer()
+        for _ in range(20):
+            bazi = {
+                'bazi_pillars': {'day': {'stem': rnd.choice(HEAVENLY_STEMS), 'branch': rnd.choice(EARTHLY_BRANCHES)}},
+                'element_counts': {'木': 1} if rnd.random() < 0.7 else {},
+            }
+            liunians = [
+                {'stem': rnd.choice(HEAVENLY_STEMS), 'branch': rnd.choice(EARTHLY_BRANCHES),
+                 'main_star': rnd.choice(stars), 'deities': rnd.sample(deities, rnd.randint(0, 3))}
+                for _ in range(100)
+            ]
+            dayuns = [rnd.choice([None, {'stem': rnd.choice(HEAVENLY_STEMS), 'branch': rnd.choice(EARTHLY_BRANCHES)}])
+                      for _ in liunians]
+            batch = analyzer.calculate_auspicious_scores(bazi, liunians, dayuns)
+            assert batch == [analyzer.calculate_auspicious_score(bazi, ln, d) for ln, d in zip(liunians, dayuns)]
+        assert analyzer.calculate_auspicious_scores({}, []) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进行中 LLM 流复用单元测试
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from server.utils import stream_inflight
+from server.utils.stream_inflight import (
+    InflightStreamRegistry, collect_stream_text, make_llm_cache_writer, stream_completed,
+)
+
+
+class FakeUpstream:
+    """模拟 LLM 上游：记录被调用次数，按 gate 节奏产出 chunk"""
+
+    def __init__(self, pieces, fail_after=None):
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+    async def stream(self):
+        self.calls += 1
+        for i, piece in enumerate(self.pieces):
+            if i == 1:
+                # 第一个 chunk 之后等待放行，模拟生成中途有新请求到达
+                await self.gate.wait()
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("upstream broken")
+            yield {'type': 'progress', 'content': piece}
+        yield {'type': 'complete', 'content': ''}
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+class TestInflightStreamRegistry:
+    """进行中流登记表测试"""
+
+    def test_concurrent_requests_share_one_upstream(self):
+        async def scenario():
+            registry = InflightStreamRegistry()
+            upstream = FakeUpstream(["命主", "财运", "亨通"])
+            cache_writes = []
+
+            def on_complete(chunks):
+                cache_writes.append(collect_stream_text(chunks))
+
+            first = asyncio.ensure_future(_collect(registry.stream("k", upstream.stream, on_complete)))
+            await asyncio.sleep(0.01)
+            # 第二个请求在生成中途到达：先回放已有 chunk 再接收实时 chunk
+            second = asyncio.ensure_future(_collect(registry.stream("k", upstream.stream, on_complete)))
+            await asyncio.sleep(0.01)
+            upstream.gate.set()
+            return upstream, registry, cache_writes, await first, await second
+
+        upstream, registry, cache_writes, first, second = asyncio.run(scenario())
+
+        assert upstream.calls == 1
+        assert first == second
+        assert collect_stream_text(first) == "命主财运亨通"
+        assert cache_writes == ["命主财运亨通"]
+        assert registry.get_stats() == {"upstreams": 1, "attached": 1, "inflight": 0}
+
+    def test_new_upstream_after_completion(self):
+        async def scenario():
+            registry = InflightStreamRegistry()
+            upstream = FakeUpstream(["a", "b"])
+            upstream.gate.set()
+            await _collect(registry.stream("k", upstream.stream))
+            await _collect(registry.stream("k", upstream.stream))
+            return upstream.calls
+
+        assert asyncio.run(scenario()) == 2
+
+    def test_upstream_error_propagates_and_skips_cache(self):
+        async def scenario():
+            registry = InflightStreamRegistry()
+            upstream = FakeUpstream(["a", "b"], fail_after=1)
+            upstream.gate.set()
+            cache_writes = []
+            with pytest.raises(RuntimeError):
+                await _collect(registry.stream("k", upstream.stream, cache_writes.append))
+            return registry, cache_writes
+
+        registry, cache_writes = asyncio.run(scenario())
+        assert cache_writes == []
+        assert registry.get_stats()["inflight"] == 0
+
+    def test_subscriber_disconnect_does_not_stop_upstream(self):
+        async def scenario():
+            registry = InflightStreamRegistry()
+            upstream = FakeUpstream(["a", "b", "c"])
+            cache_writes = []
+            stream = registry.stream("k", upstream.stream, lambda chunks: cache_writes.append(collect_stream_text(chunks)))
+            await stream.__anext__()
+            await stream.aclose()
+            upstream.gate.set()
+            await asyncio.sleep(0.01)
+            return cache_writes
+
+        assert asyncio.run(scenario()) == ["abc"]
+
+
+class TestStreamHelpers:
+    """chunk 辅助函数测试"""
+
+    def test_stream_completed(self):
+        assert stream_completed([{'type': 'chunk'}, {'type': 'end'}])
+        assert not stream_completed([{'type': 'progress'}])
+        assert not stream_completed([{'type': 'error'}, {'type': 'complete'}])
+
+    def test_llm_cache_writer(self, monkeypatch):
+        written = []
+        monkeypatch.setattr(stream_inflight, "set_llm_cache", lambda *args: written.append(args))
+        write = make_llm_cache_writer("health", "h1", 60)
+
+        write([{'type': 'progress', 'content': '甲'}, {'type': 'error', 'content': 'x'}])
+        write([{'type': 'progress', 'content': ''}, {'type': 'complete', 'content': ''}])
+        assert written == []
+        write([{'type': 'progress', 'content': '甲'}, {'type': 'complete', 'content': '乙'}])
+        assert written == [("health", "h1", "甲乙", 60)]
+
+    def test_llm_cache_writer_filter(self, monkeypatch):
+        written = []
+        monkeypatch.setattr(stream_inflight, "set_llm_cache", lambda *args: written.append(args))
+        write = make_llm_cache_writer("marriage", "h2", 60, chunk_filter=lambda c: c['content'] != '拒答')
+        write([{'type': 'progress', 'content': '拒答'}, {'type': 'progress', 'content': '正文'},
+               {'type': 'complete', 'content': ''}])
+        assert written == [("marriage", "h2", "正文", 60)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+类型化 protobuf 结构单元测试
+
+- 排盘 / 大运流年详情经 protobuf 往返后与原字典逐字节一致（含字段顺序和冗余字段的对象引用）
+- 结构不符时抛出 SchemaMismatch，服务端回退旧版 JSON 字段
+- 规则匹配结果按条回退 JSON
+- schema_version 协商与 GRPC_LEGACY_JSON_FIELDS 兼容开关
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from shared.clients import typed_payloads
+from shared.clients.typed_payloads import (
+    SCHEMA_VERSION, SchemaMismatch, chart_from_proto, fortune_detail_from_proto,
+    matched_rule_from_proto, to_chart, to_fortune_detail, to_matched_rule,
+)
+
+import bazi_core_pb2
+import bazi_fortune_pb2
+import bazi_rule_pb2
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _round_trip(message):
+    return type(message).FromString(message.SerializeToString())
+
+
+@pytest.fixture(scope="module")
+def chart_result():
+    from core.calculators.bazi_core_calculator import BaziCoreCalculator
+    return BaziCoreCalculator("1990-05-15", "14:30", "male").calculate()
+
+
+@pytest.fixture(scope="module")
+def fortune_detail():
+    import datetime
+    from core.calculators.helpers import compute_local_detail
+    return compute_local_detail("1990-05-15", "14:30", "male", current_time=datetime.datetime(2025, 6, 1))
+
+
+class _Context:
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+
+class TestChart:
+
+    def test_round_trip(self, chart_result):
+        back = chart_from_proto(_round_trip(to_chart(chart_result)))
+        assert _dumps(back) == _dumps(chart_result)
+
+    def test_unexpected_structure(self, chart_result):
+        broken = dict(chart_result, basic_info=dict(chart_result["basic_info"], extra="x"))
+        with pytest.raises(SchemaMismatch):
+            to_chart(broken)
+        details = dict(chart_result["details"])
+        details["day"] = dict(details["day"], main_star=None, nayin=1)
+        with pytest.raises(SchemaMismatch):
+            to_chart(dict(chart_result, details=details))
+
+
+class TestFortuneDetail:
+
+    def test_round_trip(self, fortune_detail):
+        message = to_fortune_detail(fortune_detail)
+        back = fortune_detail_from_proto(_round_trip(message))
+        assert _dumps(back) == _dumps(fortune_detail)
+        # 冗余字段只传一次，体积远小于 JSON
+        assert message.ByteSize() * 4 < len(_dumps(fortune_detail).encode("utf-8"))
+
+    def test_aliases_restored(self, fortune_detail):
+        back = fortune_detail_from_proto(to_fortune_detail(fortune_detail))
+        assert back["details"]["dayun_sequence"] is back["dayun_sequence"]
+        assert back["details"]["liuyue_sequence"] is back["liuyue_sequence"]
+        assert back["details"]["dayun"] is back["dayun_info"]["current_dayun"]
+        assert back["liunian_sequence"][0] is back["dayun_sequence"][0]["liunian_sequence"][0]
+
+    def test_inconsistent_aliases(self, fortune_detail):
+        details = dict(fortune_detail["details"], liunian_sequence=[])
+        with pytest.raises(SchemaMismatch):
+            to_fortune_detail(dict(fortune_detail, details=details))
+
+
+class TestMatchedRule:
+
+    def test_typed_content(self):
+        rule = {"rule_id": "R1", "rule_code": "C1", "rule_name": "日主得令", "rule_type": "wealth",
+                "content": {"type": "list", "items": [{"type": "text", "text": "财运亨通"}]}, "priority": 5}
+        message = to_matched_rule(rule, _dumps)
+        assert not message.rule_json and not message.content_json
+        assert matched_rule_from_proto(_round_trip(message), json.loads) == rule
+
+    def test_fallbacks(self):
+        content = {"type": "text", "text": "x", "score": 0.8}
+        rule = {"rule_id": "R1", "rule_code": "C1", "rule_name": "n", "rule_type": "t",
+                "content": content, "priority": 1}
+        message = to_matched_rule(rule, _dumps)
+        assert message.content_json and not message.rule_json
+        assert matched_rule_from_proto(message, json.loads) == rule
+
+        # 字段缺失 / None 的规则整条退回 JSON
+        rule = dict(rule, rule_code=None, priority=None)
+        message = to_matched_rule(rule, _dumps)
+        assert message.rule_json
+        assert matched_rule_from_proto(message, json.loads) == rule
+
+
+class TestNegotiation:
+
+    def _calculate(self, schema_version):
+        from services.bazi_core.grpc_server import BaziCoreServicer
+        request = bazi_core_pb2.BaziCoreRequest(
+            solar_date="1990-05-15", solar_time="14:30", gender="male", schema_version=schema_version)
+        return BaziCoreServicer().CalculateBazi(request, _Context())
+
+    def test_typed_client(self, chart_result, monkeypatch):
+        monkeypatch.setattr(typed_payloads, "GRPC_LEGACY_JSON_FIELDS", False)
+        response = self._calculate(SCHEMA_VERSION)
+        assert response.schema_version == SCHEMA_VERSION
+        assert not response.basic_info and not response.ten_gods_stats
+        assert chart_from_proto(response.chart) == chart_result
+
+    def test_legacy_client(self, monkeypatch):
+        monkeypatch.setattr(typed_payloads, "GRPC_LEGACY_JSON_FIELDS", False)
+        response = self._calculate(0)
+        assert response.schema_version == 0
+        assert response.basic_info["gender"] == "male"
+        assert not response.HasField("chart")
+
+    def test_legacy_fields_flag(self, monkeypatch):
+        monkeypatch.setattr(typed_payloads, "GRPC_LEGACY_JSON_FIELDS", True)
+        response = self._calculate(SCHEMA_VERSION)
+        assert response.schema_version == SCHEMA_VERSION
+        assert response.HasField("chart") and response.basic_info
+
+    def test_mismatch_falls_back(self, monkeypatch):
+        from services.bazi_fortune import grpc_server
+
+        def _mismatch(detail):
+            raise SchemaMismatch("test")
+
+        monkeypatch.setattr(grpc_server, "compute_local_detail", lambda **kwargs: {"a": 1})
+        monkeypatch.setattr(grpc_server, "to_fortune_detail", _mismatch)
+        request = bazi_fortune_pb2.BaziFortuneRequest(
+            solar_date="1990-05-15", solar_time="14:30", gender="male", schema_version=SCHEMA_VERSION)
+        response = grpc_server.BaziFortuneServicer().CalculateDayunLiunian(request, _Context())
+        assert response.schema_version == 0
+        assert json.loads(response.detail_json) == {"a": 1}
+
+    def test_requested_version(self, monkeypatch):
+        monkeypatch.setattr(typed_payloads, "GRPC_TYPED_PAYLOADS", False)
+        assert typed_payloads.requested_schema_version() == 0
+        assert not typed_payloads.wants_typed(bazi_rule_pb2.BaziRuleMatchRequest())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])